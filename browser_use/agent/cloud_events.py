@@ -155,7 +155,11 @@ class CreateAgentStepEvent(BaseEvent):
 		# Capture screenshot as base64 data URL if available
 		screenshot_url = None
 		if browser_state_summary.screenshot:
-			screenshot_url = f'data:image/png;base64,{browser_state_summary.screenshot}'
+			from browser_use.screenshots.encoding import detect_media_type_b64
+
+			screenshot_url = (
+				f'data:{detect_media_type_b64(browser_state_summary.screenshot)};base64,{browser_state_summary.screenshot}'
+			)
 			import logging
 
 			logger = logging.getLogger(__name__)
@@ -0,0 +1,266 @@
+"""
+Append-only agent history log.
+
+`AgentHistoryList.save_to_file` re-serializes the whole history into indented
+JSON, so saving after every step costs more the longer the run gets.
+`AgentHistoryLog` appends one compact JSON line per step instead. The item is
+snapshotted when it is appended; encoding and disk I/O happen in a background
+task that hands batches to a worker thread, so the event loop never waits on
+the file.
+
+File layout (JSON Lines, gzip-compressed when the path ends in `.gz`):
+    {"format": "browser-use-history", "version": 1}
+    {"index": 0, "item": {...}}    # AgentHistory.model_dump()
+    {"index": 0, "item": {...}}    # a later record for the same step replaces it (e.g. judge verdict)
+    {"usage": {...}}               # UsageSummary at the end of a run
+
+Screenshots are referenced by their stored path. Inline result images (e.g.
+from read_file) are written once to a content-addressed `<log name>.blobs/`
+directory and referenced by hash.
+
+Every batch is flushed and fsynced. If the process dies mid-write, the torn
+last line is skipped on load and every earlier step is kept.
+
+**Usage:**
+    log = AgentHistoryLog('run.jsonl', sensitive_data=sensitive_data)
+    log.append(0, history_item)  # non-blocking
+    await log.flush()
+    history = AgentHistoryList.load_from_file('run.jsonl', AgentOutput)
+
+**Configuration:**
+    Agent(save_history_path='run.jsonl')  # or 'run.jsonl.gz'
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import logging
+import os
+import zlib
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+	from browser_use.agent.views import AgentHistory
+	from browser_use.tokens.views import UsageSummary
+
+logger = logging.getLogger(__name__)
+
+HISTORY_LOG_FORMAT = 'browser-use-history'
+HISTORY_LOG_VERSION = 1
+HISTORY_LOG_SUFFIXES = ('.jsonl', '.gz')
+
+
+def is_history_log(path: str | Path) -> bool:
+	"""Whether a file is an append-only history log rather than a JSON export."""
+	path = Path(path)
+	if path.suffix in HISTORY_LOG_SUFFIXES:
+		return True
+	try:
+		with open(path, 'rb') as f:
+			head = f.read(64)
+	except OSError:
+		return False
+	return HISTORY_LOG_FORMAT.encode() in head
+
+
+def _blobs_dir(path: Path) -> Path:
+	return path.with_name(f'{path.name}.blobs')
+
+
+def _dumps(record: dict[str, Any]) -> str:
+	return json.dumps(record, separators=(',', ':'), ensure_ascii=False) + '\n'
+
+
+class AgentHistoryLog:
+	"""Appends agent history steps to a JSON Lines file from a background writer."""
+
+	def __init__(
+		self,
+		path: str | Path,
+		sensitive_data: dict[str, str | dict[str, str]] | None = None,
+		fsync: bool = True,
+	):
+		"""
+		Initialize log. The file is (re)created on the first write.
+
+		Args:
+			path: Log file; gzip-compressed if it ends in `.gz`
+			sensitive_data: Secrets to redact from action inputs, as in `save_to_file`
+			fsync: Sync each batch to disk before the next one is written
+		"""
+		self.path = Path(path)
+		self.sensitive_data = sensitive_data
+		self.fsync = fsync
+		self.compress = self.path.suffix == '.gz'
+		self.blobs_dir = _blobs_dir(self.path)
+
+		self._pending: list[dict[str, Any]] = []
+		self._writer: asyncio.Task[None] | None = None
+		self._created = False
+
+	def append(self, index: int, item: AgentHistory) -> None:
+		"""Queue a step for writing; appending the same index again replaces that step on load."""
+		self._enqueue({'index': index, 'item': item.model_dump(sensitive_data=self.sensitive_data)})
+
+	def append_usage(self, usage: UsageSummary | None) -> None:
+		"""Queue the run's usage summary."""
+		if usage is not None:
+			self._enqueue({'usage': usage.model_dump(mode='json')})
+
+	def _enqueue(self, record: dict[str, Any]) -> None:
+		self._pending.append(record)
+		if self._writer is None or self._writer.done():
+			self._writer = asyncio.create_task(self._drain())
+
+	async def _drain(self) -> None:
+		while self._pending:
+			batch, self._pending = self._pending, []
+			try:
+				await asyncio.to_thread(self.write_records, batch)
+			except Exception as e:
+				logger.error(f'💾 Failed to append {len(batch)} history record(s) to {self.path}: {type(e).__name__}: {e}')
+
+	async def flush(self) -> None:
+		"""Wait until every queued record is on disk."""
+		while self._writer is not None and not self._writer.done():
+			await self._writer
+
+	def write_records(self, records: Iterable[dict[str, Any]]) -> None:
+		"""Append records synchronously (runs in the writer thread)."""
+		lines = ''.join(_dumps(self._externalize_images(record)) for record in records)
+		if not self._created:
+			self.path.parent.mkdir(parents=True, exist_ok=True)
+			lines = _dumps({'format': HISTORY_LOG_FORMAT, 'version': HISTORY_LOG_VERSION}) + lines
+
+		with open(self.path, 'ab' if self._created else 'wb') as f:
+			if self.compress:
+				# Each batch is its own gzip member; concatenated members read back as one stream
+				with gzip.GzipFile(fileobj=f, mode='wb') as gz:
+					gz.write(lines.encode())
+			else:
+				f.write(lines.encode())
+			f.flush()
+			if self.fsync:
+				os.fsync(f.fileno())
+		self._created = True
+
+	def _externalize_images(self, record: dict[str, Any]) -> dict[str, Any]:
+		"""Replace inline base64 result images with references to content-addressed blobs."""
+		for result in record.get('item', {}).get('result', []):
+			for image in result.get('images') or []:
+				data = image.get('data')
+				if not isinstance(data, str):
+					continue
+				raw = base64.b64decode(data)
+				blob_name = hashlib.sha256(raw).hexdigest()[:32]
+				blob_path = self.blobs_dir / blob_name
+				if not blob_path.exists():
+					self.blobs_dir.mkdir(parents=True, exist_ok=True)
+					tmp_path = blob_path.with_suffix('.tmp')
+					tmp_path.write_bytes(raw)
+					tmp_path.replace(blob_path)
+				del image['data']
+				image['data_ref'] = blob_name
+		return record
+
+	@classmethod
+	def write_history(
+		cls,
+		path: str | Path,
+		history: Iterable[AgentHistory],
+		usage: UsageSummary | None = None,
+		sensitive_data: dict[str, str | dict[str, str]] | None = None,
+	) -> None:
+		"""Write a complete history as a new log in one go."""
+		log = cls(path, sensitive_data=sensitive_data)
+		records = [{'index': i, 'item': item.model_dump(sensitive_data=sensitive_data)} for i, item in enumerate(history)]
+		if usage is not None:
+			records.append({'usage': usage.model_dump(mode='json')})
+		log.write_records(records)
+
+
+def _iter_lines(path: Path) -> Iterator[bytes]:
+	"""Yield the file's lines, decompressing gzip members chunk by chunk; a torn tail comes last without its newline."""
+	decompressor = zlib.decompressobj(wbits=31) if path.suffix == '.gz' else None
+	buffer = b''
+	with open(path, 'rb') as f:
+		while chunk := f.read(1 << 16):
+			if decompressor is None:
+				data = chunk
+			else:
+				data = b''
+				try:
+					while chunk:
+						data += decompressor.decompress(chunk)
+						chunk = decompressor.unused_data
+						if decompressor.eof:
+							# Each appended batch is its own gzip member
+							decompressor = zlib.decompressobj(wbits=31)
+				except zlib.error:
+					logger.warning(f'⚠️ History log {path.name} ends with a corrupt compressed write, ignoring it')
+					break
+			*lines, buffer = (buffer + data).split(b'\n')
+			yield from lines
+	if buffer:
+		yield buffer
+
+
+def iter_history_records(path: str | Path) -> Iterator[dict[str, Any]]:
+	"""
+	Stream the records of a history log, tolerating a torn final write.
+
+	Raises:
+		ValueError: If the file is not a history log or a record before the last one is corrupt
+	"""
+	path = Path(path)
+	lines = _iter_lines(path)
+	try:
+		header = json.loads(next(lines, b'null'))
+	except json.JSONDecodeError:
+		header = None
+	if not isinstance(header, dict) or header.get('format') != HISTORY_LOG_FORMAT:
+		raise ValueError(f'{path} is not a browser-use history log')
+
+	previous: bytes | None = None
+	for line in lines:
+		if previous is not None:
+			yield json.loads(previous)
+		previous = line
+
+	if previous is not None:
+		try:
+			yield json.loads(previous)
+		except json.JSONDecodeError:
+			logger.warning(f'⚠️ History log {path.name} ends with a truncated record, ignoring it')
+
+
+def read_history_log(path: str | Path) -> dict[str, Any]:
+	"""
+	Read a history log into the same dict shape as the JSON export.
+
+	Returns:
+		{'history': [...], 'usage': ...}, ready for `AgentHistoryList.load_from_dict`
+	"""
+	path = Path(path)
+	blobs_dir = _blobs_dir(path)
+	items: dict[int, dict[str, Any]] = {}
+	usage = None
+	for record in iter_history_records(path):
+		if 'index' in record:
+			items[record['index']] = record['item']
+		elif 'usage' in record:
+			usage = record['usage']
+
+	history = [items[index] for index in sorted(items)]
+	for item in history:
+		for result in item.get('result', []):
+			for image in result.get('images') or []:
+				if 'data_ref' in image:
+					image['data'] = base64.b64encode((blobs_dir / image.pop('data_ref')).read_bytes()).decode('utf-8')
+	return {'history': history, 'usage': usage}
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import logging
+from collections import deque
 from typing import Literal
 
 from browser_use.agent.message_manager.views import (
 	HistoryItem,
 )
 from browser_use.agent.prompts import AgentMessagePrompt
+from browser_use.agent.redaction import get_redactor
 from browser_use.agent.views import (
 	ActionResult,
 	AgentOutput,
@@ -22,6 +24,7 @@ from browser_use.llm.messages import (
 	SystemMessage,
 )
 from browser_use.observability import observe_debug
+from browser_use.screenshots.encoding import ScreenshotProfile
 from browser_use.utils import match_url_with_domain_pattern, time_execution_sync
 
 logger = logging.getLogger(__name__)
@@ -93,6 +96,73 @@ def _log_format_message_line(message: BaseMessage, content: str, is_last_message
 # ========== End of Logging Helper Functions ==========
 
 
+class AgentHistoryRenderer:
+	"""
+	Append-only rendering of the agent history block.
+
+	History items are only ever appended, so the joined text is extended with
+	the new items instead of being rebuilt every step. With a history limit the
+	layout is: first item + omitted marker + most recent (limit - 1) items; the
+	window slides by slicing the oldest recent items off the front.
+	"""
+
+	def __init__(self, max_history_items: int | None = None):
+		self.max_history_items = max_history_items
+		self._reset(None)
+
+	def _reset(self, items: list[HistoryItem] | None) -> None:
+		self._items = items
+		self._count = 0
+		self._last_item: HistoryItem | None = None
+		self._first = ''
+		self._recent: deque[str] = deque()
+		self._recent_text = ''
+		self._omitted = 0
+
+	def render(self, items: list[HistoryItem]) -> str:
+		"""Render the history, reusing everything rendered on previous calls."""
+		# Start over if the list was replaced or rewritten (e.g. state restored)
+		if (
+			items is not self._items
+			or len(items) < self._count
+			or (self._count and items[self._count - 1] is not self._last_item)
+		):
+			self._reset(items)
+
+		if len(items) > self._count:
+			new_texts = [item.to_string() for item in items[self._count :]]
+			if self._count == 0:
+				self._first = new_texts.pop(0)
+			if new_texts:
+				self._recent.extend(new_texts)
+				appended = '\n'.join(new_texts)
+				self._recent_text = f'{self._recent_text}\n{appended}' if self._recent_text else appended
+				self._slide_window()
+			self._count = len(items)
+			self._last_item = items[-1]
+
+		if not self._count:
+			return ''
+		if not self._recent_text:
+			return self._first
+		if not self._omitted:
+			return f'{self._first}\n{self._recent_text}'
+		# The omitted message doesn't count against the limit, only real history items do
+		return f'{self._first}\n<sys>[... {self._omitted} previous steps omitted...]</sys>\n{self._recent_text}'
+
+	def _slide_window(self) -> None:
+		if self.max_history_items is None:
+			return
+		excess = len(self._recent) - (self.max_history_items - 1)  # -1 for the first item
+		if excess <= 0:
+			return
+		cut = 0
+		for _ in range(excess):
+			cut += len(self._recent.popleft()) + 1  # +1 for the joining newline
+		self._recent_text = self._recent_text[cut:]
+		self._omitted += excess
+
+
 class MessageManager:
 	vision_detail_level: Literal['auto', 'low', 'high']
 
@@ -111,6 +181,7 @@ class MessageManager:
 		include_recent_events: bool = False,
 		sample_images: list[ContentPartTextParam | ContentPartImageParam] | None = None,
 		llm_screenshot_size: tuple[int, int] | None = None,
+		screenshot_profile: ScreenshotProfile | None = None,
 	):
 		self.task = task
 		self.state = state
@@ -124,8 +195,10 @@ class MessageManager:
 		self.include_recent_events = include_recent_events
 		self.sample_images = sample_images
 		self.llm_screenshot_size = llm_screenshot_size
+		self.screenshot_profile = screenshot_profile or ScreenshotProfile(size=llm_screenshot_size)
 
 		assert max_history_items is None or max_history_items > 5, 'max_history_items must be None or greater than 5'
+		self._history_renderer = AgentHistoryRenderer(max_history_items)
 
 		# Store settings as direct attributes instead of in a settings object
 		self.include_attributes = include_attributes or []
@@ -139,31 +212,9 @@ class MessageManager:
 	@property
 	def agent_history_description(self) -> str:
 		"""Build agent history description from list of items, respecting max_history_items limit"""
-		if self.max_history_items is None:
-			# Include all items
-			return '\n'.join(item.to_string() for item in self.state.agent_history_items)
-
-		total_items = len(self.state.agent_history_items)
-
-		# If we have fewer items than the limit, just return all items
-		if total_items <= self.max_history_items:
-			return '\n'.join(item.to_string() for item in self.state.agent_history_items)
-
-		# We have more items than the limit, so we need to omit some
-		omitted_count = total_items - self.max_history_items
-
-		# Show first item + omitted message + most recent (max_history_items - 1) items
-		# The omitted message doesn't count against the limit, only real history items do
-		recent_items_count = self.max_history_items - 1  # -1 for first item
-
-		items_to_include = [
-			self.state.agent_history_items[0].to_string(),  # Keep first item (initialization)
-			f'<sys>[... {omitted_count} previous steps omitted...]</sys>',
-		]
-		# Add most recent items
-		items_to_include.extend([item.to_string() for item in self.state.agent_history_items[-recent_items_count:]])
-
-		return '\n'.join(items_to_include)
+		if self._history_renderer.max_history_items != self.max_history_items:
+			self._history_renderer = AgentHistoryRenderer(self.max_history_items)
+		return self._history_renderer.render(self.state.agent_history_items)
 
 	def add_new_task(self, new_task: str) -> None:
 		new_task = '<follow_up_user_request> ' + new_task.strip() + ' </follow_up_user_request>'
@@ -366,13 +417,14 @@ class MessageManager:
 			read_state_images=self.state.read_state_images,
 			llm_screenshot_size=self.llm_screenshot_size,
 			unavailable_skills_info=unavailable_skills_info,
+			screenshot_profile=self.screenshot_profile,
 		).get_user_message(effective_use_vision)
 
 		# Store state message text for history
 		self.last_state_message_text = state_message.text
 
 		# Set the state message with caching enabled
-		self._set_message_with_type(state_message, 'state')
+		self._set_message_with_type(state_message, 'state', url=browser_state_summary.url)
 
 	def _log_history_lines(self) -> str:
 		"""Generate a formatted log string of message history for debugging / printing to terminal"""
@@ -420,7 +472,9 @@ class MessageManager:
 		self.last_input_messages = self.state.history.get_messages()
 		return self.last_input_messages
 
-	def _set_message_with_type(self, message: BaseMessage, message_type: Literal['system', 'state']) -> None:
+	def _set_message_with_type(
+		self, message: BaseMessage, message_type: Literal['system', 'state'], url: str | None = None
+	) -> None:
 		"""Replace a specific state message slot with a new message"""
 		# System messages don't need filtering - they only contain instructions/placeholders
 		# State messages need filtering - they include agent_history_description which contains
@@ -429,7 +483,7 @@ class MessageManager:
 			self.state.history.system_message = message
 		elif message_type == 'state':
 			if self.sensitive_data:
-				message = self._filter_sensitive_data(message)
+				message = self._filter_sensitive_data(message, url)
 			self.state.history.state_message = message
 		else:
 			raise ValueError(f'Invalid state message type: {message_type}')
@@ -441,43 +495,22 @@ class MessageManager:
 		self.state.history.context_messages.append(message)
 
 	@time_execution_sync('--filter_sensitive_data')
-	def _filter_sensitive_data(self, message: BaseMessage) -> BaseMessage:
+	def _filter_sensitive_data(self, message: BaseMessage, url: str | None = None) -> BaseMessage:
 		"""Filter out sensitive data from the message"""
+		if not self.sensitive_data:
+			return message
 
-		def replace_sensitive(value: str) -> str:
-			if not self.sensitive_data:
-				return value
-
-			# Collect all sensitive values, immediately converting old format to new format
-			sensitive_values: dict[str, str] = {}
-
-			# Process all sensitive data entries
-			for key_or_domain, content in self.sensitive_data.items():
-				if isinstance(content, dict):
-					# Already in new format: {domain: {key: value}}
-					for key, val in content.items():
-						if val:  # Skip empty values
-							sensitive_values[key] = val
-				elif content:  # Old format: {key: value} - convert to new format internally
-					# We treat this as if it was {'http*://*': {key_or_domain: content}}
-					sensitive_values[key_or_domain] = content
-
-			# If there are no valid sensitive data entries, just return the original value
-			if not sensitive_values:
-				logger.warning('No valid entries found in sensitive_data dictionary')
-				return value
-
-			# Replace all valid sensitive data values with their placeholder tags
-			for key, val in sensitive_values.items():
-				value = value.replace(val, f'<secret>{key}</secret>')
-
-			return value
+		# Compiled once per distinct sensitive_data content, then one pass per text part
+		redactor = get_redactor(self.sensitive_data)
+		if redactor.is_empty:
+			logger.warning('No valid entries found in sensitive_data dictionary')
+			return message
 
 		if isinstance(message.content, str):
-			message.content = replace_sensitive(message.content)
+			message.content = redactor.redact(message.content, url)
 		elif isinstance(message.content, list):
 			for i, item in enumerate(message.content):
 				if isinstance(item, ContentPartTextParam):
-					item.text = replace_sensitive(item.text)
+					item.text = redactor.redact(item.text, url)
 					message.content[i] = item
 		return message
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 
 from browser_use.llm.messages import (
 	BaseMessage,
@@ -25,13 +25,26 @@ class HistoryItem(BaseModel):
 
 	model_config = ConfigDict(arbitrary_types_allowed=True)
 
+	# Rendered once and reused every step; cleared if a field is reassigned
+	_rendered: str | None = PrivateAttr(default=None)
+
 	def model_post_init(self, __context) -> None:
 		"""Validate that error and system_message are not both provided"""
 		if self.error is not None and self.system_message is not None:
 			raise ValueError('Cannot have both error and system_message at the same time')
 
+	def __setattr__(self, name: str, value: Any) -> None:
+		super().__setattr__(name, value)
+		if not name.startswith('_'):
+			self._rendered = None
+
 	def to_string(self) -> str:
 		"""Get string representation of the history item"""
+		if self._rendered is None:
+			self._rendered = self._render()
+		return self._rendered
+
+	def _render(self) -> str:
 		step_str = 'step' if self.step_number is not None else 'step_unknown'
 
 		if self.error:
@@ -0,0 +1,121 @@
+"""
+Step pipelining and per-phase step timing for the Agent loop.
+
+By default every agent step runs strictly in order: capture browser state,
+build the prompt, call the LLM, execute actions, persist the step. With
+`Agent(pipeline_steps=True)` the agent overlaps work across step boundaries:
+
+- as soon as the last action of a step settles, the next browser state (DOM,
+  screenshot, LLM screenshot encoding, skills availability) is captured in the
+  background while the step is post-processed and finalized, and the
+  page-dependent parts of the next prompt (action models, page actions, the
+  rendered DOM) are prepared from it
+- screenshot storage and history log writes of a step are deferred and run
+  while the next step waits on the LLM
+
+`StepPipeline` owns those background tasks; `StepTimer` records how long each
+phase of a step took, in both modes.
+
+**Usage:**
+    pipeline = StepPipeline(logger)
+    pipeline.prefetch(capture_next_state())
+    state = await pipeline.take_prefetched()  # None if nothing was prefetched or it failed
+    pipeline.defer(lambda: store_screenshot(...))
+    await pipeline.drain()  # before anything reads persisted steps
+
+**Configuration:**
+    Agent(task, llm, pipeline_steps=True)
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Coroutine
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
+
+if TYPE_CHECKING:
+	from browser_use.agent.views import AgentOutput
+	from browser_use.browser.views import BrowserStateSummary
+	from browser_use.tools.registry.views import ActionModel
+
+T = TypeVar('T')
+
+
+@dataclass
+class PreparedContext:
+	"""Browser state of the next step plus the prompt parts that only depend on the page."""
+
+	browser_state_summary: 'BrowserStateSummary'
+	unavailable_skills_info: str | None
+	page_filtered_actions: str
+	action_models: 'tuple[type[ActionModel], type[AgentOutput], type[ActionModel], type[AgentOutput]]'
+
+
+class StepTimer:
+	"""Lap timer for the phases of one agent step, in milliseconds."""
+
+	def __init__(self):
+		self.phases: dict[str, float] = {}
+		self._last = time.perf_counter()
+
+	def lap(self, phase: str) -> None:
+		"""Attribute the time since the previous lap (or the step start) to a phase."""
+		now = time.perf_counter()
+		self.phases[phase] = self.phases.get(phase, 0.0) + (now - self._last) * 1000
+		self._last = now
+
+	def summary(self) -> str:
+		return ' | '.join(f'{phase} {ms:.0f}ms' for phase, ms in self.phases.items())
+
+
+class StepPipeline(Generic[T]):
+	"""Background work that lets one agent step overlap with the next."""
+
+	def __init__(self, logger: logging.Logger):
+		self.logger = logger
+		self._prefetch: asyncio.Task[T] | None = None
+		self._deferred: asyncio.Task[None] | None = None
+
+	def prefetch(self, coro: Coroutine[Any, Any, T]) -> None:
+		"""Start capturing the next step's context in the background, replacing any earlier prefetch."""
+		self.cancel_prefetch()
+		self._prefetch = asyncio.create_task(coro, name='agent_step_prefetch')
+
+	def cancel_prefetch(self) -> None:
+		"""Drop a pending prefetch, e.g. because the page may change before the next step."""
+		if self._prefetch is not None:
+			self._prefetch.cancel()
+			self._prefetch = None
+
+	async def take_prefetched(self) -> T | None:
+		"""Wait for and hand over the prefetched context, or None if there is none or it failed."""
+		task, self._prefetch = self._prefetch, None
+		if task is None:
+			return None
+		try:
+			return await task
+		except Exception as e:
+			self.logger.debug(f'⏩ Prefetching the next browser state failed, capturing it again: {type(e).__name__}: {e}')
+			return None
+
+	def defer(self, work: Callable[[], Awaitable[None]]) -> None:
+		"""Run step persistence in the background, in submission order, so it overlaps the next LLM call."""
+		previous = self._deferred
+
+		async def run_after_previous() -> None:
+			if previous is not None:
+				await previous
+			try:
+				await work()
+			except Exception as e:
+				self.logger.warning(f'⚠️ Deferred step persistence failed: {type(e).__name__}: {e}')
+
+		self._deferred = asyncio.create_task(run_after_previous(), name='agent_step_persistence')
+
+	async def drain(self) -> None:
+		"""Cancel any prefetch and wait until all deferred persistence has finished."""
+		self.cancel_prefetch()
+		while self._deferred is not None and not self._deferred.done():
+			await self._deferred
+		self._deferred = None
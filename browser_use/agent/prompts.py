@@ -5,6 +5,7 @@ from typing import TYPE_CHECKING, Literal, Optional
 from browser_use.dom.views import NodeType, SimplifiedNode
 from browser_use.llm.messages import ContentPartImageParam, ContentPartTextParam, ImageURL, SystemMessage, UserMessage
 from browser_use.observability import observe_debug
+from browser_use.screenshots.encoding import ScreenshotProfile, detect_media_type_b64, get_screenshot_variants
 from browser_use.utils import is_new_tab_page, sanitize_surrogates
 
 if TYPE_CHECKING:
@@ -105,6 +106,7 @@ class AgentMessagePrompt:
 		read_state_images: list[dict] | None = None,
 		llm_screenshot_size: tuple[int, int] | None = None,
 		unavailable_skills_info: str | None = None,
+		screenshot_profile: ScreenshotProfile | None = None,
 	):
 		self.browser_state: 'BrowserStateSummary' = browser_state_summary
 		self.file_system: 'FileSystem | None' = file_system
@@ -124,6 +126,7 @@ class AgentMessagePrompt:
 		self.read_state_images = read_state_images or []
 		self.unavailable_skills_info: str | None = unavailable_skills_info
 		self.llm_screenshot_size = llm_screenshot_size
+		self.screenshot_profile = screenshot_profile or ScreenshotProfile(size=llm_screenshot_size)
 		assert self.browser_state
 
 	def _extract_page_statistics(self) -> dict[str, int]:
@@ -335,37 +338,28 @@ Available tabs:
 			agent_state += f'<available_file_paths>{available_file_paths_text}\nUse with absolute paths</available_file_paths>\n'
 		return agent_state
 
-	def _resize_screenshot(self, screenshot_b64: str) -> str:
-		"""Resize screenshot to llm_screenshot_size if configured."""
-		if not self.llm_screenshot_size:
-			return screenshot_b64
-
+	def _encode_screenshot(self, screenshot_b64: str) -> ImageURL:
+		"""Encode screenshot with the LLM screenshot profile (reuses the variant if the agent already encoded it)."""
 		try:
-			import base64
+			encoded = get_screenshot_variants(screenshot_b64).get_sync(self.screenshot_profile)
+			return ImageURL(url=encoded.data_url, media_type=encoded.media_type, detail=self.vision_detail_level)
+		except Exception as e:
 			import logging
-			from io import BytesIO
-
-			from PIL import Image
 
-			img = Image.open(BytesIO(base64.b64decode(screenshot_b64)))
-			if img.size == self.llm_screenshot_size:
-				return screenshot_b64
-
-			logging.getLogger(__name__).info(
-				f'🔄 Resizing screenshot from {img.size[0]}x{img.size[1]} to {self.llm_screenshot_size[0]}x{self.llm_screenshot_size[1]} for LLM'
+			logging.getLogger(__name__).warning(f'Failed to encode screenshot: {e}, using original')
+			media_type = detect_media_type_b64(screenshot_b64)
+			return ImageURL(
+				url=f'data:{media_type};base64,{screenshot_b64}', media_type=media_type, detail=self.vision_detail_level
 			)
 
-			img_resized = img.resize(self.llm_screenshot_size, Image.Resampling.LANCZOS)
-			buffer = BytesIO()
-			img_resized.save(buffer, format='PNG')
-			return base64.b64encode(buffer.getvalue()).decode('utf-8')
-		except Exception as e:
-			logging.getLogger(__name__).warning(f'Failed to resize screenshot: {e}, using original')
-			return screenshot_b64
-
 	@observe_debug(ignore_input=True, ignore_output=True, name='get_user_message')
 	def get_user_message(self, use_vision: bool = True) -> UserMessage:
-		"""Get complete state as a single cached message"""
+		"""
+		Get complete state as a single cached message.
+
+		When there is history, the first text part is the agent history block (a
+		prefix that only grows between steps) and the second is the per-step state.
+		"""
 		# Don't pass screenshot to model if page is a new tab page, step is 0, and there's only one tab
 		if (
 			is_new_tab_page(self.browser_state.url)
@@ -375,13 +369,12 @@ Available tabs:
 		):
 			use_vision = False
 
-		# Build complete state description
-		state_description = (
-			'<agent_history>\n'
-			+ (self.agent_history_description.strip('\n') if self.agent_history_description else '')
-			+ '\n</agent_history>\n\n'
-		)
-		state_description += '<agent_state>\n' + self._get_agent_state_description().strip('\n') + '\n</agent_state>\n'
+		# The history block only grows between steps, so it goes first as the stable
+		# prefix; everything after it (step info, browser state, ...) changes every step
+		history_description = self.agent_history_description.strip('\n') if self.agent_history_description else ''
+		history_block = sanitize_surrogates('<agent_history>\n' + history_description + '\n</agent_history>\n')
+
+		state_description = '<agent_state>\n' + self._get_agent_state_description().strip('\n') + '\n</agent_state>\n'
 		state_description += '<browser_state>\n' + self._get_browser_state_description().strip('\n') + '\n</browser_state>\n'
 		# Only add read_state if it has content
 		read_state_description = self.read_state_description.strip('\n').strip() if self.read_state_description else ''
@@ -404,8 +397,11 @@ Available tabs:
 		has_images = bool(self.read_state_images)
 
 		if (use_vision is True and self.screenshots) or has_images:
-			# Start with text description
-			content_parts: list[ContentPartTextParam | ContentPartImageParam] = [ContentPartTextParam(text=state_description)]
+			# Start with text description (stable history prefix, then the volatile state)
+			content_parts: list[ContentPartTextParam | ContentPartImageParam] = [
+				ContentPartTextParam(text=history_block),
+				ContentPartTextParam(text=state_description),
+			]
 
 			# Add sample images
 			content_parts.extend(self.sample_images)
@@ -421,19 +417,8 @@ Available tabs:
 				# Add label as text content
 				content_parts.append(ContentPartTextParam(text=label))
 
-				# Resize screenshot if llm_screenshot_size is configured
-				processed_screenshot = self._resize_screenshot(screenshot)
-
-				# Add the screenshot
-				content_parts.append(
-					ContentPartImageParam(
-						image_url=ImageURL(
-							url=f'data:image/png;base64,{processed_screenshot}',
-							media_type='image/png',
-							detail=self.vision_detail_level,
-						),
-					)
-				)
+				# Add the screenshot, encoded (and resized) per the LLM screenshot profile
+				content_parts.append(ContentPartImageParam(image_url=self._encode_screenshot(screenshot)))
 
 			# Add read_state images (from read_file action) before screenshots
 			for img_data in self.read_state_images:
@@ -463,9 +448,16 @@ Available tabs:
 					)
 				)
 
-			return UserMessage(content=content_parts, cache=True)
+			return UserMessage(content=content_parts, cache=True, cache_prefix_parts=1)
 
-		return UserMessage(content=state_description, cache=True)
+		if history_description:
+			# Separate parts keep the prefix/suffix boundary visible to serializers; .text is unchanged
+			return UserMessage(
+				content=[ContentPartTextParam(text=history_block), ContentPartTextParam(text=state_description)],
+				cache=True,
+				cache_prefix_parts=1,
+			)
+		return UserMessage(content=history_block + '\n' + state_description, cache=True)
 
 
 def get_rerun_summary_prompt(original_task: str, total_steps: int, success_count: int, error_count: int) -> str:
@@ -0,0 +1,141 @@
+"""
+Compiled redaction of sensitive data values.
+
+Sensitive values are replaced with `<secret>placeholder</secret>` tags before
+text reaches the LLM or is written to a history file. The value table
+(placeholders, domain scoping, longest-first order) is compiled once per
+distinct sensitive data dict and cached, instead of being rebuilt for every
+message and text part.
+
+Redaction locates occurrences with C-level substring search (the same search
+`str.replace` does, but without allocating a new copy of the content per
+secret), resolves them leftmost-longest, and builds the output in a single
+pass. A regex or pure-Python automaton over all values was measured slower
+than per-value substring search in CPython (see benchmark_redaction.py).
+
+Both sensitive data formats are supported:
+- Old format: {placeholder: value}
+- Domain-scoped: {domain_pattern: {placeholder: value}}
+
+Values from every domain are always redacted. When one value is registered
+under several placeholders, the placeholder from a domain matching the current
+URL is preferred. Existing placeholder tags are left untouched, so redacting
+already-redacted text is a no-op.
+
+**Usage:**
+    redactor = get_redactor(sensitive_data)
+    text = redactor.redact(text, url=current_url)
+"""
+
+import re
+from functools import lru_cache
+from typing import Any
+
+from browser_use.utils import match_url_with_domain_pattern
+
+SensitiveData = dict[str, str | dict[str, str]]
+
+# Old-format entries behave as if they were registered for every domain
+_ANY_DOMAIN = None
+_PLACEHOLDER_TAG = '<secret>'
+_PLACEHOLDER_TAG_PATTERN = re.compile(r'<secret>[^<>]*</secret>')
+
+
+class SensitiveDataRedactor:
+	"""Replaces sensitive values with their placeholder tags in one pass."""
+
+	def __init__(self, entries: tuple[tuple[str | None, str, str], ...]):
+		"""
+		Initialize redactor.
+
+		Args:
+			entries: (domain_pattern or None, placeholder, value) in configuration order
+		"""
+		self._entries = entries
+		# First registration of a value wins unless a domain matching the current URL overrides it
+		self._placeholders: dict[str, str] = {}
+		for _, placeholder, value in entries:
+			self._placeholders.setdefault(value, f'<secret>{placeholder}</secret>')
+		self._scoped = any(domain is not _ANY_DOMAIN for domain, _, _ in entries)
+		# Longest first, so a value that extends another one wins at the same position
+		self._values = sorted(self._placeholders, key=len, reverse=True)
+		self._url_placeholders: dict[str, dict[str, str]] = {}
+
+	@property
+	def is_empty(self) -> bool:
+		return not self._values
+
+	def _placeholders_for_url(self, url: str | None) -> dict[str, str]:
+		if not url or not self._scoped:
+			return self._placeholders
+		cached = self._url_placeholders.get(url)
+		if cached is not None:
+			return cached
+		placeholders = dict(self._placeholders)
+		preferred: set[str] = set()
+		for domain, placeholder, value in self._entries:
+			# `is not None` rather than `is not _ANY_DOMAIN` so type checkers narrow domain to str
+			if domain is not None and value not in preferred and match_url_with_domain_pattern(url, domain):
+				placeholders[value] = f'<secret>{placeholder}</secret>'
+				preferred.add(value)
+		if len(self._url_placeholders) >= 64:
+			self._url_placeholders.clear()
+		self._url_placeholders[url] = placeholders
+		return placeholders
+
+	def redact(self, text: str, url: str | None = None) -> str:
+		"""Replace every sensitive value in the text with its placeholder tag."""
+		if not self._values or not text:
+			return text
+
+		# (start, -length, is_value, value): sorting gives leftmost, then longest, then
+		# existing placeholder tags (is_value=False) ahead of values at the same span
+		matches: list[tuple[int, int, bool, str]] = []
+		for value in self._values:
+			start = text.find(value)
+			while start != -1:
+				matches.append((start, -len(value), True, value))
+				start = text.find(value, start + 1)
+		if not matches:
+			return text
+		if _PLACEHOLDER_TAG in text:
+			matches.extend((m.start(), m.start() - m.end(), False, '') for m in _PLACEHOLDER_TAG_PATTERN.finditer(text))
+
+		placeholders = self._placeholders_for_url(url)
+		parts: list[str] = []
+		position = 0
+		for start, negative_length, is_value, value in sorted(matches):
+			if start < position:
+				continue  # Overlaps an earlier (leftmost) match
+			end = start - negative_length
+			parts.append(text[position:start])
+			parts.append(placeholders[value] if is_value else text[start:end])
+			position = end
+		parts.append(text[position:])
+		return ''.join(parts)
+
+	def redact_data(self, data: Any, url: str | None = None) -> Any:
+		"""Recursively redact strings inside dicts and lists."""
+		if isinstance(data, str):
+			return self.redact(data, url)
+		if isinstance(data, dict):
+			return {key: self.redact_data(value, url) for key, value in data.items()}
+		if isinstance(data, list):
+			return [self.redact_data(item, url) for item in data]
+		return data
+
+
+@lru_cache(maxsize=32)
+def _compile(entries: tuple[tuple[str | None, str, str], ...]) -> SensitiveDataRedactor:
+	return SensitiveDataRedactor(entries)
+
+
+def get_redactor(sensitive_data: SensitiveData | None) -> SensitiveDataRedactor:
+	"""Get the compiled redactor for this sensitive data, compiling it only when the content changes."""
+	entries: list[tuple[str | None, str, str]] = []
+	for key_or_domain, content in (sensitive_data or {}).items():
+		if isinstance(content, dict):
+			entries.extend((key_or_domain, key, value) for key, value in content.items() if value)
+		elif content:
+			entries.append((_ANY_DOMAIN, key_or_domain, content))
+	return _compile(tuple(entries))
@@ -36,6 +36,7 @@ from pydantic import BaseModel, ValidationError
 from uuid_extensions import uuid7str
 
 from browser_use import Browser, BrowserProfile, BrowserSession
+from browser_use.agent.history_log import AgentHistoryLog
 from browser_use.agent.judge import construct_judge_messages
 
 # Lazy import for gif to avoid heavy agent.views import at startup
@@ -43,6 +44,7 @@ from browser_use.agent.judge import construct_judge_messages
 from browser_use.agent.message_manager.service import (
 	MessageManager,
 )
+from browser_use.agent.pipeline import PreparedContext, StepPipeline, StepTimer
 from browser_use.agent.prompts import SystemPrompt
 from browser_use.agent.views import (
 	ActionResult,
@@ -65,6 +67,7 @@ from browser_use.config import CONFIG
 from browser_use.dom.views import DOMInteractedElement, MatchLevel
 from browser_use.filesystem.file_system import FileSystem
 from browser_use.observability import observe, observe_debug
+from browser_use.screenshots.encoding import ScreenshotProfile, get_screenshot_variants
 from browser_use.telemetry.service import ProductTelemetry
 from browser_use.telemetry.views import AgentTelemetryEvent
 from browser_use.tools.registry.views import ActionModel
@@ -162,6 +165,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		use_vision: bool | Literal['auto'] = True,
 		save_conversation_path: str | Path | None = None,
 		save_conversation_path_encoding: str | None = 'utf-8',
+		save_history_path: str | Path | None = None,
+		pipeline_steps: bool = False,
 		max_failures: int = 3,
 		override_system_message: str | None = None,
 		extend_system_message: str | None = None,
@@ -193,6 +198,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		sample_images: list[ContentPartTextParam | ContentPartImageParam] | None = None,
 		final_response_after_failure: bool = True,
 		llm_screenshot_size: tuple[int, int] | None = None,
+		llm_screenshot_profile: ScreenshotProfile | None = None,
+		screenshot_storage_profile: ScreenshotProfile | None = None,
 		_url_shortening_limit: int = 25,
 		**kwargs,
 	):
@@ -229,6 +236,18 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 				llm_screenshot_size = (1400, 850)
 				logger.info('🖼️  Auto-configured LLM screenshot size for Claude Sonnet: 1400x850')
 
+		# Encoding of the screenshot sent to the LLM; an explicit llm_screenshot_size wins over profile scaling
+		if llm_screenshot_profile is None:
+			llm_screenshot_profile = ScreenshotProfile(size=llm_screenshot_size)
+		elif (
+			llm_screenshot_size is not None
+			and llm_screenshot_profile.size is None
+			and llm_screenshot_profile.max_dimension is None
+		):
+			llm_screenshot_profile = llm_screenshot_profile.model_copy(update={'size': llm_screenshot_size})
+		self.llm_screenshot_profile = llm_screenshot_profile
+		self.screenshot_storage_profile = screenshot_storage_profile
+
 		if page_extraction_llm is None:
 			page_extraction_llm = llm
 		if judge_llm is None:
@@ -363,6 +382,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			vision_detail_level=vision_detail_level,
 			save_conversation_path=save_conversation_path,
 			save_conversation_path_encoding=save_conversation_path_encoding,
+			save_history_path=save_history_path,
+			pipeline_steps=pipeline_steps,
 			max_failures=max_failures,
 			override_system_message=override_system_message,
 			extend_system_message=extend_system_message,
@@ -479,6 +500,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			include_recent_events=self.include_recent_events,
 			sample_images=self.sample_images,
 			llm_screenshot_size=llm_screenshot_size,
+			screenshot_profile=self.llm_screenshot_profile,
 		)
 
 		if self.sensitive_data:
@@ -548,6 +570,17 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			self.settings.save_conversation_path = Path(self.settings.save_conversation_path).expanduser().resolve()
 			self.logger.info(f'💬 Saving conversation to {_log_pretty_path(self.settings.save_conversation_path)}')
 
+		self._history_log: AgentHistoryLog | None = None
+		if self.settings.save_history_path:
+			self.settings.save_history_path = Path(self.settings.save_history_path).expanduser().resolve()
+			self._history_log = AgentHistoryLog(self.settings.save_history_path, sensitive_data=self.sensitive_data)
+			self.logger.info(f'💾 Saving history to {_log_pretty_path(self.settings.save_history_path)}')
+
+		# Step pipelining (see agent/pipeline.py); only active inside run() without step hooks
+		self._pipeline: StepPipeline[PreparedContext] = StepPipeline(self.logger)
+		self._pipeline_active = False
+		self._step_timer = StepTimer()
+
 		# Initialize download tracking
 		assert self.browser_session is not None, 'BrowserSession is not set up'
 		self.has_downloads_path = self.browser_session.browser_profile.downloads_path is not None
@@ -686,7 +719,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		try:
 			from browser_use.screenshots.service import ScreenshotService
 
-			self.screenshot_service = ScreenshotService(self.agent_directory)
+			self.screenshot_service = ScreenshotService(self.agent_directory, profile=self.screenshot_storage_profile)
 			self.logger.debug(f'📸 Screenshot service initialized in: {self.agent_directory}/screenshots')
 		except Exception as e:
 			self.logger.error(f'📸 Failed to initialize screenshot service: {e}.')
@@ -983,6 +1016,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		# Initialize timing first, before any exceptions can occur
 
 		self.step_start_time = time.time()
+		self._step_timer = StepTimer()
 
 		browser_state_summary = None
 
@@ -992,10 +1026,17 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 			# Phase 2: Get model output and execute actions
 			await self._get_next_action(browser_state_summary)
+			self._step_timer.lap('llm')
 			await self._execute_actions()
+			self._step_timer.lap('actions')
+
+			# Pipelined mode: the page has settled, start capturing the next step's state right away
+			if self._pipeline_active and not (self.state.last_result and self.state.last_result[-1].is_done):
+				self._pipeline.prefetch(self._capture_browser_context())
 
 			# Phase 3: Post-processing
 			await self._post_process()
+			self._step_timer.lap('post_process')
 
 		except Exception as e:
 			# Handle ALL exceptions in one place
@@ -1003,6 +1044,36 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 		finally:
 			await self._finalize(browser_state_summary)
+			self._step_timer.lap('finalize')
+			self.logger.debug(f'⏱️ Step phases: {self._step_timer.summary()}')
+
+	async def _capture_browser_context(self) -> PreparedContext:
+		"""Capture the browser state and prepare the page-dependent prompt parts for the next step (prefetched in pipelined mode)"""
+		assert self.browser_session is not None, 'BrowserSession is not set up'
+		state_request = self.browser_session.get_browser_state_summary(
+			include_screenshot=True,
+			include_recent_events=self.include_recent_events,
+		)
+		unavailable_skills_info = None
+		if self.skill_service is not None:
+			browser_state_summary, unavailable_skills_info = await asyncio.gather(
+				state_request, self._get_unavailable_skills_info()
+			)
+		else:
+			browser_state_summary = await state_request
+
+		# Encode the LLM screenshot now; _prepare_context picks it up from the shared variant cache
+		if self.settings.use_vision is True and browser_state_summary.screenshot:
+			try:
+				await get_screenshot_variants(browser_state_summary.screenshot).get(self.llm_screenshot_profile)
+			except Exception:
+				pass  # _encode_llm_screenshot reports it
+
+		# Build the page's action models and render the DOM for the prompt while the previous step finishes
+		page_filtered_actions = self.tools.registry.get_prompt_description(browser_state_summary.url)
+		action_models = self._build_action_models(browser_state_summary.url)
+		browser_state_summary.dom_state.llm_representation(include_attributes=self.settings.include_attributes)
+		return PreparedContext(browser_state_summary, unavailable_skills_info, page_filtered_actions, action_models)
 
 	async def _prepare_context(self, step_info: AgentStepInfo | None = None) -> BrowserStateSummary:
 		"""Prepare the context for the step: browser state, action models, page actions"""
@@ -1011,12 +1082,18 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		assert self.browser_session is not None, 'BrowserSession is not set up'
 
 		self.logger.debug(f'🌐 Step {self.state.n_steps}: Getting browser state...')
-		# Always take screenshots for all steps
-		self.logger.debug('📸 Requesting browser state with include_screenshot=True')
-		browser_state_summary = await self.browser_session.get_browser_state_summary(
-			include_screenshot=True,  # always capture even if use_vision=False so that cloud sync is useful (it's fast now anyway)
-			include_recent_events=self.include_recent_events,
-		)
+		prefetched = await self._pipeline.take_prefetched() if self._pipeline_active else None
+		if prefetched is not None:
+			self.logger.debug('⏩ Using browser state prefetched while the previous step finished')
+			browser_state_summary = prefetched.browser_state_summary
+		else:
+			# Always take screenshots for all steps
+			self.logger.debug('📸 Requesting browser state with include_screenshot=True')
+			browser_state_summary = await self.browser_session.get_browser_state_summary(
+				include_screenshot=True,  # always capture even if use_vision=False so that cloud sync is useful (it's fast now anyway)
+				include_recent_events=self.include_recent_events,
+			)
+		self._step_timer.lap('browser_state')
 		if browser_state_summary.screenshot:
 			self.logger.debug(f'📸 Got browser state WITH screenshot, length: {len(browser_state_summary.screenshot)}')
 		else:
@@ -1030,19 +1107,27 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 		# Update action models with page-specific actions
 		self.logger.debug(f'📝 Step {self.state.n_steps}: Updating action models...')
-		await self._update_action_models_for_page(browser_state_summary.url)
-
-		# Get page-specific filtered actions
-		page_filtered_actions = self.tools.registry.get_prompt_description(browser_state_summary.url)
+		if prefetched is not None:
+			self._apply_action_models(prefetched.action_models)
+			page_filtered_actions = prefetched.page_filtered_actions
+		else:
+			await self._update_action_models_for_page(browser_state_summary.url)
+			# Get page-specific filtered actions
+			page_filtered_actions = self.tools.registry.get_prompt_description(browser_state_summary.url)
 
 		# Page-specific actions will be included directly in the browser_state message
 		self.logger.debug(f'💬 Step {self.state.n_steps}: Creating state messages for context...')
 
 		# Get unavailable skills info if skills service is enabled
 		unavailable_skills_info = None
-		if self.skill_service is not None:
+		if prefetched is not None:
+			unavailable_skills_info = prefetched.unavailable_skills_info
+		elif self.skill_service is not None:
 			unavailable_skills_info = await self._get_unavailable_skills_info()
 
+		if self.settings.use_vision is True and browser_state_summary.screenshot:
+			await self._encode_llm_screenshot(browser_state_summary.screenshot)
+
 		self._message_manager.create_state_messages(
 			browser_state_summary=browser_state_summary,
 			model_output=self.state.last_model_output,
@@ -1057,6 +1142,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 		await self._force_done_after_last_step(step_info)
 		await self._force_done_after_failure()
+		self._step_timer.lap('prompt')
 		return browser_state_summary
 
 	@observe_debug(ignore_input=True, name='get_next_action')
@@ -1186,6 +1272,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 				step_start_time=self.step_start_time,
 				step_end_time=step_end_time,
 				step_interval=step_interval,
+				phase_timings=dict(self._step_timer.phases) or None,
 			)
 
 			# Use _make_history_item like main branch
@@ -1227,6 +1314,26 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		# Increment step counter after step is fully completed
 		self.state.n_steps += 1
 
+	async def _encode_llm_screenshot(self, screenshot_b64: str) -> None:
+		"""Encode the LLM screenshot variant in a worker thread so building the prompt doesn't block the loop"""
+		variants = get_screenshot_variants(screenshot_b64)
+		try:
+			encoded = await variants.get(self.llm_screenshot_profile)
+		except Exception as e:
+			self.logger.debug(f'📸 Could not encode LLM screenshot, sending it as captured: {type(e).__name__}: {e}')
+			return
+
+		# Coordinates the LLM returns are in the encoded image's pixel space; let tools rescale them
+		profile = self.llm_screenshot_profile
+		if profile.size is None and profile.max_dimension is not None:
+			encoded_size = (encoded.width, encoded.height)
+			self.browser_session.llm_screenshot_size = encoded_size if encoded_size != variants.source_size else None
+
+		self.logger.debug(
+			f'📸 LLM screenshot: {len(variants.source) / 1024:.1f}KB captured -> '
+			f'{len(encoded.data) / 1024:.1f}KB {encoded.media_type} {encoded.width}x{encoded.height}'
+		)
+
 	async def _force_done_after_last_step(self, step_info: AgentStepInfo | None = None) -> None:
 		"""Handle special processing for the last step"""
 		if step_info and step_info.is_last_step():
@@ -1293,6 +1400,9 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		if self.history.history[-1].result[-1].is_done:
 			last_result = self.history.history[-1].result[-1]
 			last_result.judgement = judgement
+			if self._history_log:
+				# Re-append the step so the log carries the verdict
+				self._history_log.append(len(self.history.history) - 1, self.history.history[-1])
 
 			# Get self-reported success
 			self_reported_success = last_result.success
@@ -1405,7 +1515,11 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 		# Store screenshot and get path
 		screenshot_path = None
-		if browser_state_summary.screenshot:
+		deferred_screenshot = browser_state_summary.screenshot if self._pipeline_active else None
+		if deferred_screenshot:
+			# Stored in the background; the path is filled in before the step is written to the history log
+			pass
+		elif browser_state_summary.screenshot:
 			self.logger.debug(
 				f'📸 Storing screenshot for step {self.state.n_steps}, screenshot length: {len(browser_state_summary.screenshot)}'
 			)
@@ -1430,7 +1544,28 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			state_message=state_message,
 		)
 
+		if deferred_screenshot:
+			self.history.add_item(history_item)
+			self._defer_step_persistence(len(self.history.history) - 1, history_item, deferred_screenshot)
+		else:
+			self._add_history_item(history_item)
+
+	def _defer_step_persistence(self, index: int, history_item: AgentHistory, screenshot_b64: str) -> None:
+		"""Store a step's screenshot and append the step to the history log while the next step runs"""
+		step_number = self.state.n_steps
+
+		async def persist() -> None:
+			history_item.state.screenshot_path = await self.screenshot_service.store_screenshot(screenshot_b64, step_number)
+			if self._history_log:
+				self._history_log.append(index, history_item)
+
+		self._pipeline.defer(persist)
+
+	def _add_history_item(self, history_item: AgentHistory) -> None:
+		"""Add a history item and queue it for the history log"""
 		self.history.add_item(history_item)
+		if self._history_log:
+			self._history_log.append(len(self.history.history) - 1, history_item)
 
 	def _remove_think_tags(self, text: str) -> str:
 		THINK_TAGS = re.compile(r'<think>.*?</think>', re.DOTALL)
@@ -2127,6 +2262,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			await on_step_end(self)
 
 		if self.history.is_done():
+			# The judge and done callbacks read stored screenshots
+			await self._pipeline.drain()
 			await self.log_completion()
 
 			# Run judge before done callback if enabled
@@ -2178,6 +2315,10 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		)
 		signal_handler.register()
 
+		self._pipeline_active = self.settings.pipeline_steps and on_step_start is None and on_step_end is None
+		if self.settings.pipeline_steps and not self._pipeline_active:
+			self.logger.debug('⏩ Step pipelining disabled: on_step_start/on_step_end hooks may change the page between steps')
+
 		try:
 			await self._log_agent_run()
 
@@ -2264,7 +2405,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			else:
 				agent_run_error = 'Failed to complete task in maximum steps'
 
-				self.history.add_item(
+				self._add_history_item(
 					AgentHistory(
 						model_output=None,
 						result=[ActionResult(error=agent_run_error, include_in_memory=True)],
@@ -2311,6 +2452,14 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			# Log token usage summary
 			await self.token_cost_service.log_usage_summary()
 
+			# Finish deferred step persistence before the history is saved or turned into a GIF
+			await self._pipeline.drain()
+			self._pipeline_active = False
+
+			if self._history_log:
+				self._history_log.append_usage(self.history.usage)
+				await self._history_log.flush()
+
 			# Unregister signal handlers before cleanup
 			signal_handler.unregister()
 
@@ -2898,7 +3047,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 				metadata=metadata,
 			)
 
-			self.history.add_item(history_item)
+			self._add_history_item(history_item)
 			self.logger.debug('📝 Saved initial actions to history as step 0')
 			self.logger.debug('Initial actions completed')
 
@@ -3387,6 +3536,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		print('\n\n⏸️ Paused the agent and left the browser open.\n\tPress [Enter] to resume or [Ctrl+C] again to quit.')
 		self.state.paused = True
 		self._external_pause_event.clear()
+		# The page may change while paused
+		self._pipeline.cancel_prefetch()
 
 	def resume(self) -> None:
 		"""Resume the agent"""
@@ -3480,24 +3631,26 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 	async def _update_action_models_for_page(self, page_url: str) -> None:
 		"""Update action models with page-specific actions"""
-		# Create new action model with current page's filtered actions
-		self.ActionModel = self.tools.registry.create_action_model(page_url=page_url)
-		# Update output model with the new actions
+		self._apply_action_models(self._build_action_models(page_url))
+
+	def _build_action_models(
+		self, page_url: str
+	) -> tuple[type[ActionModel], type[AgentOutput], type[ActionModel], type[AgentOutput]]:
+		"""Create the action and output models with the page's filtered actions, without installing them"""
+		action_model = self.tools.registry.create_action_model(page_url=page_url)
+		done_action_model = self.tools.registry.create_action_model(include_actions=['done'], page_url=page_url)
 		if self.settings.flash_mode:
-			self.AgentOutput = AgentOutput.type_with_custom_actions_flash_mode(self.ActionModel)
+			output_type = AgentOutput.type_with_custom_actions_flash_mode
 		elif self.settings.use_thinking:
-			self.AgentOutput = AgentOutput.type_with_custom_actions(self.ActionModel)
+			output_type = AgentOutput.type_with_custom_actions
 		else:
-			self.AgentOutput = AgentOutput.type_with_custom_actions_no_thinking(self.ActionModel)
+			output_type = AgentOutput.type_with_custom_actions_no_thinking
+		return action_model, output_type(action_model), done_action_model, output_type(done_action_model)
 
-		# Update done action model too
-		self.DoneActionModel = self.tools.registry.create_action_model(include_actions=['done'], page_url=page_url)
-		if self.settings.flash_mode:
-			self.DoneAgentOutput = AgentOutput.type_with_custom_actions_flash_mode(self.DoneActionModel)
-		elif self.settings.use_thinking:
-			self.DoneAgentOutput = AgentOutput.type_with_custom_actions(self.DoneActionModel)
-		else:
-			self.DoneAgentOutput = AgentOutput.type_with_custom_actions_no_thinking(self.DoneActionModel)
+	def _apply_action_models(
+		self, models: tuple[type[ActionModel], type[AgentOutput], type[ActionModel], type[AgentOutput]]
+	) -> None:
+		self.ActionModel, self.AgentOutput, self.DoneActionModel, self.DoneAgentOutput = models
 
 	async def authenticate_cloud_sync(self, show_instructions: bool = True) -> bool:
 		"""
@@ -12,6 +12,7 @@ from typing_extensions import TypeVar
 from uuid_extensions import uuid7str
 
 from browser_use.agent.message_manager.views import MessageManagerState
+from browser_use.agent.redaction import get_redactor
 from browser_use.browser.views import BrowserStateHistory
 from browser_use.dom.views import DEFAULT_INCLUDE_ATTRIBUTES, DOMInteractedElement, DOMSelectorMap
 
@@ -36,6 +37,8 @@ class AgentSettings(BaseModel):
 	vision_detail_level: Literal['auto', 'low', 'high'] = 'auto'
 	save_conversation_path: str | Path | None = None
 	save_conversation_path_encoding: str | None = 'utf-8'
+	save_history_path: str | Path | None = None  # Append-only history log (.jsonl / .jsonl.gz) written after every step
+	pipeline_steps: bool = False  # Overlap the next step's browser state capture and this step's persistence with LLM calls
 	max_failures: int = 3
 	generate_gif: bool | str = False
 	override_system_message: str | None = None
@@ -169,6 +172,7 @@ class StepMetadata(BaseModel):
 	step_end_time: float
 	step_number: int
 	step_interval: float | None = None
+	phase_timings: dict[str, float] | None = None  # Milliseconds spent per step phase (browser_state, prompt, llm, actions, ...)
 
 	@property
 	def duration_seconds(self) -> float:
@@ -306,30 +310,7 @@ class AgentHistory(BaseModel):
 		"""Filter out sensitive data from a string value"""
 		if not sensitive_data:
 			return value
-
-		# Collect all sensitive values, immediately converting old format to new format
-		sensitive_values: dict[str, str] = {}
-
-		# Process all sensitive data entries
-		for key_or_domain, content in sensitive_data.items():
-			if isinstance(content, dict):
-				# Already in new format: {domain: {key: value}}
-				for key, val in content.items():
-					if val:  # Skip empty values
-						sensitive_values[key] = val
-			elif content:  # Old format: {key: value} - convert to new format internally
-				# We treat this as if it was {'http*://*': {key_or_domain: content}}
-				sensitive_values[key_or_domain] = content
-
-		# If there are no valid sensitive data entries, just return the original value
-		if not sensitive_values:
-			return value
-
-		# Replace all valid sensitive data values with their placeholder tags
-		for key, val in sensitive_values.items():
-			value = value.replace(val, f'<secret>{key}</secret>')
-
-		return value
+		return get_redactor(sensitive_data).redact(value)
 
 	def _filter_sensitive_data_from_dict(
 		self, data: dict[str, Any], sensitive_data: dict[str, str | dict[str, str]] | None
@@ -337,25 +318,7 @@ class AgentHistory(BaseModel):
 		"""Recursively filter sensitive data from a dictionary"""
 		if not sensitive_data:
 			return data
-
-		filtered_data = {}
-		for key, value in data.items():
-			if isinstance(value, str):
-				filtered_data[key] = self._filter_sensitive_data_from_string(value, sensitive_data)
-			elif isinstance(value, dict):
-				filtered_data[key] = self._filter_sensitive_data_from_dict(value, sensitive_data)
-			elif isinstance(value, list):
-				filtered_data[key] = [
-					self._filter_sensitive_data_from_string(item, sensitive_data)
-					if isinstance(item, str)
-					else self._filter_sensitive_data_from_dict(item, sensitive_data)
-					if isinstance(item, dict)
-					else item
-					for item in value
-				]
-			else:
-				filtered_data[key] = value
-		return filtered_data
+		return get_redactor(sensitive_data).redact_data(data)
 
 	def model_dump(self, sensitive_data: dict[str, str | dict[str, str]] | None = None, **kwargs) -> dict[str, Any]:
 		"""Custom serialization handling circular references and filtering sensitive data"""
@@ -431,14 +394,25 @@ class AgentHistoryList(BaseModel, Generic[AgentStructuredOutput]):
 		return self.__str__()
 
 	def save_to_file(self, filepath: str | Path, sensitive_data: dict[str, str | dict[str, str]] | None = None) -> None:
-		"""Save history to JSON file with proper serialization and optional sensitive data filtering"""
-		try:
-			Path(filepath).parent.mkdir(parents=True, exist_ok=True)
-			data = self.model_dump(sensitive_data=sensitive_data)
-			with open(filepath, 'w', encoding='utf-8') as f:
-				json.dump(data, f, indent=2)
-		except Exception as e:
-			raise e
+		"""Save history to JSON file with proper serialization and optional sensitive data filtering
+
+		Paths ending in `.jsonl` or `.gz` are written as an append-only history log instead
+		(see `browser_use.agent.history_log`); use `Agent(save_history_path=...)` to write it step by step.
+		"""
+		from browser_use.agent.history_log import HISTORY_LOG_SUFFIXES, AgentHistoryLog
+
+		path = Path(filepath)
+		if path.suffix in HISTORY_LOG_SUFFIXES:
+			AgentHistoryLog.write_history(path, self.history, usage=self.usage, sensitive_data=sensitive_data)
+			return
+
+		path.parent.mkdir(parents=True, exist_ok=True)
+		data = self.model_dump(sensitive_data=sensitive_data)
+		# Write next to the target and swap it in, so a crash never leaves a half-written export
+		tmp_path = path.with_name(f'.{path.name}.tmp')
+		with open(tmp_path, 'w', encoding='utf-8') as f:
+			json.dump(data, f, indent=2)
+		tmp_path.replace(path)
 
 	# def save_as_playwright_script(
 	# 	self,
@@ -495,9 +469,14 @@ class AgentHistoryList(BaseModel, Generic[AgentStructuredOutput]):
 
 	@classmethod
 	def load_from_file(cls, filepath: str | Path, output_model: type[AgentOutput]) -> AgentHistoryList:
-		"""Load history from JSON file"""
-		with open(filepath, encoding='utf-8') as f:
-			data = json.load(f)
+		"""Load history from a JSON export or an append-only history log (streamed line by line)"""
+		from browser_use.agent.history_log import is_history_log, read_history_log
+
+		if is_history_log(filepath):
+			data = read_history_log(filepath)
+		else:
+			with open(filepath, encoding='utf-8') as f:
+				data = json.load(f)
 		return cls.load_from_dict(data, output_model)
 
 	def last_action(self) -> None | dict:
@@ -187,6 +187,8 @@ class ScreenshotEvent(BaseEvent[str]):
 
 	full_page: bool = False
 	clip: dict[str, float] | None = None  # {x, y, width, height}
+	format: Literal['png', 'jpeg', 'webp'] = 'png'
+	quality: int | None = None  # 0-100, jpeg/webp only
 
 	event_timeout: float | None = Field(default_factory=lambda: _get_timeout('TIMEOUT_ScreenshotEvent', 15.0))  # seconds
 
@@ -634,6 +634,16 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 		default=5,
 		description='Maximum depth for cross-origin iframe recursion (default: 5 levels deep).',
 	)
+	max_parallel_iframes: int = Field(
+		ge=1,
+		default=4,
+		description='Maximum number of cross-origin iframe DOM trees fetched concurrently.',
+	)
+	iframe_timeout: float = Field(
+		gt=0,
+		default=10.0,
+		description='Seconds shared by all cross-origin iframes of one DOM build; frames not collected in time are left out.',
+	)
 
 	# --- Page load/wait timings ---
 
@@ -651,11 +661,20 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 		default=True, description='Only show element IDs in highlights if llm_representation is less than 10 characters.'
 	)
 	paint_order_filtering: bool = Field(default=True, description='Enable paint order filtering. Slightly experimental.')
+	cache_dom_subtrees: bool = Field(
+		default=False,
+		description='Reuse serializer work for DOM subtrees that did not change since the previous step. Faster when steps change small parts of a page, slower when the whole layout shifts.',
+	)
 	interaction_highlight_color: str = Field(
 		default='rgb(255, 127, 39)',
 		description='Color to use for highlighting elements during interactions (CSS color string).',
 	)
 	interaction_highlight_duration: float = Field(default=1.0, description='Duration in seconds to show interaction highlights.')
+	screenshot_format: Literal['png', 'jpeg', 'webp'] = Field(
+		default='png',
+		description='Format Chrome captures page screenshots in. JPEG/WebP captures are smaller and faster; each consumer re-encodes them with its own ScreenshotProfile.',
+	)
+	screenshot_quality: int | None = Field(default=None, ge=0, le=100, description='Capture quality for jpeg/webp screenshots.')
 
 	# --- Downloads ---
 	auto_download_pdfs: bool = Field(default=True, description='Automatically download PDFs when navigating to PDF viewer pages.')
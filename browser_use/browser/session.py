@@ -151,8 +151,11 @@ class BrowserSession(BaseModel):
 		highlight_elements: bool | None = None,
 		dom_highlight_elements: bool | None = None,
 		paint_order_filtering: bool | None = None,
+		cache_dom_subtrees: bool | None = None,
 		max_iframes: int | None = None,
 		max_iframe_depth: int | None = None,
+		max_parallel_iframes: int | None = None,
+		iframe_timeout: float | None = None,
 	) -> None: ...
 
 	# Overload 2: Local browser mode (use local browser params)
@@ -184,8 +187,11 @@ class BrowserSession(BaseModel):
 		highlight_elements: bool | None = None,
 		dom_highlight_elements: bool | None = None,
 		paint_order_filtering: bool | None = None,
+		cache_dom_subtrees: bool | None = None,
 		max_iframes: int | None = None,
 		max_iframe_depth: int | None = None,
+		max_parallel_iframes: int | None = None,
+		iframe_timeout: float | None = None,
 		# All other local params
 		env: dict[str, str | float | bool] | None = None,
 		ignore_default_args: list[str] | Literal[True] | None = None,
@@ -291,9 +297,12 @@ class BrowserSession(BaseModel):
 		highlight_elements: bool | None = None,
 		dom_highlight_elements: bool | None = None,
 		paint_order_filtering: bool | None = None,
+		cache_dom_subtrees: bool | None = None,
 		# Iframe processing limits
 		max_iframes: int | None = None,
 		max_iframe_depth: int | None = None,
+		max_parallel_iframes: int | None = None,
+		iframe_timeout: float | None = None,
 	):
 		# Following the same pattern as AgentSettings in service.py
 		# Only pass non-None values to avoid validation errors
@@ -3436,7 +3445,7 @@ class BrowserSession(BaseModel):
 			path: Optional file path to save screenshot
 			full_page: Capture entire scrollable page beyond viewport
 			format: Image format ('png', 'jpeg', 'webp')
-			quality: Quality 0-100 for JPEG format
+			quality: Quality 0-100 for JPEG/WebP formats
 			clip: Region to capture {'x': int, 'y': int, 'width': int, 'height': int}
 
 		Returns:
@@ -3454,7 +3463,7 @@ class BrowserSession(BaseModel):
 			'captureBeyondViewport': full_page,
 		}
 
-		if quality is not None and format == 'jpeg':
+		if quality is not None and format in ('jpeg', 'webp'):
 			params['quality'] = quality
 
 		if clip:
@@ -3493,7 +3502,7 @@ class BrowserSession(BaseModel):
 			selector: CSS selector for the element
 			path: Optional file path to save screenshot
 			format: Image format ('png', 'jpeg', 'webp')
-			quality: Quality 0-100 for JPEG format
+			quality: Quality 0-100 for JPEG/WebP formats
 
 		Returns:
 			Screenshot data as bytes
@@ -2,7 +2,7 @@
 
 import asyncio
 import time
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from browser_use.browser.events import (
 	BrowserErrorEvent,
@@ -38,6 +38,10 @@ class DOMWatchdog(BaseWatchdog):
 	selector_map: dict[int, EnhancedDOMTreeNode] | None = None
 	current_dom_state: SerializedDOMState | None = None
 	enhanced_dom_tree: EnhancedDOMTreeNode | None = None
+	# Bumped whenever enhanced_dom_tree is rebuilt or cleared; keys caches derived from the tree
+	dom_version: int = 0
+	# (target_id, dom_version, extract_links) -> (markdown, content stats), see dom/markdown_extractor.py
+	markdown_cache: dict[tuple[str | None, int, bool], tuple[str, dict[str, Any]]] = {}
 
 	# Internal DOM service
 	_dom_service: DomService | None = None
@@ -547,6 +551,9 @@ class DOMWatchdog(BaseWatchdog):
 					paint_order_filtering=self.browser_session.browser_profile.paint_order_filtering,
 					max_iframes=self.browser_session.browser_profile.max_iframes,
 					max_iframe_depth=self.browser_session.browser_profile.max_iframe_depth,
+					max_parallel_iframes=self.browser_session.browser_profile.max_parallel_iframes,
+					iframe_timeout=self.browser_session.browser_profile.iframe_timeout,
+					cache_subtrees=self.browser_session.browser_profile.cache_dom_subtrees,
 				)
 
 			# Get serialized DOM tree using the service
@@ -555,6 +562,7 @@ class DOMWatchdog(BaseWatchdog):
 			self.current_dom_state, self.enhanced_dom_tree, timing_info = await self._dom_service.get_serialized_dom_tree(
 				previous_cached_state=previous_state,
 			)
+			self._bump_dom_version()
 			end = time.time()
 			total_time_ms = (end - start) * 1000
 			self.logger.debug(
@@ -593,6 +601,12 @@ class DOMWatchdog(BaseWatchdog):
 			if construct_tree_ms > 0.01:
 				timing_lines.append(f'  ├─ construct_enhanced_tree: {construct_tree_ms:.2f}ms')
 
+			# cross-origin iframes, collected concurrently
+			cross_origin_iframes_ms = timing_info.get('cross_origin_iframes_ms', 0)
+			if cross_origin_iframes_ms > 0.01:
+				frame_count = sum(1 for key in timing_info if key.startswith('cross_origin_iframe_'))
+				timing_lines.append(f'  ├─ cross_origin_iframes ({frame_count} frames): {cross_origin_iframes_ms:.2f}ms')
+
 			# serialize_accessible_elements breakdown
 			serialize_total_ms = timing_info.get('serialize_accessible_elements_total_ms', 0)
 			if serialize_total_ms > 0.01:
@@ -603,7 +617,14 @@ class DOMWatchdog(BaseWatchdog):
 				bbox_ms = timing_info.get('bbox_filtering_ms', 0)
 				assign_idx_ms = timing_info.get('assign_interactive_indices_ms', 0)
 				clickable_ms = timing_info.get('clickable_detection_time_ms', 0)
+				fingerprint_ms = timing_info.get('subtree_fingerprint_ms', 0)
 
+				if fingerprint_ms > 0.01 and self._dom_service.subtree_cache:
+					stats = self._dom_service.subtree_cache.stats
+					timing_lines.append(
+						f'  │  ├─ subtree_fingerprint: {fingerprint_ms:.2f}ms '
+						f'({stats.reused_rate:.0%} of {stats.reused_nodes + stats.processed_nodes} nodes reused)'
+					)
 				if create_simp_ms > 0.01:
 					timing_lines.append(f'  │  ├─ create_simplified_tree: {create_simp_ms:.2f}ms')
 					if clickable_ms > 0.01:
@@ -635,6 +656,7 @@ class DOMWatchdog(BaseWatchdog):
 				+ build_ax_ms
 				+ build_snapshot_ms
 				+ construct_tree_ms
+				+ cross_origin_iframes_ms
 				+ serialize_total_ms
 				+ get_dom_overhead_ms
 				+ serialize_overhead_ms
@@ -686,7 +708,10 @@ class DOMWatchdog(BaseWatchdog):
 			handler_names = [getattr(h, '__name__', str(h)) for h in handlers]
 			self.logger.debug(f'📸 ScreenshotEvent handlers registered: {len(handlers)} - {handler_names}')
 
-			screenshot_event = self.event_bus.dispatch(ScreenshotEvent(full_page=False))
+			profile = self.browser_session.browser_profile
+			screenshot_event = self.event_bus.dispatch(
+				ScreenshotEvent(full_page=False, format=profile.screenshot_format, quality=profile.screenshot_quality)
+			)
 			self.logger.debug('📸 Dispatched ScreenshotEvent, waiting for event to complete...')
 
 			# Wait for the event itself to complete (this waits for all handlers)
@@ -834,8 +859,14 @@ class DOMWatchdog(BaseWatchdog):
 		self.selector_map = None
 		self.current_dom_state = None
 		self.enhanced_dom_tree = None
+		self._bump_dom_version()
 		# Keep the DOM service instance to reuse its CDP client connection
 
+	def _bump_dom_version(self) -> None:
+		"""Invalidate everything derived from the previous enhanced DOM tree."""
+		self.dom_version += 1
+		self.markdown_cache = {}
+
 	def is_file_input(self, element: EnhancedDOMTreeNode) -> bool:
 		"""Check if element is a file input."""
 		return element.node_name.upper() == 'INPUT' and element.attributes.get('type', '').lower() == 'file'
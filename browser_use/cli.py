@@ -1979,6 +1979,10 @@ async def run_auth_command():
 			except Exception:
 				pass  # Don't fail if we can't send the error event
 		sys.exit(1)
+	finally:
+		if sync_service:
+			# Events are sent in the background; deliver the queued ones before exiting
+			await sync_service.close()
 
 
 @click.group(invoke_without_command=True)
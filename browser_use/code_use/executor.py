@@ -0,0 +1,236 @@
+"""Cell execution engine for code-use agent: compiled-cell cache and incremental namespace tracking."""
+
+import ast
+import bisect
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from types import CodeType
+from typing import Any
+
+from browser_use.code_use.formatting import format_code_block_variable, is_listed_variable, join_available
+
+_WRAPPER_NAME = '__code_exec__'
+
+
+@dataclass(slots=True)
+class _CellAnalysis:
+	tree: ast.Module
+	has_await: bool
+	assigned_names: frozenset[str]
+	user_global_names: frozenset[str]
+	# Every name the cell binds or mentions, i.e. the variables it may have changed
+	names: frozenset[str]
+
+
+def _analyze(source: str) -> _CellAnalysis:
+	tree = ast.parse(source, filename='<code>', mode='exec')
+	has_await = False
+	assigned_names: set[str] = set()
+	user_global_names: set[str] = set()
+	names: set[str] = set()
+
+	for node in ast.walk(tree):
+		if isinstance(node, (ast.Await, ast.AsyncWith, ast.AsyncFor)):
+			has_await = True
+		elif isinstance(node, ast.Name):
+			names.add(node.id)
+		elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+			names.add(node.name)
+		elif isinstance(node, ast.alias):
+			names.add((node.asname or node.name).split('.')[0])
+
+		if isinstance(node, ast.Assign):
+			for target in node.targets:
+				if isinstance(target, ast.Name):
+					assigned_names.add(target.id)
+		elif isinstance(node, (ast.AugAssign, ast.AnnAssign, ast.NamedExpr)) and isinstance(node.target, ast.Name):
+			assigned_names.add(node.target.id)
+		elif isinstance(node, ast.Global):
+			# Track user's explicit global declarations
+			user_global_names.update(node.names)
+
+	names |= user_global_names
+	return _CellAnalysis(tree, has_await, frozenset(assigned_names), frozenset(user_global_names), frozenset(names))
+
+
+def _async_wrapper(tree: ast.Module, global_names: frozenset[str]) -> ast.Module:
+	"""
+	Wrap cell statements in `async def __code_exec__(): global ...; <cell>; return locals()`.
+
+	This mimics how Jupyter/IPython handles top-level await. The statements keep
+	their own line numbers, so tracebacks point at the line of the cell.
+	"""
+	body: list[ast.stmt] = []
+	if global_names:
+		body.append(ast.Global(names=sorted(global_names)))
+	body.extend(tree.body)
+	# Return locals so we can update the namespace
+	body.append(ast.Return(value=ast.Call(func=ast.Name(id='locals', ctx=ast.Load()), args=[], keywords=[])))
+	function = ast.AsyncFunctionDef(
+		name=_WRAPPER_NAME,
+		args=ast.arguments(posonlyargs=[], args=[], kwonlyargs=[], kw_defaults=[], defaults=[]),
+		body=body,
+		decorator_list=[],
+		returns=None,
+		type_params=[],
+	)
+	return ast.fix_missing_locations(ast.Module(body=[function], type_ignores=[]))
+
+
+class CellExecutor:
+	"""
+	Runs notebook cells in a persistent namespace.
+
+	Each cell is parsed and analysed once per distinct source (keyed by its hash) and
+	compiled straight from that tree; code objects are cached, so a re-run cell skips
+	parsing and compiling. Cells with top-level await run inside an async wrapper that
+	declares `global` the variables they assign which already exist, so assignments
+	persist like in Jupyter. The names each cell touches are handed to `tracker`.
+	"""
+
+	def __init__(self, namespace: dict[str, Any], cache_size: int = 256):
+		self.namespace = namespace
+		self.cache_size = cache_size
+		self.tracker = NamespaceTracker(namespace)
+		self._analyses: OrderedDict[bytes, _CellAnalysis] = OrderedDict()
+		self._code: OrderedDict[tuple[bytes, frozenset[str]], CodeType] = OrderedDict()
+		self.hits = 0
+		self.misses = 0
+
+	def _cached(self, cache: OrderedDict, key: Any) -> Any | None:
+		value = cache.get(key)
+		if value is not None:
+			cache.move_to_end(key)
+		return value
+
+	def _store(self, cache: OrderedDict, key: Any, value: Any) -> None:
+		cache[key] = value
+		if len(cache) > self.cache_size:
+			cache.popitem(last=False)
+
+	def _analysis(self, source: str) -> tuple[bytes, _CellAnalysis]:
+		digest = hashlib.sha256(source.encode('utf-8', 'surrogatepass')).digest()
+		analysis = self._cached(self._analyses, digest)
+		if analysis is None:
+			analysis = _analyze(source)
+			self._store(self._analyses, digest, analysis)
+		return digest, analysis
+
+	def compile(self, source: str) -> tuple[CodeType, _CellAnalysis]:
+		"""
+		Compile a cell for the current namespace.
+
+		Raises:
+			SyntaxError: If the cell doesn't parse
+		"""
+		digest, analysis = self._analysis(source)
+		global_names: frozenset[str] = frozenset()
+		if analysis.has_await:
+			# Pre-define user-declared globals that don't exist yet
+			# This prevents NameError when user writes "global foo" before "foo = ..."
+			for name in analysis.user_global_names:
+				self.namespace.setdefault(name, None)
+			# Only variables that already exist become globals (like Jupyter does)
+			global_names = frozenset(
+				name for name in analysis.assigned_names | analysis.user_global_names if name in self.namespace
+			)
+
+		key = (digest, global_names)
+		code = self._cached(self._code, key)
+		if code is not None:
+			self.hits += 1
+			return code, analysis
+
+		self.misses += 1
+		tree = _async_wrapper(analysis.tree, global_names) if analysis.has_await else analysis.tree
+		code = compile(tree, '<code>', 'exec')
+		self._store(self._code, key, code)
+		return code, analysis
+
+	async def run(self, source: str) -> None:
+		"""Execute a cell in the namespace; exceptions raised by the cell propagate."""
+		code, analysis = self.compile(source)
+		try:
+			exec(code, self.namespace, self.namespace)
+			if analysis.has_await:
+				cell_function = self.namespace.pop(_WRAPPER_NAME)
+				result_locals = await cell_function()
+				# Update namespace with all variables from the function's locals
+				# This makes variable assignments persist across cells
+				if result_locals:
+					for key, value in result_locals.items():
+						if not key.startswith('_'):
+							self.namespace[key] = value
+		finally:
+			self.tracker.touch(analysis.names)
+
+
+class NamespaceTracker:
+	"""
+	Keeps the **Available:** line of a namespace up to date incrementally.
+
+	Variable names are kept sorted as they come and go, and code block variable
+	details are only rebuilt for names that were touched or whose value was
+	replaced, so listing the namespace doesn't grow with everything stored in it.
+	"""
+
+	def __init__(self, namespace: dict[str, Any]):
+		self.namespace = namespace
+		self._keys: set[str] = set()
+		self._code_blocks: frozenset[str] = frozenset()
+		self._variable_names: list[str] = []
+		self._block_names: list[str] = []
+		self._touched: set[str] = set()
+		# name -> (value it was built from, detail)
+		self._details: dict[str, tuple[Any, str | None]] = {}
+		self._line: str | None = None
+
+	def touch(self, names: Any) -> None:
+		"""Mark variables whose values may have changed in place."""
+		self._touched.update(names)
+
+	def _sync(self) -> None:
+		keys = self.namespace.keys()
+		code_blocks = self.namespace.get('_code_block_vars') or ()
+		added = keys - self._keys
+		removed = self._keys - keys
+		moved = self._code_blocks.symmetric_difference(code_blocks)
+		if added or removed or moved:
+			self._keys.difference_update(removed)
+			self._keys.update(added)
+			self._code_blocks = frozenset(code_blocks)
+			for name in removed | (moved & self._keys):
+				self._details.pop(name, None)
+				for names in (self._variable_names, self._block_names):
+					index = bisect.bisect_left(names, name)
+					if index < len(names) and names[index] == name:
+						del names[index]
+			for name in added | (moved & self._keys):
+				if is_listed_variable(name):
+					bisect.insort(self._block_names if name in self._code_blocks else self._variable_names, name)
+			self._line = None
+
+		for name in self._touched:
+			if self._details.pop(name, None) is not None:
+				self._line = None
+		self._touched.clear()
+
+	def format_available(self) -> str:
+		"""Same text as formatting.format_available_variables(namespace)."""
+		self._sync()
+		details = None
+		if self._block_names:
+			details = []
+			for name in self._block_names:
+				value = self.namespace.get(name)
+				cached = self._details.get(name)
+				if cached is None or cached[0] is not value:
+					cached = (value, format_code_block_variable(name, value))
+					self._details[name] = cached
+					self._line = None
+				if cached[1] is not None:
+					details.append(cached[1])
+		if self._line is None:
+			self._line = join_available(details, self._variable_names)
+		return self._line
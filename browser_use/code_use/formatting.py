@@ -1,18 +1,114 @@
 """Browser state formatting helpers for code-use agent."""
 
 import logging
-from typing import Any
+import reprlib
+from typing import TYPE_CHECKING, Any
 
 from browser_use.browser.session import BrowserSession
 from browser_use.browser.views import BrowserStateSummary
 
+if TYPE_CHECKING:
+	from browser_use.code_use.executor import NamespaceTracker
+
 logger = logging.getLogger(__name__)
 
+# Show useful utilities (json, asyncio, etc.) and user-defined vars, but hide system objects
+SKIP_VARIABLES = {
+	'browser',
+	'file_system',  # System objects
+	'np',
+	'pd',
+	'plt',
+	'numpy',
+	'pandas',
+	'matplotlib',
+	'requests',
+	'BeautifulSoup',
+	'bs4',
+	'pypdf',
+	'PdfReader',
+	'wait',
+}
+
+# Bounded repr: a preview of a large scraped dataset never renders the whole thing
+_preview_repr = reprlib.Repr(maxlevel=3, maxlist=20, maxtuple=20, maxdict=20, maxset=20, maxstring=400, maxother=400)
+
+
+def summarize_value(value: Any, max_chars: int = 400) -> str:
+	"""Text preview of a namespace value, at most max_chars long however large the value is."""
+	if isinstance(value, str):
+		return value[:max_chars]
+	try:
+		if isinstance(value, (list, tuple, dict, set, frozenset)):
+			# Containers are bounded before rendering instead of str()-ing every element
+			return _preview_repr.repr(value)[:max_chars]
+		return str(value)[:max_chars]
+	except Exception:
+		return f'<{type(value).__name__}>'
+
+
+def is_listed_variable(name: str) -> bool:
+	"""Whether a namespace name is shown to the LLM (private vars and system objects/actions aren't)."""
+	return not name.startswith('_') and name not in SKIP_VARIABLES
+
+
+def format_code_block_variable(var_name: str, value: Any) -> str | None:
+	"""One entry of the code block variables list, or None for an unset variable."""
+	if value is None:
+		return None
+	type_name = type(value).__name__
+	value_str = value if isinstance(value, str) else summarize_value(value)
+
+	# Check if it's a function (starts with "(function" or "(async function")
+	is_function = value_str.strip().startswith('(function') or value_str.strip().startswith('(async function')
+	if is_function:
+		# For functions, only show name and type
+		return f'{var_name}({type_name})'
+
+	# For non-functions, show first and last 20 chars
+	first_20 = value_str[:20].replace('\n', '\\n').replace('\t', '\\t')
+	last_20 = value_str[-20:].replace('\n', '\\n').replace('\t', '\\t') if len(value_str) > 20 else ''
+	if last_20 and first_20 != last_20:
+		return f'{var_name}({type_name}): "{first_20}...{last_20}"'
+	return f'{var_name}({type_name}): "{first_20}"'
+
+
+def join_available(code_block_details: list[str] | None, variable_names: list[str]) -> str:
+	"""The **Available:** line from code block variable details (None without code block variables) and sorted variable names."""
+	parts = []
+	if code_block_details is not None:
+		parts.append(f'**Code block variables:** {" | ".join(code_block_details)}')
+	if variable_names:
+		parts.append(f'**Variables:** {", ".join(variable_names)}')
+	return f'**Available:** {" | ".join(parts)}'
+
+
+def format_available_variables(namespace: dict[str, Any]) -> str:
+	"""Build the **Available:** line from scratch (NamespaceTracker keeps it up to date incrementally)."""
+	# Highlight code block variables separately from regular variables
+	tracked_code_blocks = namespace.get('_code_block_vars', set())
+	code_block_vars = []
+	regular_vars = []
+	for name in namespace.keys():
+		if is_listed_variable(name):
+			if name in tracked_code_blocks:
+				code_block_vars.append(name)
+			else:
+				regular_vars.append(name)
+
+	# Sort for consistent display
+	code_block_details = None
+	if code_block_vars:
+		details = (format_code_block_variable(name, namespace.get(name)) for name in sorted(code_block_vars))
+		code_block_details = [detail for detail in details if detail is not None]
+	return join_available(code_block_details, sorted(regular_vars))
+
 
 async def format_browser_state_for_llm(
 	state: BrowserStateSummary,
 	namespace: dict[str, Any],
 	browser_session: BrowserSession,
+	variables: 'NamespaceTracker | None' = None,
 ) -> str:
 	"""
 	Format browser state summary for LLM consumption in code-use mode.
@@ -21,6 +117,7 @@ async def format_browser_state_for_llm(
 		state: Browser state summary from browser_session.get_browser_state_summary()
 		namespace: The code execution namespace (for showing available variables)
 		browser_session: Browser session for additional checks (jQuery, etc.)
+		variables: Tracker of the namespace that lists its variables incrementally (optional)
 
 	Returns:
 		Formatted browser state text for LLM
@@ -90,73 +187,7 @@ async def format_browser_state_for_llm(
 		lines.append('')
 
 	# Add available variables and functions BEFORE DOM structure
-	# Show useful utilities (json, asyncio, etc.) and user-defined vars, but hide system objects
-	skip_vars = {
-		'browser',
-		'file_system',  # System objects
-		'np',
-		'pd',
-		'plt',
-		'numpy',
-		'pandas',
-		'matplotlib',
-		'requests',
-		'BeautifulSoup',
-		'bs4',
-		'pypdf',
-		'PdfReader',
-		'wait',
-	}
-
-	# Highlight code block variables separately from regular variables
-	code_block_vars = []
-	regular_vars = []
-	tracked_code_blocks = namespace.get('_code_block_vars', set())
-	for name in namespace.keys():
-		# Skip private vars and system objects/actions
-		if not name.startswith('_') and name not in skip_vars:
-			if name in tracked_code_blocks:
-				code_block_vars.append(name)
-			else:
-				regular_vars.append(name)
-
-	# Sort for consistent display
-	available_vars_sorted = sorted(regular_vars)
-	code_block_vars_sorted = sorted(code_block_vars)
-
-	# Build available line with code blocks and variables
-	parts = []
-	if code_block_vars_sorted:
-		# Show detailed info for code block variables
-		code_block_details = []
-		for var_name in code_block_vars_sorted:
-			value = namespace.get(var_name)
-			if value is not None:
-				type_name = type(value).__name__
-				value_str = str(value) if not isinstance(value, str) else value
-
-				# Check if it's a function (starts with "(function" or "(async function")
-				is_function = value_str.strip().startswith('(function') or value_str.strip().startswith('(async function')
-
-				if is_function:
-					# For functions, only show name and type
-					detail = f'{var_name}({type_name})'
-				else:
-					# For non-functions, show first and last 20 chars
-					first_20 = value_str[:20].replace('\n', '\\n').replace('\t', '\\t')
-					last_20 = value_str[-20:].replace('\n', '\\n').replace('\t', '\\t') if len(value_str) > 20 else ''
-
-					if last_20 and first_20 != last_20:
-						detail = f'{var_name}({type_name}): "{first_20}...{last_20}"'
-					else:
-						detail = f'{var_name}({type_name}): "{first_20}"'
-				code_block_details.append(detail)
-
-		parts.append(f'**Code block variables:** {" | ".join(code_block_details)}')
-	if available_vars_sorted:
-		parts.append(f'**Variables:** {", ".join(available_vars_sorted)}')
-
-	lines.append(f'**Available:** {" | ".join(parts)}')
+	lines.append(variables.format_available() if variables is not None else format_available_variables(namespace))
 	lines.append('')
 
 	# Add DOM structure
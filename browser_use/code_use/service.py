@@ -33,6 +33,7 @@ from browser_use.tokens.views import UsageSummary
 from browser_use.tools.service import CodeAgentTools, Tools
 from browser_use.utils import get_browser_use_version
 
+from .executor import CellExecutor
 from .formatting import format_browser_state_for_llm
 from .namespace import EvaluateError, create_namespace
 from .utils import detect_token_limit_issue, extract_code_blocks, extract_url_from_task, truncate_message_content
@@ -160,6 +161,7 @@ class CodeAgent:
 
 		self.session = NotebookSession()
 		self.namespace: dict[str, Any] = {}
+		self._executor: CellExecutor | None = None  # Runs cells in self.namespace, see _cell_executor
 		self._llm_messages: list[BaseMessage] = []  # Internal LLM conversation history
 		self.complete_history: list[CodeAgentHistory] = []  # Type-safe history with model_output and result
 		self.dom_service: DomService | None = None
@@ -805,6 +807,13 @@ class CodeAgent:
 		else:
 			print(f'→ Variable: {var_name} ({type(value).__name__}, value={repr(value)[:50]})')
 
+	@property
+	def _cell_executor(self) -> CellExecutor:
+		"""Cell executor for the current namespace (recreated when the namespace is replaced)."""
+		if self._executor is None or self._executor.namespace is not self.namespace:
+			self._executor = CellExecutor(self.namespace)
+		return self._executor
+
 	async def _execute_code(self, code: str) -> tuple[str | None, str | None, str | None]:
 		"""
 		Execute Python code in the namespace.
@@ -826,7 +835,6 @@ class CodeAgent:
 
 		try:
 			# Capture output
-			import ast
 			import io
 			import sys
 
@@ -843,105 +851,9 @@ class CodeAgent:
 				# Store consecutive errors count for done() validation
 				self.namespace['_consecutive_errors'] = self._consecutive_errors
 
-				# Check if code contains await expressions - if so, wrap in async function
-				# This mimics how Jupyter/IPython handles top-level await
-				try:
-					tree = ast.parse(code, mode='exec')
-					has_await = any(isinstance(node, (ast.Await, ast.AsyncWith, ast.AsyncFor)) for node in ast.walk(tree))
-				except SyntaxError:
-					# If parse fails, let exec handle the error
-					has_await = False
-
-				if has_await:
-					# When code has await, we must wrap in async function
-					# To make variables persist naturally (like Jupyter without needing 'global'):
-					# 1. Extract all assigned variable names from the code
-					# 2. Inject 'global' declarations for variables that already exist in namespace
-					# 3. Extract user's explicit global declarations and pre-define those vars
-					# 4. Return locals() so we can update namespace with new variables
-
-					# Find all variable names being assigned + user's explicit globals
-					try:
-						assigned_names = set()
-						user_global_names = set()
-
-						for node in ast.walk(tree):
-							if isinstance(node, ast.Assign):
-								for target in node.targets:
-									if isinstance(target, ast.Name):
-										assigned_names.add(target.id)
-							elif isinstance(node, ast.AugAssign) and isinstance(node.target, ast.Name):
-								assigned_names.add(node.target.id)
-							elif isinstance(node, (ast.AnnAssign, ast.NamedExpr)):
-								if hasattr(node, 'target') and isinstance(node.target, ast.Name):
-									assigned_names.add(node.target.id)
-							elif isinstance(node, ast.Global):
-								# Track user's explicit global declarations
-								user_global_names.update(node.names)
-
-						# Pre-define any user-declared globals that don't exist yet
-						# This prevents NameError when user writes "global foo" before "foo = ..."
-						for name in user_global_names:
-							if name not in self.namespace:
-								self.namespace[name] = None
-
-						# Filter to only existing namespace vars (like Jupyter does)
-						# Include both: assigned vars that exist + user's explicit globals
-						existing_vars = {name for name in (assigned_names | user_global_names) if name in self.namespace}
-					except Exception as e:
-						existing_vars = set()
-
-					# Build global declaration if needed
-					global_decl = ''
-					has_global_decl = False
-					if existing_vars:
-						vars_str = ', '.join(sorted(existing_vars))
-						global_decl = f'    global {vars_str}\n'
-						has_global_decl = True
-
-					indented_code = '\n'.join('    ' + line if line.strip() else line for line in code.split('\n'))
-					wrapped_code = f"""async def __code_exec__():
-{global_decl}{indented_code}
-    # Return locals so we can update the namespace
-    return locals()
-
-__code_exec_coro__ = __code_exec__()
-"""
-					# Store whether we added a global declaration (needed for error line mapping)
-					self.namespace['_has_global_decl'] = has_global_decl
-
-					# Compile and execute wrapper at module level
-					compiled_code = compile(wrapped_code, '<code>', 'exec')
-					exec(compiled_code, self.namespace, self.namespace)
-
-					# Get and await the coroutine, then update namespace with new/modified variables
-					coro = self.namespace.get('__code_exec_coro__')
-					if coro:
-						result_locals = await coro
-						# Update namespace with all variables from the function's locals
-						# This makes variable assignments persist across cells
-						if result_locals:
-							for key, value in result_locals.items():
-								if not key.startswith('_'):
-									self.namespace[key] = value
-									# Variable info is tracked in "Available" section, no need for verbose inline output
-
-						# Clean up temporary variables
-						self.namespace.pop('__code_exec_coro__', None)
-						self.namespace.pop('__code_exec__', None)
-				else:
-					# No await - execute directly at module level for natural variable scoping
-					# This means x = x + 10 will work without needing 'global x'
-
-					# Track variables before execution
-					vars_before = set(self.namespace.keys())
-
-					compiled_code = compile(code, '<code>', 'exec')
-					exec(compiled_code, self.namespace, self.namespace)
-
-					# Track newly created/modified variables (info shown in "Available" section)
-					vars_after = set(self.namespace.keys())
-					new_vars = vars_after - vars_before
+				# Parsed and compiled once per distinct cell source; cells with top-level await
+				# run in an async wrapper so their variables persist like in Jupyter
+				await self._cell_executor.run(code)
 
 				# Get output
 				output_value = sys.stdout.getvalue()
@@ -1100,7 +1012,10 @@ __code_exec_coro__ = __code_exec__()
 
 			# Format browser state with namespace context
 			browser_state_text = await format_browser_state_for_llm(
-				state=state, namespace=self.namespace, browser_session=self.browser_session
+				state=state,
+				namespace=self.namespace,
+				browser_session=self.browser_session,
+				variables=self._cell_executor.tracker,
 			)
 
 			screenshot = state.screenshot if include_screenshot else None
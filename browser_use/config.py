@@ -224,6 +224,8 @@ class FlatEnvConfig(BaseSettings):
 	BROWSER_USE_HEADLESS: bool | None = Field(default=None)
 	BROWSER_USE_ALLOWED_DOMAINS: str | None = Field(default=None)
 	BROWSER_USE_LLM_MODEL: str | None = Field(default=None)
+	BROWSER_USE_MCP_MAX_SESSIONS: int = Field(default=4)
+	BROWSER_USE_MCP_WARM_SESSIONS: int = Field(default=0)
 
 	# Proxy env vars
 	BROWSER_USE_PROXY_URL: str | None = Field(default=None)
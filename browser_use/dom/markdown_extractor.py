@@ -3,6 +3,11 @@ Shared markdown extraction utilities for browser content processing.
 
 This module provides a unified interface for extracting clean markdown from browser content,
 used by both the tools service and page actor.
+
+On the browser session path the result is cached on the DOMWatchdog per
+(target, DOM version, extract_links), so paging through a long page with
+`start_from_char` or running several extractions on the same page converts the
+DOM to markdown once. The cache is dropped whenever the DOM tree is rebuilt.
 """
 
 import re
@@ -14,6 +19,7 @@ from browser_use.dom.service import DomService
 if TYPE_CHECKING:
 	from browser_use.browser.session import BrowserSession
 	from browser_use.browser.watchdogs.dom_watchdog import DOMWatchdog
+	from browser_use.dom.views import EnhancedDOMTreeNode
 
 
 async def extract_clean_markdown(
@@ -45,21 +51,55 @@ async def extract_clean_markdown(
 			raise ValueError('Cannot specify both browser_session and dom_service/target_id')
 		# Browser session path (tools service)
 		enhanced_dom_tree = await _get_enhanced_dom_tree_from_browser_session(browser_session)
+		dom_watchdog: DOMWatchdog = browser_session._dom_watchdog  # type: ignore[assignment]
+		cache_key = (browser_session.agent_focus_target_id, dom_watchdog.dom_version, extract_links)
+		cached = dom_watchdog.markdown_cache.get(cache_key)
+		if cached is not None:
+			content, stats = cached
+			return content, {**stats, 'cached': True}
+
 		current_url = await browser_session.get_current_page_url()
-		method = 'enhanced_dom_tree'
+		content, stats = html_tree_to_markdown(enhanced_dom_tree, extract_links=extract_links, method='enhanced_dom_tree')
+		if current_url:
+			stats['url'] = current_url
+		dom_watchdog.markdown_cache[cache_key] = (content, stats)
+		return content, {**stats}
 	elif dom_service is not None and target_id is not None:
 		# DOM service path (page actor)
 		# Lazy fetch all_frames inside get_dom_tree if needed (for cross-origin iframes)
 		enhanced_dom_tree, _ = await dom_service.get_dom_tree(target_id=target_id, all_frames=None)
-		current_url = None  # Not available via DOM service
-		method = 'dom_service'
+		return html_tree_to_markdown(enhanced_dom_tree, extract_links=extract_links, method='dom_service')
 	else:
 		raise ValueError('Must provide either browser_session or both dom_service and target_id')
 
-	# Use the HTML serializer with the enhanced DOM tree
+
+def html_tree_to_markdown(
+	enhanced_dom_tree: 'EnhancedDOMTreeNode', extract_links: bool = False, method: str = 'enhanced_dom_tree'
+) -> tuple[str, dict[str, Any]]:
+	"""Serialize an enhanced DOM tree to HTML and convert it to clean markdown.
+
+	Args:
+	    enhanced_dom_tree: Root of the enhanced DOM tree
+	    extract_links: Whether to preserve links in markdown
+	    method: Label recorded in the content statistics
+
+	Returns:
+	    tuple: (clean_markdown_content, content_statistics)
+	"""
 	html_serializer = HTMLSerializer(extract_links=extract_links)
-	page_html = html_serializer.serialize(enhanced_dom_tree)
+	return html_to_markdown(html_serializer.serialize(enhanced_dom_tree), method=method)
+
+
+def html_to_markdown(page_html: str, method: str = 'html') -> tuple[str, dict[str, Any]]:
+	"""Convert serialized page HTML to clean markdown.
+
+	Args:
+	    page_html: HTML produced by HTMLSerializer
+	    method: Label recorded in the content statistics
 
+	Returns:
+	    tuple: (clean_markdown_content, content_statistics)
+	"""
 	original_html_length = len(page_html)
 
 	# Use markdownify for clean markdown conversion
@@ -90,7 +130,7 @@ async def extract_clean_markdown(
 	final_filtered_length = len(content)
 
 	# Content statistics
-	stats = {
+	stats: dict[str, Any] = {
 		'method': method,
 		'original_html_chars': original_html_length,
 		'initial_markdown_chars': initial_markdown_length,
@@ -98,10 +138,6 @@ async def extract_clean_markdown(
 		'final_filtered_chars': final_filtered_length,
 	}
 
-	# Add URL to stats if available
-	if current_url:
-		stats['url'] = current_url
-
 	return content, stats
 
 
@@ -168,3 +204,39 @@ def _preprocess_markdown_content(content: str, max_newlines: int = 3) -> tuple[s
 
 	chars_filtered = original_length - len(content)
 	return content, chars_filtered
+
+
+# Break points for splitting markdown, most structural first: before a heading, then line, sentence and word ends
+_CHUNK_BREAKS: tuple[tuple[str, int], ...] = (('\n#', 1), ('\n', 1), ('. ', 2), (' ', 1))
+
+
+def split_markdown_chunks(content: str, max_chars: int) -> list[tuple[int, str]]:
+	"""
+	Split markdown into chunks of at most max_chars at structural boundaries.
+
+	Each cut is placed at the latest heading in the second half of the window,
+	falling back to a line, sentence or word end, and only cuts mid-word if the
+	window contains none of those.
+
+	Args:
+	    content: Markdown to split
+	    max_chars: Maximum chunk length
+
+	Returns:
+	    list: (start_offset, chunk_text) pairs covering the whole content in order
+	"""
+	chunks: list[tuple[int, str]] = []
+	start = 0
+	while len(content) - start > max_chars:
+		window_end = start + max_chars
+		cut = window_end
+		for separator, keep in _CHUNK_BREAKS:
+			index = content.rfind(separator, start + max_chars // 2, window_end - keep + len(separator))
+			if index > start:
+				cut = index + keep
+				break
+		chunks.append((start, content[start:cut]))
+		start = cut
+	if start < len(content):
+		chunks.append((start, content[start:]))
+	return chunks
@@ -4,6 +4,7 @@ from typing import Any
 
 from browser_use.dom.serializer.clickable_elements import ClickableElementDetector
 from browser_use.dom.serializer.paint_order import PaintOrderRemover
+from browser_use.dom.serializer.subtree_cache import SubtreeCache, SubtreeFragments
 from browser_use.dom.utils import cap_text_length
 from browser_use.dom.views import (
 	DOMRect,
@@ -54,6 +55,7 @@ class DOMTreeSerializer:
 		# {'tag': 'div', 'role': 'link'},     # <div role="link">
 		# {'tag': 'span', 'role': 'link'},    # <span role="link">
 	]
+	PROPAGATING_TAGS = frozenset(pattern['tag'] for pattern in PROPAGATING_ELEMENTS)
 	DEFAULT_CONTAINMENT_THRESHOLD = 0.99  # 99% containment by default
 
 	def __init__(
@@ -64,11 +66,17 @@ class DOMTreeSerializer:
 		containment_threshold: float | None = None,
 		paint_order_filtering: bool = True,
 		session_id: str | None = None,
+		subtree_cache: SubtreeCache | None = None,
 	):
 		self.root_node = root_node
 		self._interactive_counter = 1
 		self._selector_map: DOMSelectorMap = {}
 		self._previous_cached_selector_map = previous_cached_state.selector_map if previous_cached_state else None
+		self._previous_backend_node_ids = (
+			{node.backend_node_id for node in self._previous_cached_selector_map.values()}
+			if self._previous_cached_selector_map
+			else set()
+		)
 		# Add timing tracking
 		self.timing_info: dict[str, float] = {}
 		# Cache for clickable element detection to avoid redundant calls
@@ -80,6 +88,8 @@ class DOMTreeSerializer:
 		self.paint_order_filtering = paint_order_filtering
 		# Session ID for session-specific exclude attribute
 		self.session_id = session_id
+		# Reuse of unchanged subtrees across serializations (see subtree_cache.py)
+		self.subtree_cache = subtree_cache
 
 	def _safe_parse_number(self, value_str: str, default: float) -> float:
 		"""Parse string to float, handling negatives and decimals."""
@@ -108,19 +118,36 @@ class DOMTreeSerializer:
 		self._semantic_groups = []
 		self._clickable_cache = {}  # Clear cache for new serialization
 
+		if self.subtree_cache:
+			start_fingerprint = time.time()
+			self.subtree_cache.begin(self.root_node, self.session_id)
+			self.timing_info['subtree_fingerprint'] = time.time() - start_fingerprint
+
 		# Step 1: Create simplified tree (includes clickable element detection)
 		start_step1 = time.time()
 		simplified_tree = self._create_simplified_tree(self.root_node)
+		if self.subtree_cache:
+			self.subtree_cache.register_simplified(simplified_tree)
 		end_step1 = time.time()
 		self.timing_info['create_simplified_tree'] = end_step1 - start_step1
 
 		# Step 2: Remove elements based on paint order
 		start_step3 = time.time()
 		if self.paint_order_filtering and simplified_tree:
-			PaintOrderRemover(simplified_tree).calculate_paint_order()
+			# Skipped when no painted node moved, restyled or changed order since the previous serialization
+			if not (self.subtree_cache and self.subtree_cache.reuse_paint_order(simplified_tree)):
+				PaintOrderRemover(simplified_tree).calculate_paint_order()
+				if self.subtree_cache:
+					self.subtree_cache.record_paint_order()
 		end_step3 = time.time()
 		self.timing_info['calculate_paint_order'] = end_step3 - start_step3
 
+		# Take over processed subtrees that did not change; the next steps only walk the rest
+		if self.subtree_cache and simplified_tree:
+			start_freeze = time.time()
+			self.subtree_cache.freeze_unchanged(simplified_tree, self._propagated_bounds)
+			self.timing_info['subtree_freeze'] = time.time() - start_freeze
+
 		# Step 3: Optimize tree (remove unnecessary parents)
 		start_step2 = time.time()
 		optimized_tree = self._optimize_tree(simplified_tree)
@@ -142,10 +169,16 @@ class DOMTreeSerializer:
 		end_step4 = time.time()
 		self.timing_info['assign_interactive_indices'] = end_step4 - start_step4
 
+		fragments = None
+		if self.subtree_cache:
+			start_seal = time.time()
+			fragments = self.subtree_cache.seal(filtered_tree)
+			self.timing_info['subtree_fragment_keys'] = time.time() - start_seal
+
 		end_total = time.time()
 		self.timing_info['serialize_accessible_elements_total'] = end_total - start_total
 
-		return SerializedDOMState(_root=filtered_tree, selector_map=self._selector_map), self.timing_info
+		return SerializedDOMState(_root=filtered_tree, selector_map=self._selector_map, _fragments=fragments), self.timing_info
 
 	def _add_compound_components(self, simplified: SimplifiedNode, node: EnhancedDOMTreeNode) -> None:
 		"""Enhance compound controls with information from their child components."""
@@ -434,6 +467,20 @@ class DOMTreeSerializer:
 
 	def _create_simplified_tree(self, node: EnhancedDOMTreeNode, depth: int = 0) -> SimplifiedNode | None:
 		"""Step 1: Create a simplified tree with enhanced element detection."""
+		if self.subtree_cache is None or node.node_type != NodeType.ELEMENT_NODE:
+			return self._simplify_node(node, depth)
+
+		reused, simplified = self.subtree_cache.reuse_simplified(node)
+		if reused:
+			return simplified
+
+		simplified = self._simplify_node(node, depth)
+		if simplified is None:
+			self.subtree_cache.record_pruned(node)
+		return simplified
+
+	def _simplify_node(self, node: EnhancedDOMTreeNode, depth: int) -> SimplifiedNode | None:
+		"""Simplify one node, recursing into its children through the (cached) step 1 entry point."""
 
 		if node.node_type == NodeType.DOCUMENT_NODE:
 			# for all cldren including shadow roots
@@ -544,6 +591,11 @@ class DOMTreeSerializer:
 		if not node:
 			return None
 
+		if self.subtree_cache:
+			frozen, processed = self.subtree_cache.take_frozen(node)
+			if frozen:
+				return processed
+
 		# Process children
 		optimized_children = []
 		for child in node.children:
@@ -573,6 +625,8 @@ class DOMTreeSerializer:
 		):
 			return node
 
+		if self.subtree_cache:
+			self.subtree_cache.record_optimized_away(node)
 		return None
 
 	def _collect_interactive_elements(self, node: SimplifiedNode, elements: list[SimplifiedNode]) -> None:
@@ -619,6 +673,12 @@ class DOMTreeSerializer:
 		if not node:
 			return
 
+		if self.subtree_cache and self.subtree_cache.is_frozen(node):
+			# Unchanged subtree: same interactive elements, in the same order
+			for interactive_node in self.subtree_cache.frozen_interactive(node):
+				self._add_to_selector_map(interactive_node)
+			return
+
 		# Skip assigning index to excluded nodes, or ignored by paint order
 		if not node.excluded_by_parent and not node.ignored_by_paint_order:
 			# Regular interactive element assignment (including enhanced compound controls)
@@ -687,23 +747,26 @@ class DOMTreeSerializer:
 			if should_make_interactive:
 				# Mark node as interactive
 				node.is_interactive = True
-				# Store backend_node_id in selector map (model outputs backend_node_id)
-				self._selector_map[node.original_node.backend_node_id] = node.original_node
-				self._interactive_counter += 1
-
-				# Mark compound components as new for visibility
-				if node.is_compound_component:
-					node.is_new = True
-				elif self._previous_cached_selector_map:
-					# Check if node is new for regular elements
-					previous_backend_node_ids = {node.backend_node_id for node in self._previous_cached_selector_map.values()}
-					if node.original_node.backend_node_id not in previous_backend_node_ids:
-						node.is_new = True
+				self._add_to_selector_map(node)
 
 		# Process children
 		for child in node.children:
 			self._assign_interactive_indices_and_mark_new_nodes(child)
 
+	def _add_to_selector_map(self, node: SimplifiedNode) -> None:
+		"""Index an interactive node and mark it new if it wasn't in the previous selector map."""
+		# Store backend_node_id in selector map (model outputs backend_node_id)
+		self._selector_map[node.original_node.backend_node_id] = node.original_node
+		self._interactive_counter += 1
+
+		# Mark compound components as new for visibility
+		if node.is_compound_component:
+			node.is_new = True
+		elif self._previous_cached_selector_map:
+			# Check if node is new for regular elements
+			if node.original_node.backend_node_id not in self._previous_backend_node_ids:
+				node.is_new = True
+
 	def _apply_bounding_box_filtering(self, node: SimplifiedNode | None) -> SimplifiedNode | None:
 		"""Filter children contained within propagating parent bounds."""
 		if not node:
@@ -726,6 +789,8 @@ class DOMTreeSerializer:
 		Recursively filter tree with bounding box propagation.
 		Bounds propagate to ALL descendants until overridden.
 		"""
+		if self.subtree_cache and self.subtree_cache.is_frozen(node):
+			return  # Unchanged subtree in an unchanged context, already filtered
 
 		# Check if this node should be excluded by active bounds
 		if active_bounds and self._should_exclude_child(node, active_bounds):
@@ -733,30 +798,34 @@ class DOMTreeSerializer:
 			# Important: Still check if this node starts NEW propagation
 
 		# Check if this node starts new propagation (even if excluded!)
-		new_bounds = None
+		new_bounds = self._propagated_bounds(node, depth)
+
+		# Propagate to ALL children
+		# Use new_bounds if this node starts propagation, otherwise continue with active_bounds
+		propagate_bounds = new_bounds if new_bounds else active_bounds
+
+		for child in node.children:
+			self._filter_tree_recursive(child, propagate_bounds, depth + 1)
+
+	def _propagated_bounds(self, node: SimplifiedNode, depth: int = 0) -> PropagatingBounds | None:
+		"""Bounds this node propagates to ALL its descendants, if it matches a propagating element pattern."""
 		tag = node.original_node.tag_name.lower()
+		if tag not in self.PROPAGATING_TAGS:
+			return None
 		role = node.original_node.attributes.get('role') if node.original_node.attributes else None
 		attributes = {
 			'tag': tag,
 			'role': role,
 		}
-		# Check if this element matches any propagating element pattern
 		if self._is_propagating_element(attributes):
-			# This node propagates bounds to ALL its descendants
 			if node.original_node.snapshot_node and node.original_node.snapshot_node.bounds:
-				new_bounds = PropagatingBounds(
+				return PropagatingBounds(
 					tag=tag,
 					bounds=node.original_node.snapshot_node.bounds,
 					node_id=node.original_node.node_id,
 					depth=depth,
 				)
-
-		# Propagate to ALL children
-		# Use new_bounds if this node starts propagation, otherwise continue with active_bounds
-		propagate_bounds = new_bounds if new_bounds else active_bounds
-
-		for child in node.children:
-			self._filter_tree_recursive(child, propagate_bounds, depth + 1)
+		return None
 
 	def _should_exclude_child(self, node: SimplifiedNode, active_bounds: PropagatingBounds) -> bool:
 		"""
@@ -858,16 +927,36 @@ class DOMTreeSerializer:
 		return False
 
 	@staticmethod
-	def serialize_tree(node: SimplifiedNode | None, include_attributes: list[str], depth: int = 0) -> str:
-		"""Serialize the optimized tree to string format."""
+	def serialize_tree(
+		node: SimplifiedNode | None,
+		include_attributes: list[str],
+		depth: int = 0,
+		fragments: SubtreeFragments | None = None,
+	) -> str:
+		"""Serialize the optimized tree to string format, reusing text of unchanged subtrees when `fragments` is given."""
 		if not node:
 			return ''
 
+		key = fragments.key(node, include_attributes, depth) if fragments else None
+		if key is None:
+			return DOMTreeSerializer._serialize_node(node, include_attributes, depth, fragments)
+
+		assert fragments is not None
+		text = fragments.cache.get_fragment(key)
+		if text is None:
+			text = DOMTreeSerializer._serialize_node(node, include_attributes, depth, fragments)
+			fragments.cache.put_fragment(key, text)
+		return text
+
+	@staticmethod
+	def _serialize_node(
+		node: SimplifiedNode, include_attributes: list[str], depth: int, fragments: SubtreeFragments | None
+	) -> str:
 		# Skip rendering excluded nodes, but process their children
 		if hasattr(node, 'excluded_by_parent') and node.excluded_by_parent:
 			formatted_text = []
 			for child in node.children:
-				child_text = DOMTreeSerializer.serialize_tree(child, include_attributes, depth)
+				child_text = DOMTreeSerializer.serialize_tree(child, include_attributes, depth, fragments)
 				if child_text:
 					formatted_text.append(child_text)
 			return '\n'.join(formatted_text)
@@ -880,7 +969,7 @@ class DOMTreeSerializer:
 			# Skip displaying nodes marked as should_display=False
 			if not node.should_display:
 				for child in node.children:
-					child_text = DOMTreeSerializer.serialize_tree(child, include_attributes, depth)
+					child_text = DOMTreeSerializer.serialize_tree(child, include_attributes, depth, fragments)
 					if child_text:
 						formatted_text.append(child_text)
 				return '\n'.join(formatted_text)
@@ -1016,7 +1105,7 @@ class DOMTreeSerializer:
 
 			# Process shadow DOM children
 			for child in node.children:
-				child_text = DOMTreeSerializer.serialize_tree(child, include_attributes, next_depth)
+				child_text = DOMTreeSerializer.serialize_tree(child, include_attributes, next_depth, fragments)
 				if child_text:
 					formatted_text.append(child_text)
 
@@ -1039,7 +1128,7 @@ class DOMTreeSerializer:
 		# Process children (for non-shadow elements)
 		if node.original_node.node_type != NodeType.DOCUMENT_FRAGMENT_NODE:
 			for child in node.children:
-				child_text = DOMTreeSerializer.serialize_tree(child, include_attributes, next_depth)
+				child_text = DOMTreeSerializer.serialize_tree(child, include_attributes, next_depth, fragments)
 				if child_text:
 					formatted_text.append(child_text)
 
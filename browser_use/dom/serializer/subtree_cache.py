@@ -0,0 +1,617 @@
+# @file purpose: Memoizes DOM serializer work for subtrees that did not change between serializations
+"""
+Subtree-level memoization for DOMTreeSerializer.
+
+Between two agent steps most of a page is unchanged: a toast appears, a counter
+ticks, a list grows by one row. `SubtreeCache` fingerprints every node of the
+enhanced DOM tree bottom-up (structure, attributes, text, layout, AX data) and
+reuses the previous serialization's work for subtrees with the same fingerprint:
+
+1. simplified subtrees (step 1) are rebuilt from a cached skeleton instead of
+   re-running visibility, scrollability and compound-control detection
+2. paint-order filtering is global, since an overlay anywhere can hide elements
+   anywhere; its outcome is reused only when no painted node of the whole tree
+   moved, was restyled or changed paint order
+3. a subtree whose fingerprint, paint-order outcome and inherited context
+   (propagating parent bounds, scrollable parent, shadow DOM) all match is taken
+   over fully processed, so tree optimization, bounding-box filtering and index
+   assignment only walk the regions that changed
+4. text fragments of `llm_representation` are reused per subtree, keyed by its
+   content, every flag set on it and its depth
+
+Indices are backend node ids and reused subtrees are visited in the same order,
+so the selector map is identical to a fresh serialization's. New-element markers
+are recomputed for reused interactive nodes against the previous selector map.
+
+Fingerprinting and recording cost a few passes over the tree, so a step where
+the whole layout shifted is slower than without the cache; see
+tests/performance/benchmark_dom_subtree_cache.py. Entries are kept until they
+clearly outnumber the nodes of the current tree, then dropped all at once.
+
+**Usage:**
+	cache = SubtreeCache()  # one per browser session, reused across steps
+	state, timing = DOMTreeSerializer(root, previous_state, subtree_cache=cache).serialize_accessible_elements()
+	state.llm_representation()  # reuses text of unchanged subtrees
+	cache.stats.reused_rate, cache.stats.fragment_hit_rate
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from typing import Any
+
+from browser_use.dom.views import (
+	DOMRect,
+	EnhancedDOMTreeNode,
+	EnhancedSnapshotNode,
+	NodeType,
+	PropagatingBounds,
+	SimplifiedNode,
+)
+
+NodeKey = tuple[str, int]
+"""(target_id, backend_node_id), unique across the frames of one tree"""
+
+Context = tuple[tuple[float, float, float, float] | None, bool, bool]
+"""What a subtree inherits from its ancestors: (propagating bounds, parent scrolls, inside shadow DOM)"""
+
+
+@dataclass
+class SubtreeCacheStats:
+	"""Reuse counters for the latest serialization (fragment counters also cover its llm_representation calls)."""
+
+	simplified_reused: int = 0
+	simplified_built: int = 0
+	reused_nodes: int = 0
+	processed_nodes: int = 0
+	fragment_hits: int = 0
+	fragment_misses: int = 0
+
+	@property
+	def reused_rate(self) -> float:
+		"""Share of the final tree taken over from the previous serialization."""
+		total = self.reused_nodes + self.processed_nodes
+		return self.reused_nodes / total if total else 0.0
+
+	@property
+	def fragment_hit_rate(self) -> float:
+		total = self.fragment_hits + self.fragment_misses
+		return self.fragment_hits / total if total else 0.0
+
+
+@dataclass(slots=True)
+class _Skeleton:
+	"""Shape of a simplified subtree after step 1, pointing at nodes by key so it can be rebuilt on a new tree."""
+
+	key: NodeKey
+	is_shadow_host: bool
+	is_compound_component: bool
+	compound_children: list[dict[str, Any]] | None
+	children: tuple['_Skeleton', ...]
+
+
+@dataclass(slots=True)
+class _ProcessedSkeleton:
+	"""Shape and flags of a fully processed subtree (after optimization, bbox filtering and index assignment)."""
+
+	signature: int
+	context: Context
+	key: NodeKey
+	should_display: bool
+	is_interactive: bool
+	ignored_by_paint_order: bool
+	excluded_by_parent: bool
+	is_shadow_host: bool
+	is_compound_component: bool
+	children: tuple['_ProcessedSkeleton', ...]
+	size: int
+	state: int | None
+	"""Text fragment key of the subtree, valid while its interactive nodes keep `new_flags`"""
+	new_flags: tuple[bool, ...]
+	"""is_new of the subtree's interactive nodes in index order"""
+
+
+def _rect(rect: DOMRect | None) -> tuple[float, float, float, float] | None:
+	return (rect.x, rect.y, rect.width, rect.height) if rect else None
+
+
+def _snapshot_signature(snapshot: EnhancedSnapshotNode | None) -> tuple | None:
+	if snapshot is None:
+		return None
+	styles = snapshot.computed_styles
+	return (
+		snapshot.is_clickable,
+		snapshot.cursor_style,
+		_rect(snapshot.bounds),
+		_rect(snapshot.clientRects),
+		_rect(snapshot.scrollRects),
+		tuple(styles.items()) if styles else None,
+		snapshot.paint_order,
+		snapshot.stacking_contexts,
+	)
+
+
+def _parent_scrolls(node: EnhancedDOMTreeNode) -> bool:
+	# should_show_scroll_info looks at the parent, which is outside the subtree
+	parent = node.parent_node
+	return bool(parent and (parent.is_scrollable or parent.is_actually_scrollable))
+
+
+class SubtreeCache:
+	"""Per-session memo of serializer work, keyed by subtree content fingerprints."""
+
+	def __init__(self):
+		self.stats = SubtreeCacheStats()
+		self._session_id: str | None = None
+		# Kept across serializations; None marks a subtree that was pruned
+		self._skeletons: dict[int, _Skeleton | None] = {}
+		self._processed: dict[tuple[int, Context], _ProcessedSkeleton | None] = {}
+		self._fragments: dict[tuple, str] = {}
+		# Paint-order input of the previous serialization and the positions it ignored
+		self._paint_order: tuple[tuple, list[int]] | None = None
+		# Current tree only
+		self._fingerprints: dict[int, int] = {}
+		self._nodes: dict[NodeKey, EnhancedDOMTreeNode | None] = {}
+		self._reused_simplified: dict[int, _Skeleton] = {}
+		self._paint_nodes: list[SimplifiedNode] = []
+		self._paint_items: tuple = ()
+		self._parents: dict[int, SimplifiedNode] = {}
+		self._ignored_within: dict[int, list[NodeKey]] = {}
+		self._signatures: dict[int, int | None] = {}
+		self._contexts: dict[int, Context] = {}
+		self._frozen: dict[int, SimplifiedNode | None] = {}
+		self._frozen_roots: dict[int, tuple[_ProcessedSkeleton, list[SimplifiedNode]]] = {}
+
+	def begin(self, root: EnhancedDOMTreeNode, session_id: str | None) -> None:
+		"""Fingerprint a new tree; entries of earlier serializations stay available for reuse."""
+		if session_id != self._session_id:
+			# Exclude attributes are session specific, so another session's entries don't apply
+			self._session_id = session_id
+			self._skeletons, self._processed, self._fragments, self._paint_order = {}, {}, {}, None
+		self._fingerprints, self._nodes, self._reused_simplified = {}, {}, {}
+		self._paint_nodes, self._paint_items, self._parents, self._ignored_within = [], (), {}, {}
+		self._signatures, self._contexts, self._frozen, self._frozen_roots = {}, {}, {}, {}
+		self.stats = SubtreeCacheStats()
+		self._fingerprint(root)
+
+		# Entries of subtrees that are gone pile up; start over once they clearly outnumber the live ones
+		limit = 4 * len(self._nodes) + 1_000
+		for entries in (self._skeletons, self._processed, self._fragments):
+			if len(entries) > limit:
+				entries.clear()
+
+	def _fingerprint(self, node: EnhancedDOMTreeNode) -> int:
+		fingerprint_child = self._fingerprint
+		children = tuple([fingerprint_child(child) for child in node.children_nodes]) if node.children_nodes else None
+		shadow_roots = tuple([fingerprint_child(child) for child in node.shadow_roots]) if node.shadow_roots else None
+		content_document = fingerprint_child(node.content_document) if node.content_document else None
+
+		ax = node.ax_node
+		attributes = node.attributes
+		signature = (
+			node.node_type,
+			node.node_name,
+			node.node_value,
+			node.backend_node_id,
+			node.target_id,
+			tuple(attributes.items()) if attributes else None,
+			node.is_visible,
+			node.is_scrollable,
+			node.shadow_root_type,
+			_snapshot_signature(node.snapshot_node),
+			(
+				ax.ignored,
+				ax.role,
+				ax.name,
+				ax.description,
+				tuple([(prop.name, prop.value) for prop in ax.properties]) if ax.properties else None,
+				len(ax.child_ids) if ax.child_ids else 0,
+			)
+			if ax
+			else None,
+			children,
+			shadow_roots,
+			content_document,
+		)
+		try:
+			fingerprint = hash(signature)
+		except TypeError:
+			# Unhashable AX property values (lists, dicts)
+			fingerprint = hash(repr(signature))
+
+		self._fingerprints[id(node)] = fingerprint
+		key = (node.target_id, node.backend_node_id)
+		# A key seen twice can't be resolved when rebuilding, so subtrees containing it are never reused
+		self._nodes[key] = None if key in self._nodes else node
+		return fingerprint
+
+	def _resolve(self, key: NodeKey) -> EnhancedDOMTreeNode | None:
+		return self._nodes.get(key)
+
+	# region - step 1: simplified subtrees
+
+	def reuse_simplified(self, node: EnhancedDOMTreeNode) -> tuple[bool, SimplifiedNode | None]:
+		"""Rebuild the simplified subtree of an unchanged node.
+
+		Returns:
+			(True, subtree or None if the subtree is pruned) on a hit, (False, None) on a miss
+		"""
+		fingerprint = self._fingerprints.get(id(node))
+		if fingerprint is None or fingerprint not in self._skeletons:
+			return False, None
+
+		skeleton = self._skeletons[fingerprint]
+		if skeleton is None:
+			return True, None
+
+		compound: list[tuple[EnhancedDOMTreeNode, list[dict[str, Any]]]] = []
+		simplified = self._rebuild_simplified(skeleton, compound)
+		if simplified is None:
+			return False, None
+		# Only once the whole subtree resolved, so a failed rebuild leaves the new tree untouched
+		for compound_node, compound_children in compound:
+			compound_node._compound_children.extend(compound_children)
+		self._reused_simplified[id(simplified)] = skeleton
+		return True, simplified
+
+	def _rebuild_simplified(
+		self, skeleton: _Skeleton, compound: list[tuple[EnhancedDOMTreeNode, list[dict[str, Any]]]]
+	) -> SimplifiedNode | None:
+		node = self._nodes.get(skeleton.key)
+		if node is None:
+			return None
+		children = []
+		for child_skeleton in skeleton.children:
+			child = self._rebuild_simplified(child_skeleton, compound)
+			if child is None:
+				return None
+			children.append(child)
+		if skeleton.compound_children:
+			compound.append((node, skeleton.compound_children))
+		self.stats.simplified_reused += 1
+		return SimplifiedNode(
+			original_node=node,
+			children=children,
+			is_shadow_host=skeleton.is_shadow_host,
+			is_compound_component=skeleton.is_compound_component,
+		)
+
+	def record_pruned(self, node: EnhancedDOMTreeNode) -> None:
+		"""Remember that a node's subtree produced no simplified node."""
+		fingerprint = self._fingerprints.get(id(node))
+		if fingerprint is not None:
+			self._skeletons[fingerprint] = None
+
+	def register_simplified(self, root: SimplifiedNode | None) -> None:
+		"""Store skeletons of the newly built parts of the step 1 tree; must run before later passes reshape it."""
+		if root is not None:
+			self._register_simplified(root)
+
+	def _register_simplified(self, simplified: SimplifiedNode) -> _Skeleton | None:
+		reused = self._reused_simplified.get(id(simplified))
+		if reused is not None:
+			return reused
+
+		self.stats.simplified_built += 1
+		children = [self._register_simplified(child) for child in simplified.children]
+		node = simplified.original_node
+		fingerprint = self._fingerprints.get(id(node))
+		key = (node.target_id, node.backend_node_id)
+		if fingerprint is None or self._resolve(key) is not node or None in children:
+			return None
+
+		skeleton = _Skeleton(
+			key,
+			simplified.is_shadow_host,
+			simplified.is_compound_component,
+			list(node._compound_children) or None,
+			tuple(children),  # type: ignore[arg-type]
+		)
+		if node.node_type == NodeType.ELEMENT_NODE:
+			self._skeletons[fingerprint] = skeleton
+		return skeleton
+
+	# endregion
+
+	# region - step 2: paint order
+
+	def reuse_paint_order(self, root: SimplifiedNode) -> bool:
+		"""Apply the previous paint-order outcome if no painted node moved, restyled or changed order.
+
+		Returns:
+			True if the flags were applied, False if `PaintOrderRemover` has to run (then call `record_paint_order`)
+		"""
+		self._paint_nodes, items = [], []
+		self._collect_paint_order(root, items)
+		self._paint_items = tuple(items)
+		if self._paint_order is None or self._paint_order[0] != self._paint_items:
+			return False
+		for position in self._paint_order[1]:
+			self._paint_nodes[position].ignored_by_paint_order = True
+		self._mark_ignored(self._paint_order[1])
+		return True
+
+	def record_paint_order(self) -> None:
+		"""Remember the outcome of a full paint-order pass for the next serialization."""
+		positions = [position for position, node in enumerate(self._paint_nodes) if node.ignored_by_paint_order]
+		self._paint_order = (self._paint_items, positions)
+		self._mark_ignored(positions)
+
+	def _collect_paint_order(self, simplified: SimplifiedNode, items: list[tuple]) -> None:
+		# Same selection and order as PaintOrderRemover, plus everything its outcome depends on
+		snapshot = simplified.original_node.snapshot_node
+		if snapshot and snapshot.paint_order is not None and snapshot.bounds is not None:
+			bounds = snapshot.bounds
+			styles = snapshot.computed_styles
+			self._paint_nodes.append(simplified)
+			items.append(
+				(
+					snapshot.paint_order,
+					bounds.x,
+					bounds.y,
+					bounds.width,
+					bounds.height,
+					styles.get('background-color') if styles else None,
+					styles.get('opacity') if styles else None,
+				)
+			)
+		for child in simplified.children:
+			self._parents[id(child)] = simplified
+			self._collect_paint_order(child, items)
+
+	def _mark_ignored(self, positions: list[int]) -> None:
+		# Ignored nodes are usually few, so walking up from each is cheaper than signing every subtree
+		for position in positions:
+			current: SimplifiedNode | None = self._paint_nodes[position]
+			node = current.original_node  # type: ignore[union-attr]
+			key = (node.target_id, node.backend_node_id)
+			while current is not None:
+				self._ignored_within.setdefault(id(current), []).append(key)
+				current = self._parents.get(id(current))
+
+	# endregion
+
+	# region - steps 3-4: processed subtrees
+
+	def freeze_unchanged(
+		self,
+		root: SimplifiedNode,
+		propagated_bounds: Callable[[SimplifiedNode], PropagatingBounds | None],
+	) -> None:
+		"""After paint-order filtering, take over processed subtrees whose signature and context are unchanged.
+
+		Args:
+			root: The step 1 tree with paint-order flags set
+			propagated_bounds: Bounds a node hands down to its descendants in bounding-box filtering
+		"""
+		self._freeze(root, None, False, propagated_bounds)
+
+	def _freeze(
+		self,
+		simplified: SimplifiedNode,
+		active_bounds: PropagatingBounds | None,
+		in_shadow: bool,
+		propagated_bounds: Callable[[SimplifiedNode], PropagatingBounds | None],
+	) -> None:
+		node = simplified.original_node
+		context: Context = (_rect(active_bounds.bounds) if active_bounds else None, _parent_scrolls(node), in_shadow)
+		self._contexts[id(simplified)] = context
+
+		# Content plus paint-order outcome of the subtree
+		signature = self._fingerprints.get(id(node))
+		ignored = self._ignored_within.get(id(simplified))
+		if signature is not None and ignored:
+			signature = hash((signature, tuple(ignored)))
+		self._signatures[id(simplified)] = signature
+
+		if signature is not None and (signature, context) in self._processed:
+			skeleton = self._processed[(signature, context)]
+			if skeleton is None:
+				self._frozen[id(simplified)] = None
+				return
+			interactive: list[SimplifiedNode] = []
+			if self._take_over(simplified, skeleton, interactive):
+				self._frozen[id(simplified)] = simplified
+				self._frozen_roots[id(simplified)] = (skeleton, interactive)
+				return
+
+		child_bounds = propagated_bounds(simplified) or active_bounds
+		child_in_shadow = in_shadow or (node.node_type == NodeType.DOCUMENT_FRAGMENT_NODE and node.shadow_root_type is not None)
+		for child in simplified.children:
+			self._freeze(child, child_bounds, child_in_shadow, propagated_bounds)
+
+	def _take_over(self, simplified: SimplifiedNode, skeleton: _ProcessedSkeleton, interactive: list[SimplifiedNode]) -> bool:
+		# Processing only drops subtrees and sets flags, so the step 1 nodes are reused in place
+		plan: list[tuple[SimplifiedNode, _ProcessedSkeleton, list[SimplifiedNode]]] = []
+		if not self._match_processed(simplified, skeleton, plan, interactive):
+			return False
+		# Applied only once the whole subtree matched, so a failed match leaves the tree untouched
+		for node, node_skeleton, children in plan:
+			node.children = children
+			node.should_display = node_skeleton.should_display
+			node.is_interactive = node_skeleton.is_interactive
+			node.excluded_by_parent = node_skeleton.excluded_by_parent
+		return True
+
+	def _match_processed(
+		self,
+		simplified: SimplifiedNode,
+		skeleton: _ProcessedSkeleton,
+		plan: list[tuple[SimplifiedNode, _ProcessedSkeleton, list[SimplifiedNode]]],
+		interactive: list[SimplifiedNode],
+	) -> bool:
+		node = simplified.original_node
+		if (node.target_id, node.backend_node_id) != skeleton.key:
+			return False
+		if skeleton.is_interactive:
+			interactive.append(simplified)  # preorder, like index assignment
+		kept = []
+		candidates = iter(simplified.children)
+		for child_skeleton in skeleton.children:
+			# The processed children are the step 1 children minus the optimized-away ones, in order
+			for child in candidates:
+				if (child.original_node.target_id, child.original_node.backend_node_id) == child_skeleton.key:
+					break
+			else:
+				return False
+			if not self._match_processed(child, child_skeleton, plan, interactive):
+				return False
+			kept.append(child)
+		plan.append((simplified, skeleton, kept))
+		return True
+
+	def take_frozen(self, simplified: SimplifiedNode) -> tuple[bool, SimplifiedNode | None]:
+		"""The processed replacement for a step 1 node, if it was frozen: (True, subtree or None if pruned)."""
+		if id(simplified) not in self._frozen:
+			return False, None
+		return True, self._frozen[id(simplified)]
+
+	def record_optimized_away(self, simplified: SimplifiedNode) -> None:
+		"""Remember that tree optimization removed a node's whole subtree."""
+		signature = self._signatures.get(id(simplified))
+		context = self._contexts.get(id(simplified))
+		if signature is not None and context is not None:
+			self._processed[(signature, context)] = None
+
+	def is_frozen(self, simplified: SimplifiedNode) -> bool:
+		return id(simplified) in self._frozen_roots
+
+	def frozen_interactive(self, simplified: SimplifiedNode) -> list[SimplifiedNode]:
+		"""Interactive nodes of a frozen subtree in index assignment order."""
+		return self._frozen_roots[id(simplified)][1]
+
+	# endregion
+
+	# region - text fragments
+
+	def seal(self, root: SimplifiedNode | None) -> 'SubtreeFragments':
+		"""Store processed skeletons of the changed regions and key their subtrees for text fragment reuse."""
+		states: dict[int, int] = {}
+		if root is not None:
+			self._seal(root, states)
+		return SubtreeFragments(self, states)
+
+	def _seal(self, simplified: SimplifiedNode, states: dict[int, int]) -> _ProcessedSkeleton | None:
+		frozen = self._frozen_roots.get(id(simplified))
+		if frozen is not None:
+			skeleton, interactive = frozen
+			if tuple([node.is_new for node in interactive]) != skeleton.new_flags:
+				# Elements stopped (or started) being new, which shows in the text
+				skeleton = self._reseal(simplified, skeleton, states)
+			elif skeleton.state is not None:
+				states[id(simplified)] = skeleton.state
+			self.stats.reused_nodes += skeleton.size
+			return skeleton
+
+		self.stats.processed_nodes += 1
+		children = [self._seal(child, states) for child in simplified.children]
+		node = simplified.original_node
+		fingerprint = self._fingerprints.get(id(node))
+		context = self._contexts.get(id(simplified))
+		key = (node.target_id, node.backend_node_id)
+		if fingerprint is None or context is None or None in children or self._nodes.get(key) is not node:
+			return None
+
+		state = self._state(simplified, fingerprint, context, children, states)  # type: ignore[arg-type]
+		size = 1
+		new_flags = [simplified.is_new] if simplified.is_interactive else []
+		for child in children:
+			size += child.size  # type: ignore[union-attr]
+			new_flags.extend(child.new_flags)  # type: ignore[union-attr]
+		signature = self._signatures[id(simplified)]
+		# Positional: this runs for every changed node, keyword arguments are measurably slower
+		skeleton = _ProcessedSkeleton(
+			signature,  # type: ignore[arg-type]
+			context,
+			key,
+			simplified.should_display,
+			simplified.is_interactive,
+			simplified.ignored_by_paint_order,
+			simplified.excluded_by_parent,
+			simplified.is_shadow_host,
+			simplified.is_compound_component,
+			tuple(children),  # type: ignore[arg-type]
+			size,
+			state,
+			tuple(new_flags),
+		)
+		if signature is not None:
+			self._processed[(signature, context)] = skeleton
+		return skeleton
+
+	def _reseal(self, simplified: SimplifiedNode, skeleton: _ProcessedSkeleton, states: dict[int, int]) -> _ProcessedSkeleton:
+		children = [
+			self._reseal(child, child_skeleton, states) for child, child_skeleton in zip(simplified.children, skeleton.children)
+		]
+		new_flags = [simplified.is_new] if simplified.is_interactive else []
+		for child in children:
+			new_flags.extend(child.new_flags)
+		fingerprint = self._fingerprints[id(simplified.original_node)]
+		resealed = replace(
+			skeleton,
+			children=tuple(children),
+			state=self._state(simplified, fingerprint, skeleton.context, children, states),
+			new_flags=tuple(new_flags),
+		)
+		self._processed[(skeleton.signature, skeleton.context)] = resealed
+		return resealed
+
+	@staticmethod
+	def _state(
+		simplified: SimplifiedNode,
+		fingerprint: int,
+		context: Context,
+		children: list[_ProcessedSkeleton],
+		states: dict[int, int],
+	) -> int | None:
+		child_states = tuple([child.state for child in children])
+		if None in child_states:
+			return None
+		state = hash(
+			(
+				fingerprint,
+				context[1],  # parent scrolls
+				simplified.should_display,
+				simplified.is_interactive,
+				simplified.is_new,
+				simplified.excluded_by_parent,
+				simplified.is_shadow_host,
+				child_states,
+			)
+		)
+		states[id(simplified)] = state
+		return state
+
+	def get_fragment(self, key: tuple) -> str | None:
+		text = self._fragments.get(key)
+		if text is None:
+			self.stats.fragment_misses += 1
+		else:
+			self.stats.fragment_hits += 1
+		return text
+
+	def put_fragment(self, key: tuple, text: str) -> None:
+		self._fragments[key] = text
+
+	# endregion
+
+
+class SubtreeFragments:
+	"""Fragment keys for one serialized tree; handed to `DOMTreeSerializer.serialize_tree` via SerializedDOMState."""
+
+	def __init__(self, cache: SubtreeCache, states: dict[int, int]):
+		self.cache = cache
+		self.states = states
+		self._include_attributes: list[str] | None = None
+		self._include_attributes_key: tuple[str, ...] = ()
+
+	def key(self, node: SimplifiedNode, include_attributes: list[str], depth: int) -> tuple | None:
+		"""Cache key for a subtree's text, or None for leaves and subtrees that can't be keyed."""
+		if not node.children:
+			return None  # Leaves are cheaper to render than to look up
+		state = self.states.get(id(node))
+		if state is None:
+			return None
+		if include_attributes is not self._include_attributes:
+			self._include_attributes = include_attributes
+			self._include_attributes_key = tuple(include_attributes)
+		return (state, depth, self._include_attributes_key)
@@ -1,6 +1,7 @@
 import asyncio
 import logging
 import time
+from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 from cdp_use.cdp.accessibility.commands import GetFullAXTreeReturns
@@ -13,6 +14,7 @@ from browser_use.dom.enhanced_snapshot import (
 	build_snapshot_lookup,
 )
 from browser_use.dom.serializer.serializer import DOMTreeSerializer
+from browser_use.dom.serializer.subtree_cache import SubtreeCache
 from browser_use.dom.views import (
 	DOMRect,
 	EnhancedAXNode,
@@ -31,6 +33,27 @@ if TYPE_CHECKING:
 # Note: iframe limits are now configurable via BrowserProfile.max_iframes and BrowserProfile.max_iframe_depth
 
 
+@dataclass
+class _IframeBudget:
+	"""Fan-out limit and deadline shared by every cross-origin iframe fetched during one DOM build."""
+
+	semaphore: asyncio.Semaphore
+	deadline: float  # time.monotonic() after which unfinished frames are dropped
+
+	@property
+	def remaining(self) -> float:
+		return max(0.0, self.deadline - time.monotonic())
+
+
+@dataclass
+class _PendingIframe:
+	"""A cross-origin iframe whose content document is being collected in the background."""
+
+	node: EnhancedDOMTreeNode
+	target_id: str
+	task: asyncio.Task[tuple[EnhancedDOMTreeNode, dict[str, float]]]
+
+
 class DomService:
 	"""
 	Service for getting the DOM tree and other DOM-related information.
@@ -50,6 +73,9 @@ class DomService:
 		paint_order_filtering: bool = True,
 		max_iframes: int = 100,
 		max_iframe_depth: int = 5,
+		max_parallel_iframes: int = 4,
+		iframe_timeout: float = 10.0,
+		cache_subtrees: bool = False,
 	):
 		self.browser_session = browser_session
 		self.logger = logger or browser_session.logger
@@ -57,6 +83,10 @@ class DomService:
 		self.paint_order_filtering = paint_order_filtering
 		self.max_iframes = max_iframes
 		self.max_iframe_depth = max_iframe_depth
+		self.max_parallel_iframes = max_parallel_iframes
+		self.iframe_timeout = iframe_timeout
+		# Only worth it for a long-lived service that serializes the same page repeatedly
+		self.subtree_cache = SubtreeCache() if cache_subtrees else None
 
 	async def __aenter__(self):
 		return self
@@ -326,51 +356,15 @@ class DomService:
 			'device_pixel_ratio': create_task_with_error_handling(self._get_viewport_ratio(target_id), name='get_viewport_ratio'),
 		}
 
-		# Wait for all tasks with timeout
-		done, pending = await asyncio.wait(tasks.values(), timeout=10.0)
-
-		# Retry any failed or timed out tasks
-		if pending:
-			for task in pending:
+		try:
+			results, failed = await self._wait_for_tree_requests(
+				tasks, create_snapshot_request, create_dom_tree_request, target_id
+			)
+		except asyncio.CancelledError:
+			# Cancelled iframe fetch (out of budget): don't leave its CDP requests running
+			for task in tasks.values():
 				task.cancel()
-
-			# Retry mapping for pending tasks
-			retry_map = {
-				tasks['snapshot']: lambda: create_task_with_error_handling(create_snapshot_request(), name='get_snapshot_retry'),
-				tasks['dom_tree']: lambda: create_task_with_error_handling(create_dom_tree_request(), name='get_dom_tree_retry'),
-				tasks['ax_tree']: lambda: create_task_with_error_handling(
-					self._get_ax_tree_for_all_frames(target_id), name='get_ax_tree_retry'
-				),
-				tasks['device_pixel_ratio']: lambda: create_task_with_error_handling(
-					self._get_viewport_ratio(target_id), name='get_viewport_ratio_retry'
-				),
-			}
-
-			# Create new tasks only for the ones that didn't complete
-			for key, task in tasks.items():
-				if task in pending and task in retry_map:
-					tasks[key] = retry_map[task]()
-
-			# Wait again with shorter timeout
-			done2, pending2 = await asyncio.wait([t for t in tasks.values() if not t.done()], timeout=2.0)
-
-			if pending2:
-				for task in pending2:
-					task.cancel()
-
-		# Extract results, tracking which ones failed
-		results = {}
-		failed = []
-		for key, task in tasks.items():
-			if task.done() and not task.cancelled():
-				try:
-					results[key] = task.result()
-				except Exception as e:
-					self.logger.warning(f'CDP request {key} failed with exception: {e}')
-					failed.append(key)
-			else:
-				self.logger.warning(f'CDP request {key} timed out')
-				failed.append(key)
+			raise
 
 		# If any required tasks failed, raise an exception
 		if failed:
@@ -420,6 +414,57 @@ class DomService:
 			},
 		)
 
+	async def _wait_for_tree_requests(
+		self, tasks: dict[str, asyncio.Task], create_snapshot_request, create_dom_tree_request, target_id: TargetID
+	) -> tuple[dict, list[str]]:
+		"""Wait for the tree requests, retrying once any that time out. Returns (results, failed request names)."""
+		# Wait for all tasks with timeout
+		done, pending = await asyncio.wait(tasks.values(), timeout=10.0)
+
+		# Retry any failed or timed out tasks
+		if pending:
+			for task in pending:
+				task.cancel()
+
+			# Retry mapping for pending tasks
+			retry_map = {
+				tasks['snapshot']: lambda: create_task_with_error_handling(create_snapshot_request(), name='get_snapshot_retry'),
+				tasks['dom_tree']: lambda: create_task_with_error_handling(create_dom_tree_request(), name='get_dom_tree_retry'),
+				tasks['ax_tree']: lambda: create_task_with_error_handling(
+					self._get_ax_tree_for_all_frames(target_id), name='get_ax_tree_retry'
+				),
+				tasks['device_pixel_ratio']: lambda: create_task_with_error_handling(
+					self._get_viewport_ratio(target_id), name='get_viewport_ratio_retry'
+				),
+			}
+
+			# Create new tasks only for the ones that didn't complete
+			for key, task in tasks.items():
+				if task in pending and task in retry_map:
+					tasks[key] = retry_map[task]()
+
+			# Wait again with shorter timeout
+			done2, pending2 = await asyncio.wait([t for t in tasks.values() if not t.done()], timeout=2.0)
+
+			if pending2:
+				for task in pending2:
+					task.cancel()
+
+		# Extract results, tracking which ones failed
+		results = {}
+		failed = []
+		for key, task in tasks.items():
+			if task.done() and not task.cancelled():
+				try:
+					results[key] = task.result()
+				except Exception as e:
+					self.logger.warning(f'CDP request {key} failed with exception: {e}')
+					failed.append(key)
+			else:
+				self.logger.warning(f'CDP request {key} timed out')
+				failed.append(key)
+		return results, failed
+
 	@observe_debug(ignore_input=True, ignore_output=True, name='get_dom_tree')
 	async def get_dom_tree(
 		self,
@@ -428,25 +473,44 @@ class DomService:
 		initial_html_frames: list[EnhancedDOMTreeNode] | None = None,
 		initial_total_frame_offset: DOMRect | None = None,
 		iframe_depth: int = 0,
+		iframe_budget: _IframeBudget | None = None,
 	) -> tuple[EnhancedDOMTreeNode, dict[str, float]]:
 		"""Get the DOM tree for a specific target.
 
+		Visible cross-origin iframes are collected concurrently while the tree is built and grafted
+		in at the end. All of them share one fan-out limit (max_parallel_iframes) and one deadline
+		(iframe_timeout); frames that miss it are left without a content document.
+
 		Args:
 			target_id: Target ID of the page to get the DOM tree for.
 			all_frames: Pre-fetched frame hierarchy to avoid redundant CDP calls (optional, lazy fetch if None)
 			initial_html_frames: List of HTML frame nodes encountered so far
 			initial_total_frame_offset: Accumulated coordinate offset
 			iframe_depth: Current depth of iframe nesting to prevent infinite recursion
+			iframe_budget: Budget shared with the parent document (created for the top-level call)
 
 		Returns:
-			Tuple of (enhanced_dom_tree_node, timing_info)
+			Tuple of (enhanced_dom_tree_node, timing_info). timing_info includes
+			'cross_origin_iframes_ms' and a 'cross_origin_iframe_<target id>_ms' entry per collected frame.
 		"""
 		timing_info: dict[str, float] = {}
 		timing_start_total = time.time()
+		if iframe_budget is None:
+			iframe_budget = _IframeBudget(asyncio.Semaphore(self.max_parallel_iframes), time.monotonic() + self.iframe_timeout)
+		pending_iframes: list[_PendingIframe] = []
 
 		# Get all trees from CDP (snapshot, DOM, AX, viewport ratio)
 		start_get_trees = time.time()
-		trees = await self._get_all_trees(target_id)
+		if iframe_depth > 0:
+			# Iframe documents hold a fan-out slot only while their CDP requests are in flight,
+			# and those requests must finish within the budget shared by the whole DOM build
+			async with iframe_budget.semaphore:
+				try:
+					trees = await asyncio.wait_for(self._get_all_trees(target_id), timeout=iframe_budget.remaining)
+				except TimeoutError:
+					raise TimeoutError(f'iframe budget of {self.iframe_timeout:.0f}s used up') from None
+		else:
+			trees = await self._get_all_trees(target_id)
 		get_trees_ms = (time.time() - start_get_trees) * 1000
 		timing_info.update(trees.cdp_timing)
 		timing_info['get_all_trees_total_ms'] = get_trees_ms
@@ -486,6 +550,7 @@ class DomService:
 				total_frame_offset: Accumulated coordinate translation from parent iframes (includes scroll corrections)
 				all_frames: Pre-fetched frame hierarchy to avoid redundant CDP calls
 			"""
+			nonlocal frames_for_iframes
 
 			# Initialize lists if not provided
 			if html_frames is None:
@@ -706,9 +771,11 @@ class DomService:
 						self.logger.debug('Skipping invisible cross-origin iframe')
 
 					if should_process_iframe:
-						# Lazy fetch all_frames only when actually needed (for cross-origin iframes)
+						# Lazy fetch all_frames only when actually needed (for cross-origin iframes), once per document
 						if all_frames is None:
-							all_frames, _ = await self.browser_session.get_all_frames()
+							if frames_for_iframes is None:
+								frames_for_iframes, _ = await self.browser_session.get_all_frames()
+							all_frames = frames_for_iframes
 
 						# Use pre-fetched all_frames to find the iframe's target (no redundant CDP call)
 						frame_id = node.get('frameId', None)
@@ -727,35 +794,50 @@ class DomService:
 									}
 						else:
 							iframe_document_target = None
-						# if target actually exists in one of the frames, just recursively build the dom tree for it
+						# if target actually exists in one of the frames, build its dom tree in the background
+						# and graft it onto this node once the rest of the document is constructed
 						if iframe_document_target:
 							self.logger.debug(
 								f'Getting content document for iframe {node.get("frameId", None)} at depth {iframe_depth + 1}'
 							)
-							content_document, _ = await self.get_dom_tree(
-								target_id=iframe_document_target['targetId'],
-								all_frames=all_frames,
-								# TODO: experiment with this values -> not sure whether the whole cross origin iframe should be ALWAYS included as soon as some part of it is visible or not.
-								# Current config: if the cross origin iframe is AT ALL visible, then just include everything inside of it!
-								# initial_html_frames=updated_html_frames,
-								initial_total_frame_offset=total_frame_offset,
-								iframe_depth=iframe_depth + 1,
+							iframe_target_id = iframe_document_target['targetId']
+							task = asyncio.create_task(
+								self.get_dom_tree(
+									target_id=iframe_target_id,
+									all_frames=all_frames,
+									# TODO: experiment with this values -> not sure whether the whole cross origin iframe should be ALWAYS included as soon as some part of it is visible or not.
+									# Current config: if the cross origin iframe is AT ALL visible, then just include everything inside of it!
+									# initial_html_frames=updated_html_frames,
+									initial_total_frame_offset=total_frame_offset,
+									iframe_depth=iframe_depth + 1,
+									iframe_budget=iframe_budget,
+								),
+								name=f'get_iframe_dom_tree_{iframe_target_id[-4:]}',
 							)
-
-							dom_tree_node.content_document = content_document
-							dom_tree_node.content_document.parent_node = dom_tree_node
+							pending_iframes.append(_PendingIframe(node=dom_tree_node, target_id=iframe_target_id, task=task))
 
 			return dom_tree_node
 
 		# Build enhanced DOM tree recursively
 		# Note: all_frames stays None and will be lazily fetched inside _construct_enhanced_node
 		# only if/when a cross-origin iframe is encountered
+		frames_for_iframes: dict | None = None
 		start_construct = time.time()
-		enhanced_dom_tree_node = await _construct_enhanced_node(
-			dom_tree['root'], initial_html_frames, initial_total_frame_offset, all_frames
-		)
+		try:
+			enhanced_dom_tree_node = await _construct_enhanced_node(
+				dom_tree['root'], initial_html_frames, initial_total_frame_offset, all_frames
+			)
+		except BaseException:
+			for pending in pending_iframes:
+				pending.task.cancel()
+			raise
 		timing_info['construct_enhanced_tree_ms'] = (time.time() - start_construct) * 1000
 
+		if pending_iframes:
+			start_iframes = time.time()
+			await self._graft_iframe_documents(pending_iframes, timing_info)
+			timing_info['cross_origin_iframes_ms'] = (time.time() - start_iframes) * 1000
+
 		# Calculate total time for get_dom_tree
 		total_get_dom_tree_ms = (time.time() - timing_start_total) * 1000
 		timing_info['get_dom_tree_total_ms'] = total_get_dom_tree_ms
@@ -766,6 +848,7 @@ class DomService:
 			+ timing_info.get('build_ax_lookup_ms', 0)
 			+ timing_info.get('build_snapshot_lookup_ms', 0)
 			+ timing_info.get('construct_enhanced_tree_ms', 0)
+			+ timing_info.get('cross_origin_iframes_ms', 0)
 		)
 		get_dom_tree_overhead_ms = total_get_dom_tree_ms - tracked_sub_operations_ms
 		if get_dom_tree_overhead_ms > 0.1:
@@ -773,6 +856,32 @@ class DomService:
 
 		return enhanced_dom_tree_node, timing_info
 
+	async def _graft_iframe_documents(self, pending_iframes: list[_PendingIframe], timing_info: dict[str, float]) -> None:
+		"""Wait for background iframe trees and attach them to their iframe nodes.
+
+		No timeout is needed here: every frame's CDP requests are bounded by the shared iframe budget,
+		so frames that run out of it fail fast and nested frames still return what they collected.
+		"""
+		try:
+			await asyncio.wait([pending.task for pending in pending_iframes])
+		except asyncio.CancelledError:
+			for pending in pending_iframes:
+				pending.task.cancel()
+			raise
+
+		for pending in pending_iframes:
+			try:
+				content_document, frame_timing = pending.task.result()
+			except Exception as e:
+				self.logger.warning(f'⚠️ Failed to collect cross-origin iframe {pending.target_id[-4:]}: {type(e).__name__}: {e}')
+				continue
+
+			pending.node.content_document = content_document
+			content_document.parent_node = pending.node
+			timing_info[f'cross_origin_iframe_{pending.target_id}_ms'] = frame_timing.get('get_dom_tree_total_ms', 0)
+			# Keep per-frame timings of nested iframes
+			timing_info.update((key, value) for key, value in frame_timing.items() if key.startswith('cross_origin_iframe_'))
+
 	@observe_debug(ignore_input=True, ignore_output=True, name='get_serialized_dom_tree')
 	async def get_serialized_dom_tree(
 		self, previous_cached_state: SerializedDOMState | None = None
@@ -804,7 +913,11 @@ class DomService:
 		start_serialize = time.time()
 
 		serialized_dom_state, serializer_timing = DOMTreeSerializer(
-			enhanced_dom_tree, previous_cached_state, paint_order_filtering=self.paint_order_filtering, session_id=session_id
+			enhanced_dom_tree,
+			previous_cached_state,
+			paint_order_filtering=self.paint_order_filtering,
+			session_id=session_id,
+			subtree_cache=self.subtree_cache,
 		).serialize_accessible_elements()
 		total_serialization_ms = (time.time() - start_serialize) * 1000
 
@@ -896,6 +896,13 @@ class SerializedDOMState:
 
 	selector_map: DOMSelectorMap
 
+	_fragments: Any = None
+	"""Text fragment keys (`SubtreeFragments | None`) when the tree came from a serializer with a SubtreeCache.
+	Typed as Any because pydantic validates this dataclass inside events and cannot resolve the circular import."""
+
+	_representations: dict[tuple[str, ...], str] = field(default_factory=dict, repr=False, compare=False)
+	"""Rendered `llm_representation` per attribute set, so a pipelined agent can render it ahead of the prompt"""
+
 	@observe_debug(ignore_input=True, ignore_output=True, name='llm_representation')
 	def llm_representation(
 		self,
@@ -908,8 +915,12 @@ class SerializedDOMState:
 			return 'Empty DOM tree (you might have to wait for the page to load)'
 
 		include_attributes = include_attributes or DEFAULT_INCLUDE_ATTRIBUTES
-
-		return DOMTreeSerializer.serialize_tree(self._root, include_attributes)
+		key = tuple(include_attributes)
+		if key not in self._representations:
+			self._representations[key] = DOMTreeSerializer.serialize_tree(
+				self._root, include_attributes, fragments=self._fragments
+			)
+		return self._representations[key]
 
 	@observe_debug(ignore_input=True, ignore_output=True, name='eval_representation')
 	def eval_representation(
@@ -1,18 +1,43 @@
 import asyncio
 import base64
+import hashlib
 import os
 import re
 import shutil
 from abc import ABC, abstractmethod
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, ClassVar
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr, computed_field, field_serializer
 
 INVALID_FILENAME_ERROR_MESSAGE = 'Error: Invalid filename format. Must be alphanumeric with supported extension.'
 DEFAULT_FILE_SYSTEM_PATH = 'browseruse_agent_data'
 
+# Characters str.splitlines() treats as line boundaries ('\r\n' counts once)
+_LINE_BREAKS = frozenset('\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029')
+
+# Appends are merged into the last chunk while it is shorter than this, so the chunk list stays short
+_CHUNK_CHARS = 64 * 1024
+
+_io_executor: ThreadPoolExecutor | None = None
+
+
+def _get_io_executor() -> ThreadPoolExecutor:
+	"""Shared executor for file writes, so a write doesn't have to start its own thread pool"""
+	global _io_executor
+	if _io_executor is None:
+		_io_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='browser_use_fs')
+	return _io_executor
+
+
+def _count_lines(text: str) -> int:
+	"""Same as len(text.splitlines()), without building the list of lines"""
+	if not text:
+		return 0
+	breaks = sum(text.count(char) for char in _LINE_BREAKS) - text.count('\r\n')
+	return breaks + (text[-1] not in _LINE_BREAKS)
+
 
 class FileSystemError(Exception):
 	"""Custom exception for file system operations that should be shown to LLM"""
@@ -21,10 +46,32 @@ class FileSystemError(Exception):
 
 
 class BaseFile(BaseModel, ABC):
-	"""Base class for all file types"""
+	"""Base class for all file types
+
+	Content is held as a list of chunks, so appending doesn't copy what is already there; the chunks are
+	joined the first time the full text is needed. Size and line count are updated as content changes,
+	the digest is computed the first time it's needed after a change, and appends are written to the end
+	of the file on disk instead of rewriting it. Copies get their own chunk list and I/O lock.
+	"""
 
 	name: str
-	content: str = ''
+
+	# Whether append() may write just the new text to the end of the file on disk
+	appends_in_place: ClassVar[bool] = True
+
+	_chunks: list[str] = PrivateAttr(default_factory=list)
+	_size: int = PrivateAttr(default=0)
+	_line_count: int = PrivateAttr(default=0)
+	_digest: str | None = PrivateAttr(default=None)
+	_version: int = PrivateAttr(default=0)
+	_snapshot: tuple[int, dict[str, Any], tuple[str, ...]] | None = PrivateAttr(default=None)
+	# File on disk and how many characters of the content it holds
+	_synced: tuple[Path, int] | None = PrivateAttr(default=None)
+	_io_lock: asyncio.Lock = PrivateAttr(default_factory=asyncio.Lock)
+
+	def __init__(self, content: str = '', **data: Any):
+		super().__init__(**data)
+		self.update_content(content)
 
 	# --- Subclass must define this ---
 	@property
@@ -39,28 +86,134 @@ class BaseFile(BaseModel, ABC):
 
 	def append_file_content(self, content: str) -> None:
 		"""Append content to internal content"""
-		self.update_content(self.content + content)
+		if not content:
+			return
+		line_count = _count_lines(content)
+		if self._chunks:
+			last_char = self._chunks[-1][-1]
+			if last_char not in _LINE_BREAKS or (last_char == '\r' and content[0] == '\n'):
+				# The first appended line continues the current last line
+				line_count -= 1
+		if self._chunks and len(self._chunks[-1]) < _CHUNK_CHARS:
+			self._chunks[-1] += content
+		else:
+			self._chunks.append(content)
+		self._size += len(content)
+		self._line_count += line_count
+		self._digest = None
+		self._version += 1
 
 	# --- These are shared and implemented here ---
 
+	if TYPE_CHECKING:
+		# To type checkers content is a plain field, which also puts it in the constructor signature
+		content: str = ''
+	else:
+
+		@computed_field
+		@property
+		def content(self) -> str:
+			if len(self._chunks) > 1:
+				self._chunks = [''.join(self._chunks)]
+			return self._chunks[0] if self._chunks else ''
+
+		@content.setter
+		def content(self, content: str) -> None:
+			self.update_content(content)
+
 	def update_content(self, content: str) -> None:
-		self.content = content
+		self._chunks = [content] if content else []
+		self._size = len(content)
+		self._line_count = _count_lines(content)
+		self._digest = None
+		self._version += 1
+
+	def __copy__(self):
+		copied = super().__copy__()
+		copied._detach()
+		return copied
+
+	def __deepcopy__(self, memo: dict[int, Any] | None = None):
+		copied = super().__deepcopy__(memo)
+		copied._detach()
+		return copied
+
+	def _detach(self) -> None:
+		"""Give a copy its own chunk list and I/O lock; it hasn't written anything to disk yet"""
+		self._chunks = list(self._chunks)
+		self._snapshot = None
+		self._synced = None
+		self._io_lock = asyncio.Lock()
+
+	@property
+	def digest(self) -> str:
+		"""SHA-256 of the content, computed chunk by chunk and kept until the content changes"""
+		if self._digest is None:
+			content_hash = hashlib.sha256()
+			for chunk in self._chunks:
+				for start in range(0, len(chunk), _CHUNK_CHARS):
+					content_hash.update(chunk[start : start + _CHUNK_CHARS].encode('utf-8', 'surrogatepass'))
+			self._digest = content_hash.hexdigest()
+		return self._digest
+
+	def head(self, chars: int) -> str:
+		"""First `chars` characters of the content, without joining the whole file"""
+		parts = []
+		for chunk in self._chunks:
+			if chars <= 0:
+				break
+			parts.append(chunk[:chars])
+			chars -= len(chunk)
+		return ''.join(parts)
+
+	def tail(self, chars: int) -> str:
+		"""Last `chars` characters of the content, without joining the whole file"""
+		parts = []
+		for chunk in reversed(self._chunks):
+			if chars <= 0:
+				break
+			parts.append(chunk[-chars:])
+			chars -= len(chunk)
+		return ''.join(reversed(parts))
+
+	def snapshot(self) -> tuple[dict[str, Any], tuple[str, ...]]:
+		"""Reference to the current content: (name, size and digest, content chunks), reused until the content changes"""
+		if self._snapshot is None or self._snapshot[0] != self._version:
+			info = {'name': self.name, 'size': self._size, 'digest': self.digest}
+			self._snapshot = (self._version, info, tuple(self._chunks))
+		return self._snapshot[1], self._snapshot[2]
+
+	def _write_to_disk(self, file_path: Path, content: str) -> None:
+		"""Write the full content to file_path. Runs in the shared I/O executor, so it only sees the content it is given."""
+		file_path.write_text(content)
 
 	def sync_to_disk_sync(self, path: Path) -> None:
 		file_path = path / self.full_name
-		file_path.write_text(self.content)
+		content = self.content
+		self._write_to_disk(file_path, content)
+		self._synced = (file_path, len(content))
 
 	async def sync_to_disk(self, path: Path) -> None:
 		file_path = path / self.full_name
-		with ThreadPoolExecutor() as executor:
-			await asyncio.get_event_loop().run_in_executor(executor, lambda: file_path.write_text(self.content))
+		content = self.content
+		async with self._io_lock:
+			await asyncio.get_running_loop().run_in_executor(_get_io_executor(), self._write_to_disk, file_path, content)
+			self._synced = (file_path, len(content))
 
 	async def write(self, content: str, path: Path) -> None:
 		self.write_file_content(content)
 		await self.sync_to_disk(path)
 
 	async def append(self, content: str, path: Path) -> None:
+		file_path = path / self.full_name
+		size_before = self._size
 		self.append_file_content(content)
+		async with self._io_lock:
+			if self.appends_in_place and self._synced == (file_path, size_before):
+				await asyncio.get_running_loop().run_in_executor(_get_io_executor(), _append_text, file_path, content)
+				self._synced = (file_path, size_before + len(content))
+				return
+		# The file on disk doesn't match what we had before this append, so rewrite it
 		await self.sync_to_disk(path)
 
 	def read(self) -> str:
@@ -70,13 +223,23 @@ class BaseFile(BaseModel, ABC):
 	def full_name(self) -> str:
 		return f'{self.name}.{self.extension}'
 
+	@property
+	def version(self) -> int:
+		"""Incremented on every content change"""
+		return self._version
+
 	@property
 	def get_size(self) -> int:
-		return len(self.content)
+		return self._size
 
 	@property
 	def get_line_count(self) -> int:
-		return len(self.content.splitlines())
+		return self._line_count
+
+
+def _append_text(file_path: Path, content: str) -> None:
+	with file_path.open('a') as f:
+		f.write(content)
 
 
 class MarkdownFile(BaseFile):
@@ -126,13 +289,14 @@ class PdfFile(BaseFile):
 	def extension(self) -> str:
 		return 'pdf'
 
-	def sync_to_disk_sync(self, path: Path) -> None:
+	appends_in_place: ClassVar[bool] = False
+
+	def _write_to_disk(self, file_path: Path, content: str) -> None:
 		# Lazy import reportlab
 		from reportlab.lib.pagesizes import letter
 		from reportlab.lib.styles import getSampleStyleSheet
 		from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
 
-		file_path = path / self.full_name
 		try:
 			# Create PDF document
 			doc = SimpleDocTemplate(str(file_path), pagesize=letter)
@@ -142,7 +306,7 @@ class PdfFile(BaseFile):
 			# Convert markdown content to simple text and add to PDF
 			# For basic implementation, we'll treat content as plain text
 			# This avoids the AGPL license issue while maintaining functionality
-			content_lines = self.content.split('\n')
+			content_lines = content.split('\n')
 
 			for line in content_lines:
 				if line.strip():
@@ -163,10 +327,6 @@ class PdfFile(BaseFile):
 		except Exception as e:
 			raise FileSystemError(f"Error: Could not write to file '{self.full_name}'. {str(e)}")
 
-	async def sync_to_disk(self, path: Path) -> None:
-		with ThreadPoolExecutor() as executor:
-			await asyncio.get_event_loop().run_in_executor(executor, lambda: self.sync_to_disk_sync(path))
-
 
 class DocxFile(BaseFile):
 	"""DOCX file implementation"""
@@ -175,15 +335,16 @@ class DocxFile(BaseFile):
 	def extension(self) -> str:
 		return 'docx'
 
-	def sync_to_disk_sync(self, path: Path) -> None:
-		file_path = path / self.full_name
+	appends_in_place: ClassVar[bool] = False
+
+	def _write_to_disk(self, file_path: Path, content: str) -> None:
 		try:
 			from docx import Document
 
 			doc = Document()
 
 			# Convert content to DOCX paragraphs
-			content_lines = self.content.split('\n')
+			content_lines = content.split('\n')
 
 			for line in content_lines:
 				if line.strip():
@@ -203,18 +364,36 @@ class DocxFile(BaseFile):
 		except Exception as e:
 			raise FileSystemError(f"Error: Could not write to file '{self.full_name}'. {str(e)}")
 
-	async def sync_to_disk(self, path: Path) -> None:
-		with ThreadPoolExecutor() as executor:
-			await asyncio.get_event_loop().run_in_executor(executor, lambda: self.sync_to_disk_sync(path))
-
 
 class FileSystemState(BaseModel):
-	"""Serializable state of the file system"""
+	"""Serializable state of the file system
+
+	FileSystem.get_state() records each file's name, size and digest, and keeps a reference to its content
+	chunks instead of copying the text, so taking a snapshot every step is cheap. The content is joined
+	into the file data only when the state is serialized.
+	"""
 
 	files: dict[str, dict[str, Any]] = Field(default_factory=dict)  # full filename -> file data
 	base_dir: str
 	extracted_content_count: int = 0
 
+	_contents: dict[str, tuple[str, ...]] = PrivateAttr(default_factory=dict)  # full filename -> content chunks
+
+	def get_content(self, full_filename: str) -> str:
+		"""Content of a file in this snapshot"""
+		if full_filename in self._contents:
+			return ''.join(self._contents[full_filename])
+		return self.files[full_filename]['data'].get('content', '')
+
+	@field_serializer('files')
+	def _serialize_files(self, files: dict[str, dict[str, Any]]) -> dict[str, dict[str, Any]]:
+		return {
+			full_filename: {**file_data, 'data': {**file_data['data'], 'content': self.get_content(full_filename)}}
+			if full_filename in self._contents
+			else file_data
+			for full_filename, file_data in files.items()
+		}
+
 
 class FileSystem:
 	"""Enhanced file system with in-memory storage and multiple file type support"""
@@ -242,6 +421,7 @@ class FileSystem:
 		}
 
 		self.files = {}
+		self._descriptions: dict[str, tuple[BaseFile, int, str]] = {}  # full filename -> (file, version, description)
 		if create_default_files:
 			self.default_files = ['todo.md']
 			self._create_default_files()
@@ -493,76 +673,89 @@ class FileSystem:
 
 	def describe(self) -> str:
 		"""List all files with their content information using file-specific display methods"""
-		DISPLAY_CHARS = 400
 		description = ''
 
-		for file_obj in self.files.values():
+		for full_filename, file_obj in self.files.items():
 			# Skip todo.md from description
 			if file_obj.full_name == 'todo.md':
 				continue
 
-			content = file_obj.read()
-
-			# Handle empty files
-			if not content:
-				description += f'<file>\n{file_obj.full_name} - [empty file]\n</file>\n'
-				continue
-
-			lines = content.splitlines()
-			line_count = len(lines)
-
-			# For small files, display the entire content
-			whole_file_description = (
-				f'<file>\n{file_obj.full_name} - {line_count} lines\n<content>\n{content}\n</content>\n</file>\n'
-			)
-			if len(content) < int(1.5 * DISPLAY_CHARS):
-				description += whole_file_description
-				continue
-
-			# For larger files, display start and end previews
-			half_display_chars = DISPLAY_CHARS // 2
-
-			# Get start preview
-			start_preview = ''
-			start_line_count = 0
-			chars_count = 0
-			for line in lines:
-				if chars_count + len(line) + 1 > half_display_chars:
-					break
-				start_preview += line + '\n'
-				chars_count += len(line) + 1
-				start_line_count += 1
-
-			# Get end preview
-			end_preview = ''
-			end_line_count = 0
-			chars_count = 0
-			for line in reversed(lines):
-				if chars_count + len(line) + 1 > half_display_chars:
-					break
-				end_preview = line + '\n' + end_preview
-				chars_count += len(line) + 1
-				end_line_count += 1
-
-			# Calculate lines in between
-			middle_line_count = line_count - start_line_count - end_line_count
-			if middle_line_count <= 0:
-				description += whole_file_description
-				continue
+			# Descriptions only change with the content, and the agent asks for them every step
+			cached = self._descriptions.get(full_filename)
+			if cached is None or cached[0] is not file_obj or cached[1] != file_obj.version:
+				cached = (file_obj, file_obj.version, self._describe_file(file_obj))
+				self._descriptions[full_filename] = cached
+			description += cached[2]
 
-			start_preview = start_preview.strip('\n').rstrip()
-			end_preview = end_preview.strip('\n').rstrip()
+		return description.strip('\n')
 
-			# Format output
-			if not (start_preview or end_preview):
-				description += f'<file>\n{file_obj.full_name} - {line_count} lines\n<content>\n{middle_line_count} lines...\n</content>\n</file>\n'
-			else:
-				description += f'<file>\n{file_obj.full_name} - {line_count} lines\n<content>\n{start_preview}\n'
-				description += f'... {middle_line_count} more lines ...\n'
-				description += f'{end_preview}\n'
-				description += '</content>\n</file>\n'
+	def _describe_file(self, file_obj: BaseFile) -> str:
+		"""Describe one file: its whole content if small, otherwise its line count with start and end previews"""
+		DISPLAY_CHARS = 400
 
-		return description.strip('\n')
+		# Handle empty files
+		if not file_obj.get_size:
+			return f'<file>\n{file_obj.full_name} - [empty file]\n</file>\n'
+
+		line_count = file_obj.get_line_count
+
+		# For small files, display the entire content
+		if file_obj.get_size < int(1.5 * DISPLAY_CHARS):
+			return self._describe_whole_file(file_obj)
+
+		# For larger files, display start and end previews
+		half_display_chars = DISPLAY_CHARS // 2
+
+		# A preview counts one character per line break ('\r\n' is two), so its lines always lie within
+		# twice as many characters of either end. Only that much is read; the outermost line of each
+		# window may be cut off, so it is dropped.
+		window = 2 * half_display_chars + 4
+		start_lines = file_obj.head(window).splitlines()[:-1]
+		end_lines = file_obj.tail(window).splitlines()[1:]
+
+		# Get start preview
+		start_preview = ''
+		start_line_count = 0
+		chars_count = 0
+		for line in start_lines:
+			if chars_count + len(line) + 1 > half_display_chars:
+				break
+			start_preview += line + '\n'
+			chars_count += len(line) + 1
+			start_line_count += 1
+
+		# Get end preview
+		end_preview = ''
+		end_line_count = 0
+		chars_count = 0
+		for line in reversed(end_lines):
+			if chars_count + len(line) + 1 > half_display_chars:
+				break
+			end_preview = line + '\n' + end_preview
+			chars_count += len(line) + 1
+			end_line_count += 1
+
+		# Calculate lines in between
+		middle_line_count = line_count - start_line_count - end_line_count
+		if middle_line_count <= 0:
+			return self._describe_whole_file(file_obj)
+
+		start_preview = start_preview.strip('\n').rstrip()
+		end_preview = end_preview.strip('\n').rstrip()
+
+		# Format output
+		if not (start_preview or end_preview):
+			return f'<file>\n{file_obj.full_name} - {line_count} lines\n<content>\n{middle_line_count} lines...\n</content>\n</file>\n'
+		description = f'<file>\n{file_obj.full_name} - {line_count} lines\n<content>\n{start_preview}\n'
+		description += f'... {middle_line_count} more lines ...\n'
+		description += f'{end_preview}\n'
+		description += '</content>\n</file>\n'
+		return description
+
+	def _describe_whole_file(self, file_obj: BaseFile) -> str:
+		return (
+			f'<file>\n{file_obj.full_name} - {file_obj.get_line_count} lines\n<content>\n{file_obj.read()}\n</content>\n</file>\n'
+		)
 
 	def get_todo_contents(self) -> str:
 		"""Get todo file contents"""
@@ -572,12 +765,16 @@ class FileSystem:
 	def get_state(self) -> FileSystemState:
 		"""Get serializable state of the file system"""
 		files_data = {}
+		contents = {}
 		for full_filename, file_obj in self.files.items():
-			files_data[full_filename] = {'type': file_obj.__class__.__name__, 'data': file_obj.model_dump()}
+			info, contents[full_filename] = file_obj.snapshot()
+			files_data[full_filename] = {'type': file_obj.__class__.__name__, 'data': info}
 
-		return FileSystemState(
+		state = FileSystemState(
 			files=files_data, base_dir=str(self.base_dir), extracted_content_count=self.extracted_content_count
 		)
+		state._contents = contents
+		return state
 
 	def nuke(self) -> None:
 		"""Delete the file system directory"""
@@ -593,7 +790,7 @@ class FileSystem:
 		# Restore all files
 		for full_filename, file_data in state.files.items():
 			file_type = file_data['type']
-			file_info = file_data['data']
+			file_info = {**file_data['data'], 'content': state.get_content(full_filename)}
 
 			# Create the appropriate file object based on type
 			if file_type == 'MarkdownFile':
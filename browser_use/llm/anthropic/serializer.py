@@ -20,6 +20,7 @@ from browser_use.llm.messages import (
 	SystemMessage,
 	UserMessage,
 )
+from browser_use.llm.prompt_cache import cached_part_index, find_cache_breakpoints
 
 NonSystemMessage = UserMessage | AssistantMessage
 
@@ -111,20 +112,28 @@ class AnthropicMessageSerializer:
 	def _serialize_content(
 		content: str | list[ContentPartTextParam | ContentPartImageParam],
 		use_cache: bool = False,
+		cache_part_index: int | None = None,
 	) -> str | list[TextBlockParam | ImageBlockParam]:
-		"""Serialize content to Anthropic format."""
+		"""Serialize content to Anthropic format.
+
+		The cache breakpoint goes on the part at cache_part_index (the end of the stable
+		prefix), or on the last part when no index is given.
+		"""
 		if isinstance(content, str):
 			if use_cache:
 				return [TextBlockParam(text=content, type='text', cache_control=CacheControlEphemeralParam(type='ephemeral'))]
 			else:
 				return content
 
+		if cache_part_index is None:
+			cache_part_index = len(content) - 1
+
 		serialized_blocks: list[TextBlockParam | ImageBlockParam] = []
 		for i, part in enumerate(content):
-			is_last = i == len(content) - 1
+			is_breakpoint = i == cache_part_index
 			if part.type == 'text':
 				serialized_blocks.append(
-					AnthropicMessageSerializer._serialize_content_part_text(part, use_cache=use_cache and is_last)
+					AnthropicMessageSerializer._serialize_content_part_text(part, use_cache=use_cache and is_breakpoint)
 				)
 			elif part.type == 'image_url':
 				serialized_blocks.append(AnthropicMessageSerializer._serialize_content_part_image(part))
@@ -178,7 +187,9 @@ class AnthropicMessageSerializer:
 		If a SystemMessage is passed here, it will be converted to a user message.
 		"""
 		if isinstance(message, UserMessage):
-			content = AnthropicMessageSerializer._serialize_content(message.content, use_cache=message.cache)
+			content = AnthropicMessageSerializer._serialize_content(
+				message.content, use_cache=message.cache, cache_part_index=cached_part_index(message)
+			)
 			return MessageParam(role='user', content=content)
 
 		elif isinstance(message, SystemMessage):
@@ -275,11 +286,10 @@ class AnthropicMessageSerializer:
 		cleaned_messages = [msg.model_copy(deep=True) for msg in messages]
 
 		# Find the last message with cache=True
-		last_cache_index = -1
-		for i in range(len(cleaned_messages) - 1, -1, -1):
-			if cleaned_messages[i].cache:
-				last_cache_index = i
-				break
+		last_cache_index = next(
+			(bp.message_index for bp in find_cache_breakpoints(cleaned_messages) if bp.segment != 'system'),
+			-1,
+		)
 
 		# If we found a cached message, disable cache for all others
 		if last_cache_index != -1:
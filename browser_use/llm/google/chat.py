@@ -14,9 +14,11 @@ from pydantic import BaseModel
 
 from browser_use.llm.base import BaseChatModel
 from browser_use.llm.exceptions import ModelProviderError
+from browser_use.llm.google.context_cache import GeminiContextCache
 from browser_use.llm.google.serializer import GoogleMessageSerializer
 from browser_use.llm.messages import BaseMessage
 from browser_use.llm.schema import SchemaOptimizer
+from browser_use.llm.structured_output import parse_json_text
 from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeUsage
 
 T = TypeVar('T', bound=BaseModel)
@@ -67,6 +69,9 @@ class ChatGoogle(BaseChatModel):
 		retryable_status_codes: List of HTTP status codes to retry on (default: [429, 500, 502, 503, 504])
 		retry_base_delay: Base delay in seconds for exponential backoff (default: 1.0)
 		retry_max_delay: Maximum delay in seconds between retries (default: 60.0)
+		cache_system_instruction: If True, the system instruction is sent through an explicit cached-content
+			handle that is reused across calls (default: False; Gemini still applies implicit prefix caching)
+		cache_ttl_seconds: Lifetime of the cached-content handle (default: 3600)
 
 	Example:
 		from google.genai import types
@@ -97,6 +102,8 @@ class ChatGoogle(BaseChatModel):
 	retryable_status_codes: list[int] = field(default_factory=lambda: [429, 500, 502, 503, 504])  # Status codes to retry on
 	retry_base_delay: float = 1.0  # Base delay in seconds for exponential backoff
 	retry_max_delay: float = 60.0  # Maximum delay in seconds between retries
+	cache_system_instruction: bool = False  # Reuse an explicit cached-content handle for the system instruction
+	cache_ttl_seconds: int = 3600
 
 	# Client initialization parameters
 	api_key: str | None = None
@@ -108,6 +115,7 @@ class ChatGoogle(BaseChatModel):
 
 	# Internal client cache to prevent connection issues
 	_client: genai.Client | None = None
+	_context_cache: GeminiContextCache | None = None
 
 	# Static
 	@property
@@ -184,6 +192,17 @@ class ChatGoogle(BaseChatModel):
 
 		return usage
 
+	async def _get_cached_content(self, system_instruction: str, config: types.GenerateContentConfigDict) -> str | None:
+		"""Cached-content handle carrying the system instruction, or None to send it inline."""
+		if not self.cache_system_instruction or self.include_system_in_user:
+			return None
+		# Requests that use a handle can't also set tools or their own cached content
+		if any(key in config for key in ('cached_content', 'tools', 'tool_config')):
+			return None
+		if self._context_cache is None:
+			self._context_cache = GeminiContextCache(ttl_seconds=self.cache_ttl_seconds)
+		return await self._context_cache.get_handle(self.get_client(), self.model, system_instruction)
+
 	@overload
 	async def ainvoke(
 		self, messages: list[BaseMessage], output_format: None = None, **kwargs: Any
@@ -222,7 +241,11 @@ class ChatGoogle(BaseChatModel):
 
 		# Add system instruction if present
 		if system_instruction:
-			config['system_instruction'] = system_instruction
+			if cached_content := await self._get_cached_content(system_instruction, config):
+				# The handle already carries the system instruction
+				config['cached_content'] = cached_content
+			else:
+				config['system_instruction'] = system_instruction
 
 		if self.top_p is not None:
 			config['top_p'] = self.top_p
@@ -301,19 +324,12 @@ class ChatGoogle(BaseChatModel):
 							# When using response_schema, Gemini returns JSON as text
 							if response.text:
 								try:
-									# Handle JSON wrapped in markdown code blocks (common Gemini behavior)
-									text = response.text.strip()
-									if text.startswith('```json') and text.endswith('```'):
-										text = text[7:-3].strip()
-										self.logger.debug('🔧 Stripped ```json``` wrapper from response')
-									elif text.startswith('```') and text.endswith('```'):
-										text = text[3:-3].strip()
-										self.logger.debug('🔧 Stripped ``` wrapper from response')
-
-									# Parse the JSON text and validate with the Pydantic model
-									parsed_data = json.loads(text)
+									# Tolerates JSON wrapped in markdown code blocks (common Gemini behavior)
+									parsed = parse_json_text(response.text, output_format, strict=True)
+									if parsed.value is None:
+										raise ValueError(f'Response did not contain a {output_format.__name__} object')
 									return ChatInvokeCompletion(
-										completion=output_format.model_validate(parsed_data),
+										completion=parsed.value,
 										usage=usage,
 										stop_reason=self._get_stop_reason(response),
 									)
@@ -365,7 +381,7 @@ class ChatGoogle(BaseChatModel):
 
 						# Update config with fallback system instruction if present
 						fallback_config = config.copy()
-						if fallback_system:
+						if fallback_system and 'cached_content' not in fallback_config:
 							fallback_config['system_instruction'] = fallback_system
 
 						response = await self.get_client().aio.models.generate_content(
@@ -382,19 +398,12 @@ class ChatGoogle(BaseChatModel):
 						# Try to extract JSON from the text response
 						if response.text:
 							try:
-								# Try to find JSON in the response
-								text = response.text.strip()
-
-								# Common patterns: JSON wrapped in markdown code blocks
-								if text.startswith('```json') and text.endswith('```'):
-									text = text[7:-3].strip()
-								elif text.startswith('```') and text.endswith('```'):
-									text = text[3:-3].strip()
-
-								# Parse and validate
-								parsed_data = json.loads(text)
+								# Find the JSON in the response (markdown code blocks, surrounding text)
+								parsed = parse_json_text(response.text, output_format, strict=True)
+								if parsed.value is None:
+									raise ValueError(f'Response did not contain a {output_format.__name__} object')
 								return ChatInvokeCompletion(
-									completion=output_format.model_validate(parsed_data),
+									completion=parsed.value,
 									usage=usage,
 									stop_reason=self._get_stop_reason(response),
 								)
@@ -0,0 +1,117 @@
+"""
+Explicit Gemini context caching for the stable system instruction.
+
+Gemini bills tokens served from a cached-content handle at a reduced rate. The
+agent's system instruction is identical on every step, so one handle per
+(model, system instruction) is created and reused until shortly before its TTL
+runs out. Prompts that are too short to cache (the API enforces a minimum token
+count), models or clients without cache support are remembered and sent
+uncached. Other failures, such as rate limits or network errors, only skip the
+cache until a short backoff has passed.
+
+**Usage:**
+    cache = GeminiContextCache(ttl_seconds=3600)
+    handle = await cache.get_handle(client, model, system_instruction)
+    if handle:
+        config['cached_content'] = handle
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+
+from google.genai import Client, types
+
+logger = logging.getLogger(__name__)
+
+
+class GeminiContextCache:
+	"""Creates and reuses cached-content handles keyed by model and system instruction."""
+
+	def __init__(self, ttl_seconds: int = 3600, refresh_margin_seconds: int = 60, retry_backoff_seconds: float = 60):
+		"""
+		Initialize cache.
+
+		Args:
+			ttl_seconds: Lifetime of each cached-content handle on the server
+			refresh_margin_seconds: Stop using a handle this long before it expires
+			retry_backoff_seconds: Wait this long before retrying after a transient creation error
+		"""
+		self.ttl_seconds = ttl_seconds
+		self.refresh_margin_seconds = refresh_margin_seconds
+		self.retry_backoff_seconds = retry_backoff_seconds
+		self._handles: dict[str, tuple[str, float]] = {}  # key -> (cache name, monotonic expiry)
+		self._uncacheable: set[str] = set()
+		self._retry_at: dict[str, float] = {}  # key -> monotonic time of the next creation attempt
+		self._lock = asyncio.Lock()
+
+	@staticmethod
+	def _key(model: str, system_instruction: str) -> str:
+		return hashlib.sha256(f'{model}\0{system_instruction}'.encode()).hexdigest()
+
+	@staticmethod
+	def _is_uncacheable_error(error: Exception) -> bool:
+		"""Whether creating the cache can never succeed for this prompt and model."""
+		if isinstance(error, (AttributeError, NotImplementedError)):
+			# Client without cache support
+			return True
+		message = str(error).lower()
+		return 'too small' in message or 'not supported' in message
+
+	def _valid_handle(self, key: str) -> str | None:
+		handle = self._handles.get(key)
+		if handle and handle[1] - self.refresh_margin_seconds > time.monotonic():
+			return handle[0]
+		return None
+
+	async def get_handle(self, client: Client, model: str, system_instruction: str) -> str | None:
+		"""
+		Get a cached-content handle for the system instruction, creating it if needed.
+
+		Args:
+			client: Gemini client used to create the cache
+			model: Model the handle is created for (handles are model-specific)
+			system_instruction: Stable system instruction to cache
+
+		Returns:
+			Cached content name to pass as `cached_content`, or None to send the prompt uncached
+		"""
+		key = self._key(model, system_instruction)
+		if key in self._uncacheable or self._retry_at.get(key, 0) > time.monotonic():
+			return None
+		if handle := self._valid_handle(key):
+			return handle
+
+		async with self._lock:
+			if handle := self._valid_handle(key):
+				return handle
+			try:
+				cached = await client.aio.caches.create(
+					model=model,
+					config=types.CreateCachedContentConfig(
+						system_instruction=system_instruction,
+						ttl=f'{self.ttl_seconds}s',
+						display_name=f'browser-use-{key[:12]}',
+					),
+				)
+			except Exception as e:
+				if self._is_uncacheable_error(e):
+					# Below the model's minimum cacheable size or unsupported; don't retry every step
+					logger.debug(f'💾 Gemini context cache unavailable for {model}, sending uncached: {type(e).__name__}: {e}')
+					self._uncacheable.add(key)
+				else:
+					logger.debug(
+						f'💾 Gemini context cache creation failed for {model}, retrying in {self.retry_backoff_seconds:.0f}s: '
+						f'{type(e).__name__}: {e}'
+					)
+					self._retry_at[key] = time.monotonic() + self.retry_backoff_seconds
+				return None
+
+			if not cached.name:
+				self._uncacheable.add(key)
+				return None
+			self._retry_at.pop(key, None)
+			self._handles[key] = (cached.name, time.monotonic() + self.ttl_seconds)
+			logger.debug(f'💾 Created Gemini context cache {cached.name} for {model}')
+			return cached.name
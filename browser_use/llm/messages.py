@@ -128,7 +128,7 @@ class _MessageBase(BaseModel):
 	role: Literal['user', 'system', 'assistant']
 
 	cache: bool = False
-	"""Whether to cache this message. This is only applicable when using Anthropic models.
+	"""Whether this message ends a stable, cacheable prompt prefix (see `browser_use.llm.prompt_cache`).
 	"""
 
 
@@ -146,6 +146,10 @@ class UserMessage(_MessageBase):
     role.
     """
 
+	cache_prefix_parts: int | None = None
+	"""With `cache=True`: only the first N content parts are stable across steps, so the cache
+	breakpoint goes after them instead of after the whole message."""
+
 	@property
 	def text(self) -> str:
 		"""
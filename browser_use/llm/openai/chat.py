@@ -1,3 +1,4 @@
+import json
 from collections.abc import Iterable, Mapping
 from dataclasses import dataclass, field
 from typing import Any, Literal, TypeVar, overload
@@ -15,6 +16,7 @@ from browser_use.llm.base import BaseChatModel
 from browser_use.llm.exceptions import ModelProviderError, ModelRateLimitError
 from browser_use.llm.messages import BaseMessage
 from browser_use.llm.openai.serializer import OpenAIMessageSerializer
+from browser_use.llm.prompt_cache import stable_prefix_key
 from browser_use.llm.schema import SchemaOptimizer
 from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeUsage
 
@@ -48,6 +50,9 @@ class ChatOpenAI(BaseChatModel):
 	remove_defaults_from_schema: bool = (
 		False  # If True, remove default values from JSON schema (for compatibility with some providers)
 	)
+	# Routes requests that share the system prompt and schema to the same prompt cache.
+	# 'auto' derives the key from that prefix when talking to the official API (no base_url)
+	prompt_cache_key: str | Literal['auto'] | None = 'auto'
 
 	# Client initialization parameters
 	api_key: str | None = None
@@ -145,6 +150,14 @@ class ChatOpenAI(BaseChatModel):
 
 		return usage
 
+	def _get_prompt_cache_key(self, messages: list[BaseMessage], schema: dict[str, Any] | None = None) -> str | None:
+		"""Resolve the prompt_cache_key for this request, or None to leave routing to the provider."""
+		if self.prompt_cache_key != 'auto':
+			return self.prompt_cache_key
+		if self.base_url is not None:
+			return None
+		return stable_prefix_key(messages, json.dumps(schema, sort_keys=True) if schema else None)
+
 	@overload
 	async def ainvoke(
 		self, messages: list[BaseMessage], output_format: None = None, **kwargs: Any
@@ -196,6 +209,9 @@ class ChatOpenAI(BaseChatModel):
 				model_params.pop('frequency_penalty', None)
 
 			if output_format is None:
+				if prompt_cache_key := self._get_prompt_cache_key(messages):
+					model_params['prompt_cache_key'] = prompt_cache_key
+
 				# Return string response
 				response = await self.get_client().chat.completions.create(
 					model=self.model,
@@ -221,6 +237,9 @@ class ChatOpenAI(BaseChatModel):
 					),
 				}
 
+				if prompt_cache_key := self._get_prompt_cache_key(messages, response_format['schema']):
+					model_params['prompt_cache_key'] = prompt_cache_key
+
 				# Add JSON schema to system prompt if requested
 				if self.add_schema_to_system_prompt and openai_messages and openai_messages[0]['role'] == 'system':
 					schema_text = f'\n<json_schema>\n{response_format}\n</json_schema>'
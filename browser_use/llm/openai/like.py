@@ -13,3 +13,5 @@ class ChatOpenAILike(ChatOpenAI):
 	"""
 
 	model: str
+	# Only the official OpenAI API is known to accept prompt_cache_key
+	prompt_cache_key: str | None = None
@@ -0,0 +1,127 @@
+"""
+Provider-agnostic prompt prefix caching.
+
+Every agent step re-sends the same system prompt and output schema, followed by
+an agent history that only grows at its end. Providers can bill that prefix at
+cache-read rates when requests keep it byte-identical and, depending on the
+provider, mark where it ends:
+
+- Anthropic (direct and Bedrock): explicit `cache_control` breakpoints
+- OpenAI and compatible APIs: automatic caching of identical leading tokens,
+  with an optional `prompt_cache_key` that routes requests sharing a prefix to
+  the same cache
+- Gemini: implicit prefix caching, plus explicit cached-content handles for the
+  system instruction (see `browser_use.llm.google.context_cache`)
+
+This module finds the stable segments of a message list once, independently of
+the provider, and each serializer maps them onto its own mechanism. Stable
+segments, in prompt order:
+
+- `system`: the system message (instructions and action descriptions), when
+  flagged `cache=True`
+- `history`: the first `cache_prefix_parts` content parts of the last cached
+  user message (the agent history block of the state message)
+- `message`: the whole last cached message, for callers that flag `cache=True`
+  without declaring a stable prefix
+
+Only the last cached non-system message gets a breakpoint: a later breakpoint
+covers everything before it, and Anthropic allows at most four per request.
+
+**Usage:**
+    breakpoints = find_cache_breakpoints(messages)
+    key = stable_prefix_key(messages, json.dumps(schema, sort_keys=True))
+"""
+
+import hashlib
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Literal
+
+from browser_use.llm.messages import BaseMessage, SystemMessage, UserMessage
+
+CacheSegment = Literal['system', 'history', 'message']
+
+
+@dataclass(frozen=True)
+class CacheBreakpoint:
+	"""End of a stable prompt segment."""
+
+	segment: CacheSegment
+	message_index: int
+	part_index: int | None
+	"""Index of the last content part inside the segment, or None when the content is a plain string."""
+
+
+def _last_part_index(message: BaseMessage) -> int | None:
+	if isinstance(message.content, list) and message.content:
+		return len(message.content) - 1
+	return None
+
+
+def find_cache_breakpoints(messages: Sequence[BaseMessage]) -> list[CacheBreakpoint]:
+	"""
+	Locate the ends of the stable prompt segments.
+
+	Args:
+		messages: Messages in request order
+
+	Returns:
+		Breakpoints in prompt order, at most one for the system message and one for the conversation
+	"""
+	breakpoints: list[CacheBreakpoint] = []
+	for index, message in enumerate(messages):
+		if isinstance(message, SystemMessage):
+			if message.cache:
+				breakpoints.append(CacheBreakpoint('system', index, _last_part_index(message)))
+			break
+
+	for index in range(len(messages) - 1, -1, -1):
+		message = messages[index]
+		if isinstance(message, SystemMessage) or not message.cache:
+			continue
+		prefix_parts = message.cache_prefix_parts if isinstance(message, UserMessage) else None
+		if prefix_parts and isinstance(message.content, list) and prefix_parts < len(message.content):
+			breakpoints.append(CacheBreakpoint('history', index, prefix_parts - 1))
+		else:
+			breakpoints.append(CacheBreakpoint('message', index, _last_part_index(message)))
+		break
+
+	return breakpoints
+
+
+def cached_part_index(message: BaseMessage) -> int | None:
+	"""
+	Index of the content part that ends the cached prefix of a single `cache=True` message.
+
+	Returns:
+		The last stable part, or the last part when no stable prefix is declared (None for string content)
+	"""
+	if isinstance(message, UserMessage) and message.cache_prefix_parts and isinstance(message.content, list):
+		if message.cache_prefix_parts < len(message.content):
+			return message.cache_prefix_parts - 1
+	return _last_part_index(message)
+
+
+def stable_prefix_key(messages: Sequence[BaseMessage], *extra: str | None) -> str | None:
+	"""
+	Short key identifying the stable prefix (system prompt plus e.g. the output schema).
+
+	Requests that share the key share a cacheable prefix, so providers that route
+	by key (OpenAI `prompt_cache_key`) can send them to the same cache.
+
+	Args:
+		messages: Messages in request order
+		*extra: Other stable request parts that precede the conversation, such as a serialized schema
+
+	Returns:
+		Hex digest, or None when there is no system message to key on
+	"""
+	system = next((message for message in messages if isinstance(message, SystemMessage)), None)
+	if system is None:
+		return None
+	digest = hashlib.sha256(system.text.encode())
+	for part in extra:
+		if part:
+			digest.update(b'\0')
+			digest.update(part.encode())
+	return digest.hexdigest()[:32]
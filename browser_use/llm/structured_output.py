@@ -0,0 +1,366 @@
+"""
+Incremental JSON parsing for structured LLM output.
+
+Models asked for JSON frequently wrap it in markdown fences or prose, and
+callers used to buffer the whole response before trying a chain of repair
+strategies (direct parse, fence stripping, regex extraction, brace counting).
+`StreamingJSONParser` consumes the response as it streams in instead:
+
+- Skips any preamble (```json fences, prose) up to the first `{` or `[`
+- Tracks nesting incrementally while a value is still arriving, and decodes
+  values that have fully arrived in a single C-level pass
+- Completes top-level object fields as soon as their value closes and
+  validates each one against the matching Pydantic field
+- Aborts early on unrecoverable structure (mismatched brackets, junk where a
+  key is expected) instead of waiting for the rest of the response
+- Ignores trailing text after the root value closes (closing fences, notes)
+- Returns the completed fields as a partial result when a stream times out
+
+**Usage:**
+    result = await parse_json_stream(chunks, FrameAnalysisResponse, timeout=60)
+    if result.complete:
+        analysis = result.value
+    else:
+        partial_fields = result.data
+
+    completion = parse_json_text(response_text, output_format, strict=True).value
+"""
+
+import asyncio
+import json
+import re
+import time
+from collections.abc import AsyncIterable, Callable
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Annotated, Any, Generic, TypeVar
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+T = TypeVar('T', bound=BaseModel)
+
+# A whole string literal (or an unterminated one running to the end of the buffer), or a
+# structural character. Nested levels only need brackets, so ',' and ':' are skipped there.
+_STRING = r'"[^"\\]*(?:\\.[^"\\]*)*(?:(?P<closed>")|\\?\Z)'
+_TOP_LEVEL_TOKEN = re.compile(_STRING + r'|[{}\[\],:]', re.DOTALL)
+_NESTED_TOKEN = re.compile(_STRING + r'|[{}\[\]]', re.DOTALL)
+_ROOT_START = re.compile(r'[{\[]')
+_WHITESPACE = re.compile(r'\s*')
+_DECODER = json.JSONDecoder(strict=False)  # Tolerate raw control characters inside strings
+_CLOSERS = {'}': '{', ']': '['}
+
+
+class StructuredOutputError(ValueError):
+	"""Raised when model output cannot be parsed into the requested structure."""
+
+
+@dataclass
+class StructuredParseResult(Generic[T]):
+	"""Outcome of parsing a (possibly incomplete) structured response."""
+
+	data: Any = None  # Parsed JSON; for incomplete object responses, the completed fields
+	value: T | None = None  # Validated model (complete responses with an output format only)
+	complete: bool = False
+	timed_out: bool = False
+	error: str | None = None
+	field_errors: dict[str, str] = field(default_factory=dict)
+	time_to_first_field: float | None = None
+	elapsed: float = 0.0
+
+
+@lru_cache(maxsize=128)
+def _field_adapters(output_format: type[BaseModel]) -> dict[str, TypeAdapter]:
+	"""Per-field validators for a model, keyed by the name the field has in JSON."""
+	adapters = {}
+	for name, field_info in output_format.model_fields.items():
+		annotation = field_info.annotation
+		if field_info.metadata:
+			annotation = Annotated[annotation, *field_info.metadata]  # Keep constraints like ge/le/max_length
+		adapters[field_info.alias or name] = TypeAdapter(annotation)
+	return adapters
+
+
+class StreamingJSONParser(Generic[T]):
+	"""Incrementally parses one JSON value from streamed model output."""
+
+	def __init__(
+		self,
+		output_format: type[T] | None = None,
+		*,
+		strict: bool = False,
+		max_preamble_chars: int = 4096,
+	):
+		"""
+		Initialize parser.
+
+		Args:
+			output_format: Pydantic model to validate fields and the final value against
+			strict: Raise StructuredOutputError on the first invalid field, and from
+				finish() if the response is incomplete or fails validation
+			max_preamble_chars: Abort if no JSON value starts within this many characters
+		"""
+		self.output_format = output_format
+		self.strict = strict
+		self.max_preamble_chars = max_preamble_chars
+
+		self.fields: dict[str, Any] = {}
+		self.field_errors: dict[str, str] = {}
+		self.done = False
+		self.time_to_first_field: float | None = None
+
+		self._started_at = time.perf_counter()
+		self._buffer = ''  # Text from the root value's first character onwards
+		self._preamble_chars = 0
+		self._pos = 0
+		self._stack: list[str] = []
+		self._object_root = False
+		self._root_end: int | None = None
+
+		# Top-level field state (object roots only)
+		self._expect_key = False
+		self._expect_colon = False
+		self._key: str | None = None
+		self._value_start = 0
+		self._decoded: tuple[Any, int] | None = None  # (value, end) when decoded in one pass
+
+	@property
+	def started(self) -> bool:
+		return bool(self._stack) or self.done
+
+	def feed(self, text: str) -> list[str]:
+		"""
+		Consume the next piece of model output.
+
+		Returns:
+			Names of top-level fields completed by this piece
+
+		Raises:
+			StructuredOutputError: If the output can no longer become valid JSON
+		"""
+		if self.done or not text:
+			return []
+		if not self._buffer:
+			match = _ROOT_START.search(text)
+			self._preamble_chars += match.start() if match else len(text)
+			if self._preamble_chars > self.max_preamble_chars:
+				raise StructuredOutputError(f'No JSON value found in the first {self.max_preamble_chars} characters')
+			if match is None:
+				return []
+			text = text[match.start() :]
+		self._buffer += text
+		return self._scan()
+
+	def _fail(self, message: str) -> StructuredOutputError:
+		return StructuredOutputError(f'{message} at offset {self._preamble_chars + self._pos}')
+
+	def _check_gap(self, start: int, end: int) -> None:
+		"""Between a top-level key position and its ':' only whitespace is allowed."""
+		if (self._expect_key or self._expect_colon) and len(self._stack) == 1 and self._object_root:
+			junk = self._buffer[start:end].strip()
+			if junk:
+				expected = 'key' if self._expect_key else "':'"
+				raise self._fail(f'Expected {expected}, found {junk[:20]!r}')
+
+	def _scan(self) -> list[str]:
+		buffer = self._buffer
+		completed: list[str] = []
+		while not self.done:
+			pos = self._pos
+			depth = len(self._stack)
+			at_top_level = depth == 1 and self._object_root
+			token = _TOP_LEVEL_TOKEN if at_top_level else _NESTED_TOKEN
+			match = token.search(buffer, pos)
+			self._check_gap(pos, match.start() if match else len(buffer))
+			if match is None:
+				self._pos = len(buffer)
+				break
+
+			char = buffer[match.start()]
+			if char == '"':
+				if match.group('closed') is None:
+					self._pos = match.start()  # Unterminated string: rescan it when more text arrives
+					break
+				self._pos = match.end()
+				if at_top_level:
+					if self._expect_colon:
+						raise self._fail("Expected ':'")
+					if self._expect_key:
+						self._key = json.loads(match.group(), strict=False)
+						self._expect_key = False
+						self._expect_colon = True
+				continue
+
+			self._pos = match.end()
+			if char in '{[':
+				if depth == 0:
+					self._object_root = char == '{'
+					self._expect_key = self._object_root
+				elif at_top_level and (self._expect_key or self._expect_colon):
+					raise self._fail(f'Unexpected {char!r}')
+				self._stack.append(char)
+			elif char in '}]':
+				if not self._stack or self._stack[-1] != _CLOSERS[char]:
+					raise self._fail(f'Mismatched {char!r}')
+				if at_top_level:
+					if self._expect_colon:
+						raise self._fail("Expected ':'")
+					if self._key is not None:
+						completed.append(self._complete_field(match.start()))
+				self._stack.pop()
+				if not self._stack:
+					self.done = True
+					self._root_end = self._pos
+			elif char == ',':
+				if self._key is None:
+					raise self._fail("Unexpected ','")
+				completed.append(self._complete_field(match.start()))
+				self._expect_key = True
+			elif char == ':':
+				if not self._expect_colon:
+					raise self._fail("Unexpected ':'")
+				self._expect_colon = False
+				self._value_start = self._pos
+				self._decode_value()
+		return completed
+
+	def _decode_value(self) -> None:
+		"""
+		Decode a top-level value in one C-speed pass if it has fully arrived.
+
+		Falls back to token scanning when the value is still incomplete, so each
+		value costs at most one failed attempt.
+		"""
+		buffer = self._buffer
+		whitespace = _WHITESPACE.match(buffer, self._pos)
+		start = whitespace.end() if whitespace else self._pos
+		try:
+			value, end = _DECODER.raw_decode(buffer, start)
+		except json.JSONDecodeError:
+			return
+		if end >= len(buffer):
+			return  # A number at the end of the buffer may continue in the next piece
+		self._decoded = (value, end)
+		self._pos = end
+
+	def _complete_field(self, value_end: int) -> str:
+		key = self._key
+		assert key is not None
+		self._key = None
+		if self._decoded is not None:
+			value, decoded_end = self._decoded
+			self._decoded = None
+			if self._buffer[decoded_end:value_end].strip():
+				raise self._fail(f'Unexpected text after value for field {key!r}')
+		else:
+			try:
+				value = json.loads(self._buffer[self._value_start : value_end], strict=False)
+			except json.JSONDecodeError as e:
+				raise self._fail(f'Invalid value for field {key!r}: {e.msg}') from e
+
+		self.fields[key] = value
+		if self.time_to_first_field is None:
+			self.time_to_first_field = time.perf_counter() - self._started_at
+
+		adapter = _field_adapters(self.output_format).get(key) if self.output_format else None
+		if adapter is not None:
+			try:
+				adapter.validate_python(value)
+			except ValidationError as e:
+				self.field_errors[key] = str(e)
+				if self.strict:
+					raise StructuredOutputError(f'Field {key!r} failed validation: {e}') from e
+		return key
+
+	def finish(self) -> StructuredParseResult[T]:
+		"""
+		Build the result from everything fed so far.
+
+		Raises:
+			StructuredOutputError: In strict mode, if the value is incomplete or invalid
+		"""
+		result: StructuredParseResult[T] = StructuredParseResult(
+			field_errors=dict(self.field_errors),
+			time_to_first_field=self.time_to_first_field,
+			elapsed=time.perf_counter() - self._started_at,
+		)
+		if not self.done:
+			result.data = dict(self.fields) if self._object_root else None
+			result.error = 'Response ended before the JSON value was complete' if self.started else 'No JSON value found'
+			if self.strict:
+				raise StructuredOutputError(result.error)
+			return result
+
+		result.complete = True
+		# Object fields were already decoded as they completed
+		result.data = self.fields if self._object_root else json.loads(self._buffer[: self._root_end], strict=False)
+		if self.output_format is not None:
+			try:
+				result.value = self.output_format.model_validate(result.data)
+			except ValidationError as e:
+				result.error = str(e)
+				if self.strict:
+					raise StructuredOutputError(f'Response failed validation: {e}') from e
+		return result
+
+
+def parse_json_text(
+	text: str,
+	output_format: type[T] | None = None,
+	*,
+	strict: bool = False,
+) -> StructuredParseResult[T]:
+	"""
+	Parse a fully buffered model response (fences, prose and trailing text are tolerated).
+
+	Raises:
+		StructuredOutputError: On unrecoverable structure, or in strict mode if incomplete/invalid
+	"""
+	parser = StreamingJSONParser(output_format, strict=strict, max_preamble_chars=len(text))
+	parser.feed(text)
+	return parser.finish()
+
+
+async def parse_json_stream(
+	chunks: AsyncIterable[str],
+	output_format: type[T] | None = None,
+	*,
+	timeout: float | None = None,
+	strict: bool = False,
+	on_field: Callable[[str, Any], None] | None = None,
+) -> StructuredParseResult[T]:
+	"""
+	Parse streamed model output, stopping as soon as the root JSON value closes.
+
+	Args:
+		chunks: Text pieces as they arrive from the model
+		output_format: Pydantic model to validate against
+		timeout: Seconds to wait for the complete value; on timeout the completed
+			fields are returned as a partial result
+		strict: See StreamingJSONParser
+		on_field: Called with (name, value) as each top-level field completes
+
+	Raises:
+		StructuredOutputError: On unrecoverable structure (the stream is closed early)
+	"""
+	parser = StreamingJSONParser(output_format, strict=strict)
+	timed_out = False
+	try:
+		async with asyncio.timeout(timeout):
+			async for chunk in chunks:
+				for name in parser.feed(chunk):
+					if on_field is not None:
+						on_field(name, parser.fields[name])
+				if parser.done:
+					break
+	except TimeoutError:
+		timed_out = True
+	finally:
+		aclose = getattr(chunks, 'aclose', None)
+		if aclose is not None:
+			await aclose()
+
+	if timed_out and parser.strict and not parser.done:
+		raise StructuredOutputError(f'Timed out after {timeout}s waiting for the complete response')
+	result = parser.finish()
+	result.timed_out = timed_out
+	return result
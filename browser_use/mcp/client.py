@@ -20,29 +20,39 @@ Example usage:
     await mcp_client.register_to_tools(tools)
 
     # Now use with Agent as normal - MCP tools are available as actions
+
+Tool calls share a pool of up to `max_sessions` server processes (see
+browser_use/mcp/connections.py), and the tool list of a server is cached on disk
+per command and server version, so later runs skip tool discovery.
 """
 
-import asyncio
+import json
 import logging
 import time
+from pathlib import Path
 from typing import Any
 
 from pydantic import BaseModel, ConfigDict, Field, create_model
 
 from browser_use.agent.views import ActionResult
+from browser_use.config import CONFIG
+from browser_use.mcp.connections import MCPConnectionPool, ToolSchemaCache, to_wire
 from browser_use.telemetry import MCPClientTelemetryEvent, ProductTelemetry
 from browser_use.tools.registry.service import Registry
 from browser_use.tools.service import Tools
-from browser_use.utils import create_task_with_error_handling, get_browser_use_version
+from browser_use.utils import get_browser_use_version
 
 logger = logging.getLogger(__name__)
 
 # Import MCP SDK
 from mcp import ClientSession, StdioServerParameters, types
-from mcp.client.stdio import stdio_client
 
 MCP_AVAILABLE = True
 
+# Parameter models built from tool schemas, keyed by action name and schema, so
+# reconnecting or registering the same tools again reuses them
+_param_models: dict[tuple[str, str], type[BaseModel] | None] = {}
+
 
 class MCPClient:
 	"""Client for connecting to MCP servers and exposing their tools as browser-use actions."""
@@ -53,6 +63,11 @@ class MCPClient:
 		command: str,
 		args: list[str] | None = None,
 		env: dict[str, str] | None = None,
+		max_sessions: int = 1,
+		max_calls_per_session: int = 8,
+		connect_timeout: float = 10.0,
+		cache_tool_schemas: bool = True,
+		schema_cache_dir: str | Path | None = None,
 	):
 		"""Initialize MCP client.
 
@@ -61,22 +76,41 @@ class MCPClient:
 			command: Command to start the MCP server (e.g., "npx", "python")
 			args: Arguments for the command (e.g., ["@playwright/mcp@latest"])
 			env: Environment variables for the server process
+			max_sessions: Most server processes to run for concurrent tool calls
+			max_calls_per_session: Most tool calls in flight on one server process
+			connect_timeout: Seconds to wait for the server to start
+			cache_tool_schemas: Reuse the tool list of the same server command and version from disk
+			schema_cache_dir: Where tool lists are cached (default: <config dir>/mcp/tool_schemas)
 		"""
 		self.server_name = server_name
 		self.command = command
 		self.args = args or []
 		self.env = env
 
-		self.session: ClientSession | None = None
-		self._stdio_task = None
-		self._read_stream = None
-		self._write_stream = None
+		self.server_params = StdioServerParameters(command=self.command, args=self.args, env=self.env)
+		self._pool = MCPConnectionPool(
+			self.server_params,
+			server_name,
+			max_sessions=max_sessions,
+			max_calls_per_session=max_calls_per_session,
+			connect_timeout=connect_timeout,
+		)
+		self._schema_cache = (
+			ToolSchemaCache(schema_cache_dir or CONFIG.BROWSER_USE_CONFIG_DIR / 'mcp' / 'tool_schemas')
+			if cache_tool_schemas
+			else None
+		)
+		self.server_info: dict[str, Any] = {}
 		self._tools: dict[str, types.Tool] = {}
 		self._registered_actions: set[str] = set()
 		self._connected = False
-		self._disconnect_event = asyncio.Event()
 		self._telemetry = ProductTelemetry()
 
+	@property
+	def session(self) -> ClientSession | None:
+		"""A session with the server (tool calls borrow theirs from the pool)."""
+		return self._pool.session
+
 	async def connect(self) -> None:
 		"""Connect to the MCP server and discover available tools."""
 		if self._connected:
@@ -89,24 +123,27 @@ class MCPClient:
 		try:
 			logger.info(f"🔌 Connecting to MCP server '{self.server_name}': {self.command} {' '.join(self.args)}")
 
-			# Create server parameters
-			server_params = StdioServerParameters(command=self.command, args=self.args, env=self.env)
+			# Returns as soon as the session is initialized
+			connection = await self._pool.start()
+			self.server_info = connection.server_info
 
-			# Start stdio client in background task
-			self._stdio_task = create_task_with_error_handling(
-				self._run_stdio_client(server_params), name='mcp_stdio_client', suppress_exceptions=True
-			)
-
-			# Wait for connection to be established
-			retries = 0
-			max_retries = 100  # 10 second timeout (increased for parallel test execution)
-			while not self._connected and retries < max_retries:
-				await asyncio.sleep(0.1)
-				retries += 1
+			try:
+				tools = self._schema_cache.load(self.server_params, self.server_info) if self._schema_cache else None
+				if tools is None:
+					# Discover available tools
+					async with self._pool.lease() as session:
+						tools_response = await session.list_tools()
+					tools = tools_response.tools
+					if self._schema_cache:
+						self._schema_cache.store(self.server_params, self.server_info, tools)
+				else:
+					logger.debug(f"Using cached tool schemas of '{self.server_name}' {self.server_info.get('version')}")
+			except BaseException:
+				await self._pool.close()
+				raise
 
-			if not self._connected:
-				error_msg = f"Failed to connect to MCP server '{self.server_name}' after {max_retries * 0.1} seconds"
-				raise RuntimeError(error_msg)
+			self._tools = {tool.name: tool for tool in tools}
+			self._connected = True
 
 			logger.info(f"📦 Discovered {len(self._tools)} tools from '{self.server_name}': {list(self._tools.keys())}")
 
@@ -128,38 +165,6 @@ class MCPClient:
 				)
 			)
 
-	async def _run_stdio_client(self, server_params: StdioServerParameters):
-		"""Run the stdio client connection in a background task."""
-		try:
-			async with stdio_client(server_params) as (read_stream, write_stream):
-				self._read_stream = read_stream
-				self._write_stream = write_stream
-
-				# Create and initialize session
-				async with ClientSession(read_stream, write_stream) as session:
-					self.session = session
-
-					# Initialize the connection
-					await session.initialize()
-
-					# Discover available tools
-					tools_response = await session.list_tools()
-					self._tools = {tool.name: tool for tool in tools_response.tools}
-
-					# Mark as connected
-					self._connected = True
-
-					# Keep the connection alive until disconnect is called
-					await self._disconnect_event.wait()
-
-		except Exception as e:
-			logger.error(f'MCP server connection error: {e}')
-			self._connected = False
-			raise
-		finally:
-			self._connected = False
-			self.session = None
-
 	async def disconnect(self) -> None:
 		"""Disconnect from the MCP server."""
 		if not self._connected:
@@ -171,21 +176,9 @@ class MCPClient:
 		try:
 			logger.info(f"🔌 Disconnecting from MCP server '{self.server_name}'")
 
-			# Signal disconnect
+			# Signal disconnect and wait for every server process to exit
 			self._connected = False
-			self._disconnect_event.set()
-
-			# Wait for stdio task to finish
-			if self._stdio_task:
-				try:
-					await asyncio.wait_for(self._stdio_task, timeout=2.0)
-				except TimeoutError:
-					logger.warning(f"Timeout waiting for MCP server '{self.server_name}' to disconnect")
-					self._stdio_task.cancel()
-					try:
-						await self._stdio_task
-					except asyncio.CancelledError:
-						pass
+			await self._pool.close()
 
 			self._tools.clear()
 			self._registered_actions.clear()
@@ -253,46 +246,7 @@ class MCPClient:
 			action_name: Name for the registered action
 			tool: MCP Tool object with schema information
 		"""
-		# Parse tool parameters to create Pydantic model
-		param_fields = {}
-
-		if tool.inputSchema:
-			# MCP tools use JSON Schema for parameters
-			properties = tool.inputSchema.get('properties', {})
-			required = set(tool.inputSchema.get('required', []))
-
-			for param_name, param_schema in properties.items():
-				# Convert JSON Schema type to Python type
-				param_type = self._json_schema_to_python_type(param_schema, f'{action_name}_{param_name}')
-
-				# Determine if field is required and handle defaults
-				if param_name in required:
-					default = ...  # Required field
-				else:
-					# Optional field - make type optional and handle default
-					param_type = param_type | None
-					if 'default' in param_schema:
-						default = param_schema['default']
-					else:
-						default = None
-
-				# Add field with description if available
-				field_kwargs = {}
-				if 'description' in param_schema:
-					field_kwargs['description'] = param_schema['description']
-
-				param_fields[param_name] = (param_type, Field(default, **field_kwargs))
-
-		# Create Pydantic model for the tool parameters
-		if param_fields:
-			# Create a BaseModel class with proper configuration
-			class ConfiguredBaseModel(BaseModel):
-				model_config = ConfigDict(extra='forbid', validate_by_name=True, validate_by_alias=True)
-
-			param_model = create_model(f'{action_name}_Params', __base__=ConfiguredBaseModel, **param_fields)
-		else:
-			# No parameters - create empty model
-			param_model = None
+		param_model = self._param_model_for(action_name, to_wire(tool).get('inputSchema'))
 
 		# Determine if this is a browser-specific tool
 		is_browser_tool = tool.name.startswith('browser_') or 'page' in tool.name.lower()
@@ -308,7 +262,7 @@ class MCPClient:
 			# Type 1: Function takes param model as first parameter
 			async def mcp_action_wrapper(params: param_model) -> ActionResult:  # type: ignore[no-redef]
 				"""Wrapper function that calls the MCP tool."""
-				if not self.session or not self._connected:
+				if not self._connected:
 					return ActionResult(error=f"MCP server '{self.server_name}' not connected", success=False)
 
 				# Convert pydantic model to dict for MCP call
@@ -320,8 +274,9 @@ class MCPClient:
 				error_msg = None
 
 				try:
-					# Call the MCP tool
-					result = await self.session.call_tool(tool.name, tool_params)
+					# Call the MCP tool on a pooled session
+					async with self._pool.lease() as session:
+						result = await session.call_tool(tool.name, tool_params)
 
 					# Convert MCP result to ActionResult
 					extracted_content = self._format_mcp_result(result)
@@ -354,7 +309,7 @@ class MCPClient:
 			# No parameters - empty function signature
 			async def mcp_action_wrapper() -> ActionResult:  # type: ignore[no-redef]
 				"""Wrapper function that calls the MCP tool."""
-				if not self.session or not self._connected:
+				if not self._connected:
 					return ActionResult(error=f"MCP server '{self.server_name}' not connected", success=False)
 
 				logger.debug(f"🔧 Calling MCP tool '{tool.name}' with no params")
@@ -363,8 +318,9 @@ class MCPClient:
 				error_msg = None
 
 				try:
-					# Call the MCP tool with empty params
-					result = await self.session.call_tool(tool.name, {})
+					# Call the MCP tool with empty params on a pooled session
+					async with self._pool.lease() as session:
+						result = await session.call_tool(tool.name, {})
 
 					# Convert MCP result to ActionResult
 					extracted_content = self._format_mcp_result(result)
@@ -406,6 +362,58 @@ class MCPClient:
 
 		logger.debug(f"✅ Registered MCP tool '{tool.name}' as action '{action_name}'")
 
+	def _param_model_for(self, action_name: str, input_schema: dict | None) -> type[BaseModel] | None:
+		"""Parameter model of a tool, built once per action name and input schema."""
+		key = (action_name, json.dumps(input_schema, sort_keys=True))
+		if key not in _param_models:
+			_param_models[key] = self._create_param_model(action_name, input_schema)
+		return _param_models[key]
+
+	def _create_param_model(self, action_name: str, input_schema: dict | None) -> type[BaseModel] | None:
+		"""Create the Pydantic model for a tool's JSON Schema parameters (None without parameters)."""
+		# Parse tool parameters to create Pydantic model
+		param_fields = {}
+
+		if input_schema:
+			# MCP tools use JSON Schema for parameters
+			properties = input_schema.get('properties', {})
+			required = set(input_schema.get('required', []))
+
+			for param_name, param_schema in properties.items():
+				# Convert JSON Schema type to Python type
+				param_type = self._json_schema_to_python_type(param_schema, f'{action_name}_{param_name}')
+
+				# Determine if field is required and handle defaults
+				if param_name in required:
+					default = ...  # Required field
+				else:
+					# Optional field - make type optional and handle default
+					param_type = param_type | None
+					if 'default' in param_schema:
+						default = param_schema['default']
+					else:
+						default = None
+
+				# Add field with description if available
+				field_kwargs = {}
+				if 'description' in param_schema:
+					field_kwargs['description'] = param_schema['description']
+
+				param_fields[param_name] = (param_type, Field(default, **field_kwargs))
+
+		# Create Pydantic model for the tool parameters
+		if param_fields:
+			# Create a BaseModel class with proper configuration
+			class ConfiguredBaseModel(BaseModel):
+				model_config = ConfigDict(extra='forbid', validate_by_name=True, validate_by_alias=True)
+
+			param_model = create_model(f'{action_name}_Params', __base__=ConfiguredBaseModel, **param_fields)
+		else:
+			# No parameters - create empty model
+			param_model = None
+
+		return param_model
+
 	def _format_mcp_result(self, result: Any) -> str:
 		"""Format MCP tool result into a string for ActionResult.
 
@@ -0,0 +1,267 @@
+"""Connection management for MCPClient: pooled stdio sessions and the on-disk tool schema cache.
+
+Each MCPConnection is one server process with an initialized ClientSession, run in
+a background task that signals readiness through an event. MCPConnectionPool hands
+out sessions for tool calls: idle sessions first, then (while the pool may grow)
+new sessions started in the background, pipelining up to `max_calls_per_session`
+calls onto the least busy session in the meantime.
+
+Usage:
+	pool = MCPConnectionPool(server_params, 'my-server', max_sessions=4)
+	await pool.start()
+	async with pool.lease() as session:
+		result = await session.call_tool('search', {'query': 'shoes'})
+	await pool.close()
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any
+
+from mcp import ClientSession, StdioServerParameters, types
+from mcp.client.stdio import stdio_client
+
+from browser_use.utils import create_task_with_error_handling
+
+logger = logging.getLogger(__name__)
+
+
+def to_wire(model: Any) -> dict[str, Any]:
+	"""An MCP SDK object as it appears in the protocol (camelCase keys on every SDK version)."""
+	return model.model_dump(mode='json', by_alias=True, exclude_none=True)
+
+
+class MCPConnection:
+	"""One stdio session with an MCP server, kept open by a background task."""
+
+	def __init__(self, server_params: StdioServerParameters, server_name: str):
+		self.server_params = server_params
+		self.server_name = server_name
+		self.session: ClientSession | None = None
+		self.server_info: dict[str, Any] = {}
+		self.in_flight = 0
+		self._task: asyncio.Task | None = None
+		self._ready = asyncio.Event()
+		self._closing = asyncio.Event()
+		self._error: BaseException | None = None
+
+	@property
+	def connected(self) -> bool:
+		return self.session is not None
+
+	async def open(self, timeout: float) -> None:
+		"""Start the server process and wait until the session is initialized.
+
+		Raises:
+			RuntimeError: If the session isn't ready within timeout or the server fails to start
+		"""
+		self._task = create_task_with_error_handling(self._run(), name='mcp_stdio_client', suppress_exceptions=True)
+		try:
+			await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+		except TimeoutError:
+			await self.close()
+			raise RuntimeError(f"Failed to connect to MCP server '{self.server_name}' after {timeout} seconds")
+		if not self.connected:
+			raise RuntimeError(f"Failed to connect to MCP server '{self.server_name}': {self._error}")
+
+	async def _run(self) -> None:
+		try:
+			async with stdio_client(self.server_params) as (read_stream, write_stream):
+				async with ClientSession(read_stream, write_stream) as session:
+					result = await session.initialize()
+					self.server_info = to_wire(result).get('serverInfo', {})
+					self.session = session
+					self._ready.set()
+
+					# Keep the connection alive until close is called
+					await self._closing.wait()
+		except Exception as e:
+			logger.error(f'MCP server connection error: {e}')
+			self._error = e
+			raise
+		finally:
+			self.session = None
+			# Wakes up open() when the server fails before the session is ready
+			self._ready.set()
+
+	async def close(self, timeout: float = 2.0) -> None:
+		self._closing.set()
+		if self._task is None:
+			return
+		try:
+			await asyncio.wait_for(self._task, timeout=timeout)
+		except TimeoutError:
+			logger.warning(f"Timeout waiting for MCP server '{self.server_name}' to disconnect")
+			self._task.cancel()
+			try:
+				await self._task
+			except asyncio.CancelledError:
+				pass
+		except Exception:
+			pass  # Already logged by _run
+
+
+class MCPConnectionPool:
+	"""Up to max_sessions sessions with one MCP server, shared by concurrent tool calls."""
+
+	def __init__(
+		self,
+		server_params: StdioServerParameters,
+		server_name: str,
+		max_sessions: int = 1,
+		max_calls_per_session: int = 8,
+		connect_timeout: float = 10.0,
+	):
+		"""Initialize the pool.
+
+		Args:
+			server_params: How to start the server process
+			server_name: Name of the MCP server (for logging)
+			max_sessions: Most server processes to run; more are started only while all are busy
+			max_calls_per_session: Most tool calls in flight on one session
+			connect_timeout: Seconds to wait for a new session to initialize
+		"""
+		self.server_params = server_params
+		self.server_name = server_name
+		self.max_sessions = max(1, max_sessions)
+		self.max_calls_per_session = max(1, max_calls_per_session)
+		self.connect_timeout = connect_timeout
+		self.connections: list[MCPConnection] = []
+		self._opening = 0
+		self._failed_opens = 0
+		# After a session fails to open, the pool doesn't grow again until then (monotonic time)
+		self._grow_after = 0.0
+		self._changed = asyncio.Condition()
+		self._open_tasks: set[asyncio.Task] = set()
+
+	@property
+	def session(self) -> ClientSession | None:
+		"""Session of the first live connection."""
+		return next((c.session for c in self.connections if c.connected), None)
+
+	async def start(self) -> MCPConnection:
+		"""Open the first session.
+
+		Raises:
+			RuntimeError: If the server can't be started
+		"""
+		connection = MCPConnection(self.server_params, self.server_name)
+		await connection.open(self.connect_timeout)
+		async with self._changed:
+			self.connections.append(connection)
+		return connection
+
+	@asynccontextmanager
+	async def lease(self) -> AsyncIterator[ClientSession]:
+		"""Borrow a session for one call.
+
+		Raises:
+			RuntimeError: If no session can be opened
+		"""
+		connection = await self._acquire()
+		assert connection.session is not None
+		try:
+			yield connection.session
+		finally:
+			async with self._changed:
+				connection.in_flight -= 1
+				self._changed.notify_all()
+
+	async def _acquire(self) -> MCPConnection:
+		async with self._changed:
+			failed_opens = self._failed_opens
+			while True:
+				# Connections whose server exited are dropped (and replaced on demand)
+				self.connections = [c for c in self.connections if c.connected]
+				least_busy = min(self.connections, key=lambda c: c.in_flight, default=None)
+				if least_busy is None and self._failed_opens > failed_opens:
+					raise RuntimeError(f"MCP server '{self.server_name}' not connected")
+				if least_busy is None or least_busy.in_flight > 0:
+					can_grow = len(self.connections) + self._opening < self.max_sessions
+					if can_grow and (least_busy is None or time.monotonic() >= self._grow_after):
+						self._open_in_background()
+				if least_busy is not None and least_busy.in_flight < self.max_calls_per_session:
+					least_busy.in_flight += 1
+					return least_busy
+				await self._changed.wait()
+
+	def _open_in_background(self) -> None:
+		self._opening += 1
+		task = create_task_with_error_handling(self._open_one(), name='mcp_open_session', suppress_exceptions=True)
+		self._open_tasks.add(task)
+		task.add_done_callback(self._open_tasks.discard)
+
+	async def _open_one(self) -> None:
+		connection = MCPConnection(self.server_params, self.server_name)
+		try:
+			await connection.open(self.connect_timeout)
+		except asyncio.CancelledError:
+			await connection.close()
+			raise
+		except Exception as e:
+			logger.warning(f"Could not open another session with MCP server '{self.server_name}': {e}")
+			connection = None
+		async with self._changed:
+			self._opening -= 1
+			if connection is None:
+				self._failed_opens += 1
+				self._grow_after = time.monotonic() + 5.0
+			else:
+				self.connections.append(connection)
+				logger.debug(f"Opened session {len(self.connections)}/{self.max_sessions} with MCP server '{self.server_name}'")
+			self._changed.notify_all()
+
+	async def close(self) -> None:
+		"""Close every session, including ones still starting."""
+		for task in list(self._open_tasks):
+			task.cancel()
+		await asyncio.gather(*self._open_tasks, return_exceptions=True)
+		connections, self.connections = self.connections, []
+		await asyncio.gather(*(c.close() for c in connections))
+
+
+class ToolSchemaCache:
+	"""Tool lists of MCP servers on disk, keyed by server command and reported server version.
+
+	Servers that don't report a version are never cached, since there's no way to
+	tell when their tools change.
+	"""
+
+	def __init__(self, cache_dir: str | Path):
+		self.cache_dir = Path(cache_dir)
+
+	def _path(self, server_params: StdioServerParameters, server_info: dict[str, Any]) -> Path | None:
+		version = server_info.get('version')
+		if not version:
+			return None
+		key = json.dumps([server_params.command, server_params.args, server_info.get('name'), version])
+		return self.cache_dir / f'{hashlib.sha256(key.encode()).hexdigest()[:32]}.json'
+
+	def load(self, server_params: StdioServerParameters, server_info: dict[str, Any]) -> list[types.Tool] | None:
+		path = self._path(server_params, server_info)
+		if path is None or not path.exists():
+			return None
+		try:
+			return [types.Tool.model_validate(tool) for tool in json.loads(path.read_text())['tools']]
+		except Exception as e:
+			logger.debug(f'Ignoring unreadable MCP tool schema cache {path}: {e}')
+			return None
+
+	def store(self, server_params: StdioServerParameters, server_info: dict[str, Any], tools: list[types.Tool]) -> None:
+		path = self._path(server_params, server_info)
+		if path is None:
+			return
+		try:
+			self.cache_dir.mkdir(parents=True, exist_ok=True)
+			tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+			tmp_path.write_text(json.dumps({'server': server_info, 'tools': [to_wire(tool) for tool in tools]}))
+			tmp_path.replace(path)
+		except OSError as e:
+			logger.debug(f'Could not write MCP tool schema cache {path}: {e}')
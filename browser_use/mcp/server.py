@@ -6,6 +6,11 @@ This server provides tools for:
 - Content extraction from web pages
 - File system operations
 
+Browser control tools take an optional session_id. Each session has its own browser; calls for
+different sessions run concurrently, calls for the same session run in order. At most
+BROWSER_USE_MCP_MAX_SESSIONS sessions stay open (the least recently used idle one is closed to make
+room), and BROWSER_USE_MCP_WARM_SESSIONS spare browsers can be started ahead of first use.
+
 Usage:
     uvx browser-use --mcp
 
@@ -92,7 +97,7 @@ logging.disable(logging.CRITICAL)
 # Import browser_use modules
 from browser_use import ActionModel, Agent
 from browser_use.browser import BrowserProfile, BrowserSession
-from browser_use.config import get_default_llm, get_default_profile, load_browser_use_config
+from browser_use.config import CONFIG, get_default_llm, get_default_profile, load_browser_use_config
 from browser_use.filesystem.file_system import FileSystem
 from browser_use.llm.openai.chat import ChatOpenAI
 from browser_use.tools.service import Tools
@@ -149,8 +154,25 @@ except ImportError:
 	logger.error('MCP SDK not installed. Install with: pip install mcp')
 	sys.exit(1)
 
+from browser_use.mcp.sessions import SessionPool
 from browser_use.telemetry import MCPServerTelemetryEvent, ProductTelemetry
-from browser_use.utils import create_task_with_error_handling, get_browser_use_version
+from browser_use.utils import get_browser_use_version
+
+# Calls without a session_id share this session, which uses the configured browser profile
+DEFAULT_SESSION_ID = 'default'
+
+SESSION_ID_SCHEMA = {
+	'type': 'string',
+	'description': (
+		'Browser session to run in, created on first use. Calls for different sessions run concurrently, '
+		f'calls for the same session run in order. Defaults to the shared "{DEFAULT_SESSION_ID}" session'
+	),
+}
+
+
+def session_scoped(input_schema: dict[str, Any]) -> dict[str, Any]:
+	"""Add the session_id argument to a browser control tool, so it can run in its own session."""
+	return {**input_schema, 'properties': {**input_schema['properties'], 'session_id': SESSION_ID_SCHEMA}}
 
 
 def get_parent_process_cmdline() -> str | None:
@@ -187,24 +209,28 @@ def get_parent_process_cmdline() -> str | None:
 class BrowserUseServer:
 	"""MCP Server for browser-use capabilities."""
 
-	def __init__(self, session_timeout_minutes: int = 10):
+	def __init__(self, session_timeout_minutes: int = 10, max_sessions: int = 4, warm_sessions: int = 0):
 		# Ensure all logging goes to stderr (in case new loggers were created)
 		_ensure_all_loggers_use_stderr()
 
 		self.server = Server('browser-use')
 		self.config = load_browser_use_config()
 		self.agent: Agent | None = None
-		self.browser_session: BrowserSession | None = None
 		self.tools: Tools | None = None
 		self.llm: ChatOpenAI | None = None
 		self.file_system: FileSystem | None = None
 		self._telemetry = ProductTelemetry()
 		self._start_time = time.time()
 
-		# Session management
-		self.active_sessions: dict[str, dict[str, Any]] = {}  # session_id -> session info
+		# Session management: one browser per session id, calls on different sessions run concurrently
 		self.session_timeout_minutes = session_timeout_minutes
-		self._cleanup_task: Any = None
+		self.sessions: SessionPool[BrowserSession] = SessionPool(
+			create=self._create_browser_session,
+			close=self._stop_browser_session,
+			max_sessions=max_sessions,
+			idle_timeout=session_timeout_minutes * 60,
+			warm_sessions=warm_sessions,
+		)
 
 		# Setup handlers
 		self._setup_handlers()
@@ -215,126 +241,146 @@ class BrowserUseServer:
 		@self.server.list_tools()
 		async def handle_list_tools() -> list[types.Tool]:
 			"""List all available browser-use tools."""
-			return [
+			tools = [
 				# Agent tools
 				# Direct browser control tools
 				types.Tool(
 					name='browser_navigate',
 					description='Navigate to a URL in the browser',
-					inputSchema={
-						'type': 'object',
-						'properties': {
-							'url': {'type': 'string', 'description': 'The URL to navigate to'},
-							'new_tab': {'type': 'boolean', 'description': 'Whether to open in a new tab', 'default': False},
-						},
-						'required': ['url'],
-					},
+					inputSchema=session_scoped(
+						{
+							'type': 'object',
+							'properties': {
+								'url': {'type': 'string', 'description': 'The URL to navigate to'},
+								'new_tab': {'type': 'boolean', 'description': 'Whether to open in a new tab', 'default': False},
+							},
+							'required': ['url'],
+						}
+					),
 				),
 				types.Tool(
 					name='browser_click',
 					description='Click an element on the page by its index',
-					inputSchema={
-						'type': 'object',
-						'properties': {
-							'index': {
-								'type': 'integer',
-								'description': 'The index of the link or element to click (from browser_get_state)',
+					inputSchema=session_scoped(
+						{
+							'type': 'object',
+							'properties': {
+								'index': {
+									'type': 'integer',
+									'description': 'The index of the link or element to click (from browser_get_state)',
+								},
+								'new_tab': {
+									'type': 'boolean',
+									'description': 'Whether to open any resulting navigation in a new tab',
+									'default': False,
+								},
 							},
-							'new_tab': {
-								'type': 'boolean',
-								'description': 'Whether to open any resulting navigation in a new tab',
-								'default': False,
-							},
-						},
-						'required': ['index'],
-					},
+							'required': ['index'],
+						}
+					),
 				),
 				types.Tool(
 					name='browser_type',
 					description='Type text into an input field',
-					inputSchema={
-						'type': 'object',
-						'properties': {
-							'index': {
-								'type': 'integer',
-								'description': 'The index of the input element (from browser_get_state)',
+					inputSchema=session_scoped(
+						{
+							'type': 'object',
+							'properties': {
+								'index': {
+									'type': 'integer',
+									'description': 'The index of the input element (from browser_get_state)',
+								},
+								'text': {'type': 'string', 'description': 'The text to type'},
 							},
-							'text': {'type': 'string', 'description': 'The text to type'},
-						},
-						'required': ['index', 'text'],
-					},
+							'required': ['index', 'text'],
+						}
+					),
 				),
 				types.Tool(
 					name='browser_get_state',
 					description='Get the current state of the page including all interactive elements',
-					inputSchema={
-						'type': 'object',
-						'properties': {
-							'include_screenshot': {
-								'type': 'boolean',
-								'description': 'Whether to include a screenshot of the current page',
-								'default': False,
-							}
-						},
-					},
+					inputSchema=session_scoped(
+						{
+							'type': 'object',
+							'properties': {
+								'include_screenshot': {
+									'type': 'boolean',
+									'description': 'Whether to include a screenshot of the current page',
+									'default': False,
+								}
+							},
+						}
+					),
 				),
 				types.Tool(
 					name='browser_extract_content',
 					description='Extract structured content from the current page based on a query',
-					inputSchema={
-						'type': 'object',
-						'properties': {
-							'query': {'type': 'string', 'description': 'What information to extract from the page'},
-							'extract_links': {
-								'type': 'boolean',
-								'description': 'Whether to include links in the extraction',
-								'default': False,
+					inputSchema=session_scoped(
+						{
+							'type': 'object',
+							'properties': {
+								'query': {'type': 'string', 'description': 'What information to extract from the page'},
+								'extract_links': {
+									'type': 'boolean',
+									'description': 'Whether to include links in the extraction',
+									'default': False,
+								},
 							},
-						},
-						'required': ['query'],
-					},
+							'required': ['query'],
+						}
+					),
 				),
 				types.Tool(
 					name='browser_scroll',
 					description='Scroll the page',
-					inputSchema={
-						'type': 'object',
-						'properties': {
-							'direction': {
-								'type': 'string',
-								'enum': ['up', 'down'],
-								'description': 'Direction to scroll',
-								'default': 'down',
-							}
-						},
-					},
+					inputSchema=session_scoped(
+						{
+							'type': 'object',
+							'properties': {
+								'direction': {
+									'type': 'string',
+									'enum': ['up', 'down'],
+									'description': 'Direction to scroll',
+									'default': 'down',
+								}
+							},
+						}
+					),
 				),
 				types.Tool(
 					name='browser_go_back',
 					description='Go back to the previous page',
-					inputSchema={'type': 'object', 'properties': {}},
+					inputSchema=session_scoped({'type': 'object', 'properties': {}}),
 				),
 				# Tab management
 				types.Tool(
-					name='browser_list_tabs', description='List all open tabs', inputSchema={'type': 'object', 'properties': {}}
+					name='browser_list_tabs',
+					description='List all open tabs',
+					inputSchema=session_scoped({'type': 'object', 'properties': {}}),
 				),
 				types.Tool(
 					name='browser_switch_tab',
 					description='Switch to a different tab',
-					inputSchema={
-						'type': 'object',
-						'properties': {'tab_id': {'type': 'string', 'description': '4 Character Tab ID of the tab to switch to'}},
-						'required': ['tab_id'],
-					},
+					inputSchema=session_scoped(
+						{
+							'type': 'object',
+							'properties': {
+								'tab_id': {'type': 'string', 'description': '4 Character Tab ID of the tab to switch to'}
+							},
+							'required': ['tab_id'],
+						}
+					),
 				),
 				types.Tool(
 					name='browser_close_tab',
 					description='Close a tab',
-					inputSchema={
-						'type': 'object',
-						'properties': {'tab_id': {'type': 'string', 'description': '4 Character Tab ID of the tab to close'}},
-						'required': ['tab_id'],
-					},
+					inputSchema=session_scoped(
+						{
+							'type': 'object',
+							'properties': {'tab_id': {'type': 'string', 'description': '4 Character Tab ID of the tab to close'}},
+							'required': ['tab_id'],
+						}
+					),
 				),
 				# types.Tool(
 				# 	name="browser_close",
@@ -405,6 +451,7 @@ class BrowserUseServer:
 					inputSchema={'type': 'object', 'properties': {}},
 				),
 			]
+			return tools
 
 		@self.server.list_resources()
 		async def handle_list_resources() -> list[types.Resource]:
@@ -464,90 +511,54 @@ class BrowserUseServer:
 		elif tool_name == 'browser_close_all':
 			return await self._close_all_sessions()
 
-		# Direct browser control tools (require active session)
-		elif tool_name.startswith('browser_'):
-			# Ensure browser session exists
-			if not self.browser_session:
-				await self._init_browser_session()
+		elif tool_name == 'browser_close':
+			return await self._close_session(arguments.get('session_id') or DEFAULT_SESSION_ID)
 
-			if tool_name == 'browser_navigate':
-				return await self._navigate(arguments['url'], arguments.get('new_tab', False))
+		# Direct browser control tools, run in the caller's session (opened on first use)
+		elif tool_name.startswith('browser_'):
+			self._init_tools()
+			session_id = arguments.get('session_id') or DEFAULT_SESSION_ID
+			# The default session keeps the configured profile, so it never takes a warm spare
+			async with self.sessions.lease(session_id, use_spare=session_id != DEFAULT_SESSION_ID) as session:
+				browser_session = session.resource
 
-			elif tool_name == 'browser_click':
-				return await self._click(arguments['index'], arguments.get('new_tab', False))
+				if tool_name == 'browser_navigate':
+					return await self._navigate(browser_session, arguments['url'], arguments.get('new_tab', False))
 
-			elif tool_name == 'browser_type':
-				return await self._type_text(arguments['index'], arguments['text'])
+				elif tool_name == 'browser_click':
+					return await self._click(browser_session, arguments['index'], arguments.get('new_tab', False))
 
-			elif tool_name == 'browser_get_state':
-				return await self._get_browser_state(arguments.get('include_screenshot', False))
+				elif tool_name == 'browser_type':
+					return await self._type_text(browser_session, arguments['index'], arguments['text'])
 
-			elif tool_name == 'browser_extract_content':
-				return await self._extract_content(arguments['query'], arguments.get('extract_links', False))
+				elif tool_name == 'browser_get_state':
+					return await self._get_browser_state(browser_session, arguments.get('include_screenshot', False))
 
-			elif tool_name == 'browser_scroll':
-				return await self._scroll(arguments.get('direction', 'down'))
+				elif tool_name == 'browser_extract_content':
+					return await self._extract_content(browser_session, arguments['query'], arguments.get('extract_links', False))
 
-			elif tool_name == 'browser_go_back':
-				return await self._go_back()
+				elif tool_name == 'browser_scroll':
+					return await self._scroll(browser_session, arguments.get('direction', 'down'))
 
-			elif tool_name == 'browser_close':
-				return await self._close_browser()
+				elif tool_name == 'browser_go_back':
+					return await self._go_back(browser_session)
 
-			elif tool_name == 'browser_list_tabs':
-				return await self._list_tabs()
+				elif tool_name == 'browser_list_tabs':
+					return await self._list_tabs(browser_session)
 
-			elif tool_name == 'browser_switch_tab':
-				return await self._switch_tab(arguments['tab_id'])
+				elif tool_name == 'browser_switch_tab':
+					return await self._switch_tab(browser_session, arguments['tab_id'])
 
-			elif tool_name == 'browser_close_tab':
-				return await self._close_tab(arguments['tab_id'])
+				elif tool_name == 'browser_close_tab':
+					return await self._close_tab(browser_session, arguments['tab_id'])
 
 		return f'Unknown tool: {tool_name}'
 
-	async def _init_browser_session(self, allowed_domains: list[str] | None = None, **kwargs):
-		"""Initialize browser session using config"""
-		if self.browser_session:
+	def _init_tools(self) -> None:
+		"""Create the tools, LLM and file system shared by all browser sessions."""
+		if self.tools is not None:
 			return
 
-		# Ensure all logging goes to stderr before browser initialization
-		_ensure_all_loggers_use_stderr()
-
-		logger.debug('Initializing browser session...')
-
-		# Get profile config
-		profile_config = get_default_profile(self.config)
-
-		# Merge profile config with defaults and overrides
-		profile_data = {
-			'downloads_path': str(Path.home() / 'Downloads' / 'browser-use-mcp'),
-			'wait_between_actions': 0.5,
-			'keep_alive': True,
-			'user_data_dir': '~/.config/browseruse/profiles/default',
-			'device_scale_factor': 1.0,
-			'disable_security': False,
-			'headless': False,
-			**profile_config,  # Config values override defaults
-		}
-
-		# Tool parameter overrides (highest priority)
-		if allowed_domains is not None:
-			profile_data['allowed_domains'] = allowed_domains
-
-		# Merge any additional kwargs that are valid BrowserProfile fields
-		for key, value in kwargs.items():
-			profile_data[key] = value
-
-		# Create browser profile
-		profile = BrowserProfile(**profile_data)
-
-		# Create browser session
-		self.browser_session = BrowserSession(browser_profile=profile)
-		await self.browser_session.start()
-
-		# Track the session for management
-		self._track_session(self.browser_session)
-
 		# Create tools for direct actions
 		self.tools = Tools()
 
@@ -566,10 +577,41 @@ class BrowserUseServer:
 			)
 
 		# Initialize FileSystem for extraction actions
-		file_system_path = profile_config.get('file_system_path', '~/.browser-use-mcp')
+		file_system_path = get_default_profile(self.config).get('file_system_path', '~/.browser-use-mcp')
 		self.file_system = FileSystem(base_dir=Path(file_system_path).expanduser())
 
-		logger.debug('Browser session initialized')
+	async def _create_browser_session(self, session_id: str | None) -> BrowserSession:
+		"""Start a browser for a session, or a warm spare when session_id is None."""
+		# Ensure all logging goes to stderr before browser initialization
+		_ensure_all_loggers_use_stderr()
+
+		logger.debug(f'Starting browser for session {session_id or "(warm spare)"}...')
+
+		# Get profile config
+		profile_config = get_default_profile(self.config)
+
+		# Merge profile config with defaults
+		profile_data = {
+			'downloads_path': str(Path.home() / 'Downloads' / 'browser-use-mcp'),
+			'wait_between_actions': 0.5,
+			'keep_alive': True,
+			'user_data_dir': '~/.config/browseruse/profiles/default',
+			'device_scale_factor': 1.0,
+			'disable_security': False,
+			'headless': False,
+			**profile_config,  # Config values override defaults
+		}
+		if session_id != DEFAULT_SESSION_ID:
+			# Chrome locks its user data dir, so every other session gets its own temporary profile
+			profile_data['user_data_dir'] = None
+
+		browser_session = BrowserSession(browser_profile=BrowserProfile(**profile_data))
+		await browser_session.start()
+		logger.debug(f'Browser for session {session_id or "(warm spare)"} started')
+		return browser_session
+
+	async def _stop_browser_session(self, browser_session: BrowserSession) -> None:
+		await browser_session.kill()
 
 	async def _retry_with_browser_use_agent(
 		self,
@@ -674,35 +716,23 @@ class BrowserUseServer:
 			# Clean up
 			await agent.close()
 
-	async def _navigate(self, url: str, new_tab: bool = False) -> str:
+	async def _navigate(self, browser_session: BrowserSession, url: str, new_tab: bool = False) -> str:
 		"""Navigate to a URL."""
-		if not self.browser_session:
-			return 'Error: No browser session active'
-
-		# Update session activity
-		self._update_session_activity(self.browser_session.id)
-
 		from browser_use.browser.events import NavigateToUrlEvent
 
 		if new_tab:
-			event = self.browser_session.event_bus.dispatch(NavigateToUrlEvent(url=url, new_tab=True))
+			event = browser_session.event_bus.dispatch(NavigateToUrlEvent(url=url, new_tab=True))
 			await event
 			return f'Opened new tab with URL: {url}'
 		else:
-			event = self.browser_session.event_bus.dispatch(NavigateToUrlEvent(url=url))
+			event = browser_session.event_bus.dispatch(NavigateToUrlEvent(url=url))
 			await event
 			return f'Navigated to: {url}'
 
-	async def _click(self, index: int, new_tab: bool = False) -> str:
+	async def _click(self, browser_session: BrowserSession, index: int, new_tab: bool = False) -> str:
 		"""Click an element by index."""
-		if not self.browser_session:
-			return 'Error: No browser session active'
-
-		# Update session activity
-		self._update_session_activity(self.browser_session.id)
-
 		# Get the element
-		element = await self.browser_session.get_dom_element_by_index(index)
+		element = await browser_session.get_dom_element_by_index(index)
 		if not element:
 			return f'Element with index {index} not found'
 
@@ -711,7 +741,7 @@ class BrowserUseServer:
 			href = element.attributes.get('href')
 			if href:
 				# Convert relative href to absolute URL
-				state = await self.browser_session.get_browser_state_summary()
+				state = await browser_session.get_browser_state_summary()
 				current_url = state.url
 				if href.startswith('/'):
 					# Relative URL - construct full URL
@@ -725,7 +755,7 @@ class BrowserUseServer:
 				# Open link in new tab
 				from browser_use.browser.events import NavigateToUrlEvent
 
-				event = self.browser_session.event_bus.dispatch(NavigateToUrlEvent(url=full_url, new_tab=True))
+				event = browser_session.event_bus.dispatch(NavigateToUrlEvent(url=full_url, new_tab=True))
 				await event
 				return f'Clicked element {index} and opened in new tab {full_url[:20]}...'
 			else:
@@ -733,23 +763,20 @@ class BrowserUseServer:
 				# Opening in new tab without href is not reliably supported
 				from browser_use.browser.events import ClickElementEvent
 
-				event = self.browser_session.event_bus.dispatch(ClickElementEvent(node=element))
+				event = browser_session.event_bus.dispatch(ClickElementEvent(node=element))
 				await event
 				return f'Clicked element {index} (new tab not supported for non-link elements)'
 		else:
 			# Normal click
 			from browser_use.browser.events import ClickElementEvent
 
-			event = self.browser_session.event_bus.dispatch(ClickElementEvent(node=element))
+			event = browser_session.event_bus.dispatch(ClickElementEvent(node=element))
 			await event
 			return f'Clicked element {index}'
 
-	async def _type_text(self, index: int, text: str) -> str:
+	async def _type_text(self, browser_session: BrowserSession, index: int, text: str) -> str:
 		"""Type text into an element."""
-		if not self.browser_session:
-			return 'Error: No browser session active'
-
-		element = await self.browser_session.get_dom_element_by_index(index)
+		element = await browser_session.get_dom_element_by_index(index)
 		if not element:
 			return f'Element with index {index} not found'
 
@@ -777,7 +804,7 @@ class BrowserUseServer:
 			else:
 				sensitive_key_name = 'credential'
 
-		event = self.browser_session.event_bus.dispatch(
+		event = browser_session.event_bus.dispatch(
 			TypeTextEvent(node=element, text=text, is_sensitive=is_potentially_sensitive, sensitive_key_name=sensitive_key_name)
 		)
 		await event
@@ -790,12 +817,9 @@ class BrowserUseServer:
 		else:
 			return f"Typed '{text}' into element {index}"
 
-	async def _get_browser_state(self, include_screenshot: bool = False) -> str:
+	async def _get_browser_state(self, browser_session: BrowserSession, include_screenshot: bool = False) -> str:
 		"""Get current browser state."""
-		if not self.browser_session:
-			return 'Error: No browser session active'
-
-		state = await self.browser_session.get_browser_state_summary()
+		state = await browser_session.get_browser_state_summary()
 
 		result = {
 			'url': state.url,
@@ -822,7 +846,7 @@ class BrowserUseServer:
 
 		return json.dumps(result, indent=2)
 
-	async def _extract_content(self, query: str, extract_links: bool = False) -> str:
+	async def _extract_content(self, browser_session: BrowserSession, query: str, extract_links: bool = False) -> str:
 		"""Extract content from current page."""
 		if not self.llm:
 			return 'Error: LLM not initialized (set OPENAI_API_KEY)'
@@ -830,13 +854,10 @@ class BrowserUseServer:
 		if not self.file_system:
 			return 'Error: FileSystem not initialized'
 
-		if not self.browser_session:
-			return 'Error: No browser session active'
-
 		if not self.tools:
 			return 'Error: Tools not initialized'
 
-		state = await self.browser_session.get_browser_state_summary()
+		state = await browser_session.get_browser_state_summary()
 
 		# Use the extract action
 		# Create a dynamic action model that matches the tools's expectations
@@ -857,22 +878,19 @@ class BrowserUseServer:
 		)
 		action_result = await self.tools.act(
 			action=action,
-			browser_session=self.browser_session,
+			browser_session=browser_session,
 			page_extraction_llm=self.llm,
 			file_system=self.file_system,
 		)
 
 		return action_result.extracted_content or 'No content extracted'
 
-	async def _scroll(self, direction: str = 'down') -> str:
+	async def _scroll(self, browser_session: BrowserSession, direction: str = 'down') -> str:
 		"""Scroll the page."""
-		if not self.browser_session:
-			return 'Error: No browser session active'
-
 		from browser_use.browser.events import ScrollEvent
 
 		# Scroll by a standard amount (500 pixels)
-		event = self.browser_session.event_bus.dispatch(
+		event = browser_session.event_bus.dispatch(
 			ScrollEvent(
 				direction=direction,  # type: ignore
 				amount=500,
@@ -881,93 +899,57 @@ class BrowserUseServer:
 		await event
 		return f'Scrolled {direction}'
 
-	async def _go_back(self) -> str:
+	async def _go_back(self, browser_session: BrowserSession) -> str:
 		"""Go back in browser history."""
-		if not self.browser_session:
-			return 'Error: No browser session active'
-
 		from browser_use.browser.events import GoBackEvent
 
-		event = self.browser_session.event_bus.dispatch(GoBackEvent())
+		event = browser_session.event_bus.dispatch(GoBackEvent())
 		await event
 		return 'Navigated back'
 
-	async def _close_browser(self) -> str:
-		"""Close the browser session."""
-		if self.browser_session:
-			from browser_use.browser.events import BrowserStopEvent
-
-			event = self.browser_session.event_bus.dispatch(BrowserStopEvent())
-			await event
-			self.browser_session = None
-			self.tools = None
-			return 'Browser closed'
-		return 'No browser session to close'
-
-	async def _list_tabs(self) -> str:
+	async def _list_tabs(self, browser_session: BrowserSession) -> str:
 		"""List all open tabs."""
-		if not self.browser_session:
-			return 'Error: No browser session active'
-
-		tabs_info = await self.browser_session.get_tabs()
+		tabs_info = await browser_session.get_tabs()
 		tabs = []
 		for i, tab in enumerate(tabs_info):
 			tabs.append({'tab_id': tab.target_id[-4:], 'url': tab.url, 'title': tab.title or ''})
 		return json.dumps(tabs, indent=2)
 
-	async def _switch_tab(self, tab_id: str) -> str:
+	async def _switch_tab(self, browser_session: BrowserSession, tab_id: str) -> str:
 		"""Switch to a different tab."""
-		if not self.browser_session:
-			return 'Error: No browser session active'
-
 		from browser_use.browser.events import SwitchTabEvent
 
-		target_id = await self.browser_session.get_target_id_from_tab_id(tab_id)
-		event = self.browser_session.event_bus.dispatch(SwitchTabEvent(target_id=target_id))
+		target_id = await browser_session.get_target_id_from_tab_id(tab_id)
+		event = browser_session.event_bus.dispatch(SwitchTabEvent(target_id=target_id))
 		await event
-		state = await self.browser_session.get_browser_state_summary()
+		state = await browser_session.get_browser_state_summary()
 		return f'Switched to tab {tab_id}: {state.url}'
 
-	async def _close_tab(self, tab_id: str) -> str:
+	async def _close_tab(self, browser_session: BrowserSession, tab_id: str) -> str:
 		"""Close a specific tab."""
-		if not self.browser_session:
-			return 'Error: No browser session active'
-
 		from browser_use.browser.events import CloseTabEvent
 
-		target_id = await self.browser_session.get_target_id_from_tab_id(tab_id)
-		event = self.browser_session.event_bus.dispatch(CloseTabEvent(target_id=target_id))
+		target_id = await browser_session.get_target_id_from_tab_id(tab_id)
+		event = browser_session.event_bus.dispatch(CloseTabEvent(target_id=target_id))
 		await event
-		current_url = await self.browser_session.get_current_page_url()
+		current_url = await browser_session.get_current_page_url()
 		return f'Closed tab # {tab_id}, now on {current_url}'
 
-	def _track_session(self, session: BrowserSession) -> None:
-		"""Track a browser session for management."""
-		self.active_sessions[session.id] = {
-			'session': session,
-			'created_at': time.time(),
-			'last_activity': time.time(),
-			'url': getattr(session, 'current_url', None),
-		}
-
-	def _update_session_activity(self, session_id: str) -> None:
-		"""Update the last activity time for a session."""
-		if session_id in self.active_sessions:
-			self.active_sessions[session_id]['last_activity'] = time.time()
-
 	async def _list_sessions(self) -> str:
 		"""List all active browser sessions."""
-		if not self.active_sessions:
+		sessions = self.sessions.sessions
+		if not sessions:
 			return 'No active browser sessions'
 
 		sessions_info = []
-		for session_id, session_data in self.active_sessions.items():
-			session = session_data['session']
-			created_at = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(session_data['created_at']))
-			last_activity = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(session_data['last_activity']))
+		for session_id, session in sessions.items():
+			browser_session = session.resource
+			focused_target = browser_session.get_focused_target()
+			created_at = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(session.created_at))
+			last_activity = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(session.last_activity))
 
 			# Check if session is still active
-			is_active = hasattr(session, 'cdp_client') and session.cdp_client is not None
+			is_active = browser_session._cdp_client_root is not None
 
 			sessions_info.append(
 				{
@@ -975,119 +957,52 @@ class BrowserUseServer:
 					'created_at': created_at,
 					'last_activity': last_activity,
 					'active': is_active,
-					'current_url': session_data.get('url', 'Unknown'),
-					'age_minutes': (time.time() - session_data['created_at']) / 60,
+					'busy': session.in_use > 0,
+					'current_url': focused_target.url if focused_target else 'Unknown',
+					'age_minutes': (time.time() - session.created_at) / 60,
 				}
 			)
 
 		return json.dumps(sessions_info, indent=2)
 
 	async def _close_session(self, session_id: str) -> str:
-		"""Close a specific browser session."""
-		if session_id not in self.active_sessions:
-			return f'Session {session_id} not found'
-
-		session_data = self.active_sessions[session_id]
-		session = session_data['session']
-
+		"""Close a specific browser session, after its running call finishes."""
 		try:
-			# Close the session
-			if hasattr(session, 'kill'):
-				await session.kill()
-			elif hasattr(session, 'close'):
-				await session.close()
-
-			# Remove from tracking
-			del self.active_sessions[session_id]
-
-			# If this was the current session, clear it
-			if self.browser_session and self.browser_session.id == session_id:
-				self.browser_session = None
-				self.tools = None
-
+			if not await self.sessions.close(session_id):
+				return f'Session {session_id} not found'
 			return f'Successfully closed session {session_id}'
 		except Exception as e:
 			return f'Error closing session {session_id}: {str(e)}'
 
 	async def _close_all_sessions(self) -> str:
 		"""Close all active browser sessions."""
-		if not self.active_sessions:
+		if not self.sessions.sessions:
 			return 'No active sessions to close'
 
-		closed_count = 0
-		errors = []
-
-		for session_id in list(self.active_sessions.keys()):
-			try:
-				result = await self._close_session(session_id)
-				if 'Successfully closed' in result:
-					closed_count += 1
-				else:
-					errors.append(f'{session_id}: {result}')
-			except Exception as e:
-				errors.append(f'{session_id}: {str(e)}')
-
-		# Clear current session references
-		self.browser_session = None
-		self.tools = None
-
-		result = f'Closed {closed_count} sessions'
-		if errors:
-			result += f'. Errors: {"; ".join(errors)}'
-
-		return result
-
-	async def _cleanup_expired_sessions(self) -> None:
-		"""Background task to clean up expired sessions."""
-		current_time = time.time()
-		timeout_seconds = self.session_timeout_minutes * 60
-
-		expired_sessions = []
-		for session_id, session_data in self.active_sessions.items():
-			last_activity = session_data['last_activity']
-			if current_time - last_activity > timeout_seconds:
-				expired_sessions.append(session_id)
-
-		for session_id in expired_sessions:
-			try:
-				await self._close_session(session_id)
-				logger.info(f'Auto-closed expired session {session_id}')
-			except Exception as e:
-				logger.error(f'Error auto-closing session {session_id}: {e}')
-
-	async def _start_cleanup_task(self) -> None:
-		"""Start the background cleanup task."""
-
-		async def cleanup_loop():
-			while True:
-				try:
-					await self._cleanup_expired_sessions()
-					# Check every 2 minutes
-					await asyncio.sleep(120)
-				except Exception as e:
-					logger.error(f'Error in cleanup task: {e}')
-					await asyncio.sleep(120)
-
-		self._cleanup_task = create_task_with_error_handling(cleanup_loop(), name='mcp_cleanup_loop', suppress_exceptions=True)
+		closed_count = await self.sessions.close_all()
+		return f'Closed {closed_count} sessions'
 
 	async def run(self):
 		"""Run the MCP server."""
-		# Start the cleanup task
-		await self._start_cleanup_task()
-
-		async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-			await self.server.run(
-				read_stream,
-				write_stream,
-				InitializationOptions(
-					server_name='browser-use',
-					server_version='0.1.0',
-					capabilities=self.server.get_capabilities(
-						notification_options=NotificationOptions(),
-						experimental_capabilities={},
+		# Start the warm spares (if configured) while the client connects
+		self.sessions.start_warming()
+
+		try:
+			async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
+				await self.server.run(
+					read_stream,
+					write_stream,
+					InitializationOptions(
+						server_name='browser-use',
+						server_version='0.1.0',
+						capabilities=self.server.get_capabilities(
+							notification_options=NotificationOptions(),
+							experimental_capabilities={},
+						),
 					),
-				),
-			)
+				)
+		finally:
+			await self.sessions.close_all()
 
 
 async def main(session_timeout_minutes: int = 10):
@@ -1095,7 +1010,11 @@ async def main(session_timeout_minutes: int = 10):
 		print('MCP SDK is required. Install with: pip install mcp', file=sys.stderr)
 		sys.exit(1)
 
-	server = BrowserUseServer(session_timeout_minutes=session_timeout_minutes)
+	server = BrowserUseServer(
+		session_timeout_minutes=session_timeout_minutes,
+		max_sessions=CONFIG.BROWSER_USE_MCP_MAX_SESSIONS,
+		warm_sessions=CONFIG.BROWSER_USE_MCP_WARM_SESSIONS,
+	)
 	server._telemetry.capture(
 		MCPServerTelemetryEvent(
 			version=get_browser_use_version(),
@@ -0,0 +1,257 @@
+"""
+Session pool for the browser-use MCP server.
+
+Tool calls are bound to a session id. Each id gets its own browser, calls for
+the same id run one at a time under that session's lock, and calls for
+different ids run concurrently. The pool holds at most `max_sessions` sessions;
+opening one more evicts the least recently used idle session. Sessions idle for
+longer than `idle_timeout` are closed by a single timer that sleeps until the
+next one expires, instead of a periodic sweep.
+
+With `warm_sessions` set, that many spare browsers are started ahead of time and
+handed to new sessions, so the first call of a session doesn't wait for a
+browser launch. Spares are replenished in the background and don't count
+towards `max_sessions`.
+
+**Usage:**
+	pool = SessionPool(create=start_browser, close=stop_browser, max_sessions=4, idle_timeout=600)
+	async with pool.lease('client-a') as session:  # created on first use
+		await do_something(session.resource)
+	await pool.close_all()
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable, Coroutine
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, Generic, TypeVar
+
+from browser_use.utils import create_task_with_error_handling
+
+T = TypeVar('T')
+
+logger = logging.getLogger(__name__)
+
+
+class SessionLimitError(RuntimeError):
+	"""Raised when a new session is needed but every pooled session is busy."""
+
+
+@dataclass
+class PooledSession(Generic[T]):
+	"""A pooled resource (a browser session) plus its bookkeeping."""
+
+	session_id: str
+	resource: T
+	created_at: float = field(default_factory=time.time)
+	last_activity: float = field(default_factory=time.time)
+	lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+	in_use: int = 0
+	"""Calls running or waiting for the lock; a session in use is never evicted"""
+
+
+class SessionPool(Generic[T]):
+	"""Session-scoped resources with per-session locks, an LRU cap, idle expiry and optional warm spares.
+
+	Args:
+		create: Starts a resource for a session id, or a spare for the warm pool when called with None
+		close: Stops a resource
+		max_sessions: Most sessions open at once
+		idle_timeout: Seconds without calls after which a session is closed, None to keep sessions open
+		warm_sessions: Spare resources kept started for new sessions
+	"""
+
+	def __init__(
+		self,
+		create: Callable[[str | None], Awaitable[T]],
+		close: Callable[[T], Awaitable[None]],
+		max_sessions: int = 4,
+		idle_timeout: float | None = 600,
+		warm_sessions: int = 0,
+	):
+		if max_sessions < 1:
+			raise ValueError('max_sessions must be at least 1')
+		self._create = create
+		self._close = close
+		self.max_sessions = max_sessions
+		self.idle_timeout = idle_timeout
+		self.warm_sessions = warm_sessions
+
+		# Least recently used first
+		self._sessions: OrderedDict[str, PooledSession[T]] = OrderedDict()
+		self._opening: dict[str, asyncio.Future[PooledSession[T]]] = {}
+		self._spares: list[T] = []
+		self._warming = 0
+		self._tasks: set[asyncio.Task] = set()
+		self._expiry_task: asyncio.Task | None = None
+		self._activity = asyncio.Event()
+		self._warm = asyncio.Event()
+		self._warm.set()
+
+	@property
+	def sessions(self) -> dict[str, PooledSession[T]]:
+		"""Open sessions, least recently used first."""
+		return dict(self._sessions)
+
+	def get(self, session_id: str) -> PooledSession[T] | None:
+		return self._sessions.get(session_id)
+
+	@asynccontextmanager
+	async def lease(self, session_id: str, use_spare: bool = True) -> AsyncIterator[PooledSession[T]]:
+		"""Run a call in a session, opening it on first use and holding its lock for the duration.
+
+		Args:
+			session_id: Session to run in
+			use_spare: Whether a new session may take a warm spare instead of calling `create` with its id
+		"""
+		while True:
+			session = self._sessions.get(session_id) or await self._open(session_id, use_spare)
+			session.in_use += 1
+			try:
+				await session.lock.acquire()
+			except BaseException:
+				session.in_use -= 1
+				raise
+			if self._sessions.get(session_id) is session:
+				break
+			# Closed while we waited for the lock, open a fresh one
+			session.lock.release()
+			session.in_use -= 1
+		try:
+			self._touch(session)
+			yield session
+		finally:
+			session.lock.release()
+			session.in_use -= 1
+			self._touch(session)
+
+	async def close(self, session_id: str) -> bool:
+		"""Close a session, waiting for its running call. Returns False if there is no such session."""
+		session = self._sessions.get(session_id)
+		if session is None:
+			return False
+		async with session.lock:
+			if self._sessions.get(session_id) is not session:
+				return False  # closed while we waited
+			del self._sessions[session_id]
+		await self._stop(session.resource)
+		self._activity.set()
+		return True
+
+	async def close_all(self) -> int:
+		"""Close every session and spare, cancel background work. Returns the number of sessions closed."""
+		for task in [*self._tasks, *([self._expiry_task] if self._expiry_task else [])]:
+			task.cancel()
+		self._tasks.clear()
+		self._expiry_task = None
+
+		closed = 0
+		for session_id in list(self._sessions):
+			if await self.close(session_id):
+				closed += 1
+		spares, self._spares = self._spares, []
+		for spare in spares:
+			await self._stop(spare)
+		return closed
+
+	def start_warming(self) -> None:
+		"""Start spares up to `warm_sessions` in the background."""
+		while len(self._spares) + self._warming < self.warm_sessions:
+			self._warming += 1
+			self._warm.clear()
+			self._spawn(self._warm_one())
+
+	async def wait_warm(self) -> None:
+		"""Wait until the spares being started have started or failed."""
+		await self._warm.wait()
+
+	async def _open(self, session_id: str, use_spare: bool) -> PooledSession[T]:
+		# Concurrent first calls for the same id share one browser
+		opening = self._opening.get(session_id)
+		if opening is None:
+			if len(self._opening) >= self.max_sessions:
+				raise SessionLimitError(f'{self.max_sessions} browser sessions are already starting, try again when one is ready')
+			opening = asyncio.ensure_future(self._start_session(session_id, use_spare))
+			self._opening[session_id] = opening
+			opening.add_done_callback(lambda _: self._opening.pop(session_id, None))
+		return await asyncio.shield(opening)
+
+	async def _start_session(self, session_id: str, use_spare: bool) -> PooledSession[T]:
+		await self._make_room()
+		if use_spare and self._spares:
+			resource = self._spares.pop()
+		else:
+			resource = await self._create(session_id)
+		self.start_warming()
+
+		session = PooledSession(session_id=session_id, resource=resource)
+		self._sessions[session_id] = session
+		self._ensure_expiry_timer()
+		return session
+
+	async def _make_room(self) -> None:
+		# Sessions still being opened hold a slot too, this one included
+		while self._sessions and len(self._sessions) + len(self._opening) > self.max_sessions:
+			idle = next((session for session in self._sessions.values() if session.in_use == 0), None)
+			if idle is None:
+				raise SessionLimitError(f'All {self.max_sessions} browser sessions are busy, try again when one finishes')
+			del self._sessions[idle.session_id]
+			logger.info(f'Evicting least recently used browser session {idle.session_id} to stay within {self.max_sessions}')
+			await self._stop(idle.resource)
+
+	def _touch(self, session: PooledSession[T]) -> None:
+		session.last_activity = time.time()
+		if self._sessions.get(session.session_id) is session:
+			self._sessions.move_to_end(session.session_id)
+		self._activity.set()
+
+	def _ensure_expiry_timer(self) -> None:
+		if self.idle_timeout is not None and (self._expiry_task is None or self._expiry_task.done()):
+			self._expiry_task = create_task_with_error_handling(
+				self._expire_idle_sessions(), name='mcp_session_expiry', logger_instance=logger, suppress_exceptions=True
+			)
+
+	async def _expire_idle_sessions(self) -> None:
+		assert self.idle_timeout is not None
+		while self._sessions:
+			self._activity.clear()
+			# The first idle session in LRU order is the one that expires next
+			idle = next((session for session in self._sessions.values() if session.in_use == 0), None)
+			delay = idle.last_activity + self.idle_timeout - time.time() if idle else None
+			if idle is not None and delay is not None and delay <= 0:
+				logger.info(f'Closing browser session {idle.session_id} after {self.idle_timeout:.0f}s without calls')
+				del self._sessions[idle.session_id]
+				await self._stop(idle.resource)
+				continue
+			try:
+				await asyncio.wait_for(self._activity.wait(), timeout=delay)
+			except TimeoutError:
+				pass
+
+	async def _warm_one(self) -> None:
+		try:
+			spare = await self._create(None)
+		except Exception as e:
+			logger.warning(f'Could not start a warm browser session: {type(e).__name__}: {e}')
+			return
+		finally:
+			self._warming -= 1
+			if not self._warming:
+				self._warm.set()
+		self._spares.append(spare)
+
+	async def _stop(self, resource: T) -> None:
+		try:
+			await self._close(resource)
+		except Exception as e:
+			logger.warning(f'Error closing browser session: {type(e).__name__}: {e}')
+
+	def _spawn(self, coroutine: Coroutine[Any, Any, None]) -> None:
+		task = create_task_with_error_handling(
+			coroutine, name='mcp_warm_session', logger_instance=logger, suppress_exceptions=True
+		)
+		self._tasks.add(task)
+		task.add_done_callback(self._tasks.discard)
@@ -0,0 +1,223 @@
+"""
+Screenshot encoding profiles and per-step encoded variants.
+
+A page screenshot is captured once per step and consumed by several parties with
+different needs: vision LLMs (fewer pixels mean fewer image tokens), on-disk
+history (bytes) and cloud streaming. Each consumer describes what it wants as a
+`ScreenshotProfile`; `ScreenshotVariants` produces each requested variant of one
+capture at most once, decoding and resizing in a worker thread so the event loop
+is not blocked.
+
+A profile that matches the captured format without resizing or re-quantizing
+returns the captured bytes untouched.
+
+**Usage:**
+    variants = get_screenshot_variants(browser_state_summary.screenshot)
+    encoded = await variants.get(ScreenshotProfile(format='jpeg', quality=80, max_dimension=1280))
+    url = encoded.data_url
+
+**Configuration:**
+    BrowserProfile.screenshot_format / screenshot_quality: format Chrome captures in (CDP)
+    Agent(llm_screenshot_profile=..., screenshot_storage_profile=...): per-consumer profiles
+"""
+
+import asyncio
+import base64
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import cached_property
+from io import BytesIO
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from browser_use.llm.messages import SupportedImageMediaType
+
+ImageFormat = Literal['png', 'jpeg', 'webp']
+
+_PIL_FORMATS: dict[ImageFormat, str] = {'png': 'PNG', 'jpeg': 'JPEG', 'webp': 'WEBP'}
+_DEFAULT_QUALITY: dict[ImageFormat, int] = {'jpeg': 85, 'webp': 80}
+_MAX_CACHED_CAPTURES = 8
+
+
+class ScreenshotProfile(BaseModel):
+	"""How a screenshot is encoded for one consumer."""
+
+	model_config = ConfigDict(frozen=True, extra='forbid')
+
+	format: ImageFormat = 'png'
+	quality: int | None = Field(default=None, ge=1, le=100)
+	"""JPEG/WebP quality. None uses the encoder default and keeps same-format captures as they are."""
+	max_dimension: int | None = Field(default=None, ge=16)
+	"""Downscale so the longer edge is at most this many pixels."""
+	size: tuple[int, int] | None = None
+	"""Exact output size (width, height); takes precedence over max_dimension."""
+	grayscale: bool = False
+
+	@property
+	def media_type(self) -> SupportedImageMediaType:
+		return f'image/{self.format}'  # type: ignore[return-value]
+
+	@property
+	def transforms_pixels(self) -> bool:
+		return self.size is not None or self.max_dimension is not None or self.grayscale
+
+
+@dataclass(frozen=True)
+class EncodedScreenshot:
+	"""One encoded variant of a screenshot."""
+
+	data: bytes
+	media_type: SupportedImageMediaType
+	width: int
+	height: int
+
+	@cached_property
+	def b64(self) -> str:
+		return base64.b64encode(self.data).decode('ascii')
+
+	@property
+	def extension(self) -> str:
+		subtype = self.media_type.split('/')[1]
+		return 'jpg' if subtype == 'jpeg' else subtype
+
+	@property
+	def data_url(self) -> str:
+		return f'data:{self.media_type};base64,{self.b64}'
+
+	@cached_property
+	def digest(self) -> str:
+		"""Content hash, used for content-addressed storage."""
+		return hashlib.sha256(self.data).hexdigest()
+
+
+def detect_media_type(data: bytes) -> SupportedImageMediaType:
+	"""Detect the image type from its magic bytes, defaulting to PNG."""
+	if data.startswith(b'\xff\xd8\xff'):
+		return 'image/jpeg'
+	if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+		return 'image/webp'
+	if data.startswith(b'GIF8'):
+		return 'image/gif'
+	return 'image/png'
+
+
+def detect_media_type_b64(screenshot_b64: str) -> SupportedImageMediaType:
+	"""Detect the image type of base64 data without decoding all of it."""
+	try:
+		return detect_media_type(base64.b64decode(screenshot_b64[:24]))
+	except ValueError:
+		return 'image/png'
+
+
+def _target_size(source: tuple[int, int], profile: ScreenshotProfile) -> tuple[int, int]:
+	if profile.size is not None:
+		return profile.size
+	width, height = source
+	if profile.max_dimension is None or max(width, height) <= profile.max_dimension:
+		return source
+	scale = profile.max_dimension / max(width, height)
+	return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def encode_screenshot(data: bytes, profile: ScreenshotProfile) -> EncodedScreenshot:
+	"""
+	Encode raw screenshot bytes according to a profile (CPU-bound, call off the event loop).
+
+	Args:
+		data: Captured image bytes (PNG, JPEG or WebP)
+		profile: Target encoding
+
+	Returns:
+		The encoded variant; the input bytes themselves when no re-encoding is needed
+	"""
+	from PIL import Image
+
+	with Image.open(BytesIO(data)) as img:
+		source_format = (img.format or '').lower()
+		if source_format == profile.format and profile.quality is None and not profile.transforms_pixels:
+			return EncodedScreenshot(data=data, media_type=profile.media_type, width=img.width, height=img.height)
+
+		img.load()
+		image: Image.Image = img
+		if profile.grayscale:
+			image = image.convert('L')
+		elif image.mode not in ('RGB', 'L') and profile.format == 'jpeg':
+			image = image.convert('RGB')
+
+		size = _target_size(image.size, profile)
+		if size != image.size:
+			# reducing_gap does most of a large downscale with a cheap box reduce first
+			image = image.resize(size, Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+		save_kwargs: dict = {}
+		if profile.format in _DEFAULT_QUALITY:
+			save_kwargs['quality'] = profile.quality or _DEFAULT_QUALITY[profile.format]
+		if profile.format == 'webp':
+			save_kwargs['method'] = 4
+
+		buffer = BytesIO()
+		image.save(buffer, format=_PIL_FORMATS[profile.format], **save_kwargs)
+		return EncodedScreenshot(data=buffer.getvalue(), media_type=profile.media_type, width=size[0], height=size[1])
+
+
+class ScreenshotVariants:
+	"""Encoded variants of one captured screenshot, each produced at most once."""
+
+	def __init__(self, screenshot_b64: str):
+		self.screenshot_b64 = screenshot_b64
+		self._variants: dict[ScreenshotProfile, EncodedScreenshot] = {}
+		self._pending: dict[ScreenshotProfile, asyncio.Future[EncodedScreenshot]] = {}
+
+	@cached_property
+	def source(self) -> bytes:
+		return base64.b64decode(self.screenshot_b64)
+
+	@cached_property
+	def source_size(self) -> tuple[int, int]:
+		"""Captured (width, height), read from the image header only."""
+		from PIL import Image
+
+		with Image.open(BytesIO(self.source)) as img:
+			return img.size
+
+	def get_sync(self, profile: ScreenshotProfile) -> EncodedScreenshot:
+		"""Get a variant, encoding it in the calling thread if it isn't cached yet."""
+		encoded = self._variants.get(profile)
+		if encoded is None:
+			encoded = self._variants[profile] = encode_screenshot(self.source, profile)
+		return encoded
+
+	async def get(self, profile: ScreenshotProfile) -> EncodedScreenshot:
+		"""Get a variant, encoding it in a worker thread if it isn't cached yet."""
+		encoded = self._variants.get(profile)
+		if encoded is not None:
+			return encoded
+
+		# Concurrent requests for the same variant share one encode
+		pending = self._pending.get(profile)
+		if pending is None:
+			pending = self._pending[profile] = asyncio.ensure_future(asyncio.to_thread(encode_screenshot, self.source, profile))
+		try:
+			encoded = await asyncio.shield(pending)
+		finally:
+			if pending.done():
+				self._pending.pop(profile, None)
+		self._variants[profile] = encoded
+		return encoded
+
+
+_recent_captures: OrderedDict[str, ScreenshotVariants] = OrderedDict()
+
+
+def get_screenshot_variants(screenshot_b64: str) -> ScreenshotVariants:
+	"""Get the shared variant cache for a captured screenshot (the last few captures are kept)."""
+	variants = _recent_captures.get(screenshot_b64)
+	if variants is not None:
+		_recent_captures.move_to_end(screenshot_b64)
+		return variants
+	variants = _recent_captures[screenshot_b64] = ScreenshotVariants(screenshot_b64)
+	while len(_recent_captures) > _MAX_CACHED_CAPTURES:
+		_recent_captures.popitem(last=False)
+	return variants
@@ -1,37 +1,63 @@
 """
 Screenshot storage service for browser-use agents.
+
+Screenshots are stored content-addressed (named by the hash of the encoded
+bytes), so a screen that did not change between steps is written once and
+every step that showed it points at the same file.
 """
 
 import base64
+import logging
 from pathlib import Path
 
 import anyio
 
 from browser_use.observability import observe_debug
+from browser_use.screenshots.encoding import EncodedScreenshot, ScreenshotProfile, detect_media_type, get_screenshot_variants
+
+logger = logging.getLogger(__name__)
 
 
 class ScreenshotService:
 	"""Simple screenshot storage service that saves screenshots to disk"""
 
-	def __init__(self, agent_directory: str | Path):
-		"""Initialize with agent directory path"""
+	def __init__(self, agent_directory: str | Path, profile: ScreenshotProfile | None = None):
+		"""Initialize with agent directory path and the encoding profile for stored screenshots"""
 		self.agent_directory = Path(agent_directory) if isinstance(agent_directory, str) else agent_directory
+		self.profile = profile or ScreenshotProfile()
 
 		# Create screenshots subdirectory
 		self.screenshots_dir = self.agent_directory / 'screenshots'
 		self.screenshots_dir.mkdir(parents=True, exist_ok=True)
 
+		# Bytes actually written vs. bytes referenced by steps (the difference was deduplicated)
+		self.bytes_written = 0
+		self.bytes_stored = 0
+
 	@observe_debug(ignore_input=True, ignore_output=True, name='store_screenshot')
 	async def store_screenshot(self, screenshot_b64: str, step_number: int) -> str:
 		"""Store screenshot to disk and return the full path as string"""
-		screenshot_filename = f'step_{step_number}.png'
-		screenshot_path = self.screenshots_dir / screenshot_filename
+		try:
+			encoded = await get_screenshot_variants(screenshot_b64).get(self.profile)
+		except Exception as e:
+			# Keep captures the encoder can't read exactly as they are
+			logger.debug(f'📸 Step {step_number}: storing screenshot unencoded: {type(e).__name__}: {e}')
+			data = base64.b64decode(screenshot_b64)
+			encoded = EncodedScreenshot(data=data, media_type=detect_media_type(data), width=0, height=0)
 
-		# Decode base64 and save to disk
-		screenshot_data = base64.b64decode(screenshot_b64)
+		screenshot_path = self.screenshots_dir / f'{encoded.digest[:32]}.{encoded.extension}'
+		self.bytes_stored += len(encoded.data)
 
-		async with await anyio.open_file(screenshot_path, 'wb') as f:
-			await f.write(screenshot_data)
+		if not await anyio.Path(screenshot_path).exists():
+			# Write under a temporary name first so readers never see a partial file
+			tmp_path = screenshot_path.with_suffix(f'.{step_number}.tmp')
+			async with await anyio.open_file(tmp_path, 'wb') as f:
+				await f.write(encoded.data)
+			await anyio.Path(tmp_path).replace(screenshot_path)
+			self.bytes_written += len(encoded.data)
+			logger.debug(f'📸 Step {step_number}: stored {len(encoded.data) / 1024:.1f}KB screenshot ({encoded.media_type})')
+		else:
+			logger.debug(f'📸 Step {step_number}: screenshot unchanged, reusing {screenshot_path.name}')
 
 		return str(screenshot_path)
 
@@ -1,22 +1,115 @@
 """
 Cloud sync service for sending events to the Browser Use cloud.
+
+Events are sent by a background pipeline so event handlers never wait on the network:
+
+- handle_event() serializes the event into a bounded in-memory queue and returns
+- one sender task batches queued events by size (max_batch_size) and age
+  (flush_interval) and POSTs each batch gzipped over a single long-lived HTTP
+  client (HTTP/2 when the `h2` package is installed)
+- failed batches are retried with jittered exponential backoff; when the endpoint
+  stays unavailable, or the queue is full, events spill to an on-disk log
+  (spill_dir) in order and are sent from there, oldest first, once it is back;
+  spill files are written and read in worker threads, off the event loop, and
+  segments a crashed process had claimed for sending are picked up again
+- close() sends everything still pending in order, and whatever can't be sent
+  within its timeout stays in the spill log for the next run
+
+Usage:
+	sync = CloudSync()
+	await sync.handle_event(event)
+	...
+	await sync.close()
 """
 
+import asyncio
+import bisect
+import collections
+import gzip
+import importlib.util
+import json
 import logging
+import os
+import random
+import statistics
+import time
+from pathlib import Path
+from typing import Any, NamedTuple
 
 import httpx
+import psutil
 from bubus import BaseEvent
 
 from browser_use.config import CONFIG
 from browser_use.sync.auth import TEMP_USER_ID, DeviceAuthClient
+from browser_use.utils import create_task_with_error_handling
 
 logger = logging.getLogger(__name__)
 
+# Responses worth retrying; any other 4xx would fail the same way again
+_RETRY_STATUS_CODES = {408, 425, 429}
+
+
+class _QueuedEvent(NamedTuple):
+	seq: int
+	# time.monotonic() when the event was queued
+	queued_at: float
+	data: dict[str, Any]
+
+
+class CloudSyncMetrics:
+	"""Counters and recent samples describing the sync pipeline."""
+
+	def __init__(self, samples: int = 1000):
+		self.batch_sizes: collections.deque[int] = collections.deque(maxlen=samples)
+		self.latencies: collections.deque[float] = collections.deque(maxlen=samples)
+		self.events_sent = 0
+		self.events_dropped = 0
+		self.events_spilled = 0
+		self.retries = 0
+
+	def to_dict(self, queue_depth: int, spill_depth: int) -> dict[str, Any]:
+		def summary(values: collections.deque) -> dict[str, float]:
+			if not values:
+				return {'count': 0, 'mean': 0.0, 'p50': 0.0, 'p99': 0.0, 'max': 0.0}
+			ordered = sorted(values)
+			return {
+				'count': len(ordered),
+				'mean': statistics.fmean(ordered),
+				'p50': ordered[len(ordered) // 2],
+				'p99': ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))],
+				'max': ordered[-1],
+			}
+
+		return {
+			'batch_size': summary(self.batch_sizes),
+			'latency_seconds': summary(self.latencies),
+			'queue_depth': queue_depth,
+			'spill_depth': spill_depth,
+			'events_sent': self.events_sent,
+			'events_dropped': self.events_dropped,
+			'events_spilled': self.events_spilled,
+			'retries': self.retries,
+		}
+
 
 class CloudSync:
 	"""Service for syncing events to the Browser Use cloud"""
 
-	def __init__(self, base_url: str | None = None, allow_session_events_for_auth: bool = False):
+	def __init__(
+		self,
+		base_url: str | None = None,
+		allow_session_events_for_auth: bool = False,
+		max_batch_size: int = 100,
+		flush_interval: float = 0.5,
+		max_queue_size: int = 10_000,
+		max_retries: int = 3,
+		retry_base_delay: float = 0.5,
+		max_retry_delay: float = 30.0,
+		spill_dir: str | Path | None = None,
+		compress: bool = True,
+		request_timeout: float = 10.0,
+	):
 		# Backend API URL for all API requests - can be passed directly or defaults to env var
 		self.base_url = base_url or CONFIG.BROWSER_USE_CLOUD_API_URL
 		self.auth_client = DeviceAuthClient(base_url=self.base_url)
@@ -26,6 +119,35 @@ class CloudSync:
 		# Check if cloud sync is actually enabled - if not, we should remain silent
 		self.enabled = CONFIG.BROWSER_USE_CLOUD_SYNC
 
+		self.max_batch_size = max_batch_size
+		self.flush_interval = flush_interval
+		self.max_queue_size = max_queue_size
+		self.max_retries = max_retries
+		self.retry_base_delay = retry_base_delay
+		self.max_retry_delay = max_retry_delay
+		self.spill_dir = Path(spill_dir) if spill_dir else CONFIG.BROWSER_USE_CONFIG_DIR / 'events' / 'outbox'
+		self.compress = compress
+		self.request_timeout = request_timeout
+		self.metrics = CloudSyncMetrics()
+
+		# Serialized events, oldest first
+		self._queue: collections.deque[_QueuedEvent] = collections.deque()
+		self._in_flight: list[_QueuedEvent] = []
+		# Events waiting for the spill task to write them to disk
+		self._spill_buffer: list[_QueuedEvent] = []
+		self._spiller: asyncio.Task | None = None
+		self._last_seq = 0
+		self._wakeup = asyncio.Event()
+		self._idle = asyncio.Event()
+		self._sender: asyncio.Task | None = None
+		self._client: httpx.AsyncClient | None = None
+		self._closing = False
+		self._flush_requested = False
+		self._consecutive_failures = 0
+		# Spilled segments as (path, event count), oldest first; loaded by the first flush or send
+		self._segments: list[tuple[Path, int]] | None = None
+		self._rng = random.Random()
+
 	async def handle_event(self, event: BaseEvent) -> None:
 		"""Handle an event by sending it to the cloud"""
 		try:
@@ -55,10 +177,8 @@ class CloudSync:
 			logger.error(f'Failed to handle {event.event_type} event: {type(e).__name__}: {e}', exc_info=True)
 
 	async def _send_event(self, event: BaseEvent) -> None:
-		"""Send event to cloud API"""
+		"""Queue event for the cloud API"""
 		try:
-			headers = {}
-
 			# Override user_id only if it's not already set to a specific value
 			# This allows CLI and other code to explicitly set temp user_id when needed
 			if self.auth_client and self.auth_client.is_authenticated:
@@ -71,38 +191,292 @@ class CloudSync:
 				if not hasattr(event, 'user_id') or not getattr(event, 'user_id', None):
 					setattr(event, 'user_id', TEMP_USER_ID)
 
-			# Add auth headers if available
-			if self.auth_client:
-				headers.update(self.auth_client.get_headers())
-
-			# Send event (batch format with direct BaseEvent serialization)
-			async with httpx.AsyncClient() as client:
-				# Serialize event and add device_id to all events
-				event_data = event.model_dump(mode='json')
-				if self.auth_client and self.auth_client.device_id:
-					event_data['device_id'] = self.auth_client.device_id
-
-				response = await client.post(
-					f'{self.base_url.rstrip("/")}/api/v1/events',
-					json={'events': [event_data]},
-					headers=headers,
-					timeout=10.0,
-				)
-
-				if response.status_code >= 400:
-					# Log error but don't raise - we want to fail silently
-					logger.debug(
-						f'Failed to send sync event: POST {response.request.url} {response.status_code} - {response.text}'
-					)
+			# Serialize event now (later changes to it aren't sent) and add device_id to all events
+			event_data = event.model_dump(mode='json')
+			if self.auth_client and self.auth_client.device_id:
+				event_data['device_id'] = self.auth_client.device_id
+			self._enqueue(event_data)
+		except Exception as e:
+			logger.debug(f'Unexpected error queueing event {event}: {type(e).__name__}: {e}')
+
+	def _enqueue(self, event_data: dict[str, Any]) -> None:
+		# Sequence numbers follow wall time so spilled segments of every run sort in order
+		self._last_seq = max(self._last_seq + 1, time.time_ns())
+		item = _QueuedEvent(self._last_seq, time.monotonic(), event_data)
+
+		if self._closing:
+			# Too late for this run; the next one sends it
+			self._spill_later([item])
+			return
+		if len(self._queue) >= self.max_queue_size:
+			# Keep the order: everything queued goes to disk ahead of the new event
+			self._spill_later([*self._queue, item])
+			self._queue.clear()
+		else:
+			self._queue.append(item)
+
+		self._start_sender()
+
+	def _start_sender(self) -> None:
+		if self._sender is None or self._sender.done():
+			self._wakeup = asyncio.Event()
+			self._idle = asyncio.Event()
+			self._sender = create_task_with_error_handling(self._run(), name='cloud_sync_sender', suppress_exceptions=True)
+		self._idle.clear()
+		self._wakeup.set()
+
+	def get_metrics(self) -> dict[str, Any]:
+		"""Batch size and latency summaries, queue depth and spill depth (events waiting on disk)."""
+		# Segments left by earlier runs only count once the sender has loaded them
+		spill_depth = sum(count for _, count in self._segments or ()) + len(self._spill_buffer)
+		return self.metrics.to_dict(queue_depth=len(self._queue) + len(self._in_flight), spill_depth=spill_depth)
+
+	async def flush(self, timeout: float | None = None) -> bool:
+		"""
+		Send everything queued or spilled so far without waiting for the batching interval.
+
+		Returns:
+			True if nothing is left to send, False if the timeout passed first
+		"""
+		if (
+			not self._queue
+			and not self._spill_buffer
+			and not await self._load_segments()
+			and (self._sender is None or self._idle.is_set())
+		):
+			return True
+		self._flush_requested = True
+		self._start_sender()
+		try:
+			await asyncio.wait_for(self._idle.wait(), timeout)
+			return True
+		except TimeoutError:
+			return False
+		finally:
+			self._flush_requested = False
+
+	async def close(self, timeout: float = 5.0) -> None:
+		"""Send pending events in order; whatever isn't sent within timeout stays spilled on disk for the next run."""
+		self._closing = True
+		if self._sender is not None and not self._sender.done():
+			self._wakeup.set()
+			try:
+				await asyncio.wait_for(asyncio.shield(self._sender), timeout)
+			except TimeoutError:
+				self._sender.cancel()
+				await asyncio.gather(self._sender, return_exceptions=True)
+		self._sender = None
+
+		await self._wait_for_spills()
+		leftovers = [*self._in_flight, *self._queue]
+		self._in_flight, self._queue = [], collections.deque()
+		if leftovers:
+			await self._spill(leftovers)
+			logger.debug(f'Cloud sync closed with {len(leftovers)} events spilled to {self.spill_dir}')
+
+		if self._client is not None:
+			await self._client.aclose()
+			self._client = None
+
+	async def _run(self) -> None:
+		"""Sender task: spilled segments first (they are older), then batches from the queue."""
+		while True:
+			# Events being spilled are older than anything queued, so they go to disk first
+			await self._wait_for_spills()
+			segments = await self._load_segments()
+			if segments:
+				if not await self._send_segment(*segments[0]):
+					await asyncio.sleep(self._backoff_delay())
+				continue
+
+			if not self._queue:
+				self._idle.set()
+				if self._closing:
+					return
+				self._wakeup.clear()
+				await self._wakeup.wait()
+				continue
+
+			# Wait for a full batch, or until the oldest queued event is flush_interval old
+			while len(self._queue) < self.max_batch_size and not (self._closing or self._flush_requested):
+				remaining = self._queue[0].queued_at + self.flush_interval - time.monotonic()
+				if remaining <= 0:
+					break
+				self._wakeup.clear()
+				try:
+					await asyncio.wait_for(self._wakeup.wait(), remaining)
+				except TimeoutError:
+					break
+				if not self._queue:
+					break
+			if not self._queue:
+				continue
+
+			self._in_flight = [self._queue.popleft() for _ in range(min(self.max_batch_size, len(self._queue)))]
+			if not await self._deliver([item.data for item in self._in_flight]):
+				# Endpoint unavailable: keep the batch on disk, where the next attempt picks it up first
+				await self._spill(self._in_flight)
+			self._in_flight = []
+
+	async def _deliver(self, events: list[dict[str, Any]]) -> bool:
+		"""POST one batch, retrying with backoff. Returns False if the endpoint stayed unavailable."""
+		for attempt in range(self.max_retries + 1):
+			if attempt:
+				self.metrics.retries += 1
+				await asyncio.sleep(self._backoff_delay())
+			outcome = await self._post(events)
+			if outcome == 'retry':
+				self._consecutive_failures += 1
+				continue
+			self._consecutive_failures = 0
+			if outcome == 'sent':
+				self.metrics.events_sent += len(events)
+				self.metrics.batch_sizes.append(len(events))
+			else:
+				self.metrics.events_dropped += len(events)
+			return True
+		return False
+
+	def _backoff_delay(self) -> float:
+		"""Exponential in the number of failures in a row, with half of it jittered so clients don't retry in step."""
+		delay = min(self.max_retry_delay, self.retry_base_delay * 2 ** max(self._consecutive_failures - 1, 0))
+		return delay / 2 + self._rng.uniform(0, delay / 2)
+
+	async def _post(self, events: list[dict[str, Any]]) -> str:
+		"""Send one batch: 'sent', 'retry' (worth trying again) or 'dropped' (rejected by the API)."""
+		headers = {'Content-Type': 'application/json'}
+		# Add auth headers if available
+		if self.auth_client:
+			headers.update(self.auth_client.get_headers())
+		body = json.dumps({'events': events}).encode()
+		if self.compress:
+			body = gzip.compress(body, compresslevel=5)
+			headers['Content-Encoding'] = 'gzip'
+
+		if self._client is None:
+			self._client = httpx.AsyncClient(
+				http2=importlib.util.find_spec('h2') is not None,
+				timeout=self.request_timeout,
+			)
+		start = time.perf_counter()
+		try:
+			response = await self._client.post(f'{self.base_url.rstrip("/")}/api/v1/events', content=body, headers=headers)
 		except httpx.TimeoutException:
-			logger.debug(f'Event send timed out after 10 seconds: {event}')
-		except httpx.ConnectError as e:
-			# logger.warning(f'⚠️ Failed to connect to cloud service at {self.base_url}: {e}')
-			pass
+			logger.debug(f'Event batch send timed out after {self.request_timeout} seconds ({len(events)} events)')
+			return 'retry'
 		except httpx.HTTPError as e:
-			logger.debug(f'HTTP error sending event {event}: {type(e).__name__}: {e}')
-		except Exception as e:
-			logger.debug(f'Unexpected error sending event {event}: {type(e).__name__}: {e}')
+			logger.debug(f'HTTP error sending {len(events)} events: {type(e).__name__}: {e}')
+			return 'retry'
+		self.metrics.latencies.append(time.perf_counter() - start)
+
+		if response.status_code < 400:
+			return 'sent'
+		if response.status_code >= 500 or response.status_code in _RETRY_STATUS_CODES:
+			return 'retry'
+		# Log error but don't raise - we want to fail silently
+		logger.debug(f'Failed to send sync events: POST {response.request.url} {response.status_code} - {response.text}')
+		return 'dropped'
+
+	async def _load_segments(self) -> list[tuple[Path, int]]:
+		"""Spilled segments (path, event count), oldest first, including ones left by earlier runs."""
+		if self._segments is None:
+			segments = await asyncio.to_thread(self._read_segments)
+			# Another caller may have loaded them while this one was reading
+			if self._segments is None:
+				self._segments = segments
+		return self._segments
+
+	def _read_segments(self) -> list[tuple[Path, int]]:
+		"""Runs in a worker thread; first takes back segments claimed by processes that are no longer running."""
+		segments = []
+		try:
+			for claimed in self.spill_dir.glob('*.jsonl.*'):
+				pid = claimed.suffix[1:]
+				if pid.isdigit() and not psutil.pid_exists(int(pid)):
+					claimed.replace(claimed.with_suffix(''))
+			for path in sorted(self.spill_dir.glob('*.jsonl')):
+				with open(path, 'rb') as f:
+					segments.append((path, sum(1 for _ in f)))
+		except OSError as e:
+			logger.debug(f'Could not read spilled events in {self.spill_dir}: {e}')
+		return segments
+
+	def _spill_later(self, items: list[_QueuedEvent]) -> None:
+		"""Hand events to the spill task, so the caller doesn't wait on disk."""
+		self._spill_buffer.extend(items)
+		if self._spiller is None or self._spiller.done():
+			self._spiller = create_task_with_error_handling(
+				self._drain_spill_buffer(), name='cloud_sync_spill', suppress_exceptions=True
+			)
+
+	async def _drain_spill_buffer(self) -> None:
+		while self._spill_buffer:
+			# Stay in the buffer (and in spill_depth) until written; later events are appended behind them
+			items = list(self._spill_buffer)
+			await self._spill(items)
+			del self._spill_buffer[: len(items)]
+
+	async def _wait_for_spills(self) -> None:
+		if self._spiller is not None and not self._spiller.done():
+			await asyncio.shield(self._spiller)
+
+	async def _spill(self, items: list[_QueuedEvent]) -> None:
+		"""Write events to disk in batch-sized segments named after their first sequence number."""
+		segments = await self._load_segments()
+		chunks = [items[start : start + self.max_batch_size] for start in range(0, len(items), self.max_batch_size)]
+		written = await asyncio.to_thread(self._write_segments, chunks)
+		for path, count in written:
+			bisect.insort(segments, (path, count))
+			self.metrics.events_spilled += count
+		unwritten = len(items) - sum(count for _, count in written)
+		if unwritten:
+			self.metrics.events_dropped += unwritten
+
+	def _write_segments(self, chunks: list[list[_QueuedEvent]]) -> list[tuple[Path, int]]:
+		"""Runs in a worker thread; returns the segments written before any error."""
+		written = []
+		try:
+			self.spill_dir.mkdir(parents=True, exist_ok=True)
+			for chunk in chunks:
+				path = self.spill_dir / f'{chunk[0].seq:020d}.jsonl'
+				# Written aside and renamed, so a segment is never read half-written
+				tmp_path = path.with_suffix('.tmp')
+				tmp_path.write_text(''.join(json.dumps(item.data) + '\n' for item in chunk))
+				tmp_path.replace(path)
+				written.append((path, len(chunk)))
+		except OSError as e:
+			logger.warning(f'Could not spill {sum(map(len, chunks))} cloud sync events to {self.spill_dir}: {e}')
+		return written
+
+	async def _send_segment(self, path: Path, count: int) -> bool:
+		"""Send a spilled segment and delete it. Returns False if the endpoint stayed unavailable."""
+		segments = await self._load_segments()
+		# Renaming claims the segment, so another process picking up the same directory skips it
+		claimed = path.with_name(f'{path.name}.{os.getpid()}')
+		try:
+			await asyncio.to_thread(path.rename, claimed)
+		except FileNotFoundError:
+			segments.remove((path, count))
+			return True
+
+		delivered = False
+		try:
+			try:
+				text = await asyncio.to_thread(claimed.read_text)
+				events = [json.loads(line) for line in text.splitlines() if line]
+			except (OSError, ValueError) as e:
+				logger.warning(f'Dropping unreadable spilled events {path}: {e}')
+				self.metrics.events_dropped += count
+				delivered = True
+				return True
+			delivered = await self._deliver(events)
+			return delivered
+		finally:
+			if delivered:
+				await asyncio.to_thread(claimed.unlink, missing_ok=True)
+				segments.remove((path, count))
+			else:
+				await asyncio.to_thread(claimed.rename, path)
 
 	# async def _update_wal_user_ids(self, session_id: str) -> None:
 	# 	"""Update user IDs in WAL file after authentication"""
@@ -0,0 +1,135 @@
+"""
+Bundled model pricing snapshot and model-name normalization.
+
+LiteLLM's pricing document covers thousands of models across every modality and
+is several megabytes large. TokenCost only needs per-token prices of the chat
+models of the providers browser-use ships clients for, so a compacted copy of
+just those entries is bundled with the package. It loads in milliseconds and
+works without network access; `TokenCost` refreshes it in the background.
+
+**Usage:**
+    snapshot = load_bundled_pricing()
+    data = compact_pricing_data(full_litellm_json)
+    candidates = model_name_candidates('gemini-2.5-flash')
+
+**Regenerating the bundled snapshot:**
+    python -m browser_use.tokens.pricing [path/to/model_prices_and_context_window.json]
+"""
+
+import json
+import sys
+from datetime import datetime
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+from browser_use.tokens.views import CachedPricingData
+
+PRICING_URL = 'https://raw.githubusercontent.com/BerriAI/litellm/main/model_prices_and_context_window.json'
+SNAPSHOT_PATH = Path(__file__).with_name('pricing_snapshot.json')
+
+PRICING_FIELDS = (
+	'input_cost_per_token',
+	'output_cost_per_token',
+	'cache_read_input_token_cost',
+	'cache_creation_input_token_cost',
+	'max_tokens',
+	'max_input_tokens',
+	'max_output_tokens',
+)
+
+# LiteLLM providers behind the clients in browser_use.llm
+SNAPSHOT_PROVIDERS = frozenset(
+	{
+		'openai',
+		'azure',
+		'anthropic',
+		'bedrock',
+		'bedrock_converse',
+		'gemini',
+		'vertex_ai-language-models',
+		'vertex_ai-anthropic_models',
+		'groq',
+		'mistral',
+		'xai',
+		'deepseek',
+		'cerebras',
+		'openrouter',
+		'ollama',
+		'vercel_ai_gateway',
+		'oci',
+	}
+)
+SNAPSHOT_MODES = frozenset({'chat', 'responses'})
+
+# LiteLLM keys some providers' models under a prefix, e.g. 'groq/llama-3.3-70b-versatile'
+PROVIDER_PREFIXES = ('gemini', 'groq', 'xai', 'mistral', 'deepseek', 'cerebras', 'openrouter', 'anthropic', 'azure', 'bedrock')
+
+
+def compact_pricing_data(data: dict[str, Any]) -> dict[str, dict[str, Any]]:
+	"""
+	Reduce LiteLLM's pricing document to the chat models of supported providers.
+
+	Args:
+		data: Parsed model_prices_and_context_window.json
+
+	Returns:
+		Model name -> the non-null pricing fields TokenCost reads
+	"""
+	compacted: dict[str, dict[str, Any]] = {}
+	for name, entry in data.items():
+		if not isinstance(entry, dict):
+			continue
+		if entry.get('litellm_provider') not in SNAPSHOT_PROVIDERS or entry.get('mode') not in SNAPSHOT_MODES:
+			continue
+		compacted[name] = {field: entry[field] for field in PRICING_FIELDS if entry.get(field) is not None}
+	return compacted
+
+
+@cache
+def load_bundled_pricing() -> CachedPricingData:
+	"""Load the snapshot shipped with the package (parsed once per process)."""
+	return CachedPricingData.model_validate_json(SNAPSHOT_PATH.read_bytes())
+
+
+def model_name_candidates(model_name: str, mapped_name: str | None = None) -> list[str]:
+	"""
+	Pricing keys to try for a model name, most specific first.
+
+	Args:
+		model_name: Model name as reported by the chat client
+		mapped_name: Explicit LiteLLM name from MODEL_TO_LITELLM, if any
+	"""
+	candidates: list[str] = []
+	for name in (mapped_name, model_name, model_name.lower()):
+		if name and name not in candidates:
+			candidates.append(name)
+
+	# 'models/gemini-2.5-flash' (Gemini API) and 'openai/gpt-4.1' (gateways) -> bare name
+	base = model_name.lower().removeprefix('models/')
+	if base not in candidates:
+		candidates.append(base)
+	candidates.extend(f'{prefix}/{base}' for prefix in PROVIDER_PREFIXES)
+	if '/' in base:
+		candidates.append(base.rsplit('/', 1)[1])
+	return candidates
+
+
+def main() -> None:
+	"""Regenerate the bundled snapshot from LiteLLM (or a local copy of its pricing JSON)."""
+	if len(sys.argv) > 1:
+		data = json.loads(Path(sys.argv[1]).read_text(encoding='utf-8'))
+	else:
+		import httpx
+
+		response = httpx.get(PRICING_URL, timeout=30)
+		response.raise_for_status()
+		data = response.json()
+
+	snapshot = CachedPricingData(timestamp=datetime.now(), data=compact_pricing_data(data))
+	SNAPSHOT_PATH.write_text(json.dumps(snapshot.model_dump(mode='json'), separators=(',', ':'), sort_keys=True) + '\n')
+	print(f'Wrote {len(snapshot.data)} models to {SNAPSHOT_PATH}')
+
+
+if __name__ == '__main__':
+	main()
@@ -1,12 +1,17 @@
 """
 Token cost service that tracks LLM token usage and costs.
 
-Fetches pricing data from LiteLLM repository and caches it for 1 day.
+Pricing comes from a compacted LiteLLM snapshot bundled with the package, so
+costs work offline and without startup latency. When the local copy is older
+than a day, a fresh one is fetched and cached in the background.
 Automatically tracks token usage when LLMs are registered and invoked.
 """
 
+import asyncio
+import json
 import logging
 import os
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
@@ -19,6 +24,7 @@ from browser_use.llm.base import BaseChatModel
 from browser_use.llm.views import ChatInvokeUsage
 from browser_use.tokens.custom_pricing import CUSTOM_MODEL_PRICING
 from browser_use.tokens.mappings import MODEL_TO_LITELLM
+from browser_use.tokens.pricing import PRICING_URL, compact_pricing_data, load_bundled_pricing, model_name_candidates
 from browser_use.tokens.views import (
 	CachedPricingData,
 	ModelPricing,
@@ -45,22 +51,100 @@ def xdg_cache_home() -> Path:
 	return default
 
 
+@dataclass
+class _UsageTotals:
+	"""Running usage totals over the first `entry_count` entries of a usage history"""
+
+	history: list[TokenUsageEntry] | None = None
+	pricing: dict[str, Any] | None = None
+	entry_count: int = 0
+	prompt_tokens: int = 0
+	prompt_cached_tokens: int = 0
+	completion_tokens: int = 0
+	prompt_cost: float = 0.0
+	prompt_cached_cost: float = 0.0
+	completion_cost: float = 0.0
+	by_model: dict[str, ModelUsageStats] = field(default_factory=dict)
+	model_costs: dict[str, tuple[float, float]] = field(default_factory=dict)
+	"""Model -> (prompt cost, completion cost)"""
+
+	def add(self, entry: TokenUsageEntry, cost: TokenCostCalculated | None) -> None:
+		usage = entry.usage
+		self.entry_count += 1
+		self.prompt_tokens += usage.prompt_tokens
+		self.prompt_cached_tokens += usage.prompt_cached_tokens or 0
+		self.completion_tokens += usage.completion_tokens
+
+		stats = self.by_model.get(entry.model)
+		if stats is None:
+			stats = self.by_model[entry.model] = ModelUsageStats(model=entry.model)
+		stats.prompt_tokens += usage.prompt_tokens
+		stats.prompt_cached_tokens += usage.prompt_cached_tokens or 0
+		stats.completion_tokens += usage.completion_tokens
+		stats.total_tokens += usage.prompt_tokens + usage.completion_tokens
+		stats.invocations += 1
+
+		if cost:
+			stats.cost += cost.total_cost
+			self.prompt_cost += cost.prompt_cost
+			self.completion_cost += cost.completion_cost
+			self.prompt_cached_cost += cost.prompt_read_cached_cost or 0
+			model_prompt_cost, model_completion_cost = self.model_costs.get(entry.model, (0.0, 0.0))
+			self.model_costs[entry.model] = (model_prompt_cost + cost.prompt_cost, model_completion_cost + cost.completion_cost)
+
+	def summary(self) -> UsageSummary:
+		by_model: dict[str, ModelUsageStats] = {}
+		for model, stats in self.by_model.items():
+			# Copies, so callers can't modify the running totals
+			by_model[model] = stats.model_copy(
+				update={'average_tokens_per_invocation': stats.total_tokens / stats.invocations if stats.invocations else 0.0}
+			)
+
+		return UsageSummary(
+			total_prompt_tokens=self.prompt_tokens,
+			total_prompt_cost=self.prompt_cost,
+			total_prompt_cached_tokens=self.prompt_cached_tokens,
+			total_prompt_cached_cost=self.prompt_cached_cost,
+			total_completion_tokens=self.completion_tokens,
+			total_completion_cost=self.completion_cost,
+			total_tokens=self.prompt_tokens + self.completion_tokens,
+			# Prompt cost already includes cache reads (and creation)
+			total_cost=self.prompt_cost + self.completion_cost,
+			entry_count=self.entry_count,
+			by_model=by_model,
+		)
+
+
 class TokenCost:
 	"""Service for tracking token usage and calculating costs"""
 
 	CACHE_DIR_NAME = 'browser_use/token_cost'
+	CACHE_FILE_PREFIX = 'pricing_v2_'
 	CACHE_DURATION = timedelta(days=1)
-	PRICING_URL = 'https://raw.githubusercontent.com/BerriAI/litellm/main/model_prices_and_context_window.json'
+	PRICING_URL = PRICING_URL
 
-	def __init__(self, include_cost: bool = False):
+	def __init__(self, include_cost: bool = False, refresh_pricing: bool = True):
+		"""
+		Args:
+			include_cost: Calculate costs (also enabled by BROWSER_USE_CALCULATE_COST=true)
+			refresh_pricing: Fetch fresh pricing in the background when the local copy is older than CACHE_DURATION
+		"""
 		self.include_cost = include_cost or os.getenv('BROWSER_USE_CALCULATE_COST', 'false').lower() == 'true'
+		self.refresh_pricing = refresh_pricing
 
 		self.usage_history: list[TokenUsageEntry] = []
 		self.registered_llms: dict[str, BaseChatModel] = {}
 		self._pricing_data: dict[str, Any] | None = None
+		self._pricing_timestamp: datetime | None = None
+		self._refresh_task: asyncio.Task[None] | None = None
 		self._initialized = False
 		self._cache_dir = xdg_cache_home() / self.CACHE_DIR_NAME
 
+		# Resolved pricing per model name, valid for the pricing data it was resolved from
+		self._model_pricing: dict[str, ModelPricing | None] = {}
+		self._model_pricing_source: dict[str, Any] | None = None
+		self._totals = _UsageTotals()
+
 	async def initialize(self) -> None:
 		"""Initialize the service by loading pricing data"""
 		if not self._initialized:
@@ -69,94 +153,59 @@ class TokenCost:
 			self._initialized = True
 
 	async def _load_pricing_data(self) -> None:
-		"""Load pricing data from cache or fetch from GitHub"""
-		# Try to find a valid cache file
-		cache_file = await self._find_valid_cache()
+		"""Load the newest local pricing (refreshed cache or bundled snapshot) and refresh it in the background if stale"""
+		pricing = load_bundled_pricing()
+		cached = await self._load_latest_cache()
+		if cached is not None and cached.timestamp > pricing.timestamp:
+			pricing = cached
+		self._set_pricing_data(pricing)
+
+		if self.refresh_pricing and datetime.now() - pricing.timestamp >= self.CACHE_DURATION:
+			# Never block the agent on the network; costs use the local copy until the refresh lands
+			self._refresh_task = create_task_with_error_handling(
+				self._fetch_and_cache_pricing_data(), name='refresh_token_pricing', suppress_exceptions=True
+			)
 
-		if cache_file:
-			await self._load_from_cache(cache_file)
-		else:
-			await self._fetch_and_cache_pricing_data()
+	def _set_pricing_data(self, pricing: CachedPricingData) -> None:
+		self._pricing_data = pricing.data
+		self._pricing_timestamp = pricing.timestamp
 
-	async def _find_valid_cache(self) -> Path | None:
-		"""Find the most recent valid cache file"""
+	async def _load_latest_cache(self) -> CachedPricingData | None:
+		"""Load the most recently refreshed pricing cache, if any"""
 		try:
-			# Ensure cache directory exists
-			self._cache_dir.mkdir(parents=True, exist_ok=True)
-
-			# List all JSON files in the cache directory
-			cache_files = list(self._cache_dir.glob('*.json'))
-
-			if not cache_files:
-				return None
-
-			# Sort by modification time (most recent first)
-			cache_files.sort(key=lambda f: f.stat().st_mtime, reverse=True)
-
-			# Check each file until we find a valid one
+			cache_files = sorted(
+				self._cache_dir.glob(f'{self.CACHE_FILE_PREFIX}*.json'), key=lambda f: f.stat().st_mtime, reverse=True
+			)
 			for cache_file in cache_files:
-				if await self._is_cache_valid(cache_file):
-					return cache_file
-				else:
-					# Clean up old cache files
-					try:
-						os.remove(cache_file)
-					except Exception:
-						pass
-
-			return None
-		except Exception:
-			return None
-
-	async def _is_cache_valid(self, cache_file: Path) -> bool:
-		"""Check if a specific cache file is valid and not expired"""
-		try:
-			if not cache_file.exists():
-				return False
-
-			# Read the cached data
-			cached = CachedPricingData.model_validate_json(await anyio.Path(cache_file).read_text())
-
-			# Check if cache is still valid
-			return datetime.now() - cached.timestamp < self.CACHE_DURATION
-		except Exception:
-			return False
-
-	async def _load_from_cache(self, cache_file: Path) -> None:
-		"""Load pricing data from a specific cache file"""
-		try:
-			content = await anyio.Path(cache_file).read_text()
-			cached = CachedPricingData.model_validate_json(content)
-			self._pricing_data = cached.data
+				try:
+					return CachedPricingData.model_validate_json(await anyio.Path(cache_file).read_bytes())
+				except Exception as e:
+					logger.debug(f'Error loading cached pricing data from {cache_file}: {e}')
 		except Exception as e:
-			logger.debug(f'Error loading cached pricing data from {cache_file}: {e}')
-			# Fall back to fetching
-			await self._fetch_and_cache_pricing_data()
+			logger.debug(f'Error listing pricing caches: {e}')
+		return None
 
 	async def _fetch_and_cache_pricing_data(self) -> None:
-		"""Fetch pricing data from LiteLLM GitHub and cache it with timestamp"""
+		"""Fetch pricing data from LiteLLM GitHub, compact it and cache it with timestamp"""
 		try:
 			async with httpx.AsyncClient() as client:
 				response = await client.get(self.PRICING_URL, timeout=30)
 				response.raise_for_status()
 
-				self._pricing_data = response.json()
-
-			# Create cache object with timestamp
-			cached = CachedPricingData(timestamp=datetime.now(), data=self._pricing_data or {})
-
-			# Ensure cache directory exists
-			self._cache_dir.mkdir(parents=True, exist_ok=True)
+			# Parsing and compacting the multi-megabyte document is CPU-bound
+			data = await asyncio.to_thread(lambda: compact_pricing_data(json.loads(response.content)))
+			cached = CachedPricingData(timestamp=datetime.now(), data=data)
+			self._set_pricing_data(cached)
 
 			# Create cache file with timestamp in filename
-			timestamp_str = datetime.now().strftime('%Y%m%d_%H%M%S')
-			cache_file = self._cache_dir / f'pricing_{timestamp_str}.json'
-
-			await anyio.Path(cache_file).write_text(cached.model_dump_json(indent=2))
+			self._cache_dir.mkdir(parents=True, exist_ok=True)
+			timestamp_str = cached.timestamp.strftime('%Y%m%d_%H%M%S')
+			cache_file = self._cache_dir / f'{self.CACHE_FILE_PREFIX}{timestamp_str}.json'
+			await anyio.Path(cache_file).write_text(cached.model_dump_json())
+			await self.clean_old_caches(keep_count=1)
 		except Exception as e:
+			# Keep whatever pricing is already loaded (at worst the bundled snapshot)
 			logger.debug(f'Error fetching pricing data: {e}')
-			# Fall back to empty pricing data
-			self._pricing_data = {}
 
 	async def get_model_pricing(self, model_name: str) -> ModelPricing | None:
 		"""Get pricing information for a specific model"""
@@ -164,27 +213,29 @@ class TokenCost:
 		if not self._initialized:
 			await self.initialize()
 
+		if self._model_pricing_source is not self._pricing_data:
+			# Pricing data was refreshed (or replaced), re-resolve names against it
+			self._model_pricing = {}
+			self._model_pricing_source = self._pricing_data
+
+		if model_name not in self._model_pricing:
+			self._model_pricing[model_name] = self._resolve_model_pricing(model_name)
+		return self._model_pricing[model_name]
+
+	def _resolve_model_pricing(self, model_name: str) -> ModelPricing | None:
 		# Check custom pricing first
-		if model_name in CUSTOM_MODEL_PRICING:
-			data = CUSTOM_MODEL_PRICING[model_name]
-			return ModelPricing(
-				model=model_name,
-				input_cost_per_token=data.get('input_cost_per_token'),
-				output_cost_per_token=data.get('output_cost_per_token'),
-				max_tokens=data.get('max_tokens'),
-				max_input_tokens=data.get('max_input_tokens'),
-				max_output_tokens=data.get('max_output_tokens'),
-				cache_read_input_token_cost=data.get('cache_read_input_token_cost'),
-				cache_creation_input_token_cost=data.get('cache_creation_input_token_cost'),
-			)
+		data = CUSTOM_MODEL_PRICING.get(model_name)
 
-		# Map model name to LiteLLM model name if needed
-		litellm_model_name = MODEL_TO_LITELLM.get(model_name, model_name)
+		if data is None and self._pricing_data:
+			# Map model name to LiteLLM model name if needed, then try normalized and provider-prefixed names
+			for candidate in model_name_candidates(model_name, MODEL_TO_LITELLM.get(model_name)):
+				if candidate in self._pricing_data:
+					data = self._pricing_data[candidate]
+					break
 
-		if not self._pricing_data or litellm_model_name not in self._pricing_data:
+		if data is None:
 			return None
 
-		data = self._pricing_data[litellm_model_name]
 		return ModelPricing(
 			model=model_name,
 			input_cost_per_token=data.get('input_cost_per_token'),
@@ -205,14 +256,16 @@ class TokenCost:
 			return None
 
 		uncached_prompt_tokens = usage.prompt_tokens - (usage.prompt_cached_tokens or 0)
+		# Cache hits are still billed: without a listed cache-read rate, count them at the input rate
+		cache_read_cost_per_token = data.cache_read_input_token_cost or data.input_cost_per_token
 
 		return TokenCostCalculated(
-			new_prompt_tokens=usage.prompt_tokens,
+			new_prompt_tokens=uncached_prompt_tokens,
 			new_prompt_cost=uncached_prompt_tokens * (data.input_cost_per_token or 0),
 			# Cached tokens
 			prompt_read_cached_tokens=usage.prompt_cached_tokens,
-			prompt_read_cached_cost=usage.prompt_cached_tokens * data.cache_read_input_token_cost
-			if usage.prompt_cached_tokens and data.cache_read_input_token_cost
+			prompt_read_cached_cost=usage.prompt_cached_tokens * cache_read_cost_per_token
+			if usage.prompt_cached_tokens and cache_read_cost_per_token
 			else None,
 			# Cache creation tokens
 			prompt_cached_creation_tokens=usage.prompt_cache_creation_tokens,
@@ -375,77 +428,34 @@ class TokenCost:
 		)
 
 	async def get_usage_summary(self, model: str | None = None, since: datetime | None = None) -> UsageSummary:
-		"""Get summary of token usage and costs (costs calculated on-the-fly)"""
-		filtered_usage = self.usage_history
-
-		if model:
-			filtered_usage = [u for u in filtered_usage if u.model == model]
-
-		if since:
-			filtered_usage = [u for u in filtered_usage if u.timestamp >= since]
-
-		if not filtered_usage:
-			return UsageSummary(
-				total_prompt_tokens=0,
-				total_prompt_cost=0.0,
-				total_prompt_cached_tokens=0,
-				total_prompt_cached_cost=0.0,
-				total_completion_tokens=0,
-				total_completion_cost=0.0,
-				total_tokens=0,
-				total_cost=0.0,
-				entry_count=0,
-			)
-
-		# Calculate totals
-		total_prompt = sum(u.usage.prompt_tokens for u in filtered_usage)
-		total_completion = sum(u.usage.completion_tokens for u in filtered_usage)
-		total_tokens = total_prompt + total_completion
-		total_prompt_cached = sum(u.usage.prompt_cached_tokens or 0 for u in filtered_usage)
-		models = list({u.model for u in filtered_usage})
-
-		# Calculate per-model stats with record-by-record cost calculation
-		model_stats: dict[str, ModelUsageStats] = {}
-		total_prompt_cost = 0.0
-		total_completion_cost = 0.0
-		total_prompt_cached_cost = 0.0
-
-		for entry in filtered_usage:
-			if entry.model not in model_stats:
-				model_stats[entry.model] = ModelUsageStats(model=entry.model)
-
-			stats = model_stats[entry.model]
-			stats.prompt_tokens += entry.usage.prompt_tokens
-			stats.completion_tokens += entry.usage.completion_tokens
-			stats.total_tokens += entry.usage.prompt_tokens + entry.usage.completion_tokens
-			stats.invocations += 1
-
-			if self.include_cost:
-				# Calculate cost record by record using the updated calculate_cost function
-				cost = await self.calculate_cost(entry.model, entry.usage)
-				if cost:
-					stats.cost += cost.total_cost
-					total_prompt_cost += cost.prompt_cost
-					total_completion_cost += cost.completion_cost
-					total_prompt_cached_cost += cost.prompt_read_cached_cost or 0
-
-		# Calculate averages
-		for stats in model_stats.values():
-			if stats.invocations > 0:
-				stats.average_tokens_per_invocation = stats.total_tokens / stats.invocations
+		"""Get summary of token usage and costs (new entries are added to running totals)"""
+		if self.include_cost and not self._initialized:
+			await self.initialize()
 
-		return UsageSummary(
-			total_prompt_tokens=total_prompt,
-			total_prompt_cost=total_prompt_cost,
-			total_prompt_cached_tokens=total_prompt_cached,
-			total_prompt_cached_cost=total_prompt_cached_cost,
-			total_completion_tokens=total_completion,
-			total_completion_cost=total_completion_cost,
-			total_tokens=total_tokens,
-			total_cost=total_prompt_cost + total_completion_cost + total_prompt_cached_cost,
-			entry_count=len(filtered_usage),
-			by_model=model_stats,
-		)
+		if model or since:
+			totals = _UsageTotals()
+			for entry in self.usage_history:
+				if (model and entry.model != model) or (since and entry.timestamp < since):
+					continue
+				totals.add(entry, await self.calculate_cost(entry.model, entry.usage))
+			return totals.summary()
+
+		await self._update_totals()
+		return self._totals.summary()
+
+	async def _update_totals(self) -> None:
+		"""Fold usage entries added since the last summary into the running totals"""
+		totals = self._totals
+		if (
+			totals.history is not self.usage_history
+			or totals.pricing is not self._pricing_data
+			or totals.entry_count > len(self.usage_history)
+		):
+			# History was cleared/replaced or pricing refreshed: costs must be recomputed
+			totals = self._totals = _UsageTotals(history=self.usage_history, pricing=self._pricing_data)
+
+		for entry in self.usage_history[totals.entry_count :]:
+			totals.add(entry, await self.calculate_cost(entry.model, entry.usage))
 
 	def _format_tokens(self, tokens: int) -> str:
 		"""Format token count with k suffix for thousands"""
@@ -506,19 +516,7 @@ class TokenCost:
 
 			# Format cost display (only if cost tracking is enabled)
 			if self.include_cost:
-				# Calculate per-model costs on-the-fly
-				total_model_cost = 0.0
-				model_prompt_cost = 0.0
-				model_completion_cost = 0.0
-
-				# Calculate costs for this model
-				for entry in self.usage_history:
-					if entry.model == model:
-						cost = await self.calculate_cost(entry.model, entry.usage)
-						if cost:
-							model_prompt_cost += cost.prompt_cost
-							model_completion_cost += cost.completion_cost
-
+				model_prompt_cost, model_completion_cost = self._totals.model_costs.get(model, (0.0, 0.0))
 				total_model_cost = model_prompt_cost + model_completion_cost
 
 				if total_model_cost > 0:
@@ -555,10 +553,15 @@ class TokenCost:
 			await self._fetch_and_cache_pricing_data()
 
 	async def clean_old_caches(self, keep_count: int = 3) -> None:
-		"""Clean up old cache files, keeping only the most recent ones"""
+		"""Clean up old cache files, keeping only the most recent ones (older-format caches are always removed)"""
 		try:
-			# List all JSON files in the cache directory
-			cache_files = list(self._cache_dir.glob('*.json'))
+			for legacy_file in self._cache_dir.glob('pricing_2*.json'):
+				try:
+					os.remove(legacy_file)
+				except Exception:
+					pass
+
+			cache_files = list(self._cache_dir.glob(f'{self.CACHE_FILE_PREFIX}*.json'))
 
 			if len(cache_files) <= keep_count:
 				return
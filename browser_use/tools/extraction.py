@@ -0,0 +1,116 @@
+"""
+Map-reduce extraction over long page markdown.
+
+The default `extract` action sends at most `MAX_CHAR_LIMIT` characters to the
+extraction LLM and asks the agent to call it again with `start_from_char` for
+the rest, which costs one agent step and one serial LLM call per page slice.
+In map-reduce mode the markdown is split at structural boundaries (headings,
+then lines and sentences), every chunk is queried concurrently under a
+concurrency limit, and the partial answers are merged by one final LLM call,
+all inside a single action.
+
+**Usage:**
+    chunks = split_markdown_chunks(content, max_chars=30000)
+    completion, stats = await map_reduce_extract(llm, system_prompt, query, chunks, max_concurrency=4)
+
+**Configuration:**
+    Tools(extract_mode='map_reduce', extract_max_concurrency=4)
+"""
+
+import asyncio
+import logging
+from typing import Any
+
+from browser_use.llm.base import BaseChatModel
+from browser_use.llm.messages import SystemMessage, UserMessage
+
+logger = logging.getLogger(__name__)
+
+EXTRACT_LLM_TIMEOUT = 120.0
+
+REDUCE_SYSTEM_PROMPT = """
+You are an expert at merging partial data extractions.
+
+<input>
+You will be given a query and the answers extracted from consecutive chunks of one webpage, in page order.
+</input>
+
+<instructions>
+- Combine the partial answers into one answer to the query.
+- Keep every relevant item, in page order, and remove duplicates caused by chunk boundaries.
+- Ignore chunks that report the information is not available, unless no chunk contains it - then say so.
+- Only use information present in the partial answers. Do not make up information.
+</instructions>
+
+<output>
+- Directly output the merged information, without conversational text and without mentioning chunks.
+</output>
+""".strip()
+
+
+async def _invoke(llm: BaseChatModel, system_prompt: str, prompt: str) -> str:
+	response = await asyncio.wait_for(
+		llm.ainvoke([SystemMessage(content=system_prompt), UserMessage(content=prompt)]),
+		timeout=EXTRACT_LLM_TIMEOUT,
+	)
+	return response.completion
+
+
+async def map_reduce_extract(
+	llm: BaseChatModel,
+	system_prompt: str,
+	query: str,
+	chunks: list[tuple[int, str]],
+	max_concurrency: int = 4,
+	stats_summary: str = '',
+) -> tuple[str, dict[str, Any]]:
+	"""
+	Answer a query over page chunks concurrently and merge the partial answers.
+
+	Args:
+		llm: Page extraction LLM
+		system_prompt: System prompt for the per-chunk extraction calls
+		query: Extraction query
+		chunks: (start_offset, text) pairs from split_markdown_chunks
+		max_concurrency: Maximum number of chunk calls in flight
+		stats_summary: Content statistics line included in every chunk prompt
+
+	Returns:
+		Merged completion and {'chunks', 'llm_calls'} statistics
+
+	Raises:
+		Exception: The first chunk error, if every chunk call failed
+	"""
+	total_chars = sum(len(text) for _, text in chunks)
+	semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+	async def extract_chunk(number: int, start: int, text: str) -> str:
+		prompt = (
+			f'<query>\n{query}\n</query>\n\n<content_stats>\n{stats_summary}\n'
+			f'Chunk {number} of {len(chunks)}: chars {start:,}-{start + len(text):,} of the page markdown\n</content_stats>\n\n'
+			f'<webpage_content>\n{text}\n</webpage_content>'
+		)
+		async with semaphore:
+			return await _invoke(llm, system_prompt, prompt)
+
+	results = await asyncio.gather(
+		*(extract_chunk(number, start, text) for number, (start, text) in enumerate(chunks, start=1)),
+		return_exceptions=True,
+	)
+	partials = [(number, result) for number, result in enumerate(results, start=1) if isinstance(result, str)]
+	failures = [result for result in results if isinstance(result, BaseException)]
+	if not partials:
+		raise failures[0]
+	for error in failures:
+		logger.warning(f'⚠️ Extraction of a page chunk failed, merging the remaining chunks: {type(error).__name__}: {error}')
+
+	stats: dict[str, Any] = {'chunks': len(chunks), 'failed_chunks': len(failures), 'llm_calls': len(chunks)}
+	if len(partials) == 1:
+		return partials[0][1], stats
+
+	partial_answers = '\n\n'.join(f'<chunk number="{number}">\n{answer}\n</chunk>' for number, answer in partials)
+	prompt = f'<query>\n{query}\n</query>\n\n<partial_answers>\n{partial_answers}\n</partial_answers>'
+	merged = await _invoke(llm, REDUCE_SYSTEM_PROMPT, prompt)
+	stats['llm_calls'] += 1
+	logger.debug(f'Map-reduce extraction merged {len(partials)} chunks covering {total_chars:,} chars')
+	return merged, stats
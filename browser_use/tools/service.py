@@ -2,7 +2,7 @@ import asyncio
 import json
 import logging
 import os
-from typing import Generic, TypeVar
+from typing import Generic, Literal, TypeVar
 
 try:
 	from lmnr import Laminar  # type: ignore
@@ -32,6 +32,7 @@ from browser_use.filesystem.file_system import FileSystem
 from browser_use.llm.base import BaseChatModel
 from browser_use.llm.messages import SystemMessage, UserMessage
 from browser_use.observability import observe_debug
+from browser_use.tools.extraction import EXTRACT_LLM_TIMEOUT, map_reduce_extract
 from browser_use.tools.registry.service import Registry
 from browser_use.tools.utils import get_click_description
 from browser_use.tools.views import (
@@ -108,9 +109,22 @@ class Tools(Generic[Context]):
 		exclude_actions: list[str] | None = None,
 		output_model: type[T] | None = None,
 		display_files_in_done_text: bool = True,
+		extract_mode: Literal['paged', 'map_reduce'] = 'paged',
+		extract_max_concurrency: int = 4,
 	):
+		"""
+		Args:
+			exclude_actions: Names of default actions not to register
+			output_model: Structured output model for the done action
+			display_files_in_done_text: Include attached file contents in the done text
+			extract_mode: 'paged' sends one slice of a long page per extract call (continue with start_from_char);
+				'map_reduce' queries every slice concurrently and merges the answers in one call
+			extract_max_concurrency: Maximum concurrent extraction LLM calls in map_reduce mode
+		"""
 		self.registry = Registry[Context](exclude_actions if exclude_actions is not None else [])
 		self.display_files_in_done_text = display_files_in_done_text
+		self.extract_mode = extract_mode
+		self.extract_max_concurrency = extract_max_concurrency
 		self._output_model: type[BaseModel] | None = output_model
 		self._coordinate_clicking_enabled: bool = False
 
@@ -670,7 +684,7 @@ class Tools(Generic[Context]):
 
 			# Extract clean markdown using the unified method
 			try:
-				from browser_use.dom.markdown_extractor import extract_clean_markdown
+				from browser_use.dom.markdown_extractor import extract_clean_markdown, split_markdown_chunks
 
 				content, content_stats = await extract_clean_markdown(
 					browser_session=browser_session, extract_links=extract_links
@@ -689,9 +703,12 @@ class Tools(Generic[Context]):
 				content = content[start_from_char:]
 				content_stats['started_from_char'] = start_from_char
 
-			# Smart truncation with context preservation
+			# Long pages are either split into chunks queried together (map_reduce) or truncated for paging
+			chunks = None
 			truncated = False
-			if len(content) > MAX_CHAR_LIMIT:
+			if len(content) > MAX_CHAR_LIMIT and self.extract_mode == 'map_reduce':
+				chunks = split_markdown_chunks(content, MAX_CHAR_LIMIT)
+			elif len(content) > MAX_CHAR_LIMIT:
 				# Try to truncate at a natural break point (paragraph, sentence)
 				truncate_at = MAX_CHAR_LIMIT
 
@@ -723,6 +740,8 @@ class Tools(Generic[Context]):
 				stats_summary += f' → {len(content):,} final chars (truncated, use start_from_char={content_stats["next_start_char"]} to continue)'
 			elif chars_filtered > 0:
 				stats_summary += f' (filtered {chars_filtered:,} chars of noise)'
+			if chunks:
+				stats_summary += f' → split into {len(chunks)} chunks, extracted together'
 
 			system_prompt = """
 You are an expert at extracting data from the markdown of a webpage.
@@ -752,15 +771,25 @@ You will be given a query and the markdown of a webpage that has been filtered t
 			prompt = f'<query>\n{query}\n</query>\n\n<content_stats>\n{stats_summary}\n</content_stats>\n\n<webpage_content>\n{content}\n</webpage_content>'
 
 			try:
-				response = await asyncio.wait_for(
-					page_extraction_llm.ainvoke([SystemMessage(content=system_prompt), UserMessage(content=prompt)]),
-					timeout=120.0,
-				)
+				if chunks:
+					completion, map_reduce_stats = await map_reduce_extract(
+						page_extraction_llm,
+						system_prompt,
+						query,
+						chunks,
+						max_concurrency=self.extract_max_concurrency,
+						stats_summary=stats_summary,
+					)
+					logger.debug(f'Map-reduce extraction: {map_reduce_stats}')
+				else:
+					response = await asyncio.wait_for(
+						page_extraction_llm.ainvoke([SystemMessage(content=system_prompt), UserMessage(content=prompt)]),
+						timeout=EXTRACT_LLM_TIMEOUT,
+					)
+					completion = response.completion
 
 				current_url = await browser_session.get_current_page_url()
-				extracted_content = (
-					f'<url>\n{current_url}\n</url>\n<query>\n{query}\n</query>\n<result>\n{response.completion}\n</result>'
-				)
+				extracted_content = f'<url>\n{current_url}\n</url>\n<query>\n{query}\n</query>\n<result>\n{completion}\n</result>'
 
 				# Simple memory handling
 				MAX_MEMORY_LENGTH = 1000
@@ -5,7 +5,6 @@ Provides schemas and services for general agents to communicate with browser-use
 """
 
 import logging
-import re
 from typing import Any
 
 from pydantic import BaseModel, Field, field_validator
@@ -88,7 +87,8 @@ class ScreenRecognitionService:
 	Matches current browser state to known screens.
 	
 	Uses URL patterns and DOM indicators to identify which screen
-	the browser is currently on.
+	the browser is currently on. Screens, matchers and actions come from the
+	shared runtime model of the knowledge base (see runtime_model.py).
 	"""
 	
 	async def recognize_screen(
@@ -113,54 +113,26 @@ class ScreenRecognitionService:
 			- available_actions: Available actions on this screen
 		"""
 		try:
-			from navigator.knowledge.persist.documents.screens import (
-				query_screens_by_knowledge_id,
-			)
+			from navigator.knowledge.runtime_model import RECOGNITION_THRESHOLD, get_knowledge_runtime_cache
 			
-			# Get all actionable screens for this knowledge
-			screens = await query_screens_by_knowledge_id(
-				knowledge_id,
-				content_type="web_ui",
-				actionable_only=True,
-				limit=1000
-			)
+			model = await get_knowledge_runtime_cache().get_model(knowledge_id)
 			
-			if not screens:
+			if not model.matchers:
 				return {
 					"screen_id": None,
 					"confidence": 0.0,
 					"message": "No actionable screens found for this knowledge"
 				}
 			
-			best_match = None
-			best_score = 0.0
-			matched_indicators_list: list[dict[str, Any]] = []
+			best_match, best_score, matched_indicators_list = model.recognize(current_url, dom_summary)
 			
-			for screen in screens:
-				score, matched = self._calculate_match_score(
-					screen,
-					current_url,
-					dom_summary
-				)
-				
-				if score > best_score:
-					best_score = score
-					best_match = screen
-					matched_indicators_list = matched
-			
-			if best_match and best_score > 0.7:  # Confidence threshold
-				# Get available actions for this screen
-				available_actions = await self._get_available_actions(
-					best_match.screen_id,
-					knowledge_id
-				)
-				
+			if best_match and best_score > RECOGNITION_THRESHOLD:
 				return {
 					"screen_id": best_match.screen_id,
 					"screen_name": best_match.name,
 					"confidence": best_score,
 					"matched_indicators": matched_indicators_list,
-					"available_actions": available_actions
+					"available_actions": model.screen_actions.get(best_match.screen_id, [])
 				}
 			
 			return {
@@ -187,6 +159,9 @@ class ScreenRecognitionService:
 		"""
 		Calculate how well screen matches current state.
 		
+		Compiles the screen's patterns on every call; recognize_screen uses the
+		runtime model's precompiled matchers instead.
+		
 		Args:
 			screen: Screen definition
 			current_url: Current browser URL
@@ -195,74 +170,9 @@ class ScreenRecognitionService:
 		Returns:
 			Tuple of (score, matched_indicators)
 		"""
-		score = 0.0
-		matched_indicators: list[dict[str, Any]] = []
-		
-		# URL pattern matching (40% weight)
-		url_match = False
-		for pattern in screen.url_patterns:
-			try:
-				if re.match(pattern, current_url):
-					url_match = True
-					matched_indicators.append({
-						"type": "url_matches",
-						"pattern": pattern,
-						"value": current_url
-					})
-					break
-			except re.error:
-				logger.warning(f"Invalid regex pattern: {pattern}")
-				continue
-		
-		if url_match:
-			score += 0.4
+		from navigator.knowledge.runtime_model import ScreenMatcher
 		
-		# DOM indicator matching (60% weight)
-		matched_count = 0
-		total_indicators = len(screen.state_signature.required_indicators)
-		
-		if total_indicators > 0:
-			dom_lower = dom_summary.lower()
-			
-			for indicator in screen.state_signature.required_indicators:
-				matched = False
-				
-				if indicator.type == "dom_contains":
-					if indicator.value and indicator.value.lower() in dom_lower:
-						matched = True
-						matched_indicators.append({
-							"type": "dom_contains",
-							"value": indicator.value,
-							"selector": indicator.selector
-						})
-				
-				elif indicator.type == "url_matches":
-					if indicator.pattern:
-						try:
-							if re.match(indicator.pattern, current_url):
-								matched = True
-								matched_indicators.append({
-									"type": "url_matches",
-									"pattern": indicator.pattern
-								})
-						except re.error:
-							pass
-				
-				elif indicator.type == "url_exact":
-					if indicator.value and indicator.value == current_url:
-						matched = True
-						matched_indicators.append({
-							"type": "url_exact",
-							"value": indicator.value
-						})
-				
-				if matched:
-					matched_count += 1
-			
-			indicator_score = matched_count / total_indicators if total_indicators > 0 else 0.0
-			score += indicator_score * 0.6
-		
-		return score, matched_indicators
+		return ScreenMatcher.compile(screen).score(current_url, dom_summary.lower())
 	
 	async def _get_available_actions(
 		self,
@@ -271,33 +181,18 @@ class ScreenRecognitionService:
 	) -> list[dict[str, Any]]:
 		"""Get available actions for a screen."""
 		try:
-			from navigator.knowledge.persist.documents.actions import (
-				query_actions_by_knowledge_id,
-			)
 			from navigator.knowledge.persist.documents.screens import get_screen
+			from navigator.knowledge.runtime_model import get_knowledge_runtime_cache
+			
+			model = await get_knowledge_runtime_cache().get_model(knowledge_id)
+			if screen_id in model.screen_actions:
+				return model.screen_actions[screen_id]
 			
-			# Get screen to find action_ids
+			# Screen from another job or knowledge base, match it against this one's actions
 			screen = await get_screen(screen_id)
 			if not screen or not hasattr(screen, 'action_ids'):
 				return []
-			
-			# Get all actions for this knowledge
-			all_actions = await query_actions_by_knowledge_id(knowledge_id, limit=1000)
-			
-			# Filter to actions available on this screen
-			screen_action_ids = set(screen.action_ids or [])
-			available = [
-				{
-					"action_id": action.action_id,
-					"action_type": action.action_type,
-					"name": action.name,
-					"target_selector": action.target_selector
-				}
-				for action in all_actions
-				if action.action_id in screen_action_ids
-			]
-			
-			return available
+			return model.actions_for(screen)
 		
 		except Exception as e:
 			logger.error(f"Failed to get available actions: {e}")
@@ -8,7 +8,6 @@ Generates comprehensive user flows by combining:
 - Transitions (navigation paths)
 """
 
-import json
 import logging
 import os
 from typing import Any
@@ -16,6 +15,8 @@ from uuid import uuid4
 
 from pydantic import BaseModel, Field
 
+from browser_use.llm.structured_output import StructuredOutputError, parse_json_text
+
 logger = logging.getLogger(__name__)
 
 
@@ -381,24 +382,13 @@ Return ONLY valid JSON, no markdown formatting."""
 				else:
 					logger.debug(f"OpenAI response: {content_text}")
 
-				# Try to parse JSON, with fallback for markdown code blocks
+				# Parse JSON (tolerates markdown code blocks and surrounding text)
 				try:
-					data = json.loads(content_text)
-				except json.JSONDecodeError as e:
-					# Try to extract JSON from markdown code blocks
-					import re
-					json_match = re.search(r'```(?:json)?\s*(\{.*\})\s*```', content_text, re.DOTALL)
-					if json_match:
-						data = json.loads(json_match.group(1))
-					else:
-						# Try to find JSON object in the text
-						json_match = re.search(r'\{.*\}', content_text, re.DOTALL)
-						if json_match:
-							data = json.loads(json_match.group(0))
-						else:
-							logger.error(f"Failed to parse JSON. Response length: {len(content_text)}, Error: {e}")
-							logger.error(f"Response content: {content_text[:1000]}")
-							raise
+					data = parse_json_text(content_text, strict=True).data
+				except StructuredOutputError as e:
+					logger.error(f"Failed to parse JSON. Response length: {len(content_text)}, Error: {e}")
+					logger.error(f"Response content: {content_text[:1000]}")
+					raise
 
 				# Handle both direct array and wrapped in object
 				if isinstance(data, list):
@@ -5,7 +5,6 @@ Extracts step-by-step operational workflows from video demonstrations
 by combining transcription, action sequences, and frame analysis.
 """
 
-import json
 import logging
 import os
 from typing import Any
@@ -13,6 +12,7 @@ from uuid import uuid4
 
 from pydantic import BaseModel, Field
 
+from browser_use.llm.structured_output import StructuredOutputError, parse_json_text
 from navigator.schemas import ContentChunk
 
 logger = logging.getLogger(__name__)
@@ -327,24 +327,13 @@ Return ONLY valid JSON, no markdown formatting."""
 				else:
 					logger.debug(f"OpenAI response: {content_text}")
 
-				# Try to parse JSON, with fallback for markdown code blocks
+				# Parse JSON (tolerates markdown code blocks and surrounding text)
 				try:
-					data = json.loads(content_text)
-				except json.JSONDecodeError as e:
-					# Try to extract JSON from markdown code blocks
-					import re
-					json_match = re.search(r'```(?:json)?\s*(\{.*\})\s*```', content_text, re.DOTALL)
-					if json_match:
-						data = json.loads(json_match.group(1))
-					else:
-						# Try to find JSON object in the text
-						json_match = re.search(r'\{.*\}', content_text, re.DOTALL)
-						if json_match:
-							data = json.loads(json_match.group(0))
-						else:
-							logger.error(f"Failed to parse JSON. Response length: {len(content_text)}, Error: {e}")
-							logger.error(f"Response content: {content_text[:1000]}")
-							raise
+					data = parse_json_text(content_text, strict=True).data
+				except StructuredOutputError as e:
+					logger.error(f"Failed to parse JSON. Response length: {len(content_text)}, Error: {e}")
+					logger.error(f"Response content: {content_text[:1000]}")
+					raise
 
 				# Handle both direct array and wrapped in object
 				if isinstance(data, list):
@@ -460,15 +449,10 @@ Return ONLY valid JSON, no markdown formatting."""
 
 				# Try to extract JSON
 				try:
-					data = json.loads(content_text)
-				except json.JSONDecodeError:
-					import re
-					json_match = re.search(r'```json\s*(.*?)\s*```', content_text, re.DOTALL)
-					if json_match:
-						data = json.loads(json_match.group(1))
-					else:
-						logger.warning("Could not parse Gemini response as JSON")
-						return []
+					data = parse_json_text(content_text, strict=True).data
+				except StructuredOutputError:
+					logger.warning("Could not parse Gemini response as JSON")
+					return []
 
 				# Handle both direct array and wrapped in object
 				if isinstance(data, list):
@@ -4,14 +4,14 @@ LLM-Based Action Extrapolation (Phase 5).
 Uses Gemini LLM to infer missing screen actions and transitions between known actions.
 """
 
-import json
 import logging
 import os
-import re
 from typing import Any
 
 from pydantic import BaseModel, Field, field_validator
 
+from browser_use.llm.structured_output import parse_json_text
+
 logger = logging.getLogger(__name__)
 
 
@@ -314,30 +314,12 @@ Return ONLY valid JSON, no markdown formatting."""
 	def _parse_extrapolation_response(self, response_text: str) -> dict[str, Any] | None:
 		"""Parse Gemini LLM response into structured format."""
 		try:
-			# Extract JSON from response (handle markdown code blocks)
-			text = response_text.strip()
-			
-			# Try direct JSON parsing first
-			try:
-				return json.loads(text)
-			except json.JSONDecodeError:
-				pass
-			
-			# Try to extract JSON from markdown code blocks
-			json_match = re.search(r'```json\s*(\{.*?\})\s*```', text, re.DOTALL)
-			if not json_match:
-				json_match = re.search(r'```\s*(\{.*?\})\s*```', text, re.DOTALL)
-			
-			if json_match:
-				return json.loads(json_match.group(1))
-			
-			# Try to find JSON object in text
-			json_match = re.search(r'\{.*\}', text, re.DOTALL)
-			if json_match:
-				return json.loads(json_match.group(0))
-			
-			logger.warning("Could not parse JSON from LLM response")
-			return None
+			# Handles markdown code blocks and text around the JSON object
+			parsed = parse_json_text(response_text)
+			if not parsed.complete:
+				logger.warning(f"Could not parse JSON from LLM response: {parsed.error}")
+				return None
+			return parsed.data
 		
 		except Exception as e:
 			logger.error(f"Failed to parse extrapolation response: {e}")
@@ -6,9 +6,10 @@ Handles smart frame filtering using OpenCV pixel diff and scene change detection
 
 import logging
 import re
-import subprocess
 from pathlib import Path
 
+from navigator.knowledge.ingest.video.media_tools import get_media_tool_runner
+
 logger = logging.getLogger(__name__)
 
 
@@ -35,7 +36,7 @@ async def detect_scene_changes(video_path: Path, duration: float) -> list[float]
 			'-'
 		]
 
-		result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+		result = await get_media_tool_runner().run(cmd, timeout=60)
 
 		# Parse output for scene change timestamps
 		# Look for pts_time in ffmpeg output
@@ -5,10 +5,8 @@ Analyzes video frames using Gemini Vision LLM to extract UI elements, screen sta
 business context, and visible text (OCR).
 """
 
-import json
 import logging
 import os
-import re
 from pathlib import Path
 from typing import Any
 
@@ -19,10 +17,14 @@ from tenacity import (
 	wait_exponential,
 )
 
+from browser_use.llm.structured_output import StructuredOutputError, parse_json_stream
 from navigator.schemas import FrameAnalysisResponse
 
 logger = logging.getLogger(__name__)
 
+# Seconds to wait for a complete response before keeping the fields received so far
+_VISION_RESPONSE_TIMEOUT = float(os.getenv('VISION_RESPONSE_TIMEOUT', '120'))
+
 # Global client cache to reuse Gemini client across frame analyses (improves performance)
 _gemini_client_cache: dict[str, Any] = {}
 
@@ -120,77 +122,48 @@ CRITICAL:
 - Phase 5.2: Include importance_score and layout_context for EVERY ui_element.
 - Phase 5.2: Provide structured layout_structure object, not just a string description."""
 
-	# Open PIL Image and pass directly to SDK
-	with Image.open(frame_path) as img:
-		response = client.models.generate_content(
-			model="gemini-2.5-flash",
-			contents=[prompt, img]
-		)
-
-	content = response.text
+	# Stream the response and parse it incrementally: fields are validated as they
+	# complete, malformed output aborts the stream early, and a timeout keeps
+	# whatever fields were already complete
+	received: list[str] = []
+
+	async def stream_text():
+		with Image.open(frame_path) as img:
+			stream = await client.aio.models.generate_content_stream(
+				model="gemini-2.5-flash",
+				contents=[prompt, img]
+			)
+			async for chunk in stream:
+				if chunk.text:
+					received.append(chunk.text)
+					yield chunk.text
 
+	analysis_dict = None
+	try:
+		parsed = await parse_json_stream(
+			stream_text(),
+			FrameAnalysisResponse,
+			timeout=_VISION_RESPONSE_TIMEOUT,
+		)
+		if parsed.complete:
+			analysis_dict = parsed.data
+		elif parsed.data:
+			logger.warning(
+				f"Incomplete Gemini response for frame {timestamp}s ({parsed.error}), "
+				f"keeping {len(parsed.data)} completed fields"
+			)
+			analysis_dict = parsed.data
+		if parsed.field_errors:
+			logger.debug(f"Fields failing schema validation for frame {timestamp}s: {list(parsed.field_errors)}")
+	except StructuredOutputError as e:
+		logger.warning(f"Failed to parse JSON from LLM response for frame {timestamp}s: {e}")
+
+	content = ''.join(received)
 	if not content:
 		logger.warning(f"Gemini returned empty content for frame {timestamp}s")
 		return None
-
-	# Parse and validate JSON response
-	analysis_dict = None
-
-	# Step 1: Try direct JSON parsing
-	try:
-		analysis_dict = json.loads(content)
-	except json.JSONDecodeError:
-		# Step 2: Try to extract JSON from markdown code blocks
-		text = content.strip()
-
-		# Try ```json ... ``` first
-		if text.startswith('```json') and '```' in text:
-			text = text[7:]
-			if text.endswith('```'):
-				text = text[:-3].strip()
-			else:
-				json_match = re.search(r'```json\s*(.*?)\s*```', content, re.DOTALL)
-				if json_match:
-					text = json_match.group(1).strip()
-		# Try plain ``` ... ``` code block
-		elif text.startswith('```') and text.count('```') >= 2:
-			if text.endswith('```'):
-				text = text[3:-3].strip()
-			else:
-				json_match = re.search(r'```\s*(.*?)\s*```', content, re.DOTALL)
-				if json_match:
-					text = json_match.group(1).strip()
-
-		# Step 3: Try to find JSON object/array in the text
-		if not analysis_dict:
-			json_obj_match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', text, re.DOTALL)
-			if json_obj_match:
-				text = json_obj_match.group(0)
-
-		# Step 4: Try parsing the extracted/cleaned text
-		try:
-			analysis_dict = json.loads(text)
-		except json.JSONDecodeError:
-			# Step 5: Last resort - find JSON between first { and last }
-			first_brace = text.find('{')
-			if first_brace >= 0:
-				brace_count = 0
-				for i in range(first_brace, len(text)):
-					if text[i] == '{':
-						brace_count += 1
-					elif text[i] == '}':
-						brace_count -= 1
-						if brace_count == 0:
-							json_str = text[first_brace:i+1]
-							try:
-								analysis_dict = json.loads(json_str)
-								break
-							except json.JSONDecodeError:
-								pass
-
-			if not analysis_dict:
-				logger.warning(f"Failed to parse JSON from LLM response for frame {timestamp}s. Attempted multiple extraction methods.")
-				logger.debug(f"Raw response (first 500 chars): {content[:500]}")
+	if analysis_dict is None:
+		logger.debug(f"Raw response (first 500 chars): {content[:500]}")
 
 	# Phase 5.2: Post-process spatial information from frame analysis
 	if analysis_dict:
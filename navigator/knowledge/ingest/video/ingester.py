@@ -23,6 +23,7 @@ from navigator.knowledge.ingest.video.frame_analysis.filtering import (
 )
 from navigator.knowledge.ingest.video.frame_analysis.formatting import format_frame_analysis
 from navigator.knowledge.ingest.video.frame_analysis.vision import analyze_frame_with_vision
+from navigator.knowledge.ingest.video.media_tools import get_media_tool_runner
 from navigator.knowledge.ingest.video.metadata import extract_metadata, format_metadata_as_text
 from navigator.knowledge.ingest.video.thumbnails import generate_thumbnails
 from navigator.knowledge.ingest.video.transcription import (
@@ -141,7 +142,7 @@ class VideoIngester:
 				return result
 
 			# Extract metadata
-			metadata = extract_metadata(video_path)
+			metadata = await extract_metadata(video_path)
 
 			if not metadata:
 				result.add_error(
@@ -306,7 +307,7 @@ class VideoIngester:
 					result.add_error("ActionExtractionError", f"Action extraction failed: {str(e)}", {"video_path": str(video_path)})
 
 			# Generate thumbnails
-			thumbnail_paths = generate_thumbnails(video_path, ingestion_id, duration, self.thumbnail_count)
+			thumbnail_paths = await generate_thumbnails(video_path, ingestion_id, duration, self.thumbnail_count)
 
 			if thumbnail_paths:
 				# Create chunk with thumbnail references
@@ -437,24 +438,14 @@ class VideoIngester:
 			temp_dir = Path(tempfile.gettempdir()) / 'video_frames' / ingestion_id
 			temp_dir.mkdir(parents=True, exist_ok=True)
 
-			frame_paths = []
-			for timestamp in all_candidate_timestamps:
-				frame_path = temp_dir / f"frame_{timestamp:.2f}.jpg"
-
-				import subprocess
-				cmd = [
-					'ffmpeg',
-					'-ss', str(timestamp),
-					'-i', str(video_path),
-					'-vframes', '1',
-					'-q:v', '2',
-					'-y',
-					str(frame_path)
-				]
-
-				result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-				if result.returncode == 0 and frame_path.exists():
-					frame_paths.append((timestamp, frame_path))
+			# Extract candidate frames concurrently (bounded by the shared media tool runner)
+			runner = get_media_tool_runner()
+			frame_targets = [(timestamp, temp_dir / f"frame_{timestamp:.2f}.jpg") for timestamp in all_candidate_timestamps]
+			extracted = await asyncio.gather(*(
+				runner.extract_frame(video_path, timestamp, frame_path, timeout=10)
+				for timestamp, frame_path in frame_targets
+			))
+			frame_paths = [target for target, ok in zip(frame_targets, extracted) if ok]
 
 			logger.info(f"📸 Extracted {len(frame_paths)} frames from {len(all_candidate_timestamps)} candidate timestamps")
 
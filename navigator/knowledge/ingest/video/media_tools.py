@@ -0,0 +1,262 @@
+"""
+Async runner for ffmpeg / ffprobe invocations.
+
+All video modules run their media tools through one shared runner instead of
+calling `subprocess.run` from inside coroutines (which blocks the event loop,
+stalling Temporal heartbeats and every other coroutine in the worker).
+
+Features:
+- `asyncio.create_subprocess_exec` (never blocks the event loop)
+- Bounded global concurrency (MEDIA_TOOL_MAX_CONCURRENCY, default: CPU count)
+- Per-call timeouts; the whole process group is killed on timeout/cancel
+- ffmpeg stderr progress parsing (`time=HH:MM:SS.xx`)
+- ffprobe result cache keyed by file identity (path, inode, size, mtime)
+
+**Usage:**
+    runner = get_media_tool_runner()
+    metadata = await runner.probe(video_path)
+    result = await runner.run(['ffmpeg', '-i', str(video_path), ...], timeout=60)
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import signal
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# ffmpeg progress lines look like: "frame=  120 fps= 30 ... time=00:00:04.00 bitrate=..."
+_PROGRESS_PATTERN = re.compile(rb'time=(\d+):(\d{2}):(\d{2}(?:\.\d+)?)')
+
+
+class MediaToolError(RuntimeError):
+	"""Raised when a media tool fails and the caller asked for `check=True`."""
+
+
+@dataclass
+class MediaToolResult:
+	"""Outcome of a media tool invocation."""
+
+	returncode: int
+	stdout: bytes
+	stderr: str
+	elapsed: float
+	timed_out: bool = False
+
+	@property
+	def ok(self) -> bool:
+		return self.returncode == 0 and not self.timed_out
+
+
+def parse_progress(line: bytes) -> float | None:
+	"""Parse the media position (seconds) from an ffmpeg progress line."""
+	match = _PROGRESS_PATTERN.search(line)
+	if not match:
+		return None
+	hours, minutes, seconds = match.groups()
+	return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def _kill_process_group(process: asyncio.subprocess.Process) -> None:
+	"""Kill the process and any children it spawned."""
+	if process.returncode is not None:
+		return
+	try:
+		os.killpg(process.pid, signal.SIGKILL)
+	except (ProcessLookupError, PermissionError, AttributeError):
+		try:
+			process.kill()
+		except ProcessLookupError:
+			pass
+
+
+class MediaToolRunner:
+	"""Runs media tools as async subprocesses under a global concurrency limit."""
+
+	def __init__(self, max_concurrency: int | None = None, probe_cache_size: int = 256):
+		"""
+		Initialize media tool runner.
+
+		Args:
+			max_concurrency: Maximum media tool processes running at once
+			probe_cache_size: Number of ffprobe results to keep
+		"""
+		self.max_concurrency = max_concurrency or int(os.getenv('MEDIA_TOOL_MAX_CONCURRENCY', str(os.cpu_count() or 4)))
+		self._semaphore = asyncio.Semaphore(self.max_concurrency)
+		self._probe_cache: OrderedDict[tuple, dict[str, Any]] = OrderedDict()
+		self._probe_cache_size = probe_cache_size
+
+	async def _spawn(self, args: list[str]) -> asyncio.subprocess.Process:
+		return await asyncio.create_subprocess_exec(
+			*args,
+			stdin=asyncio.subprocess.DEVNULL,
+			stdout=asyncio.subprocess.PIPE,
+			stderr=asyncio.subprocess.PIPE,
+			start_new_session=True,  # Own process group, so timeouts kill helpers too
+		)
+
+	async def run(
+		self,
+		args: list[str],
+		timeout: float | None = None,
+		on_progress: Callable[[float], None] | None = None,
+		check: bool = False,
+	) -> MediaToolResult:
+		"""
+		Run a media tool to completion.
+
+		Args:
+			args: Command and arguments (e.g. ['ffmpeg', '-i', ...])
+			timeout: Seconds before the process group is killed (None = no limit)
+			on_progress: Called with media position in seconds as ffmpeg reports progress
+			check: Raise MediaToolError on non-zero exit or timeout
+
+		Raises:
+			FileNotFoundError: If the tool is not installed
+		"""
+		async with self._semaphore:
+			start = time.perf_counter()
+			process = await self._spawn(args)
+			assert process.stdout is not None and process.stderr is not None
+
+			async def read_stderr() -> bytes:
+				assert process.stderr is not None
+				collected = bytearray()
+				pending = b''
+				while chunk := await process.stderr.read(4096):
+					collected.extend(chunk)
+					if on_progress is None:
+						continue
+					# ffmpeg terminates progress lines with \r, log lines with \n
+					pending += chunk
+					*lines, pending = re.split(rb'[\r\n]', pending)
+					for line in lines:
+						position = parse_progress(line)
+						if position is not None:
+							on_progress(position)
+				return bytes(collected)
+
+			timed_out = False
+			communicate = asyncio.gather(process.stdout.read(), read_stderr(), process.wait())
+			try:
+				stdout, stderr, _ = await asyncio.wait_for(communicate, timeout=timeout)
+			except TimeoutError:
+				timed_out = True
+				_kill_process_group(process)
+				await process.wait()
+				stdout, stderr = b'', b''
+			except BaseException:
+				# Cancelled (e.g. activity cancellation): don't leave ffmpeg running
+				_kill_process_group(process)
+				raise
+
+		result = MediaToolResult(
+			returncode=process.returncode if process.returncode is not None else -1,
+			stdout=stdout,
+			stderr=stderr.decode('utf-8', errors='replace'),
+			elapsed=time.perf_counter() - start,
+			timed_out=timed_out,
+		)
+		if timed_out:
+			logger.warning(f'⏱️ {Path(args[0]).name} timed out after {timeout}s and was killed')
+		if check and not result.ok:
+			reason = f'timed out after {timeout}s' if timed_out else f'exited with {result.returncode}: {result.stderr[-2000:]}'
+			raise MediaToolError(f'{Path(args[0]).name} {reason}')
+		return result
+
+	async def stream_stdout(self, args: list[str], read_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+		"""
+		Run a media tool and yield its stdout incrementally.
+
+		The concurrency slot is held for the whole stream; the process group is
+		killed if the consumer stops early.
+
+		Raises:
+			MediaToolError: If the tool exits with an error
+		"""
+		async with self._semaphore:
+			process = await self._spawn(args)
+			assert process.stdout is not None and process.stderr is not None
+			stderr_task = asyncio.create_task(process.stderr.read())
+			try:
+				while data := await process.stdout.read(read_size):
+					yield data
+				returncode = await process.wait()
+				stderr = (await stderr_task).decode('utf-8', errors='replace')
+				if returncode != 0:
+					raise MediaToolError(f'{Path(args[0]).name} exited with {returncode}: {stderr[-2000:]}')
+			finally:
+				if process.returncode is None:
+					_kill_process_group(process)
+					await process.wait()
+				if not stderr_task.done():
+					stderr_task.cancel()
+
+	@staticmethod
+	def _file_identity(path: Path) -> tuple:
+		stat_result = path.stat()
+		return (str(path.resolve()), stat_result.st_ino, stat_result.st_size, stat_result.st_mtime_ns)
+
+	async def probe(self, path: Path, timeout: float = 30) -> dict[str, Any] | None:
+		"""
+		Run ffprobe (format + streams as JSON), cached by file identity.
+
+		Returns:
+			Parsed ffprobe output, or None if ffprobe failed
+
+		Raises:
+			FileNotFoundError: If ffprobe is not installed or the file does not exist
+		"""
+		key = self._file_identity(path)
+		cached = self._probe_cache.get(key)
+		if cached is not None:
+			self._probe_cache.move_to_end(key)
+			return cached
+
+		result = await self.run(
+			['ffprobe', '-v', 'quiet', '-print_format', 'json', '-show_format', '-show_streams', str(path)],
+			timeout=timeout,
+		)
+		if not result.ok:
+			logger.error(f'ffprobe failed: {result.stderr}')
+			return None
+
+		data = json.loads(result.stdout)
+		self._probe_cache[key] = data
+		if len(self._probe_cache) > self._probe_cache_size:
+			self._probe_cache.popitem(last=False)
+		return data
+
+	async def extract_frame(self, video_path: Path, timestamp: float, output_path: Path, timeout: float = 10) -> bool:
+		"""
+		Extract a single JPEG frame at a timestamp.
+
+		Returns:
+			True if the frame was written
+		"""
+		result = await self.run(
+			['ffmpeg', '-ss', str(timestamp), '-i', str(video_path), '-vframes', '1', '-q:v', '2', '-y', str(output_path)],
+			timeout=timeout,
+		)
+		if not result.ok:
+			logger.debug(f'Frame extraction at {timestamp}s failed: {result.stderr[-500:]}')
+		return result.ok and await asyncio.to_thread(output_path.exists)
+
+
+_media_tool_runner: MediaToolRunner | None = None
+
+
+def get_media_tool_runner() -> MediaToolRunner:
+	"""Get the process-wide media tool runner."""
+	global _media_tool_runner
+	if _media_tool_runner is None:
+		_media_tool_runner = MediaToolRunner()
+	return _media_tool_runner
@@ -4,19 +4,22 @@ Video metadata extraction and formatting.
 Handles extraction of video metadata using ffprobe and formatting as text.
 """
 
-import json
 import logging
-import subprocess
 from pathlib import Path
 from typing import Any
 
+from navigator.knowledge.ingest.video.media_tools import get_media_tool_runner
+
 logger = logging.getLogger(__name__)
 
 
-def extract_metadata(video_path: Path) -> dict[str, Any] | None:
+async def extract_metadata(video_path: Path) -> dict[str, Any] | None:
 	"""
 	Extract video metadata using ffprobe.
 	
+	Probe results are cached by file identity, so repeated calls for the same
+	video (ingestion, frame filtering, assembly) only run ffprobe once.
+	
 	Args:
 		video_path: Path to video file
 	
@@ -25,23 +28,10 @@ def extract_metadata(video_path: Path) -> dict[str, Any] | None:
 	"""
 	try:
 		# Use ffprobe to extract metadata
-		cmd = [
-			'ffprobe',
-			'-v', 'quiet',
-			'-print_format', 'json',
-			'-show_format',
-			'-show_streams',
-			str(video_path)
-		]
-
-		result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-
-		if result.returncode != 0:
-			logger.error(f"ffprobe failed: {result.stderr}")
+		data = await get_media_tool_runner().probe(video_path, timeout=30)
+		if data is None:
 			return None
 
-		data = json.loads(result.stdout)
-
 		# Extract relevant metadata
 		format_info = data.get('format', {})
 		streams = data.get('streams', [])
@@ -71,7 +61,7 @@ def extract_metadata(video_path: Path) -> dict[str, Any] | None:
 		return metadata
 
 	except FileNotFoundError:
-		logger.error("ffprobe not found. Please install ffmpeg.")
+		logger.error(f"ffprobe or video file not found ({video_path}). Please install ffmpeg.")
 		return None
 	except Exception as e:
 		logger.error(f"Error extracting metadata: {e}")
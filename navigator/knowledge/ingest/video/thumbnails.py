@@ -4,15 +4,17 @@ Video thumbnail generation.
 Generates thumbnails at key intervals in the video.
 """
 
+import asyncio
 import logging
-import subprocess
 import tempfile
 from pathlib import Path
 
+from navigator.knowledge.ingest.video.media_tools import get_media_tool_runner
+
 logger = logging.getLogger(__name__)
 
 
-def generate_thumbnails(
+async def generate_thumbnails(
 	video_path: Path,
 	ingestion_id: str,
 	duration: float,
@@ -42,6 +44,7 @@ def generate_thumbnails(
 		temp_dir.mkdir(parents=True, exist_ok=True)
 
 		# Generate thumbnails at intervals
+		targets = []
 		for i in range(thumbnail_count):
 			# Calculate timestamp (0%, 25%, 50%, 75%, 100%)
 			progress = i / (thumbnail_count - 1) if thumbnail_count > 1 else 0
@@ -54,30 +57,21 @@ def generate_thumbnails(
 
 			# Output path
 			output_path = temp_dir / f"thumbnail_{i}_{int(progress*100)}pct.jpg"
+			targets.append((progress, timestamp, output_path))
 
-			# Use ffmpeg to extract frame
-			cmd = [
-				'ffmpeg',
-				'-ss', str(timestamp),
-				'-i', str(video_path),
-				'-vframes', '1',
-				'-q:v', '2',
-				'-y',
-				str(output_path)
-			]
-
-			result = subprocess.run(
-				cmd,
-				capture_output=True,
-				text=True,
-				timeout=30
-			)
+		# Extract all thumbnails concurrently (bounded by the shared media tool runner)
+		runner = get_media_tool_runner()
+		results = await asyncio.gather(*(
+			runner.extract_frame(video_path, timestamp, output_path, timeout=30)
+			for _, timestamp, output_path in targets
+		))
 
-			if result.returncode == 0 and output_path.exists():
+		for (progress, timestamp, output_path), ok in zip(targets, results):
+			if ok:
 				thumbnail_paths.append(output_path)
 				logger.debug(f"✅ Generated thumbnail at {int(progress*100)}%: {output_path}")
 			else:
-				logger.error(f"Failed to generate thumbnail at {timestamp}s: {result.stderr}")
+				logger.error(f"Failed to generate thumbnail at {timestamp}s")
 
 	except FileNotFoundError:
 		logger.error("ffmpeg not found. Please install ffmpeg.")
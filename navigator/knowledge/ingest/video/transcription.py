@@ -2,15 +2,16 @@
 Video transcription using Deepgram API and subtitle extraction.
 
 Handles video audio transcription via Deepgram cloud API and embedded subtitle extraction.
+Long recordings are streamed and transcribed in chunks (see transcription_pipeline).
 """
 
 import logging
 import os
 import re
-import subprocess
 import tempfile
+from collections.abc import Callable
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from tenacity import (
 	retry,
@@ -19,6 +20,9 @@ from tenacity import (
 	wait_exponential,
 )
 
+if TYPE_CHECKING:
+	from navigator.knowledge.ingest.video.transcription_pipeline import AudioChunk, ChunkTranscript
+
 logger = logging.getLogger(__name__)
 
 
@@ -56,14 +60,78 @@ def transcribe_with_deepgram_retry(dg_client, buffer_data):
 		raise  # Re-raise to trigger retry
 
 
-async def transcribe_video(video_path: Path) -> dict[str, Any] | None:
+def parse_deepgram_response(response: Any) -> 'ChunkTranscript':
+	"""
+	Convert a Deepgram response into segments and word-level timestamps.
+	
+	Args:
+		response: Deepgram response object
+	
+	Returns:
+		ChunkTranscript with timestamps relative to the submitted audio
+	"""
+	from navigator.knowledge.ingest.video.transcription_pipeline import ChunkTranscript
+
+	segments = []
+	words = []
+
+	# Extract utterances (segments)
+	if hasattr(response, 'results') and hasattr(response.results, 'utterances'):
+		utterances = response.results.utterances or []
+
+		for utt in utterances:
+			segment_text = utt.transcript.strip() if hasattr(utt, 'transcript') else ''
+			if not segment_text:
+				continue
+
+			# Create segment entry
+			segments.append({
+				'start': utt.start if hasattr(utt, 'start') else 0.0,
+				'end': utt.end if hasattr(utt, 'end') else 0.0,
+				'text': segment_text,
+			})
+
+			# Extract words from utterance (Deepgram provides word-level timestamps)
+			if hasattr(utt, 'words') and utt.words:
+				for word in utt.words:
+					word_text = word.word.strip() if hasattr(word, 'word') else ''
+					if word_text:
+						word_confidence = word.confidence if hasattr(word, 'confidence') else utt.confidence if hasattr(utt, 'confidence') else 0.95
+						words.append({
+							'word': word_text,
+							'start': word.start if hasattr(word, 'start') else 0.0,
+							'end': word.end if hasattr(word, 'end') else 0.0,
+							'confidence': word_confidence,
+						})
+
+	# Get detected language from response metadata
+	language = None
+	if hasattr(response, 'metadata') and hasattr(response.metadata, 'language'):
+		language = response.metadata.language
+
+	return ChunkTranscript(segments=segments, words=words, language=language)
+
+
+async def transcribe_video(
+	video_path: Path,
+	on_chunk_done: Callable[[int, 'AudioChunk'], None] | None = None,
+	chunk_seconds: float | None = None,
+	max_concurrency: int | None = None,
+) -> dict[str, Any] | None:
 	"""
 	Transcribe video audio using Deepgram API (cloud-based).
 	
-	Uses Deepgram for cloud-based transcription with high accuracy,
-	word-level timestamps, and speaker diarization support.
+	Audio is streamed from ffmpeg in silence-aligned chunks that are
+	transcribed concurrently and stitched with their timestamp offsets.
+	Chunk transcripts are cached by audio content hash.
 	Requires DEEPGRAM_API_KEY environment variable.
 	
+	Args:
+		video_path: Path to video file
+		on_chunk_done: Called with (completed_count, chunk) after each chunk (e.g. to heartbeat)
+		chunk_seconds: Nominal chunk length (default: TRANSCRIPTION_CHUNK_SECONDS or 30)
+		max_concurrency: Parallel chunk requests (default: TRANSCRIPTION_MAX_CONCURRENCY or 4)
+	
 	Returns:
 		Transcription data with segments and full text
 	"""
@@ -78,7 +146,7 @@ async def transcribe_video(video_path: Path) -> dict[str, Any] | None:
 		raise ValueError(error_msg)
 
 	try:
-		from deepgram import DeepgramClient
+		import deepgram  # noqa: F401
 	except ImportError as e:
 		error_msg = (
 			"deepgram-sdk is required for video transcription but is not installed. "
@@ -92,137 +160,35 @@ async def transcribe_video(video_path: Path) -> dict[str, Any] | None:
 	if not video_path.exists():
 		raise FileNotFoundError(f"Video file not found: {video_path}")
 
+	from navigator.knowledge.ingest.video.transcription_pipeline import (
+		DeepgramBackend,
+		TranscriptCache,
+		TranscriptionPipeline,
+	)
+
 	try:
 		file_size = video_path.stat().st_size
 		logger.info(f"Transcribing video with Deepgram: {video_path.name} ({file_size / (1024**2):.2f} MB)")
 
-		# Extract audio from video using ffmpeg (Deepgram needs audio file)
-		# Use tempfile to create a temporary audio file
-		with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as audio_temp:
-			audio_path = Path(audio_temp.name)
-
-		try:
-			# Extract audio using ffmpeg
-			logger.debug("Extracting audio from video for Deepgram transcription...")
-			cmd = [
-				'ffmpeg',
-				'-i', str(video_path),
-				'-vn',  # No video
-				'-acodec', 'pcm_s16le',  # PCM 16-bit WAV
-				'-ar', '16000',  # Sample rate 16kHz (Deepgram works well with this)
-				'-ac', '1',  # Mono channel
-				'-y',  # Overwrite output file
-				str(audio_path)
-			]
-
-			result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
-			if result.returncode != 0:
-				raise RuntimeError(f"FFmpeg audio extraction failed: {result.stderr}")
-
-			if not audio_path.exists():
-				raise RuntimeError("Audio file was not created by FFmpeg")
-
-			logger.debug(f"Audio extracted successfully: {audio_path.name}")
-
-			# Initialize Deepgram client
-			dg_client = DeepgramClient(api_key=deepgram_api_key)
-
-			# Read audio file as buffer
-			with open(audio_path, 'rb') as audio_file:
-				buffer_data = audio_file.read()
-
-			# Transcribe audio using Deepgram with retry logic
-			# Deepgram SDK v3: pass options directly as keyword arguments (not as options dict)
-			logger.info("Starting Deepgram transcription (cloud-based API)...")
-			response = transcribe_with_deepgram_retry(dg_client, buffer_data)
-
-			# Process Deepgram response
-			transcription_parts = []
-			segments = []
-			words = []
-			confidences = []
-
-			# Extract utterances (segments)
-			if hasattr(response, 'results') and hasattr(response.results, 'utterances'):
-				utterances = response.results.utterances
-
-				for utt in utterances:
-					segment_text = utt.transcript.strip() if hasattr(utt, 'transcript') else ''
-					if not segment_text:
-						continue
-
-					transcription_parts.append(segment_text)
-
-					# Create segment entry
-					segments.append({
-						'start': utt.start if hasattr(utt, 'start') else 0.0,
-						'end': utt.end if hasattr(utt, 'end') else 0.0,
-						'text': segment_text,
-					})
-
-					# Extract words from utterance (Deepgram provides word-level timestamps)
-					if hasattr(utt, 'words') and utt.words:
-						for word in utt.words:
-							word_text = word.word.strip() if hasattr(word, 'word') else ''
-							if word_text:
-								word_confidence = word.confidence if hasattr(word, 'confidence') else utt.confidence if hasattr(utt, 'confidence') else 0.95
-								words.append({
-									'word': word_text,
-									'start': word.start if hasattr(word, 'start') else 0.0,
-									'end': word.end if hasattr(word, 'end') else 0.0,
-									'confidence': word_confidence,
-								})
-								confidences.append(word_confidence)
-
-			# Combine all transcription text
-			transcription_text = ' '.join(transcription_parts)
-
-			# Validate we have transcription data
-			if not transcription_text and not segments:
-				logger.warning("Deepgram returned empty transcription")
-				return None
+		pipeline = TranscriptionPipeline(
+			DeepgramBackend(api_key=deepgram_api_key),
+			chunk_seconds=chunk_seconds or float(os.getenv('TRANSCRIPTION_CHUNK_SECONDS', '30')),
+			max_concurrency=max_concurrency or int(os.getenv('TRANSCRIPTION_MAX_CONCURRENCY', '4')),
+			cache=TranscriptCache(os.getenv('TRANSCRIPTION_CACHE_DIR') or None),
+		)
+		result = await pipeline.transcribe_file(video_path, on_chunk_done=on_chunk_done)
 
-			# Calculate average confidence
-			avg_confidence = sum(confidences) / len(confidences) if confidences else 0.95
-
-			# Get detected language from response metadata
-			detected_language = "en-US"
-			if hasattr(response, 'metadata') and hasattr(response.metadata, 'language'):
-				detected_language = response.metadata.language
-
-			# If we only have segments but no word-level timestamps, merge segments by gaps
-			if segments and not words:
-				# Group segments by time gap (>3 seconds creates new segment group)
-				grouped_segments = []
-				for seg in segments:
-					if not grouped_segments or seg['start'] - grouped_segments[-1]['end'] > 3.0:
-						grouped_segments.append(seg.copy())
-					else:
-						grouped_segments[-1]['end'] = seg['end']
-						grouped_segments[-1]['text'] += ' ' + seg['text']
-
-				segments = grouped_segments
-
-			logger.info(
-				f"✅ Deepgram transcription completed: {len(segments)} segments, "
-				f"{len(transcription_text)} chars, language: {detected_language}, "
-				f"confidence: {avg_confidence:.2f}"
-			)
-
-			return {
-				'transcription': transcription_text,
-				'segments': segments,
-				'language': detected_language,
-				'confidence': avg_confidence,
-			}
+		# Validate we have transcription data
+		if not result:
+			logger.warning("Deepgram returned empty transcription")
+			return None
 
-		finally:
-			# Clean up temporary audio file
-			if audio_path.exists():
-				try:
-					audio_path.unlink()
-				except Exception as e:
-					logger.debug(f"Failed to delete temporary audio file: {e}")
+		logger.info(
+			f"✅ Deepgram transcription completed: {len(result['segments'])} segments, "
+			f"{len(result['transcription'])} chars, language: {result['language']}, "
+			f"confidence: {result['confidence']:.2f}"
+		)
+		return result
 
 	except (ValueError, FileNotFoundError, ImportError):
 		# Re-raise these as-is (already have good error messages)
@@ -257,7 +223,9 @@ async def extract_subtitles(video_path: Path, ingestion_id: str) -> dict[str, An
 				str(srt_path)
 			]
 
-			result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+			from navigator.knowledge.ingest.video.media_tools import get_media_tool_runner
+
+			result = await get_media_tool_runner().run(cmd, timeout=60)
 
 			if result.returncode != 0 or not srt_path.exists():
 				logger.debug("No embedded subtitles found or extraction failed")
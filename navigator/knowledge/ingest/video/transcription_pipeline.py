@@ -0,0 +1,384 @@
+"""
+Streaming, chunked audio transcription pipeline.
+
+Audio is decoded by ffmpeg straight to a PCM pipe and cut into fixed-length
+chunks whose boundaries are moved to the quietest nearby point, so words are
+not split between chunks. Chunks are transcribed concurrently through a
+pluggable backend while ffmpeg is still decoding, then stitched back together
+with their timestamp offsets. Chunk transcripts are cached by audio content
+hash, so re-ingesting the same recording (or a recording sharing chunks)
+does not pay for transcription twice.
+
+**Usage:**
+    pipeline = TranscriptionPipeline(DeepgramBackend(api_key))
+    result = await pipeline.transcribe_file(video_path, on_chunk_done=heartbeat)
+"""
+
+import array
+import asyncio
+import hashlib
+import io
+import json
+import logging
+import tempfile
+import wave
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+BYTES_PER_SAMPLE = 2  # PCM signed 16-bit little endian, mono
+
+
+@dataclass
+class AudioChunk:
+	"""A slice of mono 16-bit PCM audio with its offset in the recording."""
+
+	index: int
+	start: float
+	pcm: bytes
+	sample_rate: int = SAMPLE_RATE
+
+	@property
+	def duration(self) -> float:
+		return len(self.pcm) / (BYTES_PER_SAMPLE * self.sample_rate)
+
+	@property
+	def end(self) -> float:
+		return self.start + self.duration
+
+	@property
+	def content_hash(self) -> str:
+		return hashlib.sha256(self.pcm).hexdigest()
+
+	def to_wav(self) -> bytes:
+		"""Wrap PCM samples in a WAV container (what transcription APIs expect)."""
+		buffer = io.BytesIO()
+		with wave.open(buffer, 'wb') as wav:
+			wav.setnchannels(1)
+			wav.setsampwidth(BYTES_PER_SAMPLE)
+			wav.setframerate(self.sample_rate)
+			wav.writeframes(self.pcm)
+		return buffer.getvalue()
+
+
+@dataclass
+class ChunkTranscript:
+	"""Transcription of one chunk; timestamps are relative to the chunk start."""
+
+	segments: list[dict[str, Any]] = field(default_factory=list)
+	words: list[dict[str, Any]] = field(default_factory=list)
+	language: str | None = None
+
+	def to_dict(self) -> dict[str, Any]:
+		return {'segments': self.segments, 'words': self.words, 'language': self.language}
+
+	@classmethod
+	def from_dict(cls, data: dict[str, Any]) -> 'ChunkTranscript':
+		return cls(segments=data.get('segments', []), words=data.get('words', []), language=data.get('language'))
+
+
+class TranscriptionBackend(ABC):
+	"""Transcribes a single audio chunk."""
+
+	# Used in cache keys, so different backends never share cached transcripts
+	name: str = 'backend'
+
+	@abstractmethod
+	async def transcribe_chunk(self, chunk: AudioChunk) -> ChunkTranscript:
+		"""Transcribe one chunk (timestamps relative to chunk start)."""
+
+
+class DeepgramBackend(TranscriptionBackend):
+	"""Deepgram cloud transcription (nova-2)."""
+
+	name = 'deepgram-nova-2'
+
+	def __init__(self, api_key: str):
+		from deepgram import DeepgramClient
+
+		self._client = DeepgramClient(api_key=api_key)
+
+	async def transcribe_chunk(self, chunk: AudioChunk) -> ChunkTranscript:
+		from navigator.knowledge.ingest.video.transcription import parse_deepgram_response, transcribe_with_deepgram_retry
+
+		# Deepgram SDK is synchronous - keep it off the event loop
+		response = await asyncio.to_thread(transcribe_with_deepgram_retry, self._client, chunk.to_wav())
+		return parse_deepgram_response(response)
+
+
+class OfflineStubBackend(TranscriptionBackend):
+	"""
+	Offline backend for tests and benchmarks.
+
+	Emits one segment per non-silent region of the chunk, with text derived
+	from the audio itself so results are deterministic.
+	"""
+
+	name = 'offline-stub'
+
+	def __init__(self, latency: float = 0.0, silence_threshold: int = 500):
+		self.latency = latency
+		self.silence_threshold = silence_threshold
+		self.calls = 0
+
+	async def transcribe_chunk(self, chunk: AudioChunk) -> ChunkTranscript:
+		self.calls += 1
+		if self.latency:
+			await asyncio.sleep(self.latency)
+
+		segments = []
+		words = []
+		window = chunk.sample_rate // 50  # 20ms
+		samples = array.array('h', chunk.pcm)
+		region_start: int | None = None
+		for offset in range(0, len(samples) + window, window):
+			frame = samples[offset : offset + window]
+			loud = bool(frame) and max(abs(s) for s in frame) >= self.silence_threshold
+			if loud and region_start is None:
+				region_start = offset
+			elif not loud and region_start is not None:
+				start, end = region_start / chunk.sample_rate, min(offset, len(samples)) / chunk.sample_rate
+				text = f'speech {chunk.content_hash[:6]}-{len(segments)}'
+				segments.append({'start': start, 'end': end, 'text': text})
+				words.append({'word': text, 'start': start, 'end': end, 'confidence': 0.9})
+				region_start = None
+		return ChunkTranscript(segments=segments, words=words, language='en-US')
+
+
+class TranscriptCache:
+	"""File-based cache of chunk transcripts keyed by backend and audio content hash."""
+
+	def __init__(self, cache_dir: Path | str | None = None):
+		self.cache_dir = Path(cache_dir) if cache_dir else Path(tempfile.gettempdir()) / 'transcription_cache'
+		self.cache_dir.mkdir(parents=True, exist_ok=True)
+		self.hits = 0
+		self.misses = 0
+
+	def _path(self, backend: TranscriptionBackend, chunk: AudioChunk) -> Path:
+		key = hashlib.sha256(f'{backend.name}:{chunk.sample_rate}:{chunk.content_hash}'.encode()).hexdigest()
+		return self.cache_dir / f'{key}.json'
+
+	def get(self, backend: TranscriptionBackend, chunk: AudioChunk) -> ChunkTranscript | None:
+		path = self._path(backend, chunk)
+		try:
+			transcript = ChunkTranscript.from_dict(json.loads(path.read_text()))
+		except (FileNotFoundError, json.JSONDecodeError):
+			self.misses += 1
+			return None
+		self.hits += 1
+		return transcript
+
+	def put(self, backend: TranscriptionBackend, chunk: AudioChunk, transcript: ChunkTranscript) -> None:
+		path = self._path(backend, chunk)
+		tmp_path = path.with_suffix('.tmp')
+		tmp_path.write_text(json.dumps(transcript.to_dict()))
+		tmp_path.replace(path)
+
+
+def _quietest_offset(pcm: bytes, start: int, end: int, sample_rate: int) -> int:
+	"""Byte offset of the quietest 20ms window in pcm[start:end] (aligned to samples)."""
+	window = (sample_rate // 50) * BYTES_PER_SAMPLE
+	best_offset, best_energy = end, None
+	for offset in range(start - start % BYTES_PER_SAMPLE, end - window + 1, window):
+		samples = array.array('h', pcm[offset : offset + window])
+		energy = sum(abs(s) for s in samples)
+		if best_energy is None or energy < best_energy:
+			best_offset, best_energy = offset + window // 2 - (window // 2) % BYTES_PER_SAMPLE, energy
+			if energy == 0:
+				break
+	return best_offset
+
+
+async def chunk_pcm_stream(
+	stream: AsyncIterator[bytes],
+	chunk_seconds: float = 30.0,
+	search_seconds: float = 2.0,
+	sample_rate: int = SAMPLE_RATE,
+) -> AsyncIterator[AudioChunk]:
+	"""
+	Cut a PCM byte stream into silence-aligned chunks.
+
+	Each cut is placed at the quietest point within `search_seconds` (at most
+	a quarter chunk) of the nominal `chunk_seconds` boundary.
+
+	Args:
+		stream: Async iterator of raw PCM s16le mono bytes
+		chunk_seconds: Nominal chunk length
+		search_seconds: How far around the boundary to look for silence
+		sample_rate: PCM sample rate
+	"""
+	bytes_per_second = sample_rate * BYTES_PER_SAMPLE
+	target = int(chunk_seconds * bytes_per_second)
+	target -= target % BYTES_PER_SAMPLE
+	# Never search further than a quarter chunk, so cuts cannot produce tiny chunks
+	search = int(min(search_seconds, chunk_seconds / 4) * bytes_per_second)
+
+	buffer = bytearray()
+	consumed = 0
+	index = 0
+	async for data in stream:
+		buffer.extend(data)
+		while len(buffer) >= target + search:
+			cut = _quietest_offset(bytes(buffer), target - search, target + search, sample_rate)
+			yield AudioChunk(index=index, start=consumed / bytes_per_second, pcm=bytes(buffer[:cut]), sample_rate=sample_rate)
+			consumed += cut
+			del buffer[:cut]
+			index += 1
+
+	if buffer:
+		yield AudioChunk(index=index, start=consumed / bytes_per_second, pcm=bytes(buffer), sample_rate=sample_rate)
+
+
+async def stream_ffmpeg_pcm(
+	media_path: Path,
+	sample_rate: int = SAMPLE_RATE,
+	read_size: int = 64 * 1024,
+) -> AsyncIterator[bytes]:
+	"""
+	Decode the audio track of a media file to PCM s16le mono via an ffmpeg pipe.
+
+	Raises:
+		MediaToolError: If ffmpeg exits with an error
+	"""
+	from navigator.knowledge.ingest.video.media_tools import get_media_tool_runner
+
+	cmd = [
+		'ffmpeg',
+		'-nostdin',
+		'-i', str(media_path),
+		'-vn',  # No video
+		'-f', 's16le',
+		'-acodec', 'pcm_s16le',
+		'-ar', str(sample_rate),
+		'-ac', '1',  # Mono channel
+		'pipe:1',
+	]
+	async for data in get_media_tool_runner().stream_stdout(cmd, read_size=read_size):
+		yield data
+
+
+def stitch_transcripts(chunks: list[tuple[AudioChunk, ChunkTranscript]]) -> dict[str, Any] | None:
+	"""
+	Merge chunk transcripts into one result with absolute timestamps.
+
+	Returns:
+		Transcription data (same shape as `transcribe_video`), or None if empty
+	"""
+	segments = []
+	words = []
+	language = None
+	for chunk, transcript in sorted(chunks, key=lambda item: item[0].index):
+		language = language or transcript.language
+		for seg in transcript.segments:
+			segments.append({**seg, 'start': seg['start'] + chunk.start, 'end': seg['end'] + chunk.start})
+		for word in transcript.words:
+			words.append({**word, 'start': word['start'] + chunk.start, 'end': word['end'] + chunk.start})
+
+	transcription_text = ' '.join(seg['text'] for seg in segments)
+	if not transcription_text and not segments:
+		return None
+
+	confidences = [w['confidence'] for w in words if 'confidence' in w]
+	avg_confidence = sum(confidences) / len(confidences) if confidences else 0.95
+
+	# If we only have segments but no word-level timestamps, merge segments by gaps
+	if segments and not words:
+		grouped_segments = []
+		for seg in segments:
+			if not grouped_segments or seg['start'] - grouped_segments[-1]['end'] > 3.0:
+				grouped_segments.append(seg.copy())
+			else:
+				grouped_segments[-1]['end'] = seg['end']
+				grouped_segments[-1]['text'] += ' ' + seg['text']
+		segments = grouped_segments
+
+	return {
+		'transcription': transcription_text,
+		'segments': segments,
+		'language': language or 'en-US',
+		'confidence': avg_confidence,
+	}
+
+
+class TranscriptionPipeline:
+	"""Transcribes audio streams chunk by chunk with bounded concurrency."""
+
+	def __init__(
+		self,
+		backend: TranscriptionBackend,
+		chunk_seconds: float = 30.0,
+		max_concurrency: int = 4,
+		cache: TranscriptCache | None = None,
+	):
+		"""
+		Initialize transcription pipeline.
+
+		Args:
+			backend: Transcription backend for individual chunks
+			chunk_seconds: Nominal chunk length (boundaries snap to silence)
+			max_concurrency: Maximum chunks transcribed at once
+			cache: Chunk transcript cache (None disables caching)
+		"""
+		self.backend = backend
+		self.chunk_seconds = chunk_seconds
+		self.max_concurrency = max_concurrency
+		self.cache = cache
+
+	async def transcribe_stream(
+		self,
+		stream: AsyncIterator[bytes],
+		on_chunk_done: Callable[[int, AudioChunk], None] | None = None,
+	) -> dict[str, Any] | None:
+		"""
+		Transcribe a PCM byte stream.
+
+		Chunks are dispatched to the backend as soon as they are cut, so
+		decoding and transcription overlap.
+
+		Args:
+			stream: Async iterator of raw PCM s16le mono bytes
+			on_chunk_done: Called with (completed_count, chunk) after each chunk (e.g. to heartbeat)
+		"""
+		semaphore = asyncio.Semaphore(self.max_concurrency)
+		results: list[tuple[AudioChunk, ChunkTranscript]] = []
+		tasks: list[asyncio.Task] = []
+
+		async def transcribe(chunk: AudioChunk) -> None:
+			transcript = self.cache.get(self.backend, chunk) if self.cache else None
+			if transcript is None:
+				async with semaphore:
+					transcript = await self.backend.transcribe_chunk(chunk)
+				if self.cache:
+					self.cache.put(self.backend, chunk, transcript)
+			results.append((chunk, transcript))
+			if on_chunk_done:
+				on_chunk_done(len(results), chunk)
+
+		try:
+			async for chunk in chunk_pcm_stream(stream, chunk_seconds=self.chunk_seconds):
+				# Backpressure: don't let decoded audio run far ahead of transcription
+				pending = {t for t in tasks if not t.done()}
+				while len(pending) >= self.max_concurrency * 2:
+					_, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+				tasks.append(asyncio.create_task(transcribe(chunk)))
+			await asyncio.gather(*tasks)
+		finally:
+			for task in tasks:
+				if not task.done():
+					task.cancel()
+
+		logger.info(f'🎙️ Transcribed {len(results)} audio chunk(s) with {self.backend.name}')
+		return stitch_transcripts(results)
+
+	async def transcribe_file(
+		self,
+		media_path: Path,
+		on_chunk_done: Callable[[int, AudioChunk], None] | None = None,
+	) -> dict[str, Any] | None:
+		"""Transcribe the audio track of a media file streamed through ffmpeg."""
+		return await self.transcribe_stream(stream_ffmpeg_pcm(media_path), on_chunk_done=on_chunk_done)
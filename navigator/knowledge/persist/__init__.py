@@ -104,6 +104,10 @@ from navigator.knowledge.persist.state import (
 	save_workflow_state,
 	update_workflow_progress,
 )
+from navigator.knowledge.persist.versions import (
+	bump_knowledge_version,
+	get_knowledge_version,
+)
 
 __all__ = [
 	# Collections
@@ -179,4 +183,7 @@ __all__ = [
 	'get_flow_navigation',
 	'get_business_feature_flows',
 	'get_screen_context',
+	# Knowledge versions (runtime model invalidation)
+	'bump_knowledge_version',
+	'get_knowledge_version',
 ]
@@ -11,6 +11,7 @@ Collections:
 5. tasks: Full task definitions
 6. actions: Full action definitions
 7. transitions: Full transition definitions
+8. knowledge_versions: Write counter per knowledge_id (invalidates in-memory runtime models)
 
 All collections use 'brwsr_auto_svc_' prefix for namespace safety.
 """
@@ -38,6 +39,7 @@ TRANSITIONS_COLLECTION = 'knowledge_transitions'
 BUSINESS_FUNCTIONS_COLLECTION = 'knowledge_business_functions'
 WORKFLOWS_COLLECTION = 'knowledge_workflows'
 USER_FLOWS_COLLECTION = 'knowledge_user_flows'
+KNOWLEDGE_VERSIONS_COLLECTION = 'knowledge_versions'
 
 
 class WorkflowStatus(str, Enum):
@@ -226,6 +228,16 @@ async def get_user_flows_collection() -> AsyncIOMotorCollection | None:
 	return await get_collection(USER_FLOWS_COLLECTION)
 
 
+async def get_knowledge_versions_collection() -> AsyncIOMotorCollection | None:
+	"""
+	Get knowledge versions collection (write counter per knowledge_id).
+	
+	Returns:
+		Motor collection instance or None if MongoDB unavailable
+	"""
+	return await get_collection(KNOWLEDGE_VERSIONS_COLLECTION)
+
+
 async def ensure_indexes() -> None:
 	"""
 	Create indexes for all knowledge persistence collections.
@@ -238,6 +250,7 @@ async def ensure_indexes() -> None:
 	- tasks: task_id (unique), website_id
 	- actions: action_id (unique), website_id
 	- transitions: transition_id (unique), from_screen_id, to_screen_id
+	- knowledge_versions: knowledge_id (unique)
 	"""
 	try:
 		# Workflow state indexes
@@ -319,6 +332,12 @@ async def ensure_indexes() -> None:
 			await workflows_col.create_index('knowledge_id')  # Index for knowledge_id queries
 			logger.info(f"Created indexes for {WORKFLOWS_COLLECTION}")
 
+		# Knowledge versions collection indexes
+		knowledge_versions_col = await get_knowledge_versions_collection()
+		if knowledge_versions_col:
+			await knowledge_versions_col.create_index('knowledge_id', unique=True)
+			logger.info(f"Created indexes for {KNOWLEDGE_VERSIONS_COLLECTION}")
+
 		logger.info("✅ All knowledge persistence indexes created successfully")
 
 	except Exception as e:
@@ -350,6 +369,9 @@ async def clear_all_collections() -> None:
 			if col:
 				await col.delete_many({})
 
+		from navigator.knowledge.persist.versions import bump_knowledge_version
+		await bump_knowledge_version(None)
+
 		logger.info("✅ Cleared all knowledge persistence collections")
 
 	except Exception as e:
@@ -19,6 +19,7 @@ from navigator.knowledge.persist.collections import (
 	get_transitions_collection,
 	get_workflows_collection,
 )
+from navigator.knowledge.persist.versions import bump_knowledge_version
 
 logger = logging.getLogger(__name__)
 
@@ -185,6 +186,8 @@ class CrossReferenceManager:
 				upsert=False
 			)
 
+			await bump_knowledge_version(knowledge_id)
+
 			logger.debug(f"Linked screen_id={screen_id} to action_id={action_id}")
 			return True
 
@@ -242,6 +245,8 @@ class CrossReferenceManager:
 				upsert=False
 			)
 
+			await bump_knowledge_version(knowledge_id)
+
 			logger.debug(
 				f"Linked transition_id={transition_id} to action_id={action_id}"
 			)
@@ -531,6 +536,9 @@ class CrossReferenceManager:
 				upsert=False
 			)
 
+			if entity_type == 'action':
+				await bump_knowledge_version(knowledge_id)
+
 			logger.debug(
 				f"Updated screen_id={screen_id} with {entity_type}_id={entity_id}"
 			)
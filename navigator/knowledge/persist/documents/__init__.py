@@ -8,6 +8,7 @@ Re-exports all document storage functions organized by entity type.
 # Action storage
 from navigator.knowledge.persist.documents.actions import (
 	get_action,
+	get_actions,
 	query_actions_by_knowledge_id,
 	save_action,
 	save_actions,
@@ -31,6 +32,7 @@ from navigator.knowledge.persist.documents.business_functions import (
 from navigator.knowledge.persist.documents.screens import (
 	delete_screen,
 	get_screen,
+	get_screens,
 	query_screens_by_knowledge_id,
 	query_screens_by_name_pattern,
 	query_screens_by_website,
@@ -41,6 +43,7 @@ from navigator.knowledge.persist.documents.screens import (
 # Task storage
 from navigator.knowledge.persist.documents.tasks import (
 	get_task,
+	get_tasks,
 	query_tasks_by_knowledge_id,
 	query_tasks_by_website,
 	save_task,
@@ -50,6 +53,7 @@ from navigator.knowledge.persist.documents.tasks import (
 # Transition storage
 from navigator.knowledge.persist.documents.transitions import (
 	get_transition,
+	get_transitions,
 	query_transitions_by_knowledge_id,
 	query_transitions_by_source,
 	query_transitions_by_target,
@@ -86,6 +90,7 @@ __all__ = [
 	'save_screen',
 	'save_screens',
 	'get_screen',
+	'get_screens',
 	'query_screens_by_website',
 	'query_screens_by_knowledge_id',
 	'query_screens_by_name_pattern',
@@ -94,17 +99,20 @@ __all__ = [
 	'save_task',
 	'save_tasks',
 	'get_task',
+	'get_tasks',
 	'query_tasks_by_website',
 	'query_tasks_by_knowledge_id',
 	# Action storage
 	'save_action',
 	'save_actions',
 	'get_action',
+	'get_actions',
 	'query_actions_by_knowledge_id',
 	# Transition storage
 	'save_transition',
 	'save_transitions',
 	'get_transition',
+	'get_transitions',
 	'query_transitions_by_source',
 	'query_transitions_by_target',
 	'query_transitions_by_website',
@@ -9,6 +9,8 @@ from typing import Any
 
 from navigator.knowledge.extract.actions import ActionDefinition
 from navigator.knowledge.persist.collections import get_actions_collection
+from navigator.knowledge.persist.versions import bump_knowledge_version
+from navigator.storage.entity_cache import find_entities, find_entity
 
 logger = logging.getLogger(__name__)
 
@@ -95,6 +97,8 @@ async def save_action(
 					knowledge_id
 				)
 
+		await bump_knowledge_version(knowledge_id)
+
 		logger.info(f"Saved action: action_id={action.action_id}, name={action.name}, knowledge_id={knowledge_id}, job_id={job_id}")
 		return True
 
@@ -148,7 +152,7 @@ async def get_action(action_id: str) -> ActionDefinition | None:
 			logger.warning("MongoDB unavailable, cannot retrieve action")
 			return None
 
-		doc = await collection.find_one({'action_id': action_id})
+		doc = await find_entity(collection, 'action_id', action_id)
 		if doc is None:
 			return None
 
@@ -163,6 +167,37 @@ async def get_action(action_id: str) -> ActionDefinition | None:
 		return None
 
 
+async def get_actions(action_ids: list[str]) -> dict[str, ActionDefinition]:
+	"""
+	Retrieve action definitions by action_id in one query (cached actions don't hit MongoDB).
+	
+	Args:
+		action_ids: Action IDs to retrieve
+	
+	Returns:
+		Dict of action_id to ActionDefinition for the IDs that were found
+	"""
+	try:
+		collection = await get_actions_collection()
+		if collection is None:
+			logger.warning("MongoDB unavailable, cannot retrieve actions")
+			return {}
+
+		docs = await find_entities(collection, 'action_id', action_ids)
+		actions = {}
+		for action_id, doc in docs.items():
+			doc.pop('_id', None)
+			try:
+				actions[action_id] = ActionDefinition(**doc)
+			except Exception as e:
+				logger.warning(f"Failed to parse action document: {e}")
+		return actions
+
+	except Exception as e:
+		logger.error(f"Failed to get actions: {e}")
+		return {}
+
+
 async def query_actions_by_knowledge_id(
 	knowledge_id: str,
 	job_id: str | None = None,
@@ -177,7 +212,7 @@ async def query_actions_by_knowledge_id(
 	Args:
 		knowledge_id: Knowledge ID to query
 		job_id: Optional job ID to filter by (if None, gets latest)
-		limit: Maximum number of results
+		limit: Maximum number of results (0 for all)
 	
 	Returns:
 		List of ActionDefinition objects
@@ -7,6 +7,8 @@ Shared utilities and common patterns used across all entity storage modules.
 import logging
 from typing import Any
 
+from navigator.knowledge.persist.versions import bump_knowledge_version
+
 logger = logging.getLogger(__name__)
 
 
@@ -153,6 +155,8 @@ async def delete_knowledge_by_knowledge_id(knowledge_id: str) -> dict[str, Any]:
 			workflows_result = await workflows_collection.delete_many({'knowledge_id': knowledge_id})
 			results['workflows_deleted'] = workflows_result.deleted_count
 
+		await bump_knowledge_version(knowledge_id)
+
 		results['total_deleted'] = (
 			results['screens_deleted'] +
 			results['tasks_deleted'] +
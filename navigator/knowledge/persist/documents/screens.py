@@ -9,6 +9,8 @@ from typing import Any
 
 from navigator.knowledge.extract.screens import ScreenDefinition
 from navigator.knowledge.persist.collections import get_screens_collection
+from navigator.knowledge.persist.versions import bump_knowledge_version
+from navigator.storage.entity_cache import find_entities, find_entity
 
 logger = logging.getLogger(__name__)
 
@@ -66,6 +68,8 @@ async def save_screen(
 					knowledge_id
 				)
 
+		await bump_knowledge_version(knowledge_id)
+
 		logger.info(f"Saved screen: screen_id={screen.screen_id}, name={screen.name}, knowledge_id={knowledge_id}, job_id={job_id}")
 		return True
 
@@ -119,7 +123,7 @@ async def get_screen(screen_id: str) -> ScreenDefinition | None:
 			logger.warning("MongoDB unavailable, cannot retrieve screen")
 			return None
 
-		doc = await collection.find_one({'screen_id': screen_id})
+		doc = await find_entity(collection, 'screen_id', screen_id)
 		if doc is None:
 			return None
 
@@ -134,6 +138,37 @@ async def get_screen(screen_id: str) -> ScreenDefinition | None:
 		return None
 
 
+async def get_screens(screen_ids: list[str]) -> dict[str, ScreenDefinition]:
+	"""
+	Retrieve screen definitions by screen_id in one query (cached screens don't hit MongoDB).
+	
+	Args:
+		screen_ids: Screen IDs to retrieve
+	
+	Returns:
+		Dict of screen_id to ScreenDefinition for the IDs that were found
+	"""
+	try:
+		collection = await get_screens_collection()
+		if collection is None:
+			logger.warning("MongoDB unavailable, cannot retrieve screens")
+			return {}
+
+		docs = await find_entities(collection, 'screen_id', screen_ids)
+		screens = {}
+		for screen_id, doc in docs.items():
+			doc.pop('_id', None)
+			try:
+				screens[screen_id] = ScreenDefinition(**doc)
+			except Exception as e:
+				logger.warning(f"Failed to parse screen document: {e}")
+		return screens
+
+	except Exception as e:
+		logger.error(f"Failed to get screens: {e}")
+		return {}
+
+
 async def query_screens_by_website(
 	website_id: str,
 	limit: int = 100,
@@ -203,7 +238,7 @@ async def query_screens_by_knowledge_id(
 	Args:
 		knowledge_id: Knowledge ID to query
 		job_id: Optional job ID to filter by (if None, gets latest)
-		limit: Maximum number of results
+		limit: Maximum number of results (0 for all)
 		content_type: Optional content type filter ('web_ui', 'documentation', etc.)
 		actionable_only: If True, only return screens with is_actionable=True
 	
@@ -340,9 +375,10 @@ async def delete_screen(screen_id: str) -> bool:
 			logger.warning("MongoDB unavailable, cannot delete screen")
 			return False
 
-		result = await collection.delete_one({'screen_id': screen_id})
+		deleted = await collection.find_one_and_delete({'screen_id': screen_id}, projection={'knowledge_id': 1})
 
-		if result.deleted_count > 0:
+		if deleted is not None:
+			await bump_knowledge_version(deleted.get('knowledge_id'))
 			logger.info(f"Deleted screen: screen_id={screen_id}")
 			return True
 		else:
@@ -12,6 +12,7 @@ from navigator.knowledge.persist.collections import (
 	get_actions_collection,
 	get_tasks_collection,
 )
+from navigator.storage.entity_cache import find_entities, find_entity
 
 logger = logging.getLogger(__name__)
 
@@ -147,7 +148,7 @@ async def get_task(task_id: str) -> TaskDefinition | None:
 			logger.warning("MongoDB unavailable, cannot retrieve task")
 			return None
 
-		doc = await collection.find_one({'task_id': task_id})
+		doc = await find_entity(collection, 'task_id', task_id)
 		if doc is None:
 			return None
 
@@ -162,6 +163,37 @@ async def get_task(task_id: str) -> TaskDefinition | None:
 		return None
 
 
+async def get_tasks(task_ids: list[str]) -> dict[str, TaskDefinition]:
+	"""
+	Retrieve task definitions by task_id in one query (cached tasks don't hit MongoDB).
+	
+	Args:
+		task_ids: Task IDs to retrieve
+	
+	Returns:
+		Dict of task_id to TaskDefinition for the IDs that were found
+	"""
+	try:
+		collection = await get_tasks_collection()
+		if collection is None:
+			logger.warning("MongoDB unavailable, cannot retrieve tasks")
+			return {}
+
+		docs = await find_entities(collection, 'task_id', task_ids)
+		tasks = {}
+		for task_id, doc in docs.items():
+			doc.pop('_id', None)
+			try:
+				tasks[task_id] = TaskDefinition(**doc)
+			except Exception as e:
+				logger.warning(f"Failed to parse task document: {e}")
+		return tasks
+
+	except Exception as e:
+		logger.error(f"Failed to get tasks: {e}")
+		return {}
+
+
 async def query_tasks_by_website(website_id: str, limit: int = 100) -> list[TaskDefinition]:
 	"""
 	Query tasks by website_id.
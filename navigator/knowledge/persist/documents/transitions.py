@@ -9,6 +9,8 @@ from typing import Any
 
 from navigator.knowledge.extract.transitions import TransitionDefinition
 from navigator.knowledge.persist.collections import get_transitions_collection
+from navigator.knowledge.persist.versions import bump_knowledge_version
+from navigator.storage.entity_cache import find_entities, find_entity
 
 logger = logging.getLogger(__name__)
 
@@ -91,6 +93,8 @@ async def save_transition(
 				knowledge_id
 			)
 
+		await bump_knowledge_version(knowledge_id)
+
 		logger.info(f"Saved transition: transition_id={transition.transition_id}, knowledge_id={knowledge_id}, job_id={job_id}")
 		return True
 
@@ -144,7 +148,7 @@ async def get_transition(transition_id: str) -> TransitionDefinition | None:
 			logger.warning("MongoDB unavailable, cannot retrieve transition")
 			return None
 
-		doc = await collection.find_one({'transition_id': transition_id})
+		doc = await find_entity(collection, 'transition_id', transition_id)
 		if doc is None:
 			return None
 
@@ -159,6 +163,37 @@ async def get_transition(transition_id: str) -> TransitionDefinition | None:
 		return None
 
 
+async def get_transitions(transition_ids: list[str]) -> dict[str, TransitionDefinition]:
+	"""
+	Retrieve transition definitions by transition_id in one query (cached transitions don't hit MongoDB).
+	
+	Args:
+		transition_ids: Transition IDs to retrieve
+	
+	Returns:
+		Dict of transition_id to TransitionDefinition for the IDs that were found
+	"""
+	try:
+		collection = await get_transitions_collection()
+		if collection is None:
+			logger.warning("MongoDB unavailable, cannot retrieve transitions")
+			return {}
+
+		docs = await find_entities(collection, 'transition_id', transition_ids)
+		transitions = {}
+		for transition_id, doc in docs.items():
+			doc.pop('_id', None)
+			try:
+				transitions[transition_id] = TransitionDefinition(**doc)
+			except Exception as e:
+				logger.warning(f"Failed to parse transition document: {e}")
+		return transitions
+
+	except Exception as e:
+		logger.error(f"Failed to get transitions: {e}")
+		return {}
+
+
 async def query_transitions_by_source(source_screen_id: str, limit: int = 100) -> list[TransitionDefinition]:
 	"""
 	Query transitions by source screen_id.
@@ -278,7 +313,7 @@ async def query_transitions_by_knowledge_id(
 	Args:
 		knowledge_id: Knowledge ID to query
 		job_id: Optional job ID to filter by (if None, gets latest)
-		limit: Maximum number of results
+		limit: Maximum number of results (0 for all)
 	
 	Returns:
 		List of TransitionDefinition objects
@@ -21,6 +21,7 @@ from navigator.knowledge.persist.collections import (
 	get_transitions_collection,
 )
 from navigator.knowledge.persist.cross_references import get_cross_reference_manager
+from navigator.knowledge.persist.versions import bump_knowledge_version
 
 logger = logging.getLogger(__name__)
 
@@ -130,6 +131,9 @@ class KnowledgeDeduplicator:
 			logger.error(f"❌ Deduplication failed: {e}", exc_info=True)
 			result.errors.append(f"Deduplication exception: {str(e)}")
 		
+		# Merged and removed screens/actions change what agent queries see, even after a partial run
+		await bump_knowledge_version(self.knowledge_id)
+		
 		return result
 	
 	async def _deduplicate_screens(self, result: DeduplicationResult) -> int:
@@ -14,10 +14,13 @@ from typing import Any
 from navigator.knowledge.graph.queries import find_shortest_path
 from navigator.knowledge.persist.documents import (
 	get_action,
+	get_actions,
 	get_business_function,
 	get_screen,
-	get_task,
+	get_screens,
+	get_tasks,
 	get_transition,
+	get_transitions,
 	get_user_flow,
 	get_workflow,
 )
@@ -34,6 +37,9 @@ async def get_navigation_path(
 	"""
 	Find shortest path between two screens with complete navigation instructions.
 	
+	Uses the knowledge base's in-memory runtime model when both screens are part
+	of it (latest job only), otherwise the website's navigation graph.
+	
 	Returns detailed path information including:
 	- Screen sequence
 	- Transitions between screens
@@ -56,6 +62,16 @@ async def get_navigation_path(
 		- total_reliability: Combined reliability score
 	"""
 	try:
+		# Answer from the in-memory runtime model when both screens belong to this knowledge base
+		if not job_id:
+			from navigator.knowledge.runtime_model import get_knowledge_runtime_cache
+
+			model = await get_knowledge_runtime_cache().get_model(knowledge_id)
+			if from_screen_id in model.screens and to_screen_id in model.screens:
+				result = model.navigation_path(from_screen_id, to_screen_id)
+				if result is not None:
+					return result
+
 		# Get source and target screens to find website_id
 		from_screen = await get_screen(from_screen_id)
 		to_screen = await get_screen(to_screen_id)
@@ -96,6 +112,12 @@ async def get_navigation_path(
 		path = path_result['path']
 		transitions_data = path_result.get('edges', [])
 
+		# Load the screens and transitions of the path in one query each
+		screens_on_path = await get_screens(path)
+		path_transitions = await get_transitions([
+			t['transition_id'] for t in transitions_data if isinstance(t, dict) and 'transition_id' in t
+		])
+
 		# Enhance transitions with full data
 		transitions = []
 		actions = []
@@ -112,7 +134,7 @@ async def get_navigation_path(
 			if i < len(transitions_data):
 				transition_dict = transitions_data[i]
 				if isinstance(transition_dict, dict) and 'transition_id' in transition_dict:
-					transition = await get_transition(transition_dict['transition_id'])
+					transition = path_transitions.get(transition_dict['transition_id'])
 
 			# If transition not found in path result, query directly
 			if not transition:
@@ -140,8 +162,8 @@ async def get_navigation_path(
 					action_name = transition.triggered_by.action_type if transition.triggered_by else "unknown"
 
 				# Get screen names
-				from_screen_step = await get_screen(from_screen_id_step)
-				to_screen_step = await get_screen(to_screen_id_step)
+				from_screen_step = screens_on_path.get(from_screen_id_step)
+				to_screen_step = screens_on_path.get(to_screen_id_step)
 				from_name = from_screen_step.name if from_screen_step else from_screen_id_step
 				to_name = to_screen_step.name if to_screen_step else to_screen_id_step
 
@@ -173,8 +195,8 @@ async def get_navigation_path(
 					total_reliability *= transition.reliability_score
 			else:
 				# Transition not found, create basic step
-				from_screen_step = await get_screen(from_screen_id_step)
-				to_screen_step = await get_screen(to_screen_id_step)
+				from_screen_step = screens_on_path.get(from_screen_id_step)
+				to_screen_step = screens_on_path.get(to_screen_id_step)
 				from_name = from_screen_step.name if from_screen_step else from_screen_id_step
 				to_name = to_screen_step.name if to_screen_step else to_screen_id_step
 
@@ -423,15 +445,17 @@ async def get_business_feature_flows(
 
 		# Get screens
 		if hasattr(business_function, 'related_screens') and business_function.related_screens:
+			screens = await get_screens(business_function.related_screens)
 			for screen_id in business_function.related_screens:
-				screen = await get_screen(screen_id)
+				screen = screens.get(screen_id)
 				if screen:
 					related_screens.append(screen.dict())
 
 		# Get actions
 		if hasattr(business_function, 'related_actions') and business_function.related_actions:
+			actions = await get_actions(business_function.related_actions)
 			for action_id in business_function.related_actions:
-				action = await get_action(action_id)
+				action = actions.get(action_id)
 				if action:
 					related_actions.append(action.dict())
 
@@ -553,11 +577,23 @@ async def get_screen_context(
 						'note': 'User flow not found in database'
 					})
 
+		# Load related actions, tasks and transitions in one query each, then the
+		# screens and actions the transitions point at
+		actions = await get_actions(getattr(screen, 'action_ids', None) or [])
+		tasks = await get_tasks(getattr(screen, 'task_ids', None) or [])
+		transitions = await get_transitions(
+			(getattr(screen, 'outgoing_transitions', None) or []) + (getattr(screen, 'incoming_transitions', None) or [])
+		)
+		screens = await get_screens(
+			[t.to_screen_id for t in transitions.values()] + [t.from_screen_id for t in transitions.values()]
+		)
+		actions.update(await get_actions([t.action_id for t in transitions.values() if t.action_id and t.action_id not in actions]))
+
 		# Get available actions
 		available_actions = []
 		if hasattr(screen, 'action_ids') and screen.action_ids:
 			for action_id in screen.action_ids:
-				action = await get_action(action_id)
+				action = actions.get(action_id)
 				if action:
 					action_dict = {
 						'action_id': action.action_id,
@@ -576,7 +612,7 @@ async def get_screen_context(
 		available_tasks = []
 		if hasattr(screen, 'task_ids') and screen.task_ids:
 			for task_id in screen.task_ids:
-				task = await get_task(task_id)
+				task = tasks.get(task_id)
 				if task:
 					available_tasks.append({
 						'task_id': task.task_id,
@@ -590,12 +626,12 @@ async def get_screen_context(
 		can_navigate_to = []
 		if hasattr(screen, 'outgoing_transitions') and screen.outgoing_transitions:
 			for transition_id in screen.outgoing_transitions:
-				transition = await get_transition(transition_id)
+				transition = transitions.get(transition_id)
 				if transition:
-					to_screen = await get_screen(transition.to_screen_id)
+					to_screen = screens.get(transition.to_screen_id)
 					action = None
 					if transition.action_id:
-						action = await get_action(transition.action_id)
+						action = actions.get(transition.action_id)
 
 					can_navigate_to.append({
 						'screen_id': transition.to_screen_id,
@@ -613,12 +649,12 @@ async def get_screen_context(
 		can_navigate_from = []
 		if hasattr(screen, 'incoming_transitions') and screen.incoming_transitions:
 			for transition_id in screen.incoming_transitions:
-				transition = await get_transition(transition_id)
+				transition = transitions.get(transition_id)
 				if transition:
-					from_screen = await get_screen(transition.from_screen_id)
+					from_screen = screens.get(transition.from_screen_id)
 					action = None
 					if transition.action_id:
-						action = await get_action(transition.action_id)
+						action = actions.get(transition.action_id)
 
 					can_navigate_from.append({
 						'screen_id': transition.from_screen_id,
@@ -0,0 +1,67 @@
+"""
+Knowledge version counters.
+
+Every write to screens, actions or transitions bumps a counter for its
+knowledge_id in MongoDB. In-memory views of a knowledge base (see
+navigator/knowledge/runtime_model.py) remember the version they were built
+from and rebuild when it changes, so they stay correct across processes
+without rescanning the collections on every request.
+
+Writes that don't know their knowledge_id bump the shared ALL_KNOWLEDGE
+counter, which invalidates every knowledge_id at once.
+"""
+
+import logging
+
+from navigator.knowledge.persist.collections import get_knowledge_versions_collection
+
+logger = logging.getLogger(__name__)
+
+ALL_KNOWLEDGE = '*'
+
+
+async def bump_knowledge_version(knowledge_id: str | None) -> None:
+	"""
+	Record a write to a knowledge base.
+
+	Args:
+		knowledge_id: Knowledge ID that was written to, or None if unknown (invalidates all)
+	"""
+	try:
+		collection = await get_knowledge_versions_collection()
+		if collection is None:
+			return
+
+		await collection.update_one(
+			{'knowledge_id': knowledge_id or ALL_KNOWLEDGE},
+			{'$inc': {'version': 1}},
+			upsert=True
+		)
+
+	except Exception as e:
+		logger.warning(f"Failed to bump knowledge version for {knowledge_id or ALL_KNOWLEDGE}: {e}")
+
+
+async def get_knowledge_version(knowledge_id: str) -> tuple[int, int] | None:
+	"""
+	Get the current version of a knowledge base.
+
+	Args:
+		knowledge_id: Knowledge ID to look up
+
+	Returns:
+		(knowledge_id version, shared version), or None if MongoDB is unavailable
+	"""
+	try:
+		collection = await get_knowledge_versions_collection()
+		if collection is None:
+			return None
+
+		versions = {knowledge_id: 0, ALL_KNOWLEDGE: 0}
+		async for doc in collection.find({'knowledge_id': {'$in': [knowledge_id, ALL_KNOWLEDGE]}}):
+			versions[doc['knowledge_id']] = doc.get('version', 0)
+		return versions[knowledge_id], versions[ALL_KNOWLEDGE]
+
+	except Exception as e:
+		logger.warning(f"Failed to get knowledge version for {knowledge_id}: {e}")
+		return None
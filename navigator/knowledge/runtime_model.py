@@ -0,0 +1,621 @@
+"""
+In-memory runtime model of a knowledge base, for agent queries.
+
+Agent queries (screen recognition, available actions, navigation paths) used
+to scan the screens and actions collections and recompile every URL pattern on
+each request. A KnowledgeRuntimeModel loads a knowledge_id's screens, actions
+and transitions once and keeps:
+
+- precompiled matchers for actionable web UI screens
+- a screen -> available actions map
+- a navigation graph (outgoing transitions per screen) for cheapest-path queries
+- optionally, a NavigationIndex: shortest-path trees from hub screens (from every
+  screen in small graphs) with each transition's instruction step built once, so
+  navigation paths are read off in O(path length)
+
+Models are shared across requests through KnowledgeRuntimeCache, which checks
+the knowledge version counter (navigator/knowledge/persist/versions.py) on each
+lookup and rebuilds a model (and its NavigationIndex) after any write to its
+knowledge base.
+
+Usage:
+	model = await get_knowledge_runtime_cache().get_model(knowledge_id)
+	match = model.recognize(current_url, dom_summary)
+	path = model.navigation_path(from_screen_id, to_screen_id)
+"""
+
+import asyncio
+import heapq
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+from navigator.knowledge.extract.actions import ActionDefinition
+from navigator.knowledge.extract.screens import Indicator, ScreenDefinition
+from navigator.knowledge.extract.transitions import TransitionDefinition
+
+logger = logging.getLogger(__name__)
+
+# Screen recognition needs at least this score to report a match
+RECOGNITION_THRESHOLD = 0.7
+
+# Navigation paths have at most this many transitions
+MAX_PATH_DEPTH = 20
+
+# Cost of a transition without an 'estimated_ms', for routing and reported path costs alike
+DEFAULT_TRANSITION_COST_MS = 1000
+
+
+def _compile(pattern: str) -> re.Pattern[str] | None:
+	try:
+		return re.compile(pattern)
+	except re.error:
+		logger.warning(f'Invalid regex pattern: {pattern}')
+		return None
+
+
+@dataclass
+class ScreenMatcher:
+	"""A screen's URL patterns and required indicators, compiled once."""
+
+	screen: ScreenDefinition
+	url_patterns: list[tuple[str, re.Pattern[str]]]
+	indicators: list[tuple[Indicator, re.Pattern[str] | None]]
+
+	@classmethod
+	def compile(cls, screen: ScreenDefinition) -> 'ScreenMatcher':
+		url_patterns = [(pattern, compiled) for pattern in screen.url_patterns if (compiled := _compile(pattern))]
+		indicators = [
+			(indicator, _compile(indicator.pattern) if indicator.type == 'url_matches' and indicator.pattern else None)
+			for indicator in screen.state_signature.required_indicators
+		]
+		return cls(screen=screen, url_patterns=url_patterns, indicators=indicators)
+
+	def score(self, current_url: str, dom_lower: str) -> tuple[float, list[dict[str, Any]]]:
+		"""
+		Score how well the screen matches the current state.
+
+		URL patterns count for 40%, required indicators for 60%.
+
+		Args:
+			current_url: Current browser URL
+			dom_lower: Lowercased DOM summary text
+
+		Returns:
+			Tuple of (score, matched_indicators)
+		"""
+		score = 0.0
+		matched_indicators: list[dict[str, Any]] = []
+
+		for pattern, compiled in self.url_patterns:
+			if compiled.match(current_url):
+				matched_indicators.append({'type': 'url_matches', 'pattern': pattern, 'value': current_url})
+				score += 0.4
+				break
+
+		if self.indicators:
+			matched_count = 0
+			for indicator, compiled in self.indicators:
+				if indicator.type == 'dom_contains':
+					if indicator.value and indicator.value.lower() in dom_lower:
+						matched_count += 1
+						matched_indicators.append(
+							{'type': 'dom_contains', 'value': indicator.value, 'selector': indicator.selector}
+						)
+				elif indicator.type == 'url_matches':
+					if compiled is not None and compiled.match(current_url):
+						matched_count += 1
+						matched_indicators.append({'type': 'url_matches', 'pattern': indicator.pattern})
+				elif indicator.type == 'url_exact':
+					if indicator.value and indicator.value == current_url:
+						matched_count += 1
+						matched_indicators.append({'type': 'url_exact', 'value': indicator.value})
+			score += matched_count / len(self.indicators) * 0.6
+
+		return score, matched_indicators
+
+
+def _action_summary(action: ActionDefinition) -> dict[str, Any]:
+	return {
+		'action_id': action.action_id,
+		'action_type': action.action_type,
+		'name': action.name,
+		'target_selector': action.target_selector,
+	}
+
+
+def _edge_cost(transition: TransitionDefinition) -> float:
+	# Same weight as the NetworkX graph cache
+	if not transition.cost:
+		return DEFAULT_TRANSITION_COST_MS
+	return transition.cost.get('estimated_ms', DEFAULT_TRANSITION_COST_MS)
+
+
+@dataclass
+class KnowledgeRuntimeModel:
+	"""
+	Screens, actions and transitions of one knowledge base, indexed for agent queries.
+
+	Build with from_definitions() or load(); treat as read-only afterwards.
+	"""
+
+	knowledge_id: str
+	version: tuple[int, int] | None
+	screens: dict[str, ScreenDefinition]
+	actions: dict[str, ActionDefinition]
+	transitions: dict[str, TransitionDefinition]
+	matchers: list[ScreenMatcher] = field(default_factory=list)
+	screen_actions: dict[str, list[dict[str, Any]]] = field(default_factory=dict)
+	outgoing: dict[str, list[TransitionDefinition]] = field(default_factory=dict)
+	paths: 'NavigationIndex | None' = None
+
+	@classmethod
+	def from_definitions(
+		cls,
+		knowledge_id: str,
+		screens: list[ScreenDefinition],
+		actions: list[ActionDefinition],
+		transitions: list[TransitionDefinition],
+		version: tuple[int, int] | None = None
+	) -> 'KnowledgeRuntimeModel':
+		model = cls(
+			knowledge_id=knowledge_id,
+			version=version,
+			screens={screen.screen_id: screen for screen in screens},
+			actions={action.action_id: action for action in actions},
+			transitions={transition.transition_id: transition for transition in transitions},
+		)
+
+		# Only actionable web UI screens are candidates for recognition
+		model.matchers = [
+			ScreenMatcher.compile(screen)
+			for screen in screens
+			if screen.content_type == 'web_ui' and screen.is_actionable
+		]
+
+		# Keep actions in load order, like filtering the actions collection would
+		action_list = list(model.actions.values())
+		positions = {action_id: i for i, action_id in enumerate(model.actions)}
+		for screen in screens:
+			indexes = sorted({positions[action_id] for action_id in screen.action_ids or [] if action_id in positions})
+			model.screen_actions[screen.screen_id] = [_action_summary(action_list[i]) for i in indexes]
+
+		for transition in transitions:
+			if transition.from_screen_id in model.screens and transition.to_screen_id in model.screens:
+				model.outgoing.setdefault(transition.from_screen_id, []).append(transition)
+
+		return model
+
+	@classmethod
+	async def load(cls, knowledge_id: str, version: tuple[int, int] | None = None) -> 'KnowledgeRuntimeModel':
+		"""
+		Load the latest screens, actions and transitions for a knowledge_id from MongoDB.
+
+		Args:
+			knowledge_id: Knowledge ID to load
+			version: Knowledge version read before loading
+
+		Returns:
+			KnowledgeRuntimeModel
+		"""
+		from navigator.knowledge.persist.documents import (
+			query_actions_by_knowledge_id,
+			query_screens_by_knowledge_id,
+			query_transitions_by_knowledge_id,
+		)
+
+		# limit=0 is no limit: the cursors page through every document in batches, a capped load would drop routes
+		screens, actions, transitions = await asyncio.gather(
+			query_screens_by_knowledge_id(knowledge_id, limit=0),
+			query_actions_by_knowledge_id(knowledge_id, limit=0),
+			query_transitions_by_knowledge_id(knowledge_id, limit=0),
+		)
+		model = cls.from_definitions(knowledge_id, screens, actions, transitions, version=version)
+		logger.info(
+			f'Built runtime model for knowledge_id={knowledge_id}: {len(screens)} screens, '
+			f'{len(actions)} actions, {len(transitions)} transitions (version {version})'
+		)
+		return model
+
+	def recognize(self, current_url: str, dom_summary: str) -> tuple[ScreenDefinition | None, float, list[dict[str, Any]]]:
+		"""
+		Find the best matching screen for the current browser state.
+
+		Args:
+			current_url: Current browser URL
+			dom_summary: DOM summary text from browser
+
+		Returns:
+			Tuple of (best screen or None, its score, its matched indicators)
+		"""
+		dom_lower = dom_summary.lower()
+		best_match: ScreenDefinition | None = None
+		best_score = 0.0
+		best_indicators: list[dict[str, Any]] = []
+
+		for matcher in self.matchers:
+			score, matched = matcher.score(current_url, dom_lower)
+			if score > best_score:
+				best_match, best_score, best_indicators = matcher.screen, score, matched
+
+		return best_match, best_score, best_indicators
+
+	def actions_for(self, screen: ScreenDefinition) -> list[dict[str, Any]]:
+		"""Summaries of this knowledge base's actions that are available on a screen, in load order."""
+		screen_action_ids = set(screen.action_ids or [])
+		return [_action_summary(action) for action_id, action in self.actions.items() if action_id in screen_action_ids]
+
+	def find_path(self, from_screen_id: str, to_screen_id: str, max_depth: int = MAX_PATH_DEPTH) -> list[TransitionDefinition] | None:
+		"""
+		Cheapest sequence of transitions between two screens (by estimated_ms).
+
+		Args:
+			from_screen_id: Source screen ID
+			to_screen_id: Target screen ID
+			max_depth: Maximum number of transitions
+
+		Returns:
+			List of transitions (empty when source equals target), or None if no path exists
+		"""
+		if from_screen_id not in self.screens or to_screen_id not in self.screens:
+			return None
+
+		# Dijkstra over the outgoing transitions; the counter keeps heap entries comparable
+		best_cost = {from_screen_id: 0.0}
+		heap: list[tuple[float, int, str, list[TransitionDefinition]]] = [(0.0, 0, from_screen_id, [])]
+		pushed = 0
+		while heap:
+			cost, _, screen_id, path = heapq.heappop(heap)
+			if screen_id == to_screen_id:
+				return path
+			if cost > best_cost.get(screen_id, float('inf')) or len(path) >= max_depth:
+				continue
+			for transition in self.outgoing.get(screen_id, []):
+				next_cost = cost + _edge_cost(transition)
+				if next_cost < best_cost.get(transition.to_screen_id, float('inf')):
+					best_cost[transition.to_screen_id] = next_cost
+					pushed += 1
+					heapq.heappush(heap, (next_cost, pushed, transition.to_screen_id, [*path, transition]))
+		return None
+
+	def navigation_path(self, from_screen_id: str, to_screen_id: str) -> dict[str, Any] | None:
+		"""
+		Navigation instructions between two screens, in the format of get_navigation_path().
+
+		Read off the NavigationIndex when the model has one, otherwise searched per call.
+
+		Args:
+			from_screen_id: Source screen ID
+			to_screen_id: Target screen ID
+
+		Returns:
+			Dict with path, transitions, actions, steps, total_cost and total_reliability,
+			or None if either screen is unknown or no path exists
+		"""
+		if from_screen_id not in self.screens or to_screen_id not in self.screens:
+			return None
+
+		if self.paths is not None:
+			transition_ids = self.paths.transition_ids(from_screen_id, to_screen_id)
+			if transition_ids is None:
+				return None
+			if len(transition_ids) <= MAX_PATH_DEPTH:
+				return self.paths.navigation_path(from_screen_id, transition_ids)
+			# The cheapest route is too long, the depth-limited search may find a shorter one
+
+		transitions = self.find_path(from_screen_id, to_screen_id)
+		if transitions is None:
+			return None
+		return _assemble_path(from_screen_id, [self.step_payload(transition) for transition in transitions])
+
+	def step_payload(self, transition: TransitionDefinition) -> 'StepPayload':
+		"""Instruction step, action and cost of taking one transition."""
+		action = None
+		if transition.action_id:
+			action = self.actions.get(transition.action_id)
+		elif transition.triggered_by and transition.triggered_by.element_id:
+			action = self.actions.get(transition.triggered_by.element_id)
+
+		if action:
+			action_name = action.name
+		else:
+			action_name = transition.triggered_by.action_type if transition.triggered_by else 'unknown'
+
+		from_name = self.screens[transition.from_screen_id].name
+		to_name = self.screens[transition.to_screen_id].name
+		return StepPayload(
+			to_screen_id=transition.to_screen_id,
+			transition=transition.dict(),
+			action=action.dict() if action else None,
+			step={
+				'from_screen': {'screen_id': transition.from_screen_id, 'screen_name': from_name},
+				'to_screen': {'screen_id': transition.to_screen_id, 'screen_name': to_name},
+				'action': {
+					'action_id': action.action_id if action else None,
+					'action_name': action_name,
+					'action_type': transition.triggered_by.action_type if transition.triggered_by else None
+				},
+				'transition_id': transition.transition_id,
+				'instruction': f'On {from_name}, {action_name} to navigate to {to_name}'
+			},
+			cost=_edge_cost(transition),
+			reliability=transition.reliability_score or 1.0,
+		)
+
+	def precompute_paths(
+		self,
+		hub_screen_ids: list[str] | None = None,
+		hubs: int = 16,
+		all_pairs_max_screens: int = 100
+	) -> 'NavigationIndex':
+		"""
+		Build the model's NavigationIndex; part of building the model.
+
+		Args:
+			hub_screen_ids: Screens to build trees from; defaults to the best connected screens
+			hubs: Number of hub screens to pick when hub_screen_ids is not given
+			all_pairs_max_screens: Build a tree from every screen in graphs up to this size
+
+		Returns:
+			The NavigationIndex, also set as model.paths
+		"""
+		self.paths = NavigationIndex.build(self, hub_screen_ids, hubs=hubs, all_pairs_max_screens=all_pairs_max_screens)
+		return self.paths
+
+
+@dataclass
+class StepPayload:
+	"""Everything a navigation path needs about one of its transitions, built once."""
+
+	to_screen_id: str
+	transition: dict[str, Any]
+	action: dict[str, Any] | None
+	step: dict[str, Any]
+	cost: float
+	reliability: float
+
+
+def _assemble_path(from_screen_id: str, payloads: list[StepPayload]) -> dict[str, Any]:
+	path = [from_screen_id, *(payload.to_screen_id for payload in payloads)]
+	total_cost = 0
+	total_reliability = 1.0
+	for payload in payloads:
+		total_cost += payload.cost
+		total_reliability *= payload.reliability
+
+	return {
+		'path': path,
+		'transitions': [payload.transition for payload in payloads],
+		'actions': [payload.action for payload in payloads if payload.action],
+		'steps': [{'step_number': i + 1, **payload.step} for i, payload in enumerate(payloads)],
+		'total_cost': total_cost,
+		'total_reliability': total_reliability,
+		'path_length': len(path),
+		'hops': len(path) - 1
+	}
+
+
+class NavigationIndex:
+	"""
+	Shortest-path trees over a runtime model's navigation graph.
+
+	A tree maps every screen reachable from its source to the transition that
+	enters it on the cheapest route, so a path is read off by walking back from
+	the target. Trees from hub screens (or from every screen, in small graphs)
+	are built up front; trees from other sources are built on first use and
+	kept up to max_trees. Instruction steps are built once per transition, the
+	first time a path takes it.
+
+	Belongs to one model version; the runtime cache drops it with its model.
+	Path payloads share their dicts, treat them as read-only.
+	"""
+
+	def __init__(self, model: KnowledgeRuntimeModel, max_trees: int = 256):
+		self.model = model
+		self.max_trees = max_trees
+		# (cost, target, transition_id) per screen, in the order find_path visits them
+		self.edges = {
+			screen_id: [(_edge_cost(t), t.to_screen_id, t.transition_id) for t in transitions]
+			for screen_id, transitions in model.outgoing.items()
+		}
+		self.payloads: dict[str, StepPayload] = {}
+		self.trees: dict[str, dict[str, str]] = {}
+		self._on_demand: OrderedDict[str, dict[str, str]] = OrderedDict()
+		self.all_pairs = False
+		self.build_seconds = 0.0
+
+	@classmethod
+	def build(
+		cls,
+		model: KnowledgeRuntimeModel,
+		hub_screen_ids: list[str] | None = None,
+		hubs: int = 16,
+		all_pairs_max_screens: int = 100
+	) -> 'NavigationIndex':
+		"""
+		Build the trees for a model's hub screens, or all screens in small graphs.
+
+		Args:
+			model: Runtime model to index
+			hub_screen_ids: Screens to build trees from; defaults to the best connected screens
+			hubs: Number of hub screens to pick when hub_screen_ids is not given
+			all_pairs_max_screens: Build a tree from every screen in graphs up to this size
+
+		Returns:
+			NavigationIndex
+		"""
+		start = time.perf_counter()
+		index = cls(model)
+		if hub_screen_ids is None and len(model.screens) <= all_pairs_max_screens:
+			index.all_pairs = True
+			sources = list(model.screens)
+		elif hub_screen_ids is None:
+			degree = dict.fromkeys(model.screens, 0)
+			for screen_id, transitions in model.outgoing.items():
+				degree[screen_id] += len(transitions)
+				for transition in transitions:
+					degree[transition.to_screen_id] += 1
+			sources = sorted(degree, key=lambda screen_id: -degree[screen_id])[:hubs]
+		else:
+			sources = [screen_id for screen_id in hub_screen_ids if screen_id in model.screens]
+
+		for source in sources:
+			index.trees[source] = index._shortest_path_tree(source)
+		index.build_seconds = time.perf_counter() - start
+		return index
+
+	def _shortest_path_tree(self, source: str) -> dict[str, str]:
+		# Same search (and tie-breaking) as KnowledgeRuntimeModel.find_path, run to completion
+		best_cost = {source: 0.0}
+		entered_by: dict[str, str] = {}
+		heap: list[tuple[float, int, str]] = [(0.0, 0, source)]
+		pushed = 0
+		while heap:
+			cost, _, screen_id = heapq.heappop(heap)
+			if cost > best_cost[screen_id]:
+				continue
+			for edge_cost, target, transition_id in self.edges.get(screen_id, ()):
+				next_cost = cost + edge_cost
+				if next_cost < best_cost.get(target, float('inf')):
+					best_cost[target] = next_cost
+					entered_by[target] = transition_id
+					pushed += 1
+					heapq.heappush(heap, (next_cost, pushed, target))
+		return entered_by
+
+	def tree(self, source: str) -> dict[str, str]:
+		"""Shortest-path tree from a screen, built on first use if it isn't a hub."""
+		tree = self.trees.get(source)
+		if tree is not None:
+			return tree
+		tree = self._on_demand.get(source)
+		if tree is None:
+			tree = self._on_demand[source] = self._shortest_path_tree(source)
+			while len(self._on_demand) > self.max_trees:
+				self._on_demand.popitem(last=False)
+		else:
+			self._on_demand.move_to_end(source)
+		return tree
+
+	def transition_ids(self, from_screen_id: str, to_screen_id: str) -> list[str] | None:
+		"""
+		Transitions of the cheapest route between two screens of the model.
+
+		Returns:
+			List of transition IDs (empty when source equals target), or None if no path exists
+		"""
+		tree = self.tree(from_screen_id)
+		transition_ids = []
+		screen_id = to_screen_id
+		while screen_id != from_screen_id:
+			transition_id = tree.get(screen_id)
+			if transition_id is None:
+				return None
+			transition_ids.append(transition_id)
+			screen_id = self.model.transitions[transition_id].from_screen_id
+		transition_ids.reverse()
+		return transition_ids
+
+	def navigation_path(self, from_screen_id: str, transition_ids: list[str]) -> dict[str, Any]:
+		"""Navigation instructions for a route from transition_ids(), in the format of get_navigation_path()."""
+		payloads = []
+		for transition_id in transition_ids:
+			payload = self.payloads.get(transition_id)
+			if payload is None:
+				payload = self.payloads[transition_id] = self.model.step_payload(self.model.transitions[transition_id])
+			payloads.append(payload)
+		return _assemble_path(from_screen_id, payloads)
+
+	def stats(self) -> dict[str, Any]:
+		return {
+			'screens': len(self.model.screens),
+			'transitions': sum(len(edges) for edges in self.edges.values()),
+			'materialized_steps': len(self.payloads),
+			'trees': len(self.trees),
+			'on_demand_trees': len(self._on_demand),
+			'all_pairs': self.all_pairs,
+			'build_ms': round(self.build_seconds * 1000, 2),
+		}
+
+
+def _is_current(model: KnowledgeRuntimeModel | None, version: tuple[int, int]) -> bool:
+	# A model built by a concurrent request may be newer than the version we read
+	return model is not None and model.version is not None and all(map(int.__ge__, model.version, version))
+
+
+class KnowledgeRuntimeCache:
+	"""
+	Shares runtime models across requests, one per knowledge_id.
+
+	Each lookup reads the knowledge version (one indexed query) and rebuilds the
+	model if it changed. Concurrent lookups for the same knowledge_id share one build.
+	With precompute_paths, each build also builds the model's NavigationIndex.
+	"""
+
+	def __init__(self, max_models: int = 32, precompute_paths: bool = True):
+		self.max_models = max_models
+		self.precompute_paths = precompute_paths
+		self._models: OrderedDict[str, KnowledgeRuntimeModel] = OrderedDict()
+		self._locks: dict[str, asyncio.Lock] = {}
+
+	async def get_model(self, knowledge_id: str) -> KnowledgeRuntimeModel:
+		"""
+		Get the runtime model for a knowledge_id, building it if missing or outdated.
+
+		Args:
+			knowledge_id: Knowledge ID to get the model for
+
+		Returns:
+			KnowledgeRuntimeModel
+		"""
+		from navigator.knowledge.persist.versions import get_knowledge_version
+
+		version = await get_knowledge_version(knowledge_id)
+		if version is None:
+			# No version to validate against (MongoDB unavailable), don't cache
+			return await KnowledgeRuntimeModel.load(knowledge_id)
+
+		model = self._models.get(knowledge_id)
+		if _is_current(model, version):
+			self._models.move_to_end(knowledge_id)
+			return model
+
+		lock = self._locks.setdefault(knowledge_id, asyncio.Lock())
+		async with lock:
+			# Another request may have rebuilt it while we waited
+			model = self._models.get(knowledge_id)
+			if model is None or not _is_current(model, version):
+				model = await KnowledgeRuntimeModel.load(knowledge_id, version=version)
+				if self.precompute_paths:
+					# Building the index is CPU-bound; the model isn't shared until it's done
+					paths = await asyncio.to_thread(model.precompute_paths)
+					logger.info(f'Precomputed navigation paths for knowledge_id={knowledge_id}: {paths.stats()}')
+				self._models[knowledge_id] = model
+			self._models.move_to_end(knowledge_id)
+			while len(self._models) > self.max_models:
+				evicted, _ = self._models.popitem(last=False)
+				self._locks.pop(evicted, None)
+			return model
+
+	def invalidate(self, knowledge_id: str | None = None) -> None:
+		"""Drop the model for a knowledge_id, or all models."""
+		if knowledge_id is None:
+			self._models.clear()
+		else:
+			self._models.pop(knowledge_id, None)
+
+
+_runtime_cache: KnowledgeRuntimeCache | None = None
+
+
+def get_knowledge_runtime_cache() -> KnowledgeRuntimeCache:
+	"""Get the process-wide runtime model cache (set KNOWLEDGE_PRECOMPUTE_PATHS=false to skip the NavigationIndex)."""
+	global _runtime_cache
+	if _runtime_cache is None:
+		precompute_paths = os.getenv('KNOWLEDGE_PRECOMPUTE_PATHS', 'true').lower() not in ('false', '0', 'no')
+		_runtime_cache = KnowledgeRuntimeCache(precompute_paths=precompute_paths)
+	return _runtime_cache
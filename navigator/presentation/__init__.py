@@ -12,7 +12,8 @@ from navigator.presentation.flow_manager import (
 	PresentationSession,
 	SessionState,
 )
-from navigator.presentation.session_store import SessionStore
+from navigator.presentation.scheduler import ActionScheduler
+from navigator.presentation.session_store import SessionStore, close_session_store, get_session_store
 
 __all__ = [
 	"PresentationFlowManager",
@@ -20,5 +21,8 @@ __all__ = [
 	"SessionState",
 	"PresentationActionRegistry",
 	"ActionQueue",
+	"ActionScheduler",
 	"SessionStore",
+	"get_session_store",
+	"close_session_store",
 ]
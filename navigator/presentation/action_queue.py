@@ -3,22 +3,32 @@ Action Queue Management for Presentation Flow
 
 Provides reliable action queue using BullMQ (with in-memory fallback).
 Handles action queuing, processing, rate limiting, and retry logic.
+
+The in-memory queue is scheduled by ActionScheduler (see scheduler.py): token
+bucket rate limits globally and per session, fair queuing across sessions,
+coalescing of redundant actions and retries with jittered backoff.
 """
 
-import asyncio
+import itertools
 import logging
+import random
 import time
 from typing import Any, Callable
 
+from navigator.presentation.scheduler import ActionScheduler, Clock, ScheduledAction, jittered_backoff
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_SESSION_ID = "default"
+
 
 class ActionQueue:
 	"""
 	Action queue for reliable action processing.
 	
 	Supports BullMQ for persistent queues (requires Redis) or in-memory queues for development.
-	Provides rate limiting and retry logic with exponential backoff.
+	Provides rate limiting (globally and per session), fair scheduling across sessions and
+	retry logic with exponential backoff.
 	"""
 
 	def __init__(
@@ -28,6 +38,11 @@ class ActionQueue:
 		max_retries: int = 3,
 		retry_backoff_base: float = 2.0,
 		action_processor: Callable[[dict[str, Any]], Any] | None = None,
+		max_actions_per_second_per_session: float | None = None,
+		burst: int = 1,
+		retry_jitter: float = 0.1,
+		coalesce_actions: bool = True,
+		clock: Clock | None = None,
 	):
 		"""
 		Initialize the action queue.
@@ -38,25 +53,33 @@ class ActionQueue:
 			max_retries: Maximum number of retries for failed actions (default: 3)
 			retry_backoff_base: Base for exponential backoff (default: 2.0)
 			action_processor: Optional callback function to process actions. If None, actions are just queued.
+			max_actions_per_second_per_session: Optional rate limit for each session. If None, no per-session limit.
+			burst: How many actions a rate limit lets through at once after being idle (default: 1)
+			retry_jitter: Retry delays are stretched by a random fraction up to this (default: 0.1)
+			coalesce_actions: Merge redundant consecutive actions, like repeated scrolls (default: True)
+			clock: Optional time source for scheduling (tests use a fake clock)
 		"""
 		self.queue = queue
 		self.max_actions_per_second = max_actions_per_second
 		self.max_retries = max_retries
 		self.retry_backoff_base = retry_backoff_base
+		self.retry_jitter = retry_jitter
 		self.action_processor = action_processor
-
-		# Rate limiting
-		if max_actions_per_second:
-			self._rate_limiter = asyncio.Semaphore(max_actions_per_second)
-			self._min_delay = 1.0 / max_actions_per_second
-		else:
-			self._rate_limiter = None
-			self._min_delay = 0.0
-
-		# In-memory queue (fallback)
-		self._in_memory_queue: list[dict[str, Any]] = []
-		self._in_memory_processing = False
-		self._failed_actions: dict[str, int] = {}  # job_id -> retry_count
+		self._rng = random.Random()
+		self._job_counter = itertools.count()
+
+		# In-memory queue (fallback), also provides rate limiting for the BullMQ worker
+		self._scheduler = ActionScheduler(
+			self._run_action,
+			rate_per_second=max_actions_per_second,
+			session_rate_per_second=max_actions_per_second_per_session,
+			burst=burst,
+			retry_delay=self._retry_delay,
+			coalesce=coalesce_actions,
+			clock=clock,
+		)
+		self._rate_limiter = self._scheduler.rate_limiter
+		self._min_delay = 1.0 / max_actions_per_second if max_actions_per_second else 0.0
 
 		# Worker tracking (for BullMQ)
 		self._worker: Any | None = None
@@ -66,12 +89,72 @@ class ActionQueue:
 			f"rate_limit: {max_actions_per_second}, max_retries: {max_retries})"
 		)
 
+	@property
+	def _in_memory_queue(self) -> list[dict[str, Any]]:
+		"""Pending in-memory jobs, in the order they will run within each session."""
+		return [
+			{
+				"job_id": job.job_id,
+				"session_id": job.session_id,
+				"action": job.action,
+				"priority": job.priority,
+				"coalesced_job_ids": job.coalesced_job_ids,
+			}
+			for job in self._scheduler.pending()
+		]
+
+	def pending_actions(self) -> dict[str, list[dict[str, Any]]]:
+		"""
+		Get pending in-memory actions by session.
+		
+		Returns:
+			Dict of session_id -> actions that haven't started, in the order they will run
+		"""
+		pending: dict[str, list[dict[str, Any]]] = {}
+		for job in self._scheduler.pending():
+			pending.setdefault(job.session_id, []).append(job.action)
+		return pending
+
+	def set_session_weight(self, session_id: str, weight: float) -> None:
+		"""
+		Set a session's share of the queue when sessions compete for it.
+		
+		Args:
+			session_id: Session ID
+			weight: Relative share (default for every session: 1.0)
+		"""
+		self._scheduler.set_weight(session_id, weight)
+
+	def discard_session(self, session_id: str) -> None:
+		"""
+		Drop a session's pending in-memory actions (they complete as failed).
+		
+		Args:
+			session_id: Session ID
+		"""
+		self._scheduler.discard_session(session_id)
+
+	def get_wait_time_histograms(self) -> dict[str, Any]:
+		"""
+		Get queue wait time histograms (seconds from when an action is due until it starts).
+		
+		Returns:
+			Dict with the overall histogram under "all" and one per session under "sessions"
+		"""
+		sessions = {}
+		for session_id in self._scheduler.session_ids():
+			histogram = self._scheduler.session_wait_times(session_id)
+			if histogram is not None:
+				sessions[session_id] = histogram.to_dict()
+		return {"all": self._scheduler.wait_times.to_dict(), "sessions": sessions}
+
 	async def enqueue_action(
 		self,
 		action: dict[str, Any],
 		job_id: str | None = None,
 		priority: int = 0,
 		delay: float = 0.0,
+		session_id: str = DEFAULT_SESSION_ID,
 	) -> str:
 		"""
 		Enqueue an action for processing.
@@ -81,12 +164,13 @@ class ActionQueue:
 			job_id: Optional job ID. If None, generates one.
 			priority: Job priority (higher = processed first, default: 0)
 			delay: Delay in seconds before processing (default: 0.0)
+			session_id: Session the action belongs to. Each session's actions run in order, one at a time.
 		
 		Returns:
 			Job ID
 		"""
 		if job_id is None:
-			job_id = f"action_{int(time.time() * 1000)}"
+			job_id = f"action_{int(time.time() * 1000)}_{next(self._job_counter)}"
 
 		if self.queue:
 			# Use BullMQ queue
@@ -113,25 +197,24 @@ class ActionQueue:
 				# Fall through to in-memory queue
 
 		# In-memory queue (fallback or no queue provided)
-		self._in_memory_queue.append({
-			"job_id": job_id,
-			"action": action,
-			"priority": priority,
-			"delay": delay,
-			"enqueued_at": time.time(),
-		})
+		self._scheduler.submit(session_id, job_id, action, priority=priority, delay=delay)
 		logger.debug(f"Enqueued action in-memory: {job_id}")
 		return job_id
 
-	async def process_queue(self) -> list[dict[str, Any]]:
+	async def process_queue(self, session_id: str | None = None) -> list[dict[str, Any]]:
 		"""
 		Process queued actions.
 		
 		For BullMQ: Starts a worker if not already running.
-		For in-memory: Processes all queued actions.
+		For in-memory: Processes queued actions and waits for them. Sessions are processed
+		concurrently (one action at a time per session), so a slow or retrying session
+		doesn't hold up the others.
+		
+		Args:
+			session_id: Only wait for this session's actions (in-memory). If None, waits for all.
 		
 		Returns:
-			List of processing results
+			List of processing results, in completion order
 		"""
 		if self.queue:
 			# BullMQ queue processing
@@ -147,15 +230,10 @@ class ActionQueue:
 
 						logger.debug(f"Processing action from BullMQ queue: {job_id}")
 
-						# Apply rate limiting
-						if self._rate_limiter:
-							async with self._rate_limiter:
-								await asyncio.sleep(self._min_delay)
-								result = await self._process_action(action, job_id)
-						else:
-							result = await self._process_action(action, job_id)
-
-						return result
+						# Apply rate limiting; failures are retried by BullMQ (attempts)
+						await self._scheduler.acquire()
+						result = await self._execute(action)
+						return {"success": True, "job_id": job_id, "result": result}
 
 					self._worker = QueueWorker(
 						"browser_actions",
@@ -174,97 +252,45 @@ class ActionQueue:
 				# Fall through to in-memory processing
 
 		# In-memory queue processing
-		if self._in_memory_processing:
-			logger.debug("Queue processing already in progress")
-			return []
-
-		self._in_memory_processing = True
-		results = []
-
-		try:
-			# Sort by priority (higher first) and delay
-			sorted_queue = sorted(
-				self._in_memory_queue,
-				key=lambda x: (x["priority"], -x.get("enqueued_at", 0)),
-				reverse=True,
-			)
-
-			for item in sorted_queue:
-				job_id = item["job_id"]
-				action = item["action"]
-				delay = item.get("delay", 0.0)
-
-				# Apply delay if specified
-				if delay > 0:
-					await asyncio.sleep(delay)
-
-				# Apply rate limiting
-				if self._rate_limiter:
-					async with self._rate_limiter:
-						await asyncio.sleep(self._min_delay)
-						result = await self._process_action(action, job_id)
-				else:
-					result = await self._process_action(action, job_id)
-
-				results.append(result)
-
-			# Clear processed items
-			self._in_memory_queue = []
-
-		finally:
-			self._in_memory_processing = False
-
-		return results
-
-	async def _process_action(self, action: dict[str, Any], job_id: str) -> dict[str, Any]:
-		"""
-		Process a single action with retry logic.
-		
-		Args:
-			action: Action data
-			job_id: Job ID
-		
-		Returns:
-			Processing result
-		"""
-		retry_count = self._failed_actions.get(job_id, 0)
-
-		try:
-			if self.action_processor:
-				result = await self.action_processor(action)
-				# Clear failed count on success
-				if job_id in self._failed_actions:
-					del self._failed_actions[job_id]
-				return {"success": True, "job_id": job_id, "result": result}
-			else:
-				# No processor, just return success
-				return {"success": True, "job_id": job_id, "action": action}
-
-		except Exception as e:
-			logger.error(f"Error processing action {job_id}: {e}", exc_info=True)
-
-			# Check if we should retry
-			if retry_count < self.max_retries:
-				retry_count += 1
-				self._failed_actions[job_id] = retry_count
-
-				# Calculate exponential backoff delay
-				backoff_delay = self.retry_backoff_base ** retry_count
-
-				logger.debug(f"Retrying action {job_id} (attempt {retry_count}/{self.max_retries}) after {backoff_delay}s")
-				await asyncio.sleep(backoff_delay)
-
-				# Retry the action
-				return await self._process_action(action, job_id)
-			else:
-				# Max retries reached
-				logger.error(f"Action {job_id} failed after {self.max_retries} retries")
-				return {
-					"success": False,
-					"job_id": job_id,
-					"error": str(e),
-					"retries": retry_count,
-				}
+		completed = await self._scheduler.drain(session_id)
+		return [self._to_result(job) for job in completed]
+
+	async def _execute(self, action: dict[str, Any]) -> Any:
+		"""Run one action with the action processor (no-op without one)."""
+		if self.action_processor:
+			return await self.action_processor(action)
+		return None
+
+	async def _run_action(self, job: ScheduledAction) -> Any:
+		logger.debug(f"Processing action {job.job_id} (attempt {job.attempts}) for session {job.session_id[:8]}...")
+		return await self._execute(job.action)
+
+	def _retry_delay(self, job: ScheduledAction) -> float | None:
+		"""Delay before retrying a failed action, or None once max_retries is reached."""
+		retry_count = job.attempts
+		if retry_count > self.max_retries:
+			return None
+		return jittered_backoff(retry_count, self.retry_backoff_base, self.retry_jitter, self._rng)
+
+	def _to_result(self, job: ScheduledAction) -> dict[str, Any]:
+		"""Processing result for a completed in-memory job."""
+		if job.error is not None:
+			return {
+				"success": False,
+				"job_id": job.job_id,
+				"error": str(job.error),
+				"retries": max(job.attempts - 1, 0),
+			}
+
+		result: dict[str, Any] = {"success": True, "job_id": job.job_id}
+		if self.action_processor:
+			result["result"] = job.result
+		else:
+			# No processor, just return success
+			result["action"] = job.action
+		if job.coalesced_job_ids:
+			result["coalesced_job_ids"] = job.coalesced_job_ids
+		return result
 
 	async def close(self) -> None:
 		"""Close the queue and stop processing."""
@@ -276,4 +302,5 @@ class ActionQueue:
 				logger.error(f"Error closing BullMQ worker: {e}", exc_info=True)
 			self._worker = None
 
+		await self._scheduler.close()
 		logger.debug("ActionQueue closed")
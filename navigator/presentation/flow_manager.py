@@ -11,6 +11,8 @@ import time
 from enum import Enum
 from typing import Any
 
+from navigator.presentation.action_queue import ActionQueue
+
 logger = logging.getLogger(__name__)
 
 
@@ -49,6 +51,7 @@ class PresentationFlowManager:
 		timeout_minutes: int = 360,
 		command_queue: Any | None = None,
 		browser_session_manager: Any | None = None,
+		action_queue: ActionQueue | None = None,
 	):
 		"""
 		Initialize the presentation flow manager.
@@ -57,6 +60,8 @@ class PresentationFlowManager:
 			timeout_minutes: Session timeout in minutes (default: 360 = 6 hours)
 			command_queue: Optional BullMQ Queue for command processing. If None, uses in-memory queue.
 			browser_session_manager: Optional BrowserSessionManager instance. If None, will create one.
+			action_queue: Optional ActionQueue for in-memory processing, shared by all sessions (rate limits,
+				fair scheduling across sessions, coalescing, retries). If None, creates one without limits.
 		"""
 		self.sessions: dict[str, PresentationSession] = {}
 		self.timeout_minutes = timeout_minutes
@@ -65,6 +70,7 @@ class PresentationFlowManager:
 		self._shutdown = False
 		self.command_queue = command_queue
 		self._queue_workers: dict[str, Any] = {}  # session_id -> worker
+		self.action_queue = action_queue or ActionQueue()
 
 		# Browser session manager integration
 		if browser_session_manager is None:
@@ -146,6 +152,9 @@ class PresentationFlowManager:
 			except Exception as e:
 				logger.error(f"Error closing queue worker for session {session_id[:8]}...: {e}", exc_info=True)
 
+		# Drop actions that haven't run yet
+		self.action_queue.discard_session(session_id)
+
 		# Remove from active sessions
 		del self.sessions[session_id]
 
@@ -265,19 +274,26 @@ class PresentationFlowManager:
 				raise
 		else:
 			# In-memory queue (for development/testing)
-			if not hasattr(self, '_in_memory_queue'):
-				self._in_memory_queue: dict[str, list[dict[str, Any]]] = {}
-			if session_id not in self._in_memory_queue:
-				self._in_memory_queue[session_id] = []
-			self._in_memory_queue[session_id].append(action)
+			await self.action_queue.enqueue_action(action, session_id=session_id)
 			logger.debug(f"Enqueued action in-memory for session {session_id[:8]}...")
 
-	async def process_queue(self, session_id: str) -> None:
+	@property
+	def _in_memory_queue(self) -> dict[str, list[dict[str, Any]]]:
+		"""Pending in-memory actions by session."""
+		return self.action_queue.pending_actions()
+
+	async def process_queue(self, session_id: str) -> list[dict[str, Any]]:
 		"""
 		Process queued actions for a session (starts worker if using BullMQ).
 		
+		In-memory actions of all sessions go through one ActionQueue, so sessions processed
+		at the same time share its rate limits fairly.
+		
 		Args:
 			session_id: Session ID
+		
+		Returns:
+			Processing results of the session's in-memory actions (empty for BullMQ)
 		"""
 		if session_id not in self.sessions:
 			raise ValueError(f"Session {session_id} does not exist")
@@ -313,13 +329,11 @@ class PresentationFlowManager:
 			except ImportError:
 				logger.error("BullMQ not available. Install with: uv add bullmq")
 				raise
+			return []
 		else:
 			# In-memory queue processing
-			if hasattr(self, '_in_memory_queue') and session_id in self._in_memory_queue:
-				queue = self._in_memory_queue[session_id]
-				logger.debug(f"Processing {len(queue)} actions from in-memory queue for session {session_id[:8]}...")
-				# Clear queue after processing (actual execution happens in Step 1.4)
-				self._in_memory_queue[session_id] = []
+			logger.debug(f"Processing in-memory queue for session {session_id[:8]}...")
+			return await self.action_queue.process_queue(session_id)
 
 	async def shutdown(self) -> None:
 		"""Shutdown the flow manager and stop background tasks."""
@@ -334,6 +348,7 @@ class PresentationFlowManager:
 			except Exception as e:
 				logger.error(f"Error closing queue worker for session {session_id[:8]}...: {e}", exc_info=True)
 		self._queue_workers.clear()
+		await self.action_queue.close()
 
 		# Cancel cleanup task
 		if self._cleanup_task and not self._cleanup_task.done():
@@ -0,0 +1,495 @@
+"""
+Action Scheduler for Presentation Flow
+
+Decides when queued browser actions run, across presentation sessions:
+
+- Token buckets limit the action rate globally and per session. When the
+  queue is idle an action starts right away; only actions that would exceed
+  the rate wait.
+- Sessions share the queue by weighted fair queuing, so a session with a long
+  backlog can't starve the others. A session's own actions run one at a time,
+  higher priority first, then in the order they were queued.
+- A queued action made redundant by the next one is merged with it:
+  consecutive scrolls in the same direction add up, and consecutive
+  navigations keep only the last URL.
+- Failed actions are retried after a backoff. While an action waits for its
+  retry, only its own session waits.
+
+Queue wait times (from when an action is due to when it starts) are recorded
+in histograms, overall and per session.
+
+Usage:
+	scheduler = ActionScheduler(run_action, rate_per_second=10, session_rate_per_second=2)
+	scheduler.submit("session-1", "job-1", {"type": "scroll", "params": {"direction": "down"}})
+	completed = await scheduler.drain()
+"""
+
+import asyncio
+import bisect
+import heapq
+import itertools
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Protocol
+
+logger = logging.getLogger(__name__)
+
+# Same default as navigator/action/dispatcher/handlers/scrolling.py
+DEFAULT_SCROLL_AMOUNT = 500
+
+# Upper bounds (seconds) of the wait time histogram buckets
+DEFAULT_WAIT_TIME_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class SessionClosedError(Exception):
+	"""Raised for queued actions of a session that was discarded before they ran."""
+
+
+class Clock(Protocol):
+	"""Time source for the scheduler (replaced by a fake clock in tests)."""
+
+	def now(self) -> float: ...
+
+	async def sleep(self, seconds: float) -> None: ...
+
+
+class MonotonicClock:
+	"""Real time."""
+
+	def now(self) -> float:
+		return time.monotonic()
+
+	async def sleep(self, seconds: float) -> None:
+		await asyncio.sleep(seconds)
+
+
+@dataclass
+class TokenBucket:
+	"""Allows `rate` actions per second on average, in bursts of up to `burst`."""
+
+	rate: float
+	burst: float = 1.0
+	tokens: float = field(init=False)
+	updated: float | None = field(default=None, init=False)
+
+	def __post_init__(self) -> None:
+		self.tokens = self.burst
+
+	def _refill(self, now: float) -> None:
+		if self.updated is not None:
+			self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+		self.updated = now
+
+	def delay(self, now: float) -> float:
+		"""Seconds until a token is available (0 if there is one now)."""
+		self._refill(now)
+		# Tolerate float error from refilling after waiting exactly the computed delay
+		missing = 1 - self.tokens
+		return missing / self.rate if missing > 1e-9 else 0.0
+
+	def take(self, now: float) -> None:
+		self._refill(now)
+		self.tokens -= 1
+
+
+class WaitTimeHistogram:
+	"""Histogram of queue wait times in seconds."""
+
+	def __init__(self, bounds: tuple[float, ...] = DEFAULT_WAIT_TIME_BUCKETS):
+		self.bounds = bounds
+		self.counts = [0] * (len(bounds) + 1)  # the last bucket has no upper bound
+		self.count = 0
+		self.total = 0.0
+		self.max = 0.0
+
+	def observe(self, seconds: float) -> None:
+		self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+		self.count += 1
+		self.total += seconds
+		self.max = max(self.max, seconds)
+
+	def quantile(self, q: float) -> float:
+		"""Upper bound of the bucket holding the q-quantile (the maximum for the last bucket)."""
+		if not self.count:
+			return 0.0
+		rank = q * self.count
+		seen = 0
+		for bound, count in zip(self.bounds, self.counts):
+			seen += count
+			if seen >= rank:
+				return bound
+		return self.max
+
+	def to_dict(self) -> dict[str, Any]:
+		"""Cumulative bucket counts keyed by upper bound, with count, sum, max, p50 and p99."""
+		cumulative = list(itertools.accumulate(self.counts))
+		buckets = {str(bound): n for bound, n in zip(self.bounds, cumulative)}
+		buckets["+Inf"] = cumulative[-1]
+		return {
+			"count": self.count,
+			"sum": self.total,
+			"max": self.max,
+			"p50": self.quantile(0.5),
+			"p99": self.quantile(0.99),
+			"buckets": buckets,
+		}
+
+
+def coalesce_actions(previous: dict[str, Any], action: dict[str, Any]) -> dict[str, Any] | None:
+	"""
+	Merge an action into the one queued right before it, if running both is redundant.
+
+	Args:
+		previous: Queued action that hasn't started yet
+		action: Action queued after it
+
+	Returns:
+		The merged action, or None if both have to run
+	"""
+	action_type = action.get("type")
+	if action_type != previous.get("type"):
+		return None
+	params = action.get("params") or {}
+	previous_params = previous.get("params") or {}
+
+	if action_type == "scroll":
+		other_params = {k: v for k, v in params.items() if k != "amount"}
+		if other_params != {k: v for k, v in previous_params.items() if k != "amount"}:
+			return None
+		amount = previous_params.get("amount", DEFAULT_SCROLL_AMOUNT) + params.get("amount", DEFAULT_SCROLL_AMOUNT)
+		return {**action, "params": {**params, "amount": amount}}
+
+	if action_type == "navigate":
+		# Opening tabs isn't redundant
+		if params.get("new_tab") or previous_params.get("new_tab"):
+			return None
+		return action
+
+	return None
+
+
+def jittered_backoff(attempt: int, base: float, jitter: float, rng: random.Random) -> float:
+	"""base ** attempt seconds, stretched by up to `jitter` (a fraction) so retries don't line up."""
+	return base**attempt * (1 + jitter * rng.random())
+
+
+@dataclass
+class ScheduledAction:
+	"""An action in the scheduler, with its outcome once it has run."""
+
+	job_id: str
+	session_id: str
+	action: dict[str, Any]
+	priority: int
+	due_at: float  # doesn't start before this (clock time)
+	seq: int
+	future: asyncio.Future = field(repr=False)
+	coalesced_job_ids: list[str] = field(default_factory=list)
+	attempts: int = 0
+	started: bool = False
+	result: Any = None
+	error: BaseException | None = None
+
+	@property
+	def sort_key(self) -> tuple[int, int]:
+		return -self.priority, self.seq
+
+
+@dataclass
+class _SessionQueue:
+	heap: list[tuple[tuple[int, int], ScheduledAction]] = field(default_factory=list)
+	bucket: TokenBucket | None = None
+	weight: float = 1.0
+	finish_tag: float = 0.0
+	busy: bool = False
+	last: ScheduledAction | None = None  # most recently submitted, for coalescing
+	wait_times: WaitTimeHistogram = field(default_factory=WaitTimeHistogram)
+
+
+class ActionScheduler:
+	"""
+	Schedules actions across sessions with rate limits, fair queuing, coalescing and retries.
+
+	Actions run in a background dispatcher that `drain()` starts; once started it keeps
+	going until nothing is queued.
+	"""
+
+	def __init__(
+		self,
+		processor: Callable[[ScheduledAction], Awaitable[Any]],
+		rate_per_second: float | None = None,
+		session_rate_per_second: float | None = None,
+		burst: int = 1,
+		retry_delay: Callable[[ScheduledAction], float | None] | None = None,
+		coalesce: bool = True,
+		clock: Clock | None = None,
+	):
+		"""
+		Initialize the scheduler.
+
+		Args:
+			processor: Runs one action; an exception counts as a failed attempt
+			rate_per_second: Optional global rate limit. If None, no global limit.
+			session_rate_per_second: Optional rate limit for each session. If None, no per-session limit.
+			burst: How many actions a rate limit lets through at once after being idle (default: 1)
+			retry_delay: Given a failed action, returns seconds until its retry, or None to give up.
+				If None, failed actions aren't retried.
+			coalesce: Merge redundant consecutive actions of a session (default: True)
+			clock: Time source (default: MonotonicClock)
+		"""
+		self.processor = processor
+		self.session_rate_per_second = session_rate_per_second
+		self.burst = burst
+		self.retry_delay = retry_delay
+		self.coalesce = coalesce
+		self.clock: Clock = clock or MonotonicClock()
+		self.rate_limiter = TokenBucket(rate_per_second, burst) if rate_per_second else None
+		self.wait_times = WaitTimeHistogram()
+
+		self._sessions: dict[str, _SessionQueue] = {}
+		self._active: dict[int, ScheduledAction] = {}  # seq -> queued or running action
+		self._seq = itertools.count()
+		self._virtual_time = 0.0
+		self._wakeup = asyncio.Event()
+		self._dispatcher: asyncio.Task | None = None
+
+	def _session(self, session_id: str) -> _SessionQueue:
+		queue = self._sessions.get(session_id)
+		if queue is None:
+			bucket = TokenBucket(self.session_rate_per_second, self.burst) if self.session_rate_per_second else None
+			queue = self._sessions[session_id] = _SessionQueue(bucket=bucket)
+		return queue
+
+	def set_weight(self, session_id: str, weight: float) -> None:
+		"""Give a session a larger (or smaller) share of the queue when sessions compete (default weight: 1)."""
+		if weight <= 0:
+			raise ValueError("Session weight must be positive")
+		self._session(session_id).weight = weight
+
+	def submit(
+		self,
+		session_id: str,
+		job_id: str,
+		action: dict[str, Any],
+		priority: int = 0,
+		delay: float = 0.0,
+	) -> ScheduledAction:
+		"""
+		Queue an action.
+
+		Args:
+			session_id: Session the action belongs to
+			job_id: Job ID
+			action: Action data (dict with type and params)
+			priority: Higher runs first within the session (default: 0)
+			delay: Seconds before the action may start (default: 0.0)
+
+		Returns:
+			The queued action. If it was merged into the previous one, that action is returned
+			and job_id is listed in its coalesced_job_ids.
+		"""
+		queue = self._session(session_id)
+		now = self.clock.now()
+
+		previous = queue.last
+		if (
+			self.coalesce
+			and delay <= 0
+			and previous is not None
+			and not previous.started
+			and previous.priority == priority
+			and previous.due_at <= now
+		):
+			merged = coalesce_actions(previous.action, action)
+			if merged is not None:
+				previous.action = merged
+				previous.coalesced_job_ids.append(job_id)
+				logger.debug(f"Coalesced action {job_id} into {previous.job_id} for session {session_id[:8]}...")
+				return previous
+
+		job = ScheduledAction(
+			job_id=job_id,
+			session_id=session_id,
+			action=action,
+			priority=priority,
+			due_at=now + max(delay, 0.0),
+			seq=next(self._seq),
+			future=asyncio.get_running_loop().create_future(),
+		)
+		heapq.heappush(queue.heap, (job.sort_key, job))
+		queue.last = job
+		self._active[job.seq] = job
+		self._wakeup.set()
+		return job
+
+	def pending(self, session_id: str | None = None) -> list[ScheduledAction]:
+		"""Queued actions that haven't started, in the order they will run within each session."""
+		jobs = [job for job in self._active.values() if not job.started and session_id in (None, job.session_id)]
+		return sorted(jobs, key=lambda job: job.sort_key)
+
+	def session_ids(self) -> list[str]:
+		return list(self._sessions)
+
+	def session_wait_times(self, session_id: str) -> WaitTimeHistogram | None:
+		queue = self._sessions.get(session_id)
+		return queue.wait_times if queue else None
+
+	async def drain(self, session_id: str | None = None) -> list[ScheduledAction]:
+		"""
+		Process queued actions and wait for them.
+
+		Args:
+			session_id: Only wait for this session's actions. Other sessions' actions keep running.
+
+		Returns:
+			The actions in the order they completed, with their result or error set
+		"""
+		jobs = [job for job in self._active.values() if session_id in (None, job.session_id)]
+		if not jobs:
+			return []
+		if self._dispatcher is None or self._dispatcher.done():
+			from browser_use.utils import create_task_with_error_handling
+
+			self._dispatcher = create_task_with_error_handling(
+				self._dispatch(), name="presentation_action_scheduler", suppress_exceptions=True
+			)
+		return [await future for future in asyncio.as_completed([job.future for job in jobs])]
+
+	async def acquire(self, session_id: str | None = None) -> None:
+		"""Wait for rate limit tokens, for actions run outside this scheduler (e.g. by a BullMQ worker)."""
+		bucket = self._session(session_id).bucket if session_id else None
+		while True:
+			now = self.clock.now()
+			delay = max(
+				self.rate_limiter.delay(now) if self.rate_limiter else 0.0,
+				bucket.delay(now) if bucket else 0.0,
+			)
+			if delay <= 0:
+				for limiter in (self.rate_limiter, bucket):
+					if limiter:
+						limiter.take(now)
+				return
+			await self.clock.sleep(delay)
+
+	def discard_session(self, session_id: str) -> None:
+		"""Drop a session's queued actions; they complete with SessionClosedError. A running action finishes."""
+		queue = self._sessions.pop(session_id, None)
+		if queue is None:
+			return
+		for _, job in queue.heap:
+			self._finish(job, error=SessionClosedError(f"Session {session_id} was closed before the action ran"))
+		queue.heap.clear()
+		self._wakeup.set()
+
+	async def close(self) -> None:
+		"""Stop dispatching; queued and running actions complete with SessionClosedError."""
+		for session_id in list(self._sessions):
+			self.discard_session(session_id)
+		if self._dispatcher and not self._dispatcher.done():
+			self._dispatcher.cancel()
+			try:
+				await self._dispatcher
+			except asyncio.CancelledError:
+				pass
+		self._dispatcher = None
+		for job in list(self._active.values()):
+			self._finish(job, error=SessionClosedError("The scheduler was closed before the action completed"))
+
+	def _finish(self, job: ScheduledAction, result: Any = None, error: BaseException | None = None) -> None:
+		job.result = result
+		job.error = error
+		self._active.pop(job.seq, None)
+		if not job.future.done():
+			job.future.set_result(job)
+
+	def _next_job(self, now: float) -> tuple[ScheduledAction | None, float | None]:
+		"""
+		Pick the next action to start.
+
+		Returns:
+			(action, None) if one can start now, otherwise (None, seconds until one might,
+			or None if that depends on a running action finishing)
+		"""
+		best: tuple[float, _SessionQueue, ScheduledAction] | None = None
+		wait: float | None = None
+		for queue in self._sessions.values():
+			if queue.busy or not queue.heap:
+				continue
+			job = queue.heap[0][1]
+			delay = max(job.due_at - now, queue.bucket.delay(now) if queue.bucket else 0.0)
+			if delay > 0:
+				wait = delay if wait is None else min(wait, delay)
+				continue
+			# Start-time fair queuing: each action costs 1 / weight of virtual time
+			finish_tag = max(self._virtual_time, queue.finish_tag) + 1 / queue.weight
+			if best is None or (finish_tag, job.seq) < (best[0], best[2].seq):
+				best = (finish_tag, queue, job)
+
+		if best is None:
+			return None, wait
+		if self.rate_limiter:
+			delay = self.rate_limiter.delay(now)
+			if delay > 0:
+				return None, delay
+			self.rate_limiter.take(now)
+
+		finish_tag, queue, job = best
+		if queue.bucket:
+			queue.bucket.take(now)
+		heapq.heappop(queue.heap)
+		queue.busy = True
+		self._virtual_time = finish_tag - 1 / queue.weight
+		queue.finish_tag = finish_tag
+
+		wait_time = now - job.due_at
+		self.wait_times.observe(wait_time)
+		queue.wait_times.observe(wait_time)
+		return job, None
+
+	async def _dispatch(self) -> None:
+		running: set[asyncio.Task] = set()
+		try:
+			while self._active:
+				job, wait = self._next_job(self.clock.now())
+				if job is not None:
+					task = asyncio.create_task(self._run(job))
+					running.add(task)
+					task.add_done_callback(running.discard)
+					continue
+
+				self._wakeup.clear()
+				waiters = [asyncio.create_task(self._wakeup.wait())]
+				if wait is not None:
+					waiters.append(asyncio.create_task(self.clock.sleep(wait)))
+				try:
+					await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+				finally:
+					for waiter in waiters:
+						waiter.cancel()
+		finally:
+			for task in running:
+				task.cancel()
+
+	async def _run(self, job: ScheduledAction) -> None:
+		job.started = True
+		job.attempts += 1
+		queue = self._sessions.get(job.session_id)
+		try:
+			result = await self.processor(job)
+		except Exception as e:
+			retry_in = self.retry_delay(job) if self.retry_delay else None
+			if retry_in is None or queue is None or self._sessions.get(job.session_id) is not queue:
+				logger.error(f"Action {job.job_id} failed after {job.attempts} attempt(s): {e}")
+				self._finish(job, error=e)
+			else:
+				logger.debug(f"Retrying action {job.job_id} (attempt {job.attempts + 1}) in {retry_in:.2f}s: {e}")
+				job.due_at = self.clock.now() + retry_in
+				heapq.heappush(queue.heap, (job.sort_key, job))
+		else:
+			self._finish(job, result=result)
+		finally:
+			if queue is not None:
+				queue.busy = False
+			self._wakeup.set()
@@ -1,243 +1,495 @@
 """
 Session Persistence for Presentation Flow
 
-Provides MongoDB-based session persistence for presentation sessions.
-All collections use the 'brwsr_auto_svc_' prefix.
-Allows sessions to survive service restarts.
+Provides session persistence for presentation sessions in up to three tiers:
+
+- Local: an in-process LRU of session states. Saves land here first, so a
+  process always reads its own writes without a network round-trip.
+- MongoDB: the durable tier (all collections use the 'brwsr_auto_svc_' prefix).
+  Writes are write-behind: saves and deletes mark the session dirty, and a
+  background flusher writes the latest version of every dirty session in
+  `bulk_write` batches, so repeated saves of one session cost one write.
+  Expired documents are removed by a TTL index on `expires_at`.
+- Redis (optional): shared by every instance. Saves and deletes go to Redis
+  right away and local copies are re-read from it after `shared_refresh_seconds`,
+  so other instances see a change within that time.
+
+Local expiry runs on a timer wheel that evicts sessions as time passes, instead
+of checking the expiry on every read. Allows sessions to survive service restarts.
+
+While MongoDB is unavailable, pending writes are capped at `max_dirty_sessions`;
+beyond that the oldest pending writes are dropped with a warning.
+
+Usage:
+	store = get_session_store()  # created on app startup
+	await store.save_session(session_id, {'room_name': 'room', 'state': 'active'}, ttl=3600)
+	state = await store.load_session(session_id)
+	await close_session_store()  # on app shutdown, flushes pending writes to MongoDB
 """
 
+import asyncio
+import json
 import logging
+import math
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Any
 
+from browser_use.utils import create_task_with_error_handling
+from navigator.presentation.scheduler import Clock, MonotonicClock
 from navigator.storage.mongodb import get_collection
 
 logger = logging.getLogger(__name__)
 
+# Pending MongoDB delete in SessionStore._dirty
+_DELETED = None
+
+
+class TimerWheel:
+	"""
+	Buckets deadlines into ticks of `resolution` seconds.
+
+	Advancing the wheel returns the keys whose deadline has passed, looking only
+	at the buckets that came due since the last call. Rescheduling or cancelling a
+	key leaves its old bucket entry behind; it is skipped when that bucket comes due.
+	"""
+
+	def __init__(self, resolution: float = 1.0, now: float = 0.0):
+		self.resolution = resolution
+		self._slots: dict[int, set[str]] = {}
+		self._deadlines: dict[str, int] = {}
+		self._tick = math.floor(now / resolution)
+
+	def _to_tick(self, seconds: float) -> int:
+		return math.ceil(seconds / self.resolution)
+
+	def __len__(self) -> int:
+		return len(self._deadlines)
+
+	def schedule(self, key: str, deadline: float) -> None:
+		# A deadline in the current tick is due on the next advance
+		tick = max(self._to_tick(deadline), self._tick + 1)
+		self._deadlines[key] = tick
+		self._slots.setdefault(tick, set()).add(key)
+
+	def cancel(self, key: str) -> None:
+		self._deadlines.pop(key, None)
+
+	def advance(self, now: float) -> list[str]:
+		"""Move the wheel to `now` and return the keys that expired."""
+		tick = math.floor(now / self.resolution)
+		if tick <= self._tick:
+			return []
+		if tick - self._tick <= len(self._slots):
+			due_ticks = [t for t in range(self._tick + 1, tick + 1) if t in self._slots]
+		else:
+			# Long idle gap: cheaper to look at the occupied buckets
+			due_ticks = sorted(t for t in self._slots if t <= tick)
+		self._tick = tick
+
+		expired = []
+		for due in due_ticks:
+			for key in self._slots.pop(due):
+				if self._deadlines.get(key) == due:
+					del self._deadlines[key]
+					expired.append(key)
+		return expired
+
+
+class _LocalSession:
+	__slots__ = ('state', 'expires_at')
+
+	def __init__(self, state: dict[str, Any], expires_at: float):
+		self.state = state
+		self.expires_at = expires_at
+
 
 class SessionStore:
 	"""
-	Session persistence store using MongoDB.
-	
+	Session persistence store with a local LRU tier, write-behind MongoDB and optional Redis.
+
 	Provides save/load functionality for presentation session state.
 	Optional - can be used to persist sessions across service restarts.
+	Session states are kept by reference in the local tier, so don't modify a
+	state after saving it; save a new one instead.
 	"""
 
-	def __init__(self, use_mongodb: bool = True, default_ttl_hours: int = 6):
+	def __init__(
+		self,
+		use_mongodb: bool = True,
+		default_ttl_hours: int = 6,
+		redis_client: Any | None = None,
+		key_prefix: str = "browser:session:",
+		max_cached_sessions: int = 10000,
+		flush_interval: float = 1.0,
+		flush_batch_size: int = 500,
+		max_pending_writes: int = 5000,
+		max_dirty_sessions: int = 50000,
+		shared_refresh_seconds: float = 2.0,
+		mongodb_retry_seconds: float = 30.0,
+		clock: Clock | None = None,
+	):
 		"""
 		Initialize the session store.
-		
+
 		Args:
-			use_mongodb: Whether to use MongoDB (True by default, falls back to in-memory if unavailable)
+			use_mongodb: Whether to persist to MongoDB (True by default, sessions stay in memory while it is unavailable)
 			default_ttl_hours: Default time-to-live in hours (default: 6 hours)
+			redis_client: Optional Redis client (from redis.asyncio) shared with other instances
+			key_prefix: Prefix of the Redis keys holding sessions
+			max_cached_sessions: Size of the local LRU tier when MongoDB or Redis backs it
+			flush_interval: Seconds between write-behind flushes to MongoDB
+			flush_batch_size: Maximum number of writes per MongoDB bulk_write
+			max_pending_writes: Dirty sessions after which a save flushes before returning
+			max_dirty_sessions: Pending writes kept while MongoDB is unavailable; the oldest are dropped beyond it
+			shared_refresh_seconds: Seconds a local copy is served before re-reading it from Redis
+			mongodb_retry_seconds: Seconds to wait before trying MongoDB again after it was unavailable
+			clock: Time source for local expiry (defaults to the monotonic clock)
 		"""
 		self.use_mongodb = use_mongodb
 		self.default_ttl_hours = default_ttl_hours
-		self._in_memory_sessions: dict[str, dict[str, Any]] = {}
+		self.redis_client = redis_client
+		self.key_prefix = key_prefix
+		self.max_cached_sessions = max_cached_sessions
+		self.flush_interval = flush_interval
+		self.flush_batch_size = flush_batch_size
+		self.max_pending_writes = max_pending_writes
+		self.max_dirty_sessions = max(max_dirty_sessions, max_pending_writes)
+		self.dropped_writes = 0
+		self.shared_refresh_seconds = shared_refresh_seconds
+		self.mongodb_retry_seconds = mongodb_retry_seconds
+		self._clock = clock or MonotonicClock()
 
-		if use_mongodb:
-			logger.info("SessionStore initialized with MongoDB")
-		else:
-			logger.debug("SessionStore initialized with in-memory storage")
+		self._local: OrderedDict[str, _LocalSession] = OrderedDict()
+		self._wheel = TimerWheel(now=self._clock.now())
+		# session_id -> MongoDB document to upsert, or _DELETED
+		self._dirty: dict[str, dict[str, Any] | None] = {}
+		# Writes of the flush in progress, still readable until MongoDB has them
+		self._flushing: dict[str, dict[str, Any] | None] = {}
+		self._flush_lock = asyncio.Lock()
+		self._flusher: asyncio.Task | None = None
+		self._collection: Any | None = None
+		self._mongodb_retry_at: float | None = None
+
+		logger.info(
+			f"SessionStore initialized (mongodb: {'write-behind' if use_mongodb else 'disabled'}, "
+			f"redis: {'enabled' if redis_client is not None else 'disabled'})"
+		)
+
+	def _key(self, session_id: str) -> str:
+		return f"{self.key_prefix}{session_id}"
+
+	# Local tier
+
+	def _expire_local(self) -> None:
+		now = self._clock.now()
+		for session_id in self._wheel.advance(now):
+			entry = self._local.pop(session_id, None)
+			if entry is not None and entry.expires_at <= now and self._dirty.get(session_id) is not _DELETED:
+				# The session itself expired, not just the local copy: nothing left to persist
+				self._dirty.pop(session_id, None)
+
+	def _cache(self, session_id: str, session_state: dict[str, Any], ttl: float) -> None:
+		now = self._clock.now()
+		entry = _LocalSession(session_state, now + ttl)
+		evict_at = entry.expires_at
+		if self.redis_client is not None:
+			evict_at = min(evict_at, now + self.shared_refresh_seconds)
+		self._local[session_id] = entry
+		self._local.move_to_end(session_id)
+		self._wheel.schedule(session_id, evict_at)
+
+		# Without MongoDB or Redis behind it, the local tier is the only copy
+		if self.use_mongodb or self.redis_client is not None:
+			while len(self._local) > self.max_cached_sessions:
+				evicted, _ = self._local.popitem(last=False)
+				self._wheel.cancel(evicted)
+
+	def _uncache(self, session_id: str) -> None:
+		self._local.pop(session_id, None)
+		self._wheel.cancel(session_id)
+
+	# MongoDB tier
+
+	async def _get_collection(self) -> Any | None:
+		"""Sessions collection, or None while MongoDB is unavailable."""
+		if not self.use_mongodb:
+			return None
+		if self._collection is not None:
+			return self._collection
+		if self._mongodb_retry_at is not None and self._clock.now() < self._mongodb_retry_at:
+			return None
+
+		try:
+			collection = await get_collection('sessions')
+			if collection is not None:
+				await collection.create_index('session_id', unique=True)
+				await collection.create_index('expires_at', expireAfterSeconds=0)
+		except Exception as e:
+			logger.warning(f"MongoDB unavailable for sessions, keeping them in memory: {e}")
+			collection = None
+
+		if collection is None:
+			self._mongodb_retry_at = self._clock.now() + self.mongodb_retry_seconds
+			return None
+		self._collection = collection
+		self._mongodb_retry_at = None
+		return collection
+
+	def _mark_dirty(self, session_id: str, document: dict[str, Any] | None) -> None:
+		self._dirty.pop(session_id, None)
+		self._dirty[session_id] = document
+		if self._flusher is None or self._flusher.done():
+			self._flusher = create_task_with_error_handling(
+				self._flush_periodically(), name='session_store_flush', suppress_exceptions=True
+			)
+
+	def _drop_oldest_dirty(self) -> None:
+		"""Keep at most max_dirty_sessions pending writes (only reached while MongoDB can't take them)."""
+		overflow = len(self._dirty) - self.max_dirty_sessions
+		if overflow <= 0:
+			return
+		for session_id in list(self._dirty)[:overflow]:
+			del self._dirty[session_id]
+		self.dropped_writes += overflow
+		logger.warning(
+			f"MongoDB unavailable with {self.max_dirty_sessions} pending session writes, dropped the {overflow} oldest "
+			f"({self.dropped_writes} dropped in total)"
+		)
+
+	async def _flush_periodically(self) -> None:
+		while self._dirty:
+			await self._clock.sleep(self.flush_interval)
+			await self.flush()
+			if self._dirty and self._collection is None:
+				# MongoDB is down: don't spin until it is worth trying again
+				await self._clock.sleep(self.mongodb_retry_seconds)
+
+	async def flush(self) -> int:
+		"""
+		Write every dirty session to MongoDB.
+
+		Returns:
+			Number of sessions written (0 if MongoDB is unavailable; they stay dirty)
+		"""
+		async with self._flush_lock:
+			collection = await self._get_collection()
+			if collection is None or not self._dirty:
+				return 0
+
+			from pymongo import DeleteOne, UpdateOne
+
+			self._flushing, self._dirty = self._dirty, {}
+			items = list(self._flushing.items())
+			written = 0
+			for start in range(0, len(items), self.flush_batch_size):
+				batch = items[start : start + self.flush_batch_size]
+				operations = [
+					DeleteOne({'session_id': session_id})
+					if document is _DELETED
+					else UpdateOne({'session_id': session_id}, {'$set': document}, upsert=True)
+					for session_id, document in batch
+				]
+				try:
+					await collection.bulk_write(operations, ordered=False)
+					written += len(batch)
+				except Exception as e:
+					logger.error(f"Error flushing {len(items) - written} sessions to MongoDB: {e}", exc_info=True)
+					# Put back what wasn't written, unless a newer write replaced it meanwhile
+					for session_id, document in items[start:]:
+						self._dirty.setdefault(session_id, document)
+					break
+			self._flushing = {}
+
+			logger.debug(f"Flushed {written} sessions to MongoDB")
+			return written
+
+	# Redis tier
+
+	async def _redis_call(self, method: str, *args: Any) -> Any:
+		try:
+			return await getattr(self.redis_client, method)(*args)
+		except Exception as e:
+			logger.error(f"Redis {method} failed for session store: {e}", exc_info=True)
+			return None
 
 	async def save_session(self, session_id: str, session_state: dict[str, Any], ttl: int = 21600) -> None:
 		"""
-		Save session state to MongoDB.
-		
+		Save session state. Reads in this process see it immediately.
+
 		Args:
 			session_id: Session ID
 			session_state: Session state dictionary
 			ttl: Time-to-live in seconds (default: 21600 = 6 hours)
 		"""
-		expires_at = datetime.utcnow() + timedelta(seconds=ttl)
+		self._expire_local()
+		self._cache(session_id, session_state, ttl)
 
-		session_document = {
-			'session_id': session_id,
-			'session_state': session_state,
-			'expires_at': expires_at,
-			'updated_at': datetime.utcnow(),
-		}
+		if self.redis_client is not None:
+			await self._redis_call('setex', self._key(session_id), ttl, json.dumps(session_state))
 
 		if self.use_mongodb:
-			try:
-				collection = await get_collection('sessions')
-				if collection is None:
-					# Fallback to in-memory
-					self._in_memory_sessions[session_id] = {
-						'session_state': session_state,
-						'expires_at': expires_at,
-					}
-					logger.debug(f"Saved session {session_id[:8]}... to in-memory (MongoDB unavailable) (TTL: {ttl}s)")
-					return
-
-				# Upsert by session_id
-				await collection.update_one(
-					{'session_id': session_id},
-					{'$set': session_document},
-					upsert=True
-				)
-				logger.debug(f"Saved session {session_id[:8]}... to MongoDB (TTL: {ttl}s)")
-			except Exception as e:
-				logger.error(f"Error saving session {session_id[:8]}... to MongoDB: {e}", exc_info=True)
-				# Fallback to in-memory
-				self._in_memory_sessions[session_id] = {
+			now = datetime.utcnow()
+			self._mark_dirty(
+				session_id,
+				{
+					'session_id': session_id,
 					'session_state': session_state,
-					'expires_at': expires_at,
-				}
-				logger.debug(f"Saved session {session_id[:8]}... to in-memory (fallback)")
-		else:
-			self._in_memory_sessions[session_id] = {
-				'session_state': session_state,
-				'expires_at': expires_at,
-			}
-			logger.debug(f"Saved session {session_id[:8]}... to in-memory (TTL: {ttl}s)")
+					'expires_at': now + timedelta(seconds=ttl),
+					'updated_at': now,
+				},
+			)
+			if len(self._dirty) >= self.max_pending_writes:
+				await self.flush()
+				self._drop_oldest_dirty()
+		logger.debug(f"Saved session {session_id[:8]}... (TTL: {ttl}s)")
 
 	async def load_session(self, session_id: str) -> dict[str, Any] | None:
 		"""
-		Load session state from MongoDB.
-		
+		Load session state from the nearest tier that has it.
+
 		Args:
 			session_id: Session ID
-		
+
 		Returns:
 			Session state dictionary or None if not found or expired
 		"""
-		if self.use_mongodb:
-			try:
-				collection = await get_collection('sessions')
-				if collection is None:
-					# Fallback to in-memory
-					return self._load_from_memory(session_id)
-
-				doc = await collection.find_one({'session_id': session_id})
-				if doc is None:
-					logger.debug(f"Session {session_id[:8]}... not found in MongoDB")
-					return None
-
-				# Check expiration
-				expires_at = doc.get('expires_at')
-				if expires_at and expires_at < datetime.utcnow():
-					logger.debug(f"Session {session_id[:8]}... expired")
-					await self.delete_session(session_id)
-					return None
-
-				session_state = doc.get('session_state', {})
-				logger.debug(f"Loaded session {session_id[:8]}... from MongoDB")
+		self._expire_local()
+		entry = self._local.get(session_id)
+		if entry is not None:
+			self._local.move_to_end(session_id)
+			return entry.state
+
+		if self.redis_client is not None:
+			raw = await self._redis_call('get', self._key(session_id))
+			if raw is not None:
+				session_state = json.loads(raw)
+				# Redis holds the remaining TTL; the local copy only lives until the next refresh
+				self._cache(session_id, session_state, self.shared_refresh_seconds)
+				logger.debug(f"Loaded session {session_id[:8]}... from Redis")
 				return session_state
-			except Exception as e:
-				logger.error(f"Error loading session {session_id[:8]}... from MongoDB: {e}", exc_info=True)
-				# Fallback to in-memory
-				return self._load_from_memory(session_id)
-		else:
-			return self._load_from_memory(session_id)
 
-	def _load_from_memory(self, session_id: str) -> dict[str, Any] | None:
-		"""Load session from in-memory storage."""
-		session_data = self._in_memory_sessions.get(session_id)
-		if session_data is None:
-			logger.debug(f"Session {session_id[:8]}... not found in in-memory storage")
-			return None
+		for pending in (self._dirty, self._flushing):
+			if session_id in pending:
+				# Written by this process but not in MongoDB yet
+				document = pending[session_id]
+				return None if document is _DELETED else document['session_state']
 
-		# Check expiration
-		expires_at = session_data.get('expires_at')
-		if expires_at and expires_at < datetime.utcnow():
-			logger.debug(f"Session {session_id[:8]}... expired")
-			self._in_memory_sessions.pop(session_id, None)
+		collection = await self._get_collection()
+		if collection is None:
+			return None
+		try:
+			now = datetime.utcnow()
+			# The TTL monitor runs about once a minute, so filter out documents it hasn't removed yet
+			doc = await collection.find_one(
+				{'session_id': session_id, 'expires_at': {'$gt': now}},
+				{'_id': 0, 'session_state': 1, 'expires_at': 1},
+			)
+		except Exception as e:
+			logger.error(f"Error loading session {session_id[:8]}... from MongoDB: {e}", exc_info=True)
+			return None
+		if doc is None:
+			logger.debug(f"Session {session_id[:8]}... not found")
 			return None
 
-		return session_data.get('session_state')
+		session_state = doc.get('session_state', {})
+		self._cache(session_id, session_state, (doc['expires_at'] - now).total_seconds())
+		logger.debug(f"Loaded session {session_id[:8]}... from MongoDB")
+		return session_state
 
 	async def delete_session(self, session_id: str) -> None:
 		"""
-		Delete session from MongoDB.
-		
+		Delete session from every tier.
+
 		Args:
 			session_id: Session ID
 		"""
+		self._expire_local()
+		self._uncache(session_id)
+		if self.redis_client is not None:
+			await self._redis_call('delete', self._key(session_id))
 		if self.use_mongodb:
-			try:
-				collection = await get_collection('sessions')
-				if collection:
-					await collection.delete_one({'session_id': session_id})
-					logger.debug(f"Deleted session {session_id[:8]}... from MongoDB")
-			except Exception as e:
-				logger.error(f"Error deleting session {session_id[:8]}... from MongoDB: {e}", exc_info=True)
-
-		# Also delete from in-memory
-		self._in_memory_sessions.pop(session_id, None)
-		logger.debug(f"Deleted session {session_id[:8]}... from in-memory")
+			self._mark_dirty(session_id, _DELETED)
+		logger.debug(f"Deleted session {session_id[:8]}...")
 
 	async def list_sessions(self) -> list[str]:
 		"""
 		List all active session IDs.
-		
+
 		Returns:
 			List of session IDs
 		"""
-		if self.use_mongodb:
-			try:
-				collection = await get_collection('sessions')
-				if collection is None:
-					# Fallback to in-memory
-					return self._list_from_memory()
-
-				# Get all non-expired sessions
-				now = datetime.utcnow()
-				cursor = collection.find({
-					'expires_at': {'$gt': now}
-				})
-
-				session_ids = []
-				async for doc in cursor:
-					session_ids.append(doc.get('session_id'))
-
-				logger.debug(f"Found {len(session_ids)} active sessions in MongoDB")
-				return session_ids
-			except Exception as e:
-				logger.error(f"Error listing sessions from MongoDB: {e}", exc_info=True)
-				# Fallback to in-memory
-				return self._list_from_memory()
+		self._expire_local()
+		session_ids: set[str] = set()
+		if self.redis_client is not None:
+			keys = await self._redis_call('keys', f"{self.key_prefix}*") or []
+			for key in keys:
+				if isinstance(key, bytes):
+					key = key.decode('utf-8')
+				session_ids.add(key[len(self.key_prefix) :])
 		else:
-			return self._list_from_memory()
-
-	def _list_from_memory(self) -> list[str]:
-		"""List sessions from in-memory storage."""
-		now = datetime.utcnow()
-		session_ids = [
-			session_id for session_id, session_data in self._in_memory_sessions.items()
-			if session_data.get('expires_at', datetime.max) > now
-		]
-		logger.debug(f"Found {len(session_ids)} active sessions in in-memory storage")
-		return session_ids
+			collection = await self._get_collection()
+			if collection is not None:
+				try:
+					# Served from the expires_at TTL index
+					cursor = collection.find({'expires_at': {'$gt': datetime.utcnow()}}, {'_id': 0, 'session_id': 1})
+					async for doc in cursor:
+						session_ids.add(doc['session_id'])
+				except Exception as e:
+					logger.error(f"Error listing sessions from MongoDB: {e}", exc_info=True)
+
+		if self.redis_client is None:
+			session_ids.update(self._local)
+		for session_id, document in self._dirty.items():
+			if document is _DELETED:
+				session_ids.discard(session_id)
+			else:
+				session_ids.add(session_id)
+		logger.debug(f"Found {len(session_ids)} active sessions")
+		return list(session_ids)
 
 	async def cleanup_expired_sessions(self) -> int:
 		"""
-		Clean up expired sessions from MongoDB.
-		
+		Evict expired sessions from the local tier.
+
+		MongoDB removes expired documents itself through the TTL index on `expires_at`,
+		and Redis through key expiry.
+
 		Returns:
-			Number of sessions deleted
+			Number of sessions evicted
 		"""
-		if self.use_mongodb:
+		before = len(self._local)
+		self._expire_local()
+		return before - len(self._local)
+
+	async def close(self) -> None:
+		"""Stop the background flusher and write pending sessions to MongoDB."""
+		if self._flusher is not None and not self._flusher.done():
+			self._flusher.cancel()
 			try:
-				collection = await get_collection('sessions')
-				if collection:
-					now = datetime.utcnow()
-					result = await collection.delete_many({
-						'expires_at': {'$lt': now}
-					})
-					deleted_count = result.deleted_count
-					logger.debug(f"Cleaned up {deleted_count} expired sessions from MongoDB")
-					return deleted_count
-			except Exception as e:
-				logger.error(f"Error cleaning up expired sessions: {e}", exc_info=True)
-
-		# Also clean up in-memory
-		now = datetime.utcnow()
-		expired_ids = [
-			session_id for session_id, session_data in self._in_memory_sessions.items()
-			if session_data.get('expires_at', datetime.max) <= now
-		]
-		for session_id in expired_ids:
-			self._in_memory_sessions.pop(session_id, None)
-
-		return len(expired_ids)
+				await self._flusher
+			except asyncio.CancelledError:
+				pass
+		self._flusher = None
+		await self.flush()
+
+
+_session_store: SessionStore | None = None
+
+
+def get_session_store() -> SessionStore:
+	"""Get the process-wide session store (created on first use, normally at app startup)."""
+	global _session_store
+
+	if _session_store is None:
+		_session_store = SessionStore()
+	return _session_store
+
+
+async def close_session_store() -> None:
+	"""Flush pending session writes and drop the process-wide store (app shutdown)."""
+	global _session_store
+
+	if _session_store is not None:
+		store, _session_store = _session_store, None
+		await store.close()
@@ -199,13 +199,23 @@ if __name__ == '__main__':
 	@asynccontextmanager
 	async def lifespan(app: FastAPI):
 		"""Lifespan context manager for startup and shutdown."""
-		# Startup - start Temporal worker
+		from navigator.presentation.session_store import close_session_store, get_session_store
+
+		# Startup - create the shared session store and start Temporal worker
+		get_session_store()
 		await start_temporal_worker()
 
 		yield  # Server is running
 
-		# Shutdown - stop Temporal worker
+		# Shutdown - stop Temporal worker, then write pending sessions to MongoDB
 		await stop_temporal_worker()
+		try:
+			await asyncio.wait_for(close_session_store(), timeout=10.0)
+			logger.info('✅ Session store flushed')
+		except asyncio.TimeoutError:
+			logger.warning('⚠️  Session store flush timed out, pending sessions were not persisted')
+		except Exception as e:
+			logger.error(f'❌ Error flushing session store: {e}', exc_info=True)
 
 	# Get app and inject lifespan
 	from navigator.server.websocket import create_app_with_lifespan
@@ -1,7 +1,8 @@
 """
 Storage utilities for Browser Automation Service.
 
-Provides MongoDB-based persistence with standardized collection naming.
+Provides MongoDB-based persistence with standardized collection naming,
+pooled connections and a read-through entity cache.
 Also provides ArangoDB graph database support for knowledge graph storage.
 """
 
@@ -16,11 +17,15 @@ from navigator.storage.arangodb import (
 	get_arangodb_database_name,
 	get_arangodb_url,
 )
+from navigator.storage.entity_cache import find_entities, find_entity
 from navigator.storage.mongodb import (
 	COLLECTION_PREFIX,
+	MongoDBSettings,
 	close_mongodb_connection,
 	get_collection,
+	get_collection_metrics,
 	get_collection_name,
+	get_entity_cache,
 	get_mongodb_client,
 	get_mongodb_database,
 	get_mongodb_database_name,
@@ -30,12 +35,17 @@ from navigator.storage.mongodb import (
 __all__ = [
 	# MongoDB
 	'COLLECTION_PREFIX',
+	'MongoDBSettings',
 	'get_collection_name',
 	'get_mongodb_url',
 	'get_mongodb_database_name',
 	'get_mongodb_client',
 	'get_mongodb_database',
 	'get_collection',
+	'get_collection_metrics',
+	'get_entity_cache',
+	'find_entity',
+	'find_entities',
 	'close_mongodb_connection',
 	# ArangoDB
 	'get_arangodb_url',
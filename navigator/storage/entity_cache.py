@@ -0,0 +1,351 @@
+"""
+Read-through entity cache and per-collection metrics for MongoDB.
+
+Collections returned by navigator.storage.mongodb.get_collection are wrapped in
+a CachedCollection, which times every operation and invalidates cached entities
+when it writes:
+
+- writes filtered by the entity id (or a {'$in': [...]} of ids) drop those entities
+- writes filtered by _id drop the entity with that _id
+- any other write (update_many, delete_many, bulk_write, ...) drops the collection
+
+Entities are cached per (collection, entity id) for a bounded time, since other
+processes write too. With change streams enabled (MONGODB_ENTITY_CACHE_CHANGE_STREAMS,
+needs a replica set) their writes invalidate entries as they happen.
+
+Usage:
+	from navigator.storage.entity_cache import find_entities, find_entity
+
+	collection = await get_collection('knowledge_screens')
+	doc = await find_entity(collection, "screen_id", screen_id)
+	docs = await find_entities(collection, "screen_id", screen_ids)  # {screen_id: doc}
+"""
+
+import asyncio
+import copy
+import logging
+import time
+from collections import OrderedDict, deque
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Ids per $in query when loading a batch of entities
+_BATCH_SIZE = 500
+
+
+class CollectionMetrics:
+	"""Operation latency of one collection."""
+
+	def __init__(self, samples: int = 1024):
+		self.operations = 0
+		self.errors = 0
+		self.total_seconds = 0.0
+		self.max_seconds = 0.0
+		self._samples: deque[float] = deque(maxlen=samples)
+
+	def record(self, seconds: float, error: bool = False) -> None:
+		self.operations += 1
+		self.errors += error
+		self.total_seconds += seconds
+		self.max_seconds = max(self.max_seconds, seconds)
+		self._samples.append(seconds)
+
+	def snapshot(self) -> dict[str, Any]:
+		samples = sorted(self._samples)
+		p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))] if samples else 0.0
+		return {
+			"operations": self.operations,
+			"errors": self.errors,
+			"mean_ms": self.total_seconds / self.operations * 1000 if self.operations else 0.0,
+			"p95_ms": p95 * 1000,
+			"max_ms": self.max_seconds * 1000,
+		}
+
+
+@dataclass(slots=True)
+class _Entry:
+	doc: dict[str, Any]
+	expires_at: float
+	epoch: int
+
+
+class EntityCache:
+	"""
+	LRU of entity documents keyed by (collection, entity id), with a TTL.
+
+	Each collection has a write generation, bumped by every invalidation: a read
+	that started before a write doesn't store what it read once the write is done.
+	Dropping a whole collection bumps its epoch, which outdates its entries at once.
+	"""
+
+	def __init__(self, max_entries: int = 10000, ttl_seconds: float = 60.0, clock: Callable[[], float] = time.monotonic):
+		"""
+		Initialize the cache.
+
+		Args:
+			max_entries: Most entities kept (least recently used are evicted)
+			ttl_seconds: How long an entity is served without reading MongoDB (0 disables caching)
+			clock: Monotonic time source
+		"""
+		self.max_entries = max_entries
+		self.ttl_seconds = ttl_seconds
+		self.clock = clock
+		self.id_fields: dict[str, str] = {}
+		self._entries: OrderedDict[tuple[str, Any], _Entry] = OrderedDict()
+		self._object_ids: dict[tuple[str, Any], Any] = {}
+		self._generations: dict[str, int] = {}
+		self._epochs: dict[str, int] = {}
+		self.hits = 0
+		self.misses = 0
+		self.invalidations = 0
+
+	@property
+	def enabled(self) -> bool:
+		return self.ttl_seconds > 0 and self.max_entries > 0
+
+	def generation(self, collection: str) -> int:
+		return self._generations.get(collection, 0)
+
+	def get(self, collection: str, entity_id: Any) -> dict[str, Any] | None:
+		"""Copy of a cached entity, or None if it isn't cached (or expired)."""
+		key = (collection, entity_id)
+		entry = self._entries.get(key)
+		if entry is None or entry.epoch != self._epochs.get(collection, 0) or entry.expires_at <= self.clock():
+			if entry is not None:
+				self._drop(key)
+			self.misses += 1
+			return None
+		self._entries.move_to_end(key)
+		self.hits += 1
+		# Callers modify what they get (e.g. pop '_id')
+		return copy.deepcopy(entry.doc)
+
+	def put(self, collection: str, entity_id: Any, doc: dict[str, Any], generation: int) -> None:
+		"""Cache an entity read when the collection was at `generation`."""
+		if not self.enabled or generation != self.generation(collection):
+			return
+		key = (collection, entity_id)
+		self._drop(key)
+		self._entries[key] = _Entry(copy.deepcopy(doc), self.clock() + self.ttl_seconds, self._epochs.get(collection, 0))
+		if "_id" in doc:
+			self._object_ids[(collection, doc["_id"])] = entity_id
+		while len(self._entries) > self.max_entries:
+			self._drop(next(iter(self._entries)))
+
+	def _drop(self, key: tuple[str, Any]) -> None:
+		entry = self._entries.pop(key, None)
+		if entry is not None and "_id" in entry.doc:
+			self._object_ids.pop((key[0], entry.doc["_id"]), None)
+
+	def invalidate(self, collection: str, entity_ids: Iterable[Any] | None = None) -> None:
+		"""Drop some entities of a collection, or all of them when entity_ids is None."""
+		self._generations[collection] = self.generation(collection) + 1
+		self.invalidations += 1
+		if entity_ids is None:
+			self._epochs[collection] = self._epochs.get(collection, 0) + 1
+			return
+		for entity_id in entity_ids:
+			self._drop((collection, entity_id))
+
+	def invalidate_object_id(self, collection: str, object_id: Any) -> None:
+		"""Drop the entity whose document has this _id."""
+		entity_id = self._object_ids.get((collection, object_id))
+		self.invalidate(collection, [] if entity_id is None else [entity_id])
+
+	def clear(self) -> None:
+		self._entries.clear()
+		self._object_ids.clear()
+		for collection in list(self._generations):
+			self._generations[collection] += 1
+
+	def stats(self) -> dict[str, Any]:
+		lookups = self.hits + self.misses
+		return {
+			"entries": len(self._entries),
+			"hits": self.hits,
+			"misses": self.misses,
+			"hit_rate": self.hits / lookups if lookups else 0.0,
+			"invalidations": self.invalidations,
+		}
+
+
+class CachedCollection:
+	"""
+	Motor collection handle that times operations and invalidates cached entities on writes.
+
+	Everything else is passed through to the wrapped collection.
+	"""
+
+	_WRITES = frozenset({
+		"update_one", "update_many", "replace_one", "delete_one", "delete_many",
+		"find_one_and_update", "find_one_and_replace", "find_one_and_delete", "bulk_write",
+	})
+	_TIMED = frozenset({
+		"find_one", "insert_one", "insert_many", "count_documents", "estimated_document_count", "distinct", "create_index",
+	})
+
+	def __init__(self, collection: Any, name: str, cache: EntityCache, metrics: CollectionMetrics, change_streams: bool = False):
+		self.collection = collection
+		self.name = name
+		self.cache = cache
+		self.metrics = metrics
+		self.change_streams = change_streams
+		self._watch_task: asyncio.Task | None = None
+		self._watch_retry_at = 0.0
+
+	def __getattr__(self, attr: str) -> Any:
+		value = getattr(self.collection, attr)
+		if attr in CachedCollection._WRITES:
+			return self._wrap(value, attr)
+		if attr in CachedCollection._TIMED:
+			return self._wrap(value, None)
+		return value
+
+	def _wrap(self, method: Callable, write: str | None) -> Callable:
+		async def call(*args, **kwargs):
+			start = time.perf_counter()
+			error = False
+			try:
+				return await method(*args, **kwargs)
+			except BaseException:
+				error = True
+				raise
+			finally:
+				self.metrics.record(time.perf_counter() - start, error)
+				# Also after a failed write, which may have been applied
+				if write is not None:
+					self._invalidate_for(write, args[0] if args else kwargs.get("filter"))
+
+		return call
+
+	def _invalidate_for(self, method: str, filter: Any) -> None:
+		id_field = self.cache.id_fields.get(self.name)
+		if method != "bulk_write" and isinstance(filter, dict):
+			value = filter.get(id_field) if id_field else None
+			if isinstance(value, str):
+				self.cache.invalidate(self.name, [value])
+				return
+			if isinstance(value, dict) and set(value) == {"$in"}:
+				self.cache.invalidate(self.name, value["$in"])
+				return
+			if "_id" in filter and not isinstance(filter["_id"], dict):
+				self.cache.invalidate_object_id(self.name, filter["_id"])
+				return
+		self.cache.invalidate(self.name)
+
+	async def find_entity(self, id_field: str, entity_id: Any) -> dict[str, Any] | None:
+		"""Read-through lookup of one entity by its id field."""
+		docs = await self.find_entities(id_field, [entity_id])
+		return docs.get(entity_id)
+
+	async def find_entities(self, id_field: str, entity_ids: Iterable[Any]) -> dict[str, Any]:
+		"""Read-through lookup of entities by their id field, loading the missing ones in batches."""
+		self.cache.id_fields.setdefault(self.name, id_field)
+		self._ensure_watching()
+		found: dict[Any, dict[str, Any]] = {}
+		missing: list[Any] = []
+		for entity_id in dict.fromkeys(entity_ids):
+			doc = self.cache.get(self.name, entity_id)
+			if doc is None:
+				missing.append(entity_id)
+			else:
+				found[entity_id] = doc
+
+		for i in range(0, len(missing), _BATCH_SIZE):
+			batch = missing[i:i + _BATCH_SIZE]
+			generation = self.cache.generation(self.name)
+			start = time.perf_counter()
+			error = False
+			try:
+				if len(batch) == 1:
+					doc = await self.collection.find_one({id_field: batch[0]})
+					docs = [doc] if doc is not None else []
+				else:
+					docs = await self.collection.find({id_field: {"$in": batch}}).to_list(length=None)
+			except BaseException:
+				error = True
+				raise
+			finally:
+				self.metrics.record(time.perf_counter() - start, error)
+			for doc in docs:
+				entity_id = doc.get(id_field)
+				self.cache.put(self.name, entity_id, doc, generation)
+				found[entity_id] = doc
+		return found
+
+	def _ensure_watching(self) -> None:
+		if not self.change_streams or not self.cache.enabled:
+			return
+		if self._watch_task is not None and not self._watch_task.done():
+			return
+		if time.monotonic() < self._watch_retry_at:
+			return
+		self._watch_retry_at = time.monotonic() + 30.0
+		self._watch_task = asyncio.create_task(self._watch(), name=f"entity_cache_watch_{self.name}")
+
+	async def _watch(self) -> None:
+		"""Invalidate entities changed by any process, as reported by the collection's change stream."""
+		try:
+			async with self.collection.watch() as stream:
+				# Writes made before the stream opened might have been missed
+				self.cache.invalidate(self.name)
+				async for change in stream:
+					operation = change.get("operationType")
+					if operation in ("update", "replace", "delete"):
+						self.cache.invalidate_object_id(self.name, change["documentKey"]["_id"])
+					elif operation in ("drop", "rename", "dropDatabase", "invalidate"):
+						self.cache.invalidate(self.name)
+		except asyncio.CancelledError:
+			raise
+		except Exception as e:
+			logger.warning(f"Change stream on {self.name} stopped, entity cache falls back to its TTL: {e}")
+		# Changes may have been missed while the stream was down
+		self.cache.invalidate(self.name)
+
+	async def close(self) -> None:
+		if self._watch_task is not None:
+			self._watch_task.cancel()
+			await asyncio.gather(self._watch_task, return_exceptions=True)
+			self._watch_task = None
+
+
+async def find_entity(collection: Any, id_field: str, entity_id: Any) -> dict[str, Any] | None:
+	"""
+	Get one document by its entity id, through the entity cache when the collection has one.
+
+	Args:
+		collection: Collection from get_collection (any motor-like collection works, uncached)
+		id_field: Field holding the entity id (e.g. 'screen_id')
+		entity_id: Entity id to look up
+
+	Returns:
+		The document (a copy, safe to modify), or None if not found
+	"""
+	if isinstance(collection, CachedCollection):
+		return await collection.find_entity(id_field, entity_id)
+	return await collection.find_one({id_field: entity_id})
+
+
+async def find_entities(collection: Any, id_field: str, entity_ids: Iterable[Any]) -> dict[Any, dict[str, Any]]:
+	"""
+	Get documents by entity id in as few queries as possible.
+
+	Args:
+		collection: Collection from get_collection (any motor-like collection works, uncached)
+		id_field: Field holding the entity id (e.g. 'screen_id')
+		entity_ids: Entity ids to look up (duplicates are fine)
+
+	Returns:
+		Dict of entity id to document for the ids that were found
+	"""
+	if isinstance(collection, CachedCollection):
+		return await collection.find_entities(id_field, entity_ids)
+	ids = list(dict.fromkeys(entity_ids))
+	found = {}
+	for i in range(0, len(ids), _BATCH_SIZE):
+		async for doc in collection.find({id_field: {"$in": ids[i:i + _BATCH_SIZE]}}):
+			found[doc.get(id_field)] = doc
+	return found
@@ -3,19 +3,32 @@ MongoDB Storage Utility for Browser Automation Service
 
 Provides centralized MongoDB connection and collection naming with standardized prefix.
 All collections must use the 'brwsr_auto_svc_' prefix for namespace safety.
+
+The client's connection pool and timeouts come from MongoDBSettings (environment
+variables). Collection handles are created once and wrapped in a CachedCollection
+(see navigator/storage/entity_cache.py), which records per-collection latency and
+keeps the read-through entity cache consistent with the writes made through it.
 """
 
 import asyncio
 import logging
 import os
+from dataclasses import dataclass
 from typing import Any
 
+from navigator.storage.entity_cache import CachedCollection, CollectionMetrics, EntityCache
+
 logger = logging.getLogger(__name__)
 
 # MongoDB connection
 _mongodb_client: Any | None = None
 _mongodb_db: Any | None = None
 
+# Collection handles by the name they were requested with
+_collections: dict[str, CachedCollection] = {}
+_collection_metrics: dict[str, CollectionMetrics] = {}
+_entity_cache: EntityCache | None = None
+
 # Collection name prefix - REQUIRED for all collections
 COLLECTION_PREFIX = "brwsr_auto_svc_"
 
@@ -44,6 +57,49 @@ def get_collection_name(base_name: str) -> str:
 	return f"{COLLECTION_PREFIX}{base_name}"
 
 
+@dataclass
+class MongoDBSettings:
+	"""
+	Connection pool, timeout and entity cache settings.
+	
+	Read from MONGODB_MAX_POOL_SIZE, MONGODB_MIN_POOL_SIZE, MONGODB_MAX_IDLE_TIME_MS,
+	MONGODB_WAIT_QUEUE_TIMEOUT_MS, MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+	MONGODB_CONNECT_TIMEOUT_MS, MONGODB_SOCKET_TIMEOUT_MS, MONGODB_ENTITY_CACHE_SIZE,
+	MONGODB_ENTITY_CACHE_TTL_SECONDS and MONGODB_ENTITY_CACHE_CHANGE_STREAMS.
+	"""
+	max_pool_size: int = 100
+	min_pool_size: int = 0
+	max_idle_time_ms: int = 300000  # Idle connections are closed after 5 minutes
+	wait_queue_timeout_ms: int = 5000  # How long an operation waits for a free pooled connection
+	server_selection_timeout_ms: int = 5000  # Default 30s is too long
+	connect_timeout_ms: int = 5000
+	socket_timeout_ms: int = 10000
+	entity_cache_size: int = 10000
+	entity_cache_ttl_seconds: float = 30.0  # Bounds staleness from other processes; 0 disables the entity cache
+	change_streams: bool = False  # Needs a replica set
+
+	@classmethod
+	def from_env(cls) -> "MongoDBSettings":
+		defaults = cls()
+
+		def number(name: str, default: float) -> Any:
+			value = os.getenv(name)
+			return type(default)(value) if value else default
+
+		return cls(
+			max_pool_size=number("MONGODB_MAX_POOL_SIZE", defaults.max_pool_size),
+			min_pool_size=number("MONGODB_MIN_POOL_SIZE", defaults.min_pool_size),
+			max_idle_time_ms=number("MONGODB_MAX_IDLE_TIME_MS", defaults.max_idle_time_ms),
+			wait_queue_timeout_ms=number("MONGODB_WAIT_QUEUE_TIMEOUT_MS", defaults.wait_queue_timeout_ms),
+			server_selection_timeout_ms=number("MONGODB_SERVER_SELECTION_TIMEOUT_MS", defaults.server_selection_timeout_ms),
+			connect_timeout_ms=number("MONGODB_CONNECT_TIMEOUT_MS", defaults.connect_timeout_ms),
+			socket_timeout_ms=number("MONGODB_SOCKET_TIMEOUT_MS", defaults.socket_timeout_ms),
+			entity_cache_size=number("MONGODB_ENTITY_CACHE_SIZE", defaults.entity_cache_size),
+			entity_cache_ttl_seconds=number("MONGODB_ENTITY_CACHE_TTL_SECONDS", defaults.entity_cache_ttl_seconds),
+			change_streams=os.getenv("MONGODB_ENTITY_CACHE_CHANGE_STREAMS", "false").lower() in ("true", "1", "yes", "on"),
+		)
+
+
 def get_mongodb_url() -> str:
 	"""
 	Get MongoDB connection URL from environment variable.
@@ -118,16 +174,18 @@ async def get_mongodb_client():
 			from motor.motor_asyncio import AsyncIOMotorClient
 
 			mongodb_url = get_mongodb_url()
+			settings = MongoDBSettings.from_env()
 
-			# Configure connection with reasonable timeouts
-			# serverSelectionTimeoutMS: How long to wait for server selection (default 30s is too long)
-			# connectTimeoutMS: How long to wait for initial connection (default 20s)
-			# socketTimeoutMS: How long to wait for socket operations (default 20s)
+			# One pooled client per process, sized and bounded explicitly
 			_mongodb_client = AsyncIOMotorClient(
 				mongodb_url,
-				serverSelectionTimeoutMS=5000,  # 5 seconds for server selection
-				connectTimeoutMS=5000,  # 5 seconds for initial connection
-				socketTimeoutMS=10000,  # 10 seconds for socket operations
+				maxPoolSize=settings.max_pool_size,
+				minPoolSize=settings.min_pool_size,
+				maxIdleTimeMS=settings.max_idle_time_ms,
+				waitQueueTimeoutMS=settings.wait_queue_timeout_ms,
+				serverSelectionTimeoutMS=settings.server_selection_timeout_ms,
+				connectTimeoutMS=settings.connect_timeout_ms,
+				socketTimeoutMS=settings.socket_timeout_ms,
 			)
 
 			# Test connection with shorter timeout
@@ -179,28 +237,77 @@ async def get_mongodb_database():
 	return _mongodb_db
 
 
+def get_entity_cache() -> EntityCache:
+	"""Get the process-wide entity cache used by collection handles."""
+	global _entity_cache
+
+	if _entity_cache is None:
+		settings = MongoDBSettings.from_env()
+		_entity_cache = EntityCache(max_entries=settings.entity_cache_size, ttl_seconds=settings.entity_cache_ttl_seconds)
+	return _entity_cache
+
+
 async def get_collection(collection_name: str):
 	"""
 	Get a MongoDB collection with proper prefix.
 	
+	Handles are created once per collection; later calls return them without
+	awaiting the database.
+	
 	Args:
 		collection_name: Base collection name (will be prefixed automatically)
 	
 	Returns:
-		MongoDB collection instance or None if MongoDB not available
+		MongoDB collection instance (a CachedCollection) or None if MongoDB not available
 	"""
+	collection = _collections.get(collection_name)
+	if collection is not None:
+		return collection
+
 	db = await get_mongodb_database()
 	if db is None:
 		return None
 
 	prefixed_name = get_collection_name(collection_name)
-	return db[prefixed_name]
+	collection = _collections.get(prefixed_name)
+	if collection is None:
+		metrics = _collection_metrics.setdefault(prefixed_name, CollectionMetrics())
+		collection = CachedCollection(
+			db[prefixed_name],
+			prefixed_name,
+			get_entity_cache(),
+			metrics,
+			change_streams=MongoDBSettings.from_env().change_streams,
+		)
+		_collections[prefixed_name] = collection
+	_collections[collection_name] = collection
+	return collection
+
+
+def get_collection_metrics() -> dict[str, Any]:
+	"""
+	Get operation latency per collection and entity cache statistics.
+	
+	Returns:
+		Dict with 'collections' (prefixed name -> operations, errors, mean_ms, p95_ms, max_ms)
+		and 'entity_cache' (entries, hits, misses, hit_rate, invalidations)
+	"""
+	return {
+		"collections": {name: metrics.snapshot() for name, metrics in _collection_metrics.items()},
+		"entity_cache": get_entity_cache().stats(),
+	}
 
 
 async def close_mongodb_connection():
 	"""Close MongoDB connection."""
 	global _mongodb_client, _mongodb_db
 
+	for collection in set(_collections.values()):
+		await collection.close()
+	_collections.clear()
+	if _entity_cache is not None:
+		_entity_cache.clear()
+
 	if _mongodb_client:
 		_mongodb_client.close()
 		_mongodb_client = None
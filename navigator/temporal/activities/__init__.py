@@ -24,6 +24,7 @@ from navigator.temporal.activities.graph import build_graph_activity
 # Import ingestion activity
 from navigator.temporal.activities.ingestion import ingest_source_activity
 from navigator.temporal.activities.shared import (
+	get_browser_lease_manager,
 	get_idempotency_manager,
 	init_activity_dependencies,
 )
@@ -48,6 +49,7 @@ __all__ = [
 	# Initialization
 	'init_activity_dependencies',
 	'get_idempotency_manager',
+	'get_browser_lease_manager',
 	# Ingestion
 	'ingest_source_activity',
 	# Extraction
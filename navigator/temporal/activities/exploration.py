@@ -5,6 +5,7 @@ Comprehensive primary URL exploration to enrich extracted knowledge.
 """
 
 import asyncio
+import contextlib
 import logging
 from typing import Any
 from uuid import uuid4
@@ -12,7 +13,7 @@ from uuid import uuid4
 from temporalio import activity
 
 from navigator.schemas import ExplorePrimaryUrlInput, ExplorePrimaryUrlResult
-from navigator.temporal.activities.shared import get_idempotency_manager
+from navigator.temporal.activities.shared import get_browser_lease_manager, get_idempotency_manager
 
 logger = logging.getLogger(__name__)
 
@@ -61,11 +62,18 @@ async def explore_primary_url_activity(
 
 		logger.info(f"🌐 Starting primary URL exploration: {input.primary_url}")
 
-		# Create browser session
-		from browser_use.browser.profile import BrowserProfile
-		profile = BrowserProfile(headless=True, use_cloud=False)
-		browser_session = BrowserSession(browser_profile=profile)
-		await browser_session.start()
+		# Lease a warm browser from the worker pool, or create one for this activity
+		browser_stack = contextlib.AsyncExitStack()
+		browser_lease_manager = get_browser_lease_manager()
+		if browser_lease_manager:
+			browser_session = await browser_stack.enter_async_context(browser_lease_manager.lease())
+		else:
+			from browser_use.browser.profile import BrowserProfile
+			profile = BrowserProfile(headless=True, use_cloud=False)
+			browser_session = BrowserSession(browser_profile=profile)
+			await browser_session.start()
+			# BrowserSession cleanup - use kill() method
+			browser_stack.push_async_callback(browser_session.kill)
 
 		result = ExplorePrimaryUrlResult()
 
@@ -672,10 +680,9 @@ async def explore_primary_url_activity(
 			)
 
 		finally:
-			# Clean up browser session
+			# Clean up browser session (returns leased browsers to the pool)
 			try:
-				# BrowserSession cleanup - use kill() method
-				await browser_session.kill()
+				await browser_stack.aclose()
 			except Exception as e:
 				logger.warning(f"Error closing browser session: {e}")
 
@@ -1,8 +1,8 @@
 """
 Shared dependencies and utilities for extraction activities.
 
-This module provides the global idempotency manager and initialization function
-that all activities depend on.
+This module provides the global idempotency manager, the optional browser lease
+manager and the initialization function that all activities depend on.
 """
 
 import logging
@@ -15,20 +15,28 @@ logger = logging.getLogger(__name__)
 
 # Global dependencies (initialized by worker)
 _idempotency_manager: Any = None
+_browser_lease_manager: Any = None
 
 
-def init_activity_dependencies(idempotency_manager: Any):
+def init_activity_dependencies(idempotency_manager: Any, browser_lease_manager: Any = None):
 	"""
 	Initialize dependencies for V2 activities.
 	
 	Args:
 		idempotency_manager: Idempotency manager for activity deduplication
+		browser_lease_manager: Warm browser pool for exploration activities (optional)
 	"""
-	global _idempotency_manager
+	global _idempotency_manager, _browser_lease_manager
 	_idempotency_manager = idempotency_manager
+	_browser_lease_manager = browser_lease_manager
 	logger.info("✅ V2 activity dependencies initialized")
 
 
 def get_idempotency_manager() -> Any:
 	"""Get the global idempotency manager."""
 	return _idempotency_manager
+
+
+def get_browser_lease_manager() -> Any:
+	"""Get the global browser lease manager (None if activities create their own browsers)."""
+	return _browser_lease_manager
@@ -72,7 +72,7 @@ async def assemble_video_ingestion_activity(
 		# Extract metadata if not provided
 		metadata_dict = input.metadata
 		if not metadata_dict:
-			metadata_dict = extract_metadata(video_path)
+			metadata_dict = await extract_metadata(video_path)
 
 		# Create SourceMetadata
 		# Safely get file stats (handle missing file or permission errors)
@@ -248,12 +248,12 @@ async def assemble_video_ingestion_activity(
 		duration = metadata_dict.get('duration', 0) if metadata_dict else 0
 		if duration <= 0:
 			# Extract metadata if duration not available
-			extracted_metadata = extract_metadata(video_path)
+			extracted_metadata = await extract_metadata(video_path)
 			if extracted_metadata:
 				duration = extracted_metadata.get('duration', 0)
 		
 		if duration > 0:
-			thumbnails = generate_thumbnails(video_path, input.ingestion_id, duration)
+			thumbnails = await generate_thumbnails(video_path, input.ingestion_id, duration)
 			if thumbnails:
 				result.metadata.thumbnails = [str(t) for t in thumbnails]
 		else:
@@ -4,8 +4,8 @@ Video Frame Filtering Activity
 Extracts and filters video frames using scene change detection and SSIM deduplication.
 """
 
+import asyncio
 import logging
-import subprocess
 import tempfile
 from pathlib import Path
 
@@ -14,6 +14,7 @@ from temporalio import activity
 from navigator.knowledge.ingest.video import VideoIngester
 from navigator.knowledge.ingest.video.frame_analysis.deduplication import compute_ssim
 from navigator.knowledge.ingest.video.frame_analysis.filtering import detect_scene_changes, smart_filter_pass1
+from navigator.knowledge.ingest.video.media_tools import get_media_tool_runner
 from navigator.knowledge.ingest.video.metadata import extract_metadata
 from navigator.knowledge.s3_frame_storage import get_frame_storage
 from navigator.schemas import FilterFramesInput, FilterFramesResult
@@ -52,7 +53,7 @@ async def filter_frames_activity(input: FilterFramesInput) -> FilterFramesResult
 
 		# Step 0: Get video duration (required for scene detection)
 		activity.heartbeat({"status": "extracting_metadata"})
-		metadata = extract_metadata(video_path)
+		metadata = await extract_metadata(video_path)
 		if not metadata:
 			raise ValueError(f"Failed to extract metadata from video: {video_path}")
 		duration = metadata.get('duration', 0)
@@ -86,23 +87,16 @@ async def filter_frames_activity(input: FilterFramesInput) -> FilterFramesResult
 		temp_dir = Path(tempfile.gettempdir()) / 'video_frames' / input.ingestion_id / 'temp'
 		temp_dir.mkdir(parents=True, exist_ok=True)
 
-		temp_frame_paths = []
-		for timestamp in filtered_timestamps:
-			temp_frame_path = temp_dir / f"frame_{timestamp:.2f}.jpg"
-
-			cmd = [
-				'ffmpeg',
-				'-ss', str(timestamp),
-				'-i', str(video_path),
-				'-vframes', '1',
-				'-q:v', '2',
-				'-y',
-				str(temp_frame_path)
-			]
-
-			result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-			if result.returncode == 0 and temp_frame_path.exists():
-				temp_frame_paths.append((timestamp, temp_frame_path))
+		# Extract frames concurrently; the shared runner bounds ffmpeg processes and keeps
+		# the event loop (and Temporal heartbeats) responsive while they run
+		activity.heartbeat({"status": "extracting_frames", "candidates": len(filtered_timestamps)})
+		runner = get_media_tool_runner()
+		frame_targets = [(timestamp, temp_dir / f"frame_{timestamp:.2f}.jpg") for timestamp in filtered_timestamps]
+		extracted = await asyncio.gather(*(
+			runner.extract_frame(video_path, timestamp, frame_path, timeout=10)
+			for timestamp, frame_path in frame_targets
+		))
+		temp_frame_paths = [target for target, ok in zip(frame_targets, extracted) if ok]
 
 		logger.info(
 			f"📸 Extracted {len(temp_frame_paths)} frames from {len(filtered_timestamps)} candidate timestamps"
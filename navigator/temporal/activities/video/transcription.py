@@ -21,9 +21,9 @@ async def transcribe_video_activity(input: TranscribeVideoInput) -> TranscribeVi
 	Transcribe video audio using Deepgram API (cloud-based).
 	
 	This activity:
-	1. Extracts audio from video using ffmpeg
-	2. Sends audio to Deepgram API for transcription
-	3. Returns transcription segments with timestamps
+	1. Streams audio from the video through ffmpeg in silence-aligned chunks
+	2. Transcribes chunks concurrently via Deepgram (heartbeating per chunk)
+	3. Returns stitched transcription segments with timestamps
 	
 	Args:
 		input: Transcription parameters (video_path, ingestion_id, job_id)
@@ -40,7 +40,16 @@ async def transcribe_video_activity(input: TranscribeVideoInput) -> TranscribeVi
 	try:
 		# Transcribe video using module function
 		video_path = Path(input.video_path)
-		transcription_data = await transcribe_video(video_path)
+
+		def heartbeat_chunk(completed: int, chunk) -> None:
+			activity.heartbeat({
+				"status": "transcribing",
+				"video_path": input.video_path,
+				"chunks_completed": completed,
+				"audio_position": round(chunk.end, 1),
+			})
+
+		transcription_data = await transcribe_video(video_path, on_chunk_done=heartbeat_chunk)
 
 		if not transcription_data:
 			error_msg = "Transcription returned empty data"
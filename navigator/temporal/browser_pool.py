@@ -0,0 +1,326 @@
+"""
+Worker-scoped browser lease manager for exploration activities.
+
+Starting Chromium and setting up a profile dominates the runtime of short
+exploration activities. The lease manager keeps one warm `BrowserSession` per
+configured slot and hands it to activities with a clean context (fresh tab,
+cleared cookies, and cleared storage for every origin the previous lease
+reached, including in-page navigations, iframes and cookie domains). Sessions are recycled after a crash, when the
+browser exceeds its memory limit, or after a maximum number of leases.
+
+**Configuration:**
+- `BROWSER_LEASE_SLOTS`: Number of warm browser sessions (default: 3)
+- `BROWSER_LEASE_MAX_MEMORY_MB`: Recycle a browser above this RSS (default: 1536)
+- `BROWSER_LEASE_MAX_USES`: Recycle a browser after this many leases (default: 50)
+
+**Usage:**
+    manager = BrowserLeaseManager.from_env()
+    await manager.warm_up()  # optional, at worker startup
+    async with manager.lease() as browser_session:
+        await browser_session.navigate_to(url)
+    await manager.close()
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+from urllib.parse import urlparse
+
+if TYPE_CHECKING:
+	from browser_use import BrowserSession
+
+logger = logging.getLogger(__name__)
+
+
+def _default_session_factory() -> 'BrowserSession':
+	"""Create a headless local browser session (same profile the activities used before)."""
+	from browser_use import BrowserSession
+	from browser_use.browser.profile import BrowserProfile
+
+	profile = BrowserProfile(headless=True, use_cloud=False, keep_alive=True)
+	return BrowserSession(browser_profile=profile)
+
+
+@dataclass
+class BrowserSlot:
+	"""One warm browser session and its usage counters."""
+
+	slot_id: int
+	session: 'BrowserSession | None' = None
+	uses: int = 0
+	visited_origins: set[str] = field(default_factory=set)
+
+	def record_url(self, url: str) -> None:
+		"""Remember the origin of an http(s) URL so its storage is cleared before the next lease."""
+		parsed = urlparse(url)
+		if parsed.scheme in ('http', 'https') and parsed.netloc:
+			self.visited_origins.add(f'{parsed.scheme}://{parsed.netloc}')
+
+
+@dataclass
+class BrowserLeaseStats:
+	"""Lease manager counters (used for reporting startup time saved)."""
+
+	leases: int = 0
+	cold_starts: int = 0
+	warm_reuses: int = 0
+	recycles: int = 0
+	startup_seconds: float = 0.0
+
+	@property
+	def avg_startup_seconds(self) -> float:
+		return self.startup_seconds / self.cold_starts if self.cold_starts else 0.0
+
+	@property
+	def startup_seconds_saved(self) -> float:
+		"""Estimated startup time avoided by reusing warm sessions."""
+		return self.warm_reuses * self.avg_startup_seconds
+
+
+class BrowserLeaseManager:
+	"""
+	Pool of warm browser sessions leased to activities one at a time.
+
+	Each slot holds at most one browser. A lease blocks until a slot is free,
+	so the number of slots is also the exploration concurrency of this worker.
+	"""
+
+	def __init__(
+		self,
+		slots: int = 3,
+		session_factory: Callable[[], 'BrowserSession'] | None = None,
+		max_memory_mb: float = 1536,
+		max_uses: int = 50,
+	):
+		"""
+		Initialize browser lease manager.
+
+		Args:
+			slots: Number of warm browser sessions
+			session_factory: Creates a new (unstarted) BrowserSession
+			max_memory_mb: Recycle a browser whose process tree exceeds this RSS
+			max_uses: Recycle a browser after this many leases
+		"""
+		if slots < 1:
+			raise ValueError('BrowserLeaseManager requires at least one slot')
+
+		self.slots = slots
+		self.session_factory = session_factory or _default_session_factory
+		self.max_memory_mb = max_memory_mb
+		self.max_uses = max_uses
+		self.stats = BrowserLeaseStats()
+
+		self._free_slots: asyncio.Queue[BrowserSlot] = asyncio.Queue()
+		self._all_slots = [BrowserSlot(slot_id=i) for i in range(slots)]
+		for slot in self._all_slots:
+			self._free_slots.put_nowait(slot)
+		self._closed = False
+
+	@classmethod
+	def from_env(cls) -> 'BrowserLeaseManager':
+		"""Create lease manager from environment variables."""
+		return cls(
+			slots=int(os.getenv('BROWSER_LEASE_SLOTS', '3')),
+			max_memory_mb=float(os.getenv('BROWSER_LEASE_MAX_MEMORY_MB', '1536')),
+			max_uses=int(os.getenv('BROWSER_LEASE_MAX_USES', '50')),
+		)
+
+	async def warm_up(self) -> None:
+		"""Start all browser sessions up front so the first activities do not pay startup."""
+		slots = [await self._free_slots.get() for _ in range(self.slots)]
+		try:
+			results = await asyncio.gather(*(self._ensure_started(slot) for slot in slots), return_exceptions=True)
+			for slot, result in zip(slots, results):
+				if isinstance(result, BaseException):
+					logger.warning(f'Browser lease slot {slot.slot_id} failed to warm up, starting it on first lease: {result}')
+		finally:
+			for slot in slots:
+				self._free_slots.put_nowait(slot)
+
+	@asynccontextmanager
+	async def lease(self) -> AsyncIterator['BrowserSession']:
+		"""
+		Lease a warm browser session with a clean context.
+
+		The session is recycled instead of returned to the pool if the activity
+		raised because the browser crashed, or if the browser is over its limits.
+		"""
+		if self._closed:
+			raise RuntimeError('BrowserLeaseManager is closed')
+
+		slot = await self._free_slots.get()
+		leased = False
+		healthy = False
+		try:
+			session = await self._ensure_started(slot)
+			await self._prepare_clean_context(slot)
+			slot.uses += 1
+			self.stats.leases += 1
+			leased = True
+
+			yield session
+		finally:
+			# Also checked when the activity raised, so page-level errors keep the warm browser
+			if leased:
+				healthy = await self._is_healthy(slot)
+			if not healthy or slot.uses >= self.max_uses:
+				await self._recycle(slot)
+			self._free_slots.put_nowait(slot)
+
+	async def close(self) -> None:
+		"""Kill all browser sessions."""
+		self._closed = True
+		for slot in self._all_slots:
+			await self._recycle(slot, count=False)
+
+	async def _ensure_started(self, slot: BrowserSlot) -> 'BrowserSession':
+		if slot.session is not None:
+			self.stats.warm_reuses += 1
+			return slot.session
+
+		start = time.perf_counter()
+		session = self.session_factory()
+		await session.start()
+		elapsed = time.perf_counter() - start
+		self._track_navigations(slot, session)
+
+		slot.session = session
+		slot.uses = 0
+		slot.visited_origins.clear()
+		self.stats.cold_starts += 1
+		self.stats.startup_seconds += elapsed
+		logger.info(f'🌐 Browser lease slot {slot.slot_id} started in {elapsed:.2f}s')
+		return session
+
+	@staticmethod
+	def _track_navigations(slot: BrowserSlot, session: 'BrowserSession') -> None:
+		"""Record the origins of tabs the session opens or navigates, including tabs closed before cleanup."""
+		from browser_use.browser.events import NavigationCompleteEvent, TabCreatedEvent
+
+		def record_browser_navigation(event: NavigationCompleteEvent | TabCreatedEvent) -> None:
+			slot.record_url(event.url)
+
+		session.event_bus.on(NavigationCompleteEvent, record_browser_navigation)
+		session.event_bus.on(TabCreatedEvent, record_browser_navigation)
+
+	async def _collect_visited_origins(self, slot: BrowserSlot) -> None:
+		"""
+		Add every origin the browser context still knows about to the slot.
+
+		Navigation events only cover browser-initiated navigations, so this also
+		reads the session history of every open tab (links, redirects and
+		script navigations), all iframe and worker targets, and cookie domains.
+		"""
+		session = slot.session
+		if session is None:
+			return
+
+		for target in await session._cdp_get_all_pages(include_iframes=True, include_workers=True):
+			slot.record_url(target['url'])
+			if target['type'] != 'page':
+				continue
+			try:
+				cdp_session = await session.get_or_create_cdp_session(target_id=target['targetId'], focus=False)
+				history = await cdp_session.cdp_client.send.Page.getNavigationHistory(session_id=cdp_session.session_id)
+				for entry in history['entries']:
+					slot.record_url(entry['url'])
+			except Exception as e:
+				logger.debug(f'Failed to read navigation history of {target["targetId"]}: {e}')
+
+		try:
+			cookies = await session._cdp_get_cookies()
+		except Exception as e:
+			logger.debug(f'Failed to read cookies: {e}')
+			cookies = []
+		for cookie in cookies:
+			domain = cookie['domain'].lstrip('.')
+			slot.record_url(f'https://{domain}')
+			slot.record_url(f'http://{domain}')
+
+	async def _prepare_clean_context(self, slot: BrowserSlot) -> None:
+		"""
+		Give the lease a fresh tab and clear state left by the previous lease.
+
+		Opens a new about:blank tab, closes all other tabs, then clears cookies
+		and storage for every origin the previous lease reached.
+		"""
+		session = slot.session
+		if session is None or slot.uses == 0:
+			return
+
+		from browser_use.browser.events import CloseTabEvent, SwitchTabEvent
+
+		await self._collect_visited_origins(slot)
+		tabs = await session.get_tabs()
+
+		new_target_id = await session._cdp_create_new_page('about:blank')
+		await session.event_bus.dispatch(SwitchTabEvent(target_id=new_target_id))
+		for tab in tabs:
+			if tab.target_id != new_target_id:
+				await session.event_bus.dispatch(CloseTabEvent(target_id=tab.target_id))
+
+		await session._cdp_clear_cookies()
+		cdp_session = await session.get_or_create_cdp_session()
+		for origin in slot.visited_origins:
+			try:
+				await cdp_session.cdp_client.send.Storage.clearDataForOrigin(
+					params={'origin': origin, 'storageTypes': 'all'},
+					session_id=cdp_session.session_id,
+				)
+			except Exception as e:
+				logger.debug(f'Failed to clear storage for {origin}: {e}')
+		slot.visited_origins.clear()
+
+	async def _is_healthy(self, slot: BrowserSlot) -> bool:
+		"""Check that the browser is still connected and under its memory limit."""
+		session = slot.session
+		if session is None or session._cdp_client_root is None:
+			return False
+
+		memory_mb = self._get_memory_mb(session)
+		if memory_mb is not None and memory_mb > self.max_memory_mb:
+			logger.info(
+				f'♻️ Browser lease slot {slot.slot_id} over memory limit ({memory_mb:.0f} MB > {self.max_memory_mb:.0f} MB)'
+			)
+			return False
+		return True
+
+	@staticmethod
+	def _get_memory_mb(session: 'BrowserSession') -> float | None:
+		"""Resident memory of the browser process tree in MB (None if unknown)."""
+		watchdog = session._local_browser_watchdog
+		pid = watchdog.browser_pid if watchdog else None
+		if not pid:
+			return None
+
+		import psutil
+
+		try:
+			process = psutil.Process(pid)
+			rss = process.memory_info().rss
+			for child in process.children(recursive=True):
+				try:
+					rss += child.memory_info().rss
+				except psutil.Error:
+					pass
+			return rss / (1024 * 1024)
+		except psutil.Error:
+			return None
+
+	async def _recycle(self, slot: BrowserSlot, count: bool = True) -> None:
+		session, slot.session = slot.session, None
+		slot.uses = 0
+		slot.visited_origins.clear()
+		if session is None:
+			return
+		if count:
+			self.stats.recycles += 1
+		try:
+			await session.kill()
+		except Exception as e:
+			logger.warning(f'Error killing browser in lease slot {slot.slot_id}: {e}')
@@ -0,0 +1,442 @@
+"""
+Claim-check payload storage for Temporal activities.
+
+Large activity inputs and outputs are content-addressed into a blob store and
+replaced by a small reference holding only their digest. This keeps MongoDB's
+`activity_execution_log` and the Temporal workflow history small while the
+full payload lives in a shared directory or an S3-compatible bucket.
+
+Claim-check is opt-in. Every process that replays workflows or reads the
+execution log (API server and workers, on every host) must be able to read the
+blobs, so it is only enabled with storage they share: `S3_BUCKET`, or an explicit
+`CLAIM_CHECK_DIR` on a shared volume. Blobs are content-addressed and never
+deleted by this module; expire them (e.g. an S3 lifecycle rule) no sooner than
+the namespace's workflow retention and the execution log TTL.
+
+**Configuration:**
+- `CLAIM_CHECK_ENABLED`: Enable claim-check offloading (default: `false`)
+- `CLAIM_CHECK_THRESHOLD_BYTES`: Payloads at or above this size are offloaded (default: 16384)
+- `CLAIM_CHECK_BACKEND`: `local` or `s3` (default: `s3` if `S3_BUCKET` is set)
+- `CLAIM_CHECK_DIR`: Shared blob directory, required for the `local` backend
+- `CLAIM_CHECK_PREFIX`: S3 key prefix (default: `claim-check`), bucket comes from `S3_BUCKET`
+
+**Usage:**
+    store = ClaimCheckStore.from_env()
+    ref = await store.put_json(large_result)  # {'$claim_check': 'sha256:...', ...}
+    result = await store.resolve(ref)
+
+    # Transparent use in Temporal (history only holds digests):
+    client = await Client.connect(url, data_converter=claim_check_data_converter(store))
+"""
+
+import asyncio
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import zlib
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+import temporalio.converter
+from temporalio.api.common.v1 import Payload
+from temporalio.converter import PayloadCodec
+
+logger = logging.getLogger(__name__)
+
+# Reference marker stored in place of offloaded data
+CLAIM_CHECK_KEY = '$claim_check'
+
+# Temporal payload encoding for claim-checked payloads
+CLAIM_CHECK_ENCODING = b'binary/claim-check'
+
+DEFAULT_THRESHOLD_BYTES = 16 * 1024
+
+# One-byte codec header prepended to every stored blob
+_CODEC_ZSTD = b'Z'
+_CODEC_ZLIB = b'D'
+_CODEC_RAW = b'R'
+
+try:
+	import zstandard as _zstd
+except ImportError:  # zstandard is optional, fall back to zlib
+	_zstd = None
+
+
+def compress_blob(data: bytes, level: int = 3) -> bytes:
+	"""
+	Compress blob bytes, preferring zstd when available.
+
+	Args:
+		data: Raw bytes
+		level: Compression level
+
+	Returns:
+		Codec header byte followed by compressed bytes
+	"""
+	if _zstd is not None:
+		return _CODEC_ZSTD + _zstd.ZstdCompressor(level=level).compress(data)
+	return _CODEC_ZLIB + zlib.compress(data, level)
+
+
+def decompress_blob(blob: bytes) -> bytes:
+	"""
+	Decompress bytes produced by `compress_blob`.
+
+	Raises:
+		ValueError: If the codec header is unknown or zstd is required but missing
+	"""
+	codec, body = blob[:1], blob[1:]
+	if codec == _CODEC_ZSTD:
+		if _zstd is None:
+			raise ValueError('Blob is zstd-compressed but zstandard is not installed. Install with: uv pip install zstandard')
+		return _zstd.ZstdDecompressor().decompress(body)
+	if codec == _CODEC_ZLIB:
+		return zlib.decompress(body)
+	if codec == _CODEC_RAW:
+		return body
+	raise ValueError(f'Unknown claim-check blob codec: {codec!r}')
+
+
+class _HashWriter:
+	"""Feeds encoded JSON chunks into a hash while counting bytes."""
+
+	def __init__(self):
+		self.hash = hashlib.sha256()
+		self.size = 0
+
+	def update(self, chunk: str) -> None:
+		data = chunk.encode('utf-8')
+		self.hash.update(data)
+		self.size += len(data)
+
+
+def stream_json_hash(data: Any) -> tuple[str, int]:
+	"""
+	Hash the canonical JSON form of `data` without materializing the full string.
+
+	Produces the same digest as `sha256(json.dumps(data, sort_keys=True, default=str))`,
+	but encodes incrementally so large inputs never exist as one string.
+
+	Args:
+		data: JSON-serializable data
+
+	Returns:
+		Tuple of (hex digest, encoded size in bytes)
+	"""
+	writer = _HashWriter()
+	encoder = json.JSONEncoder(sort_keys=True, default=str)
+	for chunk in encoder.iterencode(data):
+		writer.update(chunk)
+	return writer.hash.hexdigest(), writer.size
+
+
+def is_claim_check_ref(value: Any) -> bool:
+	"""Check whether a value is a claim-check reference."""
+	return isinstance(value, dict) and CLAIM_CHECK_KEY in value
+
+
+class BlobStore(ABC):
+	"""Content-addressed blob storage backend."""
+
+	@abstractmethod
+	async def put(self, digest: str, blob: bytes) -> None:
+		"""Store blob under digest (no-op if already present)."""
+
+	@abstractmethod
+	async def get(self, digest: str) -> bytes:
+		"""
+		Load blob by digest.
+
+		Raises:
+			KeyError: If blob does not exist
+		"""
+
+	@abstractmethod
+	async def exists(self, digest: str) -> bool:
+		"""Check whether a blob exists."""
+
+
+class LocalBlobStore(BlobStore):
+	"""Blob store on the local filesystem (single-server mode)."""
+
+	def __init__(self, base_dir: Path | str | None = None):
+		self.base_dir = Path(base_dir) if base_dir else Path(tempfile.gettempdir()) / 'claim_check'
+		self.base_dir.mkdir(parents=True, exist_ok=True)
+
+	def _path(self, digest: str) -> Path:
+		# Fan out by digest prefix to keep directories small
+		return self.base_dir / digest[:2] / digest
+
+	def _write(self, digest: str, blob: bytes) -> None:
+		path = self._path(digest)
+		if path.exists():
+			return
+		path.parent.mkdir(parents=True, exist_ok=True)
+		# Write-then-rename so readers never see partial blobs; concurrent writers of
+		# the same digest each get their own temp file
+		with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f'{digest}.', suffix='.tmp', delete=False) as tmp:
+			tmp.write(blob)
+		try:
+			os.replace(tmp.name, path)
+		except OSError:
+			Path(tmp.name).unlink(missing_ok=True)
+			# Another writer stored the same content first
+			if not path.exists():
+				raise
+
+	async def put(self, digest: str, blob: bytes) -> None:
+		await asyncio.to_thread(self._write, digest, blob)
+
+	async def get(self, digest: str) -> bytes:
+		path = self._path(digest)
+		try:
+			return await asyncio.to_thread(path.read_bytes)
+		except FileNotFoundError:
+			raise KeyError(digest)
+
+	async def exists(self, digest: str) -> bool:
+		return self._path(digest).exists()
+
+
+class S3BlobStore(BlobStore):
+	"""
+	Blob store on S3-compatible storage (multi-server mode).
+
+	Reuses the S3 configuration of `S3FrameStorage` (bucket, endpoint, credentials).
+	"""
+
+	def __init__(self, bucket: str | None = None, prefix: str = 'claim-check'):
+		from navigator.knowledge.s3_frame_storage import S3FrameStorage
+
+		# S3FrameStorage already resolves endpoint/region/credentials from env
+		self._frame_storage = S3FrameStorage(use_s3=True, bucket=bucket)
+		self.bucket = self._frame_storage.bucket
+		self.prefix = prefix
+
+	def _key(self, digest: str) -> str:
+		return f'{self.prefix}/{digest[:2]}/{digest}'
+
+	async def put(self, digest: str, blob: bytes) -> None:
+		if await self.exists(digest):
+			return
+		client = self._frame_storage._get_s3_client()
+		await asyncio.to_thread(client.put_object, Bucket=self.bucket, Key=self._key(digest), Body=blob)
+
+	async def get(self, digest: str) -> bytes:
+		client = self._frame_storage._get_s3_client()
+		try:
+			response = await asyncio.to_thread(client.get_object, Bucket=self.bucket, Key=self._key(digest))
+		except client.exceptions.NoSuchKey:
+			raise KeyError(digest)
+		return await asyncio.to_thread(response['Body'].read)
+
+	async def exists(self, digest: str) -> bool:
+		client = self._frame_storage._get_s3_client()
+		try:
+			await asyncio.to_thread(client.head_object, Bucket=self.bucket, Key=self._key(digest))
+			return True
+		except Exception:
+			return False
+
+
+@dataclasses.dataclass
+class ClaimCheckStats:
+	"""Byte accounting for claim-check offloading."""
+
+	offloaded_count: int = 0
+	inline_count: int = 0
+	raw_bytes_offloaded: int = 0
+	stored_bytes: int = 0
+	reference_bytes: int = 0
+
+
+class ClaimCheckStore:
+	"""
+	Content-addressed claim-check store with compression.
+
+	Payloads smaller than `threshold_bytes` are kept inline; larger payloads
+	are compressed, written to the blob store and replaced by a reference.
+	"""
+
+	def __init__(
+		self,
+		blob_store: BlobStore | None = None,
+		threshold_bytes: int = DEFAULT_THRESHOLD_BYTES,
+		compression_level: int = 3,
+	):
+		"""
+		Initialize claim-check store.
+
+		Args:
+			blob_store: Blob storage backend (defaults to local filesystem)
+			threshold_bytes: Minimum serialized size to offload
+			compression_level: zstd/zlib compression level
+		"""
+		self.blob_store = blob_store or LocalBlobStore()
+		self.threshold_bytes = threshold_bytes
+		self.compression_level = compression_level
+		self.stats = ClaimCheckStats()
+
+	@classmethod
+	def from_env(cls) -> 'ClaimCheckStore | None':
+		"""
+		Create claim-check store from environment variables.
+
+		Returns:
+			ClaimCheckStore, or None unless CLAIM_CHECK_ENABLED=true and shared storage is configured
+		"""
+		if os.getenv('CLAIM_CHECK_ENABLED', 'false').lower() not in ('true', '1', 'yes'):
+			return None
+
+		# Follow S3FrameStorage's S3_BUCKET auto-detection
+		backend = os.getenv('CLAIM_CHECK_BACKEND', 's3' if os.getenv('S3_BUCKET') else 'local').lower()
+		if backend == 's3':
+			blob_store: BlobStore = S3BlobStore(prefix=os.getenv('CLAIM_CHECK_PREFIX', 'claim-check'))
+		else:
+			blob_dir = os.getenv('CLAIM_CHECK_DIR')
+			if not blob_dir:
+				# A private temp directory would leave other processes and hosts unable to replay
+				logger.warning('⚠️ Claim-check disabled: set S3_BUCKET or a shared CLAIM_CHECK_DIR to enable it')
+				return None
+			blob_store = LocalBlobStore(blob_dir)
+
+		threshold = int(os.getenv('CLAIM_CHECK_THRESHOLD_BYTES', str(DEFAULT_THRESHOLD_BYTES)))
+		logger.info(f'📦 Claim-check store: {backend} backend (threshold={threshold} bytes)')
+		return cls(blob_store=blob_store, threshold_bytes=threshold)
+
+	async def put_bytes(self, data: bytes) -> str:
+		"""
+		Store raw bytes unconditionally.
+
+		Returns:
+			Digest in the form `sha256:<hex>`
+		"""
+		hex_digest = hashlib.sha256(data).hexdigest()
+		blob = await asyncio.to_thread(compress_blob, data, self.compression_level)
+		await self.blob_store.put(hex_digest, blob)
+		self.stats.offloaded_count += 1
+		self.stats.raw_bytes_offloaded += len(data)
+		self.stats.stored_bytes += len(blob)
+		return f'sha256:{hex_digest}'
+
+	async def get_bytes(self, digest: str) -> bytes:
+		"""
+		Load raw bytes by digest.
+
+		Raises:
+			KeyError: If the blob is missing
+			ValueError: If the blob content does not match its digest
+		"""
+		hex_digest = digest.removeprefix('sha256:')
+		blob = await self.blob_store.get(hex_digest)
+		data = await asyncio.to_thread(decompress_blob, blob)
+		if hashlib.sha256(data).hexdigest() != hex_digest:
+			raise ValueError(f'Claim-check blob {digest} is corrupted (digest mismatch)')
+		return data
+
+	async def put_json(self, data: Any) -> Any:
+		"""
+		Offload JSON-serializable data if it is large.
+
+		Returns:
+			`data` unchanged if below threshold, otherwise a claim-check reference dict
+		"""
+		value, _ = await self.put_json_sized(data)
+		return value
+
+	async def put_json_sized(self, data: Any) -> tuple[Any, int]:
+		"""
+		Offload JSON-serializable data if it is large, and report the size of what stays inline.
+
+		Returns:
+			Tuple of (`data` or its reference dict, JSON size in bytes of that value)
+		"""
+		encoded = json.dumps(data, default=str, separators=(',', ':')).encode('utf-8')
+		if len(encoded) < self.threshold_bytes:
+			self.stats.inline_count += 1
+			return data, len(encoded)
+
+		digest = await self.put_bytes(encoded)
+		ref = {CLAIM_CHECK_KEY: digest, 'size': len(encoded)}
+		ref_bytes = len(json.dumps(ref, separators=(',', ':')))
+		self.stats.reference_bytes += ref_bytes
+		return ref, ref_bytes
+
+	async def resolve(self, value: Any) -> Any:
+		"""Resolve a claim-check reference (values that are not references pass through)."""
+		if not is_claim_check_ref(value):
+			return value
+		data = await self.get_bytes(value[CLAIM_CHECK_KEY])
+		return json.loads(data)
+
+
+# Process-wide store shared by the Temporal client and the idempotency manager
+_claim_check_store: ClaimCheckStore | None = None
+_claim_check_store_initialized = False
+
+
+def get_claim_check_store() -> ClaimCheckStore | None:
+	"""Get the process-wide claim-check store (created from env on first use)."""
+	global _claim_check_store, _claim_check_store_initialized
+	if not _claim_check_store_initialized:
+		_claim_check_store = ClaimCheckStore.from_env()
+		_claim_check_store_initialized = True
+	return _claim_check_store
+
+
+class ClaimCheckPayloadCodec(PayloadCodec):
+	"""
+	Temporal payload codec that claim-checks large payloads.
+
+	Payloads at or above the store threshold are serialized, compressed and
+	stored by content digest; workflow history only keeps the digest.
+	"""
+
+	def __init__(self, store: ClaimCheckStore):
+		self.store = store
+
+	async def encode(self, payloads: Sequence[Payload]) -> list[Payload]:
+		encoded = []
+		for payload in payloads:
+			if payload.ByteSize() < self.store.threshold_bytes:
+				encoded.append(payload)
+				continue
+			digest = await self.store.put_bytes(payload.SerializeToString())
+			encoded.append(
+				Payload(
+					metadata={'encoding': CLAIM_CHECK_ENCODING},
+					data=digest.encode('utf-8'),
+				)
+			)
+		return encoded
+
+	async def decode(self, payloads: Sequence[Payload]) -> list[Payload]:
+		decoded = []
+		for payload in payloads:
+			if payload.metadata.get('encoding', b'') != CLAIM_CHECK_ENCODING:
+				decoded.append(payload)
+				continue
+			data = await self.store.get_bytes(payload.data.decode('utf-8'))
+			decoded.append(Payload.FromString(data))
+		return decoded
+
+
+def claim_check_data_converter(store: ClaimCheckStore):
+	"""
+	Create a Temporal data converter with claim-check payload codec.
+
+	Args:
+		store: Claim-check store
+
+	Returns:
+		temporalio DataConverter (default converter + claim-check codec)
+	"""
+	return dataclasses.replace(
+		temporalio.converter.default(),
+		payload_codec=ClaimCheckPayloadCodec(store),
+	)
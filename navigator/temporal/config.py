@@ -26,6 +26,9 @@ class TemporalConfig:
 	# Task queue for knowledge extraction workflows
 	knowledge_task_queue: str = "knowledge-extraction-queue"
 
+	# Offload large payloads to the claim-check store (history only keeps digests); needs shared storage
+	claim_check_enabled: bool = False
+
 	@classmethod
 	def from_env(cls) -> "TemporalConfig":
 		"""
@@ -35,11 +38,13 @@ class TemporalConfig:
 		- TEMPORAL_URL: Temporal server URL (default: localhost:7233)
 		- TEMPORAL_NAMESPACE: Temporal namespace (default: default)
 		- TEMPORAL_KNOWLEDGE_QUEUE: Task queue name (default: knowledge-extraction-queue)
+		- CLAIM_CHECK_ENABLED: Enable claim-check payload codec (default: false, needs S3_BUCKET or CLAIM_CHECK_DIR)
 		"""
 		return cls(
 			url=os.getenv("TEMPORAL_URL", "localhost:7233"),
 			namespace=os.getenv("TEMPORAL_NAMESPACE", "default"),
 			knowledge_task_queue=os.getenv("TEMPORAL_KNOWLEDGE_QUEUE", "knowledge-extraction-queue"),
+			claim_check_enabled=os.getenv("CLAIM_CHECK_ENABLED", "false").lower() in ("true", "1", "yes"),
 		)
 
 
@@ -58,10 +63,20 @@ async def get_temporal_client(config: TemporalConfig | None = None) -> Client:
 
 	logger.info(f"Connecting to Temporal at {config.url} (namespace: {config.namespace})")
 
+	connect_kwargs = {}
+	if config.claim_check_enabled:
+		from navigator.temporal.claim_check import claim_check_data_converter, get_claim_check_store
+
+		store = get_claim_check_store()
+		if store is not None:
+			# Large payloads are stored by digest; workflow history only holds the reference
+			connect_kwargs['data_converter'] = claim_check_data_converter(store)
+
 	try:
 		client = await Client.connect(
 			config.url,
 			namespace=config.namespace,
+			**connect_kwargs,
 		)
 		logger.info("✅ Successfully connected to Temporal")
 		return client
@@ -2,11 +2,10 @@
 Idempotency management for Temporal activities.
 
 Ensures activities can be retried without side effects by caching results
-and detecting duplicate executions.
+and detecting duplicate executions. Large outputs are offloaded to the
+claim-check store so only their digest is written to MongoDB.
 """
 
-import hashlib
-import json
 import logging
 from datetime import datetime, timedelta
 from typing import Any
@@ -14,6 +13,8 @@ from typing import Any
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from pydantic import BaseModel
 
+from navigator.temporal.claim_check import ClaimCheckStore, stream_json_hash
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,15 +25,19 @@ class IdempotencyManager:
 	Uses MongoDB to store execution logs and detect duplicate invocations.
 	"""
 
-	def __init__(self, db: AsyncIOMotorDatabase):
+	def __init__(self, db: AsyncIOMotorDatabase, claim_check_store: ClaimCheckStore | None = None):
 		"""
 		Initialize idempotency manager.
 		
 		Args:
 			db: MongoDB database instance
+			claim_check_store: Blob store for large outputs (outputs stay inline in MongoDB if None)
 		"""
 		self.db = db
 		self.collection = db['activity_execution_log']
+		self.claim_check_store = claim_check_store
+		# Approximate bytes of output data written to MongoDB, counted when a claim-check store serializes it
+		self.mongo_output_bytes_written = 0
 
 	async def ensure_indexes(self):
 		"""Create indexes for activity execution log."""
@@ -83,12 +88,9 @@ class IdempotencyManager:
 		Returns:
 			SHA-256 hash of input
 		"""
-		# Convert to stable JSON string
-		json_str = json.dumps(input_data, sort_keys=True, default=str)
-
-		# Compute SHA-256 hash
-		hash_obj = hashlib.sha256(json_str.encode('utf-8'))
-		return hash_obj.hexdigest()[:16]  # First 16 chars for readability
+		# Hash stable JSON incrementally (large inputs are never built as one string)
+		hex_digest, _ = stream_json_hash(input_data)
+		return hex_digest[:16]  # First 16 chars for readability
 
 	@staticmethod
 	def generate_idempotency_key(
@@ -147,7 +149,15 @@ class IdempotencyManager:
 				f"✅ Found cached result for {activity_name} "
 				f"(workflow: {workflow_id}, hash: {input_hash})"
 			)
-			return log_entry['output_data']
+			output_data = log_entry['output_data']
+			if self.claim_check_store is not None:
+				try:
+					output_data = await self.claim_check_store.resolve(output_data)
+				except (KeyError, ValueError) as e:
+					# Blob missing or corrupted - treat as cache miss so the activity re-runs
+					logger.warning(f"⚠️ Claim-check blob unavailable for {activity_name}: {e}")
+					return None
+			return output_data
 
 		return None
 
@@ -186,13 +196,19 @@ class IdempotencyManager:
 		# Create log entry
 		# Serialize output_data to ensure MongoDB compatibility
 		# (convert Pydantic models, dataclasses, etc. to dicts)
+		serialized_output = self._serialize_for_mongodb(output_data)  # Handles Pydantic models like ActionDefinition
+		if self.claim_check_store is not None:
+			# Large outputs go to the blob store, MongoDB only keeps the digest reference
+			serialized_output, output_bytes = await self.claim_check_store.put_json_sized(serialized_output)
+			self.mongo_output_bytes_written += output_bytes
+
 		now = datetime.utcnow()
 		log_entry = {
 			'idempotency_key': idempotency_key,
 			'workflow_id': workflow_id,
 			'activity_name': activity_name,
 			'input_hash': input_hash,
-			'output_data': self._serialize_for_mongodb(output_data),  # Serialize output (handles Pydantic models like ActionDefinition)
+			'output_data': serialized_output,
 			'started_at': now,
 			'completed_at': now,
 			'success': success,
@@ -37,6 +37,7 @@ from navigator.temporal.activities_extraction_video import (
 	filter_frames_activity,
 	transcribe_video_activity,
 )
+from navigator.temporal.browser_pool import BrowserLeaseManager
 from navigator.temporal.config import TemporalConfig, get_temporal_client
 from navigator.temporal.idempotency import IdempotencyManager
 from navigator.temporal.workflows import KnowledgeExtractionWorkflowV2
@@ -82,6 +83,7 @@ class TemporalWorkerService:
 		self.vector_store = vector_store or VectorStore(use_mongodb=True)
 		self.enable_v2 = enable_v2
 		self.idempotency_manager: IdempotencyManager | None = None
+		self.browser_lease_manager: BrowserLeaseManager | None = None
 		self._running = False
 		self._worker_task: asyncio.Task | None = None
 
@@ -120,10 +122,17 @@ class TemporalWorkerService:
 			database_name = get_mongodb_database_name()
 			db = mongo_client[database_name]
 
-			self.idempotency_manager = IdempotencyManager(db)
+			from navigator.temporal.claim_check import get_claim_check_store
+
+			self.idempotency_manager = IdempotencyManager(db, claim_check_store=get_claim_check_store())
 			await self.idempotency_manager.ensure_indexes()
 
-			init_activity_dependencies(self.idempotency_manager)
+			# Warm browser pool shared by exploration activities on this worker
+			self.browser_lease_manager = BrowserLeaseManager.from_env()
+			await self.browser_lease_manager.warm_up()
+			logger.info(f"✅ Browser lease pool warmed up ({self.browser_lease_manager.slots} slots)")
+
+			init_activity_dependencies(self.idempotency_manager, self.browser_lease_manager)
 			logger.info("✅ Extraction workflow dependencies initialized with MongoDB")
 
 		# Add extraction workflows and activities
@@ -280,6 +289,16 @@ class TemporalWorkerService:
 				except Exception as e:
 					logger.warning(f"   Error during task cancellation: {e}")
 
+		# Kill warm exploration browsers
+		if self.browser_lease_manager:
+			try:
+				await asyncio.wait_for(self.browser_lease_manager.close(), timeout=10.0)
+				logger.info(f"   Browser lease pool closed (startup time saved: {self.browser_lease_manager.stats.startup_seconds_saved:.1f}s)")
+			except asyncio.TimeoutError:
+				logger.warning("   Browser lease pool close timed out")
+			except Exception as e:
+				logger.warning(f"   Error closing browser lease pool: {e}")
+
 		# Close browser session if we created it
 		if self.browser_session:
 			try:
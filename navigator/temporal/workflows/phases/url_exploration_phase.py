@@ -86,9 +86,10 @@ async def execute_url_exploration_phase(
 		if credentials:
 			workflow.logger.info("🔐 Credentials provided - will perform authenticated login before DOM analysis")
 
-		# Process multiple URLs in parallel (up to 3 at a time to avoid overwhelming)
+		# Process multiple URLs in parallel (default 3 at a time; workers lease warm browsers,
+		# so 'exploration_concurrency' can be raised up to the total BROWSER_LEASE_SLOTS)
 		exploration_results: list[ExplorePrimaryUrlResult] = []
-		batch_size = 3
+		batch_size = max(1, int(input.options.get('exploration_concurrency', 3))) if input.options else 3
 
 		for batch_start in range(0, len(website_urls), batch_size):
 			batch_urls = website_urls[batch_start:batch_start + batch_size]
@@ -0,0 +1,116 @@
+"""
+Minimal stdio MCP server used as a fixture by the MCP client tests and benchmark.
+
+Speaks newline-delimited JSON-RPC on stdin/stdout and handles one request at a
+time, like most stdio servers. Configured through environment variables:
+
+- FIXTURE_TOOLS: number of tools to expose (default 3)
+- FIXTURE_VERSION: server version reported on initialize (default 1.0.0)
+- FIXTURE_LIST_DELAY: seconds tools/list takes (default 0)
+- FIXTURE_LOG: file that gets one line per process start and tools/list call
+
+Tools: `echo` returns its `text` argument, `sleep` waits `seconds`, and
+`tool_<i>` tools with a few typed parameters return their arguments as JSON.
+
+Usage:
+	python tests/ci/mcp_stdio_server.py
+"""
+
+import json
+import os
+import sys
+import time
+
+VERSION = os.environ.get('FIXTURE_VERSION', '1.0.0')
+LOG = os.environ.get('FIXTURE_LOG')
+
+
+def log(line: str) -> None:
+	if LOG:
+		with open(LOG, 'a') as f:
+			f.write(f'{line}\n')
+
+
+def tools() -> list[dict]:
+	result = [
+		{
+			'name': 'echo',
+			'description': 'Echo the text back',
+			'inputSchema': {'type': 'object', 'properties': {'text': {'type': 'string'}}, 'required': ['text']},
+		},
+		{
+			'name': 'sleep',
+			'description': 'Wait for a number of seconds',
+			'inputSchema': {'type': 'object', 'properties': {'seconds': {'type': 'number', 'default': 0.1}}},
+		},
+	]
+	for i in range(int(os.environ.get('FIXTURE_TOOLS', '3')) - 2):
+		result.append(
+			{
+				'name': f'tool_{i}',
+				'description': f'Fixture tool {i}',
+				'inputSchema': {
+					'type': 'object',
+					'properties': {
+						'query': {'type': 'string', 'description': 'What to look up'},
+						'limit': {'type': 'integer', 'default': 10},
+						'tags': {'type': 'array', 'items': {'type': 'string'}},
+						'options': {
+							'type': 'object',
+							'properties': {'exact': {'type': 'boolean'}, 'region': {'type': 'string'}},
+						},
+					},
+					'required': ['query'],
+				},
+			}
+		)
+	return result
+
+
+def call_tool(name: str, arguments: dict) -> dict:
+	if name == 'echo':
+		text = arguments['text']
+	elif name == 'sleep':
+		time.sleep(arguments.get('seconds', 0.1))
+		text = 'slept'
+	else:
+		text = json.dumps({'tool': name, **arguments}, sort_keys=True)
+	return {'content': [{'type': 'text', 'text': text}], 'isError': False}
+
+
+def handle(method: str, params: dict) -> dict:
+	if method == 'initialize':
+		return {
+			'protocolVersion': params.get('protocolVersion', '2025-06-18'),
+			'capabilities': {'tools': {}},
+			'serverInfo': {'name': 'fixture', 'version': VERSION},
+		}
+	if method == 'ping':
+		return {}
+	if method == 'tools/list':
+		log('list_tools')
+		time.sleep(float(os.environ.get('FIXTURE_LIST_DELAY', '0')))
+		return {'tools': tools()}
+	if method == 'tools/call':
+		return call_tool(params['name'], params.get('arguments') or {})
+	raise KeyError(method)
+
+
+def main() -> None:
+	log('start')
+	for line in sys.stdin:
+		if not line.strip():
+			continue
+		message = json.loads(line)
+		if 'id' not in message or 'method' not in message:
+			continue  # Notifications and responses
+		try:
+			response = {'jsonrpc': '2.0', 'id': message['id'], 'result': handle(message['method'], message.get('params') or {})}
+		except KeyError:
+			response = {'jsonrpc': '2.0', 'id': message['id'], 'error': {'code': -32601, 'message': 'Method not found'}}
+		sys.stdout.write(json.dumps(response) + '\n')
+		sys.stdout.flush()
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,277 @@
+"""
+Tests for the presentation action scheduler (navigator/presentation/scheduler.py).
+
+Timing is checked against a fake clock that only moves forward when every task
+is waiting on it, so the expected start times are exact.
+"""
+
+import asyncio
+import heapq
+import itertools
+import random
+
+import pytest
+
+from navigator.presentation.action_queue import ActionQueue
+from navigator.presentation.scheduler import (
+	SessionClosedError,
+	TokenBucket,
+	WaitTimeHistogram,
+	coalesce_actions,
+	jittered_backoff,
+)
+
+
+class FakeClock:
+	"""Clock whose time only advances to the next sleeper once everything else is idle."""
+
+	def __init__(self):
+		self.time = 0.0
+		self._sleepers: list[tuple[float, int, asyncio.Future]] = []
+		self._seq = itertools.count()
+
+	def now(self) -> float:
+		return self.time
+
+	async def sleep(self, seconds: float) -> None:
+		future = asyncio.get_running_loop().create_future()
+		heapq.heappush(self._sleepers, (self.time + seconds, next(self._seq), future))
+		await future
+
+	async def run(self, coro):
+		task = asyncio.ensure_future(coro)
+		while True:
+			# Let every other task run until it blocks
+			for _ in range(50):
+				await asyncio.sleep(0)
+			if task.done():
+				return task.result()
+			while self._sleepers and self._sleepers[0][2].cancelled():
+				heapq.heappop(self._sleepers)
+			assert self._sleepers, 'deadlock: nothing is sleeping'
+			wake_at, _, future = heapq.heappop(self._sleepers)
+			self.time = max(self.time, wake_at)
+			future.set_result(None)
+
+
+def recording_queue(clock: FakeClock, duration: float = 0.0, **kwargs) -> tuple[ActionQueue, list[tuple[float, str]]]:
+	"""ActionQueue whose processor records (start time, action name) and takes `duration` seconds."""
+	started = []
+
+	async def processor(action: dict):
+		started.append((clock.now(), action['name']))
+		if duration:
+			await clock.sleep(duration)
+		return action['name']
+
+	return ActionQueue(action_processor=processor, clock=clock, retry_jitter=0.0, **kwargs), started
+
+
+def test_token_bucket_refills_at_its_rate():
+	bucket = TokenBucket(rate=2, burst=2)
+	assert bucket.delay(0.0) == 0.0
+	bucket.take(0.0)
+	bucket.take(0.0)
+	assert bucket.delay(0.0) == pytest.approx(0.5)
+	assert bucket.delay(0.25) == pytest.approx(0.25)
+	assert bucket.delay(0.5) == 0.0
+	# Idle time never saves up more than the burst
+	assert bucket.delay(100.0) == 0.0 and bucket.tokens == 2
+
+
+def test_wait_time_histogram():
+	histogram = WaitTimeHistogram(bounds=(0.1, 1.0))
+	for seconds in (0.0, 0.05, 0.5, 3.0):
+		histogram.observe(seconds)
+
+	snapshot = histogram.to_dict()
+	assert snapshot['buckets'] == {'0.1': 2, '1.0': 3, '+Inf': 4}
+	assert snapshot['count'] == 4 and snapshot['sum'] == pytest.approx(3.55) and snapshot['max'] == 3.0
+	assert histogram.quantile(0.5) == 0.1
+	assert histogram.quantile(0.99) == 3.0
+
+
+def test_coalesce_actions():
+	scroll = {'type': 'scroll', 'params': {'direction': 'down', 'amount': 300}}
+	assert coalesce_actions(scroll, {'type': 'scroll', 'params': {'direction': 'down'}}) == {
+		'type': 'scroll',
+		'params': {'direction': 'down', 'amount': 800},
+	}
+	assert coalesce_actions(scroll, {'type': 'scroll', 'params': {'direction': 'up'}}) is None
+
+	navigate = {'type': 'navigate', 'params': {'url': 'https://a.test'}}
+	later = {'type': 'navigate', 'params': {'url': 'https://b.test'}}
+	assert coalesce_actions(navigate, later) is later
+	assert coalesce_actions(navigate, {'type': 'navigate', 'params': {'url': 'https://b.test', 'new_tab': True}}) is None
+	assert coalesce_actions({'type': 'click', 'params': {'index': 1}}, {'type': 'click', 'params': {'index': 1}}) is None
+
+
+def test_jittered_backoff_stays_within_bounds():
+	rng = random.Random(1)
+	delays = [jittered_backoff(2, base=2.0, jitter=0.5, rng=rng) for _ in range(100)]
+	assert all(4.0 <= delay <= 6.0 for delay in delays)
+	assert len(set(delays)) > 1
+
+
+async def test_idle_queue_does_not_delay_actions():
+	clock = FakeClock()
+	queue, started = recording_queue(clock, max_actions_per_second=2)
+	await queue.enqueue_action({'name': 'only'})
+
+	results = await clock.run(queue.process_queue())
+	assert started == [(0.0, 'only')]
+	assert results[0]['success'] and results[0]['result'] == 'only'
+
+
+async def test_global_rate_limit_with_burst():
+	clock = FakeClock()
+	queue, started = recording_queue(clock, max_actions_per_second=2, burst=2)
+	for i in range(5):
+		await queue.enqueue_action({'name': f'a{i}'})
+
+	await clock.run(queue.process_queue())
+	assert [t for t, _ in started] == [0.0, 0.0, 0.5, 1.0, 1.5]
+
+	histogram = queue.get_wait_time_histograms()['all']
+	assert histogram['count'] == 5 and histogram['max'] == pytest.approx(1.5)
+
+
+async def test_session_rate_limit_does_not_slow_other_sessions():
+	clock = FakeClock()
+	queue, started = recording_queue(clock, max_actions_per_second_per_session=1)
+	for i in range(3):
+		await queue.enqueue_action({'name': f'a{i}'}, session_id='a')
+		await queue.enqueue_action({'name': f'b{i}'}, session_id='b')
+
+	await clock.run(queue.process_queue())
+	assert sorted(started) == [(0.0, 'a0'), (0.0, 'b0'), (1.0, 'a1'), (1.0, 'b1'), (2.0, 'a2'), (2.0, 'b2')]
+	assert set(queue.get_wait_time_histograms()['sessions']) == {'a', 'b'}
+
+
+@pytest.mark.parametrize(
+	'weight_b, expected',
+	[
+		(1.0, ['a0', 'b0', 'a1', 'b1', 'a2', 'b2', 'a3', 'a4', 'a5']),
+		(2.0, ['b0', 'a0', 'b1', 'b2', 'a1', 'a2', 'a3', 'a4', 'a5']),
+	],
+)
+async def test_sessions_share_the_rate_limit_by_weight(weight_b, expected):
+	clock = FakeClock()
+	queue, started = recording_queue(clock, max_actions_per_second=1)
+	queue.set_session_weight('b', weight_b)
+	# Session a queued its whole backlog first
+	for i in range(6):
+		await queue.enqueue_action({'name': f'a{i}'}, session_id='a')
+	for i in range(3):
+		await queue.enqueue_action({'name': f'b{i}'}, session_id='b')
+
+	await clock.run(queue.process_queue())
+	assert [name for _, name in started] == expected
+	assert [t for t, _ in started] == [float(i) for i in range(9)]
+
+
+async def test_actions_of_a_session_run_one_at_a_time_in_priority_order():
+	clock = FakeClock()
+	queue, started = recording_queue(clock, duration=1.0)
+	await queue.enqueue_action({'name': 'low'})
+	await queue.enqueue_action({'name': 'high'}, priority=5)
+	await queue.enqueue_action({'name': 'later'}, delay=0.5)
+
+	results = await clock.run(queue.process_queue())
+	assert started == [(0.0, 'high'), (1.0, 'low'), (2.0, 'later')]
+	assert [r['result'] for r in results] == ['high', 'low', 'later']
+
+
+async def test_retry_backoff_only_holds_up_its_own_session():
+	clock = FakeClock()
+	failures = {'a0': 1}
+	started = []
+
+	async def processor(action: dict):
+		started.append((clock.now(), action['name']))
+		await clock.sleep(0.5)
+		if failures.get(action['name']):
+			failures[action['name']] -= 1
+			raise RuntimeError('flaky')
+		return action['name']
+
+	queue = ActionQueue(action_processor=processor, clock=clock, retry_jitter=0.0, retry_backoff_base=2.0)
+	await queue.enqueue_action({'name': 'a0'}, session_id='a')
+	await queue.enqueue_action({'name': 'a1'}, session_id='a')
+	for i in range(3):
+		await queue.enqueue_action({'name': f'b{i}'}, session_id='b')
+
+	results = await clock.run(queue.process_queue())
+	assert started == [(0.0, 'a0'), (0.0, 'b0'), (0.5, 'b1'), (1.0, 'b2'), (2.5, 'a0'), (3.0, 'a1')]
+	assert all(r['success'] for r in results)
+
+
+async def test_failed_actions_report_retries():
+	clock = FakeClock()
+
+	async def processor(action: dict):
+		raise RuntimeError('always fails')
+
+	queue = ActionQueue(action_processor=processor, clock=clock, max_retries=2, retry_jitter=0.0)
+	await queue.enqueue_action({'type': 'click'}, job_id='job')
+
+	results = await clock.run(queue.process_queue())
+	assert results == [{'success': False, 'job_id': 'job', 'error': 'always fails', 'retries': 2}]
+	# Backoff 2s then 4s
+	assert clock.now() == pytest.approx(6.0)
+
+
+async def test_redundant_queued_actions_are_coalesced():
+	clock = FakeClock()
+	queue, started = recording_queue(clock)
+	await queue.enqueue_action({'name': 'scroll', 'type': 'scroll', 'params': {'direction': 'down', 'amount': 100}}, job_id='s1')
+	await queue.enqueue_action({'name': 'scroll', 'type': 'scroll', 'params': {'direction': 'down', 'amount': 200}}, job_id='s2')
+	await queue.enqueue_action({'name': 'nav', 'type': 'navigate', 'params': {'url': 'https://a.test'}}, job_id='n1')
+	await queue.enqueue_action({'name': 'nav', 'type': 'navigate', 'params': {'url': 'https://b.test'}}, job_id='n2')
+	# Actions of different sessions are never merged
+	await queue.enqueue_action({'name': 'nav', 'type': 'navigate', 'params': {'url': 'https://c.test'}}, session_id='other')
+
+	pending = queue._in_memory_queue
+	assert [(item['job_id'], item['coalesced_job_ids']) for item in pending] == [
+		('s1', ['s2']),
+		('n1', ['n2']),
+		(pending[2]['job_id'], []),
+	]
+	assert pending[0]['action']['params']['amount'] == 300
+	assert pending[1]['action']['params']['url'] == 'https://b.test'
+
+	results = await clock.run(queue.process_queue(session_id='default'))
+	assert [(r['job_id'], r.get('coalesced_job_ids')) for r in results] == [('s1', ['s2']), ('n1', ['n2'])]
+
+
+async def test_discarded_session_actions_fail_without_running():
+	clock = FakeClock()
+	queue, started = recording_queue(clock)
+	await queue.enqueue_action({'name': 'a0'}, session_id='a')
+	queue.discard_session('a')
+
+	assert queue.pending_actions() == {}
+	assert await clock.run(queue.process_queue()) == []
+	assert started == []
+
+
+async def test_flow_manager_processes_sessions_through_the_shared_queue(flow_manager):
+	clock = FakeClock()
+	queue, started = recording_queue(clock, max_actions_per_second=1)
+	flow_manager.action_queue = queue
+	first = await flow_manager.start_session(room_name='room-1')
+	second = await flow_manager.start_session(room_name='room-2')
+
+	await flow_manager.enqueue_action(first, {'name': 'first-0'})
+	await flow_manager.enqueue_action(first, {'name': 'first-1'})
+	await flow_manager.enqueue_action(second, {'name': 'second-0'})
+	assert list(flow_manager._in_memory_queue) == [first, second]
+
+	results = await clock.run(flow_manager.process_queue(second))
+	assert [r['result'] for r in results] == ['second-0']
+
+	# Closing a session drops what it still had queued
+	pending = queue._scheduler.pending(first)
+	await flow_manager.close_session(first)
+	assert all(isinstance(job.error, SessionClosedError) for job in pending)
+	await flow_manager.shutdown()
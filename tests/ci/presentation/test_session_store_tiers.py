@@ -0,0 +1,258 @@
+"""
+Tests for the session store tiers (navigator/presentation/session_store.py).
+
+MongoDB is replaced by an in-memory collection that applies the bulk writes it
+receives, and time by a clock that only moves when a test advances it.
+"""
+
+import asyncio
+import json
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+import pytest
+from pymongo import DeleteOne, UpdateOne
+
+from navigator.presentation import session_store as session_store_module
+from navigator.presentation.session_store import SessionStore, TimerWheel
+
+
+class ManualClock:
+	def __init__(self):
+		self.time = 1000.0
+
+	def now(self) -> float:
+		return self.time
+
+	async def sleep(self, seconds: float) -> None:
+		# The background flusher never wakes up on its own; tests flush explicitly
+		await asyncio.Event().wait()
+
+
+class FakeCollection:
+	"""Just enough of a motor collection for the session store."""
+
+	def __init__(self):
+		self.docs: dict[str, dict] = {}
+		self.bulk_writes: list[list] = []
+		self.find_one_calls = 0
+		self.indexes: list[tuple[str, dict]] = []
+
+	async def create_index(self, key: str, **options):
+		self.indexes.append((key, options))
+
+	async def bulk_write(self, operations: list, ordered: bool = True):
+		self.bulk_writes.append(operations)
+		for op in operations:
+			session_id = op._filter['session_id']
+			if isinstance(op, DeleteOne):
+				self.docs.pop(session_id, None)
+			else:
+				self.docs[session_id] = dict(op._doc['$set'])
+
+	async def find(self, query: dict, projection: dict | None = None):
+		for doc in list(self.docs.values()):
+			if doc['expires_at'] > query['expires_at']['$gt']:
+				yield {'session_id': doc['session_id']}
+
+	async def find_one(self, query: dict, projection: dict | None = None):
+		self.find_one_calls += 1
+		doc = self.docs.get(query['session_id'])
+		if doc is None or doc['expires_at'] <= query['expires_at']['$gt']:
+			return None
+		return doc
+
+
+@pytest.fixture
+def collection(monkeypatch) -> FakeCollection:
+	collection = FakeCollection()
+
+	async def get_collection(name: str):
+		assert name == 'sessions'
+		return collection
+
+	monkeypatch.setattr(session_store_module, 'get_collection', get_collection)
+	return collection
+
+
+@pytest.fixture
+async def clock():
+	return ManualClock()
+
+
+@pytest.fixture
+async def store(collection, clock):
+	store = SessionStore(clock=clock)
+	yield store
+	await store.close()
+
+
+def test_timer_wheel_expires_keys_when_their_tick_passes():
+	wheel = TimerWheel(resolution=1.0, now=0.0)
+	wheel.schedule('a', 2.5)
+	wheel.schedule('b', 5.0)
+	wheel.schedule('c', 4.0)
+	wheel.cancel('c')
+	# Rescheduling leaves the old bucket behind
+	wheel.schedule('b', 1000.0)
+
+	assert wheel.advance(2.9) == []
+	assert wheel.advance(3.0) == ['a']
+	assert wheel.advance(10.0) == []
+	assert len(wheel) == 1
+	# A long idle gap only looks at occupied buckets
+	assert wheel.advance(10**9) == ['b']
+
+
+async def test_saves_are_coalesced_into_one_bulk_write(store, collection):
+	for i in range(5):
+		await store.save_session('s1', {'step': i})
+	await store.save_session('s2', {'step': 0})
+	await store.save_session('gone', {'step': 0})
+	await store.delete_session('gone')
+
+	# Reads see the writes before MongoDB does
+	assert await store.load_session('s1') == {'step': 4}
+	assert await store.load_session('gone') is None
+	assert collection.bulk_writes == [] and collection.find_one_calls == 0
+
+	assert await store.flush() == 3
+	(operations,) = collection.bulk_writes
+	assert operations[:2] == [
+		UpdateOne({'session_id': 's1'}, {'$set': collection.docs['s1']}, upsert=True),
+		UpdateOne({'session_id': 's2'}, {'$set': collection.docs['s2']}, upsert=True),
+	]
+	assert operations[2] == DeleteOne({'session_id': 'gone'})
+	assert collection.docs['s1']['session_state'] == {'step': 4}
+	assert ('expires_at', {'expireAfterSeconds': 0}) in collection.indexes
+
+	# Nothing new to write
+	assert await store.flush() == 0
+	assert len(collection.bulk_writes) == 1
+
+
+async def test_flushes_are_batched(collection, clock):
+	store = SessionStore(clock=clock, flush_batch_size=2)
+	for i in range(5):
+		await store.save_session(f's{i}', {'i': i})
+	assert await store.flush() == 5
+	assert [len(batch) for batch in collection.bulk_writes] == [2, 2, 1]
+	await store.close()
+
+
+async def test_evicted_sessions_are_read_back_from_mongodb(collection, clock):
+	store = SessionStore(clock=clock, max_cached_sessions=2)
+	for i in range(3):
+		await store.save_session(f's{i}', {'i': i})
+	# Still readable before the flush even though s0 left the local tier
+	assert await store.load_session('s0') == {'i': 0}
+	await store.flush()
+
+	assert await store.load_session('s1') == {'i': 1}
+	assert await store.load_session('s0') == {'i': 0}
+	assert collection.find_one_calls == 1
+	assert await store.load_session('s0') == {'i': 0}
+	assert collection.find_one_calls == 1
+	await store.close()
+
+
+async def test_sessions_expire_locally_without_reaching_mongodb(store, collection, clock):
+	await store.save_session('short', {'x': 1}, ttl=5)
+	await store.save_session('long', {'x': 2}, ttl=60)
+
+	clock.time += 6
+	assert await store.load_session('long') == {'x': 2}
+	assert await store.load_session('short') is None
+	assert await store.list_sessions() == ['long']
+	# The expired session is never written
+	assert await store.flush() == 1 and list(collection.docs) == ['long']
+
+
+async def test_saves_wait_in_memory_while_mongodb_is_unavailable(monkeypatch, clock):
+	collection = None
+
+	async def get_collection(name: str):
+		return collection
+
+	monkeypatch.setattr(session_store_module, 'get_collection', get_collection)
+	store = SessionStore(clock=clock, mongodb_retry_seconds=30)
+	await store.save_session('s1', {'x': 1})
+	assert await store.flush() == 0
+	assert await store.load_session('s1') == {'x': 1}
+
+	collection = FakeCollection()
+	clock.time += 10
+	# Not retried before mongodb_retry_seconds
+	assert await store.flush() == 0
+	clock.time += 30
+	assert await store.flush() == 1
+	assert collection.docs['s1']['session_state'] == {'x': 1}
+	await store.close()
+
+
+async def test_pending_writes_are_capped_while_mongodb_is_unavailable(monkeypatch, clock):
+	async def get_collection(name: str):
+		return None
+
+	monkeypatch.setattr(session_store_module, 'get_collection', get_collection)
+	store = SessionStore(clock=clock, max_pending_writes=2, max_dirty_sessions=3)
+	for i in range(5):
+		await store.save_session(f's{i}', {'x': i})
+
+	assert list(store._dirty) == ['s2', 's3', 's4']
+	assert store.dropped_writes == 2
+	await store.close()
+
+
+async def test_process_store_is_flushed_on_close(collection, monkeypatch):
+	monkeypatch.setattr(session_store_module, '_session_store', None)
+	store = session_store_module.get_session_store()
+	assert session_store_module.get_session_store() is store
+
+	await store.save_session('s1', {'x': 1})
+	await session_store_module.close_session_store()
+	assert collection.docs['s1']['session_state'] == {'x': 1}
+	assert session_store_module.get_session_store() is not store
+	await session_store_module.close_session_store()
+
+
+async def test_failed_flush_keeps_sessions_dirty(store, collection):
+	await store.save_session('s1', {'x': 1})
+	collection.bulk_write = AsyncMock(side_effect=RuntimeError('write failed'))
+	assert await store.flush() == 0
+
+	await store.save_session('s2', {'x': 2})
+	del collection.bulk_write
+	assert await store.flush() == 2
+	assert set(collection.docs) == {'s1', 's2'}
+
+
+async def test_close_flushes_pending_writes(collection, clock):
+	store = SessionStore(clock=clock)
+	await store.save_session('s1', {'x': 1})
+	await store.close()
+	assert collection.docs['s1']['session_state'] == {'x': 1}
+	assert collection.docs['s1']['expires_at'] > datetime.utcnow()
+
+
+async def test_local_copy_is_refreshed_from_redis(collection, clock, mock_redis_client):
+	store = SessionStore(clock=clock, redis_client=mock_redis_client, shared_refresh_seconds=2)
+	await store.save_session('s1', {'v': 1}, ttl=60)
+	assert await store.load_session('s1') == {'v': 1}
+	mock_redis_client.get.assert_not_called()
+
+	# Another instance saved a newer version
+	mock_redis_client.get.return_value = json.dumps({'v': 2}).encode('utf-8')
+	clock.time += 3
+	assert await store.load_session('s1') == {'v': 2}
+	mock_redis_client.get.assert_called_once_with('browser:session:s1')
+	await store.close()
+
+
+async def test_in_memory_store_is_not_size_limited(clock):
+	store = SessionStore(use_mongodb=False, max_cached_sessions=1, clock=clock)
+	await store.save_session('a', {'x': 1})
+	await store.save_session('b', {'x': 2})
+	assert await store.load_session('a') == {'x': 1}
+	assert sorted(await store.list_sessions()) == ['a', 'b']
+	await store.close()
@@ -0,0 +1,71 @@
+"""Tests for the compiled sensitive-data redactor (browser_use/agent/redaction.py)."""
+
+from browser_use.agent.redaction import get_redactor
+
+
+def test_redacts_all_values_in_one_pass():
+	redactor = get_redactor({'username': 'admin', 'password': 'hunter2', 'token': 'tok.en+*?'})
+
+	text = 'login admin / hunter2, header tok.en+*? and admin again'
+	assert redactor.redact(text) == (
+		'login <secret>username</secret> / <secret>password</secret>, '
+		'header <secret>token</secret> and <secret>username</secret> again'
+	)
+
+
+def test_longest_overlapping_value_wins():
+	redactor = get_redactor({'short': 'abc', 'long': 'abcdef'})
+	assert redactor.redact('abcdef abc abcd') == '<secret>long</secret> <secret>short</secret> <secret>short</secret>d'
+
+
+def test_existing_placeholders_are_left_alone():
+	# A secret value that also occurs inside placeholder tags must not corrupt them
+	redactor = get_redactor({'pw': 'secret'})
+	once = redactor.redact('my secret is secret')
+	assert once == 'my <secret>pw</secret> is <secret>pw</secret>'
+	assert redactor.redact(once) == once
+
+
+def test_domain_scoped_values_are_all_redacted():
+	sensitive_data = {
+		'example.com': {'username': 'admin', 'password': 'secret123'},
+		'google.com': {'email': 'user@example.com', 'password': 'google_pass'},
+		'api_key': 'sk-123',
+	}
+	redactor = get_redactor(sensitive_data)
+
+	result = redactor.redact('admin secret123 user@example.com google_pass sk-123')
+	assert result == (
+		'<secret>username</secret> <secret>password</secret> <secret>email</secret> '
+		'<secret>password</secret> <secret>api_key</secret>'
+	)
+
+
+def test_shared_value_prefers_placeholder_of_current_domain():
+	redactor = get_redactor({'a.com': {'user': 'bob'}, 'b.com': {'login': 'bob'}})
+
+	assert redactor.redact('bob') == '<secret>user</secret>'
+	assert redactor.redact('bob', url='https://b.com/signin') == '<secret>login</secret>'
+
+
+def test_compiled_once_per_content():
+	first = get_redactor({'password': 'p1'})
+	assert get_redactor({'password': 'p1'}) is first
+	assert get_redactor({'password': 'p2'}) is not first
+
+
+def test_empty_values_ignored():
+	redactor = get_redactor({'password': '', 'site.com': {'user': ''}})
+	assert redactor.is_empty
+	assert redactor.redact('nothing to hide') == 'nothing to hide'
+
+
+def test_redact_data_recurses():
+	redactor = get_redactor({'password': 'hunter2'})
+	data = {'input': {'text': 'hunter2', 'items': ['x hunter2', {'deep': 'hunter2'}, 3]}}
+	assert redactor.redact_data(data) == {
+		'input': {
+			'text': '<secret>password</secret>',
+			'items': ['x <secret>password</secret>', {'deep': '<secret>password</secret>'}, 3],
+		}
+	}
@@ -0,0 +1,117 @@
+"""Tests for StepPipeline and StepTimer, the building blocks of Agent(pipeline_steps=True) (no browser needed)."""
+
+import asyncio
+import logging
+from typing import cast
+
+from browser_use.agent.pipeline import StepPipeline, StepTimer
+from browser_use.agent.views import AgentSettings, StepMetadata
+from browser_use.dom.serializer import serializer
+from browser_use.dom.views import SerializedDOMState, SimplifiedNode
+
+logger = logging.getLogger('test_agent_pipeline')
+
+
+def test_step_timer_accumulates_laps_per_phase():
+	timer = StepTimer()
+	timer.lap('browser_state')
+	timer.lap('llm')
+	timer.lap('llm')
+
+	assert list(timer.phases) == ['browser_state', 'llm']
+	assert all(ms >= 0 for ms in timer.phases.values())
+	assert timer.summary().startswith('browser_state ') and ' | llm ' in timer.summary()
+
+
+async def test_prefetch_runs_in_background_and_is_handed_over_once():
+	pipeline: StepPipeline[str] = StepPipeline(logger)
+	started = asyncio.Event()
+
+	async def capture() -> str:
+		started.set()
+		await asyncio.sleep(0.01)
+		return 'state'
+
+	pipeline.prefetch(capture())
+	await asyncio.wait_for(started.wait(), 1)  # runs without being awaited
+
+	assert await pipeline.take_prefetched() == 'state'
+	assert await pipeline.take_prefetched() is None
+
+
+async def test_failed_or_replaced_prefetch_falls_back_to_none():
+	pipeline: StepPipeline[str] = StepPipeline(logger)
+	cancelled: list[str] = []
+
+	async def slow(name: str) -> str:
+		try:
+			await asyncio.sleep(10)
+		except asyncio.CancelledError:
+			cancelled.append(name)
+			raise
+		return name
+
+	async def broken() -> str:
+		raise RuntimeError('target detached')
+
+	pipeline.prefetch(slow('first'))
+	await asyncio.sleep(0)
+	pipeline.prefetch(broken())
+	await asyncio.sleep(0)
+	assert cancelled == ['first']
+	assert await pipeline.take_prefetched() is None
+
+	pipeline.prefetch(slow('paused'))
+	await asyncio.sleep(0)
+	pipeline.cancel_prefetch()
+	await asyncio.sleep(0)
+	assert cancelled == ['first', 'paused']
+	assert await pipeline.take_prefetched() is None
+
+
+async def test_deferred_work_runs_in_order_and_drain_waits_for_it():
+	pipeline: StepPipeline[str] = StepPipeline(logger)
+	done: list[int] = []
+
+	def persist(step: int, delay: float):
+		async def work() -> None:
+			await asyncio.sleep(delay)
+			if step == 2:
+				raise OSError('disk full')
+			done.append(step)
+
+		return work
+
+	# Earlier steps are slower, but must still land first
+	for step, delay in ((1, 0.03), (2, 0.02), (3, 0.0)):
+		pipeline.defer(persist(step, delay))
+	assert done == []
+
+	await pipeline.drain()
+	assert done == [1, 3]  # a failed write does not block later steps
+
+	await pipeline.drain()  # idempotent
+
+
+def test_pipelining_is_opt_in_and_timings_are_recorded_in_metadata():
+	assert AgentSettings().pipeline_steps is False
+	metadata = StepMetadata(step_start_time=0.0, step_end_time=1.0, step_number=1, phase_timings={'llm': 800.0})
+	assert metadata.model_dump()['phase_timings'] == {'llm': 800.0}
+
+
+def test_dom_rendered_ahead_of_the_prompt_is_reused(monkeypatch):
+	calls = []
+
+	def serialize_tree(node, include_attributes, fragments=None):
+		calls.append(tuple(include_attributes))
+		return f'rendered {len(calls)}'
+
+	monkeypatch.setattr(serializer.DOMTreeSerializer, 'serialize_tree', staticmethod(serialize_tree))
+	root = cast(SimplifiedNode, object())
+	dom_state = SerializedDOMState(_root=root, selector_map={})
+
+	# The prefetch renders with the agent's attributes, the prompt renders again with the same ones
+	assert dom_state.llm_representation(include_attributes=None) == 'rendered 1'
+	assert dom_state.llm_representation(include_attributes=[]) == 'rendered 1'
+	assert dom_state.llm_representation(include_attributes=['id']) == 'rendered 2'
+	assert len(calls) == 2
@@ -0,0 +1,200 @@
+"""Tests for the worker-scoped browser lease manager (navigator/temporal/browser_pool.py)."""
+
+import asyncio
+from typing import cast
+
+import pytest
+from bubus import EventBus
+from pytest_httpserver import HTTPServer
+
+from browser_use.browser import BrowserSession
+from browser_use.browser.profile import BrowserProfile
+from navigator.temporal.browser_pool import BrowserLeaseManager
+
+
+class FakeBrowserSession:
+	"""Stand-in for BrowserSession that only tracks lifecycle calls."""
+
+	created = 0
+
+	def __init__(self):
+		FakeBrowserSession.created += 1
+		self.started = False
+		self.killed = False
+		self.event_bus = EventBus()
+		self._cdp_client_root = None
+		self._local_browser_watchdog = None
+
+	async def start(self):
+		await asyncio.sleep(0.01)
+		self.started = True
+		self._cdp_client_root = object()
+
+	async def kill(self):
+		self.killed = True
+		self._cdp_client_root = None
+
+
+def fake(session: BrowserSession | None) -> FakeBrowserSession:
+	return cast(FakeBrowserSession, session)
+
+
+class FakeLeaseManager(BrowserLeaseManager):
+	def __init__(self, *args, memory_mb: float | None = None, **kwargs):
+		super().__init__(*args, session_factory=lambda: cast(BrowserSession, FakeBrowserSession()), **kwargs)
+		self.memory_mb = memory_mb
+		self.context_resets = 0
+
+	async def _prepare_clean_context(self, slot):
+		if slot.uses > 0:
+			self.context_resets += 1
+
+	def _get_memory_mb(self, session):
+		return self.memory_mb
+
+
+@pytest.fixture(autouse=True)
+def reset_counter():
+	FakeBrowserSession.created = 0
+
+
+async def test_sessions_are_reused_across_leases():
+	manager = FakeLeaseManager(slots=1)
+
+	async with manager.lease() as first:
+		pass
+	async with manager.lease() as second:
+		pass
+
+	assert first is second
+	assert FakeBrowserSession.created == 1
+	assert manager.stats.cold_starts == 1
+	assert manager.stats.warm_reuses == 1
+	assert manager.context_resets == 1
+
+
+async def test_lease_concurrency_bounded_by_slots():
+	manager = FakeLeaseManager(slots=2)
+	active = 0
+	peak = 0
+
+	async def explore():
+		nonlocal active, peak
+		async with manager.lease():
+			active += 1
+			peak = max(peak, active)
+			await asyncio.sleep(0.02)
+			active -= 1
+
+	await asyncio.gather(*(explore() for _ in range(6)))
+
+	assert peak == 2
+	assert FakeBrowserSession.created == 2
+	assert manager.stats.leases == 6
+
+
+async def test_crashed_session_is_recycled():
+	manager = FakeLeaseManager(slots=1)
+
+	with pytest.raises(RuntimeError):
+		async with manager.lease() as session:
+			session._cdp_client_root = None  # Simulate browser crash
+			raise RuntimeError('Target crashed')
+
+	assert fake(session).killed
+	async with manager.lease() as replacement:
+		assert replacement is not session
+	assert manager.stats.recycles == 1
+
+
+async def test_activity_error_keeps_a_healthy_session():
+	manager = FakeLeaseManager(slots=1)
+
+	with pytest.raises(TimeoutError):
+		async with manager.lease() as session:
+			raise TimeoutError('Navigation timed out')
+
+	assert not fake(session).killed
+	async with manager.lease() as same:
+		assert same is session
+	assert manager.stats.recycles == 0
+
+
+async def test_memory_limit_triggers_recycle():
+	manager = FakeLeaseManager(slots=1, max_memory_mb=100, memory_mb=500)
+
+	async with manager.lease() as session:
+		pass
+
+	assert fake(session).killed
+	assert manager.stats.recycles == 1
+
+
+async def test_max_uses_triggers_recycle():
+	manager = FakeLeaseManager(slots=1, max_uses=2)
+
+	sessions = []
+	for _ in range(3):
+		async with manager.lease() as session:
+			sessions.append(session)
+
+	assert sessions[0] is sessions[1]
+	assert sessions[2] is not sessions[0]
+
+
+async def test_close_kills_all_sessions():
+	manager = FakeLeaseManager(slots=2)
+	await manager.warm_up()
+	sessions = [slot.session for slot in manager._all_slots]
+
+	await manager.close()
+
+	assert all(fake(session).killed for session in sessions)
+	with pytest.raises(RuntimeError):
+		async with manager.lease():
+			pass
+
+
+async def _page_storage(session: BrowserSession) -> dict:
+	cdp_session = await session.get_or_create_cdp_session()
+	result = await cdp_session.cdp_client.send.Runtime.evaluate(
+		params={'expression': "({item: localStorage.getItem('k'), cookie: document.cookie})", 'returnByValue': True},
+		session_id=cdp_session.session_id,
+	)
+	return result['result'].get('value', {})
+
+
+async def test_real_cleanup_clears_storage_of_origins_reached_by_the_page(httpserver: HTTPServer):
+	"""The page hops to a second origin and back by itself, so only the tab history knows the second origin."""
+	blank_url = httpserver.url_for('/blank')
+	other_origin = httpserver.url_for('/').replace('localhost', '127.0.0.1').rstrip('/')
+	sets_storage = "<script>localStorage.setItem('k', 'v'); document.cookie = 'c=1'; location.href = '{next}';</script>"
+	httpserver.expect_request('/first').respond_with_data(
+		sets_storage.format(next=f'{other_origin}/second'), content_type='text/html'
+	)
+	httpserver.expect_request('/second').respond_with_data(sets_storage.format(next=blank_url), content_type='text/html')
+	httpserver.expect_request('/blank').respond_with_data('<p>blank</p>', content_type='text/html')
+
+	manager = BrowserLeaseManager(
+		slots=1,
+		session_factory=lambda: BrowserSession(
+			browser_profile=BrowserProfile(headless=True, user_data_dir=None, keep_alive=True)
+		),
+	)
+	try:
+		async with manager.lease() as session:
+			await session.navigate_to(httpserver.url_for('/first'))
+			for _ in range(50):
+				if await session.get_current_page_url() == blank_url:
+					break
+				await asyncio.sleep(0.1)
+			assert await session.get_current_page_url() == blank_url
+			assert (await _page_storage(session))['item'] == 'v'
+
+		async with manager.lease() as session:
+			for url in (blank_url, f'{other_origin}/blank'):
+				await session.navigate_to(url)
+				assert await _page_storage(session) == {'item': None, 'cookie': ''}
+			assert len(await session.get_tabs()) == 1
+	finally:
+		await manager.close()
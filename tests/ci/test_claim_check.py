@@ -0,0 +1,207 @@
+"""Tests for claim-check payload storage (navigator/temporal/claim_check.py)."""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+
+import pytest
+import temporalio.converter
+from temporalio.api.common.v1 import Payload
+
+from navigator.temporal.claim_check import (
+	CLAIM_CHECK_ENCODING,
+	ClaimCheckPayloadCodec,
+	ClaimCheckStore,
+	LocalBlobStore,
+	claim_check_data_converter,
+	compress_blob,
+	decompress_blob,
+	is_claim_check_ref,
+	stream_json_hash,
+)
+from navigator.temporal.idempotency import IdempotencyManager
+
+
+class FakeCollection:
+	"""Minimal in-memory stand-in for the activity_execution_log collection."""
+
+	def __init__(self):
+		self.docs: dict[str, dict] = {}
+
+	async def update_one(self, query, update, upsert=False):
+		self.docs[query['idempotency_key']] = dict(update['$set'])
+
+	async def find_one(self, query):
+		doc = self.docs.get(query['idempotency_key'])
+		if doc and doc['success'] == query.get('success', doc['success']):
+			return doc
+		return None
+
+
+class FakeDatabase:
+	def __init__(self):
+		self.collection = FakeCollection()
+
+	def __getitem__(self, name):
+		return self.collection
+
+
+@pytest.fixture
+def store(tmp_path):
+	return ClaimCheckStore(blob_store=LocalBlobStore(tmp_path / 'blobs'), threshold_bytes=1024)
+
+
+def _large_output(n: int = 200) -> dict:
+	return {'screens': [{'screen_id': f'screen_{i}', 'name': f'Screen {i}', 'description': 'x' * 50} for i in range(n)]}
+
+
+class TestCompression:
+	def test_roundtrip(self):
+		data = b'hello world ' * 1000
+		blob = compress_blob(data)
+		assert len(blob) < len(data)
+		assert decompress_blob(blob) == data
+
+	def test_unknown_codec_rejected(self):
+		with pytest.raises(ValueError):
+			decompress_blob(b'?garbage')
+
+
+class TestStreamJsonHash:
+	def test_matches_json_dumps(self):
+		data = {'b': [1, 2, {'z': None, 'a': 'é'}], 'a': 1.5}
+		expected = hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+		digest, size = stream_json_hash(data)
+		assert digest == expected
+		assert size == len(json.dumps(data, sort_keys=True, default=str).encode('utf-8'))
+
+	def test_compute_input_hash_unchanged(self):
+		"""Existing idempotency keys must stay valid after switching to streaming hashing."""
+		data = {'url': 'https://example.com', 'type': 'docs'}
+		legacy = hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+		assert IdempotencyManager.compute_input_hash(data) == legacy
+
+
+class TestClaimCheckStore:
+	async def test_small_payload_stays_inline(self, store):
+		data = {'result': 'success'}
+		assert await store.put_json(data) == data
+		assert store.stats.inline_count == 1
+
+	async def test_large_payload_is_offloaded(self, store):
+		data = _large_output()
+		ref = await store.put_json(data)
+		assert is_claim_check_ref(ref)
+		assert len(json.dumps(ref)) < 200
+		assert await store.resolve(ref) == data
+
+	async def test_content_addressed_deduplication(self, store, tmp_path):
+		ref1 = await store.put_json(_large_output())
+		ref2 = await store.put_json(_large_output())
+		assert ref1 == ref2
+		assert len(list((tmp_path / 'blobs').rglob('*'))) == 2  # one fan-out dir + one blob
+
+	async def test_concurrent_puts_of_the_same_blob(self, tmp_path, monkeypatch):
+		blob_store = LocalBlobStore(tmp_path / 'blobs')
+		blob = compress_blob(b'x' * 10_000)
+		# Both writers finish their temp file before either renames it into place
+		both_written = threading.Barrier(2, timeout=5)
+		real_replace = os.replace
+
+		def replace(src, dst):
+			both_written.wait()
+			real_replace(src, dst)
+
+		monkeypatch.setattr(os, 'replace', replace)
+		await asyncio.gather(blob_store.put('ab' * 32, blob), blob_store.put('ab' * 32, blob))
+
+		assert await blob_store.get('ab' * 32) == blob
+		assert [p.name for p in (tmp_path / 'blobs').rglob('*') if p.is_file()] == ['ab' * 32]
+
+	async def test_corrupted_blob_detected(self, store, tmp_path):
+		ref = await store.put_json(_large_output())
+		blob_path = next(p for p in (tmp_path / 'blobs').rglob('*') if p.is_file())
+		blob_path.write_bytes(compress_blob(b'{"tampered": true}'))
+		with pytest.raises(ValueError):
+			await store.resolve(ref)
+
+
+class TestIdempotencyClaimCheck:
+	async def test_record_and_resolve_large_output(self, store):
+		db = FakeDatabase()
+		manager = IdempotencyManager(db, claim_check_store=store)  # type: ignore[arg-type]
+		output = _large_output()
+
+		await manager.record_execution('wf-1', 'extract_screens_activity', {'id': 1}, output, success=True)
+
+		stored = next(iter(db.collection.docs.values()))
+		assert is_claim_check_ref(stored['output_data'])
+		assert manager.mongo_output_bytes_written < 200
+
+		cached = await manager.check_already_executed('wf-1', 'extract_screens_activity', {'id': 1})
+		assert cached == output
+
+	async def test_missing_blob_is_cache_miss(self, store, tmp_path):
+		db = FakeDatabase()
+		manager = IdempotencyManager(db, claim_check_store=store)  # type: ignore[arg-type]
+		await manager.record_execution('wf-1', 'a', {'id': 1}, _large_output(), success=True)
+		for path in (tmp_path / 'blobs').rglob('*'):
+			if path.is_file():
+				path.unlink()
+		assert await manager.check_already_executed('wf-1', 'a', {'id': 1}) is None
+
+	async def test_without_store_output_stays_inline(self):
+		db = FakeDatabase()
+		manager = IdempotencyManager(db)  # type: ignore[arg-type]
+		output = _large_output()
+		await manager.record_execution('wf-1', 'a', {'id': 1}, output, success=True)
+		assert await manager.check_already_executed('wf-1', 'a', {'id': 1}) == output
+
+
+class TestConfiguration:
+	def test_disabled_by_default(self, monkeypatch):
+		for name in ('CLAIM_CHECK_ENABLED', 'CLAIM_CHECK_BACKEND', 'CLAIM_CHECK_DIR', 'S3_BUCKET'):
+			monkeypatch.delenv(name, raising=False)
+		assert ClaimCheckStore.from_env() is None
+
+	def test_local_backend_needs_an_explicit_directory(self, monkeypatch, tmp_path):
+		for name in ('CLAIM_CHECK_BACKEND', 'CLAIM_CHECK_DIR', 'S3_BUCKET'):
+			monkeypatch.delenv(name, raising=False)
+		monkeypatch.setenv('CLAIM_CHECK_ENABLED', 'true')
+		assert ClaimCheckStore.from_env() is None
+
+		monkeypatch.setenv('CLAIM_CHECK_DIR', str(tmp_path / 'shared'))
+		store = ClaimCheckStore.from_env()
+		assert store is not None
+		assert isinstance(store.blob_store, LocalBlobStore) and store.blob_store.base_dir == tmp_path / 'shared'
+
+
+class TestPayloadCodec:
+	async def test_codec_roundtrip(self, store):
+		codec = ClaimCheckPayloadCodec(store)
+		small = Payload(metadata={'encoding': b'json/plain'}, data=b'{"a":1}')
+		large = Payload(metadata={'encoding': b'json/plain'}, data=json.dumps(_large_output()).encode())
+
+		encoded = await codec.encode([small, large])
+		assert encoded[0] == small
+		assert encoded[1].metadata['encoding'] == CLAIM_CHECK_ENCODING
+		assert encoded[1].ByteSize() < 200
+
+		decoded = await codec.decode(encoded)
+		assert decoded == [small, large]
+
+	async def test_data_converter_history_contains_digest_only(self, store):
+		converter = claim_check_data_converter(store)
+		output = _large_output()
+
+		payloads = await converter.encode([output])
+		assert payloads[0].ByteSize() < 200
+
+		values = await converter.decode(payloads, [dict])
+		assert values == [output]
+
+		# Plain default converter for comparison
+		plain = await temporalio.converter.default().encode([output])
+		assert plain[0].ByteSize() > 10 * payloads[0].ByteSize()
@@ -0,0 +1,168 @@
+"""Tests for the batched cloud sync pipeline, against a local stub of the events endpoint."""
+
+import asyncio
+import gzip
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from bubus import BaseEvent
+from pytest_httpserver import HTTPServer
+from werkzeug import Request, Response
+
+from browser_use.sync.service import CloudSync
+
+
+class SyncTestEvent(BaseEvent):
+	value: int
+
+
+class EventsEndpoint:
+	"""Records the batches POSTed to /api/v1/events and answers with `status`."""
+
+	def __init__(self, httpserver: HTTPServer):
+		self.status = 200
+		self.delay = 0.0
+		self.batches: list[list[int]] = []
+		self.requests = 0
+		httpserver.expect_request('/api/v1/events', method='POST').respond_with_handler(self.handle)
+
+	def handle(self, request: Request) -> Response:
+		self.requests += 1
+		time.sleep(self.delay)
+		if self.status == 200:
+			assert request.headers['Content-Encoding'] == 'gzip'
+			events = json.loads(gzip.decompress(request.get_data()))['events']
+			self.batches.append([event['value'] for event in events])
+		return Response('{}', status=self.status, content_type='application/json')
+
+	@property
+	def received(self) -> list[int]:
+		return [value for batch in self.batches for value in batch]
+
+
+@pytest.fixture
+def endpoint(httpserver: HTTPServer) -> EventsEndpoint:
+	return EventsEndpoint(httpserver)
+
+
+def make_sync(httpserver: HTTPServer, spill_dir: Path, **kwargs) -> CloudSync:
+	kwargs = {'flush_interval': 10.0, 'max_retries': 1, 'retry_base_delay': 0.01, **kwargs}
+	return CloudSync(base_url=httpserver.url_for(''), allow_session_events_for_auth=True, spill_dir=spill_dir, **kwargs)
+
+
+async def send(sync: CloudSync, values) -> None:
+	for value in values:
+		await sync.handle_event(SyncTestEvent(value=value))
+
+
+async def test_events_are_batched_by_size_in_order(httpserver, endpoint, tmp_path):
+	sync = make_sync(httpserver, tmp_path, max_batch_size=3)
+	await send(sync, range(7))
+	assert await sync.flush(timeout=5)
+
+	assert endpoint.batches == [[0, 1, 2], [3, 4, 5], [6]]
+	metrics = sync.get_metrics()
+	assert metrics['events_sent'] == 7 and metrics['batch_size']['max'] == 3
+	assert metrics['latency_seconds']['count'] == 3 and metrics['queue_depth'] == 0
+	await sync.close()
+
+
+async def test_partial_batches_are_sent_after_the_flush_interval(httpserver, endpoint, tmp_path):
+	sync = make_sync(httpserver, tmp_path, flush_interval=0.05)
+	await send(sync, [1, 2])
+	await asyncio.sleep(0.5)
+
+	assert endpoint.batches == [[1, 2]]
+	client = sync._client
+	await send(sync, [3])
+	await asyncio.sleep(0.5)
+	# The same client (and its connections) is reused for every batch
+	assert endpoint.batches == [[1, 2], [3]] and sync._client is client
+	await sync.close()
+
+
+async def test_slow_endpoint_does_not_delay_event_handlers(httpserver, endpoint, tmp_path):
+	endpoint.delay = 0.5
+	sync = make_sync(httpserver, tmp_path, flush_interval=0.0)
+	start = time.perf_counter()
+	await send(sync, range(20))
+	assert time.perf_counter() - start < 0.2
+	await sync.close()
+	assert endpoint.received == list(range(20))
+
+
+async def test_events_spill_to_disk_while_endpoint_is_down(httpserver, endpoint, tmp_path):
+	endpoint.status = 503
+	sync = make_sync(httpserver, tmp_path, max_batch_size=2)
+	await send(sync, range(3))
+	assert not await sync.flush(timeout=0.5)
+	# The failed batch is on disk; newer events wait behind it in memory
+	metrics = sync.get_metrics()
+	assert metrics['spill_depth'] == 2 and metrics['queue_depth'] == 1 and metrics['retries'] >= 1
+	# One segment, possibly claimed (renamed to <segment>.<pid>) by a retry in progress
+	assert [p.name.split('.')[1] for p in tmp_path.iterdir()] == ['jsonl']
+
+	await send(sync, [3, 4])
+	endpoint.status = 200
+	assert await sync.flush(timeout=5)
+
+	assert endpoint.received == [0, 1, 2, 3, 4]
+	assert list(tmp_path.iterdir()) == []
+	assert sync.get_metrics()['spill_depth'] == 0
+	await sync.close()
+
+
+async def test_full_queue_spills_in_order(httpserver, endpoint, tmp_path):
+	sync = make_sync(httpserver, tmp_path, max_batch_size=2, max_queue_size=3)
+	await send(sync, range(5))
+	assert sync.get_metrics()['spill_depth'] == 4
+	assert await sync.flush(timeout=5)
+	assert endpoint.received == [0, 1, 2, 3, 4]
+	await sync.close()
+
+
+async def test_unsent_events_survive_shutdown_and_go_first_next_run(httpserver, endpoint, tmp_path):
+	endpoint.status = 503
+	sync = make_sync(httpserver, tmp_path)
+	await send(sync, range(3))
+	await sync.close(timeout=0.3)
+	assert endpoint.received == []
+	assert len(list(tmp_path.glob('*.jsonl'))) == 1
+
+	endpoint.status = 200
+	next_run = make_sync(httpserver, tmp_path)
+	# Leftovers are read by the sender, not by metrics on the event loop
+	assert next_run.get_metrics()['spill_depth'] == 0
+	await send(next_run, [3])
+	await next_run.close()
+	assert endpoint.received == [0, 1, 2, 3]
+	assert list(tmp_path.iterdir()) == []
+
+
+async def test_segments_claimed_by_a_dead_process_are_sent(httpserver, endpoint, tmp_path):
+	exited = await asyncio.create_subprocess_exec(sys.executable, '-c', 'pass')
+	await exited.wait()
+	claimed = tmp_path / f'{1:020d}.jsonl.{exited.pid}'
+	claimed.write_text(''.join(json.dumps({'value': value}) + '\n' for value in range(3)))
+
+	sync = make_sync(httpserver, tmp_path)
+	assert await sync.flush(timeout=5)
+
+	assert endpoint.received == [0, 1, 2]
+	assert list(tmp_path.iterdir()) == []
+	await sync.close()
+
+
+async def test_rejected_batches_are_dropped_without_retrying(httpserver, endpoint, tmp_path):
+	endpoint.status = 400
+	sync = make_sync(httpserver, tmp_path, max_retries=3)
+	await send(sync, range(2))
+	assert await sync.flush(timeout=5)
+
+	assert endpoint.requests == 1
+	assert sync.get_metrics()['events_dropped'] == 2
+	assert list(tmp_path.iterdir()) == []
+	await sync.close()
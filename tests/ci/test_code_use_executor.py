@@ -0,0 +1,87 @@
+"""Tests for code-use cell execution: the compiled-cell cache and incremental Available line."""
+
+import asyncio
+import traceback
+
+import pytest
+
+from browser_use.code_use.executor import CellExecutor
+from browser_use.code_use.formatting import format_available_variables, summarize_value
+
+
+@pytest.fixture
+def executor() -> CellExecutor:
+	return CellExecutor({'asyncio': asyncio})
+
+
+async def test_rerun_cells_are_not_recompiled(executor):
+	await executor.run('x = 1')
+	await executor.run('y = x + 1')
+	await executor.run('x = 1')
+
+	assert executor.namespace['y'] == 2
+	assert (executor.hits, executor.misses) == (1, 2)
+
+
+async def test_await_cells_persist_variables_like_jupyter(executor):
+	await executor.run('total = 10')
+	await executor.run('await asyncio.sleep(0)\ntotal = total + 5\nnew_var = "a"')
+	await executor.run('global counter\nawait asyncio.sleep(0)\ncounter = 3')
+
+	ns = executor.namespace
+	assert ns['total'] == 15 and ns['new_var'] == 'a' and ns['counter'] == 3
+	assert '__code_exec__' not in ns
+
+	# The wrapper declares `fresh` global once it exists, so the second run compiles again
+	for _ in range(3):
+		await executor.run('await asyncio.sleep(0)\nfresh = 1')
+	assert (executor.hits, executor.misses) == (1, 5)
+
+
+@pytest.mark.parametrize('prefix', ['', 'await asyncio.sleep(0)\n'])
+async def test_tracebacks_point_at_the_cell_line(executor, prefix):
+	with pytest.raises(ZeroDivisionError) as exc_info:
+		await executor.run(f'{prefix}a = 1\n\nb = a / 0')
+
+	frame = [f for f in traceback.extract_tb(exc_info.value.__traceback__) if f.filename == '<code>'][-1]
+	assert frame.lineno == prefix.count('\n') + 3
+
+
+async def test_syntax_errors_keep_the_cell_line(executor):
+	with pytest.raises(SyntaxError) as exc_info:
+		await executor.run('x = 1\ny = (')
+	assert exc_info.value.lineno == 2
+
+
+async def test_available_line_matches_a_full_rebuild(executor):
+	ns = executor.namespace
+	ns['_code_block_vars'] = set()
+
+	async def check(source: str | None = None) -> None:
+		if source is not None:
+			await executor.run(source)
+		assert executor.tracker.format_available() == format_available_variables(ns)
+
+	await check()
+	await check('items = [1, 2]\nbrowser = None\n_private = 1')
+	await check('items.append(3)')
+	# Code block variables are injected outside of cells
+	ns['js'] = '(function(){ return document.title })()'
+	ns['query'] = 'SELECT *\nFROM table WHERE id > 100'
+	ns['_code_block_vars'] = {'js', 'query'}
+	await check()
+	ns['query'] = 'SELECT 1'
+	await check()
+	await check('del items\nlater = 1')
+	ns['_code_block_vars'] = {'js', 'later'}
+	await check()
+	ns['_code_block_vars'] = set()
+	await check()
+
+
+def test_large_values_are_summarized_with_a_cap():
+	rows = [{'id': i, 'title': 'x' * 1000} for i in range(100_000)]
+	preview = summarize_value(rows)
+	assert len(preview) <= 400 and preview.startswith("[{'id': 0")
+	assert summarize_value('abc' * 1000, max_chars=10) == 'abcabcabca'
+	assert summarize_value([1, 2]) == '[1, 2]'
@@ -0,0 +1,191 @@
+"""Tests for concurrent cross-origin iframe collection in DomService, with CDP replaced by an in-memory page."""
+
+import asyncio
+import logging
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from browser_use.dom import service as dom_service_module
+from browser_use.dom.service import DomService
+from browser_use.dom.views import DOMRect, EnhancedSnapshotNode, TargetAllTrees
+
+FRAME_BOUNDS = DOMRect(x=0.0, y=0.0, width=300.0, height=200.0)
+
+
+class _EverythingVisible(dict):
+	"""Snapshot lookup that gives every node iframe-sized bounds."""
+
+	def get(self, key, default=None):
+		return EnhancedSnapshotNode(
+			is_clickable=None,
+			cursor_style=None,
+			bounds=FRAME_BOUNDS,
+			clientRects=FRAME_BOUNDS,
+			scrollRects=None,
+			computed_styles=None,
+			paint_order=None,
+			stacking_contexts=None,
+		)
+
+
+def make_document(target_id: str, iframe_frame_ids: list[str]) -> dict:
+	"""A document whose body holds a text div and one out-of-process iframe per frame id."""
+	ids = iter(range(1, 1_000))
+
+	def node(name: str, node_type: int = 1, children: list | None = None, **extra) -> dict:
+		node_id = next(ids)
+		return {
+			'nodeId': node_id,
+			'backendNodeId': node_id,
+			'nodeType': node_type,
+			'nodeName': name,
+			'nodeValue': '',
+			'children': children or [],
+			**extra,
+		}
+
+	iframes = [node('IFRAME', frameId=frame_id) for frame_id in iframe_frame_ids]
+	text = node('#text', node_type=3)
+	text['nodeValue'] = f'content of {target_id}'
+	body = node('BODY', children=[node('DIV', children=[text]), *iframes])
+	return node('#document', node_type=9, children=[node('HTML', children=[body], frameId=f'main-{target_id}')])
+
+
+class FakePage:
+	"""Targets, frames and CDP latency of a page with out-of-process iframes."""
+
+	def __init__(self, children: dict[str, list[str]], delays: dict[str, float], default_delay: float = 0.05):
+		# target id -> target ids of its iframes
+		self.children = children
+		self.delays = delays
+		self.default_delay = default_delay
+		self.in_flight = 0
+		self.peak = 0
+		self.cancelled: list[str] = []
+		self.get_all_frames_calls = 0
+
+		self.browser_session = SimpleNamespace(
+			logger=logging.getLogger('test_dom_iframe_collection'),
+			get_or_create_cdp_session=self.get_or_create_cdp_session,
+			get_all_frames=self.get_all_frames,
+			session_manager=SimpleNamespace(get_target=self.get_target),
+		)
+
+	async def get_or_create_cdp_session(self, target_id=None, focus=False):
+		raise ValueError('no CDP in this test')
+
+	async def get_all_frames(self):
+		self.get_all_frames_calls += 1
+		frames = {f'frame-{child}': {'frameTargetId': child} for children in self.children.values() for child in children}
+		return frames, {}
+
+	def get_target(self, target_id: str):
+		return SimpleNamespace(target_id=target_id, url=f'https://{target_id}.test/', title=target_id, target_type='iframe')
+
+	async def get_all_trees(self, target_id: str) -> TargetAllTrees:
+		self.in_flight += 1
+		self.peak = max(self.peak, self.in_flight)
+		try:
+			await asyncio.sleep(self.delays.get(target_id, self.default_delay))
+		except asyncio.CancelledError:
+			self.cancelled.append(target_id)
+			raise
+		finally:
+			self.in_flight -= 1
+		document = make_document(target_id, [f'frame-{child}' for child in self.children.get(target_id, [])])
+		return TargetAllTrees(
+			snapshot={'documents': [], 'strings': []},
+			dom_tree={'root': document},  # type: ignore[typeddict-item]
+			ax_tree={'nodes': []},
+			device_pixel_ratio=1.0,
+			cdp_timing={},
+		)
+
+
+@pytest.fixture(autouse=True)
+def everything_visible(monkeypatch):
+	monkeypatch.setattr(dom_service_module, 'build_snapshot_lookup', lambda snapshot, device_pixel_ratio: _EverythingVisible())
+	monkeypatch.setattr(DomService, 'is_element_visible_according_to_all_parents', classmethod(lambda cls, node, frames: True))
+
+
+def make_service(page: FakePage, **kwargs) -> DomService:
+	service = DomService(browser_session=page.browser_session, cross_origin_iframes=True, **kwargs)  # type: ignore[arg-type]
+	service._get_all_trees = page.get_all_trees  # type: ignore[method-assign]
+	return service
+
+
+def iframe_documents(root) -> dict[str, object]:
+	"""Iframe target id -> grafted content document, across the whole tree."""
+	found = {}
+	stack = [root]
+	while stack:
+		node = stack.pop()
+		if node.tag_name == 'iframe' and node.content_document is not None:
+			assert node.content_document.parent_node is node
+			found[node.content_document.target_id] = node.content_document
+		stack.extend(node.children_nodes or [])
+		if node.content_document is not None:
+			stack.append(node.content_document)
+	return found
+
+
+async def test_iframes_are_collected_concurrently_with_bounded_fan_out():
+	frames = [f'widget-{i}' for i in range(6)]
+	page = FakePage(children={'main': frames, 'widget-0': ['nested']}, delays={'main': 0.0}, default_delay=0.1)
+	service = make_service(page, max_parallel_iframes=3)
+
+	start = time.perf_counter()
+	root, timing = await service.get_dom_tree('main')
+	elapsed = time.perf_counter() - start
+
+	assert set(iframe_documents(root)) == {*frames, 'nested'}
+	assert page.peak == 3
+	# 7 frames at 100ms each: 3 waves with 3 slots instead of 700ms one after another
+	assert elapsed < 0.5
+	assert {key for key in timing if key.startswith('cross_origin_iframe_')} == {
+		f'cross_origin_iframe_{target}_ms' for target in (*frames, 'nested')
+	}
+	assert timing['cross_origin_iframes_ms'] > 0
+	assert page.get_all_frames_calls == 1  # fetched once and handed down to nested frames
+
+
+async def test_frames_over_the_shared_budget_are_dropped():
+	page = FakePage(
+		children={'main': ['fast', 'slow', 'stuck'], 'fast': ['slow-nested']},
+		delays={'main': 0.0, 'fast': 0.05, 'slow': 5.0, 'slow-nested': 5.0, 'stuck': 30.0},
+	)
+	service = make_service(page, iframe_timeout=0.3)
+
+	start = time.perf_counter()
+	root, timing = await service.get_dom_tree('main')
+
+	assert time.perf_counter() - start < 1.0
+	assert set(iframe_documents(root)) == {'fast'}
+	assert sorted(page.cancelled) == ['slow', 'slow-nested', 'stuck']
+	assert 'cross_origin_iframe_slow_ms' not in timing
+
+
+async def test_failing_iframe_does_not_fail_the_page(monkeypatch):
+	page = FakePage(children={'main': ['ok', 'broken']}, delays={'main': 0.0})
+	get_all_trees = page.get_all_trees
+
+	async def failing_get_all_trees(target_id: str) -> TargetAllTrees:
+		if target_id == 'broken':
+			raise TimeoutError('CDP requests failed or timed out: snapshot')
+		return await get_all_trees(target_id)
+
+	service = make_service(page)
+	service._get_all_trees = failing_get_all_trees  # type: ignore[method-assign]
+
+	root, _ = await service.get_dom_tree('main')
+	assert set(iframe_documents(root)) == {'ok'}
+
+
+async def test_max_iframe_depth_still_applies():
+	page = FakePage(children={'main': ['a'], 'a': ['b'], 'b': ['c']}, delays={})
+	service = make_service(page, max_iframe_depth=2)
+
+	root, _ = await service.get_dom_tree('main')
+	assert set(iframe_documents(root)) == {'a', 'b'}
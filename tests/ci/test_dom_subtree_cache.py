@@ -0,0 +1,241 @@
+"""Tests for subtree-level reuse in DOMTreeSerializer: cached serializations must match fresh ones exactly (no browser needed)."""
+
+from itertools import count
+
+from pydantic import TypeAdapter
+
+from browser_use.browser.views import BrowserStateSummary
+from browser_use.dom.serializer.serializer import DOMTreeSerializer
+from browser_use.dom.serializer.subtree_cache import SubtreeCache
+from browser_use.dom.views import (
+	DEFAULT_INCLUDE_ATTRIBUTES,
+	DOMRect,
+	EnhancedDOMTreeNode,
+	EnhancedSnapshotNode,
+	NodeType,
+	SerializedDOMState,
+)
+
+
+class PageBuilder:
+	"""Builds enhanced DOM trees of a shop page; nodes keep their backend ids across rebuilds, like CDP does."""
+
+	def __init__(self):
+		self._ids = count(1)
+		self._backend_ids: dict[str, int] = {}
+		self._y = 0.0
+
+	def node(
+		self,
+		name: str,
+		path: str,
+		children: list[EnhancedDOMTreeNode] | None = None,
+		text: str = '',
+		attributes: dict[str, str] | None = None,
+		height: float = 20.0,
+		visible: bool = True,
+	) -> EnhancedDOMTreeNode:
+		backend_id = self._backend_ids.setdefault(path, len(self._backend_ids) + 1)
+		node_type = {'#document': NodeType.DOCUMENT_NODE, '#text': NodeType.TEXT_NODE}.get(name, NodeType.ELEMENT_NODE)
+		self._y += height
+		bounds = DOMRect(x=0.0, y=self._y, width=300.0, height=height)
+		node = EnhancedDOMTreeNode(
+			node_id=next(self._ids),
+			backend_node_id=backend_id,
+			node_type=node_type,
+			node_name=name,
+			node_value=text,
+			attributes=attributes or {},
+			is_scrollable=False,
+			is_visible=visible,
+			absolute_position=bounds,
+			target_id='target-1',
+			frame_id='frame-1',
+			session_id=None,
+			content_document=None,
+			shadow_root_type=None,
+			shadow_roots=None,
+			parent_node=None,
+			children_nodes=children or [],
+			ax_node=None,
+			snapshot_node=EnhancedSnapshotNode(
+				is_clickable=None,
+				cursor_style='pointer' if name in ('A', 'BUTTON') else None,
+				bounds=bounds,
+				clientRects=bounds,
+				scrollRects=None,
+				computed_styles=None,
+				paint_order=backend_id,
+				stacking_contexts=None,
+			),
+		)
+		for child in node.children_nodes or []:
+			child.parent_node = node
+		return node
+
+	def text(self, path: str, value: str) -> EnhancedDOMTreeNode:
+		return self.node('#text', path, text=value)
+
+	def page(self, products: int = 20, counter: int = 0, toast: str | None = None, hidden_menu: bool = True):
+		self._y = 0.0
+		cards = [
+			self.node(
+				'DIV',
+				f'card-{i}',
+				[
+					self.node('H3', f'card-{i}/title', [self.text(f'card-{i}/title/text', f'Product {i}')]),
+					self.node(
+						'A', f'card-{i}/link', [self.text(f'card-{i}/link/text', 'Details')], attributes={'href': f'/p/{i}'}
+					),
+					self.node('BUTTON', f'card-{i}/add', [self.text(f'card-{i}/add/text', 'Add to cart')]),
+				],
+				attributes={'class': 'card'},
+			)
+			for i in range(products)
+		]
+		header = self.node(
+			'HEADER',
+			'header',
+			[
+				self.node('INPUT', 'search', attributes={'type': 'text', 'name': 'q', 'placeholder': 'Search'}),
+				self.node('SPAN', 'counter', [self.text('counter/text', f'{counter} items in cart')]),
+			],
+		)
+		body_children = [header]
+		if hidden_menu:
+			menu = [self.node('A', f'menu-{i}', [self.text(f'menu-{i}/text', f'Menu {i}')], visible=False) for i in range(5)]
+			body_children.append(self.node('NAV', 'menu', menu, visible=False))
+		if toast:
+			body_children.append(
+				self.node(
+					'DIV',
+					'toast',
+					[self.text('toast/text', toast), self.node('BUTTON', 'toast/close')],
+					attributes={'role': 'alert'},
+				)
+			)
+		body_children.append(self.node('MAIN', 'main', cards))
+		html = self.node('HTML', 'html', [self.node('BODY', 'body', body_children)])
+		return self.node('#document', 'document', [html])
+
+
+def serialize(root, previous: SerializedDOMState | None, cache: SubtreeCache | None) -> tuple[SerializedDOMState, str]:
+	state, _ = DOMTreeSerializer(root, previous, session_id='session-1', subtree_cache=cache).serialize_accessible_elements()
+	return state, state.llm_representation(DEFAULT_INCLUDE_ATTRIBUTES)
+
+
+def test_cached_serialization_matches_fresh_across_steps():
+	builder = PageBuilder()
+	steps = [
+		{},
+		{'counter': 1},
+		{'counter': 1, 'toast': 'Added to cart'},
+		{'counter': 2, 'toast': 'Added to cart'},
+		{'counter': 2},
+		{'counter': 2, 'products': 25},
+		{'counter': 2, 'products': 25, 'hidden_menu': False},
+	]
+	cache = SubtreeCache()
+	cached_previous = fresh_previous = None
+	texts = []
+	for step in steps:
+		cached_state, cached_text = serialize(builder.page(**step), cached_previous, cache)
+		fresh_state, fresh_text = serialize(builder.page(**step), fresh_previous, None)
+
+		assert cached_text == fresh_text, step
+		assert list(cached_state.selector_map) == list(fresh_state.selector_map)
+		cached_previous, fresh_previous = cached_state, fresh_state
+		texts.append(cached_text)
+
+	assert '*[' in texts[5] and '*[' not in texts[4]  # new products are marked when they appear
+	assert cache.stats.reused_rate > 0.5
+
+
+def test_paint_order_outcome_matches_fresh_when_an_overlay_comes_and_goes():
+	def page(builder: PageBuilder, counter: int, overlay: bool):
+		root = builder.page(products=6, counter=counter, toast='Cookies' if overlay else None)
+		if overlay:
+			# Opaque toast painted above everything, covering the whole page
+			stack = [root]
+			while stack:
+				node = stack.pop()
+				if node.attributes.get('role') == 'alert':
+					node.snapshot_node.bounds = DOMRect(x=0.0, y=0.0, width=300.0, height=5000.0)  # type: ignore[union-attr]
+					node.snapshot_node.paint_order = 10_000  # type: ignore[union-attr]
+					node.snapshot_node.computed_styles = {'background-color': 'rgb(255, 255, 255)', 'opacity': '1'}  # type: ignore[union-attr]
+				stack.extend(node.children_nodes or [])
+		return root
+
+	builder = PageBuilder()
+	cache = SubtreeCache()
+	cached_previous = fresh_previous = None
+	for counter, overlay in ((0, False), (0, True), (1, True), (1, True), (2, False)):
+		cached_state, cached_text = serialize(page(builder, counter, overlay), cached_previous, cache)
+		fresh_state, fresh_text = serialize(page(builder, counter, overlay), fresh_previous, None)
+
+		assert cached_text == fresh_text, (counter, overlay)
+		assert list(cached_state.selector_map) == list(fresh_state.selector_map)
+		cached_previous, fresh_previous = cached_state, fresh_state
+		links = [node for node in cached_state.selector_map.values() if node.tag_name == 'a']
+		assert bool(links) != overlay  # links behind the toast are not indexed
+
+
+def test_selector_map_points_at_current_tree_nodes():
+	builder = PageBuilder()
+	cache = SubtreeCache()
+	first, _ = serialize(builder.page(), None, cache)
+	root = builder.page(counter=3)
+	current_nodes = set()
+	stack = [root]
+	while stack:
+		node = stack.pop()
+		current_nodes.add(id(node))
+		stack.extend(node.children_nodes or [])
+
+	second, _ = serialize(root, first, cache)
+	assert cache.stats.reused_nodes > 0
+	assert all(id(node) in current_nodes for node in second.selector_map.values())
+
+
+def test_only_changed_regions_are_rebuilt():
+	builder = PageBuilder()
+	cache = SubtreeCache()
+	state, _ = serialize(builder.page(products=30), None, cache)
+	assert cache.stats.reused_nodes == 0
+
+	state, _ = serialize(builder.page(products=30, counter=1), state, cache)
+	# Only the counter and its ancestors are simplified and processed again
+	assert cache.stats.simplified_built < 10
+	assert cache.stats.processed_nodes < 10
+	# Rendering re-runs along the same path; the product list comes back as one fragment
+	assert cache.stats.fragment_hits > 0 and cache.stats.fragment_misses < 10
+
+	state, text = serialize(builder.page(products=30, counter=1), state, cache)
+	assert cache.stats.simplified_built == 0 and cache.stats.processed_nodes == 0
+	assert '1 items in cart' in text
+
+
+def test_repeated_llm_representation_reuses_fragments():
+	cache = SubtreeCache()
+	state, text = serialize(PageBuilder().page(), None, cache)
+	misses = cache.stats.fragment_misses
+
+	assert state.llm_representation(DEFAULT_INCLUDE_ATTRIBUTES) == text
+	assert cache.stats.fragment_misses == misses
+	# Different attributes render differently, so they don't share fragments
+	assert state.llm_representation(['href']) != text
+
+
+def test_new_session_drops_entries():
+	builder = PageBuilder()
+	cache = SubtreeCache()
+	root = builder.page()
+	DOMTreeSerializer(root, session_id='a', subtree_cache=cache).serialize_accessible_elements()
+	DOMTreeSerializer(builder.page(), session_id='b', subtree_cache=cache).serialize_accessible_elements()
+	assert cache.stats.reused_nodes == 0 and cache.stats.simplified_reused == 0
+
+
+def test_browser_state_with_fragments_can_be_validated_by_events():
+	"""Browser events validate BrowserStateSummary with pydantic, which must resolve the SerializedDOMState fields."""
+	state = BrowserStateSummary(dom_state=SerializedDOMState(_root=None, selector_map={}), url='about:blank', title='', tabs=[])
+	assert TypeAdapter(BrowserStateSummary).validate_python(state) is state
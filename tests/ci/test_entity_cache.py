@@ -0,0 +1,301 @@
+"""
+Tests for the MongoDB access layer's entity cache and collection handles
+(navigator/storage/entity_cache.py, navigator/storage/mongodb.py).
+
+MongoDB is replaced by an in-memory collection that counts the queries it gets.
+"""
+
+import asyncio
+import itertools
+from collections.abc import Iterable
+
+from navigator.knowledge.extract.actions import ActionDefinition
+from navigator.knowledge.extract.screens import ScreenDefinition, StateSignature
+from navigator.knowledge.extract.transitions import TransitionDefinition, TransitionTrigger
+from navigator.knowledge.persist import navigation
+from navigator.knowledge.persist.documents import actions as action_documents
+from navigator.knowledge.persist.documents import screens as screen_documents
+from navigator.knowledge.persist.documents import tasks as task_documents
+from navigator.knowledge.persist.documents import transitions as transition_documents
+from navigator.storage import mongodb
+from navigator.storage.entity_cache import CachedCollection, CollectionMetrics, EntityCache, find_entities, find_entity
+
+
+class FakeCursor:
+	def __init__(self, docs: list[dict]):
+		self.docs = docs
+
+	def __aiter__(self):
+		return self._iterate()
+
+	async def _iterate(self):
+		for doc in self.docs:
+			yield doc
+
+	async def to_list(self, length=None):
+		return list(self.docs)
+
+
+class FakeCollection:
+	"""Just enough of a motor collection: documents by id field, and the queries made."""
+
+	_object_ids = itertools.count(1)
+
+	def __init__(self, id_field: str, docs: Iterable[dict] = ()):
+		self.id_field = id_field
+		self.docs = {doc[id_field]: {'_id': next(self._object_ids), **doc} for doc in docs}
+		self.queries: list[dict] = []
+		self.read_gate: asyncio.Event | None = None
+
+	def _matches(self, doc: dict, query: dict) -> bool:
+		for field, condition in query.items():
+			if isinstance(condition, dict):
+				if doc.get(field) not in condition['$in']:
+					return False
+			elif doc.get(field) != condition:
+				return False
+		return True
+
+	async def find_one(self, query: dict):
+		self.queries.append(query)
+		snapshot = next((dict(doc) for doc in self.docs.values() if self._matches(doc, query)), None)
+		if self.read_gate is not None:
+			await self.read_gate.wait()
+		return snapshot
+
+	def find(self, query: dict):
+		self.queries.append(query)
+		return FakeCursor([dict(doc) for doc in self.docs.values() if self._matches(doc, query)])
+
+	async def update_one(self, query: dict, update: dict, upsert: bool = False):
+		for doc in self.docs.values():
+			if self._matches(doc, query):
+				doc.update(update['$set'])
+				return
+
+	async def update_many(self, query: dict, update: dict):
+		for doc in self.docs.values():
+			if self._matches(doc, query):
+				doc.update(update['$set'])
+
+
+class ManualClock:
+	def __init__(self):
+		self.time = 100.0
+
+	def __call__(self) -> float:
+		return self.time
+
+
+def cached(collection: FakeCollection, cache: EntityCache | None = None) -> CachedCollection:
+	return CachedCollection(collection, 'brwsr_auto_svc_things', cache or EntityCache(), CollectionMetrics())
+
+
+def things(n: int) -> list[dict]:
+	return [{'thing_id': f't{i}', 'value': i, 'tags': ['a']} for i in range(n)]
+
+
+async def found(collection: FakeCollection | CachedCollection, thing_id: str) -> dict:
+	doc = await find_entity(collection, 'thing_id', thing_id)
+	assert doc is not None
+	return doc
+
+
+async def test_entities_are_read_through_the_cache():
+	fake = FakeCollection('thing_id', things(3))
+	collection = cached(fake)
+
+	doc = await found(collection, 't1')
+	assert doc['value'] == 1
+	doc['tags'].append('changed by caller')
+
+	again = await found(collection, 't1')
+	assert again['tags'] == ['a']
+	assert await find_entity(collection, 'thing_id', 'missing') is None
+	assert fake.queries == [{'thing_id': 't1'}, {'thing_id': 'missing'}]
+	assert collection.cache.stats()['hits'] == 1
+
+
+async def test_batches_only_query_missing_entities():
+	fake = FakeCollection('thing_id', things(5))
+	collection = cached(fake)
+	await find_entity(collection, 'thing_id', 't0')
+
+	docs = await find_entities(collection, 'thing_id', ['t0', 't1', 't2', 't1', 'missing'])
+	assert sorted(docs) == ['t0', 't1', 't2']
+	assert fake.queries[1:] == [{'thing_id': {'$in': ['t1', 't2', 'missing']}}]
+
+	await find_entities(collection, 'thing_id', ['t2', 't1'])
+	assert len(fake.queries) == 2
+
+
+async def test_uncached_collections_are_queried_directly():
+	fake = FakeCollection('thing_id', things(3))
+	assert (await found(fake, 't1'))['value'] == 1
+	assert sorted(await find_entities(fake, 'thing_id', ['t0', 't2'])) == ['t0', 't2']
+
+
+async def test_writes_invalidate_what_they_touch():
+	fake = FakeCollection('thing_id', things(3))
+	collection = cached(fake)
+	await find_entities(collection, 'thing_id', ['t0', 't1', 't2'])
+
+	# Filtered by the entity id: only that entity is read again
+	await collection.update_one({'thing_id': 't1'}, {'$set': {'value': 10}})
+	assert (await found(collection, 't1'))['value'] == 10
+	assert (await found(collection, 't0'))['value'] == 0
+	assert len(fake.queries) == 2
+
+	# Filtered by _id
+	object_id = fake.docs['t2']['_id']
+	await collection.update_one({'_id': object_id}, {'$set': {'value': 20}})
+	assert (await found(collection, 't2'))['value'] == 20
+	assert len(fake.queries) == 3
+
+	# Anything else drops the whole collection
+	await collection.update_many({'value': {'$in': [0, 10, 20]}}, {'$set': {'value': -1}})
+	docs = await find_entities(collection, 'thing_id', ['t0', 't1', 't2'])
+	assert {doc['value'] for doc in docs.values()} == {-1}
+
+
+async def test_a_read_racing_a_write_is_not_cached():
+	fake = FakeCollection('thing_id', things(1))
+	collection = cached(fake)
+	fake.read_gate = asyncio.Event()
+
+	read = asyncio.create_task(found(collection, 't0'))
+	await asyncio.sleep(0)
+	await collection.update_one({'thing_id': 't0'}, {'$set': {'value': 5}})
+	fake.read_gate.set()
+	assert (await read)['value'] == 0
+
+	assert (await found(collection, 't0'))['value'] == 5
+
+
+async def test_entities_expire_and_are_evicted():
+	clock = ManualClock()
+	fake = FakeCollection('thing_id', things(3))
+	collection = cached(fake, EntityCache(max_entries=2, ttl_seconds=10, clock=clock))
+	await find_entities(collection, 'thing_id', ['t0', 't1', 't2'])
+	assert collection.cache.stats()['entries'] == 2
+
+	clock.time += 11
+	await find_entity(collection, 'thing_id', 't2')
+	assert fake.queries[-1] == {'thing_id': 't2'}
+
+
+async def test_operations_are_timed_per_collection():
+	fake = FakeCollection('thing_id', things(2))
+	collection = cached(fake)
+	await find_entities(collection, 'thing_id', ['t0', 't1'])
+	await collection.update_one({'thing_id': 't0'}, {'$set': {'value': 1}})
+	await collection.find_one({'thing_id': 't0'})
+
+	snapshot = collection.metrics.snapshot()
+	assert snapshot['operations'] == 3 and snapshot['errors'] == 0
+	assert snapshot['max_ms'] >= snapshot['mean_ms'] >= 0
+
+
+async def test_collection_handles_are_created_once(monkeypatch):
+	class FakeDatabase:
+		def __getitem__(self, name):
+			return FakeCollection('id')
+
+	calls = []
+
+	async def get_mongodb_database():
+		calls.append(1)
+		return FakeDatabase()
+
+	monkeypatch.setattr(mongodb, 'get_mongodb_database', get_mongodb_database)
+	monkeypatch.setattr(mongodb, '_collections', {})
+	monkeypatch.setattr(mongodb, '_collection_metrics', {})
+
+	first = await mongodb.get_collection('things')
+	assert await mongodb.get_collection('things') is first
+	assert await mongodb.get_collection('brwsr_auto_svc_things') is first
+	assert len(calls) == 1
+	assert isinstance(first, CachedCollection) and first.name == 'brwsr_auto_svc_things'
+
+	await first.update_one({'id': 'x'}, {'$set': {}})
+	assert mongodb.get_collection_metrics()['collections']['brwsr_auto_svc_things']['operations'] == 1
+
+
+def test_settings_come_from_the_environment(monkeypatch):
+	monkeypatch.setenv('MONGODB_MAX_POOL_SIZE', '25')
+	monkeypatch.setenv('MONGODB_ENTITY_CACHE_TTL_SECONDS', '2.5')
+	monkeypatch.setenv('MONGODB_ENTITY_CACHE_CHANGE_STREAMS', 'true')
+	settings = mongodb.MongoDBSettings.from_env()
+	assert settings.max_pool_size == 25 and settings.entity_cache_ttl_seconds == 2.5 and settings.change_streams
+	assert settings.wait_queue_timeout_ms == 5000
+
+
+async def test_screen_context_loads_related_entities_in_batches(monkeypatch):
+	screens = FakeCollection(
+		'screen_id',
+		[
+			ScreenDefinition.model_validate(
+				{
+					'screen_id': screen_id,
+					'name': screen_id.title(),
+					'website_id': 'shop',
+					'state_signature': StateSignature(),
+					'action_ids': ['open', 'open', 'close'],
+					'outgoing_transitions': [f'{screen_id}-out'],
+					'incoming_transitions': [f'{screen_id}-in'],
+				}
+			).model_dump(exclude_none=True)
+			for screen_id in ['home', 'list', 'item']
+		],
+	)
+	actions = FakeCollection(
+		'action_id',
+		[
+			ActionDefinition.model_validate(
+				{'action_id': action_id, 'name': action_id, 'website_id': 'shop', 'action_type': 'click'}
+			).model_dump(exclude_none=True)
+			for action_id in ['open', 'close', 'go']
+		],
+	)
+	transitions = FakeCollection(
+		'transition_id',
+		[
+			TransitionDefinition.model_validate(
+				{
+					'transition_id': transition_id,
+					'from_screen_id': source,
+					'to_screen_id': target,
+					'triggered_by': TransitionTrigger.model_validate({'action_type': 'click'}),
+					'action_id': 'go',
+				}
+			).model_dump(exclude_none=True)
+			for transition_id, source, target in [('list-out', 'list', 'item'), ('list-in', 'home', 'list')]
+		],
+	)
+	tasks = FakeCollection('task_id')
+	cache = EntityCache()
+	handles = {
+		screen_documents: ('get_screens_collection', screens),
+		action_documents: ('get_actions_collection', actions),
+		transition_documents: ('get_transitions_collection', transitions),
+		task_documents: ('get_tasks_collection', tasks),
+	}
+	for module, (getter, fake) in handles.items():
+		handle = CachedCollection(fake, getter, cache, CollectionMetrics())
+
+		async def get_handle(handle=handle):
+			return handle
+
+		monkeypatch.setattr(module, getter, get_handle)
+
+	context = await navigation.get_screen_context('list', 'kb-1')
+	assert [a['action_id'] for a in context['available_actions']] == ['open', 'open', 'close']
+	assert context['can_navigate_to'][0]['screen_name'] == 'Item'
+	assert context['can_navigate_from'][0]['screen_name'] == 'Home'
+	assert context['can_navigate_to'][0]['action']['action_id'] == 'go'
+	# One query per collection and round, however many related entities there are
+	assert (len(screens.queries), len(actions.queries), len(transitions.queries)) == (2, 2, 1)
+
+	# A second request is served from the cache
+	await navigation.get_screen_context('list', 'kb-1')
+	assert (len(screens.queries), len(actions.queries), len(transitions.queries)) == (2, 2, 1)
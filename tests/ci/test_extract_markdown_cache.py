@@ -0,0 +1,177 @@
+"""Tests for cached markdown conversion and map-reduce extraction in the extract action (no browser needed)."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from browser_use.dom import markdown_extractor
+from browser_use.dom.markdown_extractor import extract_clean_markdown, split_markdown_chunks
+from browser_use.filesystem.file_system import FileSystem
+from browser_use.llm.messages import SystemMessage
+from browser_use.llm.views import ChatInvokeCompletion
+from browser_use.tools.extraction import REDUCE_SYSTEM_PROMPT
+from browser_use.tools.service import Tools
+from browser_use.tools.views import ExtractAction
+
+
+def make_html(sections: int) -> str:
+	return ''.join(
+		f'<h2>Product {i}</h2><p>SKU-{i:05d} costs ${i}.99. ' + 'It is a very good product with many features. ' * 12 + '</p>'
+		for i in range(sections)
+	)
+
+
+class FakeSession:
+	"""The parts of BrowserSession the extract action and markdown extractor use."""
+
+	def __init__(self, html: str):
+		self.html = html
+		self.agent_focus_target_id = 'target-1'
+		self._dom_watchdog = SimpleNamespace(enhanced_dom_tree=object(), dom_version=1, markdown_cache={})
+
+	async def get_current_page_url(self) -> str:
+		return 'https://shop.example.com/products'
+
+
+class FakeLLM:
+	"""Echoes the SKUs in each chunk after a delay and records peak concurrency."""
+
+	model = 'fake-extraction-llm'
+
+	def __init__(self, delay: float = 0.01):
+		self.delay = delay
+		self.calls: list[list] = []
+		self.in_flight = 0
+		self.peak = 0
+
+	async def ainvoke(self, messages, output_format=None, **kwargs):
+		self.calls.append(messages)
+		self.in_flight += 1
+		self.peak = max(self.peak, self.in_flight)
+		try:
+			await asyncio.sleep(self.delay)
+		finally:
+			self.in_flight -= 1
+		if messages[0].content == REDUCE_SYSTEM_PROMPT:
+			return ChatInvokeCompletion(completion='merged', usage=None)
+		skus = [word.rstrip('.') for word in messages[1].content.split() if word.startswith('SKU-')]
+		return ChatInvokeCompletion(completion=' '.join(skus), usage=None)
+
+
+@pytest.fixture
+def serializations(monkeypatch):
+	"""Count DOM -> HTML serializations; the fake tree's HTML comes from the session fixture."""
+	calls: list[bool] = []
+
+	class CountingSerializer:
+		html = ''
+
+		def __init__(self, extract_links: bool = False):
+			calls.append(extract_links)
+
+		def serialize(self, node) -> str:
+			return CountingSerializer.html
+
+	monkeypatch.setattr(markdown_extractor, 'HTMLSerializer', CountingSerializer)
+	return SimpleNamespace(calls=calls, serializer=CountingSerializer)
+
+
+async def test_markdown_is_cached_per_target_dom_version_and_links(serializations):
+	session = FakeSession(make_html(20))
+	serializations.serializer.html = session.html
+
+	content, stats = await extract_clean_markdown(browser_session=session)  # type: ignore[arg-type]
+	assert '## Product 3' in content and stats['url'] == 'https://shop.example.com/products'
+	stats['started_from_char'] = 100  # callers mutate their copy
+
+	again, again_stats = await extract_clean_markdown(browser_session=session)  # type: ignore[arg-type]
+	assert again == content and again_stats['cached'] and 'started_from_char' not in again_stats
+	assert len(serializations.calls) == 1
+
+	await extract_clean_markdown(browser_session=session, extract_links=True)  # type: ignore[arg-type]
+	assert serializations.calls == [False, True]
+
+	# A DOM rebuild or tab switch invalidates the cached markdown
+	session._dom_watchdog.dom_version = 2
+	await extract_clean_markdown(browser_session=session)  # type: ignore[arg-type]
+	session.agent_focus_target_id = 'target-2'
+	await extract_clean_markdown(browser_session=session)  # type: ignore[arg-type]
+	assert len(serializations.calls) == 4
+
+
+def test_split_markdown_chunks_prefers_headings():
+	content = ''.join(f'## Section {i}\n' + 'word ' * 60 + '\n' for i in range(30))
+	chunks = split_markdown_chunks(content, 1_000)
+
+	assert ''.join(text for _, text in chunks) == content
+	assert all(len(text) <= 1_000 for _, text in chunks)
+	assert all(text.startswith('## Section') for _, text in chunks)
+	assert [start for start, _ in chunks] == [content.index(text) for _, text in chunks]
+
+
+def test_split_markdown_chunks_falls_back_to_sentences_and_hard_cuts():
+	sentences = 'This is a sentence. ' * 200
+	chunks = split_markdown_chunks(sentences, 500)
+	assert ''.join(text for _, text in chunks) == sentences
+	assert all(text.endswith('. ') for _, text in chunks[:-1])
+
+	unbroken = 'x' * 1_250
+	assert [len(text) for _, text in split_markdown_chunks(unbroken, 500)] == [500, 500, 250]
+	assert split_markdown_chunks('short', 500) == [(0, 'short')]
+
+
+async def run_extract(tools: Tools, session: FakeSession, llm: FakeLLM, tmp_path, **params):
+	return await tools.registry.registry.actions['extract'].function(
+		params=ExtractAction(query='List every SKU', **params),
+		browser_session=session,
+		page_extraction_llm=llm,
+		file_system=FileSystem(tmp_path),
+	)
+
+
+async def test_map_reduce_extracts_whole_page_in_one_action(serializations, tmp_path):
+	session = FakeSession(make_html(400))
+	serializations.serializer.html = session.html
+	llm = FakeLLM()
+
+	result = await run_extract(Tools(extract_mode='map_reduce', extract_max_concurrency=3), session, llm, tmp_path)
+
+	chunk_calls = [call for call in llm.calls if call[0].content != REDUCE_SYSTEM_PROMPT]
+	assert len(chunk_calls) > 3 and len(llm.calls) == len(chunk_calls) + 1
+	assert llm.peak == 3
+	assert '<result>\nmerged\n</result>' in result.extracted_content
+
+	# Every SKU on the page reached a chunk call, none twice
+	skus = [sku for call in chunk_calls for sku in call[1].content.split() if sku.startswith('SKU-')]
+	assert len(skus) == len(set(skus)) == 400
+
+	# The reduce call sees the chunk answers in page order
+	reduce_prompt = llm.calls[-1][1].content
+	assert reduce_prompt.index('SKU-00000') < reduce_prompt.index('SKU-00399')
+	assert isinstance(llm.calls[-1][0], SystemMessage)
+
+
+async def test_paged_mode_reuses_markdown_across_continuations(serializations, tmp_path):
+	session = FakeSession(make_html(400))
+	serializations.serializer.html = session.html
+	llm = FakeLLM(delay=0)
+	tools = Tools()
+
+	first = await run_extract(tools, session, llm, tmp_path)
+	assert 'use start_from_char=' in llm.calls[0][1].content
+	await run_extract(tools, session, llm, tmp_path, start_from_char=30_000)
+
+	assert len(llm.calls) == 2 and len(serializations.calls) == 1
+	assert first.error is None
+
+
+async def test_map_reduce_skips_reduce_for_short_pages(serializations, tmp_path):
+	session = FakeSession(make_html(5))
+	serializations.serializer.html = session.html
+	llm = FakeLLM(delay=0)
+
+	result = await run_extract(Tools(extract_mode='map_reduce'), session, llm, tmp_path)
+
+	assert len(llm.calls) == 1
+	assert 'SKU-00004' in result.extracted_content
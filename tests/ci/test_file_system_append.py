@@ -0,0 +1,149 @@
+"""Tests for append-friendly file content, cached descriptions and lazy state snapshots in the agent FileSystem."""
+
+import copy
+import json
+import pickle
+from pathlib import Path
+
+from browser_use.filesystem.file_system import FileSystem, FileSystemState, MarkdownFile, PdfFile, TxtFile
+
+
+def count_full_writes(monkeypatch, file_class) -> list[int]:
+	"""Record the size of every full rewrite of a file_class file."""
+	writes = []
+	original = file_class._write_to_disk
+
+	def write_to_disk(self, file_path, content):
+		writes.append(len(content))
+		original(self, file_path, content)
+
+	monkeypatch.setattr(file_class, '_write_to_disk', write_to_disk)
+	return writes
+
+
+async def test_appends_write_only_the_new_text(tmp_path: Path, monkeypatch):
+	writes = count_full_writes(monkeypatch, MarkdownFile)
+	fs = FileSystem(tmp_path, create_default_files=False)
+
+	await fs.write_file('results.md', '# Results\n')
+	for i in range(50):
+		assert 'successfully' in await fs.append_file('results.md', f'- row {i}\n')
+
+	expected = '# Results\n' + ''.join(f'- row {i}\n' for i in range(50))
+	assert (fs.data_dir / 'results.md').read_text() == expected
+	file_obj = fs.get_file('results.md')
+	assert file_obj is not None and file_obj.content == expected
+	assert writes == [len('# Results\n')]
+
+
+async def test_append_rewrites_the_file_when_disk_is_out_of_date(tmp_path: Path, monkeypatch):
+	writes = count_full_writes(monkeypatch, TxtFile)
+	fs = FileSystem(tmp_path, create_default_files=False)
+	await fs.write_file('notes.txt', 'one')
+
+	# Changed in memory only, so the file on disk is behind
+	file_obj = fs.get_file('notes.txt')
+	assert file_obj is not None
+	file_obj.append_file_content(' two')
+	await fs.append_file('notes.txt', ' three')
+
+	assert (fs.data_dir / 'notes.txt').read_text() == 'one two three'
+	assert writes == [3, 13]
+
+
+async def test_rendered_formats_are_rewritten_on_append(tmp_path: Path, monkeypatch):
+	writes = count_full_writes(monkeypatch, PdfFile)
+	fs = FileSystem(tmp_path, create_default_files=False)
+	await fs.write_file('report.pdf', '# Report')
+	await fs.append_file('report.pdf', '\nMore')
+
+	assert writes == [len('# Report'), len('# Report\nMore')]
+
+
+def test_size_and_line_count_follow_appends():
+	text = 'a\r\nb\rc\n\nd\x0ce f\r'
+	for split in range(1, len(text)):
+		for chunk_size in (1, 2, 3):
+			file_obj = TxtFile(name='lines', content=text[:split])
+			for i in range(split, len(text), chunk_size):
+				file_obj.append_file_content(text[i : i + chunk_size])
+			assert file_obj.get_line_count == len(text.splitlines())
+			assert file_obj.get_size == len(text)
+			assert file_obj.content == text
+
+
+def test_head_and_tail_read_across_chunks():
+	file_obj = TxtFile(name='chunks')
+	for word in ('alpha', 'beta', 'gamma', 'delta'):
+		file_obj.append_file_content(word)
+
+	assert file_obj.head(7) == 'alphabe'
+	assert file_obj.tail(7) == 'madelta'
+	assert file_obj.head(100) == file_obj.tail(100) == 'alphabetagammadelta'
+
+
+async def test_copies_keep_their_own_content(tmp_path: Path):
+	file_obj = MarkdownFile(name='notes', content='x')
+	await file_obj.write('x', tmp_path)
+	digest = file_obj.snapshot()[0]['digest']
+
+	shallow, deep = file_obj.model_copy(), copy.deepcopy(file_obj)
+	pickled = pickle.loads(pickle.dumps(file_obj))
+	file_obj.append_file_content('zz')
+
+	for copied in (shallow, deep, pickled):
+		assert copied.content == 'x' and copied.get_size == 1
+		assert copied.snapshot()[0]['digest'] == digest
+	assert file_obj.content == 'xzz' and file_obj.snapshot()[0]['digest'] != digest
+
+	# Appending to a copy rewrites the file instead of appending to the original's
+	await shallow.append('y', tmp_path)
+	assert file_obj.content == 'xzz'
+	assert (tmp_path / 'notes.md').read_text() == 'xy'
+
+
+async def test_describe_shows_previews_and_refreshes_after_changes(tmp_path: Path, monkeypatch):
+	fs = FileSystem(tmp_path)
+	await fs.write_file('results.md', '')
+	for i in range(200):
+		await fs.append_file('results.md', f'row {i}\n')
+
+	description = fs.describe()
+	assert description.startswith('<file>\nresults.md - 200 lines\n<content>\nrow 0\nrow 1\n')
+	assert 'more lines ...' in description and description.endswith('row 199\n</content>\n</file>')
+
+	# Unchanged files aren't described again
+	monkeypatch.setattr(fs, '_describe_file', None)
+	assert fs.describe() == description
+	monkeypatch.undo()
+
+	await fs.append_file('results.md', 'the end')
+	assert fs.describe().endswith('row 199\nthe end\n</content>\n</file>')
+	assert 'results.md - 201 lines' in fs.describe()
+
+
+async def test_state_references_content_until_serialized(tmp_path: Path):
+	fs = FileSystem(tmp_path)
+	await fs.write_file('results.md', 'first')
+	await fs.append_file('results.md', ' second')
+
+	state = fs.get_state()
+	data = state.files['results.md']['data']
+	assert 'content' not in data
+	assert data['size'] == len('first second')
+	assert state.get_content('results.md') == 'first second'
+
+	# Nothing changed, so the snapshot is reused; an append leaves the old snapshot as it was
+	assert fs.get_state().files['results.md']['data'] is data
+	await fs.append_file('results.md', ' third')
+	assert state.get_content('results.md') == 'first second'
+	assert fs.get_state().files['results.md']['data']['digest'] != data['digest']
+
+	dumped = json.loads(state.model_dump_json())
+	assert dumped['files']['results.md']['data']['content'] == 'first second'
+
+	restored = FileSystem.from_state(FileSystemState.model_validate(dumped))
+	restored_file = restored.get_file('results.md')
+	assert restored_file is not None and restored_file.content == 'first second'
+	assert (restored.data_dir / 'results.md').read_text() == 'first second'
+	assert restored.get_state().files['results.md']['data']['digest'] == data['digest']
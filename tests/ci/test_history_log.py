@@ -0,0 +1,159 @@
+"""Tests for the append-only agent history log."""
+
+import base64
+import json
+
+import anyio
+import pytest
+
+from browser_use.agent.history_log import AgentHistoryLog, is_history_log, iter_history_records
+from browser_use.agent.views import ActionResult, AgentHistory, AgentHistoryList, AgentOutput, StepMetadata
+from browser_use.browser.views import BrowserStateHistory
+from browser_use.tokens.views import UsageSummary
+from browser_use.tools.service import Tools
+
+AgentOutputWithActions = AgentOutput.type_with_custom_actions(Tools().registry.create_action_model())
+
+
+def make_item(step: int, **result_kwargs) -> AgentHistory:
+	return AgentHistory(
+		model_output=AgentOutputWithActions.model_validate(
+			{
+				'evaluation_previous_goal': 'ok',
+				'memory': f'step {step}',
+				'next_goal': 'continue',
+				'action': [{'input': {'index': step, 'text': 'hunter2'}}],
+			}
+		),
+		result=[ActionResult(long_term_memory=f'typed into {step}', **result_kwargs)],
+		state=BrowserStateHistory(
+			url=f'https://example.com/{step}',
+			title='Example',
+			tabs=[],
+			interacted_element=[None],
+			screenshot_path=f'/tmp/screenshots/{step}.png',
+		),
+		metadata=StepMetadata(step_start_time=step, step_end_time=step + 1, step_number=step),
+	)
+
+
+def make_usage() -> UsageSummary:
+	return UsageSummary(
+		total_prompt_tokens=100,
+		total_prompt_cost=0.1,
+		total_prompt_cached_tokens=0,
+		total_prompt_cached_cost=0.0,
+		total_completion_tokens=10,
+		total_completion_cost=0.01,
+		total_tokens=110,
+		total_cost=0.11,
+		entry_count=1,
+	)
+
+
+@pytest.mark.parametrize('name', ['history.jsonl', 'history.jsonl.gz'])
+async def test_appended_steps_round_trip(tmp_path, name):
+	path = tmp_path / name
+	log = AgentHistoryLog(path, sensitive_data={'password': 'hunter2'})
+	items = [make_item(step) for step in range(5)]
+	for index, item in enumerate(items):
+		log.append(index, item)
+	log.append_usage(make_usage())
+	await log.flush()
+
+	loaded = AgentHistoryList.load_from_file(path, AgentOutputWithActions)
+
+	assert is_history_log(path)
+	assert [h.state.url for h in loaded.history] == [h.state.url for h in items]
+	assert loaded.history[2].state.screenshot_path == '/tmp/screenshots/2.png'
+	assert loaded.history[0].model_output is not None
+	assert loaded.history[0].model_output.action[0].model_dump(exclude_none=True)['input']['text'] == '<secret>password</secret>'
+	assert loaded.usage is not None and loaded.usage.total_tokens == 110
+
+
+async def test_records_are_appended_not_rewritten(tmp_path):
+	path = tmp_path / 'history.jsonl'
+	log = AgentHistoryLog(path)
+
+	log.append(0, make_item(0))
+	await log.flush()
+	first_write = path.read_bytes()
+	log.append(1, make_item(1))
+	await log.flush()
+
+	contents = path.read_bytes()
+	assert contents.startswith(first_write)
+	assert len(contents.splitlines()) == 3  # header + one line per step
+
+
+async def test_later_record_replaces_step(tmp_path):
+	path = tmp_path / 'history.jsonl'
+	log = AgentHistoryLog(path)
+	item = make_item(0, is_done=True, success=True)
+	log.append(0, item)
+	item.result[-1].extracted_content = 'final answer'
+	log.append(0, item)
+	await log.flush()
+
+	loaded = AgentHistoryList.load_from_file(path, AgentOutputWithActions)
+	assert len(loaded.history) == 1
+	assert loaded.final_result() == 'final answer'
+
+
+async def test_torn_last_record_is_skipped(tmp_path):
+	path = tmp_path / 'history.jsonl'
+	log = AgentHistoryLog(path)
+	for index in range(3):
+		log.append(index, make_item(index))
+	await log.flush()
+
+	async with await anyio.open_file(path, 'a', encoding='utf-8') as f:
+		await f.write('{"index": 3, "item": {"model_out')
+
+	loaded = AgentHistoryList.load_from_file(path, AgentOutputWithActions)
+	assert len(loaded.history) == 3
+
+
+async def test_corrupt_middle_record_raises(tmp_path):
+	path = tmp_path / 'history.jsonl'
+	log = AgentHistoryLog(path)
+	log.append(0, make_item(0))
+	await log.flush()
+	async with await anyio.open_file(path, 'a', encoding='utf-8') as f:
+		await f.write('not json\n')
+	log.append(1, make_item(1))
+	await log.flush()
+
+	with pytest.raises(ValueError):
+		list(iter_history_records(path))
+
+
+async def test_result_images_stored_by_reference(tmp_path):
+	path = tmp_path / 'history.jsonl'
+	image_data = base64.b64encode(b'\x89PNG fake image bytes' * 100).decode()
+	log = AgentHistoryLog(path)
+	log.append(0, make_item(0, images=[{'name': 'a.png', 'data': image_data}]))
+	log.append(1, make_item(1, images=[{'name': 'b.png', 'data': image_data}]))
+	await log.flush()
+
+	assert image_data not in path.read_text()
+	assert len(list((tmp_path / 'history.jsonl.blobs').iterdir())) == 1
+
+	loaded = AgentHistoryList.load_from_file(path, AgentOutputWithActions)
+	assert loaded.history[1].result[0].images == [{'name': 'b.png', 'data': image_data}]
+
+
+def test_save_to_file_keeps_json_export_and_writes_logs(tmp_path):
+	history = AgentHistoryList(history=[make_item(0), make_item(1)], usage=make_usage())
+
+	json_path = tmp_path / 'history.json'
+	history.save_to_file(json_path)
+	assert not is_history_log(json_path)
+	assert len(json.loads(json_path.read_text())['history']) == 2
+	assert not list(tmp_path.glob('.*.tmp'))
+
+	log_path = tmp_path / 'history.jsonl'
+	history.save_to_file(log_path)
+	for path in (json_path, log_path):
+		loaded = AgentHistoryList.load_from_file(path, AgentOutputWithActions)
+		assert [h.state.url for h in loaded.history] == ['https://example.com/0', 'https://example.com/1']
@@ -0,0 +1,340 @@
+"""Tests for the per-knowledge runtime model used by agent knowledge queries (navigator/knowledge/runtime_model.py)."""
+
+import asyncio
+import random
+import threading
+
+import pytest
+
+from navigator.knowledge import runtime_model
+from navigator.knowledge.agent_communication import ScreenRecognitionService
+from navigator.knowledge.extract.actions import ActionDefinition
+from navigator.knowledge.extract.screens import Indicator, ScreenDefinition, StateSignature
+from navigator.knowledge.extract.transitions import TransitionDefinition
+from navigator.knowledge.persist import versions
+from navigator.knowledge.runtime_model import KnowledgeRuntimeCache, KnowledgeRuntimeModel, ScreenMatcher
+
+# Definitions are built with model_validate: their optional fields use Field(None, ...), which type checkers see as required
+
+
+def indicator(**fields) -> Indicator:
+	return Indicator.model_validate(fields)
+
+
+def screen(screen_id: str, url_pattern: str, indicators: list[Indicator] | None = None, **kwargs) -> ScreenDefinition:
+	return ScreenDefinition.model_validate(
+		{
+			'screen_id': screen_id,
+			'name': screen_id.title(),
+			'website_id': 'shop',
+			'url_patterns': [url_pattern],
+			'state_signature': StateSignature(required_indicators=indicators or []),
+			**kwargs,
+		}
+	)
+
+
+def action(action_id: str) -> ActionDefinition:
+	return ActionDefinition.model_validate(
+		{'action_id': action_id, 'name': f'Click {action_id}', 'website_id': 'shop', 'action_type': 'click'}
+	)
+
+
+def transition(
+	transition_id: str, from_screen: str, to_screen: str, cost_ms: int, action_id: str | None = None
+) -> TransitionDefinition:
+	return TransitionDefinition.model_validate(
+		{
+			'transition_id': transition_id,
+			'from_screen_id': from_screen,
+			'to_screen_id': to_screen,
+			'triggered_by': {'action_type': 'click'},
+			'cost': {'estimated_ms': cost_ms},
+			'reliability_score': 0.9,
+			'action_id': action_id,
+		}
+	)
+
+
+def shop_model(version: tuple[int, int] | None = (1, 0)) -> KnowledgeRuntimeModel:
+	screens = [
+		screen(
+			'home', r'https://shop\.test/?$', [indicator(type='dom_contains', value='Welcome')], action_ids=['to-cart', 'to-list']
+		),
+		screen(
+			'list',
+			r'https://shop\.test/products',
+			[indicator(type='dom_contains', value='Products'), indicator(type='url_matches', pattern=r'.*\?page=\d+')],
+			action_ids=['to-item', 'to-item', 'missing'],
+		),
+		screen('item', r'https://shop\.test/products/\d+', [indicator(type='dom_contains', value='Add to cart')]),
+		screen('cart', r'https://shop\.test/cart', [indicator(type='url_exact', value='https://shop.test/cart')]),
+		screen('help', r'https://shop\.test/.*', content_type='documentation'),
+	]
+	actions = [action('to-item'), action('to-cart'), action('to-list')]
+	transitions = [
+		transition('home-list', 'home', 'list', 500, 'to-list'),
+		transition('list-item', 'list', 'item', 500, 'to-item'),
+		transition('item-cart', 'item', 'cart', 500),
+		transition('home-cart', 'home', 'cart', 5000, 'to-cart'),
+	]
+	return KnowledgeRuntimeModel.from_definitions('kb-1', screens, actions, transitions, version=version)
+
+
+def test_scores_match_url_patterns_and_indicators():
+	model = shop_model()
+	list_screen = model.screens['list']
+
+	score, matched = ScreenMatcher.compile(list_screen).score('https://shop.test/products?page=2', 'all products')
+	assert score == pytest.approx(1.0)
+	assert [m['type'] for m in matched] == ['url_matches', 'dom_contains', 'url_matches']
+
+	score, _ = ScreenMatcher.compile(list_screen).score('https://shop.test/products', 'nothing here')
+	assert score == pytest.approx(0.4)
+	# The service's helper scores the same way
+	assert ScreenRecognitionService()._calculate_match_score(list_screen, 'https://shop.test/products', 'Products')[
+		0
+	] == pytest.approx(0.7)
+
+
+def test_recognize_only_considers_actionable_web_ui_screens():
+	model = shop_model()
+	assert [matcher.screen.screen_id for matcher in model.matchers] == ['home', 'list', 'item', 'cart']
+
+	best, score, _ = model.recognize('https://shop.test/products/42', '<button>Add to cart</button>')
+	assert best is not None and best.screen_id == 'item' and score == pytest.approx(1.0)
+
+	best, score, _ = model.recognize('https://shop.test/about', '')
+	assert best is None and score == 0.0
+
+
+def test_invalid_indicator_patterns_never_match():
+	broken = screen('broken', r'https://shop\.test/', [indicator(type='url_matches', pattern='(')])
+	score, matched = ScreenMatcher.compile(broken).score('https://shop.test/(', '')
+	assert score == pytest.approx(0.4)
+	assert [m['type'] for m in matched] == ['url_matches']
+
+
+def test_screen_actions_follow_action_order_without_duplicates():
+	model = shop_model()
+	assert [a['action_id'] for a in model.screen_actions['home']] == ['to-cart', 'to-list']
+	assert [a['action_id'] for a in model.screen_actions['list']] == ['to-item']
+	assert model.screen_actions['cart'] == []
+
+
+def test_navigation_path_takes_the_cheapest_route():
+	model = shop_model()
+	result = model.navigation_path('home', 'cart')
+
+	assert result is not None
+	assert result['path'] == ['home', 'list', 'item', 'cart']
+	assert result['total_cost'] == 1500
+	assert result['total_reliability'] == pytest.approx(0.9**3)
+	assert [step['action']['action_name'] for step in result['steps']] == ['Click to-list', 'Click to-item', 'click']
+	assert [a['action_id'] for a in result['actions']] == ['to-list', 'to-item']
+
+	assert [t.transition_id for t in model.find_path('home', 'cart', max_depth=2) or []] == ['home-cart']
+	assert model.find_path('cart', 'home') is None
+	assert model.find_path('home', 'unknown') is None
+	assert model.navigation_path('home', 'home') == {
+		'path': ['home'],
+		'transitions': [],
+		'actions': [],
+		'steps': [],
+		'total_cost': 0,
+		'total_reliability': 1.0,
+		'path_length': 1,
+		'hops': 0,
+	}
+
+
+def random_model(screens: int, transitions: int, seed: int) -> KnowledgeRuntimeModel:
+	rng = random.Random(seed)
+	return KnowledgeRuntimeModel.from_definitions(
+		'kb-random',
+		[screen(f's{i}', rf'https://shop\.test/{i}') for i in range(screens)],
+		[action(f'a{i}') for i in range(transitions)],
+		[
+			transition(
+				f't{i}',
+				f's{rng.randrange(screens)}',
+				f's{rng.randrange(screens)}',
+				rng.choice([100, 200, 300]),
+				rng.choice([f'a{i}', None]),
+			)
+			for i in range(transitions)
+		],
+	)
+
+
+def route(model: KnowledgeRuntimeModel, from_screen_id: str, to_screen_id: str) -> dict:
+	result = model.navigation_path(from_screen_id, to_screen_id)
+	assert result is not None
+	return result
+
+
+@pytest.mark.parametrize('all_pairs_max_screens', [100, 0])
+def test_precomputed_paths_match_the_search(all_pairs_max_screens):
+	model = random_model(40, 120, seed=3)
+	expected = {(a, b): model.navigation_path(a, b) for a in model.screens for b in model.screens}
+
+	paths = model.precompute_paths(hubs=4, all_pairs_max_screens=all_pairs_max_screens)
+	assert paths.all_pairs == (all_pairs_max_screens == 100)
+	assert len(paths.trees) == (40 if paths.all_pairs else 4)
+	for (a, b), result in expected.items():
+		assert model.navigation_path(a, b) == result
+	assert model.navigation_path('s0', 'unknown') is None
+
+
+def test_hub_trees_are_kept_and_other_trees_built_on_demand():
+	model = shop_model()
+	paths = model.precompute_paths(hubs=1, all_pairs_max_screens=0)
+	paths.max_trees = 1
+	# home has the most transitions in and out
+	assert list(paths.trees) == ['home']
+
+	assert route(model, 'list', 'cart')['path'] == ['list', 'item', 'cart']
+	assert route(model, 'item', 'cart')['path'] == ['item', 'cart']
+	assert list(paths._on_demand) == ['item']
+	assert model.navigation_path('cart', 'home') is None
+	assert list(paths.trees) == ['home'] and list(paths._on_demand) == ['cart']
+
+	assert model.precompute_paths(hub_screen_ids=['list', 'unknown']).trees.keys() == {'list'}
+
+
+def test_routes_longer_than_the_depth_limit_use_the_search():
+	chain = KnowledgeRuntimeModel.from_definitions(
+		'kb-chain',
+		[screen(f's{i}', rf'https://shop\.test/{i}') for i in range(30)],
+		[],
+		[transition(f't{i}', f's{i}', f's{i + 1}', 100) for i in range(29)] + [transition('shortcut', 's0', 's25', 10000)],
+	)
+	paths = chain.precompute_paths()
+	assert (paths.transition_ids('s0', 's29') or [])[:3] == ['t0', 't1', 't2']
+	assert route(chain, 's0', 's29')['path'] == ['s0', 's25', 's26', 's27', 's28', 's29']
+	assert route(chain, 's0', 's5')['hops'] == 5
+
+
+def test_transitions_without_a_cost_are_routed_and_reported_with_one_default():
+	free = transition('s0-s1', 's0', 's1', 0)
+	free.cost = {}
+	model = KnowledgeRuntimeModel.from_definitions(
+		'kb-free', [screen('s0', r'https://shop\.test/0'), screen('s1', r'https://shop\.test/1')], [], [free]
+	)
+	assert route(model, 's0', 's1')['total_cost'] == runtime_model.DEFAULT_TRANSITION_COST_MS
+	model.precompute_paths()
+	assert route(model, 's0', 's1')['total_cost'] == runtime_model.DEFAULT_TRANSITION_COST_MS
+
+
+async def test_load_reads_every_document(monkeypatch):
+	from navigator.knowledge.persist import documents
+
+	limits = []
+
+	def query(results):
+		async def run(knowledge_id, limit=100):
+			limits.append(limit)
+			return results
+
+		return run
+
+	model = shop_model()
+	monkeypatch.setattr(documents, 'query_screens_by_knowledge_id', query(list(model.screens.values())))
+	monkeypatch.setattr(documents, 'query_actions_by_knowledge_id', query(list(model.actions.values())))
+	monkeypatch.setattr(documents, 'query_transitions_by_knowledge_id', query(list(model.transitions.values())))
+
+	loaded = await KnowledgeRuntimeModel.load('kb-1', version=(1, 0))
+	assert limits == [0, 0, 0]
+	assert loaded.screens.keys() == model.screens.keys()
+
+
+@pytest.fixture
+def fake_store(monkeypatch):
+	"""Version counter and model loading without MongoDB."""
+	store = {'version': (1, 0), 'loads': 0}
+
+	async def get_knowledge_version(knowledge_id):
+		return store['version']
+
+	async def load(cls, knowledge_id, version=None):
+		store['loads'] += 1
+		await asyncio.sleep(0.01)
+		return shop_model(version)
+
+	monkeypatch.setattr(versions, 'get_knowledge_version', get_knowledge_version)
+	monkeypatch.setattr(KnowledgeRuntimeModel, 'load', classmethod(load))
+	return store
+
+
+async def test_cache_builds_once_and_rebuilds_after_writes(fake_store):
+	cache = KnowledgeRuntimeCache()
+	models = await asyncio.gather(*(cache.get_model('kb-1') for _ in range(5)))
+	assert fake_store['loads'] == 1
+	assert all(model is models[0] for model in models)
+
+	assert await cache.get_model('kb-1') is models[0]
+	assert fake_store['loads'] == 1
+
+	fake_store['version'] = (2, 0)
+	rebuilt = await cache.get_model('kb-1')
+	assert rebuilt is not models[0] and rebuilt.version == (2, 0)
+
+	# A write without a knowledge_id bumps the shared counter
+	fake_store['version'] = (2, 1)
+	await cache.get_model('kb-1')
+	assert fake_store['loads'] == 3
+
+
+async def test_cache_precomputes_paths_per_model_version(fake_store):
+	cache = KnowledgeRuntimeCache()
+	model = await cache.get_model('kb-1')
+	assert model.paths is not None and model.paths.all_pairs
+	assert route(model, 'home', 'cart')['total_cost'] == 1500
+
+	fake_store['version'] = (2, 0)
+	rebuilt = await cache.get_model('kb-1')
+	assert rebuilt.paths is not None and rebuilt.paths is not model.paths
+
+	assert (await KnowledgeRuntimeCache(precompute_paths=False).get_model('kb-1')).paths is None
+
+
+async def test_cache_builds_the_index_off_the_event_loop(fake_store, monkeypatch):
+	threads = []
+	precompute_paths = KnowledgeRuntimeModel.precompute_paths
+
+	def record_thread(self, *args, **kwargs):
+		threads.append(threading.current_thread())
+		return precompute_paths(self, *args, **kwargs)
+
+	monkeypatch.setattr(KnowledgeRuntimeModel, 'precompute_paths', record_thread)
+	model = await KnowledgeRuntimeCache().get_model('kb-1')
+	assert model.paths is not None
+	assert threads and threads[0] is not threading.main_thread()
+
+
+async def test_cache_evicts_least_recently_used_models(fake_store):
+	cache = KnowledgeRuntimeCache(max_models=2)
+	for knowledge_id in ('a', 'b', 'a', 'c'):
+		await cache.get_model(knowledge_id)
+	assert list(cache._models) == ['a', 'c']
+
+
+async def test_cache_does_not_keep_models_without_a_version(fake_store):
+	fake_store['version'] = None
+	cache = KnowledgeRuntimeCache()
+	await cache.get_model('kb-1')
+	await cache.get_model('kb-1')
+	assert fake_store['loads'] == 2
+
+
+async def test_recognize_screen_uses_the_shared_model(fake_store, monkeypatch):
+	monkeypatch.setattr(runtime_model, '_runtime_cache', KnowledgeRuntimeCache())
+	service = ScreenRecognitionService()
+
+	result = await service.recognize_screen('https://shop.test/', 'Welcome to the shop', 'kb-1')
+	assert result['screen_id'] == 'home'
+	assert [a['action_id'] for a in result['available_actions']] == ['to-cart', 'to-list']
+
+	assert [a['action_id'] for a in await service._get_available_actions('list', 'kb-1')] == ['to-item']
+	await service.recognize_screen('https://shop.test/cart', '', 'kb-1')
+	assert fake_store['loads'] == 1
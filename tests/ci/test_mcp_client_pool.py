@@ -0,0 +1,119 @@
+"""Tests for MCPClient's pooled sessions and tool schema cache, against the stdio fixture server (mcp_stdio_server.py)."""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from browser_use import Tools
+from browser_use.mcp.client import MCPClient
+
+SERVER = str(Path(__file__).parent / 'mcp_stdio_server.py')
+
+
+class FixtureServer:
+	"""Settings for the fixture server and what its processes logged."""
+
+	def __init__(self, tmp_path: Path):
+		self.log = tmp_path / 'server.log'
+		self.env = {'FIXTURE_LOG': str(self.log), 'FIXTURE_TOOLS': '3'}
+		self.cache_dir = tmp_path / 'tool_schemas'
+
+	def client(self, **kwargs) -> MCPClient:
+		return MCPClient('fixture', sys.executable, [SERVER], env=dict(self.env), schema_cache_dir=self.cache_dir, **kwargs)
+
+	def count(self, line: str) -> int:
+		return self.log.read_text().splitlines().count(line) if self.log.exists() else 0
+
+
+@pytest.fixture
+def server(tmp_path) -> FixtureServer:
+	return FixtureServer(tmp_path)
+
+
+async def test_tools_are_registered_and_called(server):
+	tools = Tools()
+	async with server.client() as client:
+		await client.register_to_tools(tools, prefix='fx_')
+		assert set(client._tools) == {'echo', 'sleep', 'tool_0'}
+
+		result = await tools.registry.execute_action('fx_echo', {'text': 'hello'})
+		assert result.extracted_content == 'hello'
+		result = await tools.registry.execute_action('fx_tool_0', {'query': 'q', 'options': {'exact': True}})
+		assert result.extracted_content == '{"limit": 10, "options": {"exact": true}, "query": "q", "tool": "tool_0"}'
+
+	result = await tools.registry.execute_action('fx_echo', {'text': 'hello'})
+	assert 'not connected' in result.error
+
+
+async def test_tool_schemas_are_cached_per_server_version(server):
+	async with server.client() as client:
+		first_tools = dict(client._tools)
+	async with server.client() as client:
+		assert client._tools == first_tools
+	assert server.count('list_tools') == 1
+
+	server.env['FIXTURE_VERSION'] = '1.1.0'
+	async with server.client() as client:
+		pass
+	assert server.count('list_tools') == 2
+
+	async with server.client(cache_tool_schemas=False) as client:
+		pass
+	assert server.count('list_tools') == 3
+
+
+async def test_servers_without_a_version_are_not_cached(server):
+	server.env['FIXTURE_VERSION'] = ''
+	for _ in range(2):
+		async with server.client():
+			pass
+	assert server.count('list_tools') == 2
+
+
+async def test_param_models_are_reused_across_clients(server):
+	registries = []
+	for _ in range(2):
+		tools = Tools()
+		async with server.client() as client:
+			await client.register_to_tools(tools)
+		registries.append(tools.registry.registry.actions)
+	assert registries[0]['tool_0'].param_model is registries[1]['tool_0'].param_model
+
+
+async def test_concurrent_calls_use_more_sessions(server):
+	async with server.client(max_sessions=3, max_calls_per_session=1) as client:
+		tools = Tools()
+		await client.register_to_tools(tools)
+
+		# Calls wait for a session of their own instead of queueing behind each other
+		calls = [tools.registry.execute_action('sleep', {'seconds': 0.5}) for _ in range(3)]
+		await asyncio.gather(*calls)
+		assert len(client._pool.connections) == 3
+
+		start = time.perf_counter()
+		await asyncio.gather(*(tools.registry.execute_action('sleep', {'seconds': 0.5}) for _ in range(3)))
+		assert time.perf_counter() - start < 1.0
+
+	assert server.count('start') == 3
+	assert client._pool.connections == []
+
+
+async def test_single_session_pipelines_calls(server):
+	async with server.client() as client:
+		tools = Tools()
+		await client.register_to_tools(tools)
+		results = await asyncio.gather(*(tools.registry.execute_action('echo', {'text': str(i)}) for i in range(10)))
+		assert [r.extracted_content for r in results] == [str(i) for i in range(10)]
+	assert server.count('start') == 1
+
+
+async def test_failed_server_start_is_reported_without_polling(tmp_path):
+	client = MCPClient('broken', sys.executable, ['-c', 'import sys; sys.exit(1)'], schema_cache_dir=tmp_path)
+	start = time.perf_counter()
+	with pytest.raises(Exception):
+		await client.connect()
+	assert time.perf_counter() - start < 5
+	assert client.session is None
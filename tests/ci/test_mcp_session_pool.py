@@ -0,0 +1,173 @@
+"""Tests for the MCP server's SessionPool: per-session locking, LRU cap, idle expiry and warm spares (no browser needed)."""
+
+import asyncio
+from itertools import count
+
+import pytest
+
+from browser_use.mcp.sessions import SessionLimitError, SessionPool
+
+
+class FakeBrowsers:
+	"""Stands in for browser start/stop, recording what was started and stopped."""
+
+	def __init__(self, start_delay: float = 0.0):
+		self.start_delay = start_delay
+		self.started: list[str | None] = []
+		self.stopped: list[str] = []
+		self._ids = count(1)
+
+	async def create(self, session_id: str | None) -> str:
+		self.started.append(session_id)
+		await asyncio.sleep(self.start_delay)
+		return f'browser-{next(self._ids)}'
+
+	async def close(self, browser: str) -> None:
+		self.stopped.append(browser)
+
+
+def make_pool(browsers: FakeBrowsers, **kwargs) -> SessionPool[str]:
+	return SessionPool(create=browsers.create, close=browsers.close, **kwargs)
+
+
+async def test_calls_in_one_session_run_in_order_and_sessions_run_concurrently():
+	browsers = FakeBrowsers()
+	pool = make_pool(browsers, idle_timeout=None)
+	running: dict[str, int] = {'a': 0, 'b': 0}
+	peak = {'a': 0, 'b': 0, 'total': 0}
+
+	async def call(session_id: str):
+		async with pool.lease(session_id):
+			running[session_id] += 1
+			peak[session_id] = max(peak[session_id], running[session_id])
+			peak['total'] = max(peak['total'], sum(running.values()))
+			await asyncio.sleep(0.02)
+			running[session_id] -= 1
+
+	await asyncio.gather(*(call(session_id) for session_id in 'aabbab'))
+
+	assert peak['a'] == 1 and peak['b'] == 1
+	assert peak['total'] == 2
+	assert sorted(browsers.started, key=str) == ['a', 'b']
+	await pool.close_all()
+
+
+async def test_concurrent_first_calls_share_one_browser():
+	browsers = FakeBrowsers(start_delay=0.05)
+	pool = make_pool(browsers, idle_timeout=None)
+
+	async def call():
+		async with pool.lease('a') as session:
+			return session.resource
+
+	resources = await asyncio.gather(*(call() for _ in range(5)))
+
+	assert browsers.started == ['a']
+	assert len(set(resources)) == 1
+	await pool.close_all()
+
+
+async def test_least_recently_used_idle_session_is_evicted_at_the_cap():
+	browsers = FakeBrowsers()
+	pool = make_pool(browsers, max_sessions=2, idle_timeout=None)
+	for session_id in ('a', 'b', 'a', 'c'):
+		async with pool.lease(session_id):
+			pass
+
+	assert list(pool.sessions) == ['a', 'c']
+	assert browsers.stopped == ['browser-2']  # b was used least recently
+	await pool.close_all()
+
+
+async def test_busy_sessions_are_not_evicted():
+	browsers = FakeBrowsers()
+	pool = make_pool(browsers, max_sessions=1, idle_timeout=None)
+	release = asyncio.Event()
+
+	async def hold():
+		async with pool.lease('a'):
+			await release.wait()
+
+	holder = asyncio.create_task(hold())
+	await asyncio.sleep(0.01)
+	assert pool.sessions['a'].in_use == 1
+	with pytest.raises(SessionLimitError):
+		async with pool.lease('b'):
+			pass
+
+	release.set()
+	await holder
+	async with pool.lease('b'):
+		pass
+	assert list(pool.sessions) == ['b']
+	await pool.close_all()
+
+
+async def test_idle_sessions_expire_without_a_periodic_sweep():
+	browsers = FakeBrowsers()
+	pool = make_pool(browsers, idle_timeout=0.1)
+	async with pool.lease('a'):
+		pass
+	await asyncio.sleep(0.05)
+	async with pool.lease('b'):
+		pass
+
+	await asyncio.sleep(0.08)
+	assert list(pool.sessions) == ['b']
+	await asyncio.sleep(0.08)
+	assert not pool.sessions
+	assert browsers.stopped == ['browser-1', 'browser-2']
+
+
+async def test_new_sessions_take_warm_spares_and_the_pool_refills():
+	browsers = FakeBrowsers()
+	pool = make_pool(browsers, warm_sessions=1, idle_timeout=None)
+	pool.start_warming()
+	await pool.wait_warm()
+	assert browsers.started == [None]
+
+	async with pool.lease('a') as session:
+		assert session.resource == 'browser-1'
+	async with pool.lease('default', use_spare=False) as session:
+		assert session.resource == 'browser-3'  # browser-2 is the replacement spare
+	await pool.wait_warm()
+
+	assert browsers.started == [None, None, 'default']
+	await pool.close_all()
+	assert sorted(browsers.stopped) == ['browser-1', 'browser-2', 'browser-3']
+
+
+async def test_opening_more_sessions_than_the_cap_at_once_fails_fast():
+	browsers = FakeBrowsers(start_delay=0.05)
+	pool = make_pool(browsers, max_sessions=2, idle_timeout=None)
+
+	async def call(session_id: str):
+		async with pool.lease(session_id):
+			pass
+
+	results = await asyncio.gather(*(call(session_id) for session_id in 'abc'), return_exceptions=True)
+
+	assert results[:2] == [None, None]
+	assert isinstance(results[2], SessionLimitError)
+	assert browsers.started == ['a', 'b']
+	await pool.close_all()
+
+
+async def test_close_waits_for_the_running_call():
+	browsers = FakeBrowsers()
+	pool = make_pool(browsers, idle_timeout=None)
+	events: list[str] = []
+
+	async def call():
+		async with pool.lease('a'):
+			await asyncio.sleep(0.02)
+			events.append('call finished')
+
+	task = asyncio.create_task(call())
+	await asyncio.sleep(0.005)
+	assert await pool.close('a')
+	events.append('closed')
+	await task
+
+	assert events == ['call finished', 'closed']
+	assert not await pool.close('a')
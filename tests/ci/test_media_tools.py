@@ -0,0 +1,146 @@
+"""Tests for the async media tool runner (navigator/knowledge/ingest/video/media_tools.py)."""
+
+import asyncio
+import json
+import os
+import sys
+import time
+
+import pytest
+
+from navigator.knowledge.ingest.video.media_tools import (
+	MediaToolError,
+	MediaToolResult,
+	MediaToolRunner,
+	parse_progress,
+)
+
+
+def _is_running(pid: int) -> bool:
+	"""True if the process exists and is not a zombie waiting to be reaped."""
+	try:
+		os.kill(pid, 0)
+	except ProcessLookupError:
+		return False
+	try:
+		with open(f'/proc/{pid}/stat') as f:
+			return f.read().split(')')[-1].split()[0] != 'Z'
+	except FileNotFoundError:
+		return False
+
+
+def python_tool(code: str) -> list[str]:
+	"""A stand-in media tool: a Python process running `code`."""
+	return [sys.executable, '-c', code]
+
+
+async def test_event_loop_stays_responsive_during_long_run():
+	runner = MediaToolRunner(max_concurrency=2)
+	ticks = []
+
+	async def ticker():
+		while True:
+			ticks.append(time.perf_counter())
+			await asyncio.sleep(0.01)
+
+	ticker_task = asyncio.create_task(ticker())
+	try:
+		result = await runner.run(python_tool('import time; time.sleep(1.0)'), timeout=10)
+	finally:
+		ticker_task.cancel()
+
+	assert result.ok
+	gaps = [b - a for a, b in zip(ticks, ticks[1:])]
+	assert len(ticks) > 50
+	assert max(gaps) < 0.2
+
+
+async def test_timeout_kills_process_group(tmp_path):
+	pid_file = tmp_path / 'child.pid'
+	# Parent spawns a long-running child, then sleeps; both must die on timeout
+	code = (
+		'import subprocess, sys, time\n'
+		f"child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])\n"
+		f"open({str(pid_file)!r}, 'w').write(str(child.pid))\n"
+		'time.sleep(30)\n'
+	)
+	runner = MediaToolRunner()
+
+	start = time.perf_counter()
+	result = await runner.run(python_tool(code), timeout=1.0)
+
+	assert result.timed_out
+	assert not result.ok
+	assert time.perf_counter() - start < 5
+	child_pid = int(pid_file.read_text())
+	await asyncio.sleep(0.2)
+	assert not _is_running(child_pid)
+
+
+async def test_check_raises_on_failure():
+	runner = MediaToolRunner()
+	with pytest.raises(MediaToolError):
+		await runner.run(python_tool('import sys; sys.exit(3)'), check=True)
+
+
+async def test_concurrency_is_bounded():
+	runner = MediaToolRunner(max_concurrency=2)
+
+	start = time.perf_counter()
+	await asyncio.gather(*(runner.run(python_tool('import time; time.sleep(0.3)')) for _ in range(4)))
+	elapsed = time.perf_counter() - start
+
+	assert elapsed >= 0.6
+
+
+async def test_progress_reported_from_stderr():
+	code = (
+		'import sys\n'
+		"for t in ('00:00:01.00', '00:00:02.50', '00:01:00.00'):\n"
+		"    sys.stderr.write(f'frame=  1 fps=0.0 time={t} bitrate=N/A\\r')\n"
+		'    sys.stderr.flush()\n'
+		"sys.stderr.write('\\n')\n"
+	)
+	positions = []
+	runner = MediaToolRunner()
+
+	await runner.run(python_tool(code), on_progress=positions.append)
+
+	assert positions == [1.0, 2.5, 60.0]
+
+
+def test_parse_progress():
+	assert parse_progress(b'size=  1kB time=01:02:03.50 bitrate=') == pytest.approx(3723.5)
+	assert parse_progress(b'Stream #0:0: Video: h264') is None
+
+
+async def test_stream_stdout_yields_incrementally():
+	runner = MediaToolRunner()
+	chunks = [chunk async for chunk in runner.stream_stdout(python_tool("import sys; sys.stdout.buffer.write(b'x' * 200000)"))]
+	assert b''.join(chunks) == b'x' * 200000
+
+
+class CountingProbeRunner(MediaToolRunner):
+	def __init__(self):
+		super().__init__()
+		self.calls = 0
+
+	async def run(self, args, timeout=None, on_progress=None, check=False):
+		self.calls += 1
+		return MediaToolResult(returncode=0, stdout=json.dumps({'format': {'duration': '12.5'}}).encode(), stderr='', elapsed=0)
+
+
+async def test_probe_cached_by_file_identity(tmp_path):
+	video = tmp_path / 'video.mp4'
+	video.write_bytes(b'fake video')
+	runner = CountingProbeRunner()
+
+	first = await runner.probe(video)
+	second = await runner.probe(video)
+	assert first == second
+	assert runner.calls == 1
+
+	# Changing the file invalidates the cache entry
+	video.write_bytes(b'fake video, re-encoded')
+	await runner.probe(video)
+	assert runner.calls == 2
@@ -0,0 +1,117 @@
+"""Tests for incremental agent history rendering in the MessageManager."""
+
+import pytest
+
+from browser_use.agent.message_manager.service import AgentHistoryRenderer, MessageManager
+from browser_use.agent.message_manager.views import HistoryItem
+from browser_use.agent.prompts import AgentMessagePrompt
+from browser_use.agent.views import MessageManagerState
+from browser_use.browser.views import BrowserStateSummary, TabInfo
+from browser_use.dom.views import SerializedDOMState
+from browser_use.filesystem.file_system import FileSystem
+from browser_use.llm import SystemMessage
+from browser_use.llm.messages import ContentPartTextParam
+
+
+def legacy_description(items: list[HistoryItem], max_history_items: int | None) -> str:
+	"""The previous full re-render, used as the reference output."""
+	if max_history_items is None or len(items) <= max_history_items:
+		return '\n'.join(item._render() for item in items)
+	omitted_count = len(items) - max_history_items
+	parts = [items[0]._render(), f'<sys>[... {omitted_count} previous steps omitted...]</sys>']
+	parts.extend(item._render() for item in items[-(max_history_items - 1) :])
+	return '\n'.join(parts)
+
+
+def make_item(step: int) -> HistoryItem:
+	if step % 7 == 0:
+		return HistoryItem(step_number=step, error=f'Error at step {step}')
+	return HistoryItem(
+		step_number=step, memory=f'memory {step}', next_goal=f'goal {step}', action_results=f'Result\nclicked {step}'
+	)
+
+
+@pytest.mark.parametrize('max_history_items', [None, 6, 10])
+def test_renderer_matches_full_rerender_every_step(max_history_items):
+	items = [HistoryItem(step_number=0, system_message='Agent initialized')]
+	renderer = AgentHistoryRenderer(max_history_items)
+
+	for step in range(1, 40):
+		items.append(make_item(step))
+		if step % 5 == 0:
+			items.append(HistoryItem(system_message=f'<follow_up_user_request> task {step} </follow_up_user_request>'))
+		assert renderer.render(items) == legacy_description(items, max_history_items)
+
+
+def test_renderer_handles_several_items_between_renders():
+	items = [make_item(step) for step in range(30)]
+	renderer = AgentHistoryRenderer(8)
+
+	assert renderer.render(items[:3]) == legacy_description(items[:3], 8)
+	assert renderer.render(items) == legacy_description(items, 8)
+
+
+def test_renderer_resets_when_history_is_replaced():
+	renderer = AgentHistoryRenderer(6)
+	first = [make_item(step) for step in range(10)]
+	renderer.render(first)
+
+	replaced = [make_item(step + 100) for step in range(4)]
+	assert renderer.render(replaced) == legacy_description(replaced, 6)
+
+	# Same list object, rewritten in place
+	first[:] = [make_item(step + 200) for step in range(3)]
+	renderer.render(first)
+	first[-1] = make_item(999)
+	assert renderer.render(first) == legacy_description(first, 6)
+
+
+def test_history_item_rendering_is_memoized_and_invalidated():
+	item = make_item(3)
+	assert item.to_string() is item.to_string()
+
+	item.memory = 'updated'
+	assert 'updated' in item.to_string()
+
+
+def test_message_manager_uses_incremental_history(tmp_path):
+	manager = MessageManager(
+		task='Do the thing',
+		system_message=SystemMessage(content='system'),
+		file_system=FileSystem(tmp_path),
+		state=MessageManagerState(),
+		max_history_items=6,
+	)
+	for step in range(1, 12):
+		manager.state.agent_history_items.append(make_item(step))
+		if step == 4:
+			manager.add_new_task('follow up')
+
+	assert manager.agent_history_description == legacy_description(manager.state.agent_history_items, 6)
+	assert '<sys>[... 7 previous steps omitted...]</sys>' in manager.agent_history_description
+
+
+def test_state_message_splits_stable_history_prefix(tmp_path):
+	browser_state = BrowserStateSummary(
+		url='https://example.com',
+		title='Example',
+		tabs=[TabInfo(target_id='tab-0', url='https://example.com', title='Example')],
+		screenshot=None,
+		dom_state=SerializedDOMState(_root=None, selector_map={}),
+	)
+	history = '<step>\nopened page'
+	message = AgentMessagePrompt(
+		browser_state_summary=browser_state,
+		file_system=FileSystem(tmp_path),
+		agent_history_description=history,
+		task='Do the thing',
+	).get_user_message(use_vision=False)
+
+	assert isinstance(message.content, list)
+	prefix, suffix = message.content
+	assert isinstance(prefix, ContentPartTextParam) and isinstance(suffix, ContentPartTextParam)
+	assert prefix.text == f'<agent_history>\n{history}\n</agent_history>\n'
+	assert suffix.text.startswith('<agent_state>')
+	# Joined text keeps the previous single-string layout
+	assert message.text == prefix.text + '\n' + suffix.text
+	assert '</agent_history>\n\n<agent_state>' in message.text
@@ -0,0 +1,256 @@
+"""Tests for provider-agnostic prompt prefix caching and cache-aware cost accounting."""
+
+from datetime import datetime
+
+from pydantic import BaseModel
+
+from browser_use.llm.anthropic.serializer import AnthropicMessageSerializer
+from browser_use.llm.google.chat import ChatGoogle
+from browser_use.llm.google.context_cache import GeminiContextCache
+from browser_use.llm.messages import AssistantMessage, ContentPartTextParam, SystemMessage, UserMessage
+from browser_use.llm.openai.chat import ChatOpenAI
+from browser_use.llm.openai.like import ChatOpenAILike
+from browser_use.llm.openai.serializer import OpenAIMessageSerializer
+from browser_use.llm.prompt_cache import CacheBreakpoint, find_cache_breakpoints, stable_prefix_key
+from browser_use.llm.views import ChatInvokeUsage
+from browser_use.tokens.service import TokenCost
+from browser_use.tokens.views import TokenUsageEntry
+
+SYSTEM_PROMPT = 'You are a browser agent. ' * 50
+
+
+def agent_messages(step: int) -> list:
+	"""System message plus a state message shaped like AgentMessagePrompt output."""
+	history = '\n'.join(f'<step_{i}>clicked {i}</step_{i}>' for i in range(step))
+	return [
+		SystemMessage(content=SYSTEM_PROMPT, cache=True),
+		UserMessage(
+			content=[
+				ContentPartTextParam(text=f'<agent_history>\n{history}\n</agent_history>\n'),
+				ContentPartTextParam(text=f'<agent_state>step {step}, url https://example.com/{step}</agent_state>'),
+			],
+			cache=True,
+			cache_prefix_parts=1,
+		),
+	]
+
+
+class Answer(BaseModel):
+	value: str
+
+
+def parts_of(content: object) -> list[dict]:
+	"""Narrow serialized multi-part message content to its list of part dicts."""
+	assert isinstance(content, list)
+	assert all(isinstance(part, dict) for part in content)
+	return content
+
+
+def test_breakpoints_cover_system_prompt_and_history_prefix():
+	assert find_cache_breakpoints(agent_messages(3)) == [
+		CacheBreakpoint('system', 0, None),
+		CacheBreakpoint('history', 1, 0),
+	]
+
+
+def test_only_last_cached_message_gets_a_breakpoint():
+	messages = [
+		UserMessage(content='first', cache=True),
+		AssistantMessage(content='ok'),
+		UserMessage(content=[ContentPartTextParam(text='a'), ContentPartTextParam(text='b')], cache=True),
+		UserMessage(content='uncached'),
+	]
+	assert find_cache_breakpoints(messages) == [CacheBreakpoint('message', 2, 1)]
+
+
+def test_anthropic_breakpoint_after_history_not_volatile_state():
+	messages, system = AnthropicMessageSerializer.serialize_messages(agent_messages(3))
+
+	assert isinstance(system, list)
+	assert system[-1].get('cache_control') == {'type': 'ephemeral'}
+	history_block, state_block = parts_of(messages[0]['content'])
+	assert history_block.get('cache_control') == {'type': 'ephemeral'}
+	assert state_block.get('cache_control') is None
+
+
+def test_anthropic_cache_without_prefix_still_caches_last_part():
+	message = UserMessage(content=[ContentPartTextParam(text='a'), ContentPartTextParam(text='b')], cache=True)
+	[serialized], _ = AnthropicMessageSerializer.serialize_messages([message])
+	assert [block.get('cache_control') for block in parts_of(serialized['content'])] == [None, {'type': 'ephemeral'}]
+
+
+def test_openai_payload_keeps_stable_prefix_first():
+	serialized = OpenAIMessageSerializer.serialize_messages(agent_messages(3))
+
+	assert serialized[0]['role'] == 'system'
+	assert serialized[0]['content'] == SYSTEM_PROMPT
+	parts = parts_of(serialized[1].get('content'))
+	assert parts[0]['text'].startswith('<agent_history>')
+	assert parts[1]['text'].startswith('<agent_state>')
+
+
+def test_prompt_cache_key_tracks_stable_prefix_only():
+	llm = ChatOpenAI(model='gpt-4.1-mini', api_key='test')
+	schema = {'type': 'object', 'properties': {'value': {'type': 'string'}}}
+
+	key = llm._get_prompt_cache_key(agent_messages(1), schema)
+	assert key and key == llm._get_prompt_cache_key(agent_messages(7), schema)
+	assert key != llm._get_prompt_cache_key(agent_messages(1), {'type': 'object'})
+	assert key == stable_prefix_key(agent_messages(1), '{"properties": {"value": {"type": "string"}}, "type": "object"}')
+
+	# Compatible endpoints may reject the parameter, so it's only sent to the official API by default
+	assert ChatOpenAI(model='m', api_key='test', base_url='http://localhost:1')._get_prompt_cache_key(agent_messages(1)) is None
+	assert ChatOpenAILike(model='m', api_key='test')._get_prompt_cache_key(agent_messages(1)) is None
+	assert ChatOpenAI(model='m', api_key='test', prompt_cache_key='fixed')._get_prompt_cache_key(agent_messages(1)) == 'fixed'
+
+
+class _FakeCaches:
+	def __init__(self, error: Exception | None = None):
+		self.error = error
+		self.created: list[dict] = []
+
+	async def create(self, model, config):
+		if self.error:
+			raise self.error
+		self.created.append({'model': model, 'config': config})
+		return _FakeCachedContent(f'cachedContents/{len(self.created)}')
+
+
+class _FakeCachedContent:
+	def __init__(self, name: str):
+		self.name = name
+
+
+class _FakeAio:
+	def __init__(self, error: Exception | None = None):
+		self.caches = _FakeCaches(error)
+
+
+class _FakeClient:
+	def __init__(self, error: Exception | None = None):
+		self.aio = _FakeAio(error)
+
+
+async def test_gemini_handle_created_once_and_reused():
+	client = _FakeClient()
+	cache = GeminiContextCache(ttl_seconds=600)
+
+	first = await cache.get_handle(client, 'gemini-2.5-flash', SYSTEM_PROMPT)  # type: ignore[arg-type]
+	second = await cache.get_handle(client, 'gemini-2.5-flash', SYSTEM_PROMPT)  # type: ignore[arg-type]
+	other_model = await cache.get_handle(client, 'gemini-2.5-pro', SYSTEM_PROMPT)  # type: ignore[arg-type]
+
+	assert first == second == 'cachedContents/1'
+	assert other_model == 'cachedContents/2'
+	config = client.aio.caches.created[0]['config']
+	assert config.system_instruction == SYSTEM_PROMPT
+	assert config.ttl == '600s'
+
+
+async def test_gemini_handle_refreshed_before_expiry():
+	client = _FakeClient()
+	cache = GeminiContextCache(ttl_seconds=30, refresh_margin_seconds=60)
+
+	await cache.get_handle(client, 'gemini-2.5-flash', SYSTEM_PROMPT)  # type: ignore[arg-type]
+	await cache.get_handle(client, 'gemini-2.5-flash', SYSTEM_PROMPT)  # type: ignore[arg-type]
+	assert len(client.aio.caches.created) == 2
+
+
+async def test_gemini_uncacheable_prompt_is_not_retried():
+	client = _FakeClient(ValueError('Cached content is too small'))
+	cache = GeminiContextCache(retry_backoff_seconds=0)
+
+	assert await cache.get_handle(client, 'gemini-2.5-flash', 'short') is None  # type: ignore[arg-type]
+	client.aio.caches.error = None
+	assert await cache.get_handle(client, 'gemini-2.5-flash', 'short') is None  # type: ignore[arg-type]
+	assert client.aio.caches.created == []
+
+
+async def test_gemini_transient_error_is_retried_after_backoff():
+	client = _FakeClient(ConnectionError('503 UNAVAILABLE'))
+	cache = GeminiContextCache(retry_backoff_seconds=60)
+
+	assert await cache.get_handle(client, 'gemini-2.5-flash', SYSTEM_PROMPT) is None  # type: ignore[arg-type]
+	client.aio.caches.error = None
+	# Within the backoff the prompt is sent uncached without another attempt
+	assert await cache.get_handle(client, 'gemini-2.5-flash', SYSTEM_PROMPT) is None  # type: ignore[arg-type]
+	assert client.aio.caches.created == []
+
+	# Once the backoff has passed it's created again
+	cache._retry_at.clear()
+	assert await cache.get_handle(client, 'gemini-2.5-flash', SYSTEM_PROMPT) == 'cachedContents/1'  # type: ignore[arg-type]
+
+
+async def test_chat_google_uses_handle_only_when_enabled():
+	llm = ChatGoogle(model='gemini-2.5-flash', api_key='test', cache_system_instruction=True)
+	llm._client = _FakeClient()  # type: ignore[assignment]
+
+	assert await llm._get_cached_content(SYSTEM_PROMPT, {}) == 'cachedContents/1'
+	# Handles can't be combined with request-level tools
+	assert await llm._get_cached_content(SYSTEM_PROMPT, {'tools': []}) is None
+
+	disabled = ChatGoogle(model='gemini-2.5-flash', api_key='test')
+	assert await disabled._get_cached_content(SYSTEM_PROMPT, {}) is None
+
+
+def make_token_cost(pricing: dict) -> TokenCost:
+	token_cost = TokenCost(include_cost=True)
+	token_cost._pricing_data = pricing
+	token_cost._initialized = True
+	return token_cost
+
+
+def usage(prompt: int, cached: int | None, creation: int | None = None, completion: int = 100) -> ChatInvokeUsage:
+	return ChatInvokeUsage(
+		prompt_tokens=prompt,
+		prompt_cached_tokens=cached,
+		prompt_cache_creation_tokens=creation,
+		prompt_image_tokens=None,
+		completion_tokens=completion,
+		total_tokens=prompt + completion,
+	)
+
+
+async def test_cache_hits_priced_at_cache_read_rate():
+	token_cost = make_token_cost(
+		{
+			'claude-sonnet': {
+				'input_cost_per_token': 3e-6,
+				'output_cost_per_token': 15e-6,
+				'cache_read_input_token_cost': 0.3e-6,
+				'cache_creation_input_token_cost': 3.75e-6,
+			}
+		}
+	)
+
+	cost = await token_cost.calculate_cost('claude-sonnet', usage(10_000, 8_000, creation=1_000))
+	assert cost is not None
+	assert cost.new_prompt_tokens == 2_000
+	assert cost.new_prompt_cost == 2_000 * 3e-6
+	assert cost.prompt_read_cached_cost == 8_000 * 0.3e-6
+	assert cost.prompt_cache_creation_cost == 1_000 * 3.75e-6
+
+
+async def test_cache_hits_without_cache_rate_billed_at_input_rate():
+	token_cost = make_token_cost({'some-model': {'input_cost_per_token': 1e-6, 'output_cost_per_token': 2e-6}})
+
+	cost = await token_cost.calculate_cost('some-model', usage(1_000, 400))
+	assert cost is not None
+	assert cost.prompt_cost == 1_000 * 1e-6
+
+
+async def test_usage_summary_counts_cache_reads_once():
+	token_cost = make_token_cost(
+		{'gpt-4.1-mini': {'input_cost_per_token': 4e-7, 'output_cost_per_token': 1.6e-6, 'cache_read_input_token_cost': 1e-7}}
+	)
+	# Simulated run: the stable prefix is cached from the second step on
+	for step, cached in enumerate([None, 3_072, 3_072, 4_096]):
+		token_cost.usage_history.append(
+			TokenUsageEntry(model='gpt-4.1-mini', timestamp=datetime.now(), usage=usage(5_000 + step * 200, cached))
+		)
+
+	summary = await token_cost.get_usage_summary()
+	assert summary.total_prompt_cached_tokens == 10_240
+	assert summary.by_model['gpt-4.1-mini'].prompt_cached_tokens == 10_240
+	assert abs(summary.total_prompt_cached_cost - 10_240 * 1e-7) < 1e-12
+	assert abs(summary.total_cost - summary.by_model['gpt-4.1-mini'].cost) < 1e-12
+	assert abs(summary.total_cost - (summary.total_prompt_cost + summary.total_completion_cost)) < 1e-12
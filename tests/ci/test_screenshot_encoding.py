@@ -0,0 +1,152 @@
+"""Tests for screenshot encoding profiles, per-step variant caching and content-addressed storage."""
+
+import asyncio
+import base64
+from io import BytesIO
+
+import pytest
+from PIL import Image, ImageDraw
+
+from browser_use.agent.prompts import AgentMessagePrompt
+from browser_use.browser.views import BrowserStateSummary, TabInfo
+from browser_use.dom.views import SerializedDOMState
+from browser_use.filesystem.file_system import FileSystem
+from browser_use.llm.messages import ContentPartImageParam
+from browser_use.screenshots.encoding import (
+	ScreenshotProfile,
+	ScreenshotVariants,
+	detect_media_type,
+	detect_media_type_b64,
+	encode_screenshot,
+	get_screenshot_variants,
+)
+from browser_use.screenshots.service import ScreenshotService
+
+
+def make_png(width: int = 400, height: int = 300, label: str = 'Sign in') -> bytes:
+	# A noisy background, like page imagery, so lossy formats have something to save on
+	image = Image.effect_noise((width, height), 32).convert('RGB')
+	draw = ImageDraw.Draw(image)
+	draw.rectangle((20, 20, width - 20, 60), fill=(30, 90, 200))
+	draw.text((30, 80), label, fill='black')
+	buffer = BytesIO()
+	image.save(buffer, format='PNG')
+	return buffer.getvalue()
+
+
+def image_info(data: bytes) -> tuple[str, tuple[int, int], str]:
+	with Image.open(BytesIO(data)) as img:
+		return (img.format or '').lower(), img.size, img.mode
+
+
+def test_default_profile_passes_png_through_unchanged():
+	png = make_png()
+	encoded = encode_screenshot(png, ScreenshotProfile())
+	assert encoded.data is png
+	assert encoded.media_type == 'image/png'
+	assert (encoded.width, encoded.height) == (400, 300)
+
+
+@pytest.mark.parametrize('fmt', ['jpeg', 'webp'])
+def test_lossy_profiles_reencode_and_shrink(fmt):
+	png = make_png(800, 600)
+	encoded = encode_screenshot(png, ScreenshotProfile(format=fmt, quality=70))
+
+	assert encoded.media_type == f'image/{fmt}'
+	assert detect_media_type(encoded.data) == encoded.media_type
+	assert image_info(encoded.data)[:2] == (fmt, (800, 600))
+	assert len(encoded.data) < len(png)
+	assert encoded.data_url.startswith(f'data:image/{fmt};base64,')
+
+
+def test_max_dimension_keeps_aspect_ratio_and_size_is_exact():
+	png = make_png(1600, 1000)
+
+	scaled = encode_screenshot(png, ScreenshotProfile(max_dimension=800))
+	assert image_info(scaled.data)[1] == (800, 500) == (scaled.width, scaled.height)
+
+	# Images already within the limit are not upscaled
+	assert encode_screenshot(make_png(400, 300), ScreenshotProfile(max_dimension=800)).width == 400
+
+	exact = encode_screenshot(png, ScreenshotProfile(size=(640, 480), max_dimension=100))
+	assert (exact.width, exact.height) == (640, 480)
+
+
+def test_grayscale_profile():
+	encoded = encode_screenshot(make_png(), ScreenshotProfile(format='jpeg', grayscale=True))
+	assert image_info(encoded.data)[2] == 'L'
+
+
+async def test_variants_encode_each_profile_once():
+	variants = ScreenshotVariants(base64.b64encode(make_png()).decode())
+	profile = ScreenshotProfile(format='webp', quality=60, max_dimension=200)
+
+	results = await asyncio.gather(*(variants.get(profile) for _ in range(5)))
+	assert all(result is results[0] for result in results)
+	assert variants.get_sync(profile) is results[0]
+	assert variants.get_sync(ScreenshotProfile(format='webp', quality=60, max_dimension=200)) is results[0]
+	assert variants.source_size == (400, 300)
+
+
+def test_shared_variants_are_reused_per_capture():
+	screenshot_b64 = base64.b64encode(make_png(label='shared')).decode()
+	assert get_screenshot_variants(screenshot_b64) is get_screenshot_variants(screenshot_b64)
+
+
+async def test_storage_is_content_addressed(tmp_path):
+	service = ScreenshotService(tmp_path, profile=ScreenshotProfile(format='webp', quality=80))
+	login = base64.b64encode(make_png(label='login')).decode()
+	dashboard = base64.b64encode(make_png(label='dashboard')).decode()
+
+	first = await service.store_screenshot(login, 1)
+	second = await service.store_screenshot(login, 2)
+	third = await service.store_screenshot(dashboard, 3)
+
+	assert first == second != third
+	assert first.endswith('.webp')
+	assert sorted(p.name for p in service.screenshots_dir.iterdir()) == sorted({first.split('/')[-1], third.split('/')[-1]})
+	assert service.bytes_written < service.bytes_stored
+
+	loaded = await service.get_screenshot(first)
+	assert loaded is not None
+	assert detect_media_type_b64(loaded) == 'image/webp'
+
+
+async def test_storage_keeps_undecodable_data(tmp_path):
+	service = ScreenshotService(tmp_path, profile=ScreenshotProfile(format='jpeg'))
+	raw = base64.b64encode(b'not an image').decode()
+
+	path = await service.store_screenshot(raw, 1)
+	assert path.endswith('.png')
+	assert await service.get_screenshot(path) == raw
+
+
+def test_detect_media_type():
+	assert detect_media_type(make_png()) == 'image/png'
+	assert detect_media_type(encode_screenshot(make_png(), ScreenshotProfile(format='jpeg')).data) == 'image/jpeg'
+	assert detect_media_type_b64(base64.b64encode(b'GIF89a....').decode()) == 'image/gif'
+	assert detect_media_type_b64('not base64!') == 'image/png'
+
+
+def test_state_message_uses_llm_profile(tmp_path):
+	screenshot = base64.b64encode(make_png(1200, 800)).decode()
+	browser_state = BrowserStateSummary(
+		url='https://example.com',
+		title='Example',
+		tabs=[TabInfo(target_id='tab-0', url='https://example.com', title='Example')],
+		screenshot=screenshot,
+		dom_state=SerializedDOMState(_root=None, selector_map={}),
+	)
+	message = AgentMessagePrompt(
+		browser_state_summary=browser_state,
+		file_system=FileSystem(tmp_path),
+		screenshots=[screenshot],
+		screenshot_profile=ScreenshotProfile(format='jpeg', quality=75, max_dimension=600),
+	).get_user_message(use_vision=True)
+
+	assert isinstance(message.content, list)
+	[image] = [part for part in message.content if isinstance(part, ContentPartImageParam)]
+	assert image.image_url.media_type == 'image/jpeg'
+	assert image.image_url.url.startswith('data:image/jpeg;base64,')
+	data = base64.b64decode(image.image_url.url.split(',', 1)[1])
+	assert image_info(data)[:2] == ('jpeg', (600, 400))
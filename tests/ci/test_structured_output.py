@@ -0,0 +1,158 @@
+"""Tests for incremental structured-output parsing (browser_use/llm/structured_output.py)."""
+
+import asyncio
+import json
+
+import pytest
+from pydantic import BaseModel, Field
+
+from browser_use.llm.structured_output import (
+	StreamingJSONParser,
+	StructuredOutputError,
+	parse_json_stream,
+	parse_json_text,
+)
+
+
+class Element(BaseModel):
+	type: str
+	label: str = ''
+
+
+class Analysis(BaseModel):
+	screen_state: str
+	ui_elements: list[Element] = Field(default_factory=list)
+	confidence: float = Field(default=0.0, ge=0.0, le=1.0)
+
+
+RESPONSE = {
+	'screen_state': 'Login {page}',
+	'ui_elements': [{'type': 'button', 'label': 'Sign "in"'}, {'type': 'input', 'label': 'a\\b ] }'}],
+	'confidence': 0.9,
+}
+
+
+async def as_stream(text: str, size: int = 7, delay: float = 0.0):
+	for offset in range(0, len(text), size):
+		if delay:
+			await asyncio.sleep(delay)
+		yield text[offset : offset + size]
+
+
+def test_fenced_response_with_prose():
+	text = 'Here is the analysis:\n```json\n' + json.dumps(RESPONSE, indent=2) + '\n```\nLet me know!'
+	result = parse_json_text(text, Analysis, strict=True)
+
+	assert result.complete
+	assert result.data == RESPONSE
+	assert result.value == Analysis.model_validate(RESPONSE)
+
+
+def test_fields_complete_incrementally_across_any_split():
+	text = json.dumps(RESPONSE)
+	for size in (1, 3, 64):
+		parser = StreamingJSONParser(Analysis)
+		completed = []
+		for offset in range(0, len(text), size):
+			completed.extend(parser.feed(text[offset : offset + size]))
+		assert completed == ['screen_state', 'ui_elements', 'confidence']
+		assert parser.finish().value == Analysis.model_validate(RESPONSE)
+
+
+def test_first_field_available_before_stream_ends():
+	text = json.dumps(RESPONSE)
+	parser = StreamingJSONParser(Analysis)
+	split = text.index('"ui_elements"')
+
+	assert parser.feed(text[:split]) == ['screen_state']
+	assert parser.fields == {'screen_state': 'Login {page}'}
+	assert not parser.done
+
+
+def test_array_root():
+	assert parse_json_text('```\n[{"a": 1}, {"a": 2}]\n```').data == [{'a': 1}, {'a': 2}]
+
+
+def test_control_characters_in_strings_are_tolerated():
+	result = parse_json_text('{"screen_state": "line one\nline two"}', Analysis)
+	assert result.value is not None
+	assert result.value.screen_state == 'line one\nline two'
+
+
+@pytest.mark.parametrize(
+	'text',
+	[
+		'{"screen_state": "x"]',  # Mismatched bracket
+		'{screen_state: "x"}',  # Unquoted key
+		'{"screen_state" "x"}',  # Missing colon
+		'{"screen_state": "x",, "confidence": 1}',
+	],
+)
+def test_unrecoverable_structure_raises(text):
+	with pytest.raises(StructuredOutputError):
+		parse_json_text(text, Analysis)
+
+
+def test_abort_happens_before_rest_of_stream():
+	parser = StreamingJSONParser(Analysis)
+	parser.feed('{"screen_state": "x"')
+	with pytest.raises(StructuredOutputError):
+		parser.feed(']')
+
+
+def test_invalid_field_recorded_or_raised_in_strict_mode():
+	text = '{"screen_state": "x", "confidence": 4.0}'
+
+	result = parse_json_text(text, Analysis)
+	assert list(result.field_errors) == ['confidence']
+	assert result.value is None
+
+	with pytest.raises(StructuredOutputError, match='confidence'):
+		parse_json_text(text, Analysis, strict=True)
+
+
+def test_truncated_response_returns_completed_fields():
+	result = parse_json_text('{"screen_state": "x", "ui_elements": [{"type": "but', Analysis)
+
+	assert not result.complete
+	assert result.data == {'screen_state': 'x'}
+	with pytest.raises(StructuredOutputError):
+		parse_json_text('{"screen_state": "x"', Analysis, strict=True)
+
+
+def test_no_json_found():
+	assert parse_json_text('I cannot analyze this image.').error == 'No JSON value found'
+	with pytest.raises(StructuredOutputError):
+		StreamingJSONParser(max_preamble_chars=10).feed('x' * 11)
+
+
+async def test_stream_stops_reading_once_value_closes():
+	consumed = []
+
+	async def chunks():
+		for piece in ('{"screen_state": ', '"x"}', '\n```', 'never read'):
+			consumed.append(piece)
+			yield piece
+
+	result = await parse_json_stream(chunks(), Analysis)
+
+	assert result.value == Analysis(screen_state='x')
+	assert 'never read' not in consumed
+
+
+async def test_stream_timeout_returns_partial_result():
+	text = json.dumps(RESPONSE)
+	fields = []
+
+	result = await parse_json_stream(
+		as_stream(text, size=10, delay=0.02),
+		Analysis,
+		timeout=0.15,
+		on_field=lambda name, value: fields.append(name),
+	)
+
+	assert result.timed_out
+	assert not result.complete
+	assert result.data == {'screen_state': 'Login {page}'}
+	assert fields == ['screen_state']
+	assert result.time_to_first_field is not None
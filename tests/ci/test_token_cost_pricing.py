@@ -0,0 +1,190 @@
+"""Tests for offline-first TokenCost pricing and incremental usage summaries. Networking is disabled throughout."""
+
+import json
+import socket
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+from browser_use.llm.views import ChatInvokeUsage
+from browser_use.tokens import service as token_service
+from browser_use.tokens.pricing import compact_pricing_data, load_bundled_pricing, model_name_candidates
+from browser_use.tokens.service import TokenCost
+from browser_use.tokens.views import CachedPricingData
+
+_RealAsyncClient = httpx.AsyncClient
+
+
+@pytest.fixture(autouse=True)
+def no_network(monkeypatch):
+	def refuse(*args, **kwargs):
+		raise OSError('networking is disabled in this test')
+
+	monkeypatch.setattr(socket.socket, 'connect', refuse)
+	monkeypatch.setattr(socket, 'create_connection', refuse)
+
+
+@pytest.fixture
+def token_cost(tmp_path):
+	token_cost = TokenCost(include_cost=True)
+	token_cost._cache_dir = tmp_path
+	return token_cost
+
+
+def usage(prompt: int, completion: int = 50, cached: int | None = None) -> ChatInvokeUsage:
+	return ChatInvokeUsage(
+		prompt_tokens=prompt,
+		prompt_cached_tokens=cached,
+		prompt_cache_creation_tokens=None,
+		prompt_image_tokens=None,
+		completion_tokens=completion,
+		total_tokens=prompt + completion,
+	)
+
+
+async def test_bundled_snapshot_prices_common_models_offline(token_cost):
+	for model in ('gpt-4.1-mini', 'claude-sonnet-4-5', 'gemini-2.5-flash', 'gemini-flash-latest', 'bu-latest'):
+		pricing = await token_cost.get_model_pricing(model)
+		assert pricing is not None and pricing.input_cost_per_token, model
+
+	cost = await token_cost.calculate_cost('gpt-4.1-mini', usage(1_000))
+	assert cost is not None and cost.total_cost > 0
+
+	# The stale-snapshot refresh ran in the background, failed quietly and kept the bundled prices
+	if token_cost._refresh_task:
+		await token_cost._refresh_task
+	assert token_cost._pricing_data is load_bundled_pricing().data
+
+
+def test_snapshot_only_contains_chat_pricing_fields():
+	snapshot = load_bundled_pricing()
+	assert 'gpt-4.1-mini' in snapshot.data
+	assert not any('embedding' in name for name in snapshot.data)
+	assert {key for entry in snapshot.data.values() for key in entry} <= {
+		'input_cost_per_token',
+		'output_cost_per_token',
+		'cache_read_input_token_cost',
+		'cache_creation_input_token_cost',
+		'max_tokens',
+		'max_input_tokens',
+		'max_output_tokens',
+	}
+
+
+async def test_normalized_names_resolve_once(token_cost):
+	token_cost.refresh_pricing = False
+	token_cost._pricing_data = {
+		'groq/llama-3.3-70b-versatile': {'input_cost_per_token': 5.9e-7, 'output_cost_per_token': 7.9e-7},
+		'gemini/gemini-2.5-flash': {'input_cost_per_token': 3e-7, 'output_cost_per_token': 2.5e-6},
+	}
+	token_cost._initialized = True
+
+	groq = await token_cost.get_model_pricing('llama-3.3-70b-versatile')
+	assert groq is not None and groq.input_cost_per_token == 5.9e-7
+	assert await token_cost.get_model_pricing('llama-3.3-70b-versatile') is groq
+	gemini = await token_cost.get_model_pricing('models/gemini-2.5-flash')
+	assert gemini is not None and gemini.output_cost_per_token == 2.5e-6
+	assert await token_cost.get_model_pricing('unknown-model') is None
+	assert set(token_cost._model_pricing) == {'llama-3.3-70b-versatile', 'models/gemini-2.5-flash', 'unknown-model'}
+
+	# New pricing data invalidates resolved names
+	token_cost._pricing_data = {'llama-3.3-70b-versatile': {'input_cost_per_token': 1e-6}}
+	refreshed = await token_cost.get_model_pricing('llama-3.3-70b-versatile')
+	assert refreshed is not None and refreshed.input_cost_per_token == 1e-6
+
+
+def test_model_name_candidates():
+	candidates = model_name_candidates('Models/Gemini-2.5-Flash', 'gemini/gemini-2.5-flash')
+	assert candidates[0] == 'gemini/gemini-2.5-flash'
+	assert 'gemini-2.5-flash' in candidates
+	assert 'gpt-oss-120b' in model_name_candidates('openai/gpt-oss-120b')
+	assert 'groq/openai/gpt-oss-120b' in model_name_candidates('openai/gpt-oss-120b')
+
+
+async def test_newer_refreshed_cache_wins_without_refetching(token_cost, tmp_path):
+	cached = CachedPricingData(
+		timestamp=datetime.now(), data={'my-model': {'input_cost_per_token': 1e-6, 'output_cost_per_token': 2e-6}}
+	)
+	(tmp_path / f'{TokenCost.CACHE_FILE_PREFIX}20990101_000000.json').write_text(cached.model_dump_json())
+
+	pricing = await token_cost.get_model_pricing('my-model')
+
+	assert pricing is not None and pricing.output_cost_per_token == 2e-6
+	assert token_cost._refresh_task is None
+
+
+async def test_background_refresh_compacts_and_caches(token_cost, tmp_path, monkeypatch):
+	litellm_document = {
+		'sample_spec': {'input_cost_per_token': 0},
+		'gpt-4.1-mini': {'litellm_provider': 'openai', 'mode': 'chat', 'input_cost_per_token': 9e-7, 'supports_vision': True},
+		'text-embedding-3-small': {'litellm_provider': 'openai', 'mode': 'embedding', 'input_cost_per_token': 2e-8},
+	}
+	transport = httpx.MockTransport(lambda request: httpx.Response(200, json=litellm_document))
+	monkeypatch.setattr(token_service.httpx, 'AsyncClient', lambda *args, **kwargs: _RealAsyncClient(transport=transport))
+	(tmp_path / 'pricing_20240101_000000.json').write_text('{"timestamp": "2024-01-01T00:00:00", "data": {}}')
+
+	await token_cost.refresh_pricing_data()
+
+	assert token_cost._pricing_data == {'gpt-4.1-mini': {'input_cost_per_token': 9e-7}}
+	pricing = await token_cost.get_model_pricing('gpt-4.1-mini')
+	assert pricing is not None and pricing.input_cost_per_token == 9e-7
+	[cache_file] = tmp_path.iterdir()
+	assert cache_file.name.startswith(TokenCost.CACHE_FILE_PREFIX)
+	assert json.loads(cache_file.read_text())['data'] == token_cost._pricing_data
+
+
+def test_compact_pricing_data_drops_unused_fields_and_models():
+	compacted = compact_pricing_data(
+		{
+			'claude-sonnet-4-5': {
+				'litellm_provider': 'anthropic',
+				'mode': 'chat',
+				'input_cost_per_token': 3e-6,
+				'cache_creation_input_token_cost': None,
+				'supports_pdf_input': True,
+			},
+			'dall-e-3': {'litellm_provider': 'openai', 'mode': 'image_generation', 'input_cost_per_token': 1e-6},
+			'some-model': {'litellm_provider': 'unsupported', 'mode': 'chat', 'input_cost_per_token': 1e-6},
+		}
+	)
+	assert compacted == {'claude-sonnet-4-5': {'input_cost_per_token': 3e-6}}
+
+
+async def test_usage_summary_is_incremental(token_cost, monkeypatch):
+	token_cost._pricing_data = {'gpt-4.1-mini': {'input_cost_per_token': 4e-7, 'output_cost_per_token': 1.6e-6}}
+	token_cost._initialized = True
+
+	priced: list[str] = []
+	calculate_cost = token_cost.calculate_cost
+
+	async def counting_calculate_cost(model, usage):
+		priced.append(model)
+		return await calculate_cost(model, usage)
+
+	monkeypatch.setattr(token_cost, 'calculate_cost', counting_calculate_cost)
+
+	for step in range(10):
+		token_cost.add_usage('gpt-4.1-mini', usage(1_000 + step, cached=500 if step else None))
+	first = await token_cost.get_usage_summary()
+	assert len(priced) == 10
+
+	for _ in range(3):
+		token_cost.add_usage('other-model', usage(200))
+	second = await token_cost.get_usage_summary()
+	assert len(priced) == 13
+
+	assert first.entry_count == 10 and second.entry_count == 13
+	full = await token_cost.get_usage_summary(since=datetime.now() - timedelta(days=1))
+	assert second.model_dump() == full.model_dump()
+	assert second.by_model['gpt-4.1-mini'].average_tokens_per_invocation == (10 * 1_000 + 45 + 10 * 50) / 10
+
+	# Callers can't change the running totals through the returned stats
+	second.by_model['gpt-4.1-mini'].invocations = 0
+	assert (await token_cost.get_usage_summary()).by_model['gpt-4.1-mini'].invocations == 10
+
+	only_other = await token_cost.get_usage_summary(model='other-model')
+	assert only_other.entry_count == 3 and only_other.total_cost == 0
+
+	token_cost.clear_history()
+	assert (await token_cost.get_usage_summary()).entry_count == 0
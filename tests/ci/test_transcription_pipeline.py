@@ -0,0 +1,170 @@
+"""Tests for the streaming chunked transcription pipeline."""
+
+import array
+import asyncio
+import math
+
+import pytest
+
+from navigator.knowledge.ingest.video.transcription_pipeline import (
+	SAMPLE_RATE,
+	AudioChunk,
+	ChunkTranscript,
+	OfflineStubBackend,
+	TranscriptCache,
+	TranscriptionBackend,
+	TranscriptionPipeline,
+	chunk_pcm_stream,
+	stitch_transcripts,
+)
+
+
+def make_speech_pcm(pattern: list[tuple[float, bool]], sample_rate: int = SAMPLE_RATE) -> bytes:
+	"""Generate PCM from (seconds, is_tone) pairs; tones stand in for speech."""
+	samples = array.array('h')
+	for seconds, is_tone in pattern:
+		count = int(seconds * sample_rate)
+		if is_tone:
+			samples.extend(int(8000 * math.sin(2 * math.pi * 440 * i / sample_rate)) for i in range(count))
+		else:
+			samples.extend([0] * count)
+	return samples.tobytes()
+
+
+async def as_stream(pcm: bytes, read_size: int = 8192):
+	for offset in range(0, len(pcm), read_size):
+		yield pcm[offset : offset + read_size]
+
+
+async def collect_chunks(pcm: bytes, **kwargs) -> list[AudioChunk]:
+	return [chunk async for chunk in chunk_pcm_stream(as_stream(pcm), **kwargs)]
+
+
+class TestChunking:
+	async def test_chunks_cover_entire_stream(self):
+		pcm = make_speech_pcm([(1.0, True), (0.5, False)] * 8)
+		chunks = await collect_chunks(pcm, chunk_seconds=3.0, search_seconds=1.0)
+
+		assert b''.join(c.pcm for c in chunks) == pcm
+		assert [c.index for c in chunks] == list(range(len(chunks)))
+		for previous, current in zip(chunks, chunks[1:]):
+			assert current.start == pytest.approx(previous.end)
+
+	async def test_cuts_snap_to_silence(self):
+		# Speech 0-2.6s, silence 2.6-3.4s, speech 3.4-6s: the 3s boundary must land in the silence
+		pcm = make_speech_pcm([(2.6, True), (0.8, False), (2.6, True)])
+		chunks = await collect_chunks(pcm, chunk_seconds=3.0, search_seconds=1.0)
+
+		assert len(chunks) == 2
+		assert 2.6 <= chunks[0].end <= 3.4
+
+	async def test_short_stream_is_single_chunk(self):
+		pcm = make_speech_pcm([(1.0, True)])
+		chunks = await collect_chunks(pcm, chunk_seconds=30.0)
+		assert len(chunks) == 1
+		assert chunks[0].duration == pytest.approx(1.0)
+
+
+class TestStitching:
+	def test_offsets_applied(self):
+		chunk_a = AudioChunk(index=0, start=0.0, pcm=b'\x00\x00' * SAMPLE_RATE)
+		chunk_b = AudioChunk(index=1, start=1.0, pcm=b'\x00\x00' * SAMPLE_RATE)
+		transcript = ChunkTranscript(
+			segments=[{'start': 0.1, 'end': 0.5, 'text': 'hello'}],
+			words=[{'word': 'hello', 'start': 0.1, 'end': 0.5, 'confidence': 0.8}],
+			language='en-US',
+		)
+
+		result = stitch_transcripts([(chunk_b, transcript), (chunk_a, transcript)])
+
+		assert result is not None
+		assert [s['start'] for s in result['segments']] == pytest.approx([0.1, 1.1])
+		assert result['transcription'] == 'hello hello'
+		assert result['confidence'] == pytest.approx(0.8)
+
+	def test_empty_returns_none(self):
+		chunk = AudioChunk(index=0, start=0.0, pcm=b'')
+		assert stitch_transcripts([(chunk, ChunkTranscript())]) is None
+
+
+class TestPipeline:
+	async def test_transcribes_with_absolute_timestamps(self, tmp_path):
+		pcm = make_speech_pcm([(1.0, False), (1.0, True), (2.0, False), (1.0, True), (1.0, False)])
+		pipeline = TranscriptionPipeline(OfflineStubBackend(), chunk_seconds=2.5, cache=TranscriptCache(tmp_path))
+
+		result = await pipeline.transcribe_stream(as_stream(pcm))
+
+		assert result is not None
+		starts = [s['start'] for s in result['segments']]
+		assert starts == pytest.approx([1.0, 4.0], abs=0.05)
+
+	async def test_chunks_run_concurrently(self):
+		pcm = make_speech_pcm([(0.5, True), (0.5, False)] * 8)
+		backend = OfflineStubBackend(latency=0.1)
+		pipeline = TranscriptionPipeline(backend, chunk_seconds=1.0, max_concurrency=8)
+
+		start = asyncio.get_running_loop().time()
+		await pipeline.transcribe_stream(as_stream(pcm))
+		elapsed = asyncio.get_running_loop().time() - start
+
+		assert backend.calls >= 4
+		assert elapsed < backend.calls * 0.1 * 0.75
+
+	async def test_backpressure_blocks_until_a_chunk_finishes(self, monkeypatch):
+		class SlowAfterFirstBackend(OfflineStubBackend):
+			async def transcribe_chunk(self, chunk):
+				self.latency = 0.05 if self.calls else 0.0
+				return await super().transcribe_chunk(chunk)
+
+		waits = 0
+		wait = asyncio.wait
+
+		async def counting_wait(*args, **kwargs):
+			nonlocal waits
+			waits += 1
+			return await wait(*args, **kwargs)
+
+		monkeypatch.setattr(asyncio, 'wait', counting_wait)
+		backend = SlowAfterFirstBackend()
+		pipeline = TranscriptionPipeline(backend, chunk_seconds=1.0, max_concurrency=1)
+
+		await pipeline.transcribe_stream(as_stream(make_speech_pcm([(0.5, True), (0.5, False)] * 8)))
+
+		# One wait per chunk at most; a finished task must not wake the loop again
+		assert backend.calls >= 4
+		assert waits <= backend.calls
+
+	async def test_heartbeat_per_chunk(self):
+		pcm = make_speech_pcm([(0.5, True), (0.5, False)] * 4)
+		progress = []
+		pipeline = TranscriptionPipeline(OfflineStubBackend(), chunk_seconds=1.0)
+
+		await pipeline.transcribe_stream(as_stream(pcm), on_chunk_done=lambda done, chunk: progress.append(done))
+
+		assert progress == list(range(1, len(progress) + 1))
+		assert len(progress) >= 3
+
+	async def test_cache_hit_skips_backend(self, tmp_path):
+		pcm = make_speech_pcm([(1.0, True), (1.0, False)] * 3)
+		cache = TranscriptCache(tmp_path)
+		backend = OfflineStubBackend()
+		pipeline = TranscriptionPipeline(backend, chunk_seconds=2.0, cache=cache)
+
+		first = await pipeline.transcribe_stream(as_stream(pcm))
+		calls_after_first = backend.calls
+		second = await pipeline.transcribe_stream(as_stream(pcm))
+
+		assert first == second
+		assert backend.calls == calls_after_first
+		assert cache.hits == calls_after_first
+
+	async def test_backend_error_propagates(self):
+		class FailingBackend(TranscriptionBackend):
+			name = 'failing'
+
+			async def transcribe_chunk(self, chunk):
+				raise ConnectionError('backend down')
+
+		pipeline = TranscriptionPipeline(FailingBackend(), chunk_seconds=1.0)
+		with pytest.raises(ConnectionError):
+			await pipeline.transcribe_stream(as_stream(make_speech_pcm([(3.0, True)])))
@@ -0,0 +1,105 @@
+"""
+Presentation Action Queue Benchmark
+
+Queues the same workload (SESSIONS sessions x ACTIONS_PER_SESSION actions, each
+taking ACTION_MS like a quick browser action) and measures throughput and queue
+wait times with a global rate limit of RATE actions per second:
+
+- previous: one serial loop behind asyncio.Semaphore(rate) plus a fixed
+  sleep(1 / rate) per action, as ActionQueue did before the scheduler
+- scheduler: ActionQueue with the token-bucket scheduler, one action at a time
+  per session and sessions running concurrently
+- scheduler + coalescing: as above, with every session sending runs of
+  scrolls in the same direction that get merged
+
+Wait time is measured from enqueue to start for every action.
+"""
+
+import asyncio
+import statistics
+import time
+
+from navigator.presentation.action_queue import ActionQueue
+
+SESSIONS = 8
+ACTIONS_PER_SESSION = 50
+ACTION_MS = 20
+RATE = 100
+
+
+def workload(scrolls: bool) -> list[tuple[str, dict]]:
+	actions = []
+	for i in range(ACTIONS_PER_SESSION):
+		for session in range(SESSIONS):
+			if scrolls and i % 5:
+				action = {'type': 'scroll', 'params': {'direction': 'down', 'amount': 100}}
+			else:
+				action = {'type': 'click', 'params': {'index': i}}
+			actions.append((f'session-{session}', action))
+	return actions
+
+
+async def run_action(action: dict) -> None:
+	await asyncio.sleep(ACTION_MS / 1000)
+
+
+async def previous_behaviour(actions: list[tuple[str, dict]]) -> tuple[float, list[float], int]:
+	rate_limiter = asyncio.Semaphore(RATE)
+	enqueued_at = time.perf_counter()
+	waits = []
+	for _, action in actions:
+		async with rate_limiter:
+			await asyncio.sleep(1.0 / RATE)
+			waits.append(time.perf_counter() - enqueued_at)
+			await run_action(action)
+	return time.perf_counter() - enqueued_at, waits, len(actions)
+
+
+async def scheduler(actions: list[tuple[str, dict]], coalesce: bool) -> tuple[float, list[float], int]:
+	waits = []
+	enqueued_at = time.perf_counter()
+
+	async def processor(action: dict) -> None:
+		waits.append(time.perf_counter() - enqueued_at)
+		await run_action(action)
+
+	queue = ActionQueue(max_actions_per_second=RATE, burst=SESSIONS, action_processor=processor, coalesce_actions=coalesce)
+	for session_id, action in actions:
+		await queue.enqueue_action(action, session_id=session_id)
+	results = await queue.process_queue()
+	elapsed = time.perf_counter() - enqueued_at
+	await queue.close()
+	return elapsed, waits, len(results)
+
+
+async def run() -> None:
+	plain, scrolling = workload(scrolls=False), workload(scrolls=True)
+	modes = {
+		'previous': await previous_behaviour(plain),
+		'scheduler': await scheduler(plain, coalesce=False),
+		'previous (scrolls)': await previous_behaviour(scrolling),
+		'scheduler (scrolls)': await scheduler(scrolling, coalesce=True),
+	}
+
+	print('\n' + '=' * 84)
+	print(f'ACTION QUEUE BENCHMARK ({SESSIONS} sessions x {ACTIONS_PER_SESSION} actions, {ACTION_MS}ms each, {RATE}/s limit)')
+	print('=' * 84)
+	print(f'{"mode":>20} | {"executed":>8} | {"wall":>7} | {"actions/s":>9} | {"wait p50":>9} | {"wait p99":>9}')
+	total = SESSIONS * ACTIONS_PER_SESSION
+	for mode, (elapsed, waits, executed) in modes.items():
+		p99 = statistics.quantiles(waits, n=100)[-1]
+		print(
+			f'{mode:>20} | {executed:>8} | {elapsed:6.2f}s | {total / elapsed:9.1f} | '
+			f'{statistics.median(waits):8.3f}s | {p99:8.3f}s'
+		)
+	print('=' * 84)
+	print('actions/s counts queued actions, including ones merged into another.')
+
+
+def main():
+	"""Run benchmark and print report."""
+	asyncio.run(run())
+
+
+if __name__ == '__main__':
+	main()
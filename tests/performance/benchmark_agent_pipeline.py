@@ -0,0 +1,139 @@
+"""
+Agent Step Pipelining Benchmark
+
+Runs the same scripted task (scroll a long local page a few times, then done)
+with a deterministic fake LLM that sleeps for a fixed latency per call, once
+with the default sequential step loop and once with Agent(pipeline_steps=True),
+and reports wall time per step plus the mean per-phase timings recorded in
+each step's metadata (browser_state, prompt, llm, actions, post_process,
+finalize).
+
+With pipelining the next browser state is captured while the step is
+post-processed and its screenshot is stored while the next LLM call runs, so
+browser_state and finalize should shrink while llm stays the same.
+
+Requires a local Chromium (the same one browser-use launches for agents).
+"""
+
+import asyncio
+import http.server
+import json
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from browser_use import Agent, BrowserSession
+from browser_use.browser.profile import BrowserProfile
+from browser_use.llm.views import ChatInvokeCompletion
+
+STEPS = 6
+LLM_LATENCY = 0.8
+ROWS = 3_000
+
+
+def scripted_output(step: int) -> str:
+	if step < STEPS - 1:
+		action = {'scroll': {'down': True, 'pages': 1.0}}
+	else:
+		action = {'done': {'text': 'Reached the end of the page', 'success': True}}
+	return json.dumps(
+		{
+			'thinking': None,
+			'evaluation_previous_goal': 'Scrolled',
+			'memory': f'Scrolled {step} pages',
+			'next_goal': 'Keep scrolling',
+			'action': [action],
+		}
+	)
+
+
+class ScriptedLLM:
+	"""Deterministic stand-in for a chat model with a fixed response latency."""
+
+	model = 'scripted-llm'
+	provider = 'scripted'
+	name = 'scripted-llm'
+	model_name = 'scripted-llm'
+	_verified_api_keys = True
+
+	def __init__(self):
+		self.calls = 0
+
+	async def ainvoke(self, messages, output_format=None, **kwargs):
+		await asyncio.sleep(LLM_LATENCY)
+		completion = scripted_output(self.calls)
+		self.calls += 1
+		if output_format is not None:
+			return ChatInvokeCompletion(completion=output_format.model_validate_json(completion), usage=None)
+		return ChatInvokeCompletion(completion=completion, usage=None)
+
+
+class PageHandler(http.server.BaseHTTPRequestHandler):
+	def do_GET(self):
+		rows = ''.join(
+			f'<tr><td>Row {i}</td><td><a href="#{i}">Open</a></td><td><button>Pick {i}</button></td></tr>' for i in range(ROWS)
+		)
+		payload = f'<html><body><h1>Long table</h1><table>{rows}</table></body></html>'.encode()
+		self.send_response(200)
+		self.send_header('Content-Type', 'text/html')
+		self.send_header('Content-Length', str(len(payload)))
+		self.end_headers()
+		self.wfile.write(payload)
+
+	def log_message(self, format, *args):
+		pass
+
+
+async def run_agent(url: str, pipeline_steps: bool, directory: Path) -> tuple[float, dict[str, float]]:
+	browser_session = BrowserSession(browser_profile=BrowserProfile(headless=True, use_cloud=False, keep_alive=False))
+	agent = Agent(
+		task='Scroll to the bottom of the table',
+		llm=ScriptedLLM(),  # type: ignore[arg-type]
+		browser_session=browser_session,
+		initial_actions=[{'navigate': {'url': url, 'new_tab': False}}],
+		pipeline_steps=pipeline_steps,
+		save_history_path=directory / f'history-{pipeline_steps}.jsonl',
+		calculate_cost=False,
+	)
+	start = time.perf_counter()
+	history = await agent.run(max_steps=STEPS + 1)
+	elapsed = time.perf_counter() - start
+
+	phases: dict[str, list[float]] = {}
+	for item in history.history:
+		for phase, ms in ((item.metadata and item.metadata.phase_timings) or {}).items():
+			phases.setdefault(phase, []).append(ms)
+	return elapsed / max(len(history.history), 1), {phase: statistics.mean(values) for phase, values in phases.items()}
+
+
+async def run() -> None:
+	server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), PageHandler)
+	threading.Thread(target=server.serve_forever, daemon=True).start()
+	url = f'http://127.0.0.1:{server.server_address[1]}/'
+	try:
+		with tempfile.TemporaryDirectory() as tmp:
+			results = {mode: await run_agent(url, mode, Path(tmp)) for mode in (False, True)}
+	finally:
+		server.shutdown()
+
+	phase_names = list(results[False][1])
+	print('\n' + '=' * 78)
+	print(f'AGENT STEP PIPELINING BENCHMARK ({STEPS} steps, {LLM_LATENCY * 1000:.0f}ms fake LLM, {ROWS} table rows)')
+	print('=' * 78)
+	print(f'{"mode":>12} | {"per step":>9} | ' + ' | '.join(f'{name:>12}' for name in phase_names))
+	for mode, (per_step, phases) in results.items():
+		label = 'pipelined' if mode else 'sequential'
+		cells = ' | '.join(f'{phases.get(name, 0.0):10.1f}ms' for name in phase_names)
+		print(f'{label:>12} | {per_step * 1000:7.0f}ms | {cells}')
+	print('=' * 78)
+
+
+def main():
+	"""Run benchmark and print report."""
+	asyncio.run(run())
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,116 @@
+"""
+Browser Lease Benchmark
+
+Explores a generated local static site with and without the browser lease
+manager and reports browser startup time saved and pages explored per minute.
+
+Requires a local Chromium (the same one browser-use launches for activities).
+"""
+
+import asyncio
+import functools
+import http.server
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from browser_use import BrowserSession
+from browser_use.browser.events import NavigateToUrlEvent
+from browser_use.browser.profile import BrowserProfile
+from navigator.temporal.browser_pool import BrowserLeaseManager
+
+PAGES = 30
+CONCURRENCY = 6
+
+
+def _write_static_site(root: Path, pages: int) -> None:
+	for i in range(pages):
+		links = ''.join(f'<li><a href="/page_{j}.html">Page {j}</a></li>' for j in range(pages) if j != i)
+		(root / f'page_{i}.html').write_text(
+			f'<html><head><title>Page {i}</title></head><body><h1>Page {i}</h1>'
+			f'<form><input name="q_{i}" placeholder="Search"><button>Go</button></form><ul>{links}</ul></body></html>'
+		)
+
+
+def _serve(root: Path) -> tuple[http.server.ThreadingHTTPServer, str]:
+	handler = functools.partial(http.server.SimpleHTTPRequestHandler, directory=str(root))
+	server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+	threading.Thread(target=server.serve_forever, daemon=True).start()
+	return server, f'http://127.0.0.1:{server.server_address[1]}'
+
+
+async def _explore_page(browser_session: BrowserSession, url: str) -> None:
+	await browser_session.event_bus.dispatch(NavigateToUrlEvent(url=url))
+	await browser_session.get_browser_state_summary(include_screenshot=False)
+
+
+async def run_fresh_browsers(urls: list[str]) -> dict:
+	"""Previous behavior: every activity starts and kills its own browser."""
+	semaphore = asyncio.Semaphore(3)
+	startup_seconds = 0.0
+
+	async def activity(url: str):
+		nonlocal startup_seconds
+		async with semaphore:
+			start = time.perf_counter()
+			browser_session = BrowserSession(browser_profile=BrowserProfile(headless=True, use_cloud=False))
+			await browser_session.start()
+			startup_seconds += time.perf_counter() - start
+			try:
+				await _explore_page(browser_session, url)
+			finally:
+				await browser_session.kill()
+
+	start = time.perf_counter()
+	await asyncio.gather(*(activity(url) for url in urls))
+	return {'elapsed': time.perf_counter() - start, 'startup_seconds': startup_seconds, 'saved': 0.0}
+
+
+async def run_leased_browsers(urls: list[str]) -> dict:
+	"""Lease manager with CONCURRENCY warm slots."""
+	manager = BrowserLeaseManager(slots=CONCURRENCY)
+
+	async def activity(url: str):
+		async with manager.lease() as browser_session:
+			await _explore_page(browser_session, url)
+
+	start = time.perf_counter()
+	try:
+		await asyncio.gather(*(activity(url) for url in urls))
+	finally:
+		await manager.close()
+	return {
+		'elapsed': time.perf_counter() - start,
+		'startup_seconds': manager.stats.startup_seconds,
+		'saved': manager.stats.startup_seconds_saved,
+	}
+
+
+async def main():
+	"""Run benchmark and print report."""
+	with tempfile.TemporaryDirectory() as tmp_dir:
+		root = Path(tmp_dir)
+		_write_static_site(root, PAGES)
+		server, base_url = _serve(root)
+		urls = [f'{base_url}/page_{i}.html' for i in range(PAGES)]
+		try:
+			before = await run_fresh_browsers(urls)
+			after = await run_leased_browsers(urls)
+		finally:
+			server.shutdown()
+
+	print('\n' + '=' * 70)
+	print(f'BROWSER LEASE BENCHMARK ({PAGES} pages, local static site)')
+	print('=' * 70)
+	for label, result in (('fresh browser (3)', before), (f'leased ({CONCURRENCY} slots)', after)):
+		pages_per_minute = PAGES / result['elapsed'] * 60
+		print(
+			f'{label:<22} total={result["elapsed"]:6.1f}s  startup={result["startup_seconds"]:6.1f}s  '
+			f'saved={result["saved"]:6.1f}s  pages/min={pages_per_minute:7.1f}'
+		)
+	print('=' * 70)
+
+
+if __name__ == '__main__':
+	asyncio.run(main())
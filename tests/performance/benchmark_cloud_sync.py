@@ -0,0 +1,115 @@
+"""
+Cloud Sync Benchmark
+
+Sends EVENTS agent events to a local stub of the cloud events endpoint that
+takes LATENCY_MS per request, and reports how long the event handlers were
+blocked, the time until every event was delivered, and the number of requests:
+
+- previous: a new httpx.AsyncClient and a single-event POST per event, awaited
+  inside the event handler, as CloudSync did before the pipeline
+- pipeline: CloudSync with its background sender, size/time batching, gzip
+  bodies and one long-lived client
+"""
+
+import asyncio
+import gzip
+import json
+import os
+import tempfile
+import time
+
+import httpx
+from bubus import BaseEvent
+from pytest_httpserver import HTTPServer
+from werkzeug import Request, Response
+
+from browser_use.sync.service import CloudSync
+
+EVENTS = 1000
+LATENCY_MS = 5
+
+
+class StepEvent(BaseEvent):
+	step: int
+	payload: str
+
+
+class Endpoint:
+	def __init__(self):
+		self.requests = 0
+		self.events = 0
+		self.bytes = 0
+
+	def handle(self, request: Request) -> Response:
+		time.sleep(LATENCY_MS / 1000)
+		body = request.get_data()
+		self.requests += 1
+		self.bytes += len(body)
+		if request.headers.get('Content-Encoding') == 'gzip':
+			body = gzip.decompress(body)
+		self.events += len(json.loads(body)['events'])
+		return Response('{}', content_type='application/json')
+
+
+def make_events() -> list[StepEvent]:
+	return [StepEvent(step=i, payload=f'clicked element {i} on https://example.com/items/{i}' * 4) for i in range(EVENTS)]
+
+
+async def previous_behaviour(url: str, events: list[StepEvent]) -> float:
+	blocked = 0.0
+	for event in events:
+		start = time.perf_counter()
+		async with httpx.AsyncClient() as client:
+			await client.post(f'{url}/api/v1/events', json={'events': [event.model_dump(mode='json')]}, timeout=10.0)
+		blocked += time.perf_counter() - start
+	return blocked
+
+
+async def pipeline(url: str, events: list[StepEvent]) -> float:
+	with tempfile.TemporaryDirectory() as spill_dir:
+		sync = CloudSync(base_url=url, allow_session_events_for_auth=True, spill_dir=spill_dir)
+		blocked = 0.0
+		for event in events:
+			start = time.perf_counter()
+			await sync.handle_event(event)
+			blocked += time.perf_counter() - start
+			# Agents emit events between steps, not in one burst
+			await asyncio.sleep(0)
+		await sync.close(timeout=60)
+	return blocked
+
+
+async def run() -> None:
+	os.environ['BROWSER_USE_CLOUD_SYNC'] = 'true'
+	server = HTTPServer()
+	server.start()
+	url = server.url_for('').rstrip('/')
+	results = {}
+	try:
+		for mode, send in {'previous': previous_behaviour, 'pipeline': pipeline}.items():
+			endpoint = Endpoint()
+			server.clear()
+			server.expect_request('/api/v1/events', method='POST').respond_with_handler(endpoint.handle)
+			start = time.perf_counter()
+			blocked = await send(url, make_events())
+			results[mode] = (blocked, time.perf_counter() - start, endpoint)
+	finally:
+		server.stop()
+
+	print('\n' + '=' * 78)
+	print(f'CLOUD SYNC BENCHMARK ({EVENTS} events, {LATENCY_MS}ms endpoint latency)')
+	print('=' * 78)
+	print(f'{"mode":>10} | {"handler blocked":>15} | {"all delivered":>13} | {"requests":>8} | {"bytes sent":>10}')
+	for mode, (blocked, elapsed, endpoint) in results.items():
+		assert endpoint.events == EVENTS
+		print(f'{mode:>10} | {blocked:14.2f}s | {elapsed:12.2f}s | {endpoint.requests:>8} | {endpoint.bytes:>10}')
+	print('=' * 78)
+
+
+def main():
+	"""Run benchmark and print report."""
+	asyncio.run(run())
+
+
+if __name__ == '__main__':
+	main()
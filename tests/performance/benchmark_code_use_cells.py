@@ -0,0 +1,116 @@
+"""
+Code-Use Cell Overhead Benchmark
+
+Runs SESSIONS notebook sessions of CELLS cells each. A session holds a scraped
+dataset (ROWS rows) as a code block variable plus a growing set of regular
+variables, and every cell is followed by rendering the **Available:** line,
+as CodeAgent does before each LLM call. About a third of the cells are re-runs
+of earlier cells (retries and loops the LLM writes again). Per-cell overhead
+(execution + Available line) is reported for:
+
+- previous: ast.parse + ast.walk + string wrapping + compile on every cell and a
+  full rebuild of the Available line, as CodeAgent did before the cell executor
+- executor: CellExecutor with its compiled-cell cache and NamespaceTracker
+"""
+
+import asyncio
+import time
+
+from browser_use.code_use.executor import CellExecutor, _analyze
+from browser_use.code_use.formatting import format_available_variables
+
+SESSIONS = 5
+CELLS = 200
+ROWS = 50_000
+
+
+def make_cells() -> list[str]:
+	cells = []
+	for i in range(CELLS):
+		if i % 3 == 2:
+			cells.append(cells[i // 2])
+		elif i % 4 == 0:
+			cells.append(f'await asyncio.sleep(0)\nvalue_{i} = len(rows) + {i}\ntotal = total + value_{i}')
+		else:
+			cells.append(f'value_{i} = [row["id"] for row in rows[:{i}]]\ntotal = total + len(value_{i})')
+	return cells
+
+
+def make_namespace() -> dict:
+	rows = [{'id': i, 'title': f'Product {i}', 'price': i * 1.5} for i in range(ROWS)]
+	return {'asyncio': asyncio, 'total': 0, 'rows': rows, '_code_block_vars': {'rows'}}
+
+
+async def previous_cell(namespace: dict, code: str) -> None:
+	import ast
+
+	tree = ast.parse(code, mode='exec')
+	has_await = any(isinstance(node, (ast.Await, ast.AsyncWith, ast.AsyncFor)) for node in ast.walk(tree))
+	if has_await:
+		analysis = _analyze(code)
+		existing = {name for name in analysis.assigned_names | analysis.user_global_names if name in namespace}
+		global_decl = f'    global {", ".join(sorted(existing))}\n' if existing else ''
+		indented = '\n'.join('    ' + line if line.strip() else line for line in code.split('\n'))
+		wrapped = (
+			f'async def __code_exec__():\n{global_decl}{indented}\n    return locals()\n\n__code_exec_coro__ = __code_exec__()\n'
+		)
+		exec(compile(wrapped, '<code>', 'exec'), namespace, namespace)
+		result_locals = await namespace.pop('__code_exec_coro__')
+		namespace.pop('__code_exec__', None)
+		for key, value in result_locals.items():
+			if not key.startswith('_'):
+				namespace[key] = value
+	else:
+		exec(compile(code, '<code>', 'exec'), namespace, namespace)
+	# Before the cap the code block preview str()-ed the whole dataset
+	str(namespace['rows'])
+	format_available_variables(namespace)
+
+
+async def run_previous(cells: list[str]) -> tuple[float, str]:
+	elapsed = 0.0
+	for _ in range(SESSIONS):
+		namespace = make_namespace()
+		start = time.perf_counter()
+		for code in cells:
+			await previous_cell(namespace, code)
+		elapsed += time.perf_counter() - start
+	return elapsed, format_available_variables(namespace)
+
+
+async def run_executor(cells: list[str]) -> tuple[float, str]:
+	elapsed = 0.0
+	for _ in range(SESSIONS):
+		executor = CellExecutor(make_namespace())
+		start = time.perf_counter()
+		for code in cells:
+			await executor.run(code)
+			executor.tracker.format_available()
+		elapsed += time.perf_counter() - start
+	return elapsed, executor.tracker.format_available()
+
+
+async def run() -> None:
+	cells = make_cells()
+	previous, previous_line = await run_previous(cells)
+	cached, cached_line = await run_executor(cells)
+	# Same variables listed (the rows preview itself is capped now)
+	assert previous_line.split('**Variables:**')[1] == cached_line.split('**Variables:**')[1]
+
+	total_cells = SESSIONS * CELLS
+	print('\n' + '=' * 60)
+	print(f'CODE-USE CELL BENCHMARK ({SESSIONS} sessions x {CELLS} cells, {ROWS} rows)')
+	print('=' * 60)
+	print(f'{"mode":>10} | {"total":>8} | {"per cell":>10}')
+	for mode, elapsed in {'previous': previous, 'executor': cached}.items():
+		print(f'{mode:>10} | {elapsed:7.2f}s | {elapsed / total_cells * 1000:8.3f}ms')
+	print('=' * 60)
+
+
+def main():
+	"""Run benchmark and print report."""
+	asyncio.run(run())
+
+
+if __name__ == '__main__':
+	main()
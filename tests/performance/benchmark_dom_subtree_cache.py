@@ -0,0 +1,167 @@
+"""
+DOM Subtree Cache Benchmark
+
+Replays multi-step sessions on a generated product listing page (a few
+thousand DOM nodes) and times DOMTreeSerializer.serialize_accessible_elements
+plus llm_representation per step, with and without a SubtreeCache. Each
+session changes the page between steps the way agents usually see it change:
+
+- counter: a cart counter in the header ticks
+- toast: a notification appears above the listing, shifting its layout once
+- infinite scroll: rows are appended at the end of the list
+- reflow: every row moves below a sticky header (worst case, nothing below the
+  header is reusable)
+
+Reports mean per-step time after the first step (best of a few replays), the speedup, and the share of
+simplified nodes and text fragments reused. Runs without a browser.
+"""
+
+import statistics
+import time
+from itertools import count
+
+from browser_use.dom.serializer.serializer import DOMTreeSerializer
+from browser_use.dom.serializer.subtree_cache import SubtreeCache
+from browser_use.dom.views import DOMRect, EnhancedDOMTreeNode, EnhancedSnapshotNode, NodeType
+
+ROWS = 400
+STEPS = 8
+REPEATS = 3
+
+
+class PageBuilder:
+	"""Enhanced DOM trees whose nodes keep their backend ids across rebuilds, like CDP does."""
+
+	def __init__(self):
+		self._ids = count(1)
+		self._backend_ids: dict[str, int] = {}
+		self._y = 0.0
+
+	def node(self, name: str, path: str, children=None, text: str = '', attributes=None) -> EnhancedDOMTreeNode:
+		backend_id = self._backend_ids.setdefault(path, len(self._backend_ids) + 1)
+		node_type = {'#document': NodeType.DOCUMENT_NODE, '#text': NodeType.TEXT_NODE}.get(name, NodeType.ELEMENT_NODE)
+		self._y += 10
+		bounds = DOMRect(x=0.0, y=self._y, width=800.0, height=10.0)
+		node = EnhancedDOMTreeNode(
+			node_id=next(self._ids),
+			backend_node_id=backend_id,
+			node_type=node_type,
+			node_name=name,
+			node_value=text,
+			attributes=attributes or {},
+			is_scrollable=False,
+			is_visible=True,
+			absolute_position=bounds,
+			target_id='target-1',
+			frame_id='frame-1',
+			session_id=None,
+			content_document=None,
+			shadow_root_type=None,
+			shadow_roots=None,
+			parent_node=None,
+			children_nodes=children or [],
+			ax_node=None,
+			snapshot_node=EnhancedSnapshotNode(
+				is_clickable=None,
+				cursor_style='pointer' if name in ('A', 'BUTTON') else None,
+				bounds=bounds,
+				clientRects=bounds,
+				scrollRects=None,
+				computed_styles={'display': 'block', 'visibility': 'visible', 'opacity': '1'},
+				paint_order=backend_id,
+				stacking_contexts=None,
+			),
+		)
+		for child in node.children_nodes or []:
+			child.parent_node = node
+		return node
+
+	def text(self, path: str, value: str) -> EnhancedDOMTreeNode:
+		return self.node('#text', path, text=value)
+
+	def row(self, i: int) -> EnhancedDOMTreeNode:
+		cells = [
+			self.node(
+				'TD',
+				f'row-{i}/name',
+				[
+					self.node(
+						'A', f'row-{i}/link', [self.text(f'row-{i}/link/text', f'Product {i}')], attributes={'href': f'/p/{i}'}
+					)
+				],
+			),
+			self.node('TD', f'row-{i}/sku', [self.text(f'row-{i}/sku/text', f'SKU-{i:06d}')]),
+			self.node('TD', f'row-{i}/price', [self.text(f'row-{i}/price/text', f'${i % 500}.99')]),
+			self.node(
+				'TD', f'row-{i}/actions', [self.node('BUTTON', f'row-{i}/add', [self.text(f'row-{i}/add/text', 'Add to cart')])]
+			),
+		]
+		return self.node('TR', f'row-{i}', cells)
+
+	def page(self, rows: int = ROWS, counter: int = 0, toast: bool = False, scroll: float = 0.0) -> EnhancedDOMTreeNode:
+		self._y = 0.0
+		header = self.node(
+			'HEADER',
+			'header',
+			[
+				self.node('INPUT', 'search', attributes={'type': 'search', 'name': 'q', 'placeholder': 'Search products'}),
+				self.node('SPAN', 'counter', [self.text('counter/text', f'{counter} items in cart')]),
+			],
+		)
+		children = [header]
+		self._y -= scroll  # the header is sticky, everything below it moves
+		if toast:
+			children.append(self.node('DIV', 'toast', [self.text('toast/text', 'Added to cart')], attributes={'role': 'alert'}))
+		children.append(self.node('TABLE', 'table', [self.node('TBODY', 'tbody', [self.row(i) for i in range(rows)])]))
+		html = self.node('HTML', 'html', [self.node('BODY', 'body', children)])
+		return self.node('#document', 'document', [html])
+
+
+SESSIONS = {
+	'counter': lambda step: {'counter': step},
+	'toast': lambda step: {'counter': step // 2, 'toast': step >= STEPS // 2},
+	'infinite scroll': lambda step: {'rows': ROWS + 20 * step},
+	'reflow': lambda step: {'scroll': 300.0 * step},
+}
+
+
+def replay(session, cache: SubtreeCache | None) -> tuple[list[float], list[tuple[float, float]]]:
+	builder = PageBuilder()
+	previous = None
+	times, hit_rates = [], []
+	for step in range(STEPS):
+		root = builder.page(**session(step))
+		start = time.perf_counter()
+		previous, _ = DOMTreeSerializer(root, previous, session_id='bench', subtree_cache=cache).serialize_accessible_elements()
+		previous.llm_representation()
+		times.append((time.perf_counter() - start) * 1000)
+		if cache:
+			hit_rates.append((cache.stats.reused_rate, cache.stats.fragment_hit_rate))
+	return times, hit_rates
+
+
+def main():
+	"""Run benchmark and print report."""
+	print('\n' + '=' * 86)
+	print(f'DOM SUBTREE CACHE BENCHMARK ({ROWS}-row listing, {STEPS} steps, mean of steps 2-{STEPS}, best of {REPEATS})')
+	print('=' * 86)
+	print(f'{"session":>16} | {"uncached":>10} | {"cached":>10} | {"speedup":>7} | {"nodes reused":>12} | {"fragment hits":>13}')
+	for name, session in SESSIONS.items():
+		# Best of a few replays, the machine's noise is larger than some of the differences
+		uncached_ms = min(statistics.mean(replay(session, None)[0][1:]) for _ in range(REPEATS))
+		cached_ms, hit_rates = float('inf'), []
+		for _ in range(REPEATS):
+			cached, hit_rates = replay(session, SubtreeCache())
+			cached_ms = min(cached_ms, statistics.mean(cached[1:]))
+		nodes_reused = statistics.mean(rate for rate, _ in hit_rates[1:])
+		fragment_hits = statistics.mean(rate for _, rate in hit_rates[1:])
+		print(
+			f'{name:>16} | {uncached_ms:8.1f}ms | {cached_ms:8.1f}ms | {uncached_ms / cached_ms:6.2f}x | '
+			f'{nodes_reused:12.0%} | {fragment_hits:13.0%}'
+		)
+	print('Step 1 (cold cache) is excluded; it pays for fingerprinting without reusing anything.')
+	print('=' * 86)
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,151 @@
+"""
+Extract Action Benchmark
+
+Runs the extract action on large generated HTML pages with a fake extraction
+LLM (fixed latency per call, no network) and measures:
+- markdown conversion: first conversion vs cached repeat for the same DOM version
+- reading a whole long page: paged mode (one extract call per start_from_char
+  slice, each a separate agent step) vs map-reduce mode (all slices queried
+  concurrently and merged inside one extract call)
+
+The DOM tree is faked: HTMLSerializer is replaced by one that returns the
+fixture HTML, so markdownify and preprocessing run on real input.
+"""
+
+import asyncio
+import re
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from browser_use.dom import markdown_extractor
+from browser_use.dom.markdown_extractor import extract_clean_markdown
+from browser_use.filesystem.file_system import FileSystem
+from browser_use.llm.views import ChatInvokeCompletion
+from browser_use.tools.service import Tools
+from browser_use.tools.views import ExtractAction
+
+LLM_LATENCY = 0.25
+MAX_CONCURRENCY = 4
+
+
+def catalog_html(products: int) -> str:
+	rows = ''.join(
+		f'<tr><td><a href="/p/{i}">Product {i}</a></td><td>SKU-{i:06d}</td><td>${i % 500}.99</td><td>In stock</td></tr>'
+		for i in range(products)
+	)
+	return f'<h1>Catalog</h1><table><tr><th>Name</th><th>SKU</th><th>Price</th><th>Stock</th></tr>{rows}</table>'
+
+
+def article_html(sections: int) -> str:
+	paragraph = '<p>' + 'The committee reviewed the quarterly figures and approved the revised budget. ' * 8 + '</p>'
+	return ''.join(
+		f'<h2>Section {i}</h2>{paragraph * 3}<ul><li>Point {i}.1</li><li>Point {i}.2</li></ul>' for i in range(sections)
+	)
+
+
+FIXTURES = {'catalog (5k rows)': catalog_html(5_000), 'article (300 sections)': article_html(300)}
+
+
+class FixtureSerializer:
+	html = ''
+
+	def __init__(self, extract_links: bool = False):
+		pass
+
+	def serialize(self, node) -> str:
+		return FixtureSerializer.html
+
+
+class FakeSession:
+	def __init__(self):
+		self.agent_focus_target_id = 'target-1'
+		self._dom_watchdog = SimpleNamespace(enhanced_dom_tree=object(), dom_version=1, markdown_cache={})
+
+	async def get_current_page_url(self) -> str:
+		return 'https://example.com/fixture'
+
+
+class FakeLLM:
+	model = 'fake-extraction-llm'
+
+	def __init__(self):
+		self.calls = 0
+		self.last_prompt = ''
+
+	async def ainvoke(self, messages, output_format=None, **kwargs):
+		self.calls += 1
+		self.last_prompt = messages[1].content
+		await asyncio.sleep(LLM_LATENCY)
+		return ChatInvokeCompletion(completion='extracted', usage=None)
+
+
+async def extract(tools: Tools, session: FakeSession, llm: FakeLLM, directory: Path, start_from_char: int = 0):
+	return await tools.registry.registry.actions['extract'].function(
+		params=ExtractAction(query='Summarize everything', start_from_char=start_from_char),
+		browser_session=session,
+		page_extraction_llm=llm,
+		file_system=FileSystem(directory),
+	)
+
+
+async def read_paged(directory: Path) -> tuple[float, int, int]:
+	"""Follow the start_from_char continuations the action reports until the page is exhausted."""
+	session, llm, tools = FakeSession(), FakeLLM(), Tools()
+	start = time.perf_counter()
+	actions = 0
+	next_start: int | None = 0
+	while next_start is not None:
+		await extract(tools, session, llm, directory, start_from_char=next_start)
+		actions += 1
+		match = re.search(r'use start_from_char=(\d+)', llm.last_prompt)
+		next_start = int(match.group(1)) if match else None
+	return time.perf_counter() - start, actions, llm.calls
+
+
+async def read_map_reduce(directory: Path) -> tuple[float, int, int]:
+	session, llm = FakeSession(), FakeLLM()
+	tools = Tools(extract_mode='map_reduce', extract_max_concurrency=MAX_CONCURRENCY)
+	start = time.perf_counter()
+	await extract(tools, session, llm, directory)
+	return time.perf_counter() - start, 1, llm.calls
+
+
+async def run() -> None:
+	markdown_extractor.HTMLSerializer = FixtureSerializer  # type: ignore[misc]
+
+	print('\n' + '=' * 78)
+	print(f'EXTRACT BENCHMARK (fake LLM, {LLM_LATENCY * 1000:.0f}ms per call, map-reduce concurrency {MAX_CONCURRENCY})')
+	print('=' * 78)
+	with tempfile.TemporaryDirectory() as tmp:
+		for name, html in FIXTURES.items():
+			FixtureSerializer.html = html
+			session = FakeSession()
+
+			start = time.perf_counter()
+			content, _ = await extract_clean_markdown(browser_session=session)  # type: ignore[arg-type]
+			first_ms = (time.perf_counter() - start) * 1000
+			start = time.perf_counter()
+			await extract_clean_markdown(browser_session=session)  # type: ignore[arg-type]
+			cached_ms = (time.perf_counter() - start) * 1000
+
+			paged_s, paged_actions, paged_calls = await read_paged(Path(tmp))
+			mr_s, mr_actions, mr_calls = await read_map_reduce(Path(tmp))
+
+			print(f'{name}: {len(html) / 1024:.0f}KB HTML → {len(content) / 1024:.0f}KB markdown')
+			print(f'  markdown conversion:  first {first_ms:8.1f}ms | cached {cached_ms:8.3f}ms')
+			print(f'  paged:       {paged_s:6.2f}s  {paged_actions:3d} extract actions, {paged_calls:3d} LLM calls')
+			print(f'  map-reduce:  {mr_s:6.2f}s  {mr_actions:3d} extract action,  {mr_calls:3d} LLM calls')
+			print('-' * 78)
+	print('Paged times exclude the agent steps between continuations, which dominate in practice.')
+	print('=' * 78)
+
+
+def main():
+	"""Run benchmark and print report."""
+	asyncio.run(run())
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,127 @@
+"""
+Agent FileSystem Benchmark
+
+Times the file operations an agent performs every step while it grows a
+results file:
+
+- 10k appends: append a short row, then take the state snapshot and describe
+  the file system, like an agent step does
+- 100 MB file: write a 100 MB file, then 100 steps of append + snapshot +
+  describe on it
+
+Each scenario runs against the current FileSystem and against a replica of the
+previous behaviour (string concatenation on append, a fresh thread pool and a
+full rewrite per write, full content in every snapshot, describe splitting the
+whole file), and reports wall time and peak traced memory (measured in a
+separate run, since tracing slows everything down).
+"""
+
+import asyncio
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from browser_use.filesystem.file_system import FileSystem
+
+APPENDS = 10_000
+LARGE_FILE_MB = 100
+LARGE_FILE_STEPS = 100
+
+
+class RewritingFile:
+	"""Previous file behaviour: one string, rewritten on disk on every change."""
+
+	def __init__(self, path: Path):
+		self.path = path
+		self.content = ''
+
+	async def write(self, content: str) -> None:
+		self.content = content
+		await self._sync()
+
+	async def append(self, content: str) -> None:
+		self.content = self.content + content
+		await self._sync()
+
+	async def _sync(self) -> None:
+		with ThreadPoolExecutor() as executor:
+			await asyncio.get_event_loop().run_in_executor(executor, lambda: self.path.write_text(self.content))
+
+	def step(self) -> None:
+		state = {'name': self.path.stem, 'content': self.content}
+		lines = self.content.splitlines()
+		assert state and lines
+
+
+class CurrentFile:
+	def __init__(self, fs: FileSystem, name: str):
+		self.fs = fs
+		self.name = name
+
+	async def write(self, content: str) -> None:
+		await self.fs.write_file(self.name, content)
+
+	async def append(self, content: str) -> None:
+		await self.fs.append_file(self.name, content)
+
+	def step(self) -> None:
+		self.fs.get_state()
+		self.fs.describe()
+
+
+async def many_appends(file) -> None:
+	await file.write('# Results\n')
+	for i in range(APPENDS):
+		await file.append(f'| {i} | item {i} | https://example.com/items/{i} |\n')
+		file.step()
+
+
+async def large_file(file) -> None:
+	row = 'x' * 99 + '\n'
+	await file.write(row * (LARGE_FILE_MB * 1024 * 1024 // len(row)))
+	for i in range(LARGE_FILE_STEPS):
+		await file.append(f'appended row {i}\n')
+		file.step()
+
+
+async def measure(scenario, make_file) -> tuple[float, float]:
+	with tempfile.TemporaryDirectory() as tmp_dir:
+		start = time.perf_counter()
+		await scenario(make_file(Path(tmp_dir)))
+		elapsed = time.perf_counter() - start
+
+	with tempfile.TemporaryDirectory() as tmp_dir:
+		tracemalloc.start()
+		await scenario(make_file(Path(tmp_dir)))
+		peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+		tracemalloc.stop()
+	return elapsed, peak
+
+
+async def run() -> None:
+	implementations = {
+		'full rewrite': lambda tmp: RewritingFile(tmp / 'results.md'),
+		'append-only': lambda tmp: CurrentFile(FileSystem(tmp, create_default_files=False), 'results.md'),
+	}
+	scenarios = {f'{APPENDS} appends': many_appends, f'{LARGE_FILE_MB} MB file': large_file}
+
+	print('\n' + '=' * 64)
+	print('AGENT FILESYSTEM BENCHMARK (append + snapshot + describe per step)')
+	print('=' * 64)
+	print(f'{"scenario":>16} | {"mode":>13} | {"time":>9} | {"peak mem":>9}')
+	for scenario_name, scenario in scenarios.items():
+		for mode, make_file in implementations.items():
+			elapsed, peak = await measure(scenario, make_file)
+			print(f'{scenario_name:>16} | {mode:>13} | {elapsed:8.2f}s | {peak:6.0f} MB')
+	print('=' * 64)
+
+
+def main():
+	"""Run benchmark and print report."""
+	asyncio.run(run())
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,132 @@
+"""
+Agent History Persistence Benchmark
+
+Simulates a 1,000-step run that persists its history after every step and
+compares:
+- save_to_file: re-serializes the whole history to indented JSON each time
+- AgentHistoryLog: appends one compact record per step from a background writer
+
+Reports per-step save time at several points in the run, the time the event
+loop is blocked per step, and the final file sizes.
+"""
+
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from browser_use.agent.history_log import AgentHistoryLog
+from browser_use.agent.views import ActionResult, AgentHistory, AgentHistoryList, AgentOutput, StepMetadata
+from browser_use.browser.views import BrowserStateHistory, TabInfo
+from browser_use.tools.service import Tools
+
+STEPS = 1_000
+CHECKPOINTS = (10, 100, 500, 1_000)
+SENSITIVE_DATA: dict[str, str | dict[str, str]] = {'example.com': {'password': 'hunter2', 'username': 'agent@example.com'}}
+
+AgentOutputWithActions = AgentOutput.type_with_custom_actions(Tools().registry.create_action_model())
+
+
+def make_item(step: int) -> AgentHistory:
+	return AgentHistory(
+		model_output=AgentOutputWithActions.model_validate(
+			{
+				'thinking': 'The form has a password field, fill it and submit. ' * 4,
+				'evaluation_previous_goal': 'Navigated to the login page successfully.',
+				'memory': f'Step {step}: logged in twice, searching for the invoice list. ' * 3,
+				'next_goal': 'Fill the password and submit the form.',
+				'action': [{'input': {'index': step % 200 + 1, 'text': 'hunter2'}}, {'click': {'index': step % 50 + 1}}],
+			}
+		),
+		result=[
+			ActionResult(long_term_memory=f'Typed password into element {step % 200}'),
+			ActionResult(extracted_content='Invoice #1042 | 2024-05-01 | $1,204.00\n' * 20, include_in_memory=True),
+		],
+		state=BrowserStateHistory(
+			url=f'https://example.com/invoices?page={step}',
+			title='Invoices',
+			tabs=[TabInfo(target_id='tab-0', url=f'https://example.com/invoices?page={step}', title='Invoices')],
+			interacted_element=[None, None],
+			screenshot_path=f'/tmp/browser_use_agent/screenshots/{step:032x}.png',
+		),
+		metadata=StepMetadata(step_start_time=step, step_end_time=step + 0.8, step_number=step),
+	)
+
+
+async def run_json_export(directory: Path) -> tuple[dict[int, float], int]:
+	path = directory / 'history.json'
+	history = AgentHistoryList(history=[])
+	per_step: dict[int, float] = {}
+	for step in range(1, STEPS + 1):
+		history.add_item(make_item(step))
+		if step in CHECKPOINTS:
+			start = time.perf_counter()
+			history.save_to_file(path, sensitive_data=SENSITIVE_DATA)
+			per_step[step] = (time.perf_counter() - start) * 1000
+	return per_step, path.stat().st_size
+
+
+async def run_history_log(directory: Path, name: str) -> tuple[dict[int, float], float, int]:
+	path = directory / name
+	log = AgentHistoryLog(path, sensitive_data=SENSITIVE_DATA)
+	per_step: dict[int, float] = {}
+	blocked = 0.0
+	for step in range(1, STEPS + 1):
+		item = make_item(step)
+		start = time.perf_counter()
+		log.append(step - 1, item)
+		blocked += time.perf_counter() - start
+		if step in CHECKPOINTS:
+			# Time a full durable save at this point: append + wait for fsync
+			start = time.perf_counter()
+			log.append(step - 1, item)
+			await log.flush()
+			per_step[step] = (time.perf_counter() - start) * 1000
+		else:
+			# Let the writer run between steps as it would while the agent waits on the LLM
+			await asyncio.sleep(0)
+	await log.flush()
+	return per_step, blocked / STEPS * 1000, path.stat().st_size
+
+
+def time_load(path: Path) -> float:
+	"""Best of three, so model-class warm-up isn't charged to whichever format loads first."""
+	timings = []
+	for _ in range(3):
+		start = time.perf_counter()
+		AgentHistoryList.load_from_file(path, AgentOutputWithActions)
+		timings.append((time.perf_counter() - start) * 1000)
+	return min(timings)
+
+
+async def run() -> None:
+	with tempfile.TemporaryDirectory() as tmp:
+		directory = Path(tmp)
+		json_steps, json_size = await run_json_export(directory)
+		jsonl_steps, jsonl_blocked, jsonl_size = await run_history_log(directory, 'history.jsonl')
+		gz_steps, gz_blocked, gz_size = await run_history_log(directory, 'history.jsonl.gz')
+
+		json_load = time_load(directory / 'history.json')
+		jsonl_load = time_load(directory / 'history.jsonl')
+
+	print('\n' + '=' * 70)
+	print(f'HISTORY PERSISTENCE BENCHMARK ({STEPS:,} steps, save after every step)')
+	print('=' * 70)
+	print(f'{"step":>6} | {"save_to_file (json)":>20} | {"log (jsonl)":>12} | {"log (jsonl.gz)":>14}')
+	for step in CHECKPOINTS:
+		print(f'{step:>6} | {json_steps[step]:18.2f}ms | {jsonl_steps[step]:10.2f}ms | {gz_steps[step]:12.2f}ms')
+	print('-' * 70)
+	print(f'event loop blocked per step: save_to_file {json_steps[STEPS]:.2f}ms (at step {STEPS:,}), ', end='')
+	print(f'jsonl {jsonl_blocked:.3f}ms, jsonl.gz {gz_blocked:.3f}ms')
+	print(f'file size: json {json_size / 1024:.0f}KB, jsonl {jsonl_size / 1024:.0f}KB, jsonl.gz {gz_size / 1024:.0f}KB')
+	print(f'load: json {json_load:.0f}ms, jsonl {jsonl_load:.0f}ms')
+	print('=' * 70)
+
+
+def main():
+	"""Run benchmark and print report."""
+	asyncio.run(run())
+
+
+if __name__ == '__main__':
+	main()
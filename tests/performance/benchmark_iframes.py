@@ -0,0 +1,124 @@
+"""
+Cross-Origin Iframe DOM Collection Benchmark
+
+Serves a page that embeds many cross-origin widgets (ads, payment, chat-like
+frames with a few thousand nodes each) from a local multi-origin fixture
+server and times DomService.get_dom_tree with different iframe fan-outs:
+max_parallel_iframes=1 collects the frames one after another like the old
+recursive implementation, higher values collect them concurrently.
+
+Every widget is served from its own `*.test` site, which Chromium maps to the
+local server via --host-resolver-rules and puts in its own process
+(--site-per-process), so each frame is a separate CDP target.
+
+Requires a local Chromium (the same one browser-use launches for agents).
+"""
+
+import asyncio
+import http.server
+import threading
+import time
+
+from browser_use import BrowserSession
+from browser_use.browser.events import NavigateToUrlEvent
+from browser_use.browser.profile import BrowserProfile
+from browser_use.dom.service import DomService
+
+WIDGETS = 12
+ROWS_PER_WIDGET = 400
+FAN_OUTS = (1, 4, 8)
+RUNS = 3
+
+
+class FixtureHandler(http.server.BaseHTTPRequestHandler):
+	"""`main.test` serves the host page; `widget<N>.test` serves widget N."""
+
+	def do_GET(self):
+		host = self.headers.get('Host', '').split(':')[0]
+		port = self.server.server_address[1]  # type: ignore[attr-defined]
+		if host.startswith('widget'):
+			widget = host.removeprefix('widget').removesuffix('.test')
+			rows = ''.join(
+				f'<tr><td>Item {i}</td><td><a href="#{i}">Details</a></td><td><button>Add {i}</button></td></tr>'
+				for i in range(ROWS_PER_WIDGET)
+			)
+			body = (
+				f'<h2>Widget {widget}</h2><form><input name="q"><select><option>A</option></select></form><table>{rows}</table>'
+			)
+		else:
+			frames = ''.join(
+				f'<iframe src="http://widget{i}.test:{port}/" width="400" height="300"></iframe>' for i in range(WIDGETS)
+			)
+			body = f'<h1>Host page</h1>{frames}'
+		payload = f'<html><body>{body}</body></html>'.encode()
+		self.send_response(200)
+		self.send_header('Content-Type', 'text/html')
+		self.send_header('Content-Length', str(len(payload)))
+		self.end_headers()
+		self.wfile.write(payload)
+
+	def log_message(self, format, *args):
+		pass
+
+
+def serve() -> http.server.ThreadingHTTPServer:
+	server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+	threading.Thread(target=server.serve_forever, daemon=True).start()
+	return server
+
+
+async def time_dom_tree(browser_session: BrowserSession, max_parallel_iframes: int) -> tuple[float, dict[str, float]]:
+	"""Best of RUNS so the first run's warm-up isn't charged to one fan-out."""
+	best: tuple[float, dict[str, float]] | None = None
+	for _ in range(RUNS):
+		service = DomService(browser_session, cross_origin_iframes=True, max_parallel_iframes=max_parallel_iframes)
+		start = time.perf_counter()
+		_, timing = await service.get_dom_tree(target_id=browser_session.agent_focus_target_id)  # type: ignore[arg-type]
+		elapsed = (time.perf_counter() - start) * 1000
+		if best is None or elapsed < best[0]:
+			best = (elapsed, timing)
+	assert best is not None
+	return best
+
+
+async def run() -> None:
+	server = serve()
+	port = server.server_address[1]
+	browser_session = BrowserSession(
+		browser_profile=BrowserProfile(
+			headless=True,
+			use_cloud=False,
+			cross_origin_iframes=True,
+			args=['--host-resolver-rules=MAP *.test 127.0.0.1', '--site-per-process'],
+		)
+	)
+	await browser_session.start()
+	try:
+		await browser_session.event_bus.dispatch(NavigateToUrlEvent(url=f'http://main.test:{port}/'))
+		await asyncio.sleep(2)  # let every widget finish loading
+
+		print('\n' + '=' * 72)
+		print(f'CROSS-ORIGIN IFRAME BENCHMARK ({WIDGETS} widgets x {ROWS_PER_WIDGET} rows, best of {RUNS})')
+		print('=' * 72)
+		print(f'{"fan-out":>8} | {"get_dom_tree":>12} | {"iframes":>9} | {"frames":>6} | {"slowest frame":>13}')
+		for fan_out in FAN_OUTS:
+			total_ms, timing = await time_dom_tree(browser_session, fan_out)
+			frames = {key: value for key, value in timing.items() if key.startswith('cross_origin_iframe_')}
+			slowest = max(frames.values(), default=0.0)
+			print(
+				f'{fan_out:>8} | {total_ms:10.1f}ms | {timing.get("cross_origin_iframes_ms", 0):7.1f}ms | '
+				f'{len(frames):>6} | {slowest:11.1f}ms'
+			)
+		print('=' * 72)
+	finally:
+		await browser_session.kill()
+		server.shutdown()
+
+
+def main():
+	"""Run benchmark and print report."""
+	asyncio.run(run())
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,145 @@
+"""
+Agent Knowledge Query Benchmark
+
+Seeds a local MongoDB (MONGODB_URL, e.g. mongodb://localhost:27017) with a
+generated knowledge base: a chain of screens with URL patterns and DOM
+indicators, actions on each screen and transitions between neighbours. Then it
+times the query_knowledge_for_agent tool handler on a mix of agent queries
+(navigate_to_screen from a URL, get_actions from a URL, find_screen) and
+reports p50/p99 latency in two modes:
+
+- per request: the knowledge version is bumped before every query, so each
+  one reloads screens, actions and transitions and recompiles the matchers,
+  like the handler did before the runtime model was shared
+- shared model: the runtime model is built once and reused
+
+The seeded documents are deleted afterwards.
+"""
+
+import asyncio
+import random
+import statistics
+import time
+import uuid
+
+from navigator.knowledge.persist.collections import (
+	get_actions_collection,
+	get_screens_collection,
+	get_transitions_collection,
+)
+from navigator.knowledge.persist.documents import delete_knowledge_by_knowledge_id
+from navigator.knowledge.persist.versions import bump_knowledge_version
+from navigator.server.mcp_knowledge_tools import register_knowledge_tool_handlers
+
+SCREENS = 400
+ACTIONS_PER_SCREEN = 3
+QUERIES = 200
+
+
+async def seed(knowledge_id: str, job_id: str) -> None:
+	common = {'knowledge_id': knowledge_id, 'job_id': job_id, 'website_id': 'bench-shop'}
+	screens, actions, transitions = [], [], []
+	for i in range(SCREENS):
+		action_ids = [f'{knowledge_id}-a{i}-{j}' for j in range(ACTIONS_PER_SCREEN)]
+		screens.append(
+			{
+				**common,
+				'screen_id': f'{knowledge_id}-s{i}',
+				'name': f'Screen {i}',
+				'url_patterns': [rf'https://shop\.test/section/{i}(/.*)?$'],
+				'state_signature': {
+					'required_indicators': [
+						{'type': 'dom_contains', 'value': f'Section {i} heading'},
+						{'type': 'url_matches', 'pattern': rf'.*/section/{i}\b.*'},
+					]
+				},
+				'action_ids': action_ids,
+				'content_type': 'web_ui',
+				'is_actionable': True,
+			}
+		)
+		for j, action_id in enumerate(action_ids):
+			actions.append({**common, 'action_id': action_id, 'name': f'Open item {j} of {i}', 'action_type': 'click'})
+		if i + 1 < SCREENS:
+			transitions.append(
+				{
+					**common,
+					'transition_id': f'{knowledge_id}-t{i}',
+					'from_screen_id': f'{knowledge_id}-s{i}',
+					'to_screen_id': f'{knowledge_id}-s{i + 1}',
+					'triggered_by': {'action_type': 'click'},
+					'action_id': action_ids[0],
+				}
+			)
+
+	for get_collection, documents in (
+		(get_screens_collection, screens),
+		(get_actions_collection, actions),
+		(get_transitions_collection, transitions),
+	):
+		collection = await get_collection()
+		assert collection is not None, 'MongoDB is not reachable, set MONGODB_URL'
+		await collection.insert_many(documents)
+	await bump_knowledge_version(knowledge_id)
+
+
+def queries(knowledge_id: str) -> list[dict]:
+	rng = random.Random(7)
+	mix = []
+	for _ in range(QUERIES):
+		i = rng.randrange(SCREENS - 10)
+		context = {'current_url': f'https://shop.test/section/{i}/list', 'dom_summary': f'<h1>Section {i} heading</h1>'}
+		mix.append(
+			rng.choice(
+				[
+					{'instruction_type': 'navigate_to_screen', 'target': f'{knowledge_id}-s{i + 5}', 'context': context},
+					{'instruction_type': 'get_actions', 'target': 'current', 'context': context},
+					{'instruction_type': 'find_screen', 'target': context['current_url'], 'context': context},
+				]
+			)
+		)
+	return mix
+
+
+async def measure(handler, knowledge_id: str, per_request: bool) -> list[float]:
+	latencies = []
+	for query in queries(knowledge_id):
+		if per_request:
+			await bump_knowledge_version(knowledge_id)
+		start = time.perf_counter()
+		result = await handler({'knowledge_id': knowledge_id, **query})
+		latencies.append((time.perf_counter() - start) * 1000)
+		assert result['success'], result
+	return latencies
+
+
+async def run() -> None:
+	knowledge_id = f'bench-{uuid.uuid4().hex[:8]}'
+	handler = register_knowledge_tool_handlers(None, None)['query_knowledge_for_agent']
+	await seed(knowledge_id, job_id=f'{knowledge_id}-job')
+	try:
+		results = {
+			'per request': await measure(handler, knowledge_id, per_request=True),
+			'shared model': await measure(handler, knowledge_id, per_request=False),
+		}
+	finally:
+		await delete_knowledge_by_knowledge_id(knowledge_id)
+
+	print('\n' + '=' * 64)
+	print(f'AGENT KNOWLEDGE QUERY BENCHMARK ({SCREENS} screens, {QUERIES} queries)')
+	print('=' * 64)
+	print(f'{"mode":>14} | {"p50":>9} | {"p99":>9} | {"mean":>9}')
+	for mode, latencies in results.items():
+		p50 = statistics.median(latencies)
+		p99 = statistics.quantiles(latencies, n=100)[-1]
+		print(f'{mode:>14} | {p50:7.2f}ms | {p99:7.2f}ms | {statistics.mean(latencies):7.2f}ms')
+	print('=' * 64)
+
+
+def main():
+	"""Run benchmark and print report."""
+	asyncio.run(run())
+
+
+if __name__ == '__main__':
+	main()
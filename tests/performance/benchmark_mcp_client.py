@@ -0,0 +1,119 @@
+"""
+MCP Client Benchmark
+
+Runs MCPClient against the stdio fixture server (tests/ci/mcp_stdio_server.py)
+exposing TOOLS tools whose tools/list takes LIST_DELAY seconds, and reports:
+
+- startup: connect + register_to_tools, STARTS times
+  - previous: readiness polled every 0.1s, list_tools and new parameter models on
+    every connect, as MCPClient did before the connection pool
+  - cached: event-based readiness, tool schemas from the on-disk cache and
+    reused parameter models
+- calls: CALLS concurrent tool calls taking CALL_SECONDS each
+  - one session: every call on the single server process
+  - pooled: up to SESSIONS server processes, one call in flight on each
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+from browser_use import Tools
+from browser_use.mcp import client as client_module
+from browser_use.mcp.client import MCPClient
+
+SERVER = str(Path(__file__).parents[1] / 'ci' / 'mcp_stdio_server.py')
+TOOLS = 60
+LIST_DELAY = 0.2
+STARTS = 5
+CALLS = 16
+CALL_SECONDS = 0.1
+SESSIONS = 4
+ENV = {'FIXTURE_TOOLS': str(TOOLS), 'FIXTURE_LIST_DELAY': str(LIST_DELAY)}
+
+
+async def previous_startup() -> None:
+	connected = asyncio.Event()
+	disconnect = asyncio.Event()
+	state = {}
+
+	async def run_stdio_client():
+		params = StdioServerParameters(command=sys.executable, args=[SERVER], env=ENV)
+		async with stdio_client(params) as (read_stream, write_stream):
+			async with ClientSession(read_stream, write_stream) as session:
+				await session.initialize()
+				state['tools'] = (await session.list_tools()).tools
+				connected.set()
+				await disconnect.wait()
+
+	task = asyncio.create_task(run_stdio_client())
+	await connected.wait()
+	client_module._param_models.clear()
+	client = MCPClient('fixture', sys.executable, [SERVER], env=ENV, cache_tool_schemas=False)
+	registry = Tools().registry
+	for tool in state['tools']:
+		client._register_tool_as_action(registry, tool.name, tool)
+	disconnect.set()
+	await task
+
+
+async def cached_startup(cache_dir: str) -> None:
+	async with MCPClient('fixture', sys.executable, [SERVER], env=ENV, schema_cache_dir=cache_dir) as client:
+		await client.register_to_tools(Tools())
+
+
+async def concurrent_calls(**pool_options) -> float:
+	async with MCPClient('fixture', sys.executable, [SERVER], env=ENV, cache_tool_schemas=False, **pool_options) as client:
+		tools = Tools()
+		await client.register_to_tools(tools)
+		# Warm up: lets the pool open its sessions
+		await asyncio.gather(*(tools.registry.execute_action('sleep', {'seconds': CALL_SECONDS}) for _ in range(CALLS)))
+		start = time.perf_counter()
+		await asyncio.gather(*(tools.registry.execute_action('sleep', {'seconds': CALL_SECONDS}) for _ in range(CALLS)))
+		return time.perf_counter() - start
+
+
+async def run() -> None:
+	startup = {}
+	start = time.perf_counter()
+	for _ in range(STARTS):
+		await previous_startup()
+	startup['previous'] = (time.perf_counter() - start) / STARTS
+
+	with tempfile.TemporaryDirectory() as cache_dir:
+		# The first start fills the cache
+		await cached_startup(cache_dir)
+		start = time.perf_counter()
+		for _ in range(STARTS):
+			await cached_startup(cache_dir)
+		startup['cached'] = (time.perf_counter() - start) / STARTS
+
+	calls = {
+		'one session': await concurrent_calls(),
+		'pooled': await concurrent_calls(max_sessions=SESSIONS, max_calls_per_session=1),
+	}
+
+	print('\n' + '=' * 60)
+	print(f'MCP CLIENT BENCHMARK ({TOOLS} tools, tools/list {LIST_DELAY}s)')
+	print('=' * 60)
+	print(f'Startup (connect + register, mean of {STARTS}):')
+	for mode, elapsed in startup.items():
+		print(f'  {mode:>12}: {elapsed * 1000:8.1f}ms')
+	print(f'{CALLS} concurrent calls of {CALL_SECONDS}s:')
+	for mode, elapsed in calls.items():
+		print(f'  {mode:>12}: {elapsed * 1000:8.1f}ms')
+	print('=' * 60)
+
+
+def main():
+	"""Run benchmark and print report."""
+	asyncio.run(run())
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,107 @@
+"""
+MCP Multi-Session Benchmark
+
+Simulates N MCP clients each running the same short script against local
+fixture pages (navigate, get state, scroll, get state) through
+BrowserUseServer._execute_tool, all at once. Runs it twice:
+
+- shared: every client uses the default session, so calls queue up behind one
+  browser (how the server behaved before session ids)
+- per-client: every client passes its own session_id and gets its own browser
+
+Reports total wall time, mean and p95 call latency, and the time to the first
+completed call, with and without warm spare browsers.
+
+Requires a local Chromium (the same one browser-use launches for agents).
+"""
+
+import asyncio
+import http.server
+import os
+import statistics
+import threading
+import time
+
+os.environ.setdefault('BROWSER_USE_HEADLESS', 'true')
+
+from browser_use.mcp.server import BrowserUseServer  # noqa: E402
+
+CLIENTS = 4
+ROWS = 500
+
+
+class PageHandler(http.server.BaseHTTPRequestHandler):
+	def do_GET(self):
+		rows = ''.join(f'<tr><td>{self.path} row {i}</td><td><a href="#{i}">Open</a></td></tr>' for i in range(ROWS))
+		payload = f'<html><body><h1>Fixture {self.path}</h1><table>{rows}</table></body></html>'.encode()
+		self.send_response(200)
+		self.send_header('Content-Type', 'text/html')
+		self.send_header('Content-Length', str(len(payload)))
+		self.end_headers()
+		self.wfile.write(payload)
+
+	def log_message(self, format, *args):
+		pass
+
+
+async def run_client(server: BrowserUseServer, base_url: str, client: int, session_id: str | None) -> list[float]:
+	script = [
+		('browser_navigate', {'url': f'{base_url}/client-{client}'}),
+		('browser_get_state', {}),
+		('browser_scroll', {'direction': 'down'}),
+		('browser_get_state', {}),
+	]
+	latencies = []
+	for tool_name, arguments in script:
+		if session_id is not None:
+			arguments = {**arguments, 'session_id': session_id}
+		start = time.perf_counter()
+		await server._execute_tool(tool_name, arguments)
+		latencies.append(time.perf_counter() - start)
+	return latencies
+
+
+async def run_mode(base_url: str, per_client: bool, warm_sessions: int) -> tuple[float, list[float]]:
+	server = BrowserUseServer(max_sessions=CLIENTS, warm_sessions=warm_sessions)
+	server.sessions.start_warming()
+	await server.sessions.wait_warm()
+	try:
+		start = time.perf_counter()
+		results = await asyncio.gather(
+			*(run_client(server, base_url, client, f'client-{client}' if per_client else None) for client in range(CLIENTS))
+		)
+		return time.perf_counter() - start, [latency for latencies in results for latency in latencies]
+	finally:
+		await server.sessions.close_all()
+
+
+async def run() -> None:
+	fixture_server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), PageHandler)
+	threading.Thread(target=fixture_server.serve_forever, daemon=True).start()
+	base_url = f'http://127.0.0.1:{fixture_server.server_address[1]}'
+	try:
+		modes = {
+			'shared': await run_mode(base_url, per_client=False, warm_sessions=0),
+			'per-client': await run_mode(base_url, per_client=True, warm_sessions=0),
+			'per-client warm': await run_mode(base_url, per_client=True, warm_sessions=CLIENTS),
+		}
+	finally:
+		fixture_server.shutdown()
+
+	print('\n' + '=' * 72)
+	print(f'MCP MULTI-SESSION BENCHMARK ({CLIENTS} concurrent clients, 4 calls each)')
+	print('=' * 72)
+	print(f'{"mode":>16} | {"wall":>8} | {"mean call":>9} | {"p95 call":>9} | {"first call":>10}')
+	for name, (wall, latencies) in modes.items():
+		p95 = statistics.quantiles(latencies, n=20)[-1]
+		print(f'{name:>16} | {wall:7.2f}s | {statistics.mean(latencies):8.2f}s | {p95:8.2f}s | {min(latencies[::4]):9.2f}s')
+	print('=' * 72)
+
+
+def main():
+	"""Run benchmark and print report."""
+	asyncio.run(run())
+
+
+if __name__ == '__main__':
+	main()
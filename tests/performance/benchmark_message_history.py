@@ -0,0 +1,95 @@
+"""
+Message History Benchmark
+
+Drives MessageManager.create_state_messages through long agent runs and reports
+the per-step overhead at 50, 500 and 2,000 steps, comparing the incremental
+history renderer against the previous full re-render of every history item.
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+from browser_use.agent.message_manager.service import MessageManager
+from browser_use.agent.views import ActionResult, AgentOutput, AgentStepInfo, MessageManagerState
+from browser_use.browser.views import BrowserStateSummary, TabInfo
+from browser_use.dom.views import SerializedDOMState
+from browser_use.filesystem.file_system import FileSystem
+from browser_use.llm import SystemMessage
+
+STEP_COUNTS = (50, 500, 2000)
+MEASURED_STEPS = 50  # Per-step time is averaged over the last steps of each run
+
+
+class LegacyMessageManager(MessageManager):
+	"""Previous behavior: re-render and re-join every history item on every step."""
+
+	@property
+	def agent_history_description(self) -> str:
+		items = self.state.agent_history_items
+		if self.max_history_items is None or len(items) <= self.max_history_items:
+			return '\n'.join(item._render() for item in items)
+		omitted_count = len(items) - self.max_history_items
+		parts = [items[0]._render(), f'<sys>[... {omitted_count} previous steps omitted...]</sys>']
+		parts.extend(item._render() for item in items[-(self.max_history_items - 1) :])
+		return '\n'.join(parts)
+
+
+def run(manager_cls: type[MessageManager], steps: int, max_history_items: int | None, tmp_dir: Path) -> float:
+	"""Returns average milliseconds per step over the final MEASURED_STEPS steps."""
+	manager = manager_cls(
+		task='Find the cheapest flight and book it',
+		system_message=SystemMessage(content='You are a browser agent.'),
+		file_system=FileSystem(tmp_dir),
+		state=MessageManagerState(),
+		max_history_items=max_history_items,
+	)
+	browser_state = BrowserStateSummary(
+		url='https://example.com/search',
+		title='Search',
+		tabs=[TabInfo(target_id='tab-0', url='https://example.com/search', title='Search')],
+		screenshot=None,
+		dom_state=SerializedDOMState(_root=None, selector_map={}),
+	)
+
+	measured = 0.0
+	for step in range(steps):
+		model_output = AgentOutput(
+			evaluation_previous_goal=f'Step {step} succeeded, results list loaded with 20 entries',
+			memory=f'Checked {step} result pages so far, cheapest fare seen is ${300 + step % 50}',
+			next_goal=f'Open result page {step + 1} and compare fares',
+			action=[],
+		)
+		result = [ActionResult(extracted_content=f'Clicked element {step} and the next page of results loaded')]
+		start = time.perf_counter()
+		manager.create_state_messages(
+			browser_state_summary=browser_state,
+			model_output=model_output,
+			result=result,
+			step_info=AgentStepInfo(step_number=step, max_steps=steps + 1),
+			use_vision=False,
+		)
+		manager.get_messages()
+		if step >= steps - MEASURED_STEPS:
+			measured += time.perf_counter() - start
+	return measured / MEASURED_STEPS * 1000
+
+
+def main():
+	"""Run benchmark and print report."""
+	print('\n' + '=' * 72)
+	print('MESSAGE HISTORY BENCHMARK (per-step create_state_messages time)')
+	print('=' * 72)
+	print(f'{"steps":>6} | {"history limit":>13} | {"full re-render":>14} | {"incremental":>11} | {"speedup":>7}')
+	with tempfile.TemporaryDirectory() as tmp:
+		for max_history_items in (None, 50):
+			for steps in STEP_COUNTS:
+				legacy = run(LegacyMessageManager, steps, max_history_items, Path(tmp) / f'legacy-{steps}')
+				incremental = run(MessageManager, steps, max_history_items, Path(tmp) / f'incremental-{steps}')
+				limit = str(max_history_items) if max_history_items else 'none'
+				print(f'{steps:>6} | {limit:>13} | {legacy:12.3f}ms | {incremental:9.3f}ms | {legacy / incremental:6.1f}x')
+	print('=' * 72)
+
+
+if __name__ == '__main__':
+	main()
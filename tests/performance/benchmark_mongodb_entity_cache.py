@@ -0,0 +1,152 @@
+"""
+MongoDB Entity Cache Benchmark
+
+Seeds a local MongoDB (MONGODB_URL, e.g. mongodb://localhost:27017) with SCREENS
+screens in a ring, each with ACTIONS actions and one transition in and out, then
+asks for the context of every screen ROUNDS times from CONCURRENCY concurrent
+callers. Screen contexts per second are reported for:
+
+- previous: one find_one per screen, action, transition and target screen, as
+  get_screen_context did before batched reads
+- batched + cached: get_screen_context, which reads related entities with one
+  $in query per collection through the read-through entity cache
+
+Afterwards it deletes the benchmark documents and prints the per-collection
+operation timings and cache statistics.
+"""
+
+import asyncio
+import time
+import uuid
+
+from navigator.knowledge.extract.actions import ActionDefinition
+from navigator.knowledge.extract.screens import ScreenDefinition, StateSignature
+from navigator.knowledge.extract.transitions import TransitionDefinition, TransitionTrigger
+from navigator.knowledge.persist.collections import get_actions_collection, get_screens_collection, get_transitions_collection
+from navigator.knowledge.persist.navigation import get_screen_context
+from navigator.storage.mongodb import get_collection_metrics, get_entity_cache
+
+SCREENS = 100
+ACTIONS = 10
+ROUNDS = 5
+CONCURRENCY = 20
+
+
+def documents(prefix: str) -> tuple[list[dict], list[dict], list[dict]]:
+	screens: list[dict] = []
+	actions: list[dict] = []
+	transitions: list[dict] = []
+	for i in range(SCREENS):
+		action_ids = [f'{prefix}-a{i}-{j}' for j in range(ACTIONS)]
+		screens.append(
+			ScreenDefinition.model_validate(
+				{
+					'screen_id': f'{prefix}-s{i}',
+					'name': f'Screen {i}',
+					'website_id': prefix,
+					'state_signature': StateSignature(),
+					'action_ids': action_ids,
+					'outgoing_transitions': [f'{prefix}-t{i}'],
+					'incoming_transitions': [f'{prefix}-t{(i - 1) % SCREENS}'],
+				}
+			).model_dump(exclude_none=True)
+		)
+		actions.extend(
+			ActionDefinition.model_validate(
+				{'action_id': action_id, 'name': action_id, 'website_id': prefix, 'action_type': 'click'}
+			).model_dump(exclude_none=True)
+			for action_id in action_ids
+		)
+		transitions.append(
+			TransitionDefinition.model_validate(
+				{
+					'transition_id': f'{prefix}-t{i}',
+					'from_screen_id': f'{prefix}-s{i}',
+					'to_screen_id': f'{prefix}-s{(i + 1) % SCREENS}',
+					'triggered_by': TransitionTrigger.model_validate({'action_type': 'click'}),
+					'action_id': action_ids[0],
+				}
+			).model_dump(exclude_none=True)
+		)
+	return screens, actions, transitions
+
+
+async def previous_context(screens, actions, transitions, screen_id: str) -> int:
+	screen = await screens.find_one({'screen_id': screen_id})
+	found = [await actions.find_one({'action_id': action_id}) for action_id in screen['action_ids']]
+	for transition_id in screen['outgoing_transitions'] + screen['incoming_transitions']:
+		transition = await transitions.find_one({'transition_id': transition_id})
+		if transition:
+			await screens.find_one({'screen_id': transition['to_screen_id']})
+			await actions.find_one({'action_id': transition['action_id']})
+	return len(found)
+
+
+async def measure(context, screen_ids: list[str]) -> tuple[int, float]:
+	queue = asyncio.Queue()
+	for _ in range(ROUNDS):
+		for screen_id in screen_ids:
+			queue.put_nowait(screen_id)
+
+	async def worker() -> None:
+		while not queue.empty():
+			await context(queue.get_nowait())
+
+	start = time.perf_counter()
+	await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+	return len(screen_ids) * ROUNDS, time.perf_counter() - start
+
+
+async def run() -> None:
+	try:
+		screens = await get_screens_collection()
+		actions = await get_actions_collection()
+		transitions = await get_transitions_collection()
+	except ValueError:
+		screens = actions = transitions = None
+	if screens is None or actions is None or transitions is None:
+		print('MongoDB is not available; set MONGODB_URL to a local mongod.')
+		return
+
+	prefix = f'bench-{uuid.uuid4().hex[:8]}'
+	screen_docs, action_docs, transition_docs = documents(prefix)
+	screen_ids = [doc['screen_id'] for doc in screen_docs]
+	modes = {}
+	try:
+		await screens.insert_many(screen_docs)
+		await actions.insert_many(action_docs)
+		await transitions.insert_many(transition_docs)
+
+		# The previous behaviour reads the underlying motor collections, bypassing the cache
+		raw = (screens.collection, actions.collection, transitions.collection)
+		modes['previous'] = await measure(lambda screen_id: previous_context(*raw, screen_id), screen_ids)
+		modes['batched + cached'] = await measure(lambda screen_id: get_screen_context(screen_id, prefix), screen_ids)
+
+		context = await get_screen_context(screen_ids[0], prefix)
+		assert len(context['available_actions']) == ACTIONS
+		assert context['can_navigate_to'][0]['screen_id'] == screen_ids[1]
+	finally:
+		await screens.delete_many({'website_id': prefix})
+		await actions.delete_many({'website_id': prefix})
+		await transitions.delete_many({'transition_id': {'$regex': f'^{prefix}-'}})
+
+	print('\n' + '=' * 60)
+	print(f'ENTITY CACHE BENCHMARK ({SCREENS} screens x {ACTIONS} actions, {ROUNDS} rounds, {CONCURRENCY} callers)')
+	print('=' * 60)
+	print(f'{"mode":>18} | {"contexts":>8} | {"wall":>8} | {"contexts/s":>10}')
+	for mode, (contexts, elapsed) in modes.items():
+		print(f'{mode:>18} | {contexts:>8} | {elapsed:7.2f}s | {contexts / elapsed:10.0f}')
+	print('-' * 60)
+	for name, snapshot in get_collection_metrics()['collections'].items():
+		print(f'{name}: {snapshot}')
+	print(f'cache: {get_entity_cache().stats()}')
+	print('=' * 60)
+
+
+def main():
+	"""Run benchmark and print report."""
+	asyncio.run(run())
+
+
+if __name__ == '__main__':
+	main()
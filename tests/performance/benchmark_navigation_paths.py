@@ -0,0 +1,130 @@
+"""
+Navigation Path Benchmark
+
+Builds synthetic knowledge runtime models with SIZES screens and EDGES_PER_SCREEN
+random transitions per screen, where a few hub screens (home, dashboards) link
+to and from many screens. Then it answers QUERIES navigation_path requests,
+most of them from a hub, like agents asking for routes from the home screen.
+Lookup latency (p50/p99) is reported for:
+
+- search: Dijkstra and instruction assembly per request, as the runtime model
+  did before the NavigationIndex
+- precomputed: NavigationIndex lookups, including the index build time
+  (all-pairs up to ALL_PAIRS_MAX_SCREENS screens, hub trees above)
+
+Runs in memory; no MongoDB needed.
+"""
+
+import random
+import statistics
+import time
+
+from navigator.knowledge.extract.actions import ActionDefinition
+from navigator.knowledge.extract.screens import ScreenDefinition, StateSignature
+from navigator.knowledge.extract.transitions import TransitionDefinition, TransitionTrigger
+from navigator.knowledge.runtime_model import KnowledgeRuntimeModel
+
+SIZES = [50, 100, 1000, 5000]
+EDGES_PER_SCREEN = 4
+HUBS = 8
+QUERIES = 2000
+HUB_QUERY_SHARE = 0.8
+ALL_PAIRS_MAX_SCREENS = 100
+
+
+def synthetic_model(screens: int, rng: random.Random) -> KnowledgeRuntimeModel:
+	screen_ids = [f's{i}' for i in range(screens)]
+	hubs = screen_ids[:HUBS]
+	transitions = []
+	for i, screen_id in enumerate(screen_ids):
+		targets = [rng.choice(screen_ids) for _ in range(EDGES_PER_SCREEN)] + [rng.choice(hubs)]
+		if i < HUBS:
+			targets += rng.sample(screen_ids, min(screens, 20))
+		for j, target in enumerate(targets):
+			transitions.append(
+				TransitionDefinition.model_validate(
+					{
+						'transition_id': f't{i}-{j}',
+						'from_screen_id': screen_id,
+						'to_screen_id': target,
+						'triggered_by': TransitionTrigger.model_validate({'action_type': 'click'}),
+						'cost': {'estimated_ms': rng.choice([300, 800, 1500, 3000])},
+						'reliability_score': 0.95,
+						'action_id': f'a{i}-{j}',
+					}
+				)
+			)
+	return KnowledgeRuntimeModel.from_definitions(
+		'bench',
+		[
+			ScreenDefinition.model_validate(
+				{
+					'screen_id': screen_id,
+					'name': f'Screen {screen_id}',
+					'website_id': 'bench',
+					'state_signature': StateSignature(),
+				}
+			)
+			for screen_id in screen_ids
+		],
+		[
+			ActionDefinition.model_validate(
+				{'action_id': t.action_id, 'name': f'Open {t.to_screen_id}', 'website_id': 'bench', 'action_type': 'click'}
+			)
+			for t in transitions
+		],
+		transitions,
+		version=(1, 0),
+	)
+
+
+def queries(model: KnowledgeRuntimeModel, rng: random.Random) -> list[tuple[str, str]]:
+	screen_ids = list(model.screens)
+	return [
+		(rng.choice(screen_ids[:HUBS]) if rng.random() < HUB_QUERY_SHARE else rng.choice(screen_ids), rng.choice(screen_ids))
+		for _ in range(QUERIES)
+	]
+
+
+def measure(model: KnowledgeRuntimeModel, pairs: list[tuple[str, str]]) -> list[float]:
+	latencies = []
+	for from_screen_id, to_screen_id in pairs:
+		start = time.perf_counter()
+		model.navigation_path(from_screen_id, to_screen_id)
+		latencies.append((time.perf_counter() - start) * 1000)
+	return latencies
+
+
+def run() -> None:
+	rows = []
+	for size in SIZES:
+		rng = random.Random(size)
+		model = synthetic_model(size, rng)
+		pairs = queries(model, rng)
+
+		search = measure(model, pairs)
+		paths = model.precompute_paths(hubs=HUBS, all_pairs_max_screens=ALL_PAIRS_MAX_SCREENS)
+		build_ms = paths.build_seconds * 1000
+		precomputed = measure(model, pairs)
+		rows.append((size, 'search', None, search))
+		rows.append((size, 'all-pairs' if paths.all_pairs else 'hubs', build_ms, precomputed))
+
+	print('\n' + '=' * 72)
+	print(f'NAVIGATION PATH BENCHMARK ({QUERIES} queries, {HUB_QUERY_SHARE:.0%} from {HUBS} hubs)')
+	print('=' * 72)
+	print(f'{"screens":>7} | {"mode":>10} | {"build":>10} | {"p50":>9} | {"p99":>9} | {"mean":>9}')
+	for size, mode, build_ms, latencies in rows:
+		build = f'{build_ms:8.1f}ms' if build_ms is not None else f'{"-":>10}'
+		p50 = statistics.median(latencies)
+		p99 = statistics.quantiles(latencies, n=100)[-1]
+		print(f'{size:>7} | {mode:>10} | {build} | {p50:7.3f}ms | {p99:7.3f}ms | {statistics.mean(latencies):7.3f}ms')
+	print('=' * 72)
+
+
+def main():
+	"""Run benchmark and print report."""
+	run()
+
+
+if __name__ == '__main__':
+	main()
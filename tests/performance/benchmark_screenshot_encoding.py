@@ -0,0 +1,128 @@
+"""
+Screenshot Encoding Benchmark
+
+Encodes a fixture set of synthetic page screenshots (text-heavy article, form,
+image-heavy landing page; 1x and 2x device scale) with several encoding
+profiles and reports bytes per step, encode time and estimated vision tokens.
+
+Vision tokens use Anthropic's published estimate (width * height / 750) after
+the API's own downscale to a long edge of at most 1568px and ~1.15 megapixels;
+other providers tile differently, but scale the same way with pixel count.
+"""
+
+import base64
+import random
+import time
+from io import BytesIO
+
+from PIL import Image, ImageDraw
+
+from browser_use.screenshots.encoding import ScreenshotProfile, ScreenshotVariants
+
+VIEWPORT = (1280, 1100)
+ITERATIONS = 3
+
+PROFILES: dict[str, ScreenshotProfile] = {
+	'png (current)': ScreenshotProfile(),
+	'jpeg q80': ScreenshotProfile(format='jpeg', quality=80),
+	'webp q80': ScreenshotProfile(format='webp', quality=80),
+	'jpeg q75 max1024': ScreenshotProfile(format='jpeg', quality=75, max_dimension=1024),
+	'webp q70 gray max1024': ScreenshotProfile(format='webp', quality=70, max_dimension=1024, grayscale=True),
+}
+
+
+def text_page(size: tuple[int, int], rng: random.Random) -> Image.Image:
+	image = Image.new('RGB', size, 'white')
+	draw = ImageDraw.Draw(image)
+	scale = size[0] // VIEWPORT[0]
+	draw.rectangle((0, 0, size[0], 70 * scale), fill=(24, 40, 72))
+	y = 110 * scale
+	while y < size[1] - 20 * scale:
+		words = ' '.join(''.join(rng.choices('abcdefghijklmnopqrstuvwxyz', k=rng.randint(2, 9))) for _ in range(16))
+		draw.text((80 * scale, y), words, fill=(30, 30, 30), font_size=14 * scale)
+		y += 22 * scale
+	return image
+
+
+def form_page(size: tuple[int, int], rng: random.Random) -> Image.Image:
+	image = Image.new('RGB', size, (245, 246, 248))
+	draw = ImageDraw.Draw(image)
+	scale = size[0] // VIEWPORT[0]
+	for row in range(12):
+		top = (120 + row * 75) * scale
+		draw.text((360 * scale, top), f'Field {row + 1}', fill=(60, 60, 60), font_size=13 * scale)
+		draw.rounded_rectangle(
+			(360 * scale, top + 20 * scale, 920 * scale, top + 56 * scale), 6 * scale, fill='white', outline=(200, 200, 205)
+		)
+	draw.rounded_rectangle((360 * scale, 1040 * scale, 520 * scale, 1080 * scale), 8 * scale, fill=(37, 99, 235))
+	return image
+
+
+def image_page(size: tuple[int, int], rng: random.Random) -> Image.Image:
+	image = Image.effect_noise(size, 24).convert('RGB')
+	image = Image.blend(image, Image.linear_gradient('L').resize(size).convert('RGB'), 0.6)
+	draw = ImageDraw.Draw(image)
+	scale = size[0] // VIEWPORT[0]
+	for _ in range(6):
+		x, y = rng.randrange(size[0] - 300 * scale), rng.randrange(size[1] - 200 * scale)
+		draw.rectangle((x, y, x + 300 * scale, y + 200 * scale), fill=tuple(rng.randrange(256) for _ in range(3)))
+	draw.text((100 * scale, 80 * scale), 'Summer collection', fill='white', font_size=48 * scale)
+	return image
+
+
+def fixtures() -> dict[str, str]:
+	rng = random.Random(7)
+	pages = {}
+	for dpr in (1, 2):
+		size = (VIEWPORT[0] * dpr, VIEWPORT[1] * dpr)
+		for name, render in (('text', text_page), ('form', form_page), ('image', image_page)):
+			buffer = BytesIO()
+			render(size, rng).save(buffer, format='PNG')
+			pages[f'{name}@{dpr}x'] = base64.b64encode(buffer.getvalue()).decode()
+	return pages
+
+
+def vision_tokens(width: int, height: int) -> int:
+	scale = min(1.0, 1568 / max(width, height), (1_150_000 / (width * height)) ** 0.5)
+	return round(width * scale) * round(height * scale) // 750
+
+
+def main():
+	"""Run benchmark and print report."""
+	pages = fixtures()
+	print('\n' + '=' * 78)
+	print(f'SCREENSHOT ENCODING BENCHMARK ({len(pages)} fixture pages, viewport {VIEWPORT[0]}x{VIEWPORT[1]})')
+	print('=' * 78)
+	print(f'{"profile":<22} | {"avg KB/step":>11} | {"vs png":>6} | {"encode ms":>9} | {"vision tok":>10} | {"vs png":>6}')
+
+	baseline_bytes = baseline_tokens = 0.0
+	for label, profile in PROFILES.items():
+		total_bytes = total_tokens = total_ms = 0.0
+		for screenshot in pages.values():
+			start = time.perf_counter()
+			for _ in range(ITERATIONS):
+				encoded = ScreenshotVariants(screenshot).get_sync(profile)
+			total_ms += (time.perf_counter() - start) / ITERATIONS * 1000
+			total_bytes += len(encoded.data)
+			total_tokens += vision_tokens(encoded.width, encoded.height)
+
+		avg_kb, avg_tokens, avg_ms = total_bytes / len(pages) / 1024, total_tokens / len(pages), total_ms / len(pages)
+		if not baseline_bytes:
+			baseline_bytes, baseline_tokens = avg_kb, avg_tokens
+		print(
+			f'{label:<22} | {avg_kb:9.1f}KB | {avg_kb / baseline_bytes:5.0%} | {avg_ms:7.1f}ms | '
+			f'{avg_tokens:10.0f} | {avg_tokens / baseline_tokens:5.0%}'
+		)
+
+	print('-' * 78)
+	print('Per page (png KB -> jpeg q75 max1024 KB):')
+	for name, screenshot in pages.items():
+		variants = ScreenshotVariants(screenshot)
+		original = len(variants.source) / 1024
+		encoded = variants.get_sync(PROFILES['jpeg q75 max1024'])
+		print(f'  {name:<10} {original:8.1f}KB -> {len(encoded.data) / 1024:7.1f}KB  ({encoded.width}x{encoded.height})')
+	print('=' * 78)
+
+
+if __name__ == '__main__':
+	main()
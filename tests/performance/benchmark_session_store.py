@@ -0,0 +1,128 @@
+"""
+Presentation Session Store Benchmark
+
+Runs the same session workload against a local MongoDB (MONGODB_URL, e.g.
+mongodb://localhost:27017): SESSIONS sessions, each doing STEPS rounds of
+save + load + load, like a presentation session updating its state and reading
+it back. Session operations per second are reported for:
+
+- previous: one update_one(upsert=True) per save and one find_one plus an
+  expiry check per load, as SessionStore did before the local tier
+- two-tier: SessionStore with the local LRU tier and write-behind bulk writes,
+  including the final flush so every save has reached MongoDB
+
+Afterwards it checks that MongoDB holds the last state of every session, then
+deletes the benchmark documents.
+"""
+
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from navigator.presentation.session_store import SessionStore
+from navigator.storage.mongodb import get_collection
+
+SESSIONS = 200
+STEPS = 20
+TTL = 3600
+
+
+def state(session_id: str, step: int) -> dict:
+	return {'session_id': session_id, 'room_name': f'room-{session_id}', 'state': 'active', 'step': step, 'actions': step * 3}
+
+
+async def previous_behaviour(collection, prefix: str) -> int:
+	async def save(session_id: str, session_state: dict) -> None:
+		now = datetime.utcnow()
+		await collection.update_one(
+			{'session_id': session_id},
+			{
+				'$set': {
+					'session_id': session_id,
+					'session_state': session_state,
+					'expires_at': now + timedelta(seconds=TTL),
+					'updated_at': now,
+				}
+			},
+			upsert=True,
+		)
+
+	async def load(session_id: str) -> dict | None:
+		doc = await collection.find_one({'session_id': session_id})
+		if doc is None or doc['expires_at'] < datetime.utcnow():
+			return None
+		return doc['session_state']
+
+	async def run_session(i: int) -> int:
+		session_id = f'{prefix}-{i}'
+		for step in range(STEPS):
+			await save(session_id, state(session_id, step))
+			loaded = await load(session_id)
+			assert loaded is not None and loaded['step'] == step
+			await load(session_id)
+		return STEPS * 3
+
+	return sum(await asyncio.gather(*(run_session(i) for i in range(SESSIONS))))
+
+
+async def two_tier(store: SessionStore, prefix: str) -> int:
+	async def run_session(i: int) -> int:
+		session_id = f'{prefix}-{i}'
+		for step in range(STEPS):
+			await store.save_session(session_id, state(session_id, step), ttl=TTL)
+			loaded = await store.load_session(session_id)
+			assert loaded is not None and loaded['step'] == step
+			await store.load_session(session_id)
+		return STEPS * 3
+
+	operations = sum(await asyncio.gather(*(run_session(i) for i in range(SESSIONS))))
+	await store.close()
+	return operations
+
+
+async def run() -> None:
+	try:
+		collection = await get_collection('sessions')
+	except ValueError:
+		collection = None
+	if collection is None:
+		print('MongoDB is not available; set MONGODB_URL to a local mongod.')
+		return
+	# Both modes look sessions up by an index, so only the tiers differ
+	await collection.create_index('session_id', unique=True)
+
+	run_id = uuid.uuid4().hex[:8]
+	modes = {}
+	try:
+		start = time.perf_counter()
+		operations = await previous_behaviour(collection, f'bench-{run_id}-previous')
+		modes['previous'] = (operations, time.perf_counter() - start)
+
+		store = SessionStore()
+		start = time.perf_counter()
+		operations = await two_tier(store, f'bench-{run_id}-tiered')
+		modes['two-tier'] = (operations, time.perf_counter() - start)
+
+		for i in range(SESSIONS):
+			doc = await collection.find_one({'session_id': f'bench-{run_id}-tiered-{i}'})
+			assert doc['session_state']['step'] == STEPS - 1
+	finally:
+		await collection.delete_many({'session_id': {'$regex': f'^bench-{run_id}-'}})
+
+	print('\n' + '=' * 60)
+	print(f'SESSION STORE BENCHMARK ({SESSIONS} sessions x {STEPS} x save + 2 loads)')
+	print('=' * 60)
+	print(f'{"mode":>10} | {"operations":>10} | {"wall":>8} | {"ops/s":>10}')
+	for mode, (operations, elapsed) in modes.items():
+		print(f'{mode:>10} | {operations:>10} | {elapsed:7.2f}s | {operations / elapsed:10.0f}')
+	print('=' * 60)
+
+
+def main():
+	"""Run benchmark and print report."""
+	asyncio.run(run())
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,106 @@
+"""
+Structured Output Parsing Benchmark
+
+Replays frame-analysis style responses (fenced JSON with a prose preamble, as
+Gemini tends to return them) as a stream of small chunks arriving at a steady
+rate, and compares:
+
+- buffered: wait for the whole response, strip fences, json.loads, validate
+  (previous behavior in frame analysis and the provider fallback paths)
+- streaming: StreamingJSONParser fed chunk by chunk
+
+Reports CPU parse time per response and time-to-first-field under streaming.
+"""
+
+import asyncio
+import json
+import re
+import time
+
+from browser_use.llm.structured_output import parse_json_stream, parse_json_text
+from navigator.schemas import FrameAnalysisResponse
+
+ITERATIONS = 50
+CHUNK_CHARS = 40  # Roughly what a streaming API delivers per event
+CHUNK_INTERVAL = 0.002  # Seconds between streamed chunks
+
+
+def make_response(element_count: int) -> str:
+	"""Build a recorded-style frame analysis response."""
+	analysis = {
+		'screen_state': 'Orders / Order Details',
+		'business_function': 'Order Management',
+		'operational_aspect': 'Reviewing an order before fulfillment',
+		'ui_elements': [
+			{
+				'type': 'button' if i % 3 else 'input',
+				'label': f'Element {i} "primary"',
+				'position': {'x': i * 7 % 1920, 'y': i * 13 % 1080, 'width': 120, 'height': 32},
+				'state': 'enabled',
+				'importance_score': round((i % 10) / 10, 1),
+				'layout_context': 'main',
+			}
+			for i in range(element_count)
+		],
+		'visible_actions': [f'Click element {i}' for i in range(element_count // 4)],
+		'visible_text': ' '.join(f'Label {i}' for i in range(element_count)),
+		'layout_structure': {'layout_type': 'grid', 'columns': 2, 'regions': [], 'sections': ['Header', 'Details']},
+		'visual_hierarchy': {'elements': []},
+		'data_elements': [{'type': 'table', 'content': 'Order lines'}],
+		'visual_indicators': [],
+	}
+	return 'Here is the analysis of the frame:\n```json\n' + json.dumps(analysis, indent=2) + '\n```'
+
+
+def buffered_parse(text: str) -> FrameAnalysisResponse:
+	"""Previous approach: strip markdown fences from the full text, then parse and validate."""
+	try:
+		data = json.loads(text)
+	except json.JSONDecodeError:
+		match = re.search(r'```(?:json)?\s*(.*?)\s*```', text, re.DOTALL)
+		data = json.loads(match.group(1) if match else text)
+	return FrameAnalysisResponse.model_validate(data)
+
+
+async def stream(text: str):
+	for offset in range(0, len(text), CHUNK_CHARS):
+		await asyncio.sleep(CHUNK_INTERVAL)
+		yield text[offset : offset + CHUNK_CHARS]
+
+
+def time_cpu(fn, text: str) -> float:
+	start = time.perf_counter()
+	for _ in range(ITERATIONS):
+		fn(text)
+	return (time.perf_counter() - start) / ITERATIONS * 1000
+
+
+async def streamed_timings(text: str) -> tuple[float, float]:
+	"""Returns (time to first field, time to complete result) for the streaming parser."""
+	start = time.perf_counter()
+	result = await parse_json_stream(stream(text), FrameAnalysisResponse, strict=True)
+	assert result.value is not None and result.time_to_first_field is not None
+	return result.time_to_first_field, time.perf_counter() - start
+
+
+async def main():
+	"""Run benchmark and print report."""
+	print('\n' + '=' * 78)
+	print('STRUCTURED OUTPUT PARSING BENCHMARK')
+	print('=' * 78)
+	print(f'{"response":>16} | {"buffered parse":>14} | {"stream parse":>12} | {"first field":>11} | {"full stream":>11}')
+	for element_count in (10, 100, 500):
+		text = make_response(element_count)
+		buffered_ms = time_cpu(buffered_parse, text)
+		streaming_ms = time_cpu(lambda t: parse_json_text(t, FrameAnalysisResponse, strict=True), text)
+		first_field, total = await streamed_timings(text)
+		label = f'{len(text) // 1024}KB ({element_count} el)'
+		print(
+			f'{label:>16} | {buffered_ms:12.2f}ms | {streaming_ms:10.2f}ms | {first_field * 1000:9.1f}ms | {total * 1000:9.1f}ms'
+		)
+	print('=' * 78)
+	print('buffered parsing cannot start until the full stream has arrived')
+
+
+if __name__ == '__main__':
+	asyncio.run(main())
@@ -0,0 +1,94 @@
+"""
+TokenCost Pricing and Usage Summary Benchmark
+
+Measures:
+- pricing load: bundled compact snapshot vs parsing LiteLLM's full pricing JSON
+  (pass its path as the first argument; otherwise that row is skipped)
+- get_model_pricing lookups through the resolved-name cache
+- get_usage_summary called after every step of a long run: running totals vs
+  rescanning every entry (the `since=` path still rescans)
+"""
+
+import asyncio
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from browser_use.llm.views import ChatInvokeUsage
+from browser_use.tokens.pricing import SNAPSHOT_PATH, load_bundled_pricing
+from browser_use.tokens.service import TokenCost
+from browser_use.tokens.views import CachedPricingData
+
+STEPS = 2_000
+LOOKUPS = 10_000
+
+
+def usage(step: int) -> ChatInvokeUsage:
+	return ChatInvokeUsage(
+		prompt_tokens=8_000 + step,
+		prompt_cached_tokens=6_000,
+		prompt_cache_creation_tokens=None,
+		prompt_image_tokens=None,
+		completion_tokens=300,
+		total_tokens=8_300 + step,
+	)
+
+
+def measure_pricing_load() -> None:
+	start = time.perf_counter()
+	CachedPricingData.model_validate_json(SNAPSHOT_PATH.read_bytes())
+	print(
+		f'bundled snapshot load:        {(time.perf_counter() - start) * 1000:8.1f}ms ({SNAPSHOT_PATH.stat().st_size / 1024:.0f}KB)'
+	)
+	if len(sys.argv) > 1:
+		full_path = Path(sys.argv[1])
+		start = time.perf_counter()
+		json.loads(full_path.read_bytes())
+		print(
+			f'full LiteLLM JSON parse:      {(time.perf_counter() - start) * 1000:8.1f}ms ({full_path.stat().st_size / 1024:.0f}KB)'
+		)
+
+
+async def run() -> None:
+	print('\n' + '=' * 64)
+	print('TOKEN COST BENCHMARK (networking not used)')
+	print('=' * 64)
+
+	measure_pricing_load()
+	token_cost = TokenCost(include_cost=True, refresh_pricing=False)
+	token_cost._pricing_data = load_bundled_pricing().data
+	token_cost._initialized = True
+
+	start = time.perf_counter()
+	for i in range(LOOKUPS):
+		await token_cost.get_model_pricing(
+			('gpt-4.1-mini', 'claude-sonnet-4-5', 'gemini-2.5-flash', 'llama-3.3-70b-versatile')[i % 4]
+		)
+	print(f'get_model_pricing:            {(time.perf_counter() - start) / LOOKUPS * 1e6:8.2f}us/lookup')
+
+	incremental = 0.0
+	for step in range(STEPS):
+		token_cost.add_usage('gpt-4.1-mini', usage(step))
+		start = time.perf_counter()
+		await token_cost.get_usage_summary()
+		incremental += time.perf_counter() - start
+
+	start = time.perf_counter()
+	await token_cost.get_usage_summary(since=datetime.min)
+	rescan_ms = (time.perf_counter() - start) * 1000
+	print('-' * 64)
+	print(f'usage summary after each of {STEPS:,} steps:')
+	print(f'  running totals:             {incremental / STEPS * 1000:8.3f}ms/step')
+	print(f'  full rescan at step {STEPS:,}:   {rescan_ms:8.3f}ms')
+	print('=' * 64)
+
+
+def main():
+	"""Run benchmark and print report."""
+	asyncio.run(run())
+
+
+if __name__ == '__main__':
+	main()
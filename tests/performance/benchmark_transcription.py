@@ -0,0 +1,89 @@
+"""
+Transcription Pipeline Benchmark
+
+Transcribes generated test audio (tone bursts separated by silence) with the
+offline stub backend, which simulates per-request API latency. Compares a
+single whole-file request (previous behavior) against chunked parallel
+transcription, and a second run that is served from the chunk cache.
+"""
+
+import array
+import asyncio
+import math
+import tempfile
+import time
+
+from navigator.knowledge.ingest.video.transcription_pipeline import (
+	SAMPLE_RATE,
+	AudioChunk,
+	OfflineStubBackend,
+	TranscriptCache,
+	TranscriptionPipeline,
+	stitch_transcripts,
+)
+
+AUDIO_MINUTES = 20
+# Simulated API cost: fixed overhead + time proportional to audio length
+REQUEST_OVERHEAD = 0.05
+SECONDS_PER_AUDIO_MINUTE = 0.1
+
+
+class LatencyModelBackend(OfflineStubBackend):
+	"""Stub backend whose latency grows with chunk duration, like a real API."""
+
+	async def transcribe_chunk(self, chunk: AudioChunk):
+		self.latency = REQUEST_OVERHEAD + chunk.duration / 60 * SECONDS_PER_AUDIO_MINUTE
+		return await super().transcribe_chunk(chunk)
+
+
+def generate_audio(minutes: int) -> bytes:
+	"""Generate PCM with 3s 'utterances' and 1s pauses."""
+	tone = array.array('h', (int(6000 * math.sin(2 * math.pi * 300 * i / SAMPLE_RATE)) for i in range(3 * SAMPLE_RATE)))
+	pause = array.array('h', [0] * SAMPLE_RATE)
+	block = (tone + pause).tobytes()
+	return block * (minutes * 60 // 4)
+
+
+async def as_stream(pcm: bytes, read_size: int = 64 * 1024):
+	for offset in range(0, len(pcm), read_size):
+		yield pcm[offset : offset + read_size]
+
+
+async def run_single_request(pcm: bytes) -> float:
+	backend = LatencyModelBackend()
+	start = time.perf_counter()
+	transcript = await backend.transcribe_chunk(AudioChunk(index=0, start=0.0, pcm=pcm))
+	stitch_transcripts([(AudioChunk(index=0, start=0.0, pcm=pcm), transcript)])
+	return time.perf_counter() - start
+
+
+async def run_pipeline(pcm: bytes, cache: TranscriptCache | None, concurrency: int) -> float:
+	pipeline = TranscriptionPipeline(LatencyModelBackend(), chunk_seconds=30.0, max_concurrency=concurrency, cache=cache)
+	start = time.perf_counter()
+	await pipeline.transcribe_stream(as_stream(pcm))
+	return time.perf_counter() - start
+
+
+async def main():
+	"""Run benchmark and print report."""
+	pcm = generate_audio(AUDIO_MINUTES)
+
+	single = await run_single_request(pcm)
+	chunked = {c: await run_pipeline(pcm, None, c) for c in (1, 4, 8)}
+	with tempfile.TemporaryDirectory() as cache_dir:
+		cache = TranscriptCache(cache_dir)
+		await run_pipeline(pcm, cache, 8)
+		cached = await run_pipeline(pcm, cache, 8)
+
+	print('\n' + '=' * 70)
+	print(f'TRANSCRIPTION BENCHMARK ({AUDIO_MINUTES} min generated audio, simulated API latency)')
+	print('=' * 70)
+	print(f'single request:            {single:7.2f}s')
+	for concurrency, elapsed in chunked.items():
+		print(f'chunked, concurrency={concurrency}:   {elapsed:7.2f}s')
+	print(f'chunked, cached re-run:    {cached:7.2f}s')
+	print('=' * 70)
+
+
+if __name__ == '__main__':
+	asyncio.run(main())